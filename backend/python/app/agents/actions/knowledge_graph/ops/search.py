@@ -161,6 +161,7 @@ async def execute_search(
                 limit=adjusted_limit,
                 filter_groups=fg,
                 time_range=time_range,
+                chat_mode=state.get("search_chat_mode") or state.get("chat_mode"),
             )
 
         if fan_out_sources:
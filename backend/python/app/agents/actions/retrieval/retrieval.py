@@ -410,6 +410,7 @@ class Retrieval:
                     user_id=user_id,
                     limit=adjusted_limit,
                     filter_groups=source_filter_groups,
+                    chat_mode=self.state.get("search_chat_mode") or self.state.get("chat_mode"),
                 )
 
             if fan_out_sources:
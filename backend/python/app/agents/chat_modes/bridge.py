@@ -31,9 +31,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING, Any
 
+from app.agent_loop_lib.events.base import EventType
 from app.agents.agent_loop.answer_streamer import TerminalAnswerStreamer
 from app.agents.agent_loop.clarification import emit_pre_run_clarification
 from app.agents.agent_loop.context import AgentContext
@@ -60,6 +62,7 @@ from app.agents.chat_modes.policy import (
 from app.agents.chat_modes.prefetch import prefetch_retrieval
 from app.config.constants.service import config_node_constants
 from app.utils.chat_helpers import CitationRefMapper, ImageBudget, get_message_content
+from app.utils.query_timing import phase, record_phase
 from app.utils.streaming import create_sse_event, handle_simple_mode
 
 if TYPE_CHECKING:
@@ -260,7 +263,7 @@ async def _run_no_tools_degradation(
         retrieval_service=retrieval_service, graph_provider=graph_provider, blob_store=blob_store,
         filters=query_info.get("filters"), limit=query_info.get("limit"),
         is_multimodal_llm=is_multimodal_llm, previous_conversations=query_info.get("previous_conversations"),
-        logger=log, force=True,
+        logger=log, force=True, chat_mode=query_info.get("chatMode"),
     )
     ref_mapper = prefetch.citation_ref_mapper if prefetch else CitationRefMapper()
     context_text = prefetch.formatted_context if prefetch else ""
@@ -351,6 +354,9 @@ async def run_chat_stream(  # noqa: PLR0913 - mirrors run_agent_loop_stream's ca
             # didn't explicitly filter to.
             existing_kb = list(filters.get("kb") or [])
             filters["kb"] = list({*existing_kb, *resolved_attachments.virtual_record_ids})
+        # Retrieval's precision profile keys off the wire value ("quick",
+        # "deep_research", ...), which the loop mode and policy name replace.
+        wire_chat_mode = query_info.get("chatMode")
         query_info = {**query_info, "filters": filters, "chatMode": policy.loop_chat_mode}
 
         chat_state = build_initial_state(
@@ -360,6 +366,7 @@ async def run_chat_stream(  # noqa: PLR0913 - mirrors run_agent_loop_stream's ca
             has_slack_connector=has_slack_connector, client_name=client_name,
         )
         _apply_policy_to_chat_state(chat_state, policy, web_search_config)
+        chat_state["search_chat_mode"] = wire_chat_mode
         chat_state["instructions"] = _with_mode_instructions(chat_state.get("instructions"), policy)
         chat_state["custom_instructions"] = _resolve_custom_instructions(ai_models_config, policy)
         chat_state["citation_ref_mapper"] = ref_mapper
@@ -412,6 +419,7 @@ async def run_chat_stream(  # noqa: PLR0913 - mirrors run_agent_loop_stream's ca
                         # `prefetch_retrieval`'s `ref_mapper` docstring.
                         ref_mapper=ref_mapper,
                         image_budget=image_budget,
+                        chat_mode=wire_chat_mode,
                     )
                 )
                 if policy.prefetch_retrieval else None
@@ -532,8 +540,16 @@ async def run_chat_stream(  # noqa: PLR0913 - mirrors run_agent_loop_stream's ca
             else:
                 collector = CitationCollector(context)
                 streamer = TerminalAnswerStreamer(context, collector, context.event_sink)
-                async for event in agent.stream(goal):
-                    await streamer.on_event(event)
+                # llm_total spans the whole agent run, tool turns included;
+                # llm_first_token is the wait for the first answer token.
+                with phase("llm_total"):
+                    stream_started = time.perf_counter()
+                    first_token_seen = False
+                    async for event in agent.stream(goal):
+                        if not first_token_seen and event.event_type == EventType.TEXT_MESSAGE_CONTENT:
+                            first_token_seen = True
+                            record_phase("llm_first_token", time.perf_counter() - stream_started)
+                        await streamer.on_event(event)
                 result = agent.last_stream_result
 
                 finalizer = AnswerFinalizer(context, collector)
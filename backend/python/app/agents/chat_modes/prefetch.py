@@ -93,6 +93,7 @@ async def prefetch_retrieval(
     force: bool = False,
     ref_mapper: CitationRefMapper | None = None,
     image_budget: ImageBudget | None = None,
+    chat_mode: str | None = None,
 ) -> PrefetchResult | None:
     """Runs upfront retrieval for the current query.
 
@@ -111,6 +112,9 @@ async def prefetch_retrieval(
     through one mapper, so a mapper swap after prefetch resolves doesn't
     orphan refs those tools already registered. See `bridge.py`'s
     `_produce()` for the call site this matters for.
+
+    `chat_mode` is forwarded to `search_with_filters` so the vector search
+    runs at that mode's precision profile.
     """
     if not force and _is_followup(previous_conversations):
         return None
@@ -123,6 +127,7 @@ async def prefetch_retrieval(
             user_id=user_id,
             limit=limit,
             filter_groups=filters,
+            chat_mode=chat_mode,
         )
     except Exception as exc:  # noqa: BLE001 - surfaced as a graceful empty prefetch
         logger.error("prefetch_retrieval: search_with_filters failed: %s", exc, exc_info=True)
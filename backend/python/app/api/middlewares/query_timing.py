@@ -0,0 +1,82 @@
+"""Per-request query phase timing middleware.
+
+Raw ASGI, like ``RequestContextMiddleware``, so the timer bound here is visible
+to the endpoint and to every task it spawns. See ``app/utils/query_timing.py``
+for what gets measured.
+
+With ``PIPESHUB_SERVER_TIMING=1`` the totals go out in a ``Server-Timing``
+header. A streamed chat turn sends its headers before any phase has run, so for
+``text/event-stream`` responses the same value is appended after the last
+event as an SSE comment (``: server-timing ...``), which clients ignore.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.utils.logger import create_logger
+from app.utils.query_timing import (
+    QueryTimer,
+    query_timing_settings,
+    reset_query_timer,
+    start_query_timer,
+)
+
+logger = create_logger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+HEADER_SERVER_TIMING = b"server-timing"
+
+
+def _is_event_stream(headers: list[tuple[bytes, bytes]]) -> bool:
+    for key, value in headers:
+        if key.lower() == b"content-type":
+            return value.lower().startswith(b"text/event-stream")
+    return False
+
+
+class QueryTimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings = query_timing_settings()
+        if scope.get("type") != "http" or not settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timer = QueryTimer()
+        token = start_query_timer(timer)
+        if settings.server_timing:
+            send = self._server_timing_send(timer, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_query_timer(token)
+            timer.finish(logger)
+
+    @staticmethod
+    def _server_timing_send(timer: QueryTimer, send: Send) -> Send:
+        streaming = False
+
+        async def wrapped(message: dict[str, Any]) -> None:
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                streaming = _is_event_stream(headers)
+                if not streaming:
+                    headers.append((HEADER_SERVER_TIMING, timer.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            elif (
+                streaming
+                and message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+            ):
+                trailer = f": server-timing {timer.server_timing()}\n\n".encode("latin-1")
+                message = {**message, "body": message.get("body", b"") + trailer}
+            await send(message)
+
+        return wrapped
@@ -189,8 +189,7 @@ async def _build_excel_blocks(
     from app.modules.parsers.excel.excel_parser import ExcelParser
 
     parser = ExcelParser(logger=logger, config_service=config_service)
-    await asyncio.to_thread(parser.load_workbook_from_binary, file_content)
-    return await parser.create_blocks_lightweight(max_rows=_CHAT_ATTACHMENT_MAX_TABLE_ROWS)
+    return await parser.parse_workbook(file_content, max_rows=_CHAT_ATTACHMENT_MAX_TABLE_ROWS)
 
 
 async def _build_csv_blocks(
@@ -16,14 +16,16 @@ GET  /health
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
 from typing import Annotated
 
 from fastapi import APIRouter, File, Form, Request, UploadFile, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from app.modules.parsers.excel.excel_parser import estimate_workbook_cells
 from app.services.parsing.interface import (
     ParseError,
     ParseErrorCode,
@@ -36,6 +38,11 @@ from app.services.resource_governor import (
     gate_pool,
     parse_cost,
 )
+from app.utils.docling_wire_format import (
+    DOCLING_BINARY_CONTENT_TYPE,
+    RESPONSE_FORMAT_BINARY,
+    encode_document,
+)
 from app.utils.request_context import current_display_id
 from app.utils.semaphore_logger import SemaphoreLogger
 
@@ -84,7 +91,10 @@ async def parse_file(
     org_id: Annotated[str | None, Form(description="Organisation ID")] = None,
     provider: Annotated[str | None, Form(description="Parser provider override")] = None,
     skip_table_enrichment: Annotated[bool, Form(description="Skip LLM table summaries")] = False,
-) -> JSONResponse:
+    response_format: Annotated[
+        str | None, Form(description="'binary' to receive raw documents as the binary envelope")
+    ] = None,
+) -> Response:
     """Parse *file* into blocks, or a raw parsed document for Docling-backed providers.
 
     The response body is ``ParseResponse`` JSON. Exactly one of ``block_container``
@@ -98,6 +108,11 @@ async def parse_file(
           "provider_used": "docling",
           "error": null
         }
+
+    With ``response_format=binary``, a successful ``raw_document`` result is
+    sent instead as the binary DoclingDocument envelope
+    (``app.utils.docling_wire_format``), with ``provider_used`` and
+    ``metadata`` in its ``meta`` map. Block containers and errors stay JSON.
     """
     registry = _get_registry(request)
 
@@ -145,11 +160,18 @@ async def parse_file(
 
     message_id = current_display_id()
     tier = classify(extension, mime_type)
-    cost = parse_cost(tier, len(content))
+    # xlsx is zip-compressed, so its byte size says little about how many
+    # cells openpyxl will materialise; read the sheet dimensions instead.
+    cells = (
+        estimate_workbook_cells(content)
+        if (extension or "").lower().lstrip(".") == "xlsx"
+        else None
+    )
+    cost = parse_cost(tier, len(content), cells)
     logger.info(
-        "Received parse request: record='%s' format=%s provider=%s size_bytes=%d tier=%s cost=%d",
+        "Received parse request: record='%s' format=%s provider=%s size_bytes=%d cells=%s tier=%s cost=%d",
         record_name, extension or mime_type or "unknown", provider_enum.value, len(content),
-        tier.value, cost,
+        cells, tier.value, cost,
     )
 
     governor = request.app.state.governor
@@ -235,6 +257,14 @@ async def parse_file(
         result.raw_document is not None,
     )
 
+    if response_format == RESPONSE_FORMAT_BINARY and result.raw_document is not None:
+        meta = {
+            "provider_used": result.provider_used.value if result.provider_used is not None else None,
+            "metadata": result.metadata,
+        }
+        body = await asyncio.to_thread(encode_document, result.raw_document, meta)
+        return Response(content=body, media_type=DOCLING_BINARY_CONTENT_TYPE)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
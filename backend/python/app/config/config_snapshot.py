@@ -0,0 +1,177 @@
+"""Versioned, decrypted in-memory snapshot of configuration values.
+
+``ConfigurationService`` serves reads from this snapshot while an etcd watch
+or Redis Pub/Sub subscription is keeping it current, instead of paying a
+store round trip plus ``EncryptedKeyValueStore``'s decrypt + ``json.loads``
+on every call.
+
+* Entries hold the already-decrypted value. Containers are kept msgpack-encoded
+  and decoded per read, so every caller gets a private copy and nothing a
+  caller does to a returned dict can leak into the next read.
+* Every invalidation or write bumps ``version``. A store read records the
+  version before it starts and only installs its result if no invalidation
+  landed in between (:meth:`ConfigSnapshot.install`), so a slow read cannot
+  put back a value a watch event just retired.
+* Entries older than ``max_age_seconds`` are treated as misses. This bounds
+  staleness when an invalidation is lost (Pub/Sub is at-most-once).
+* ``stats`` counts hits / misses / expired entries / invalidations.
+
+The class is a ``MutableMapping`` over plain values, so ``cache[key]``,
+``cache.pop(key)`` and ``cache.clear()`` still behave as they did on the LRU
+cache it replaces.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterator, MutableMapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import msgspec
+from cachetools import LRUCache
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_AGE_SECONDS = 60.0
+
+
+def _max_age_from_env() -> float:
+    raw = os.getenv("CONFIG_SNAPSHOT_MAX_AGE_SECONDS")
+    if raw:
+        try:
+            return max(0.0, float(raw))
+        except ValueError:
+            pass
+    return DEFAULT_MAX_AGE_SECONDS
+
+
+@dataclass
+class SnapshotStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    invalidations: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    loaded_at: float
+    value: Any = None
+    packed: bytes | None = None
+
+    def read(self) -> Any:  # noqa: ANN401
+        return msgspec.msgpack.decode(self.packed) if self.packed is not None else self.value
+
+
+def _make_entry(value: Any) -> _Entry:  # noqa: ANN401
+    now = time.monotonic()
+    if isinstance(value, (dict, list, tuple)):
+        try:
+            return _Entry(loaded_at=now, packed=msgspec.msgpack.encode(value))
+        except (TypeError, msgspec.EncodeError):
+            pass
+    return _Entry(loaded_at=now, value=value)
+
+
+class ConfigSnapshot(MutableMapping):
+    """Thread-safe LRU of decrypted config values; see the module docstring."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_ENTRIES, max_age_seconds: float | None = None) -> None:
+        self.max_age_seconds = _max_age_from_env() if max_age_seconds is None else max_age_seconds
+        self.version = 0
+        self.stats = SnapshotStats()
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        # Watch callbacks run on the etcd / Pub/Sub threads.
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        """Return ``(True, value)`` for a fresh entry, ``(False, None)`` otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return False, None
+            if time.monotonic() - entry.loaded_at > self.max_age_seconds:
+                del self._entries[key]
+                self.stats.expired += 1
+                return False, None
+            self.stats.hits += 1
+        return True, entry.read()
+
+    def install(self, key: str, value: Any, version: int) -> bool:  # noqa: ANN401
+        """Cache a value read from the store when ``version`` was current.
+
+        Returns False (and caches nothing) if the snapshot was invalidated or
+        written since, since *value* may predate that change.
+        """
+        entry = _make_entry(value)
+        with self._lock:
+            if version != self.version:
+                return False
+            self._entries[key] = entry
+        return True
+
+    def age(self, key: str) -> float | None:
+        """Seconds since *key* was loaded, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else time.monotonic() - entry.loaded_at
+
+    def snapshot_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **asdict(self.stats),
+                "entries": len(self._entries),
+                "version": self.version,
+                "max_age_seconds": self.max_age_seconds,
+            }
+
+    # MutableMapping: writes and removals count as invalidations.
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        with self._lock:
+            entry = self._entries[key]
+        return entry.read()
+
+    def __setitem__(self, key: str, value: Any) -> None:  # noqa: ANN401
+        entry = _make_entry(value)
+        with self._lock:
+            self.version += 1
+            self._entries[key] = entry
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self.version += 1
+            self.stats.invalidations += 1
+            del self._entries[key]
+
+    def pop(self, key: str, *default: Any) -> Any:  # noqa: ANN401
+        with self._lock:
+            self.version += 1
+            self.stats.invalidations += 1
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        return entry.read()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self.stats.invalidations += 1
+            self._entries.clear()
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
@@ -7,8 +7,8 @@ import time
 from typing import Optional
 
 import dotenv
-from cachetools import LRUCache
 
+from app.config.config_snapshot import ConfigSnapshot
 from app.config.constants.service import (
     KVStoreType,
     RedisDefaults,
@@ -48,9 +48,15 @@ class ConfigurationService:
         )
         self.logger.debug("🔐 Initialized EncryptionService")
 
-        # Initialize LRU cache
-        self.cache = LRUCache(maxsize=1000)
-        self.logger.debug("📦 Initialized LRU cache with max size 1000")
+        # Decrypted snapshot, kept current by the watch / Pub/Sub below
+        self.cache = ConfigSnapshot()
+        self.logger.debug(
+            "📦 Initialized config snapshot (max age %.0fs)", self.cache.max_age_seconds
+        )
+        # Set once the etcd watch or Redis Pub/Sub subscription is live; until
+        # then nothing would invalidate the snapshot, so default reads go to
+        # the store.
+        self._watch_active = False
 
         self.store = key_value_store
 
@@ -76,26 +82,34 @@ class ConfigurationService:
 
         self.logger.debug("✅ ConfigurationService initialized successfully")
 
-    async def get_config(self, key: str, default: str | int | float | bool | dict | list | None = None, use_cache: bool = False) -> str | int | float | bool | dict | list | None:
-        """Get configuration value with LRU cache and environment variable fallback"""
+    async def get_config(self, key: str, default: str | int | float | bool | dict | list | None = None, use_cache: bool | None = None) -> str | int | float | bool | dict | list | None:
+        """Get configuration value from the snapshot, the store, or an environment fallback.
+
+        ``use_cache`` None (the default) serves the snapshot while a watch is
+        keeping it current; True serves it even without one; False always
+        reads the store. Cached reads are never older than the snapshot's
+        ``max_age_seconds``.
+        """
         try:
-            # Check cache first
-            if use_cache and key in self.cache:
-                self.logger.debug("📦 Cache hit for key: %s", key)
-                return self.cache[key]
+            serve_cached = self._watch_active if use_cache is None else use_cache
+            if serve_cached:
+                found, cached = self.cache.lookup(key)
+                if found:
+                    return cached
 
+            version = self.cache.version
             value = await self.store.get_key(key)
             if value is None:
                 # Try environment variable fallback for specific services
                 env_fallback = self._get_env_fallback(key)
                 if env_fallback is not None:
                     self.logger.debug("📦 Using environment variable fallback for key: %s", key)
-                    self.cache[key] = env_fallback
+                    self.cache.install(key, env_fallback, version)
                     return env_fallback
 
                 self.logger.debug("📦 Cache miss for key: %s", key)
                 return default
-            self.cache[key] = value
+            self.cache.install(key, value, version)
             return value
         except Exception as e:
             self.logger.error("❌ Failed to get config %s: %s", key, str(e))
@@ -106,6 +120,10 @@ class ConfigurationService:
                 return env_fallback
             return default
 
+    def snapshot_stats(self) -> dict:
+        """Hit/miss/expiry/invalidation counters and state of the config snapshot."""
+        return {**self.cache.snapshot_stats(), "watch_active": self._watch_active}
+
     def _get_env_fallback(self, key: str) -> dict | None:
         """Get environment variable fallback for specific configuration keys"""
         if key == config_node_constants.KAFKA.value:
@@ -223,6 +241,9 @@ class ConfigurationService:
                 try:
                     watch_id = self.store.client.add_watch_prefix_callback("/", self._etcd_watch_callback)
                     self._etcd_watch_id = watch_id
+                    # Values cached before the watch existed may have missed events.
+                    self.clear_cache()
+                    self._watch_active = True
                     self.logger.debug("👀 etcd prefix watch registered for cache invalidation")
                 except Exception as e:
                     self.logger.error("❌ Failed to register etcd watch: %s", str(e))
@@ -310,6 +331,7 @@ class ConfigurationService:
                 # Clear cache after subscription is active to ensure any values
                 # cached during the startup window are invalidated
                 self.clear_cache()
+                self._watch_active = True
                 self._log_safe("📦 Cache cleared after Pub/Sub subscription established", level="debug")
 
                 # Keep the loop running to process messages
@@ -320,6 +342,7 @@ class ConfigurationService:
                 if not self._stopping:
                     self._log_safe("❌ Failed to setup Redis Pub/Sub: %s" % str(e), level="error")
             finally:
+                self._watch_active = False
                 loop.close()
                 self._pubsub_loop = None
 
@@ -471,6 +494,7 @@ class ConfigurationService:
             return
 
         self._stopping = True
+        self._watch_active = False
 
         try:
             # Cancel the etcd prefix watch if one was registered
@@ -528,8 +552,13 @@ class ConfigurationService:
         """
         try:
             if not hasattr(event, 'events'):
+                # etcd3 hands the callback an exception when the watch breaks;
+                # stop trusting the snapshot until reads go back to the store.
+                self._watch_active = False
+                self.clear_cache()
                 self._log_safe(
-                    "⚠️ etcd watch received non-event object (%s), skipping" % type(event).__name__,
+                    "⚠️ etcd watch received non-event object (%s); serving config from the store"
+                    % type(event).__name__,
                     level="warning",
                 )
                 return
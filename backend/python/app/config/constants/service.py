@@ -29,6 +29,9 @@ class config_node_constants(Enum):
     MIGRATIONS = "/services/migrations"
     DEPLOYMENT = "/services/deployment"
     INHERITANCE = "/services/inheritance"
+    # Text chunking strategy per org/connector, see
+    # `app/modules/transformers/chunking.py`.
+    CHUNKING = "/services/chunking"
 
 
     # Non-service paths
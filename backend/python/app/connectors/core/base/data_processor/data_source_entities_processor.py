@@ -1,3 +1,5 @@
+import contextlib
+import os
 import uuid
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Optional
@@ -43,13 +45,18 @@ from app.models.entities import (
     WebpageRecord,
 )
 from app.models.permission import EntityType, Permission, PermissionType
-from app.services.cache.invalidation_hooks import notify_kb_records_changed
+from app.services.cache.invalidation_hooks import (
+    notify_kb_records_changed,
+    notify_record_permissions_changed,
+)
 from app.services.messaging.messaging_factory import MessagingFactory
 from app.services.messaging.utils import MessagingUtils
 from app.utils.retry import retry_async
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
     from app.services.messaging.interface.producer import IMessagingProducer
 
 ARANGO_NODE_ID_PARTS = 2 # ArangoDB node IDs are in format "collection/id"
@@ -78,6 +85,113 @@ class UserGroupWithMembers:
     user_group: AppUserGroup
     users: list[tuple[AppUser, Permission]]
 
+# Values per IN-list lookup on the bulk record path; keeps each query well under
+# provider parameter limits for sync batches of thousands of records.
+BULK_LOOKUP_CHUNK_SIZE = 1000
+
+
+async def _get_nodes_by_field_in_chunks(
+    tx_store: TransactionStore, collection: str, field: str, values: list
+) -> list[dict]:
+    nodes: list[dict] = []
+    for start in range(0, len(values), BULK_LOOKUP_CHUNK_SIZE):
+        nodes.extend(
+            await tx_store.get_nodes_by_field_in(
+                collection, field, values[start:start + BULK_LOOKUP_CHUNK_SIZE]
+            ) or []
+        )
+    return nodes
+
+
+class _PermissionPrincipals:
+    """Memoized principal lookups for building permission edges.
+
+    ``prefetch`` resolves every user email and group external id of a batch
+    with a few IN-list queries. Anything it leaves unresolved (emails stored
+    with different casing, roles) falls back to the single-entity lookup, once
+    per key instead of once per permission.
+    """
+
+    def __init__(self, tx_store: TransactionStore) -> None:
+        self._tx_store = tx_store
+        self._users: dict[str, Optional[User]] = {}
+        self._user_groups: dict[tuple[str, str], Optional[AppUserGroup]] = {}
+        self._roles: dict[tuple[str, str], Optional[AppRole]] = {}
+
+    async def prefetch(self, records_with_permissions: list[tuple[Record, list[Permission]]]) -> None:
+        emails: set[str] = set()
+        group_ids: dict[str, set[str]] = {}
+        for record, permissions in records_with_permissions:
+            for permission in permissions:
+                if permission.entity_type == EntityType.USER.value and permission.email:
+                    emails.add(permission.email)
+                elif permission.entity_type == EntityType.GROUP.value and permission.external_id:
+                    group_ids.setdefault(record.connector_id, set()).add(permission.external_id)
+
+        if emails:
+            docs = await _get_nodes_by_field_in_chunks(
+                self._tx_store,
+                CollectionNames.USERS.value,
+                "email",
+                sorted(emails | {email.lower() for email in emails}),
+            )
+            by_email = {doc["email"].lower(): doc for doc in docs if doc.get("email")}
+            for email in emails:
+                if email.lower() in by_email:
+                    self._remember(self._users, email, User.from_arango_user, by_email[email.lower()])
+
+        external_ids = sorted(set().union(*group_ids.values())) if group_ids else []
+        if external_ids:
+            docs = await _get_nodes_by_field_in_chunks(
+                self._tx_store, CollectionNames.GROUPS.value, "externalGroupId", external_ids
+            )
+            found = {
+                (doc.get("connectorId"), doc.get("externalGroupId")): doc for doc in docs
+            }
+            # Every requested group is settled here: absent ones are memoized
+            # as None rather than looked up again one by one.
+            for connector_id, ids in group_ids.items():
+                for external_id in ids:
+                    doc = found.get((connector_id, external_id))
+                    if doc is None:
+                        self._user_groups[(connector_id, external_id)] = None
+                    else:
+                        self._remember(
+                            self._user_groups,
+                            (connector_id, external_id),
+                            AppUserGroup.from_arango_base_user_group,
+                            doc,
+                        )
+
+    @staticmethod
+    def _remember(memo: dict, key: "Hashable", parse: "Callable[[dict], Any]", doc: dict) -> None:
+        # A document the model cannot parse is left to the single lookup,
+        # which logs and treats it as missing, instead of failing the batch.
+        with contextlib.suppress(Exception):
+            memo[key] = parse(doc)
+
+    async def user(self, email: str) -> Optional[User]:
+        if email not in self._users:
+            self._users[email] = await self._tx_store.get_user_by_email(email)
+        return self._users[email]
+
+    async def user_group(self, connector_id: str, external_id: str) -> Optional[AppUserGroup]:
+        key = (connector_id, external_id)
+        if key not in self._user_groups:
+            self._user_groups[key] = await self._tx_store.get_user_group_by_external_id(
+                connector_id=connector_id, external_id=external_id
+            )
+        return self._user_groups[key]
+
+    async def role(self, connector_id: str, external_id: str) -> Optional[AppRole]:
+        key = (connector_id, external_id)
+        if key not in self._roles:
+            self._roles[key] = await self._tx_store.get_app_role_by_external_id(
+                external_id=external_id, connector_id=connector_id
+            )
+        return self._roles[key]
+
+
 class DataSourceEntitiesProcessor:
     ATTACHMENT_CONTAINER_TYPES = [
         RecordType.MAIL,
@@ -110,11 +224,33 @@ class DataSourceEntitiesProcessor:
         RecordRelations.FOREIGN_KEY.value,
     ]
 
+    # on_new_records batches at least this large take the set-based path
+    # (_process_records_bulk); 0 turns it off.
+    ENV_BULK_RECORDS_MIN_BATCH = "PIPESHUB_BULK_RECORDS_MIN_BATCH"
+    DEFAULT_BULK_RECORDS_MIN_BATCH = 16
+
+    # Record types that write their own per-type edges (related links, ticket
+    # users, project leads, message mentions) and so keep going through
+    # _process_record one at a time.
+    SEQUENTIAL_RECORD_CLASSES = (
+        TicketRecord,
+        ProjectRecord,
+        SQLTableRecord,
+        SQLViewRecord,
+        MessageRecord,
+    )
+
     def __init__(self, logger, data_store_provider: DataStoreProvider, config_service: ConfigurationService) -> None:
         self.logger = logger
         self.data_store_provider: DataStoreProvider = data_store_provider
         self.config_service: ConfigurationService = config_service
         self.org_id = ""
+        try:
+            self.bulk_records_min_batch = max(
+                int(os.getenv(self.ENV_BULK_RECORDS_MIN_BATCH, self.DEFAULT_BULK_RECORDS_MIN_BATCH)), 0
+            )
+        except ValueError:
+            self.bulk_records_min_batch = self.DEFAULT_BULK_RECORDS_MIN_BATCH
 
     async def initialize(self, org_id: Optional[str] = None) -> None:
         config = await MessagingUtils.create_producer_config_from_service(
@@ -763,81 +899,17 @@ class DataSourceEntitiesProcessor:
 
         await tx_store.batch_upsert_records([record])
 
-    async def _handle_record_permissions(self, record: Record, permissions: list[Permission], tx_store: TransactionStore) -> None:
-        record_permissions = []
-
+    async def _handle_record_permissions(
+        self,
+        record: Record,
+        permissions: list[Permission],
+        tx_store: TransactionStore,
+        principals: Optional["_PermissionPrincipals"] = None,
+    ) -> None:
         try:
-            for permission in permissions:
-                # Permission edges: Entity (User/Group) → Record
-                to_id = record.id
-                to_collection = CollectionNames.RECORDS.value
-                from_id = None
-                from_collection = None
-
-                if permission.entity_type == EntityType.USER.value:
-                    user = None
-                    if permission.email:
-                        user = await tx_store.get_user_by_email(permission.email)
-
-                        # If user doesn't exist (external user), use PEOPLE collection
-                        if not user and permission.email:
-                            self.logger.warning(f"Skipping user/person creation for external user {permission.email}")
-                            # TODO : Handle extenal user/person creation
-                            # person_id = await self._upsert_external_person(permission.email, tx_store)
-                            # if person_id:
-                            #     from_id = person_id
-                            #     from_collection = CollectionNames.PEOPLE.value
-
-                    if user:
-                        from_id = user.id
-                        from_collection = CollectionNames.USERS.value
-
-                elif permission.entity_type == EntityType.GROUP.value:
-                    user_group = None
-                    if permission.external_id:
-                        # Look up group by external_id
-                        user_group = await tx_store.get_user_group_by_external_id(
-                            connector_id=record.connector_id,
-                            external_id=permission.external_id
-                        )
-
-                    if user_group:
-                        from_id = user_group.id
-                        from_collection = CollectionNames.GROUPS.value
-                    else:
-                        self.logger.warning(f"User group with external ID {permission.external_id} not found in database")
-                        continue
-                elif permission.entity_type == EntityType.ROLE.value:
-                    user_role = None
-                    if permission.external_id:
-                        user_role = await tx_store.get_app_role_by_external_id(external_id=permission.external_id, connector_id=record.connector_id)
-                    if user_role:
-                        from_id = user_role.id
-                        from_collection = CollectionNames.ROLES.value
-                    else:
-                        self.logger.warning(f"User role with external ID {permission.external_id} for {record.connector_name} and connector_id {record.connector_id} not found in database")
-                        continue
-                elif permission.entity_type == EntityType.ORG.value:
-                    from_id = self.org_id
-                    from_collection = CollectionNames.ORGS.value
-
-                # elif permission.entity_type == EntityType.DOMAIN.value:
-                #     domain = await tx_store.get_domain_by_external_id(permission.external_id)
-                #     if domain:
-                #         from_id = domain.id
-                #         from_collection = CollectionNames.DOMAINS.value
-
-                # elif permission.entity_type == EntityType.ANYONE.value:
-                #     from_id = None  # Anyone doesn't have an ID
-                #     from_collection = CollectionNames.ANYONE.value
-
-                # elif permission.entity_type == EntityType.ANYONE_WITH_LINK.value:
-                #     from_id = None  # Anyone with link doesn't have an ID
-                #     from_collection = CollectionNames.ANYONE_WITH_LINK.value
-
-                if from_id and from_collection:
-                    record_permissions.append(permission.to_arango_permission(from_id, from_collection, to_id, to_collection))
-
+            record_permissions = await self._build_permission_edges(
+                record, permissions, principals or _PermissionPrincipals(tx_store)
+            )
             if record_permissions:
                 await tx_store.batch_create_edges(
                     record_permissions, collection=CollectionNames.PERMISSION.value
@@ -845,6 +917,80 @@ class DataSourceEntitiesProcessor:
         except Exception as e:
             self.logger.error("Failed to create permission edge: %s", e)
 
+    async def _build_permission_edges(
+        self, record: Record, permissions: list[Permission], principals: "_PermissionPrincipals"
+    ) -> list[dict]:
+        record_permissions = []
+        for permission in permissions:
+            # Permission edges: Entity (User/Group) → Record
+            to_id = record.id
+            to_collection = CollectionNames.RECORDS.value
+            from_id = None
+            from_collection = None
+
+            if permission.entity_type == EntityType.USER.value:
+                user = None
+                if permission.email:
+                    user = await principals.user(permission.email)
+
+                    # If user doesn't exist (external user), use PEOPLE collection
+                    if not user and permission.email:
+                        self.logger.warning(f"Skipping user/person creation for external user {permission.email}")
+                        # TODO : Handle extenal user/person creation
+                        # person_id = await self._upsert_external_person(permission.email, tx_store)
+                        # if person_id:
+                        #     from_id = person_id
+                        #     from_collection = CollectionNames.PEOPLE.value
+
+                if user:
+                    from_id = user.id
+                    from_collection = CollectionNames.USERS.value
+
+            elif permission.entity_type == EntityType.GROUP.value:
+                user_group = None
+                if permission.external_id:
+                    # Look up group by external_id
+                    user_group = await principals.user_group(record.connector_id, permission.external_id)
+
+                if user_group:
+                    from_id = user_group.id
+                    from_collection = CollectionNames.GROUPS.value
+                else:
+                    self.logger.warning(f"User group with external ID {permission.external_id} not found in database")
+                    continue
+            elif permission.entity_type == EntityType.ROLE.value:
+                user_role = None
+                if permission.external_id:
+                    user_role = await principals.role(record.connector_id, permission.external_id)
+                if user_role:
+                    from_id = user_role.id
+                    from_collection = CollectionNames.ROLES.value
+                else:
+                    self.logger.warning(f"User role with external ID {permission.external_id} for {record.connector_name} and connector_id {record.connector_id} not found in database")
+                    continue
+            elif permission.entity_type == EntityType.ORG.value:
+                from_id = self.org_id
+                from_collection = CollectionNames.ORGS.value
+
+            # elif permission.entity_type == EntityType.DOMAIN.value:
+            #     domain = await tx_store.get_domain_by_external_id(permission.external_id)
+            #     if domain:
+            #         from_id = domain.id
+            #         from_collection = CollectionNames.DOMAINS.value
+
+            # elif permission.entity_type == EntityType.ANYONE.value:
+            #     from_id = None  # Anyone doesn't have an ID
+            #     from_collection = CollectionNames.ANYONE.value
+
+            # elif permission.entity_type == EntityType.ANYONE_WITH_LINK.value:
+            #     from_id = None  # Anyone with link doesn't have an ID
+            #     from_collection = CollectionNames.ANYONE_WITH_LINK.value
+
+            if from_id and from_collection:
+                record_permissions.append(permission.to_arango_permission(from_id, from_collection, to_id, to_collection))
+
+        return record_permissions
+
     async def _upsert_external_person(self, email: str, tx_store) -> str | None:
         """
         Upsert person record for external email address.
@@ -947,10 +1093,76 @@ class DataSourceEntitiesProcessor:
 
                 self.logger.debug(f"Successfully updated permissions for record: {record.id}")
 
+            if record.virtual_record_id:
+                await notify_record_permissions_changed(
+                    record.connector_id, self.org_id, [record.virtual_record_id]
+                )
+
         except Exception as e:
             self.logger.error(f"Failed to update permissions for record {record.id}: {e}", exc_info=True)
             raise
 
+    def _merge_with_existing_record(self, record: Record, existing_record: Record) -> None:
+        """Carry the stored record's identity and state onto an incoming re-sync."""
+        record.id = existing_record.id
+        # Connectors that track their own version pass a non-zero value; fill
+        # it in for those that leave it at the default (GitLab, Jira) so the
+        # stored version isn't pinned at 0 forever. Bump only on a real
+        # content change, so a metadata-only refresh doesn't inflate it.
+        # Placeholders are not content versions: stub backfills keep the stored
+        # value, and stub→real is the first genuine record (version 0).
+        if record.version == 0:
+            if record.is_placeholder:
+                record.version = existing_record.version
+            elif existing_record.is_placeholder:
+                record.version = 0
+            else:
+                record.version = existing_record.version + (
+                    1
+                    if record.external_revision_id
+                    != existing_record.external_revision_id
+                    else 0
+                )
+        # Only fall back to the stored weburl when the incoming record
+        # doesn't carry one. Overwriting unconditionally would:
+        #   (a) revert renames / moves where the connector re-saves
+        #       the new URL on every sync, and
+        #   (b) leave a placeholder's empty `weburl=""` in place when
+        #       the real parent record arrives to fill it in.
+        if record.origin != OriginTypes.UPLOAD:
+            if existing_record.indexing_status == ProgressStatus.COMPLETED.value:
+                if record.external_revision_id != existing_record.external_revision_id:
+                    # Real content change on an indexed record: reset so it
+                    # re-queues — unless indexing is manual-only for this
+                    # record, which a content change must not override.
+                    if record.indexing_status != ProgressStatus.AUTO_INDEX_OFF.value:
+                        record.indexing_status = ProgressStatus.NOT_STARTED.value
+                else:
+                    # Unchanged content stays COMPLETED (blocks re-publish
+                    # below). Resetting unconditionally made every full
+                    # re-sync re-embed the entire already-indexed set, and
+                    # clobbered AUTO_INDEX_OFF on manually-indexed records.
+                    record.indexing_status = ProgressStatus.COMPLETED.value
+        elif record.external_revision_id == existing_record.external_revision_id:
+            # KB uploads with unchanged content must keep their indexing status
+            # (folders are created COMPLETED and must not be re-queued on metadata updates).
+            record.indexing_status = existing_record.indexing_status
+        if not record.weburl:
+            record.weburl = existing_record.weburl
+        # Same fall-back rule for source timestamps: connectors whose source
+        # exposes no cheap per-item dates (e.g. git blobs) send None and
+        # backfill them later out-of-band. The Neo4j upsert is `SET n +=`,
+        # where a null-valued key DELETES the stored property — without this
+        # carry-forward every re-sync silently erased the backfilled dates.
+        if record.source_created_at is None:
+            record.source_created_at = existing_record.source_created_at
+        if record.source_updated_at is None:
+            record.source_updated_at = existing_record.source_updated_at
+        # A real record replacing a stub promotes it out of placeholder state.
+        # Set explicitly so we don't depend on batch_upsert overwrite-vs-merge semantics.
+        if existing_record.is_placeholder and not record.is_placeholder:
+            record.is_placeholder = False
+
     async def _process_record(self, record: Record, permissions: list[Permission], tx_store: TransactionStore) -> Record | None:
         self.logger.debug(f"Processing record: {record.record_name} ({record.id})")
         existing_record = await tx_store.get_record_by_external_id(connector_id=record.connector_id,
@@ -973,64 +1185,7 @@ class DataSourceEntitiesProcessor:
             self.logger.debug("New record: %s", record)
             await self._handle_new_record(record, tx_store)
         else:
-            record.id = existing_record.id
-            # Connectors that track their own version pass a non-zero value; fill
-            # it in for those that leave it at the default (GitLab, Jira) so the
-            # stored version isn't pinned at 0 forever. Bump only on a real
-            # content change, so a metadata-only refresh doesn't inflate it.
-            # Placeholders are not content versions: stub backfills keep the stored
-            # value, and stub→real is the first genuine record (version 0).
-            if record.version == 0:
-                if record.is_placeholder:
-                    record.version = existing_record.version
-                elif existing_record.is_placeholder:
-                    record.version = 0
-                else:
-                    record.version = existing_record.version + (
-                        1
-                        if record.external_revision_id
-                        != existing_record.external_revision_id
-                        else 0
-                    )
-            # Only fall back to the stored weburl when the incoming record
-            # doesn't carry one. Overwriting unconditionally would:
-            #   (a) revert renames / moves where the connector re-saves
-            #       the new URL on every sync, and
-            #   (b) leave a placeholder's empty `weburl=""` in place when
-            #       the real parent record arrives to fill it in.
-            if record.origin != OriginTypes.UPLOAD:
-                if existing_record.indexing_status == ProgressStatus.COMPLETED.value:
-                    if record.external_revision_id != existing_record.external_revision_id:
-                        # Real content change on an indexed record: reset so it
-                        # re-queues — unless indexing is manual-only for this
-                        # record, which a content change must not override.
-                        if record.indexing_status != ProgressStatus.AUTO_INDEX_OFF.value:
-                            record.indexing_status = ProgressStatus.NOT_STARTED.value
-                    else:
-                        # Unchanged content stays COMPLETED (blocks re-publish
-                        # below). Resetting unconditionally made every full
-                        # re-sync re-embed the entire already-indexed set, and
-                        # clobbered AUTO_INDEX_OFF on manually-indexed records.
-                        record.indexing_status = ProgressStatus.COMPLETED.value
-            elif record.external_revision_id == existing_record.external_revision_id:
-                # KB uploads with unchanged content must keep their indexing status
-                # (folders are created COMPLETED and must not be re-queued on metadata updates).
-                record.indexing_status = existing_record.indexing_status
-            if not record.weburl:
-                record.weburl = existing_record.weburl
-            # Same fall-back rule for source timestamps: connectors whose source
-            # exposes no cheap per-item dates (e.g. git blobs) send None and
-            # backfill them later out-of-band. The Neo4j upsert is `SET n +=`,
-            # where a null-valued key DELETES the stored property — without this
-            # carry-forward every re-sync silently erased the backfilled dates.
-            if record.source_created_at is None:
-                record.source_created_at = existing_record.source_created_at
-            if record.source_updated_at is None:
-                record.source_updated_at = existing_record.source_updated_at
-            # A real record replacing a stub promotes it out of placeholder state.
-            # Set explicitly so we don't depend on batch_upsert overwrite-vs-merge semantics.
-            if existing_record.is_placeholder and not record.is_placeholder:
-                record.is_placeholder = False
+            self._merge_with_existing_record(record, existing_record)
             #check if revision Id is same as existing record
             if record.external_revision_id != existing_record.external_revision_id:
                 await self._handle_updated_record(record, existing_record, tx_store)
@@ -1086,6 +1241,246 @@ class DataSourceEntitiesProcessor:
 
         return record
 
+    async def _process_records_bulk(
+        self,
+        records_with_permissions: list[tuple[Record, list[Permission]]],
+        tx_store: TransactionStore,
+    ) -> list[Record]:
+        """Set-based ``_process_record`` for a whole sync batch.
+
+        Stored records, parents, record groups and permission principals are
+        resolved with a few IN-list queries, and nodes and edges are written
+        with one batch call per collection, instead of several graph round
+        trips per record. KB uploads, ``SEQUENTIAL_RECORD_CLASSES`` and repeats
+        of an external id already in the batch go through ``_process_record``
+        afterwards, in their original order, so they see the bulk writes.
+
+        Returns the processed records in input order.
+        """
+        bulk: list[tuple[Record, list[Permission]]] = []
+        sequential: list[tuple[Record, list[Permission]]] = []
+        seen: set[tuple[str, str]] = set()
+        for record, permissions in records_with_permissions:
+            key = (record.connector_id, record.external_record_id)
+            if (
+                record.origin == OriginTypes.UPLOAD
+                or isinstance(record, self.SEQUENTIAL_RECORD_CLASSES)
+                or key in seen
+            ):
+                sequential.append((record, permissions))
+                continue
+            seen.add(key)
+            # Same rule as _process_record: an explicit org from the caller wins.
+            if not record.org_id:
+                record.org_id = self.org_id
+            bulk.append((record, permissions))
+
+        if bulk:
+            await self._write_records_bulk(bulk, tx_store)
+        for record, permissions in sequential:
+            await self._process_record(record, permissions, tx_store)
+
+        self.logger.debug(
+            "Processed %d records in bulk and %d one at a time", len(bulk), len(sequential)
+        )
+        return [record for record, _ in records_with_permissions]
+
+    async def _write_records_bulk(
+        self, bulk: list[tuple[Record, list[Permission]]], tx_store: TransactionStore
+    ) -> None:
+        records = [record for record, _ in bulk]
+
+        # Stored versions of the batch's records and of their parents.
+        external_ids: dict[str, set[str]] = {}
+        for record in records:
+            ids = external_ids.setdefault(record.connector_id, set())
+            ids.add(record.external_record_id)
+            if record.parent_external_record_id:
+                ids.add(record.parent_external_record_id)
+        stored: dict[tuple[str, str], Record] = {}
+        for connector_id, ids in external_ids.items():
+            wanted = sorted(ids)
+            for start in range(0, len(wanted), BULK_LOOKUP_CHUNK_SIZE):
+                for stored_record in await tx_store.get_records_by_external_ids(
+                    connector_id, wanted[start:start + BULK_LOOKUP_CHUNK_SIZE]
+                ):
+                    stored[(connector_id, stored_record.external_record_id)] = stored_record
+
+        existing_records: list[Optional[Record]] = []
+        for record in records:
+            existing_record = stored.get((record.connector_id, record.external_record_id))
+            if existing_record is not None:
+                self._merge_with_existing_record(record, existing_record)
+            existing_records.append(existing_record)
+
+        # Parents: a record in this batch wins over the stored one; a parent
+        # that exists nowhere gets one placeholder however many children name it.
+        in_batch = {(record.connector_id, record.external_record_id): record for record in records}
+        placeholders: dict[tuple[str, str], Record] = {}
+        placeholder_parents: dict[str, Record] = {}
+        parent_links: list[tuple[Record, Record]] = []
+        for record in records:
+            if not record.parent_external_record_id:
+                continue
+            key = (record.connector_id, record.parent_external_record_id)
+            parent_record = in_batch.get(key) or placeholders.get(key) or stored.get(key)
+            if parent_record is None and record.parent_record_type:
+                parent_record = self._create_placeholder_parent_record(
+                    parent_external_id=record.parent_external_record_id,
+                    parent_record_type=record.parent_record_type,
+                    record=record,
+                    record_group_type=record.record_group_type,
+                    external_record_group_id=record.external_record_group_id,
+                )
+                placeholders[key] = parent_record
+            elif parent_record is not None and key not in in_batch and key not in placeholders and parent_record.is_placeholder:
+                # Re-anchored to its record group, as in _handle_parent_record.
+                placeholder_parents[parent_record.id] = parent_record
+            if parent_record is not None:
+                parent_links.append((record, parent_record))
+
+        # Record groups, creating the missing ones in one write (before the
+        # records, so record_group_id is part of their first save).
+        grouped = [
+            record
+            for record in (*records, *placeholders.values(), *placeholder_parents.values())
+            if record.external_record_group_id
+        ]
+        wanted_groups = {(record.connector_id, record.external_record_group_id) for record in grouped}
+        wanted_groups.update(
+            (record.connector_id, external_group_id)
+            for record in records
+            for external_group_id in record.shared_with_me_record_group_ids or []
+        )
+        record_groups: dict[tuple[str, str], RecordGroup] = {}
+        if wanted_groups:
+            for doc in await _get_nodes_by_field_in_chunks(
+                tx_store,
+                CollectionNames.RECORD_GROUPS.value,
+                "externalGroupId",
+                sorted({external_id for _, external_id in wanted_groups}),
+            ):
+                key = (doc.get("connectorId"), doc.get("externalGroupId"))
+                if key in wanted_groups:
+                    record_groups[key] = RecordGroup.from_arango_base_record_group(doc)
+        new_record_groups: list[RecordGroup] = []
+        for record in grouped:
+            key = (record.connector_id, record.external_record_group_id)
+            if key not in record_groups:
+                record_groups[key] = RecordGroup(
+                    external_group_id=record.external_record_group_id,
+                    name=record.external_record_group_id,
+                    group_type=record.record_group_type,
+                    connector_name=record.connector_name,
+                    connector_id=record.connector_id,
+                )
+                new_record_groups.append(record_groups[key])
+            record.record_group_id = record_groups[key].id
+        if new_record_groups:
+            await tx_store.batch_upsert_record_groups(new_record_groups)
+
+        # Nodes: new records, records whose content changed, placeholders.
+        records_to_upsert = [
+            record
+            for record, existing_record in zip(records, existing_records)
+            if existing_record is None or record.external_revision_id != existing_record.external_revision_id
+        ]
+        records_to_upsert.extend(placeholders.values())
+        if records_to_upsert:
+            await tx_store.batch_upsert_records(records_to_upsert)
+
+        # Record-group edges, mirroring _link_record_to_group.
+        ts = get_epoch_timestamp_in_ms()
+
+        def group_edge(record_id: str, record_group_id: str) -> dict:
+            return {
+                "from_id": record_id,
+                "from_collection": CollectionNames.RECORDS.value,
+                "to_id": record_group_id,
+                "to_collection": CollectionNames.RECORD_GROUPS.value,
+                "createdAtTimestamp": ts,
+                "updatedAtTimestamp": ts,
+            }
+
+        group_links = [
+            (record, existing_record, record.record_group_id if record.external_record_group_id else None)
+            for record, existing_record in zip(records, existing_records)
+        ]
+        group_links.extend(
+            (record, None, record.record_group_id)
+            for record in (*placeholders.values(), *placeholder_parents.values())
+        )
+        belongs_to: list[dict] = []
+        inherited: list[dict] = []
+        not_inherited: list[dict] = []
+        moved: list[dict] = []
+        for record, existing_record, record_group_id in group_links:
+            if not record_group_id and not record.shared_with_me_record_group_ids:
+                continue
+            if existing_record and existing_record.record_group_id and existing_record.record_group_id != record_group_id:
+                moved.append(group_edge(existing_record.id, existing_record.record_group_id))
+            if record.id and record_group_id:
+                edge = group_edge(record.id, record_group_id)
+                belongs_to.append(edge)
+                (inherited if record.inherit_permissions else not_inherited).append(edge)
+            for external_group_id in record.shared_with_me_record_group_ids or []:
+                shared_with_me_record_group = record_groups.get((record.connector_id, external_group_id))
+                if shared_with_me_record_group:
+                    belongs_to.append(group_edge(record.id, shared_with_me_record_group.id))
+                else:
+                    self.logger.warning(f"Shared with me record group with external ID {external_group_id} not found in database")
+
+        if moved:
+            await tx_store.batch_delete_edges(moved, collection=CollectionNames.BELONGS_TO.value)
+            await tx_store.batch_delete_edges(moved, collection=CollectionNames.INHERIT_PERMISSIONS.value)
+        if not_inherited:
+            await tx_store.batch_delete_edges(not_inherited, collection=CollectionNames.INHERIT_PERMISSIONS.value)
+        if belongs_to:
+            await tx_store.batch_create_edges(belongs_to, collection=CollectionNames.BELONGS_TO.value)
+        if inherited:
+            await tx_store.batch_create_edges(inherited, collection=CollectionNames.INHERIT_PERMISSIONS.value)
+
+        # Parent edges, mirroring _handle_parent_record.
+        for record, existing_record in zip(records, existing_records):
+            if (
+                existing_record
+                and existing_record.parent_external_record_id
+                and record.parent_external_record_id != existing_record.parent_external_record_id
+            ):
+                await tx_store.delete_parent_child_edge_to_record(existing_record.id)
+        relations = []
+        for record, parent_record in parent_links:
+            if (record.record_type == RecordType.FILE and
+                record.parent_record_type in self.ATTACHMENT_CONTAINER_TYPES):
+                relation_type = RecordRelations.ATTACHMENT.value
+            else:
+                relation_type = RecordRelations.PARENT_CHILD.value
+            relations.append({
+                "from_id": parent_record.id,
+                "from_collection": CollectionNames.RECORDS.value,
+                "to_id": record.id,
+                "to_collection": CollectionNames.RECORDS.value,
+                "relationshipType": relation_type,
+                "createdAtTimestamp": ts,
+                "updatedAtTimestamp": ts,
+            })
+        if relations:
+            await tx_store.batch_create_edges(relations, collection=CollectionNames.RECORD_RELATIONS.value)
+
+        # Permission edges; failures are logged, as in _handle_record_permissions.
+        try:
+            principals = _PermissionPrincipals(tx_store)
+            await principals.prefetch(bulk)
+            permission_edges = []
+            for record, permissions in bulk:
+                permission_edges.extend(await self._build_permission_edges(record, permissions, principals))
+            if permission_edges:
+                await tx_store.batch_create_edges(
+                    permission_edges, collection=CollectionNames.PERMISSION.value
+                )
+        except Exception as e:
+            self.logger.error("Failed to create permission edges: %s", e)
+
     async def _mark_queued_after_publish(self, record_ids: list[str]) -> None:
         """
         Promote records to QUEUED once their events are on the topic.
@@ -1119,11 +1514,16 @@ class DataSourceEntitiesProcessor:
             records_to_publish = []
 
             async with self.data_store_provider.transaction() as tx_store:
-                for record, permissions in records_with_permissions:
-                    processed_record = await self._process_record(record, permissions, tx_store)
+                if 0 < self.bulk_records_min_batch <= len(records_with_permissions):
+                    records_to_publish = await self._process_records_bulk(
+                        records_with_permissions, tx_store
+                    )
+                else:
+                    for record, permissions in records_with_permissions:
+                        processed_record = await self._process_record(record, permissions, tx_store)
 
-                    if processed_record:
-                        records_to_publish.append(processed_record)
+                        if processed_record:
+                            records_to_publish.append(processed_record)
 
             publishable: list[Record] = []
             for record in records_to_publish:
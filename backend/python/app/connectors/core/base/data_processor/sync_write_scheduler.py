@@ -0,0 +1,194 @@
+"""Partitioned concurrent writes for connector syncs.
+
+Connectors that sync many users or drives used to set
+``max_concurrent_batches = 1`` so that no two ``on_new_records`` transactions
+ever touched the same records at once. That keeps a large tenant strictly
+serial. ``SyncWriteScheduler`` lets those syncs run side by side instead:
+
+* every write names a partition, the unit that conflicts with itself (a
+  record group or drive). Writes to one partition run one at a time, in the
+  order they were submitted;
+* writes to different partitions run concurrently, at most ``max_parallel``
+  at a time (``PIPESHUB_SYNC_WRITE_PARALLELISM``, default 4);
+* partitions are not perfectly disjoint (a file shared into several users'
+  drives is written from each of them), so a batch that still deadlocks after
+  ``retry_on_deadlock`` has given up is rerun once with every other write
+  drained. Only that batch pays for the conflict.
+
+``write_records`` returns once the batch is committed, so callers that read
+back what they just wrote (placeholder sweeps) keep working unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+from app.connectors.core.base.data_store.graph_data_store import _is_deadlock_error
+from app.telemetry.modules.connector_metrics import (
+    SYNC_RECORDS_WRITTEN,
+    SYNC_WRITE_BATCH_DURATION,
+    SYNC_WRITES_IN_FLIGHT,
+)
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+
+    from app.connectors.core.base.data_processor.data_source_entities_processor import (
+        DataSourceEntitiesProcessor,
+    )
+    from app.models.entities import Record
+    from app.models.permission import Permission
+
+T = TypeVar("T")
+
+ENV_SYNC_WRITE_PARALLELISM = "PIPESHUB_SYNC_WRITE_PARALLELISM"
+DEFAULT_SYNC_WRITE_PARALLELISM = 4
+
+DEFAULT_PARTITION = "_default"
+
+
+def sync_write_parallelism() -> int:
+    """Concurrent partitions a connector sync may write at once."""
+    try:
+        return max(1, int(os.getenv(ENV_SYNC_WRITE_PARALLELISM, DEFAULT_SYNC_WRITE_PARALLELISM)))
+    except ValueError:
+        return DEFAULT_SYNC_WRITE_PARALLELISM
+
+
+def partition_key_for(records_with_permissions: Sequence[tuple[Record, list[Permission]]]) -> str:
+    """Fallback partition for a batch: its first record's record group."""
+    for record, _ in records_with_permissions:
+        group_id = getattr(record, "external_record_group_id", None)
+        if group_id:
+            return group_id
+    return DEFAULT_PARTITION
+
+
+class _ExclusiveGate:
+    """Many shared holders, or one exclusive holder; a waiting exclusive
+    holder stops new shared entries so it cannot starve."""
+
+    def __init__(self) -> None:
+        self._shared = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def shared(self) -> AsyncIterator[None]:
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: not self._exclusive and not self._exclusive_waiting
+            )
+            self._shared += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._shared -= 1
+                self._changed.notify_all()
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        async with self._changed:
+            self._exclusive_waiting += 1
+            try:
+                await self._changed.wait_for(lambda: not self._exclusive and not self._shared)
+            finally:
+                self._exclusive_waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._exclusive = False
+                self._changed.notify_all()
+
+
+class SyncWriteScheduler:
+    """Serializes sync writes per partition and runs partitions concurrently."""
+
+    def __init__(
+        self,
+        connector: object,
+        logger: logging.Logger,
+        max_parallel: int | None = None,
+    ) -> None:
+        # Metric label; connectors pass their ``Connectors`` enum member.
+        self.connector = str(getattr(connector, "value", connector))
+        self.logger = logger
+        self.max_parallel = max_parallel or sync_write_parallelism()
+        self._slots = asyncio.Semaphore(self.max_parallel)
+        self._gate = _ExclusiveGate()
+        # partition -> (lock, number of writes holding or waiting for it)
+        self._partitions: dict[str, tuple[asyncio.Lock, int]] = {}
+        self._in_flight = 0
+
+    async def write_records(
+        self,
+        processor: DataSourceEntitiesProcessor,
+        records_with_permissions: list[tuple[Record, list[Permission]]],
+        partition_key: str | None = None,
+    ) -> None:
+        """``processor.on_new_records`` for one batch, scheduled by ``partition_key``."""
+        if not records_with_permissions:
+            return
+        key = partition_key or partition_key_for(records_with_permissions)
+        await self.run(key, lambda: processor.on_new_records(records_with_permissions))
+        SYNC_RECORDS_WRITTEN.inc(self.connector, value=len(records_with_permissions))
+
+    async def run(self, partition_key: str, write: Callable[[], Awaitable[T]]) -> T:
+        """Run ``write`` (which must be safe to call twice) in ``partition_key``."""
+        async with self._partition(partition_key), self._slots:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                try:
+                    async with self._gate.shared():
+                        self._track(1)
+                        try:
+                            result = await write()
+                        finally:
+                            self._track(-1)
+                except Exception as e:
+                    if not _is_deadlock_error(e):
+                        raise
+                    self.logger.warning(
+                        f"Sync write in partition {partition_key} kept deadlocking; "
+                        f"rerunning it alone: {str(e)[:200]}"
+                    )
+                    async with self._gate.exclusive():
+                        result = await write()
+                    outcome = "conflict"
+                else:
+                    outcome = "ok"
+                return result
+            finally:
+                SYNC_WRITE_BATCH_DURATION.observe(
+                    self.connector, outcome, value=time.perf_counter() - started
+                )
+
+    @asynccontextmanager
+    async def _partition(self, key: str) -> AsyncIterator[None]:
+        lock, users = self._partitions.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._partitions[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._partitions[key]
+            if users <= 1:
+                del self._partitions[key]
+            else:
+                self._partitions[key] = (lock, users - 1)
+
+    def _track(self, delta: int) -> None:
+        self._in_flight += delta
+        SYNC_WRITES_IN_FLIGHT.set(self.connector, value=self._in_flight)
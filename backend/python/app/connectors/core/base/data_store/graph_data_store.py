@@ -147,6 +147,9 @@ class GraphTransactionStore(TransactionStore):
     async def get_record_by_external_id(self, connector_id: str, external_id: str) -> Optional[Record]:
         return await self.graph_provider.get_record_by_external_id(connector_id, external_id, transaction=self.txn)
 
+    async def get_records_by_external_ids(self, connector_id: str, external_ids: list[str]) -> list[Record]:
+        return await self.graph_provider.get_records_by_external_ids(connector_id, external_ids, transaction=self.txn)
+
     async def get_record_by_external_revision_id(self, connector_id: str, external_revision_id: str) -> Optional[Record]:
         return await self.graph_provider.get_record_by_external_revision_id(connector_id, external_revision_id, transaction=self.txn)
 
@@ -16,10 +16,20 @@ DRIVE_PERSONAL_SYNC_FILES_LIST_FIELDS = (
     f"nextPageToken, files({DRIVE_PERSONAL_SYNC_FILE_RESOURCE_FIELDS})"
 )
 
-# Workspace / delegated Drive connector lists include `owners`.
+# permissions.list projection for workspace files and shared drives.
+DRIVE_WORKSPACE_PERMISSION_FIELDS = (
+    "id, displayName, type, role, domain, emailAddress, deleted, permissionDetails"
+)
+
+# Workspace / delegated Drive connector lists include `owners`, and request
+# permissions inline so sync does not call permissions.list per file. Google
+# only inlines them where the user can share the item and never for Shared
+# Drive items; `permissionIds` is always returned, so a short inline list is
+# detectable and those items fall back to batched permissions.list.
 DRIVE_WORKSPACE_SYNC_FILE_RESOURCE_FIELDS = (
     "id, name, mimeType, size, createdTime, modifiedTime, webViewLink, fileExtension, "
-    "headRevisionId, version, shared, owners, md5Checksum, sha1Checksum, sha256Checksum, parents"
+    "headRevisionId, version, shared, owners, md5Checksum, sha1Checksum, sha256Checksum, parents, "
+    f"permissionIds, permissions({DRIVE_WORKSPACE_PERMISSION_FIELDS})"
 )
 
 DRIVE_WORKSPACE_SYNC_FILES_LIST_FIELDS = (
@@ -29,6 +29,10 @@ from app.connectors.core.base.connector.connector_service import BaseConnector
 from app.connectors.core.base.data_processor.data_source_entities_processor import (
     DataSourceEntitiesProcessor,
 )
+from app.connectors.core.base.data_processor.sync_write_scheduler import (
+    DEFAULT_PARTITION,
+    SyncWriteScheduler,
+)
 from app.connectors.core.base.data_store.data_store import DataStoreProvider
 from app.connectors.core.base.sync_point.sync_point import (
     SyncDataPointType,
@@ -63,6 +67,7 @@ from app.connectors.core.registry.filters import (
 from app.connectors.sources.google.common.apps import GoogleDriveTeamApp
 from app.connectors.sources.google.common.drive_file_fields import (
     DRIVE_WORKSPACE_FILE_GET_FIELDS,
+    DRIVE_WORKSPACE_PERMISSION_FIELDS,
     DRIVE_WORKSPACE_SYNC_CHANGES_LIST_FIELDS,
     DRIVE_WORKSPACE_SYNC_FILE_RESOURCE_FIELDS,
     DRIVE_WORKSPACE_SYNC_FILES_LIST_FIELDS,
@@ -267,7 +272,10 @@ class GoogleDriveTeamConnector(BaseConnector):
 
         # Batch processing configuration
         self.batch_size = 100
-        self.max_concurrent_batches = 1 # set to 1 for now to avoid write write conflicts for small number of records
+        # Users sync concurrently; their writes are serialized per drive (the
+        # unit that conflicts with itself) and run in parallel across drives.
+        self.write_scheduler = SyncWriteScheduler(self.connector_name, self.logger)
+        self.max_concurrent_batches = self.write_scheduler.max_parallel
 
         self.sync_filters: FilterCollection = FilterCollection()
         self.indexing_filters: FilterCollection = FilterCollection()
@@ -789,6 +797,143 @@ class GoogleDriveTeamConnector(BaseConnector):
             self.logger.warning(f"Unknown Google Drive permission type '{permission_type}', defaulting to USER")
             return EntityType.USER
 
+    def _collect_permissions(
+        self,
+        permissions_data: List[Dict],
+        resource_id: str,
+        is_drive: bool,
+        permissions: List[Permission],
+        individually_shared_emails: set,
+    ) -> Optional[PermissionType]:
+        """
+        Convert one page of Drive permission resources, appending to ``permissions`` and
+        ``individually_shared_emails``.
+
+        Returns:
+            The permission type of an "anyone with link" grant on the page, if any
+        """
+        anyone_with_link_permission_type: Optional[PermissionType] = None
+
+        for perm_data in permissions_data:
+            try:
+                # Skip deleted permissions for files, but include them for drives
+                if perm_data.get("deleted", False):
+                    continue
+
+                role = perm_data.get("role", "reader")
+                perm_type = perm_data.get("type", "user")
+
+                # Map role and type
+                permission_type = self._map_drive_role_to_permission_type(role)
+                entity_type = self._map_drive_permission_type_to_entity_type(perm_type)
+
+                # Extract email or domain based on permission type
+                email = perm_data.get("emailAddress")
+                perm_data.get("domain")
+                external_id = perm_data.get("id")
+
+                # Create permission object
+                permission = Permission(
+                    email=email if entity_type == EntityType.USER else None,
+                    external_id=email if entity_type == EntityType.GROUP else external_id,
+                    type=permission_type,
+                    entity_type=entity_type
+                )
+                permissions.append(permission)
+
+                # A "file"-type entry means this user was granted access directly on this
+                # item, as opposed to inheriting it via Shared Drive membership ("member").
+                permission_details = perm_data.get("permissionDetails") or []
+                if entity_type == EntityType.USER and email and any(
+                    detail.get("permissionType") == "file" for detail in permission_details
+                ):
+                    individually_shared_emails.add(email)
+
+                # Track "anyone with link" permission type for fallback
+                if entity_type == EntityType.ANYONE:
+                    anyone_with_link_permission_type = permission_type
+
+            except Exception as e:
+                resource_type = "drive" if is_drive else "file"
+                self.logger.error(
+                    f"Error processing permission {perm_data.get('id', 'unknown')} for {resource_type} {resource_id}: {e}",
+                    exc_info=True
+                )
+                continue
+
+        return anyone_with_link_permission_type
+
+    def _finalize_permissions(
+        self,
+        permissions: List[Permission],
+        individually_shared_emails: set,
+        anyone_with_link_permission_type: Optional[PermissionType],
+        user_email: Optional[str],
+    ) -> Tuple[List[Permission], bool, List[str]]:
+        """Apply the "anyone with link" fallback and build the `_fetch_permissions` result."""
+        # If we found an "anyone with link" permission and have a user_email, create a fallback permission
+        if anyone_with_link_permission_type is not None and user_email:
+            # Check if user_email is already in the permissions list
+            user_already_has_permission = any(
+                perm.email == user_email for perm in permissions
+            )
+
+            if not user_already_has_permission:
+                fallback_permission = Permission(
+                    email=user_email,
+                    type=anyone_with_link_permission_type,
+                    entity_type=EntityType.USER
+                )
+                self.logger.info("Anyone with link permission found for file")
+                return ([fallback_permission], True, list(individually_shared_emails))
+
+        return (permissions, False, list(individually_shared_emails))
+
+    def _file_permissions_http_error_result(
+        self,
+        http_error: HttpError,
+        resource_id: str,
+        user_email: Optional[str],
+        permissions: List[Permission],
+    ) -> Tuple[List[Permission], bool, List[str]]:
+        """`_fetch_permissions` result for a file whose permissions.list call failed."""
+        # For files, handle 403 errors with fallback permission
+        if http_error.resp.status == HttpStatusCode.FORBIDDEN.value:
+            error_reason = None
+            try:
+                error_details = http_error.error_details if hasattr(http_error, 'error_details') else []
+                if error_details and isinstance(error_details, list):
+                    for detail in error_details:
+                        if isinstance(detail, dict) and detail.get("reason") == "insufficientFilePermissions":
+                            error_reason = "insufficientFilePermissions"
+                            break
+            except Exception:
+                pass
+
+            # If it's an insufficient permissions error and we have a user_email, create fallback permission
+            if error_reason == "insufficientFilePermissions" and user_email:
+                # Create a fallback permission with READ access for the current user
+                fallback_permission = Permission(
+                    email=user_email,
+                    type=PermissionType.READ,
+                    entity_type=EntityType.USER
+                )
+                self.logger.info(
+                    f"Added single user permission for file {resource_id}: {user_email}"
+                )
+                return ([fallback_permission], True, [])
+            else:
+                self.logger.error(
+                    f"Error fetching permissions for file {resource_id}: {http_error}",
+                    exc_info=True
+                )
+                # Return empty list if no fallback available
+                return (permissions, False, [])
+        else:
+            # For other HttpErrors, log and return empty list
+            self.logger.error(f"Error fetching permissions for file {resource_id}: {http_error}", exc_info=True)
+            return (permissions, False, [])
+
     async def _fetch_permissions(
         self,
         resource_id: str,
@@ -826,7 +971,7 @@ class GoogleDriveTeamConnector(BaseConnector):
                     "pageSize": 100,  # Maximum allowed by Google Drive API
                     "pageToken": page_token,
                     "supportsAllDrives": True,
-                    "fields": "permissions(id, displayName, type, role, domain, emailAddress, deleted, permissionDetails)"
+                    "fields": f"permissions({DRIVE_WORKSPACE_PERMISSION_FIELDS})"
                 }
 
                 # Only use domain admin access for shared drives
@@ -840,52 +985,11 @@ class GoogleDriveTeamConnector(BaseConnector):
                     break
 
                 # Process each permission
-                for perm_data in permissions_data:
-                    try:
-                        # Skip deleted permissions for files, but include them for drives
-                        if perm_data.get("deleted", False):
-                            continue
-
-                        role = perm_data.get("role", "reader")
-                        perm_type = perm_data.get("type", "user")
-
-                        # Map role and type
-                        permission_type = self._map_drive_role_to_permission_type(role)
-                        entity_type = self._map_drive_permission_type_to_entity_type(perm_type)
-
-                        # Extract email or domain based on permission type
-                        email = perm_data.get("emailAddress")
-                        perm_data.get("domain")
-                        external_id = perm_data.get("id")
-
-                        # Create permission object
-                        permission = Permission(
-                            email=email if entity_type == EntityType.USER else None,
-                            external_id=email if entity_type == EntityType.GROUP else external_id,
-                            type=permission_type,
-                            entity_type=entity_type
-                        )
-                        permissions.append(permission)
-
-                        # A "file"-type entry means this user was granted access directly on this
-                        # item, as opposed to inheriting it via Shared Drive membership ("member").
-                        permission_details = perm_data.get("permissionDetails") or []
-                        if entity_type == EntityType.USER and email and any(
-                            detail.get("permissionType") == "file" for detail in permission_details
-                        ):
-                            individually_shared_emails.add(email)
-
-                        # Track "anyone with link" permission type for fallback
-                        if entity_type == EntityType.ANYONE:
-                            anyone_with_link_permission_type = permission_type
-
-                    except Exception as e:
-                        resource_type = "drive" if is_drive else "file"
-                        self.logger.error(
-                            f"Error processing permission {perm_data.get('id', 'unknown')} for {resource_type} {resource_id}: {e}",
-                            exc_info=True
-                        )
-                        continue
+                anyone_on_page = self._collect_permissions(
+                    permissions_data, resource_id, is_drive, permissions, individually_shared_emails
+                )
+                if anyone_on_page is not None:
+                    anyone_with_link_permission_type = anyone_on_page
 
                 # Check for next page
                 page_token = result.get("nextPageToken")
@@ -899,42 +1003,7 @@ class GoogleDriveTeamConnector(BaseConnector):
                     self.logger.error(f"Error fetching permissions for {resource_type} {resource_id}: {http_error}", exc_info=True)
                     raise
 
-                # For files, handle 403 errors with fallback permission
-                if http_error.resp.status == HttpStatusCode.FORBIDDEN.value:
-                    error_reason = None
-                    try:
-                        error_details = http_error.error_details if hasattr(http_error, 'error_details') else []
-                        if error_details and isinstance(error_details, list):
-                            for detail in error_details:
-                                if isinstance(detail, dict) and detail.get("reason") == "insufficientFilePermissions":
-                                    error_reason = "insufficientFilePermissions"
-                                    break
-                    except Exception:
-                        pass
-
-                    # If it's an insufficient permissions error and we have a user_email, create fallback permission
-                    if error_reason == "insufficientFilePermissions" and user_email:
-                        # Create a fallback permission with READ access for the current user
-                        fallback_permission = Permission(
-                            email=user_email,
-                            type=PermissionType.READ,
-                            entity_type=EntityType.USER
-                        )
-                        self.logger.info(
-                            f"Added single user permission for file {resource_id}: {user_email}"
-                        )
-                        return ([fallback_permission], True, [])
-                    else:
-                        self.logger.error(
-                            f"Error fetching permissions for file {resource_id}: {http_error}",
-                            exc_info=True
-                        )
-                        # Return empty list if no fallback available
-                        return (permissions, False, [])
-                else:
-                    # For other HttpErrors, log and return empty list
-                    self.logger.error(f"Error fetching permissions for file {resource_id}: {http_error}", exc_info=True)
-                    return (permissions, False, [])
+                return self._file_permissions_http_error_result(http_error, resource_id, user_email, permissions)
             except Exception as e:
                 resource_type = "drive" if is_drive else "file"
                 if is_drive:
@@ -946,23 +1015,89 @@ class GoogleDriveTeamConnector(BaseConnector):
                     self.logger.error(f"Error fetching permissions for {resource_type} {resource_id}: {e}", exc_info=True)
                     return (permissions, False, [])
 
-        # If we found an "anyone with link" permission and have a user_email, create a fallback permission
-        if anyone_with_link_permission_type is not None and user_email:
-            # Check if user_email is already in the permissions list
-            user_already_has_permission = any(
-                perm.email == user_email for perm in permissions
-            )
+        return self._finalize_permissions(
+            permissions, individually_shared_emails, anyone_with_link_permission_type, user_email
+        )
 
-            if not user_already_has_permission:
-                fallback_permission = Permission(
-                    email=user_email,
-                    type=anyone_with_link_permission_type,
-                    entity_type=EntityType.USER
+    async def _prefetch_file_permissions(
+        self,
+        files: List[dict],
+        user_email: Optional[str],
+        drive_data_source: Optional[GoogleDriveDataSource] = None,
+    ) -> Dict[str, Tuple[List[Permission], bool, List[str]]]:
+        """
+        Resolve `_fetch_permissions` results for a page of listed files without a
+        permissions.list call per file.
+
+        Files whose listing carries their complete permissions inline (``permissions``
+        as long as ``permissionIds``) are converted directly. The rest - Shared Drive
+        items, where Google never inlines permissions, files the user cannot share, and
+        truncated inline lists - are fetched with batched permissions.list calls, up to
+        100 per HTTP request. Files missing from the result (more than one page of
+        permissions, or a failed batch) are left to `_fetch_permissions`.
+
+        Returns:
+            `_fetch_permissions` results keyed by file ID
+        """
+        resolved: Dict[str, Tuple[List[Permission], bool, List[str]]] = {}
+        to_fetch: List[str] = []
+
+        for metadata in files:
+            file_id = metadata.get("id")
+            if not file_id:
+                continue
+            inline = metadata.get("permissions")
+            permission_ids = metadata.get("permissionIds") or []
+            if inline is not None and len(inline) >= len(permission_ids):
+                permissions: List[Permission] = []
+                individually_shared_emails: set[str] = set()
+                anyone_type = self._collect_permissions(
+                    inline, file_id, False, permissions, individually_shared_emails
                 )
-                self.logger.info("Anyone with link permission found for file")
-                return ([fallback_permission], True, list(individually_shared_emails))
+                resolved[file_id] = self._finalize_permissions(
+                    permissions, individually_shared_emails, anyone_type, user_email
+                )
+            else:
+                to_fetch.append(file_id)
 
-        return (permissions, False, list(individually_shared_emails))
+        if not to_fetch:
+            return resolved
+
+        data_source = drive_data_source if drive_data_source else self.drive_data_source
+        try:
+            results = await data_source.permissions_list_batch([
+                {
+                    "fileId": file_id,
+                    "pageSize": 100,
+                    "supportsAllDrives": True,
+                    "fields": f"nextPageToken, permissions({DRIVE_WORKSPACE_PERMISSION_FIELDS})",
+                }
+                for file_id in to_fetch
+            ])
+        except Exception as e:
+            self.logger.warning(f"Batched permissions.list failed, fetching per file: {e}")
+            return resolved
+
+        for file_id, (result, error) in zip(to_fetch, results):
+            if isinstance(error, HttpError):
+                resolved[file_id] = self._file_permissions_http_error_result(error, file_id, user_email, [])
+                continue
+            if error is not None or not isinstance(result, dict) or result.get("nextPageToken"):
+                continue
+            permissions = []
+            individually_shared_emails = set()
+            anyone_type = self._collect_permissions(
+                result.get("permissions", []), file_id, False, permissions, individually_shared_emails
+            )
+            resolved[file_id] = self._finalize_permissions(
+                permissions, individually_shared_emails, anyone_type, user_email
+            )
+
+        self.logger.debug(
+            f"Resolved permissions for {len(resolved)} of {len(files)} listed files "
+            f"({len(files) - len(to_fetch)} inline, {len(to_fetch)} batched)"
+        )
+        return resolved
 
     async def _create_and_sync_shared_drive_record_group(self, drive: Dict) -> None:
         """
@@ -1218,11 +1353,11 @@ class GoogleDriveTeamConnector(BaseConnector):
             tracked_folder_ids=tracked_folder_ids
         ):
             if update.is_deleted:
-                await self._handle_record_updates(update)
+                await self._handle_record_updates(update, partition_key=drive_id)
                 continue
             elif update.is_updated:
                 self.logger.info(f"📝 Record updated: {record.record_name}")
-                await self._handle_record_updates(update)
+                await self._handle_record_updates(update, partition_key=drive_id)
                 continue
             else:
                 batch_records.append((record, perms))
@@ -1234,7 +1369,9 @@ class GoogleDriveTeamConnector(BaseConnector):
                     self.logger.info(
                         f"💾 Processing batch of {len(batch_records)} records from {context_name}"
                     )
-                    await self.data_entities_processor.on_new_records(batch_records)
+                    await self.write_scheduler.write_records(
+                        self.data_entities_processor, batch_records, partition_key=drive_id
+                    )
                     batch_records = []
                     batch_count = 0
                     await asyncio.sleep(0.1)
@@ -1244,7 +1381,8 @@ class GoogleDriveTeamConnector(BaseConnector):
     async def _process_remaining_batch_records(
         self,
         batch_records: List,
-        context_name: str
+        context_name: str,
+        partition_key: Optional[str] = None
     ) -> Tuple[List, int]:
         """
         Process any remaining records in the batch.
@@ -1252,6 +1390,7 @@ class GoogleDriveTeamConnector(BaseConnector):
         Args:
             batch_records: Current batch of records to process
             context_name: Name for logging context (drive name or user email)
+            partition_key: Drive the records belong to, for write scheduling
 
         Returns:
             Tuple of (empty batch_records, zero batch_count)
@@ -1260,7 +1399,9 @@ class GoogleDriveTeamConnector(BaseConnector):
             self.logger.info(
                 f"💾 Processing final batch of {len(batch_records)} records from {context_name}"
             )
-            await self.data_entities_processor.on_new_records(batch_records)
+            await self.write_scheduler.write_records(
+                self.data_entities_processor, batch_records, partition_key=partition_key
+            )
 
         return [], 0
 
@@ -1560,8 +1701,11 @@ class GoogleDriveTeamConnector(BaseConnector):
                 "File %s exited folder-filter scope; deleting record",
                 existing_record.record_name,
             )
-            await self.data_entities_processor.on_record_deleted(
-                record_id=existing_record.id
+            await self.write_scheduler.run(
+                existing_record.external_record_group_id or DEFAULT_PARTITION,
+                lambda: self.data_entities_processor.on_record_deleted(
+                    record_id=existing_record.id
+                ),
             )
 
     def _pending_folder_expansions(self) -> set:
@@ -1640,6 +1784,7 @@ class GoogleDriveTeamConnector(BaseConnector):
         tracked_folder_ids: Optional[set] = None,
         *,
         bypass_folder_filter: bool = False,
+        prefetched_permissions: Optional[Tuple[List[Permission], bool, List[str]]] = None,
     ) -> Optional[RecordUpdate]:
         """
         Process a single Google Drive file and detect changes.
@@ -1654,6 +1799,8 @@ class GoogleDriveTeamConnector(BaseConnector):
             bypass_folder_filter: Skip the folder-scope check. Only the placeholder
                 sweep sets this: the ancestors it backfills are by definition
                 outside the tracked subtree and would otherwise be rejected.
+            prefetched_permissions: The file's `_fetch_permissions` result, already
+                resolved by `_prefetch_file_permissions`; fetched here when None
 
         Returns:
             RecordUpdate object or None if entry should be skipped
@@ -1799,12 +1946,15 @@ class GoogleDriveTeamConnector(BaseConnector):
             try:
                 # Fetch permissions for this file using the provided drive_data_source
                 # If drive_data_source is provided, use it; otherwise fall back to service account
-                new_permissions, is_fallback_permissions, individually_shared_emails = await self._fetch_permissions(
-                    file_id,
-                    is_drive=False,
-                    user_email=user_email,
-                    drive_data_source=drive_data_source
-                )
+                if prefetched_permissions is not None:
+                    new_permissions, is_fallback_permissions, individually_shared_emails = prefetched_permissions
+                else:
+                    new_permissions, is_fallback_permissions, individually_shared_emails = await self._fetch_permissions(
+                        file_id,
+                        is_drive=False,
+                        user_email=user_email,
+                        drive_data_source=drive_data_source
+                    )
 
                 if is_fallback_permissions:
                     permissions_changed = False
@@ -1889,6 +2039,18 @@ class GoogleDriveTeamConnector(BaseConnector):
             bypass_folder_filter: Forwarded to `_process_drive_item`; set only by
                 the placeholder sweep.
         """
+        try:
+            candidates = [
+                f for f in files
+                if (bypass_folder_filter or pass_folder_filter(f, tracked_folder_ids))
+                and self._pass_date_filters(f)
+                and self._pass_extension_filter(f)
+            ]
+            prefetched = await self._prefetch_file_permissions(candidates, user_email, drive_data_source)
+        except Exception as e:
+            self.logger.warning(f"Permission prefetch failed, fetching per file: {e}")
+            prefetched = {}
+
         for file_metadata in files:
             try:
                 record_update = await self._process_drive_item(
@@ -1900,6 +2062,7 @@ class GoogleDriveTeamConnector(BaseConnector):
                     drive_data_source=drive_data_source,
                     tracked_folder_ids=tracked_folder_ids,
                     bypass_folder_filter=bypass_folder_filter,
+                    prefetched_permissions=prefetched.get(file_metadata.get("id")),
                 )
                 if record_update and record_update.record:
                     files_disabled = not self.indexing_filters.is_enabled(IndexingFilterKey.FILES, default=True)
@@ -1914,30 +2077,55 @@ class GoogleDriveTeamConnector(BaseConnector):
                 self.logger.error(f"Error processing item in generator: {e}", exc_info=True)
                 continue
 
-    async def _handle_record_updates(self, record_update: RecordUpdate) -> None:
-        """Handle different types of record updates (new, updated, deleted)."""
+    async def _handle_record_updates(
+        self,
+        record_update: RecordUpdate,
+        partition_key: Optional[str] = None,
+    ) -> None:
+        """Handle different types of record updates (new, updated, deleted).
+
+        Writes go through the write scheduler in ``partition_key`` (the drive
+        being synced, else the record's group) so they never race that
+        drive's batch writes.
+        """
+        processor = self.data_entities_processor
+        record = record_update.record
+        partition = (
+            partition_key
+            or (record.external_record_group_id if record else None)
+            or DEFAULT_PARTITION
+        )
         try:
             if record_update.is_deleted:
-                await self.data_entities_processor.on_record_deleted(
-                    record_id=record_update.external_record_id
+                await self.write_scheduler.run(
+                    partition,
+                    lambda: processor.on_record_deleted(
+                        record_id=record_update.external_record_id
+                    ),
                 )
             elif record_update.is_new:
-                self.logger.info(f"New record detected: {record_update.record.record_name}")
+                self.logger.info(f"New record detected: {record.record_name}")
             elif record_update.is_updated:
                 if record_update.metadata_changed:
-                    self.logger.info(f"Metadata changed for record: {record_update.record.record_name}")
-                    await self.data_entities_processor.on_record_metadata_update(record_update.record)
+                    self.logger.info(f"Metadata changed for record: {record.record_name}")
+                    await self.write_scheduler.run(
+                        partition, lambda: processor.on_record_metadata_update(record)
+                    )
 
                 if record_update.permissions_changed:
-                    self.logger.info(f"Permissions changed for record: {record_update.record.record_name}")
-                    await self.data_entities_processor.on_updated_record_permissions(
-                        record_update.record,
-                        record_update.new_permissions
+                    self.logger.info(f"Permissions changed for record: {record.record_name}")
+                    await self.write_scheduler.run(
+                        partition,
+                        lambda: processor.on_updated_record_permissions(
+                            record, record_update.new_permissions
+                        ),
                     )
 
                 if record_update.content_changed:
-                    self.logger.info(f"Content changed for record: {record_update.record.record_name}")
-                    await self.data_entities_processor.on_record_content_update(record_update.record)
+                    self.logger.info(f"Content changed for record: {record.record_name}")
+                    await self.write_scheduler.run(
+                        partition, lambda: processor.on_record_content_update(record)
+                    )
 
         except Exception as e:
             self.logger.error(f"Error handling record updates: {e}", exc_info=True)
@@ -2057,7 +2245,9 @@ class GoogleDriveTeamConnector(BaseConnector):
             if backfills:
                 # Creates/updates the ancestors and, via _handle_parent_record, materializes
                 # the next level's parent stubs so we can pick them up below.
-                await self.data_entities_processor.on_new_records(backfills)
+                await self.write_scheduler.write_records(
+                    self.data_entities_processor, backfills, partition_key=drive_id
+                )
 
             next_frontier: List[Record] = []
             for record, _permissions in backfills:
@@ -2296,7 +2486,7 @@ class GoogleDriveTeamConnector(BaseConnector):
 
             # Process remaining records
             batch_records, batch_count = await self._process_remaining_batch_records(
-                batch_records, f"user {user.email}"
+                batch_records, f"user {user.email}", partition_key=drive_id
             )
 
             # Save start page token to sync point after initial sync
@@ -2404,7 +2594,7 @@ class GoogleDriveTeamConnector(BaseConnector):
 
             # Process remaining records
             batch_records, batch_count = await self._process_remaining_batch_records(
-                batch_records, f"user {user.email}"
+                batch_records, f"user {user.email}", partition_key=drive_id
             )
 
             # Update sync point with latest page token
@@ -2580,7 +2770,8 @@ class GoogleDriveTeamConnector(BaseConnector):
 
                             # Process remaining records
                             batch_records, batch_count = await self._process_remaining_batch_records(
-                                batch_records, f"drive '{drive_name}' for user {user.email}"
+                                batch_records, f"drive '{drive_name}' for user {user.email}",
+                                partition_key=drive_id
                             )
 
                             # Save start page token to sync point after initial sync
@@ -2656,7 +2847,9 @@ class GoogleDriveTeamConnector(BaseConnector):
                                                     permissions_changed=False,
                                                     external_record_id=file_id
                                                 )
-                                                await self._handle_record_updates(deleted_update)
+                                                await self._handle_record_updates(
+                                                    deleted_update, partition_key=drive_id
+                                                )
                                             continue
 
                                         if file_metadata:
@@ -2715,7 +2908,8 @@ class GoogleDriveTeamConnector(BaseConnector):
 
                             # Process remaining records
                             batch_records, batch_count = await self._process_remaining_batch_records(
-                                batch_records, f"drive '{drive_name}' for user {user.email}"
+                                batch_records, f"drive '{drive_name}' for user {user.email}",
+                                partition_key=drive_id
                             )
 
                             # Update sync point with latest page token
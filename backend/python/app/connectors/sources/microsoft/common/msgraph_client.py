@@ -1,8 +1,8 @@
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from logging import Logger
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from aiolimiter import AsyncLimiter
 from kiota_abstractions.base_request_configuration import RequestConfiguration
@@ -18,9 +18,16 @@ from msgraph.generated.models.drive import Drive
 from msgraph.generated.models.drive_item import DriveItem
 from msgraph.generated.models.group import Group
 from msgraph.generated.models.o_data_errors.o_data_error import ODataError
+from msgraph.generated.models.permission_collection_response import (
+    PermissionCollectionResponse,
+)
 from msgraph.generated.models.search_response import SearchResponse
 from msgraph.generated.users.users_request_builder import UsersRequestBuilder
 
+from app.connectors.sources.microsoft.common.msgraph_batch import (
+    BatchSubRequest,
+    GraphBatcher,
+)
 from app.models.entities import AppUser, FileRecord
 from app.models.permission import Permission, PermissionType
 
@@ -64,6 +71,13 @@ class RecordUpdate:
     new_permissions: Optional[List[Permission]] = None
     external_record_id: Optional[str] = None
 
+@dataclass
+class DriveItemDetails:
+    """Per-item data fetched alongside a delta page: the download URL and the
+    raw Graph permissions (as returned by ``get_file_permission``)."""
+    download_url: Optional[str] = None
+    permissions: List[Any] = field(default_factory=list)
+
 @dataclass
 class DeltaGetResponse(BaseDeltaFunctionResponse, Parsable):
     # The value property
@@ -144,6 +158,7 @@ class MSGraphClient:
         self.logger = logger
         self.rate_limiter = AsyncLimiter(max_requests_per_second, 1)
         self.connector_id = connector_id
+        self.batcher = GraphBatcher(client.request_adapter, self.rate_limiter, logger)
 
     async def get_all_user_groups(self) -> List[dict]:
         """
@@ -517,6 +532,71 @@ class MSGraphClient:
             self.logger.error(f"Unexpected error fetching file permissions for File ID {item_id}: {ex}")
             return []
 
+    async def get_drive_items_details(
+        self,
+        drive_id: str,
+        item_ids: Iterable[str],
+        download_url_ids: Iterable[str] = (),
+    ) -> Dict[str, DriveItemDetails]:
+        """
+        Fetch permissions for ``item_ids`` (and download URLs for
+        ``download_url_ids``) of one drive through ``$batch``: one HTTP call
+        per 20 sub-requests instead of one per item.
+
+        Failed sub-requests behave like their per-item counterparts
+        (``get_file_permission`` / ``get_signed_url``): empty permissions, no
+        URL. Permission lists with more than one page are completed with
+        ``get_file_permission``.
+
+        Args:
+            drive_id: The drive containing the items
+            item_ids: Items to fetch permissions for
+            download_url_ids: Items (files) to also fetch a download URL for
+
+        Returns:
+            DriveItemDetails keyed by item ID, for every ID in ``item_ids``
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        wanted = set(item_ids)
+        download_url_ids = [i for i in dict.fromkeys(download_url_ids) if i in wanted]
+        base = f"/drives/{drive_id}/items"
+        requests = [BatchSubRequest(id=f"perm:{i}", url=f"{base}/{i}/permissions") for i in item_ids]
+        requests += [BatchSubRequest(id=f"item:{i}", url=f"{base}/{i}") for i in download_url_ids]
+
+        responses = await self.batcher.execute(requests)
+
+        details: Dict[str, DriveItemDetails] = {}
+        for item_id in item_ids:
+            item_details = DriveItemDetails()
+            perm_response = responses[f"perm:{item_id}"]
+            if not perm_response.ok:
+                self.logger.error(
+                    f"Error fetching file permissions for File ID {item_id}: "
+                    f"{perm_response.error_message}"
+                )
+            elif isinstance(perm_response.body, dict) and perm_response.body.get("@odata.nextLink"):
+                item_details.permissions = await self.get_file_permission(drive_id, item_id)
+            else:
+                parsed = perm_response.parse(PermissionCollectionResponse)
+                item_details.permissions = list(parsed.value or []) if parsed else []
+
+            item_response = responses.get(f"item:{item_id}")
+            if item_response is not None:
+                if item_response.ok and isinstance(item_response.body, dict):
+                    item_details.download_url = item_response.body.get("@microsoft.graph.downloadUrl")
+                else:
+                    self.logger.error(
+                        f"Error creating signed URL for item {item_id} in drive {drive_id}: "
+                        f"{item_response.error_message}"
+                    )
+            details[item_id] = item_details
+
+        self.logger.info(
+            f"Retrieved details for {len(details)} items of drive {drive_id} "
+            f"in {len(requests)} batched requests"
+        )
+        return details
+
     async def list_folder_children(self, drive_id: str, folder_id: str) -> List[DriveItem]:
         """
         List all children of a folder.
@@ -54,6 +54,7 @@ from app.connectors.core.registry.filters import (
 )
 from app.connectors.sources.microsoft.common.apps import OneDriveApp
 from app.connectors.sources.microsoft.common.msgraph_client import (
+    DriveItemDetails,
     MSGraphClient,
     RecordUpdate,
     map_msgraph_role_to_permission_type,
@@ -270,10 +271,17 @@ class OneDriveConnector(BaseConnector):
         self.msgraph_client = MSGraphClient(self.connector_name, self.connector_id, self.client, self.logger)
         return True
 
-    async def _process_delta_item(self, item: DriveItem) -> Optional[RecordUpdate]:
+    async def _process_delta_item(
+        self, item: DriveItem, details: Optional[DriveItemDetails] = None
+    ) -> Optional[RecordUpdate]:
         """
         Process a single delta item and detect changes.
 
+        Args:
+            item: The delta item
+            details: Permissions and download URL prefetched for the item;
+                fetched per item when not given
+
         Returns:
             RecordUpdate object containing the record and change information
         """
@@ -343,7 +351,9 @@ class OneDriveConnector(BaseConnector):
 
             # Create/update file record
             signed_url = None
-            if item.file is not None:
+            if details is not None:
+                signed_url = details.download_url
+            elif item.file is not None:
                 signed_url = await self.msgraph_client.get_signed_url(
                     item.parent_reference.drive_id,
                     item.id,
@@ -388,10 +398,13 @@ class OneDriveConnector(BaseConnector):
                 return None
 
             # Get current permissions
-            permission_result = await self.msgraph_client.get_file_permission(
-                item.parent_reference.drive_id if item.parent_reference else None,
-                item.id
-            )
+            if details is not None:
+                permission_result = details.permissions
+            else:
+                permission_result = await self.msgraph_client.get_file_permission(
+                    item.parent_reference.drive_id if item.parent_reference else None,
+                    item.id
+                )
 
             new_permissions = await self._convert_to_permissions(permission_result)
 
@@ -624,9 +637,10 @@ class OneDriveConnector(BaseConnector):
         Yields:
             Tuple of (FileRecord, List[Permission], RecordUpdate)
         """
+        prefetched = await self._prefetch_delta_item_details(delta_items)
         for item in delta_items:
             try:
-                record_update = await self._process_delta_item(item)
+                record_update = await self._process_delta_item(item, prefetched.get(item.id))
 
                 if record_update:
                     if record_update.is_deleted:
@@ -649,6 +663,36 @@ class OneDriveConnector(BaseConnector):
                 self.logger.error(f"❌ Error processing item in generator: {e}", exc_info=True)
                 continue
 
+    async def _prefetch_delta_item_details(self, delta_items: List[DriveItem]) -> Dict[str, DriveItemDetails]:
+        """
+        Batch-fetch permissions and download URLs for the items of a delta page
+        that ``_process_delta_item`` will keep, one ``$batch`` call per 20
+        sub-requests. Items missing from the result (or every item, if the
+        batch fails) are fetched per item as before.
+        """
+        by_drive: Dict[str, List[DriveItem]] = {}
+        for item in delta_items:
+            try:
+                if getattr(item, 'deleted', None) is not None or not item.parent_reference:
+                    continue
+                if not self._pass_date_filters(item) or not self._pass_extension_filter(item):
+                    continue
+                by_drive.setdefault(item.parent_reference.drive_id, []).append(item)
+            except Exception:
+                continue
+
+        prefetched: Dict[str, DriveItemDetails] = {}
+        for drive_id, items in by_drive.items():
+            try:
+                prefetched.update(await self.msgraph_client.get_drive_items_details(
+                    drive_id,
+                    [item.id for item in items],
+                    download_url_ids=[item.id for item in items if item.file is not None],
+                ))
+            except Exception as e:
+                self.logger.warning(f"Batched fetch of item details for drive {drive_id} failed, fetching per item: {e}")
+        return prefetched
+
     async def _update_folder_children_permissions(
         self,
         drive_id: str,
@@ -667,13 +711,24 @@ class OneDriveConnector(BaseConnector):
             # Get all children of this folder
             children = await self.msgraph_client.list_folder_children(drive_id, folder_id)
 
+            try:
+                children_details = await self.msgraph_client.get_drive_items_details(
+                    drive_id, [child.id for child in children]
+                ) if children else {}
+            except Exception as e:
+                self.logger.warning(f"Batched permission fetch for children of {folder_id} failed, fetching per item: {e}")
+                children_details = {}
+
             for child in children:
                 try:
                     # Get the child's current permissions
-                    child_permissions = await self.msgraph_client.get_file_permission(
-                        drive_id,
-                        child.id
-                    )
+                    if child.id in children_details:
+                        child_permissions = children_details[child.id].permissions
+                    else:
+                        child_permissions = await self.msgraph_client.get_file_permission(
+                            drive_id,
+                            child.id
+                        )
 
                     # Convert to our permission model
                     converted_permissions = await self._convert_to_permissions(child_permissions)
@@ -5,9 +5,13 @@ from collections.abc import AsyncGenerator
 from datetime import datetime, timezone
 from logging import Logger
 
+from aiolimiter import AsyncLimiter
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from msgraph.generated.models.attachment import Attachment  # type: ignore
+from msgraph.generated.models.attachment_collection_response import (
+    AttachmentCollectionResponse,  # type: ignore
+)
 from msgraph.generated.models.conversation_thread import (
     ConversationThread,  # type: ignore
 )
@@ -74,6 +78,10 @@ from app.connectors.sources.microsoft.common.apps import OutlookApp
 from app.connectors.sources.microsoft.common.content_type_utils import (
     attachment_metadata_from_graph,
 )
+from app.connectors.sources.microsoft.common.msgraph_batch import (
+    BatchSubRequest,
+    GraphBatcher,
+)
 from app.connectors.sources.microsoft.common.msgraph_client import RecordUpdate
 from app.connectors.sources.microsoft.common.outlook_constants import (
     MessagesDeltaResult,
@@ -281,6 +289,8 @@ class OutlookConnector(BaseConnector):
         self.external_users_client: UsersGroupsDataSource | None = None
         self.credentials: OutlookCredentials | None = None
         self.connector_id = connector_id
+        # Paces the $batch calls that list group post attachments
+        self._graph_batch_limiter = AsyncLimiter(10, 1)
 
         # User cache for performance optimization
         self._user_cache: dict[str, str] = {}  # email -> source_user_id mapping
@@ -1146,6 +1156,13 @@ class OutlookConnector(BaseConnector):
 
             self.logger.debug(f"Processing {len(posts_to_process)} new posts out of {len(all_posts)} total")
 
+            # One $batch call lists attachments for up to 20 posts
+            attachments_by_post = await self._get_group_posts_attachments(
+                group_id,
+                thread_id,
+                [post.id for post in posts_to_process if post.has_attachments and post.id],
+            )
+
             # Process each new post as a MailRecord
             batch_records = []
             for post in posts_to_process:
@@ -1161,6 +1178,7 @@ class OutlookConnector(BaseConnector):
                             attachment_updates = await self._process_group_post_attachments(
                                 org_id, group, thread, post, permissions,
                                 parent_post_record_id=record_update.record.id,
+                                attachments=attachments_by_post.get(post.id),
                             )
                             if attachment_updates:
                                 batch_records.extend(attachment_updates)
@@ -1319,12 +1337,15 @@ class OutlookConnector(BaseConnector):
         post: Post,
         post_permissions: list[Permission],
         parent_post_record_id: str,
+        attachments: list[Attachment] | None = None,
     ) -> list[tuple[Record, list[Permission]]]:
         """Process attachments for a group post.
 
         Args:
             thread: Pydantic ConversationThread object
             post: Pydantic Post object
+            attachments: The post's attachments if already fetched
+                (``_get_group_posts_attachments``); listed here otherwise
         """
         try:
             group_id = group.source_user_group_id
@@ -1336,7 +1357,8 @@ class OutlookConnector(BaseConnector):
                 self.logger.warning(f"No thread_id for post {post_id}")
                 return []
 
-            attachments = await self._get_group_post_attachments(group_id, thread_id, post_id)
+            if attachments is None:
+                attachments = await self._get_group_post_attachments(group_id, thread_id, post_id)
 
             if not attachments:
                 return []
@@ -1402,6 +1424,51 @@ class OutlookConnector(BaseConnector):
             self.logger.error(f"Error processing attachments for post: {e}")
             return []
 
+    async def _get_group_posts_attachments(
+        self, group_id: str, thread_id: str, post_ids: list[str]
+    ) -> dict[str, list[Attachment]]:
+        """Get attachments for several posts of one thread through Graph ``$batch``.
+
+        One HTTP call per 20 posts instead of one per post. Posts whose
+        sub-request failed (or the whole batch, if it could not be sent) are
+        listed one by one with ``_get_group_post_attachments``.
+
+        Returns:
+            Pydantic Attachment lists keyed by post id, for every id in ``post_ids``
+        """
+        if not post_ids:
+            return {}
+
+        base = f"/groups/{group_id}/threads/{thread_id}/posts"
+        requests = [
+            BatchSubRequest(id=str(index), url=f"{base}/{post_id}/attachments")
+            for index, post_id in enumerate(post_ids)
+        ]
+        try:
+            batcher = GraphBatcher(
+                self.external_client.get_client().get_ms_graph_service_client().request_adapter,
+                self._graph_batch_limiter,
+                self.logger,
+            )
+            responses = await batcher.execute(requests)
+        except Exception as e:
+            self.logger.warning(f"Batched attachment listing failed for thread {thread_id}, listing per post: {e}")
+            responses = {}
+
+        attachments: dict[str, list[Attachment]] = {}
+        for request, post_id in zip(requests, post_ids):
+            response = responses.get(request.id)
+            if response is not None and response.ok:
+                parsed = response.parse(AttachmentCollectionResponse)
+                attachments[post_id] = list(parsed.value or []) if parsed else []
+            else:
+                if response is not None:
+                    self.logger.warning(
+                        f"Batched attachment listing failed for post {post_id}: {response.error_message}"
+                    )
+                attachments[post_id] = await self._get_group_post_attachments(group_id, thread_id, post_id)
+        return attachments
+
     async def _get_group_post_attachments(self, group_id: str, thread_id: str, post_id: str) -> list[Attachment]:
         """Get attachments for a group post.
 
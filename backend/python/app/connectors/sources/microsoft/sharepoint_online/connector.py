@@ -82,6 +82,7 @@ from app.connectors.core.registry.filters import (
 )
 from app.connectors.sources.microsoft.common.apps import SharePointOnlineApp
 from app.connectors.sources.microsoft.common.msgraph_client import (
+    DriveItemDetails,
     MSGraphClient,
     RecordUpdate,
     map_msgraph_role_to_permission_type,
@@ -1267,9 +1268,10 @@ class SharePointConnector(BaseConnector):
                 if not drive_items:
                     break
 
+                prefetched = await self._prefetch_drive_item_details(drive_id, drive_items)
                 for item in drive_items:
                     try:
-                        record_update = await self._process_drive_item(item, site_id, drive_id, users, modified_after=modified_after, modified_before=modified_before, created_after=created_after, created_before=created_before)
+                        record_update = await self._process_drive_item(item, site_id, drive_id, users, modified_after=modified_after, modified_before=modified_before, created_after=created_after, created_before=created_before, details=prefetched.get(getattr(item, 'id', None)))
                         if record_update:
                             if record_update.is_deleted:
                                 yield (None, [], record_update)
@@ -1316,9 +1318,41 @@ class SharePointConnector(BaseConnector):
             except Exception as clear_error:
                 self.logger.error(f"Failed to clear sync point: {clear_error}")
 
-    async def _process_drive_item(self, item: DriveItem, site_id: str, drive_id: str, users: List[AppUser], modified_after: Optional[str] = None, modified_before: Optional[str] = None, created_after: Optional[str] = None, created_before: Optional[str] = None) -> Optional[RecordUpdate]:
+    async def _prefetch_drive_item_details(self, drive_id: str, drive_items: List[DriveItem]) -> Dict[str, DriveItemDetails]:
+        """
+        Batch-fetch permissions and download URLs for the items of a delta page
+        that will become records, instead of two Graph calls per item. Items
+        left out (or all of them, if the batch fails) are fetched per item.
+        """
+        item_ids: List[str] = []
+        file_ids: List[str] = []
+        for item in drive_items:
+            try:
+                item_id = getattr(item, 'id', None)
+                if not item_id or getattr(item, 'deleted', None) is not None:
+                    continue
+                if not self._pass_drive_date_filters(item) or not self._pass_extension_filter(item):
+                    continue
+                item_ids.append(item_id)
+                if hasattr(item, 'folder') and item.folder is None:
+                    file_ids.append(item_id)
+            except Exception:
+                continue
+
+        if not item_ids:
+            return {}
+        try:
+            return await self.msgraph_client.get_drive_items_details(drive_id, item_ids, download_url_ids=file_ids)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Batched fetch of item details for drive {drive_id} failed, fetching per item: {e}")
+            return {}
+
+    async def _process_drive_item(self, item: DriveItem, site_id: str, drive_id: str, users: List[AppUser], modified_after: Optional[str] = None, modified_before: Optional[str] = None, created_after: Optional[str] = None, created_before: Optional[str] = None, details: Optional[DriveItemDetails] = None) -> Optional[RecordUpdate]:
         """
         Process a single drive item from SharePoint.
+
+        ``details`` carries the item's prefetched permissions and download URL;
+        without it both are fetched here.
         """
         try:
             item_name = getattr(item, 'name', 'Unknown Item')
@@ -1385,12 +1419,15 @@ class SharePointConnector(BaseConnector):
                         is_updated = True
 
             # Create file record
-            file_record = await self._create_file_record(item, drive_id, existing_record)
+            file_record = await self._create_file_record(item, drive_id, existing_record, details=details)
             if not file_record:
                 return None
 
             # Get permissions currently fetching permissions via site record group
-            permissions = await self._get_item_permissions(site_id, drive_id, item_id)
+            if details is not None:
+                permissions = await self._convert_to_permissions(details.permissions)
+            else:
+                permissions = await self._get_item_permissions(site_id, drive_id, item_id)
 
             # Todo: Get permissions for the record
             # for user in users:
@@ -1416,7 +1453,7 @@ class SharePointConnector(BaseConnector):
             self.logger.error(f"❌ Error processing drive item '{item_name}': {e}")
             return None
 
-    async def _create_file_record(self, item: DriveItem, drive_id: str, existing_record: Optional[Record]) -> Optional[FileRecord]:
+    async def _create_file_record(self, item: DriveItem, drive_id: str, existing_record: Optional[Record], details: Optional[DriveItemDetails] = None) -> Optional[FileRecord]:
         """
         Create a FileRecord from a DriveItem with comprehensive data extraction.
         """
@@ -1470,7 +1507,9 @@ class SharePointConnector(BaseConnector):
 
             # Get download URL for files
             signed_url = None
-            if is_file:
+            if details is not None:
+                signed_url = details.download_url
+            elif is_file:
                 try:
                     signed_url = await self.msgraph_client.get_signed_url(drive_id, item_id)
                 except Exception:
@@ -46,6 +46,12 @@ from app.services.messaging.config import ConsumerType, MessageBrokerType, Topic
 from app.services.messaging.kafka.utils.utils import KafkaUtils
 from app.services.messaging.messaging_factory import MessagingFactory
 from app.services.messaging.utils import MessagingUtils
+from app.sources.client.http.connection_pool import close_shared_pools
+from app.sources.client.http.rate_limiter import (
+    RedisRateLimitStore,
+    configure_shared_store,
+    get_rate_limiter,
+)
 from app.telemetry.modules.connector_metrics import set_connector_active
 from app.telemetry.setup import setup_telemetry
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
@@ -437,6 +443,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"❌ Failed to register accessible-records invalidator: {e}")
 
+    # Connector API budgets learnt from response headers are paced across pods.
+    try:
+        configure_shared_store(
+            await RedisRateLimitStore.create(logger, app_container.config_service())
+        )
+    except Exception as e:
+        logger.warning(f"❌ Failed to share connector rate limits: {e}")
+
     try:
         await telemetry.bind(app_container.config_service(), logger).start()
     except Exception as e:
@@ -541,6 +555,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             logger.info("✅ Accessible-records cache closed")
     except Exception as e:
         logger.error(f"❌ Error closing accessible-records cache: {e}")
+    try:
+        await close_shared_pools()
+    except Exception as e:
+        logger.error(f"❌ Error closing shared HTTP connection pools: {e}")
+    try:
+        rate_limit_store = get_rate_limiter().shared_store
+        configure_shared_store(None)
+        if rate_limit_store is not None:
+            await rate_limit_store.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing connector rate-limit store: {e}")
     # Shutdown all container resources
     try:
         await shutdown_container_resources(app_container)
@@ -71,6 +71,14 @@ class IndexingAppContainer(BaseAppContainer):
         logger=logger,
     )
 
+    # Reuses vectors for chunk text already embedded with the same model;
+    # embeds everything when the backend is unavailable or switched off.
+    embedding_cache = providers.Resource(
+        container_utils.create_embedding_cache,
+        logger=logger,
+        config_service=config_service,
+    )
+
     vector_store = providers.Resource(
         container_utils.create_vector_store,
         logger=logger,
@@ -78,6 +86,7 @@ class IndexingAppContainer(BaseAppContainer):
         config_service=config_service,
         vector_db_service=vector_db_service,
         collection_name=VECTOR_DB_COLLECTION_NAME,
+        embedding_cache=embedding_cache,
     )
 
     sink_orchestrator = providers.Resource(
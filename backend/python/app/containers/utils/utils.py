@@ -41,6 +41,7 @@ if TYPE_CHECKING:
         AccessibleRecordsCache,
         AccessibleRecordsInvalidator,
     )
+    from app.services.cache.embedding_cache import EmbeddingCache
 
 
 # Note - Cannot make this a singleton as it is used in the container and DI does not work with static methods
@@ -111,9 +112,19 @@ class ContainerUtils:
         )
         return pipeline
 
-    async def create_vector_store(self, logger, graph_provider, config_service, vector_db_service, collection_name) -> VectorStore:
+    async def create_embedding_cache(
+        self,
+        logger: Logger,
+        config_service: ConfigurationService,
+    ) -> "EmbeddingCache":
+        """Async factory for the content-addressed embedding cache (never raises)."""
+        from app.services.cache.embedding_cache import EmbeddingCache
+
+        return await EmbeddingCache.create(logger, config_service)
+
+    async def create_vector_store(self, logger, graph_provider, config_service, vector_db_service, collection_name, embedding_cache=None) -> VectorStore:
         """Async factory for VectorStore"""
-        vector_store = VectorStore(logger, config_service, graph_provider, collection_name, vector_db_service)
+        vector_store = VectorStore(logger, config_service, graph_provider, collection_name, vector_db_service, embedding_cache)
         return vector_store
 
     async def create_graphdb(self, graph_provider, logger) -> GraphDBTransformer:
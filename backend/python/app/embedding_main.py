@@ -11,17 +11,18 @@ import app.utils.runtime_threads  # noqa: E402 - must precede all ML library imp
 import asyncio
 import base64
 import os
-import struct
 import threading
 import time
-from collections.abc import AsyncGenerator
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import uvicorn
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from app.config.configuration_service import ConfigurationService
@@ -31,9 +32,21 @@ from app.config.constants.ai_models import (
 )
 from app.config.providers.encrypted_store import EncryptedKeyValueStore
 from app.telemetry.setup import setup_telemetry
+from app.utils.embedding_wire_format import (
+    BINARY_CONTENT_TYPE,
+    BINARY_DTYPES,
+    HEADER_COUNT,
+    HEADER_DIMENSIONS,
+    HEADER_DTYPE,
+    HEADER_PROMPT_TOKENS,
+    encode_matrix,
+)
 from app.utils.logger import create_logger
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator, Callable
+
 logger = create_logger("embedding_service")
 
 DEFAULT_DEVICE = os.getenv("EMBEDDING_SERVER_DEVICE", "cpu")
@@ -53,6 +66,19 @@ if MAX_CONCURRENT_EMBEDDINGS < 1:
         f"EMBEDDING_SERVER_MAX_CONCURRENCY must be at least 1, got {MAX_CONCURRENT_EMBEDDINGS}"
     )
 
+# Cross-request batching: inputs arriving within this window of the oldest
+# pending request share one forward pass. 0 disables the wait (requests are
+# still coalesced while every encode slot is busy).
+BATCH_MAX_WAIT_SECONDS = max(
+    0.0, float(os.getenv("EMBEDDING_SERVER_BATCH_WAIT_MS", "5")) / 1000
+)
+# Upper bound on texts per coalesced encode. A single request larger than this
+# is encoded on its own rather than split.
+BATCH_MAX_TEXTS = max(1, int(os.getenv("EMBEDDING_SERVER_BATCH_MAX_TEXTS", "256")))
+# Texts up to this many characters share one length bucket; above it buckets
+# double in width, so a long input never pads a batch of short ones.
+BATCH_MIN_BUCKET_CHARS = 64
+
 # Bound any Hub HTTP call so a slow/blocked network can never hang model load
 # indefinitely. huggingface_hub reads this on import, so set it before the
 # library is imported inside ``_load``.
@@ -239,12 +265,24 @@ def _download_with_progress(
         status.updated_at = time.time()
 
 
+class EncodePriority(IntEnum):
+    """Scheduling class of an encode request; lower values are served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
 class EmbeddingRequest(BaseModel):
     model: str
     input: str | list[str]
+    # "float" / "base64" (OpenAI-compatible JSON) or "float32" / "float16" /
+    # "int8" for a raw binary body (see app.utils.embedding_wire_format).
     encoding_format: str = "float"
     user: str | None = None
     trust_remote_code: bool = False
+    # "interactive" (query embeddings) or "bulk" (indexing). When omitted a
+    # single input is treated as interactive, anything larger as bulk.
+    priority: str | None = None
 
 
 class EmbeddingData(BaseModel):
@@ -282,6 +320,207 @@ class PrepareModelRequest(BaseModel):
     trust_remote_code: bool = False
 
 
+@dataclass
+class _PendingEncode:
+    texts: list[str]
+    future: asyncio.Future
+    priority: EncodePriority
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class EncodeSlots:
+    """Process-wide cap on concurrent forward passes, shared by every model's batcher.
+
+    Each batcher limits its own model; this keeps several loaded models from
+    saturating the CPU/GPU together. The split matches ``EncodeBatcher``: bulk
+    passes also need one of ``max(1, max_concurrency - 1)`` bulk slots, so one
+    slot stays free for interactive passes of any model.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._all = asyncio.Semaphore(max_concurrency)
+        self._bulk = asyncio.Semaphore(max(1, max_concurrency - 1))
+
+    @asynccontextmanager
+    async def hold(self, priority: EncodePriority) -> AsyncIterator[None]:
+        if priority is EncodePriority.BULK:
+            async with self._bulk, self._all:
+                yield
+        else:
+            async with self._all:
+                yield
+
+
+class EncodeBatcher:
+    """Coalesces concurrent encode requests for one model into shared forward passes.
+
+    Pending requests wait at most ``max_wait`` (measured from the oldest one)
+    for company, then up to ``max_texts`` inputs are drained together, split
+    into power-of-two length buckets (see ``_length_buckets``) and encoded one
+    bucket at a time so padding stays within a bucket, and the rows are
+    scattered back to each caller.
+
+    Interactive requests are always taken before bulk ones and never share a
+    batch with bulk work. Bulk batches may occupy at most
+    ``max(1, max_concurrency - 1)`` slots, so whenever ``max_concurrency > 1``
+    one slot is held back for interactive batches; the total never exceeds
+    ``max_concurrency``. A shared ``slots`` additionally caps passes across
+    every model in the process.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[list[str]], Any],
+        *,
+        max_concurrency: int,
+        max_wait: float = BATCH_MAX_WAIT_SECONDS,
+        max_texts: int = BATCH_MAX_TEXTS,
+        slots: EncodeSlots | None = None,
+    ) -> None:
+        self._encode_batch = encode_batch
+        self._slots = slots
+        self._bulk_slots = max(1, max_concurrency - 1)
+        self._interactive_slots = max_concurrency
+        self._max_wait = max_wait
+        self._max_texts = max_texts
+        self._queues: dict[EncodePriority, deque[_PendingEncode]] = {
+            priority: deque() for priority in EncodePriority
+        }
+        self._in_flight = 0
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._dispatches: set[asyncio.Task] = set()
+        self._closed = False
+
+    def close(self) -> None:
+        """Retire the batcher: its worker stops once the queued requests are served."""
+        self._closed = True
+        if self._worker is not None and not any(self._queues.values()):
+            self._worker.cancel()
+        elif self._wakeup is not None:
+            self._wakeup.set()
+
+    async def submit(self, texts: list[str], priority: EncodePriority) -> np.ndarray:
+        item = _PendingEncode(texts, asyncio.get_running_loop().create_future(), priority)
+        self._queues[priority].append(item)
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return await item.future
+
+    def _pending_texts(self) -> int:
+        return sum(len(item.texts) for queue in self._queues.values() for item in queue)
+
+    def _can_dispatch(self) -> bool:
+        if self._queues[EncodePriority.INTERACTIVE]:
+            return self._in_flight < self._interactive_slots
+        if self._queues[EncodePriority.BULK]:
+            return self._in_flight < self._bulk_slots
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            while not self._can_dispatch():
+                if self._closed and not any(self._queues.values()):
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._fill_window()
+            batch = self._take_batch()
+            if batch:
+                self._in_flight += 1
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _fill_window(self) -> None:
+        oldest = min(q[0].enqueued_at for q in self._queues.values() if q)
+        deadline = oldest + self._max_wait
+        while self._pending_texts() < self._max_texts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _take_batch(self) -> list[_PendingEncode]:
+        batch: list[_PendingEncode] = []
+        count = 0
+        for priority in EncodePriority:
+            # Interactive batches never carry bulk work along with them.
+            if priority is EncodePriority.BULK and (
+                batch or self._in_flight >= self._bulk_slots
+            ):
+                break
+            queue = self._queues[priority]
+            while queue:
+                item = queue[0]
+                if item.future.done():  # caller went away
+                    queue.popleft()
+                    continue
+                if batch and count + len(item.texts) > self._max_texts:
+                    return batch
+                queue.popleft()
+                batch.append(item)
+                count += len(item.texts)
+        return batch
+
+    async def _dispatch(self, batch: list[_PendingEncode]) -> None:
+        try:
+            texts = [text for item in batch for text in item.texts]
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            sorted_texts = [texts[i] for i in order]
+            if self._slots is None:
+                encoded = await asyncio.to_thread(self._encode_buckets, sorted_texts)
+            else:
+                async with self._slots.hold(batch[0].priority):
+                    encoded = await asyncio.to_thread(self._encode_buckets, sorted_texts)
+            embeddings = np.empty_like(encoded)
+            embeddings[order] = encoded
+            offset = 0
+            for item in batch:
+                end = offset + len(item.texts)
+                if not item.future.done():
+                    item.future.set_result(embeddings[offset:end])
+                offset = end
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        finally:
+            self._in_flight -= 1
+            self._wakeup.set()
+
+    def _encode_buckets(self, sorted_texts: list[str]) -> np.ndarray:
+        """Encode length-sorted texts one bucket at a time (runs in a worker thread)."""
+        return np.concatenate(
+            [
+                self._encode_batch(sorted_texts[start:end])
+                for start, end in _length_buckets(sorted_texts)
+            ]
+        )
+
+
+def _length_buckets(sorted_texts: list[str]) -> list[tuple[int, int]]:
+    """``[start, end)`` runs of length-sorted texts sharing a power-of-two length class."""
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    bucket = None
+    for i, text in enumerate(sorted_texts):
+        text_bucket = max(len(text), BATCH_MIN_BUCKET_CHARS).bit_length()
+        if bucket is not None and text_bucket != bucket:
+            bounds.append((start, i))
+            start = i
+        bucket = text_bucket
+    bounds.append((start, len(sorted_texts)))
+    return bounds
+
+
 class ModelManager:
     """Thread-safe cache of loaded SentenceTransformer models."""
 
@@ -294,10 +533,14 @@ class ModelManager:
     ) -> None:
         self._device = device
         self._normalize = normalize_embeddings
+        self._max_concurrency = max_concurrency
+        # Shared by every model's batcher: the cross-model cap on forward passes.
+        self._encode_slots = EncodeSlots(max_concurrency)
         self._models: dict[str, Any] = {}
         self._locks: dict[str, asyncio.Lock] = {}
         self._global_lock = asyncio.Lock()
-        self._encode_semaphore = asyncio.Semaphore(max_concurrency)
+        # Batchers are keyed by model instance so a reloaded model gets its own.
+        self._batchers: dict[str, tuple[Any, EncodeBatcher]] = {}
         self._download_status: dict[str, DownloadStatus] = {}
         self._download_status_lock = threading.Lock()
         self._prepare_tasks: dict[str, asyncio.Task] = {}
@@ -469,22 +712,37 @@ class ModelManager:
         texts: list[str],
         *,
         trust_remote_code: bool = False,
-    ) -> list[list[float]]:
+        priority: EncodePriority = EncodePriority.BULK,
+    ) -> np.ndarray:
+        """Encode ``texts`` into a contiguous ``(len(texts), dim)`` float32 matrix."""
         model = await self.get_model(
             model_name,
             trust_remote_code=trust_remote_code,
         )
 
-        def _encode() -> list[list[float]]:
-            embeddings = model.encode(
-                texts,
-                normalize_embeddings=self._normalize,
-                convert_to_numpy=True,
+        cache_key = self._cache_key(model_name, trust_remote_code=trust_remote_code)
+        entry = self._batchers.get(cache_key)
+        if entry is not None and entry[0] is model:
+            batcher = entry[1]
+        else:
+            def _encode(batch: list[str]) -> np.ndarray:
+                return model.encode(
+                    batch,
+                    normalize_embeddings=self._normalize,
+                    convert_to_numpy=True,
+                )
+
+            batcher = EncodeBatcher(
+                _encode,
+                max_concurrency=self._max_concurrency,
+                slots=self._encode_slots,
             )
-            return embeddings.tolist()
+            self._batchers[cache_key] = (model, batcher)
+            if entry is not None:
+                entry[1].close()
 
-        async with self._encode_semaphore:
-            return await asyncio.to_thread(_encode)
+        embeddings = await batcher.submit(texts, priority)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
 
 model_manager = ModelManager()
@@ -498,29 +756,66 @@ def _normalize_input(raw: str | list[str]) -> list[str]:
     return list(raw)
 
 
-def _format_embedding_vector(
-    vector: list[float],
+def _resolve_priority(raw: str | None, texts: list[str]) -> EncodePriority:
+    if raw is None:
+        return EncodePriority.INTERACTIVE if len(texts) == 1 else EncodePriority.BULK
+    try:
+        return EncodePriority[raw.upper()]
+    except KeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported priority: {raw}",
+        ) from None
+
+
+def _format_embeddings(
+    embeddings: np.ndarray,
     encoding_format: str,
-) -> list[float] | str:
-    """Format a single embedding per OpenAI encoding_format semantics."""
+) -> list[list[float]] | list[str]:
+    """Format an embedding matrix per OpenAI encoding_format semantics.
+
+    ``base64`` rows are sliced straight out of the float32 buffer; ``float``
+    converts the whole matrix to Python floats in one call.
+    """
     if encoding_format == "base64":
-        packed = struct.pack(f"<{len(vector)}f", *vector)
-        return base64.b64encode(packed).decode("ascii")
+        matrix = np.ascontiguousarray(embeddings, dtype="<f4")
+        return [base64.b64encode(row.data).decode("ascii") for row in matrix]
     if encoding_format == "float":
-        return vector
+        return embeddings.tolist()
     raise HTTPException(
         status_code=400,
         detail=f"Unsupported encoding_format: {encoding_format}",
     )
 
 
+def _binary_embeddings_response(
+    embeddings: np.ndarray,
+    encoding_format: str,
+    prompt_tokens: int,
+) -> Response:
+    count, dimensions = embeddings.shape
+    return Response(
+        content=encode_matrix(embeddings, encoding_format),
+        media_type=BINARY_CONTENT_TYPE,
+        headers={
+            HEADER_COUNT: str(count),
+            HEADER_DIMENSIONS: str(dimensions),
+            HEADER_DTYPE: encoding_format,
+            HEADER_PROMPT_TOKENS: str(prompt_tokens),
+        },
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.model_manager = model_manager
     logger.info(
-        "Starting embedding server warmup for %s (max_concurrency=%d)",
+        "Starting embedding server warmup for %s (max_concurrency=%d, "
+        "batch_wait_ms=%.1f, batch_max_texts=%d)",
         DEFAULT_EMBEDDING_MODEL,
         MAX_CONCURRENT_EMBEDDINGS,
+        BATCH_MAX_WAIT_SECONDS * 1000,
+        BATCH_MAX_TEXTS,
     )
     logger.info(
         "Security policy: allow_remote_code=%s, allowed_models=%s",
@@ -671,8 +966,8 @@ async def download_progress(model_name: str) -> JSONResponse:
     )
 
 
-@app.post("/v1/embeddings")
-async def create_embeddings(request: EmbeddingRequest) -> EmbeddingResponse:
+@app.post("/v1/embeddings", response_model=EmbeddingResponse)
+async def create_embeddings(request: EmbeddingRequest) -> EmbeddingResponse | Response:
     # --- server-side policy checks (fail fast, before any I/O) ---
     if ALLOWED_MODELS is not None and request.model not in ALLOWED_MODELS:
         raise HTTPException(
@@ -690,12 +985,19 @@ async def create_embeddings(request: EmbeddingRequest) -> EmbeddingResponse:
 
     texts = _normalize_input(request.input)
     encoding_format = request.encoding_format or "float"
+    if encoding_format not in ("float", "base64", *BINARY_DTYPES):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported encoding_format: {encoding_format}",
+        )
+    priority = _resolve_priority(request.priority, texts)
 
     try:
-        vectors = await model_manager.encode(
+        embeddings = await model_manager.encode(
             request.model,
             texts,
             trust_remote_code=request.trust_remote_code,
+            priority=priority,
         )
     except Exception as exc:
         logger.exception("Embedding failed for model=%s", request.model)
@@ -705,12 +1007,11 @@ async def create_embeddings(request: EmbeddingRequest) -> EmbeddingResponse:
         ) from exc
 
     token_estimate = sum(max(1, len(t.split()) * 4 // 3) for t in texts)
+    if encoding_format in BINARY_DTYPES:
+        return _binary_embeddings_response(embeddings, encoding_format, token_estimate)
     data = [
-        EmbeddingData(
-            embedding=_format_embedding_vector(vec, encoding_format),
-            index=i,
-        )
-        for i, vec in enumerate(vectors)
+        EmbeddingData(embedding=vec, index=i)
+        for i, vec in enumerate(_format_embeddings(embeddings, encoding_format))
     ]
     return EmbeddingResponse(
         data=data,
@@ -33,6 +33,10 @@ from app.models.blocks import (
 )
 from app.models.entities import Record, RecordType
 from app.modules.parsers.code_parser.lang_config import config_for_extension, detect_language
+from app.modules.parsers.csv.csv_parser import (
+    CSV_STREAMING_THRESHOLD_BYTES,
+    CSV_STREAMING_WINDOW_ROWS,
+)
 from app.modules.parsers.markdown.markdown_parser import MarkdownParser
 from app.modules.parsers.pdf.docling_processor import DoclingProcessor
 from app.modules.parsers.pdf.ocr_handler import OCRHandler
@@ -1381,50 +1385,59 @@ class Processor:
 
             llm, _ = await get_llm_for_role(self.config_service, "indexing", reasoning_effort="low")
 
-            # Try different encodings to decode binary data
-            encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
-            all_rows = None
-            for encoding in encodings:
-                try:
-                    self.logger.debug(
-                        f"Attempting to decode delimited file with {encoding} encoding"
-                    )
-                    # Decode binary data to string
-                    csv_text = file_binary.decode(encoding)
+            # Large exports are decoded and cut into row blocks as they are
+            # read; holding the text, raw rows and row dicts at once is the
+            # parsing spike for multi-hundred-MB files.
+            streaming = len(file_binary) >= CSV_STREAMING_THRESHOLD_BYTES
+            if streaming:
+                self.logger.info(
+                    f"Streaming delimited file of {len(file_binary)} bytes in {CSV_STREAMING_WINDOW_ROWS}-row windows"
+                )
+            else:
+                # Try different encodings to decode binary data
+                encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
+                all_rows = None
+                for encoding in encodings:
+                    try:
+                        self.logger.debug(
+                            f"Attempting to decode delimited file with {encoding} encoding"
+                        )
+                        # Decode binary data to string
+                        csv_text = file_binary.decode(encoding)
 
-                    # Create string stream from decoded text
-                    csv_stream = io.StringIO(csv_text)
+                        # Create string stream from decoded text
+                        csv_stream = io.StringIO(csv_text)
 
-                    # Read raw rows for table detection
-                    all_rows = parser.read_raw_rows(csv_stream)
+                        # Read raw rows for table detection
+                        all_rows = parser.read_raw_rows(csv_stream)
 
 
-                    self.logger.info(
-                        f"✅ Successfully parsed delimited file with {encoding} encoding. Rows: {len(all_rows)}"
-                    )
-                    break
-                except UnicodeDecodeError:
-                    self.logger.debug(f"Failed to decode with {encoding} encoding")
-                    continue
-                except Exception as e:
-                    self.logger.debug(f"Failed to process delimited file with {encoding} encoding: {str(e)}")
-                    continue
+                        self.logger.info(
+                            f"✅ Successfully parsed delimited file with {encoding} encoding. Rows: {len(all_rows)}"
+                        )
+                        break
+                    except UnicodeDecodeError:
+                        self.logger.debug(f"Failed to decode with {encoding} encoding")
+                        continue
+                    except Exception as e:
+                        self.logger.debug(f"Failed to process delimited file with {encoding} encoding: {str(e)}")
+                        continue
 
 
-            if all_rows is None or not all_rows:
-                self.logger.info(f"Unable to decode delimited file with any supported encoding or it is empty for record: {recordName}. Setting indexing status to EMPTY.")
+                if all_rows is None or not all_rows:
+                    self.logger.info(f"Unable to decode delimited file with any supported encoding or it is empty for record: {recordName}. Setting indexing status to EMPTY.")
 
-                yield PipelineEvent(event=IndexingEvent.PARSING_COMPLETE, data=PipelineEventData(record_id=recordId))
-                yield PipelineEvent(event=IndexingEvent.INDEXING_COMPLETE, data=PipelineEventData(record_id=recordId))
-                await self._mark_record(recordId, ProgressStatus.EMPTY)
+                    yield PipelineEvent(event=IndexingEvent.PARSING_COMPLETE, data=PipelineEventData(record_id=recordId))
+                    yield PipelineEvent(event=IndexingEvent.INDEXING_COMPLETE, data=PipelineEventData(record_id=recordId))
+                    await self._mark_record(recordId, ProgressStatus.EMPTY)
 
-                return
+                    return
 
-            self.logger.debug("📑 Delimited file result processed")
+                self.logger.debug("📑 Delimited file result processed")
 
-            # Detect multiple tables
-            tables = parser.find_tables_in_csv(all_rows)
-            self.logger.info(f"🔍 Detected {len(tables)} table(s) in delimited file")
+                # Detect multiple tables
+                tables = parser.find_tables_in_csv(all_rows)
+                self.logger.info(f"🔍 Detected {len(tables)} table(s) in delimited file")
 
             record = await self.graph_provider.get_document(
                 recordId, CollectionNames.RECORDS.value
@@ -1441,8 +1454,11 @@ class Processor:
             yield PipelineEvent(event=IndexingEvent.PARSING_COMPLETE, data=PipelineEventData(record_id=recordId))
 
             # Process all tables using unified multi-table logic
-            self.logger.info(f"📊 Processing {len(tables)} table(s)")
-            block_containers = await parser.get_blocks_from_csv_with_multiple_tables(tables, llm)
+            if streaming:
+                block_containers = await parser.get_blocks_from_csv_stream(file_binary, llm)
+            else:
+                self.logger.info(f"📊 Processing {len(tables)} table(s)")
+                block_containers = await parser.get_blocks_from_csv_with_multiple_tables(tables, llm)
 
             record.block_containers = block_containers
 
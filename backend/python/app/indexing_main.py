@@ -1,6 +1,7 @@
 import app.utils.runtime_threads  # noqa: E402 - must precede all ML library imports
 
 import asyncio
+import inspect
 import os
 from uuid import uuid4
 from collections.abc import AsyncGenerator, Awaitable
@@ -35,6 +36,9 @@ from app.services.messaging.distributed_concurrency import (
 from app.modules.parsers.pdf.docling_processor import (
     set_resource_governor as set_docling_processor_governor,
 )
+from app.modules.parsers.pdf.opencv_layout_pool import (
+    set_resource_governor as set_pdf_layout_governor,
+)
 from app.modules.parsers.pdf.pdf_rasterizer import (
     set_resource_governor as set_pdf_rasterizer_governor,
 )
@@ -42,6 +46,13 @@ from app.services.messaging.kafka.utils.utils import KafkaUtils
 from app.services.messaging.messaging_factory import MessagingFactory
 from app.services.messaging.utils import MessagingUtils
 from app.services.resource_governor import ResourceGovernor
+from app.services.vector_db.acl import acl_filter_enabled
+from app.services.vector_db.acl_reconciler import (
+    AclPayloadReconciler,
+    acl_reconcile_enabled,
+    run_acl_reconcile_loop,
+)
+from app.services.vector_db.const.const import VECTOR_DB_COLLECTION_NAME
 from app.telemetry.setup import setup_telemetry
 from app.utils.llm import is_local_cpu_embedding_configured
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
@@ -789,11 +800,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.governor = governor
     app_container.resource_governor = governor
     governor_task = asyncio.create_task(governor.run())
-    # Both leaf modules run a worker-process OOM-kill (BrokenProcessPool)
+    # Each leaf module runs a worker-process OOM-kill (BrokenProcessPool)
     # straight into the governor's fast incident path instead of only the
     # periodic sampler noticing the pressure it already caused.
     set_docling_processor_governor(governor)
     set_pdf_rasterizer_governor(governor)
+    set_pdf_layout_governor(governor)
 
     # This service flips records to COMPLETED, which is when a KB record first
     # becomes searchable — the query service's cached map must be dropped then.
@@ -839,6 +851,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             run_stale_recovery_loop(app_container, graph_provider)
         )
 
+    # Vector points carry indexing-time ACL tokens; keep them in step with
+    # permission changes so grants reach the ACL-filtered search path. Same
+    # loop as recovery, for the same Neo4j reason. Each pass reads the whole
+    # collection, so it only runs when asked for.
+    if acl_filter_enabled() and acl_reconcile_enabled():
+        reconciler = AclPayloadReconciler(
+            logger,
+            graph_provider,
+            await app_container.vector_db_service(),
+            VECTOR_DB_COLLECTION_NAME,
+        )
+        if worker_loop and worker_loop.is_running():
+            app.state.acl_reconcile_future = asyncio.run_coroutine_threadsafe(
+                run_acl_reconcile_loop(reconciler), worker_loop
+            )
+        else:
+            app.state.acl_reconcile_task = asyncio.create_task(
+                run_acl_reconcile_loop(reconciler)
+            )
+
     yield
     # Shutdown
     logger.info("🔄 Shutting down application")
@@ -854,28 +886,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.warning(f"❌ Error stopping telemetry pusher: {e}")
 
-    # Cancel background recovery if it's still running.
-    recovery_task = getattr(app.state, "recovery_task", None)
-    if recovery_task:
-        if not recovery_task.done():
-            recovery_task.cancel()
-        try:
-            await recovery_task
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.error(f"❌ Error during recovery task shutdown: {str(e)}")
+    # Cancel background recovery / ACL reconcile if they're still running.
+    for task_name in ("recovery_task", "acl_reconcile_task"):
+        background_task = getattr(app.state, task_name, None)
+        if background_task:
+            if not background_task.done():
+                background_task.cancel()
+            try:
+                await background_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"❌ Error during {task_name} shutdown: {str(e)}")
 
-    recovery_future = getattr(app.state, "recovery_future", None)
-    if recovery_future:
-        if not recovery_future.done():
-            recovery_future.cancel()
-        try:
-            await asyncio.wrap_future(recovery_future)
-        except (asyncio.CancelledError, RuntimeError):
-            pass
-        except Exception as e:
-            logger.error(f"❌ Error during recovery future shutdown: {str(e)}")
+    for future_name in ("recovery_future", "acl_reconcile_future"):
+        background_future = getattr(app.state, future_name, None)
+        if background_future:
+            if not background_future.done():
+                background_future.cancel()
+            try:
+                await asyncio.wrap_future(background_future)
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            except Exception as e:
+                logger.error(f"❌ Error during {future_name} shutdown: {str(e)}")
 
     # Stop message consumers
     try:
@@ -883,6 +917,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"❌ Error during application shutdown: {str(e)}")
 
+    # The embedding cache is resolved with the event processor the consumers
+    # use; close its Redis client / SQLite file once they have stopped.
+    try:
+        if app_container.embedding_cache.initialized:
+            embedding_cache = app_container.embedding_cache()
+            if inspect.isawaitable(embedding_cache):
+                embedding_cache = await embedding_cache
+            await embedding_cache.close()
+            logger.info("✅ Embedding cache closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing embedding cache: {e}")
+
+    try:
+        from app.utils.embedding_server_client import close_shared_clients
+        await close_shared_clients()
+        logger.info("✅ Embedding server clients closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing embedding server clients: {e}")
+
     # Stop the resource governor's sample loop after consumers (which hold
     # its gates) have drained, so nothing races a limit change mid-shutdown.
     governor.stop()
@@ -927,6 +980,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"❌ Error shutting down PDF rasterization pool: {e}")
 
+    try:
+        from app.modules.parsers.pdf.opencv_layout_pool import shutdown_pdf_layout_pool
+        if shutdown_pdf_layout_pool():
+            logger.info("✅ PDF layout-analysis process pool shut down")
+    except Exception as e:
+        logger.error(f"❌ Error shutting down PDF layout-analysis pool: {e}")
+
 
 from app.api.middlewares.request_context import RequestContextMiddleware
 from app.utils.request_context import set_service_suffix
@@ -59,6 +59,7 @@ class ChatState(TypedDict):
     previous_conversations: list[dict[str, str]]
     quick_mode: bool  # Renamed from decompose_query to avoid conflict
     chat_mode: str | None  # "quick", "standard", "analysis", "deep_research", "creative", "precise"
+    search_chat_mode: str | None  # Request's wire `chatMode`; picks the vector search precision
     filters: dict[str, Any] | None
     retrieval_mode: str
     graph_type: str
@@ -514,6 +515,7 @@ def build_initial_state(chat_query: dict[str, Any], user_info: dict[str, Any], l
         "filters": filters,
         "retrieval_mode": chat_query.get("retrievalMode", "HYBRID"),
         "chat_mode": chat_query.get("chatMode", "standard"),
+        "search_chat_mode": chat_query.get("chatMode"),
         "graph_type": graph_type,
 
         # Query analysis (will be populated by analyze_query_node)
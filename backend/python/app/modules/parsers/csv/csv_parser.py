@@ -1,10 +1,13 @@
 import asyncio
+import codecs
 import csv
 import io
+import itertools
 import json
 import os
+import tempfile
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+from typing import IO, Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
 from app.config.configuration_service import ConfigurationService
 from app.services.parsing.interface import ParseResult
@@ -52,6 +55,21 @@ MAX_HEADER_GENERATION_ROWS = 10  # Maximum number of rows to use for header gene
 MAX_SUMMARY_SAMPLE_ROWS = 10  # Maximum number of sample rows for table summary
 MIN_ROWS_FOR_HEADER_ANALYSIS = 1  # Minimum number of rows required for header analysis
 MAX_HEADER_DETECTION_ROWS = 10  # CSV uses 6 rows (vs Excel's 4)
+# Files at or above this size are parsed with get_blocks_from_csv_stream()
+# instead of being decoded and split into rows up front.
+CSV_STREAMING_THRESHOLD_BYTES = int(os.getenv("CSV_STREAMING_THRESHOLD_BYTES", str(16 * 1024 * 1024)))
+# Rows held at once for table/header detection while streaming.
+CSV_STREAMING_WINDOW_ROWS = max(MAX_HEADER_DETECTION_ROWS + 1, int(os.getenv("CSV_STREAMING_WINDOW_ROWS", "1000")))
+# Cap on blocks per streamed table, since every TABLE_ROW block of the file is
+# held until the container is returned. Rows past it are read to find the
+# table's end but not indexed, and the dropped count is logged. 0 indexes
+# every row.
+CSV_STREAMING_MAX_TABLE_ROWS = max(0, int(os.getenv("CSV_STREAMING_MAX_TABLE_ROWS", "100000")))
+# Rows of side-by-side tables that continue past their window are spooled per
+# table; above this size a spool moves from memory to a temporary file.
+CSV_STREAMING_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+CSV_DECODE_CHUNK_BYTES = 1024 * 1024
+CSV_ENCODINGS = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
 
 class CSVParser:
     def __init__(
@@ -87,8 +105,16 @@ class CSVParser:
     ) -> ParseResult:
             llm, _ = await get_llm_for_role(self.config_service, "indexing", reasoning_effort="low")
 
+            if len(content) >= CSV_STREAMING_THRESHOLD_BYTES:
+                return ParseResult(
+                    block_container=await self.get_blocks_from_csv_stream(content, llm),
+                    metadata={
+                        "record_name": record_name,
+                    },
+                )
+
             # Try different encodings to decode binary data
-            encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
+            encodings = CSV_ENCODINGS
             all_rows = None
             for encoding in encodings:
                 try:
@@ -382,6 +408,39 @@ class CSVParser:
         )
         return list(reader)
 
+    def detect_encoding(self, content: bytes) -> Optional[str]:
+        """
+        Return the first of ``CSV_ENCODINGS`` that decodes ``content``.
+
+        Decodes in ``CSV_DECODE_CHUNK_BYTES`` chunks and discards the text, so
+        checking a large file never holds a decoded copy of it.
+        """
+        view = memoryview(content)
+        for encoding in CSV_ENCODINGS:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                for start in range(0, len(view), CSV_DECODE_CHUNK_BYTES):
+                    decoder.decode(view[start:start + CSV_DECODE_CHUNK_BYTES])
+                decoder.decode(b"", final=True)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        return None
+
+    def iter_raw_rows(self, content: bytes, encoding: str) -> Iterator[List[str]]:
+        """
+        Lazily decode ``content`` and yield its rows, same values as ``read_raw_rows``.
+
+        Args:
+            content: Raw CSV bytes
+            encoding: An encoding ``content`` is known to decode with
+
+        Returns:
+            Iterator over rows, where each row is a list of string values
+        """
+        file_stream = io.TextIOWrapper(io.BytesIO(content), encoding=encoding, newline="")
+        return csv.reader(file_stream, delimiter=self.delimiter, quotechar=self.quotechar)
+
     def _is_empty_row(self, row: List[Any], start_col: Optional[int] = None, end_col: Optional[int] = None) -> bool:
         """
         Check if all values in a row (or a range within the row) are None/empty.
@@ -503,6 +562,7 @@ class CSVParser:
             "raw_rows": raw_rows,  # All rows without header assumptions
             "start_row": start_row + 1,  # Convert to 1-based line numbers
             "end_row": max_row + 1,
+            "start_col": start_col,  # 0-based
         }
 
     def find_tables_in_csv(self, all_rows: List[List[Any]]) -> List[Dict[str, Any]]:
@@ -948,94 +1008,244 @@ class CSVParser:
 
         # Process each table independently
         for table_idx, table in enumerate(tables):
-            raw_rows = table["raw_rows"]
+            cumulative_row_count = await self._append_table_blocks(
+                blocks, block_groups, table_idx, table, llm, cumulative_row_count, threshold
+            )
 
-            if not raw_rows:
-                continue
+        return BlocksContainer(blocks=blocks, block_groups=block_groups)
 
-            # Prepare rows for header detection (first N rows)
-            detection_rows = raw_rows[:MAX_HEADER_DETECTION_ROWS]
+    async def get_blocks_from_csv_stream(self, content: bytes, llm: BaseChatModel) -> BlocksContainer:
+        """
+        Build the same BlocksContainer as ``get_blocks_from_csv_with_multiple_tables``
+        without materialising the file.
+
+        Rows are decoded lazily and read ``CSV_STREAMING_WINDOW_ROWS`` at a time.
+        Tables and headers are detected within each window; a table still open
+        at the end of its window keeps consuming rows one at a time, straight
+        into TABLE_ROW blocks, until a row that is empty across its columns.
+        Parse-time memory is therefore one window plus the blocks themselves,
+        whatever the file size; ``CSV_STREAMING_MAX_TABLE_ROWS`` (100,000 by
+        default) bounds the latter.
+
+        Detection only sees a window, so a column that first gets data below
+        the window is not added to a table that is already open. Tables open
+        side by side share their rows, so those rows are first spooled to one
+        temporary file per table and each table is then streamed from its own.
 
-            # Detect headers using LLM
-            detection = await self.detect_headers_with_llm(detection_rows, llm)
-            logger.info(f"Table {table_idx + 1}: has_headers={detection.has_headers}, num_header_rows={detection.num_header_rows}")
+        Args:
+            content: Raw CSV/TSV bytes
+            llm: Language model instance
 
-            # Unified processing path - handles all three scenarios
-            csv_result, line_numbers = await self.process_table_with_header_info(
-                raw_rows,
-                detection,
-                table["start_row"],
-                llm
+        Returns:
+            BlocksContainer with multiple TABLE BlockGroups
+        """
+        blocks: List[Block] = []
+        block_groups: List[BlockGroup] = []
+        threshold = int(os.getenv("MAX_TABLE_ROWS_FOR_LLM", "1000"))
+        cumulative_row_count = 0
+        table_idx = 0
+
+        encoding = await asyncio.to_thread(self.detect_encoding, content)
+        if encoding is None:
+            return BlocksContainer(blocks=blocks, block_groups=block_groups)
+
+        source = _RowSource(self.iter_raw_rows(content, encoding))
+        while True:
+            window_offset = source.line
+            window = await asyncio.to_thread(source.take, CSV_STREAMING_WINDOW_ROWS)
+            if not window:
+                break
+
+            tables = await asyncio.to_thread(self.find_tables_in_csv, window)
+            open_tables = (
+                {id(t) for t in tables if t["end_row"] == len(window)}
+                if len(window) == CSV_STREAMING_WINDOW_ROWS
+                else set()
             )
+            spools: Dict[int, IO[str]] = {}
+            if len(open_tables) > 1:
+                logger.info(
+                    f"{len(open_tables)} side-by-side tables continue past line {source.line}; "
+                    "spooling their rows"
+                )
+                spools = await asyncio.to_thread(
+                    self._spool_side_by_side_rows,
+                    source,
+                    [t for t in tables if id(t) in open_tables and t["raw_rows"]],
+                )
 
-            if not csv_result:
-                continue
+            for table in tables:
+                table["start_row"] += window_offset
+                table["end_row"] += window_offset
+                if id(table) in spools:
+                    continuation = self._iter_spooled_rows(table, spools.pop(id(table)))
+                elif id(table) in open_tables:
+                    continuation = self._iter_table_continuation(source, table)
+                else:
+                    continuation = None
+                cumulative_row_count = await self._append_table_blocks(
+                    blocks, block_groups, table_idx, table, llm, cumulative_row_count, threshold, continuation
+                )
+                table_idx += 1
 
-            # Add current table rows to cumulative count
-            table_row_count = len(csv_result)
-            cumulative_row_count += table_row_count
-
-            # Check if cumulative count exceeds threshold
-            use_llm_for_rows = cumulative_row_count <= threshold
-
-            # Get table summary (always use LLM)
-            table_summary = await self.get_table_summary(llm, csv_result)
-
-            # Create table BlockGroup
-            table_group_index = len(block_groups)
-            table_row_block_indices = []
-
-            column_headers = list(csv_result[0].keys())
-
-            if use_llm_for_rows:
-                # Use LLM for row descriptions
-                batches = []
-                for i in range(0, len(csv_result), DEFAULT_BATCH_SIZE):
-                    batch = csv_result[i : i + DEFAULT_BATCH_SIZE]
-                    batches.append((i, batch))
-
-                max_concurrent_batches = min(MAX_CONCURRENT_BATCHES, len(batches))
-                batch_results = []
-
-                for i in range(0, len(batches), max_concurrent_batches):
-                    current_batches = batches[i:i + max_concurrent_batches]
-
-                    batch_tasks = []
-                    for start_idx, batch in current_batches:
-                        task = self.get_rows_text(llm, batch, table_summary)
-                        batch_tasks.append((start_idx, batch, task))
-
-                    task_results = await asyncio.gather(*[task for _, _, task in batch_tasks])
-
-                    for j, (start_idx, batch, _) in enumerate(batch_tasks):
-                        row_texts = task_results[j]
-                        batch_results.append((start_idx, batch, row_texts))
-
-                # Create blocks for this table
-                for start_idx, batch, row_texts in batch_results:
-                    for idx, (row, row_text) in enumerate(zip(batch, row_texts), start=start_idx):
-                        block_index = len(blocks)
-                        actual_row_number = line_numbers[idx] if idx < len(line_numbers) else idx + 1
-
-                        blocks.append(
-                            Block(
-                                index=block_index,
-                                type=BlockType.TABLE_ROW,
-                                format=DataFormat.JSON,
-                                data={
-                                    "row_natural_language_text": row_text,
-                                    "row_number": actual_row_number,
-                                },
-                                parent_index=table_group_index,
-                            )
-                        )
-                        table_row_block_indices.append(block_index)
-            else:
-                # Use simple format for rows (skip LLM)
-                for idx, row in enumerate(csv_result):
+        logger.info(
+            f"Streamed {source.line} CSV rows into {len(blocks)} blocks, {len(block_groups)} block groups"
+        )
+        return BlocksContainer(blocks=blocks, block_groups=block_groups)
+
+    def _iter_table_continuation(
+        self, source: "_RowSource", table: Dict[str, Any]
+    ) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yield ``(line_number, row)`` for rows of ``table`` that follow its window.
+
+        Rows are cut to the table's columns and normalised the way ``_get_table``
+        does. The first row that is empty across those columns ends the table
+        and is pushed back so the next window starts with it.
+        """
+        start_col = table["start_col"]
+        end_col = start_col + len(table["raw_rows"][0]) - 1
+        for row in source:
+            values = [row[col].strip() if col < len(row) else "" for col in range(start_col, end_col + 1)]
+            if not any(values):
+                source.push_back(row)
+                return
+            table["end_row"] = source.line
+            yield source.line, [value if value else "null" for value in values]
+
+    def _spool_side_by_side_rows(
+        self, source: "_RowSource", tables: List[Dict[str, Any]]
+    ) -> Dict[int, IO[str]]:
+        """
+        Spool the rows of side-by-side ``tables`` that follow the window, one file per table.
+
+        Each table's columns go to its own spool as ``line_number, values...``,
+        skipping rows that are empty across them. The first row that is empty
+        across every table's columns ends them all and is pushed back so the
+        next window starts with it. Spools are returned rewound, keyed by
+        ``id(table)``.
+        """
+        spans = {
+            id(t): range(t["start_col"], t["start_col"] + len(t["raw_rows"][0])) for t in tables
+        }
+        spools: Dict[int, IO[str]] = {
+            key: tempfile.SpooledTemporaryFile(
+                max_size=CSV_STREAMING_SPOOL_MEMORY_BYTES, mode="w+", newline="", encoding="utf-8"
+            )
+            for key in spans
+        }
+        writers = {key: csv.writer(spool) for key, spool in spools.items()}
+        for row in source:
+            slices = {
+                key: [row[col].strip() if col < len(row) else "" for col in span]
+                for key, span in spans.items()
+            }
+            if not any(any(values) for values in slices.values()):
+                source.push_back(row)
+                break
+            for key, values in slices.items():
+                if any(values):
+                    writers[key].writerow([source.line, *values])
+        for spool in spools.values():
+            spool.seek(0)
+        return spools
+
+    def _iter_spooled_rows(
+        self, table: Dict[str, Any], spool: IO[str]
+    ) -> Iterator[Tuple[int, List[str]]]:
+        """Yield ``(line_number, row)`` from a ``_spool_side_by_side_rows`` spool, then close it."""
+        with spool:
+            for line, *values in csv.reader(spool):
+                table["end_row"] = int(line)
+                yield int(line), [value if value else "null" for value in values]
+
+    async def _append_table_blocks(
+        self,
+        blocks: List[Block],
+        block_groups: List[BlockGroup],
+        table_idx: int,
+        table: Dict[str, Any],
+        llm: BaseChatModel,
+        cumulative_row_count: int,
+        threshold: int,
+        continuation: Optional[Iterator[Tuple[int, List[str]]]] = None,
+    ) -> int:
+        """
+        Detect headers for one table and append its TABLE group and TABLE_ROW blocks.
+
+        ``continuation`` carries rows of a streamed table beyond its detection
+        window; those always get simple row text. Returns the updated
+        record-level row count.
+        """
+        raw_rows = table["raw_rows"]
+
+        if not raw_rows:
+            return cumulative_row_count
+
+        # Prepare rows for header detection (first N rows)
+        detection_rows = raw_rows[:MAX_HEADER_DETECTION_ROWS]
+
+        # Detect headers using LLM
+        detection = await self.detect_headers_with_llm(detection_rows, llm)
+        logger.info(f"Table {table_idx + 1}: has_headers={detection.has_headers}, num_header_rows={detection.num_header_rows}")
+
+        # Unified processing path - handles all three scenarios
+        csv_result, line_numbers = await self.process_table_with_header_info(
+            raw_rows,
+            detection,
+            table["start_row"],
+            llm
+        )
+
+        if not csv_result:
+            return cumulative_row_count
+
+        # Add current table rows to cumulative count
+        table_row_count = len(csv_result)
+        cumulative_row_count += table_row_count
+
+        # Check if cumulative count exceeds threshold. A table that continues
+        # past its window is longer than the window, so it never qualifies.
+        use_llm_for_rows = continuation is None and cumulative_row_count <= threshold
+
+        # Get table summary (always use LLM)
+        table_summary = await self.get_table_summary(llm, csv_result)
+
+        # Create table BlockGroup
+        table_group_index = len(block_groups)
+        table_row_block_indices = []
+
+        column_headers = list(csv_result[0].keys())
+
+        if use_llm_for_rows:
+            # Use LLM for row descriptions
+            batches = []
+            for i in range(0, len(csv_result), DEFAULT_BATCH_SIZE):
+                batch = csv_result[i : i + DEFAULT_BATCH_SIZE]
+                batches.append((i, batch))
+
+            max_concurrent_batches = min(MAX_CONCURRENT_BATCHES, len(batches))
+            batch_results = []
+
+            for i in range(0, len(batches), max_concurrent_batches):
+                current_batches = batches[i:i + max_concurrent_batches]
+
+                batch_tasks = []
+                for start_idx, batch in current_batches:
+                    task = self.get_rows_text(llm, batch, table_summary)
+                    batch_tasks.append((start_idx, batch, task))
+
+                task_results = await asyncio.gather(*[task for _, _, task in batch_tasks])
+
+                for j, (start_idx, batch, _) in enumerate(batch_tasks):
+                    row_texts = task_results[j]
+                    batch_results.append((start_idx, batch, row_texts))
+
+            # Create blocks for this table
+            for start_idx, batch, row_texts in batch_results:
+                for idx, (row, row_text) in enumerate(zip(batch, row_texts), start=start_idx):
                     block_index = len(blocks)
                     actual_row_number = line_numbers[idx] if idx < len(line_numbers) else idx + 1
-                    row_text = generate_simple_row_text(row)
 
                     blocks.append(
                         Block(
@@ -1050,29 +1260,128 @@ class CSVParser:
                         )
                     )
                     table_row_block_indices.append(block_index)
+        else:
+            # Use simple format for rows (skip LLM)
+            for idx, row in enumerate(csv_result):
+                actual_row_number = line_numbers[idx] if idx < len(line_numbers) else idx + 1
+                table_row_block_indices.append(
+                    self._append_simple_row_block(blocks, row, actual_row_number, table_group_index)
+                )
 
-            num_of_rows = table_row_count
-            num_of_cols = len(column_headers)
-            num_of_cells = num_of_rows * num_of_cols
-
-            table_group = BlockGroup(
-                index=table_group_index,
-                type=GroupType.TABLE,
+        if continuation is not None:
+            # Header rows were all inside the window; the rest is data.
+            del csv_result
+            row_budget = (
+                max(0, CSV_STREAMING_MAX_TABLE_ROWS - table_row_count) if CSV_STREAMING_MAX_TABLE_ROWS else None
+            )
+            streamed = await asyncio.to_thread(
+                self._append_continuation_blocks,
+                blocks,
+                column_headers,
+                continuation,
+                table_group_index,
+                table_row_block_indices,
+                row_budget,
+            )
+            table_row_count += streamed
+            cumulative_row_count += streamed
+
+        num_of_rows = table_row_count
+        num_of_cols = len(column_headers)
+        num_of_cells = num_of_rows * num_of_cols
+
+        table_group = BlockGroup(
+            index=table_group_index,
+            type=GroupType.TABLE,
+            format=DataFormat.JSON,
+
+            table_metadata=TableMetadata(
+                num_of_rows=num_of_rows,
+                num_of_cols=num_of_cols,
+                num_of_cells=num_of_cells,
+            ),
+            data={
+                "table_summary": table_summary,
+                "column_headers": column_headers,
+            },
+            children=BlockGroupChildren.from_indices(block_indices=table_row_block_indices),
+        )
+        block_groups.append(table_group)
+        return cumulative_row_count
+
+    def _append_simple_row_block(
+        self, blocks: List[Block], row: Dict[str, Any], row_number: int, table_group_index: int
+    ) -> int:
+        """Append one TABLE_ROW block with ``generate_simple_row_text`` and return its index."""
+        block_index = len(blocks)
+        blocks.append(
+            Block(
+                index=block_index,
+                type=BlockType.TABLE_ROW,
                 format=DataFormat.JSON,
-
-                table_metadata=TableMetadata(
-                    num_of_rows=num_of_rows,
-                    num_of_cols=num_of_cols,
-                    num_of_cells=num_of_cells,
-                ),
                 data={
-                    "table_summary": table_summary,
-                    "column_headers": column_headers,
+                    "row_natural_language_text": generate_simple_row_text(row),
+                    "row_number": row_number,
                 },
-                children=BlockGroupChildren.from_indices(block_indices=table_row_block_indices),
+                parent_index=table_group_index,
             )
-            block_groups.append(table_group)
+        )
+        return block_index
 
-        return BlocksContainer(blocks=blocks, block_groups=block_groups)
+    def _append_continuation_blocks(
+        self,
+        blocks: List[Block],
+        headers: List[str],
+        continuation: Iterator[Tuple[int, List[str]]],
+        table_group_index: int,
+        block_indices: List[int],
+        row_budget: Optional[int] = None,
+    ) -> int:
+        """
+        Drain ``continuation`` into TABLE_ROW blocks; returns the number of rows added.
+
+        Once ``row_budget`` rows are added the remaining rows are still read,
+        so the table ends where it should, but produce no blocks.
+        """
+        added = 0
+        skipped = 0
+        for line_number, row in continuation:
+            if row_budget is not None and added >= row_budget:
+                skipped += 1
+                continue
+            row_dict = {header: self._parse_value(value) for header, value in zip(headers, row)}
+            # Skip entirely empty rows
+            if all(value == "null" for value in row_dict.values()):
+                continue
+            block_indices.append(self._append_simple_row_block(blocks, row_dict, line_number, table_group_index))
+            added += 1
+        if skipped:
+            logger.warning(
+                f"Table exceeds CSV_STREAMING_MAX_TABLE_ROWS={CSV_STREAMING_MAX_TABLE_ROWS}; "
+                f"{skipped} rows were not indexed"
+            )
+        return added
+
+
+class _RowSource:
+    """Row iterator that counts rows read and lets one be pushed back."""
+
+    def __init__(self, rows: Iterator[List[str]]) -> None:
+        self._rows = rows
+        self._pushed: List[List[str]] = []
+        self.line = 0  # 1-based number of the last row handed out
+
+    def __iter__(self) -> "_RowSource":
+        return self
+
+    def __next__(self) -> List[str]:
+        row = self._pushed.pop() if self._pushed else next(self._rows)
+        self.line += 1
+        return row
 
+    def push_back(self, row: List[str]) -> None:
+        self._pushed.append(row)
+        self.line -= 1
 
+    def take(self, count: int) -> List[List[str]]:
+        return list(itertools.islice(self, count))
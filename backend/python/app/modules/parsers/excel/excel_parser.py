@@ -4,6 +4,8 @@ import json
 import logging
 import os
 import re
+import zipfile
+from collections.abc import Iterable, Sequence
 from datetime import datetime, time
 from typing import Any
 
@@ -14,7 +16,7 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage
 from openpyxl import load_workbook
 from openpyxl.cell.cell import Cell, MergedCell
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, range_boundaries
 from openpyxl.worksheet.worksheet import Worksheet
 from tenacity import (
     retry,
@@ -59,6 +61,18 @@ MIN_ROWS_FOR_HEADER_ANALYSIS = 1  # Minimum number of rows required for header a
 MAX_HEADER_COUNT_RETRIES = 2  # Maximum retries when LLM returns wrong header count
 EXCEL_HEADER_GENERATION_SAMPLE_SCAN_LIMIT = max(50, int(os.getenv("EXCEL_HEADER_GENERATION_SAMPLE_SCAN_LIMIT", "500")))
 EXCEL_MAX_TABLE_ROWS_TO_INDEX = max(1, int(os.getenv("EXCEL_MAX_TABLE_ROWS_TO_INDEX", "20000")))
+# Workbooks estimated at or above this many cells are read with openpyxl's
+# read-only row iterators instead of being loaded into memory in full.
+EXCEL_STREAMING_MIN_CELLS = max(1, int(os.getenv("EXCEL_STREAMING_MIN_CELLS", "1000000")))
+
+# Sheet XML carries a <dimension ref="A1:Z9000"/> near its start; scanning
+# this many (uncompressed) bytes of each sheet is enough to find it.
+_DIMENSION_SCAN_BYTES = 4096
+_DIMENSION_RE = re.compile(rb'<(?:\w+:)?dimension\s+ref="([^"]+)"')
+# Roughly what one populated <c r="B12" s="3" t="s"><v>123</v></c> element
+# costs in sheet XML. Estimates a sheet with no usable dimension, and caps
+# one whose dimension spans far more cells than its XML can hold.
+_SHEET_XML_BYTES_PER_CELL = 40
 
 
 # Built-in Excel date format codes mapping
@@ -355,12 +369,54 @@ def format_excel_datetime(dt_value: datetime | time | str | int | float | None,
         return dt_value.isoformat()
 
 
+def estimate_workbook_cells(content: bytes) -> int | None:
+    """Estimate how many cells an xlsx workbook spans, without parsing it.
+
+    Reads each worksheet's ``<dimension>`` element straight from the zip
+    archive, so the cost is a few KB of decompression per sheet regardless of
+    workbook size. The dimension is only an upper bound: a sheet styled down
+    to row 1048576 declares ``A1:XFD1048576`` with a handful of values, so
+    each sheet counts the smaller of its dimension and what its uncompressed
+    XML size can hold. Sheets without a usable dimension are estimated from
+    the XML size alone. Returns ``None`` for anything that is not an xlsx
+    archive (legacy xls, corrupt uploads).
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            total = 0
+            sheets = 0
+            for info in archive.infolist():
+                name = info.filename
+                if not name.startswith("xl/worksheets/") or not name.endswith(".xml") or "/_rels/" in name:
+                    continue
+                sheets += 1
+                with archive.open(info) as src:
+                    head = src.read(_DIMENSION_SCAN_BYTES)
+                cells = 0
+                match = _DIMENSION_RE.search(head)
+                if match:
+                    try:
+                        min_col, min_row, max_col, max_row = range_boundaries(match.group(1).decode("ascii"))
+                        cells = (max_row - min_row + 1) * (max_col - min_col + 1)
+                    except (TypeError, ValueError, UnicodeDecodeError):
+                        cells = 0
+                xml_cells = info.file_size // _SHEET_XML_BYTES_PER_CELL
+                # Some writers emit a placeholder "A1" for every sheet.
+                total += xml_cells if cells <= 1 else min(cells, xml_cells)
+            return total if sheets else None
+    except (zipfile.BadZipFile, OSError, EOFError):
+        return None
+
+
 class ExcelParser:
     def __init__(self, logger: logging.Logger,config_service: ConfigurationService) -> None:
         self.logger = logger
         self.config_service = config_service
         self.workbook = None
         self.file_binary = None
+        # Set by load_workbook_from_binary() for workbooks too large to load
+        # in full; block creation then streams rows from ``file_binary``.
+        self.streaming = False
 
         # Store prompts
         self.sheet_summary_prompt = sheet_summary_prompt
@@ -396,7 +452,19 @@ class ExcelParser:
         """
         self.logger.info("Loading workbook from binary data")
         self.file_binary = file_binary
+        self.streaming = False
         if self.file_binary:
+            estimated_cells = estimate_workbook_cells(file_binary)
+            if estimated_cells is not None and estimated_cells >= EXCEL_STREAMING_MIN_CELLS:
+                # A fully loaded openpyxl workbook costs hundreds of bytes per
+                # cell; defer to the read-only row iterators instead.
+                self.streaming = True
+                self.workbook = None
+                self.logger.info(
+                    f"Workbook spans ~{estimated_cells} cells (>= {EXCEL_STREAMING_MIN_CELLS}); "
+                    "rows will be streamed sheet by sheet"
+                )
+                return
             self.workbook = load_workbook(io.BytesIO(file_binary), data_only=True)
             self.logger.info(f"Workbook loaded successfully with {len(self.workbook.sheetnames)} sheets: {self.workbook.sheetnames}")
 
@@ -406,6 +474,16 @@ class ExcelParser:
         This is the second phase - involves LLM calls for table summaries and row descriptions.
         Must call load_workbook_from_binary() first.
         """
+        if self.streaming:
+            # Table detection and LLM row text need random access to a fully
+            # loaded sheet, so oversized workbooks get the basic hierarchy.
+            self.logger.info("Streaming workbook without LLM enrichment")
+            return await asyncio.to_thread(
+                self._build_streaming_block_container,
+                self.file_binary,
+                None,
+                EXCEL_MAX_TABLE_ROWS_TO_INDEX,
+            )
         self.logger.info("Starting block creation from workbook with LLM")
         try:
             result = await self.get_blocks_from_workbook(llm)
@@ -416,18 +494,15 @@ class ExcelParser:
                 self.logger.info("Closing workbook")
                 self.workbook.close()
 
-    async def parse_workbook(self, content: bytes) -> BlocksContainer:
+    async def parse_workbook(self, content: bytes, max_rows: int | None = None) -> BlocksContainer:
         """Parse workbook from binary without LLM, for use by the Parsing Service.
 
         Produces a basic SHEET → TABLE → TABLE_ROW block hierarchy using
         ``generate_simple_row_text`` for row descriptions instead of LLM calls.
+        Rows are streamed from a read-only workbook, so memory stays bounded
+        by the emitted blocks rather than by the workbook's cell count.
         """
-        self.load_workbook_from_binary(content)
-        try:
-            return self._build_basic_block_container()
-        finally:
-            if self.workbook:
-                self.workbook.close()
+        return await asyncio.to_thread(self._build_streaming_block_container, content, max_rows)
 
     async def create_blocks_lightweight(self, max_rows: int | None = None) -> BlocksContainer:
         """Create blocks from a loaded workbook without LLM enrichment.
@@ -436,6 +511,8 @@ class ExcelParser:
         upload where latency matters and the chat LLM will see the raw blocks.
         """
         self.logger.info("Starting lightweight (no-LLM) block creation from workbook")
+        if self.streaming:
+            return await asyncio.to_thread(self._build_streaming_block_container, self.file_binary, max_rows)
         try:
             return await asyncio.to_thread(self._build_basic_block_container, max_rows)
         finally:
@@ -463,97 +540,192 @@ class ExcelParser:
 
             remaining = None if max_rows is None else max_rows - rows_emitted
             sheet_data = self._process_sheet(self.workbook[sheet_name], max_data_rows=remaining)
-            headers: list = sheet_data.get("headers") or []
             rows: list = sheet_data.get("data") or []
+            rows_emitted += self._append_basic_table(
+                blocks,
+                block_groups,
+                sheet_idx,
+                sheet_name,
+                sheet_data.get("headers") or [],
+                (
+                    (row[0].get("row", ri + 2) if row else ri + 2, [cell.get("value") for cell in row])
+                    for ri, row in enumerate(rows)
+                ),
+            )
 
-            if not rows:
-                continue
+        self.logger.info(
+            "Basic (no-LLM) workbook parsing complete: %d blocks, %d block groups",
+            len(blocks),
+            len(block_groups),
+        )
+        return BlocksContainer(blocks=blocks, block_groups=block_groups)
 
-            col_names = [
-                str(h) if h is not None else f"col_{i}"
-                for i, h in enumerate(headers)
-            ]
+    def _build_streaming_block_container(
+        self,
+        content: bytes | None,
+        max_rows: int | None = None,
+        max_rows_per_sheet: int | None = None,
+    ) -> BlocksContainer:
+        """Build the basic block hierarchy from a read-only, streamed workbook.
+
+        Produces the same SHEET → TABLE → TABLE_ROW structure as
+        ``_build_basic_block_container``, but rows come from openpyxl's
+        read-only ``iter_rows(values_only=True)`` one at a time and only their
+        row text is kept, so neither the cell objects nor the sheet are ever
+        held in memory. Rows with no values at all (styled-but-empty rows
+        that inflate a sheet's dimensions) are skipped.
+        """
+        if not content:
+            return BlocksContainer(blocks=[], block_groups=[])
 
-            # SHEET group
-            sg_idx = len(block_groups)
-            block_groups.append(
-                BlockGroup(
-                    index=sg_idx,
-                    name=sheet_name,
-                    type=GroupType.SHEET,
-                    parent_index=None,
-                    data={"sheet_name": sheet_name, "table_count": 1},
-                    format=DataFormat.JSON,
-                )
-            )
+        blocks: list[Block] = []
+        block_groups: list[BlockGroup] = []
+        rows_emitted = 0
 
-            # TABLE group (one per sheet in the basic non-LLM path)
-            tg_idx = len(block_groups)
-            block_groups.append(
-                BlockGroup(
-                    index=tg_idx,
-                    name=None,
-                    type=GroupType.TABLE,
-                    parent_index=sg_idx,
-                    table_metadata=TableMetadata(
-                        num_of_rows=len(rows),
-                        num_of_cols=len(headers),
-                        num_of_cells=len(rows) * len(headers),
-                    ),
-                    data={
-                        "table_summary": "",
-                        "column_headers": col_names,
-                        "sheet_number": sheet_idx,
-                        "sheet_name": sheet_name,
-                    },
-                    format=DataFormat.JSON,
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        try:
+            for sheet_idx, sheet_name in enumerate(workbook.sheetnames, 1):
+                if max_rows is not None and rows_emitted >= max_rows:
+                    break
+                sheet = workbook[sheet_name]
+                if not hasattr(sheet, "iter_rows"):
+                    continue  # chartsheet
+
+                # A placeholder "A1" dimension would truncate every row to a
+                # single cell; rescan the sheet's real extent instead.
+                if sheet.max_row == 1 and sheet.max_column == 1:
+                    sheet.reset_dimensions()
+
+                limits = [n for n in (max_rows_per_sheet, None if max_rows is None else max_rows - rows_emitted) if n is not None]
+                row_iter = sheet.iter_rows(values_only=True)
+                headers = list(next(row_iter, ()))
+                added = self._append_basic_table(
+                    blocks,
+                    block_groups,
+                    sheet_idx,
+                    sheet_name,
+                    headers,
+                    self._iter_non_empty_rows(row_iter, min(limits) if limits else None),
                 )
-            )
+                rows_emitted += added
+                self.logger.info(f"Streamed {added} data rows from sheet: {sheet_name}")
+        finally:
+            workbook.close()
 
-            # TABLE_ROW blocks
-            row_indices: list[int] = []
-            for ri, row in enumerate(rows):
-                row_data = {
-                    (
-                        cell.get("header")
-                        or (col_names[ci] if ci < len(col_names) else f"col_{ci}")
-                    ): cell.get("value")
-                    for ci, cell in enumerate(row)
-                }
-                bi = len(blocks)
-                row_num = row[0].get("row", ri + 2) if row else ri + 2
-                blocks.append(
-                    Block(
-                        index=bi,
-                        type=BlockType.TABLE_ROW,
+        self.logger.info(
+            "Streaming (no-LLM) workbook parsing complete: %d blocks, %d block groups",
+            len(blocks),
+            len(block_groups),
+        )
+        return BlocksContainer(blocks=blocks, block_groups=block_groups)
+
+    @staticmethod
+    def _iter_non_empty_rows(
+        rows: Iterable[Sequence[Any]], limit: int | None
+    ) -> Iterable[tuple[int, Sequence[Any]]]:
+        """Yield ``(row_number, values)`` for data rows (row 2 onwards) with any value."""
+        emitted = 0
+        for row_number, values in enumerate(rows, 2):
+            if limit is not None and emitted >= limit:
+                return
+            if all(value is None for value in values):
+                continue
+            emitted += 1
+            yield row_number, values
+
+    def _append_basic_table(
+        self,
+        blocks: list[Block],
+        block_groups: list[BlockGroup],
+        sheet_idx: int,
+        sheet_name: str,
+        headers: list[Any],
+        rows: Iterable[tuple[int, Sequence[Any]]],
+    ) -> int:
+        """Append a SHEET group, its single TABLE group and one TABLE_ROW block per row.
+
+        ``rows`` is consumed lazily; nothing is appended for a sheet without
+        data rows. Returns the number of rows added.
+        """
+        col_names = [
+            str(h) if h is not None else f"col_{i}"
+            for i, h in enumerate(headers)
+        ]
+        sg_idx = tg_idx = -1
+        row_indices: list[int] = []
+
+        for row_num, values in rows:
+            if not row_indices:
+                # SHEET group
+                sg_idx = len(block_groups)
+                block_groups.append(
+                    BlockGroup(
+                        index=sg_idx,
+                        name=sheet_name,
+                        type=GroupType.SHEET,
+                        parent_index=None,
+                        data={"sheet_name": sheet_name, "table_count": 1},
                         format=DataFormat.JSON,
+                    )
+                )
+
+                # TABLE group (one per sheet in the basic non-LLM path)
+                tg_idx = len(block_groups)
+                block_groups.append(
+                    BlockGroup(
+                        index=tg_idx,
+                        name=None,
+                        type=GroupType.TABLE,
+                        parent_index=sg_idx,
                         data={
-                            "row_natural_language_text": generate_simple_row_text(row_data),
-                            "row_number": int(row_num),
-                            "row_end_number": int(row_num),
-                            "row_count": 1,
+                            "table_summary": "",
+                            "column_headers": col_names,
                             "sheet_number": sheet_idx,
                             "sheet_name": sheet_name,
                         },
-                        parent_index=tg_idx,
+                        format=DataFormat.JSON,
                     )
                 )
-                row_indices.append(bi)
 
-            block_groups[tg_idx].children = BlockGroupChildren.from_indices(
-                block_indices=row_indices
-            )
-            block_groups[sg_idx].children = BlockGroupChildren.from_indices(
-                block_group_indices=[tg_idx]
+            # TABLE_ROW block
+            row_data = {
+                (col_names[ci] if ci < len(col_names) else f"col_{ci}"): value
+                for ci, value in enumerate(values)
+            }
+            bi = len(blocks)
+            blocks.append(
+                Block(
+                    index=bi,
+                    type=BlockType.TABLE_ROW,
+                    format=DataFormat.JSON,
+                    data={
+                        "row_natural_language_text": generate_simple_row_text(row_data),
+                        "row_number": int(row_num),
+                        "row_end_number": int(row_num),
+                        "row_count": 1,
+                        "sheet_number": sheet_idx,
+                        "sheet_name": sheet_name,
+                    },
+                    parent_index=tg_idx,
+                )
             )
-            rows_emitted += len(rows)
+            row_indices.append(bi)
 
-        self.logger.info(
-            "Basic (no-LLM) workbook parsing complete: %d blocks, %d block groups",
-            len(blocks),
-            len(block_groups),
+        if not row_indices:
+            return 0
+
+        block_groups[tg_idx].table_metadata = TableMetadata(
+            num_of_rows=len(row_indices),
+            num_of_cols=len(headers),
+            num_of_cells=len(row_indices) * len(headers),
         )
-        return BlocksContainer(blocks=blocks, block_groups=block_groups)
+        block_groups[tg_idx].children = BlockGroupChildren.from_indices(
+            block_indices=row_indices
+        )
+        block_groups[sg_idx].children = BlockGroupChildren.from_indices(
+            block_group_indices=[tg_idx]
+        )
+        return len(row_indices)
 
     def _json_default(self, obj: object) -> str:
         if isinstance(obj, (datetime, time)):
@@ -1381,19 +1381,59 @@ def _find_vector_bullets(
 # Public entry point
 # --------------------------------------------------------------------------- #
 
+RasterBatch = Dict[int, Tuple[np.ndarray, float]]
+
+
 class DocumentRasterCache:
-    """Lazy per-document raster cache; one pdfplumber render pass for all pages."""
+    """Lazy per-document raster cache, rendered a window of pages at a time.
+
+    A miss on page ``n`` renders ``n`` and up to ``batch_pages - 1`` following
+    pages (capped at ``page_count`` when known) in one call, so a sequential
+    walk pays one render round-trip per window instead of per page. Callers
+    walking a document should :meth:`release` each page once it is analysed;
+    held rasters then stay bounded by the window rather than the document.
+
+    ``render`` takes ``(page_numbers, dpi)`` and returns ``{page: (rgb, scale)}``;
+    the default renders from *pdf_path* through the rasterizer process pool.
+    """
 
-    def __init__(self, pdf_path: str, dpi: int = _DPI) -> None:
+    def __init__(
+        self,
+        pdf_path: str,
+        dpi: int = _DPI,
+        *,
+        page_count: Optional[int] = None,
+        batch_pages: int = 1,
+        render: Optional[Callable[[List[int], int], RasterBatch]] = None,
+    ) -> None:
         self._pdf_path = pdf_path
         self._dpi = dpi
-        self._cache: Optional[Dict[int, Tuple[np.ndarray, float]]] = None
+        self._page_count = page_count
+        self._batch_pages = max(1, batch_pages)
+        self._render = render
+        self._cache: RasterBatch = {}
 
     def get(self, page_number: int) -> Tuple[np.ndarray, float]:
-        if self._cache is None:
-            self._cache = _render_all_pages(self._pdf_path, self._dpi)
+        cached = self._cache.get(page_number)
+        if cached is not None:
+            return cached
+        last = page_number + self._batch_pages - 1
+        if self._page_count is not None:
+            last = max(page_number, min(last, self._page_count))
+        window = [
+            n for n in range(page_number, last + 1) if n not in self._cache
+        ]
+        if self._render is not None:
+            rendered = self._render(window, self._dpi)
+        else:
+            rendered = _render_pages(self._pdf_path, window, self._dpi)
+        self._cache.update(rendered)
         return self._cache[page_number]
 
+    def release(self, page_number: int) -> None:
+        """Drop the raster for *page_number*; a later :meth:`get` re-renders it."""
+        self._cache.pop(page_number, None)
+
 
 class _VectorPrimitiveCounter(PDFDevice):
     """Counts path-painting sub-paths without building any layout object.
@@ -4331,10 +4371,10 @@ def _merge_small_text_regions(
 # Rasterization
 # --------------------------------------------------------------------------- #
 
-def _render_all_pages(pdf_path: str, dpi: int) -> Dict[int, Tuple[np.ndarray, float]]:
-    from app.modules.parsers.pdf.pdf_rasterizer import render_all_pages_from_path_sync
+def _render_pages(pdf_path: str, page_numbers: List[int], dpi: int) -> RasterBatch:
+    from app.modules.parsers.pdf.pdf_rasterizer import render_batch_from_path_sync
 
-    return render_all_pages_from_path_sync(pdf_path, dpi)
+    return render_batch_from_path_sync(pdf_path, page_numbers, dpi)
 
 
 def _rasterize_page(
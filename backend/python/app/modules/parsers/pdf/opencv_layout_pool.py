@@ -0,0 +1,235 @@
+"""
+Page-sharded OpenCV layout analysis for PDFPlumberOpenCVProcessor.
+
+``extract_layout_regions`` is pure-Python/OpenCV CPU work per page, so running
+a document's pages one after another in a single thread leaves every other
+core idle. Documents longer than one shard are split into runs of
+``PDF_LAYOUT_SHARD_PAGES`` pages and analysed in a dedicated spawn process
+pool, with at most ``PDF_LAYOUT_WORKERS`` shards of one document in flight at
+a time so a long document cannot queue its whole length ahead of others.
+
+Inside a worker, pages are rasterized on demand in-process (a worker is
+single-threaded, so pdfium needs no further isolation there) and each page's
+raster and pdfplumber caches are dropped as soon as the page is analysed.
+Peak memory per worker is therefore one page, not one document.
+
+This module deliberately imports only pdfplumber and the layout analyzer so
+spawned workers start without the service's config/LLM stack.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import pdfplumber
+
+from app.modules.parsers.pdf.opencv_layout_analyzer import (
+    DocumentRasterCache,
+    LayoutRegion,
+    extract_layout_regions,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from app.services.resource_governor import ResourceGovernor
+
+_logger = logging.getLogger(__name__)
+
+# Wired by each service's lifespan next to pdf_rasterizer's governor; see the
+# note there on why this is a module-level singleton.
+_resource_governor: ResourceGovernor | None = None
+
+
+def set_resource_governor(governor: ResourceGovernor | None) -> None:
+    """Wire an initialized ResourceGovernor so a layout worker OOM-kill is
+    reported immediately."""
+    globals()["_resource_governor"] = governor
+
+
+def _get_pdf_layout_worker_count() -> int:
+    raw_value = os.getenv("PDF_LAYOUT_WORKERS")
+    if raw_value:
+        try:
+            return max(1, int(raw_value))
+        except ValueError:
+            pass
+
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(cpu_count, 4))
+
+
+def _get_pdf_layout_shard_pages() -> int:
+    raw_value = os.getenv("PDF_LAYOUT_SHARD_PAGES")
+    if raw_value:
+        try:
+            return max(1, int(raw_value))
+        except ValueError:
+            pass
+    return 4
+
+
+PDF_LAYOUT_WORKERS = _get_pdf_layout_worker_count()
+PDF_LAYOUT_SHARD_PAGES = _get_pdf_layout_shard_pages()
+
+
+@dataclass
+class ParsedPageData:
+    page_number: int
+    width: float
+    height: float
+    regions: list[LayoutRegion]
+
+
+@lru_cache(maxsize=1)
+def _get_pdf_layout_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=PDF_LAYOUT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_pdf_layout_pool() -> bool:
+    """Shut down the PDF layout-analysis process pool if it was initialised."""
+    if _get_pdf_layout_pool.cache_info().currsize == 0:
+        return False
+    _get_pdf_layout_pool().shutdown(wait=False, cancel_futures=True)
+    _get_pdf_layout_pool.cache_clear()
+    return True
+
+
+@atexit.register
+def _shutdown_pdf_layout_pool_on_exit() -> None:
+    shutdown_pdf_layout_pool()
+
+
+def count_pages(pdf_path: str) -> int:
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def analyze_pages(
+    pdf_path: str,
+    page_numbers: Iterable[int] | None = None,
+    *,
+    render_in_process: bool = False,
+) -> list[ParsedPageData]:
+    """Run layout analysis over 1-based *page_numbers* (default: every page).
+
+    With ``render_in_process`` rasters come straight from the open document,
+    one page at a time; otherwise they are rendered through the rasterizer
+    pool in windows of ``PDF_LAYOUT_SHARD_PAGES``. Either way each page's
+    raster is released once its regions are extracted.
+    """
+    from app.modules.parsers.pdf.pdf_rasterizer import render_open_pages
+
+    out: list[ParsedPageData] = []
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        if render_in_process:
+            raster_cache = DocumentRasterCache(
+                pdf_path,
+                page_count=page_count,
+                render=lambda numbers, dpi: render_open_pages(pdf, numbers, dpi),
+            )
+        else:
+            raster_cache = DocumentRasterCache(
+                pdf_path,
+                page_count=page_count,
+                batch_pages=PDF_LAYOUT_SHARD_PAGES,
+            )
+        numbers = range(1, page_count + 1) if page_numbers is None else page_numbers
+        for page_number in numbers:
+            page = pdf.pages[page_number - 1]
+            try:
+                regions = extract_layout_regions(
+                    page, pdf_path=pdf_path, raster_cache=raster_cache
+                )
+                out.append(
+                    ParsedPageData(
+                        page_number=page_number,
+                        width=float(page.width),
+                        height=float(page.height),
+                        regions=regions,
+                    )
+                )
+            finally:
+                raster_cache.release(page_number)
+                page.close()
+    return out
+
+
+def _worker_analyze_pages(
+    pdf_path: str,
+    page_numbers: list[int],
+) -> list[ParsedPageData]:
+    return analyze_pages(pdf_path, page_numbers, render_in_process=True)
+
+
+async def analyze_pages_in_pool(
+    pdf_path: str,
+    page_count: int,
+    *,
+    shard_pages: int | None = None,
+    max_in_flight: int | None = None,
+) -> list[ParsedPageData]:
+    """Analyse every page of *pdf_path* in page-order shards on the layout pool.
+
+    Results are returned in page order regardless of which shard finishes
+    first. If any shard fails, shards not yet started are cancelled and the
+    error propagates.
+    """
+    shard_pages = shard_pages or PDF_LAYOUT_SHARD_PAGES
+    max_in_flight = max_in_flight or PDF_LAYOUT_WORKERS
+    shards = [
+        list(range(start, min(start + shard_pages, page_count + 1)))
+        for start in range(1, page_count + 1, shard_pages)
+    ]
+
+    loop = asyncio.get_running_loop()
+    results: list[ParsedPageData] = []
+    pending: set[asyncio.Future] = set()
+    try:
+        pool = _get_pdf_layout_pool()
+        for shard in shards:
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in done:
+                    results.extend(fut.result())
+            pending.add(
+                loop.run_in_executor(pool, _worker_analyze_pages, pdf_path, shard)
+            )
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for fut in done:
+                results.extend(fut.result())
+    except BrokenProcessPool:
+        _logger.warning(
+            "PDF layout process pool broke (worker likely OOM-killed); "
+            "recreating pool"
+        )
+        _get_pdf_layout_pool.cache_clear()
+        if _resource_governor is not None:
+            _resource_governor.report_memory_incident(
+                "opencv layout worker OOM-killed (BrokenProcessPool)"
+            )
+        raise
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+    results.sort(key=lambda page_data: page_data.page_number)
+    return results
@@ -151,13 +151,25 @@ def _render_batch_impl(
     else:
         ctx = pdfplumber.open(BytesIO(pdf_bytes))
 
-    result: Dict[int, Tuple[np.ndarray, float]] = {}
     with ctx as pdf:
-        for page_number in page_numbers:
-            result[page_number] = _page_to_rgb_array(
-                pdf.pages[page_number - 1], resolution
-            )
-    return result
+        return render_open_pages(pdf, page_numbers, resolution)
+
+
+def render_open_pages(
+    pdf: pdfplumber.PDF,
+    page_numbers: list[int],
+    resolution: float = 72,
+) -> dict[int, tuple[np.ndarray, float]]:
+    """Render 1-based *page_numbers* of an already-open pdfplumber document.
+
+    Runs pdfium in the calling process, so it is only safe where nothing else
+    renders concurrently: inside a pool worker, never from the service's
+    event loop or thread pool (use the ``*_sync`` helpers there).
+    """
+    return {
+        page_number: _page_to_rgb_array(pdf.pages[page_number - 1], resolution)
+        for page_number in page_numbers
+    }
 
 
 def _worker_render_all_from_path(
@@ -7,12 +7,9 @@ import os
 import re
 import tempfile
 import uuid
-from dataclasses import dataclass
 from io import BytesIO
 from typing import List, Optional, Tuple
 
-import pdfplumber
-
 from app.config.configuration_service import ConfigurationService
 from app.models.blocks import (
     Block,
@@ -30,10 +27,16 @@ from app.models.blocks import (
     TableMetadata,
 )
 from app.modules.parsers.pdf.opencv_layout_analyzer import (
-    DocumentRasterCache,
     LayoutRegion,
     LayoutRegionType,
-    extract_layout_regions,
+)
+from app.modules.parsers.pdf.opencv_layout_pool import (
+    PDF_LAYOUT_SHARD_PAGES,
+    PDF_LAYOUT_WORKERS,
+    ParsedPageData,
+    analyze_pages,
+    analyze_pages_in_pool,
+    count_pages,
 )
 from app.utils.indexing_helpers import generate_simple_row_text
 from app.utils.indexing_metrics import track_indexing_enrichment
@@ -59,12 +62,12 @@ def _normalize_bbox_to_points(
         Point(x=x0 / page_width, y=y1 / page_height),
     ]
 
-@dataclass
-class ParsedPageData:
-    page_number: int
-    width: float
-    height: float
-    regions: List[LayoutRegion]
+def _write_temp_pdf(pdf_bytes: bytes) -> str:
+    with tempfile.NamedTemporaryFile(
+        delete=False, suffix=".pdf", prefix="pipeshub_pdf_"
+    ) as tmp:
+        tmp.write(pdf_bytes)
+        return tmp.name
 
 
 class PDFPlumberOpenCVProcessor:
@@ -89,39 +92,25 @@ class PDFPlumberOpenCVProcessor:
         stream.seek(0)
         pdf_bytes = stream.read()
 
-        def _parse_sync() -> List[ParsedPageData]:
-            out: List[ParsedPageData] = []
-            tmp_path: str | None = None
+        tmp_path = await asyncio.to_thread(_write_temp_pdf, pdf_bytes)
+        try:
+            page_count = (
+                await asyncio.to_thread(count_pages, tmp_path)
+                if PDF_LAYOUT_WORKERS > 1
+                else 0
+            )
+            if page_count > PDF_LAYOUT_SHARD_PAGES:
+                # Layout analysis is CPU-bound per page: shard it across the
+                # layout process pool instead of walking pages in one thread.
+                pages_data = await analyze_pages_in_pool(tmp_path, page_count)
+            else:
+                pages_data = await asyncio.to_thread(analyze_pages, tmp_path)
+        finally:
             try:
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=".pdf", prefix="pipeshub_pdf_"
-                ) as tmp:
-                    tmp_path = tmp.name
-                    tmp.write(pdf_bytes)
-                    tmp.flush()
-                with pdfplumber.open(tmp_path) as pdf:
-                    raster_cache = DocumentRasterCache(tmp_path)
-                    for page_idx, page in enumerate(pdf.pages):
-                        regions = extract_layout_regions(
-                            page, pdf_path=tmp_path, raster_cache=raster_cache
-                        )
-                        out.append(
-                            ParsedPageData(
-                                page_number=page_idx + 1,
-                                width=float(page.width),
-                                height=float(page.height),
-                                regions=regions,
-                            )
-                        )
-            finally:
-                if tmp_path is not None:
-                    try:
-                        os.unlink(tmp_path)
-                    except OSError:
-                        pass
-            return out
-
-        pages_data = await asyncio.to_thread(_parse_sync)
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
         for pd in pages_data:
             self.logger.debug(
                 f"Page {pd.page_number}: detected {len(pd.regions)} layout regions"
@@ -5,6 +5,7 @@ import torch
 from sentence_transformers import CrossEncoder
 
 from app.models.blocks import BlockType, GroupType
+from app.utils.query_timing import timed_phase
 
 
 class RerankerService:
@@ -52,6 +53,7 @@ class RerankerService:
                 self.model = await asyncio.to_thread(self._load_model_sync)
         return self.model
 
+    @timed_phase("rerank")
     async def rerank(
         self, query: str, documents: List[Dict[str, Any]], top_k: Optional[int] = None
     ) -> List[Dict[str, Any]]:
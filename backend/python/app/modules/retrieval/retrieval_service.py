@@ -1,6 +1,4 @@
 import asyncio
-import hashlib
-import json
 import time
 import traceback
 from typing import Any
@@ -16,6 +14,7 @@ from app.config.constants.ai_models import (
 # from langchain_cohere import CohereEmbeddings
 from app.config.constants.arangodb import (
     CollectionNames,
+    ProgressStatus,
     RecordTypes,
 )
 from app.config.constants.service import config_node_constants
@@ -23,24 +22,31 @@ from app.exceptions.fastapi_responses import Status
 from app.models.blocks import GroupType
 from app.modules.transformers.blob_storage import BlobStorage
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
+from app.services.vector_db.acl import (
+    ACL_CONNECTOR_FIELD,
+    ACL_TOKENS_FIELD,
+    RecordAclPrincipals,
+    UserAclPrincipals,
+    acl_filter_enabled,
+    verify_accessible_records,
+)
 from app.services.vector_db.interface.vector_db import IVectorDBService
 from app.services.vector_db.models import (
     FusionMethod,
     HybridSearchRequest,
+    SearchPrecision,
 )
 from app.services.vector_db.sparse_embeddings import SparseEmbedder
 from app.sources.client.http.exception.exception import VectorDBEmptyError
-from app.utils.aimodels import (
-    get_default_embedding_model,
-    get_embedding_model,
-    get_generator_model,
-)
+from app.utils.aimodels import get_generator_model
 from app.utils.chat_helpers import (
     GRAPH_BATCH_CHUNK_SIZE,
     get_flattened_results,
     get_record,
 )
+from app.utils.embedding_runtime import get_embedding_runtime
 from app.utils.image_utils import get_extension_from_mimetype
+from app.utils.query_timing import phase
 
 # OPTIMIZATION: User data cache with TTL
 _user_cache: dict[str, tuple] = {}  # {user_id: (user_data, timestamp)}
@@ -51,6 +57,29 @@ MAX_USER_CACHE_SIZE = 1000  # Max number of users to keep in cache
 # own default so the None path and the omitted path retrieve the same amount.
 DEFAULT_SEARCH_LIMIT = 20
 
+# Vector search precision per `chatMode`. Single-turn, latency-first modes
+# take the narrow HNSW beam; research/verification modes that read many
+# chunks before answering pay for wide beams and rescored candidates.
+# Anything unlisted (internal_search, agent, react, legacy "standard", ...)
+# keeps the index defaults.
+_CHAT_MODE_PRECISION: dict[str, SearchPrecision] = {
+    "quick": SearchPrecision.FAST,
+    "web_search": SearchPrecision.FAST,
+    "deep": SearchPrecision.EXACT,
+    "deep_research": SearchPrecision.EXACT,
+    "analysis": SearchPrecision.EXACT,
+    "precise": SearchPrecision.EXACT,
+    "planexecute": SearchPrecision.EXACT,
+    "verification": SearchPrecision.EXACT,
+}
+
+
+def search_precision_for_chat_mode(chat_mode: str | None) -> SearchPrecision:
+    """Map a `chatMode` wire value (case-insensitive) to a search precision."""
+    if not chat_mode:
+        return SearchPrecision.BALANCED
+    return _CHAT_MODE_PRECISION.get(chat_mode.strip().lower(), SearchPrecision.BALANCED)
+
 # User-facing guidance when the graph/permissions yield no searchable corpus
 ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE = (
     "No documents are available for you to search yet. Upload files in Collections "
@@ -104,12 +133,6 @@ class RetrievalService:
         self._sparse_embedder: SparseEmbedder | None = None
         self._sparse_embedder_lock = asyncio.Lock()
 
-        # Dense embedding model cache: re-read config on every call to detect
-        # provider changes, but reuse the built instance when config is stable.
-        self._cached_dense_embeddings: Embeddings | None = None
-        self._cached_embedding_config_hash: str | None = None
-        self._embedding_model_lock = asyncio.Lock()
-
         self.logger.info(
             f"Retrieval service initialised: collection='{collection_name}', "
             f"provider='{vector_db_service.get_service_name()}', "
@@ -130,7 +153,7 @@ class RetrievalService:
                 self._sparse_embedder = embedder
         return self._sparse_embedder
 
-    async def get_llm_instance(self, use_cache: bool = False) -> BaseChatModel | None:
+    async def get_llm_instance(self, use_cache: bool | None = None) -> BaseChatModel | None:
         try:
             self.logger.info("Getting LLM")
             ai_models = await self.config_service.get_config(
@@ -167,73 +190,25 @@ class RetrievalService:
             self.logger.error(f"Error getting LLM: {str(e)}")
             return None
 
-    @staticmethod
-    def _embedding_config_hash(embedding_configs: list[dict[str, Any]] | None) -> str:
-        """Deterministic hash of the embedding config for cache invalidation."""
-        if not embedding_configs:
-            return "default"
-        serialisable = []
-        for cfg in embedding_configs:
-            serialisable.append({
-                "provider": cfg.get("provider"),
-                "isDefault": cfg.get("isDefault"),
-                "model": (cfg.get("configuration") or {}).get("model"),
-                "endpoint": (cfg.get("configuration") or {}).get("endpoint"),
-            })
-        return hashlib.sha256(
-            json.dumps(serialisable, sort_keys=True).encode()
-        ).hexdigest()[:16]
+    async def get_embedding_model_instance(self, use_cache: bool = True) -> Embeddings | None:
+        """Return the shared embedding runtime for the configured model.
 
-    async def get_embedding_model_instance(self, use_cache: bool = False) -> Embeddings | None:
-        """Return the dense embedding model, cached across calls while config is stable.
-
-        The config is re-read every call so a provider/model change in the admin
-        UI takes effect immediately; but when the config hash hasn't changed the
-        previously-built model instance is reused, avoiding the heavy
-        construction cost on every query.
+        The config is read from the configuration service's local cache, which
+        its store watch clears on change, so a steady-state query costs no
+        store round trip and no model construction. ``use_cache=False`` (the
+        ``embeddingModelConfigured`` handler) forces a store read; a changed
+        config swaps the runtime in ``app.utils.embedding_runtime``.
         """
         try:
             ai_models = await self.config_service.get_config(
                 config_node_constants.AI_MODELS.value, use_cache=use_cache
             )
-            embedding_configs = (ai_models or {}).get("embedding")
-            config_hash = self._embedding_config_hash(embedding_configs)
-
-            if (
-                self._cached_dense_embeddings is not None
-                and self._cached_embedding_config_hash == config_hash
-            ):
-                return self._cached_dense_embeddings
-
-            async with self._embedding_model_lock:
-                if (
-                    self._cached_dense_embeddings is not None
-                    and self._cached_embedding_config_hash == config_hash
-                ):
-                    return self._cached_dense_embeddings
-
-                if not embedding_configs:
-                    self.logger.info("No embedding config found; using default embedding model")
-                    dense_embeddings = await asyncio.to_thread(get_default_embedding_model)
-                else:
-                    selected_config = next(
-                        (c for c in embedding_configs if c.get("isDefault", False)),
-                        embedding_configs[0],
-                    )
-                    provider = selected_config["provider"]
-                    self.logger.info(f"Using embedding provider: {provider}")
-                    dense_embeddings = await asyncio.to_thread(
-                        get_embedding_model, provider, selected_config
-                    )
-
-                self._cached_dense_embeddings = dense_embeddings
-                self._cached_embedding_config_hash = config_hash
-                return dense_embeddings
+            return await get_embedding_runtime((ai_models or {}).get("embedding"))
         except Exception as e:
             self.logger.error(f"Error getting embedding model: {str(e)}")
             return None
 
-    async def get_current_embedding_model_name(self, use_cache: bool = False) -> str | None:
+    async def get_current_embedding_model_name(self, use_cache: bool | None = None) -> str | None:
         """Get the current embedding model name from configuration or instance."""
         try:
             # First try to get from AI_MODELS config
@@ -299,7 +274,7 @@ class RetrievalService:
         """
         try:
             # Get current model name from config
-            model_name = await self.get_current_embedding_model_name(use_cache=False)
+            model_name = await self.get_current_embedding_model_name(use_cache=True)
 
             # Check if using BGE model before adding the prefix
             if model_name and "bge" in model_name.lower():
@@ -332,8 +307,13 @@ class RetrievalService:
         virtual_record_ids_from_tool: list[str] | None = None,
         knowledge_search: bool = False,
         time_range: dict[str, int] | None = None,
+        chat_mode: str | None = None,
     ) -> dict[str, Any]:
-        """Perform semantic search on records the given user may access (graph permission checks)."""
+        """Perform semantic search on records the given user may access (graph permission checks).
+
+        `chat_mode` picks the vector search precision profile (see
+        `search_precision_for_chat_mode`); omit it for the index defaults.
+        """
 
         try:
             # Get accessible records
@@ -365,33 +345,74 @@ class RetrievalService:
                     metadata_key = key.lower()  # e.g., 'departments', 'categories', etc.
                     filters[metadata_key] = values
 
-            init_tasks = [
-                self._get_accessible_virtual_ids_task(
-                    user_id, org_id, filters, self.graph_provider, time_range=time_range
-                ),
-                self._get_user_cached(user_id)  # Get user info in parallel with caching
-            ]
+            # ACL-token path: filter on the user's handful of principals instead of
+            # every accessible virtualRecordId. Metadata/time-range filters are only
+            # resolvable in the graph, so those queries keep the IN-list path.
+            use_acl_filter = (
+                acl_filter_enabled()
+                and not virtual_record_ids_from_tool
+                and not time_range
+                and not any(v for k, v in filters.items() if k not in ("kb", "apps"))
+            )
 
-            accessible_virtual_id_to_record_id, user = await asyncio.gather(*init_tasks)
+            user_principals: UserAclPrincipals | None = None
+            if use_acl_filter:
+                with phase("permission_fetch"):
+                    principals_data, user = await asyncio.gather(
+                        self.graph_provider.get_user_acl_principals(user_id, org_id),
+                        self._get_user_cached(user_id),
+                    )
+                if not principals_data:
+                    self.logger.error(f"No ACL principals found for user {user_id} and org {org_id}")
+                    return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
+                user_principals = UserAclPrincipals.from_dict(principals_data, org_id)
+                connector_ids = self._acl_connector_scope(user_principals, filters)
+                if not connector_ids:
+                    self.logger.error(f"No accessible apps found for user {user_id} and org {org_id}")
+                    return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
+                acl_tokens = user_principals.tokens()
+                self.logger.debug(
+                    f"ACL filter: {len(acl_tokens)} tokens, {len(connector_ids)} connectors"
+                )
+                search_filter = await self.vector_db_service.filter_collection(
+                        must={
+                            "orgId": org_id,
+                            ACL_CONNECTOR_FIELD: connector_ids,
+                            ACL_TOKENS_FIELD: acl_tokens,
+                        }
+                    )
+            else:
+                init_tasks = [
+                    self._get_accessible_virtual_ids_task(
+                        user_id, org_id, filters, self.graph_provider, time_range=time_range
+                    ),
+                    self._get_user_cached(user_id)  # Get user info in parallel with caching
+                ]
 
-            if not accessible_virtual_id_to_record_id:
-                self.logger.error(f"No accessible documents found for user {user_id} and org {org_id}")
-                return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
+                with phase("permission_fetch"):
+                    accessible_virtual_id_to_record_id, user = await asyncio.gather(*init_tasks)
+
+                if not accessible_virtual_id_to_record_id:
+                    self.logger.error(f"No accessible documents found for user {user_id} and org {org_id}")
+                    return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
 
-            self.logger.debug(f"Accessible virtual record ids count: {len(accessible_virtual_id_to_record_id)}")
+                self.logger.debug(f"Accessible virtual record ids count: {len(accessible_virtual_id_to_record_id)}")
+
+                if virtual_record_ids_from_tool:
+                    search_filter = await self.vector_db_service.filter_collection(
+                            must={"orgId": org_id,"virtualRecordId": virtual_record_ids_from_tool},
+                        )
+                else:
+                    search_filter = await self.vector_db_service.filter_collection(
+                            must={"orgId": org_id, "virtualRecordId": list(accessible_virtual_id_to_record_id.keys())}
+                        )
 
             # Graph key for KH permission_role checks (Location trails).
             user_key = (user.get("_key") or user.get("id")) if user else None
 
-            if virtual_record_ids_from_tool:
-                filter  = await self.vector_db_service.filter_collection(
-                        must={"orgId": org_id,"virtualRecordId": virtual_record_ids_from_tool},
-                    )
-            else:
-                filter = await self.vector_db_service.filter_collection(
-                        must={"orgId": org_id, "virtualRecordId": list(accessible_virtual_id_to_record_id.keys())}
-                    )
-            search_results = await self._execute_parallel_searches(queries, filter, limit)
+            search_results = await self._execute_parallel_searches(
+                queries, search_filter, limit, precision=search_precision_for_chat_mode(chat_mode)
+            )
 
             if not search_results:
                 self.logger.debug("No search results found")
@@ -414,6 +435,20 @@ class RetrievalService:
             if not returned_virtual_record_ids:
                 return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
 
+            if user_principals is not None:
+                # Tokens are an indexing-time snapshot; re-check the top-k hits
+                # against the live graph before trusting them.
+                with phase("permission_fetch"):
+                    accessible_virtual_id_to_record_id = await self._verify_acl_candidates(
+                        user_principals, org_id, filters, returned_virtual_record_ids
+                    )
+                self.logger.debug(
+                    f"ACL post-verification kept {len(accessible_virtual_id_to_record_id)}"
+                    f" of {len(returned_virtual_record_ids)} virtualRecordIds"
+                )
+                if not accessible_virtual_id_to_record_id:
+                    return self._create_empty_response(ACCESSIBLE_RECORDS_NOT_FOUND_MESSAGE, Status.ACCESSIBLE_RECORDS_NOT_FOUND)
+
             # Resolve only the permission-verified recordIds for the returned virtual IDs.
             # This prevents cross-connector leakage: if multiple connectors share the same
             # virtualRecordId, we only fetch the specific record the user has access to.
@@ -424,9 +459,10 @@ class RetrievalService:
             })
 
             self.logger.debug(f"Fetching {len(record_ids_to_fetch)} records by permission-verified record IDs")
-            fetched_records = await self.graph_provider.get_records_by_record_ids(
-                record_ids_to_fetch, org_id
-            )
+            with phase("graph_hydrate"):
+                fetched_records = await self.graph_provider.get_records_by_record_ids(
+                    record_ids_to_fetch, org_id
+                )
 
             if not fetched_records:
                 self.logger.error("Failed to fetch records by record IDs")
@@ -622,12 +658,13 @@ class RetrievalService:
                     return {}
 
             locations_map: dict[str, str] = {}
-            if file_record_ids_to_fetch or mail_record_ids_to_fetch or unique_record_ids:
-                files_map, mails_map, locations_map = await asyncio.gather(
-                    fetch_files(), fetch_mails(), fetch_locations()
-                )
-            else:
-                files_map, mails_map = await asyncio.gather(fetch_files(), fetch_mails())
+            with phase("graph_hydrate"):
+                if file_record_ids_to_fetch or mail_record_ids_to_fetch or unique_record_ids:
+                    files_map, mails_map, locations_map = await asyncio.gather(
+                        fetch_files(), fetch_mails(), fetch_locations()
+                    )
+                else:
+                    files_map, mails_map = await asyncio.gather(fetch_files(), fetch_mails())
 
             for idx, (record_id, record_type) in result_to_record_map.items():
                 result = search_results[idx]
@@ -763,6 +800,38 @@ class RetrievalService:
             user_id=user_id, org_id=org_id, filters=filters, time_range=time_range
         )
 
+    @staticmethod
+    def _acl_connector_scope(
+        user_principals: UserAclPrincipals, filters: dict[str, list[str]]
+    ) -> list[str]:
+        """Connector/KB ids to search, narrowed by the request's ``kb``/``apps`` filters."""
+        connector_ids = user_principals.connector_ids()
+        requested = set(filters.get("kb") or []) | set(filters.get("apps") or [])
+        if requested:
+            connector_ids = [cid for cid in connector_ids if cid in requested]
+        return connector_ids
+
+    async def _verify_acl_candidates(
+        self,
+        user_principals: UserAclPrincipals,
+        org_id: str,
+        filters: dict[str, list[str]],
+        virtual_record_ids: list[str],
+    ) -> dict[str, str]:
+        """Live-graph permission check for the virtualRecordIds returned by an ACL-filtered search."""
+        rows = await self.graph_provider.get_records_acl_principals(
+            org_id, virtual_record_ids=virtual_record_ids
+        )
+        scope = set(self._acl_connector_scope(user_principals, filters))
+        records = [
+            record
+            for record in (RecordAclPrincipals.from_dict(row) for row in rows or [])
+            if record.connector_id in scope
+        ]
+        return verify_accessible_records(
+            user_principals, records, completed_status=ProgressStatus.COMPLETED.value
+        )
+
     async def _get_user_cached(self, user_id: str) -> dict[str, Any] | None:
         """
         OPTIMIZATION: Get user data with caching to avoid repeated DB calls.
@@ -795,7 +864,9 @@ class RetrievalService:
 
         return user_data
 
-    async def _execute_parallel_searches(self, queries, filter, limit) -> list[dict[str, Any]]:
+    async def _execute_parallel_searches(
+        self, queries, filter, limit, precision: SearchPrecision = SearchPrecision.BALANCED,
+    ) -> list[dict[str, Any]]:
         """Execute all searches in parallel using hybrid (dense + sparse) retrieval with RRF fusion.
 
         The search strategy adapts to provider capabilities:
@@ -805,26 +876,28 @@ class RetrievalService:
         """
         all_results: list[tuple] = []
 
-        dense_embeddings = await self.get_embedding_model_instance()
-        if not dense_embeddings:
-            raise ValueError("No dense embeddings found")
-
-        sparse_embedder = await self._ensure_sparse_embedder()
-
-        dense_tasks = [dense_embeddings.aembed_query(query) for query in queries]
         supports_sparse = self._capabilities.supports_sparse_vectors
         supports_text = self._capabilities.supports_server_side_text_search
 
-        if sparse_embedder is not None and supports_sparse:
-            # Parallelise dense and sparse embedding generation
-            sparse_tasks = [sparse_embedder.embed_query(query) for query in queries]
-            (dense_query_embeddings, sparse_query_embeddings) = await asyncio.gather(
-                asyncio.gather(*dense_tasks),
-                asyncio.gather(*sparse_tasks),
-            )
-        else:
-            dense_query_embeddings = await asyncio.gather(*dense_tasks)
-            sparse_query_embeddings = [None] * len(queries)
+        with phase("embedding"):
+            dense_embeddings = await self.get_embedding_model_instance()
+            if not dense_embeddings:
+                raise ValueError("No dense embeddings found")
+
+            sparse_embedder = await self._ensure_sparse_embedder()
+
+            dense_tasks = [dense_embeddings.aembed_query(query) for query in queries]
+
+            if sparse_embedder is not None and supports_sparse:
+                # Parallelise dense and sparse embedding generation
+                sparse_tasks = [sparse_embedder.embed_query(query) for query in queries]
+                (dense_query_embeddings, sparse_query_embeddings) = await asyncio.gather(
+                    asyncio.gather(*dense_tasks),
+                    asyncio.gather(*sparse_tasks),
+                )
+            else:
+                dense_query_embeddings = await asyncio.gather(*dense_tasks)
+                sparse_query_embeddings = [None] * len(queries)
 
         requests = [
             HybridSearchRequest(
@@ -836,16 +909,18 @@ class RetrievalService:
                 filter=filter,
                 limit=limit,
                 fusion_method=FusionMethod.RRF,
+                precision=precision,
             )
             for query, dense_embedding, sparse_embedding in zip(
                 queries, dense_query_embeddings, sparse_query_embeddings
             )
         ]
 
-        search_results = await self.vector_db_service.query_nearest_points(
-            collection_name=self.collection_name,
-            requests=requests,
-        )
+        with phase("vector_search"):
+            search_results = await self.vector_db_service.query_nearest_points(
+                collection_name=self.collection_name,
+                requests=requests,
+            )
 
         seen_points: set = set()
         for batch in search_results:
@@ -18,8 +18,27 @@ from app.config.constants.service import (
     TokenScopes,
     config_node_constants,
 )
+from app.modules.transformers.block_record_format import (
+    HEADER_PROBE_BYTES,
+    PARTIAL_BLOCKS_KEY,
+    RECORD_FORMAT_BLOCKS,
+    RECORD_FORMAT_LEGACY,
+    block_frames_enabled,
+    coalesce_ranges,
+    decode_block_record,
+    encode_block_record,
+    fill_frame,
+    frame_byte_range,
+    header_length,
+    is_partial_record,
+    missing_frames,
+    new_partial_record,
+    parse_header,
+)
 from app.modules.transformers.transformer import TransformContext, Transformer
+from app.services.cache.decoded_record_cache import get_decoded_record_cache
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
+from app.utils.query_timing import aiohttp_trace_config, timed_phase
 from app.utils.request_context import inject_request_headers
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
 
@@ -60,6 +79,32 @@ def compression_threshold_bytes() -> int:
         return COMPRESSION_THRESHOLD_BYTES_DEFAULT
 
 
+def _has_record_payload(data: dict) -> bool:
+    """Whether a downloaded envelope carries a record, in either storage layout."""
+    return bool(data.get("record")) or data.get("format") == RECORD_FORMAT_BLOCKS
+
+
+_PARTIAL_READ_MIN_BYTES_ENV = "PIPESHUB_PARTIAL_RECORD_READ_MIN_BYTES"
+PARTIAL_READ_MIN_BYTES_DEFAULT = 2 * 1024 * 1024
+# Frames closer than this are fetched in one ranged GET: a few KB of waste is
+# cheaper than another request.
+FRAME_COALESCE_GAP_BYTES = 16 * 1024
+
+
+def partial_read_min_bytes() -> int:
+    """Block-framed records at least this large are read frame by frame.
+
+    Below it one GET of the whole object beats a header read plus frame reads.
+    """
+    raw = os.getenv(_PARTIAL_READ_MIN_BYTES_ENV)
+    if raw is None:
+        return PARTIAL_READ_MIN_BYTES_DEFAULT
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return PARTIAL_READ_MIN_BYTES_DEFAULT
+
+
 _SIGNED_URL_CACHE_ENV = "PIPESHUB_SIGNED_URL_CACHE_SECONDS"
 # storage.controller.ts signs download URLs for 3600s. Cache well inside that so
 # a URL handed out at the end of its cached life still has plenty left to use.
@@ -139,7 +184,8 @@ def get_shared_session() -> aiohttp.ClientSession:
             # session was shared process-wide and connections started living
             # long enough to go idle.
             keepalive_timeout=NODE_KEEPALIVE_MARGIN_SECONDS,
-        )
+        ),
+        trace_configs=[aiohttp_trace_config("blob")],
     )
     _shared_sessions[loop] = session
     return session
@@ -311,7 +357,7 @@ class BlobStorage(Transformer):
                     f"Both parallel and fallback downloads failed: {str(e)}"
                 ) from fallback_error
 
-        if not data.get("record"):
+        if not _has_record_payload(data):
             return None
         record = self._process_downloaded_record(data)
         self.logger.debug(
@@ -466,6 +512,30 @@ class BlobStorage(Transformer):
 
 
 
+    def _encode_framed_record(self, record: dict, virtual_record_id: str) -> bytes | None:
+        """Encode ``record`` in the block-framed layout, or None to store it whole.
+
+        Only records with a block container are framed; anything else (and any
+        encoding failure) keeps the legacy envelope, which every reader accepts.
+        """
+        if not isinstance(record.get("block_containers"), dict):
+            return None
+        try:
+            return encode_block_record(record, virtual_record_id)
+        except Exception as e:
+            self.logger.warning("⚠️ Block-framed encoding failed, storing record whole: %s", str(e))
+            return None
+
+    @staticmethod
+    def _compression_metadata(framed: bool) -> dict:
+        return {
+            "algorithm": "zstd",
+            "level": 10,
+            "format": "msgspec-frames" if framed else "msgspec",
+            "version": RECORD_FORMAT_BLOCKS if framed else "v1",
+            "compressed": True,
+        }
+
     def _decompress_bytes(self, compressed_bytes: bytes) -> bytes:
         """
         Decompress raw bytes using zstd.
@@ -485,8 +555,16 @@ class BlobStorage(Transformer):
 
         import msgspec
 
+        # BLOCK-FRAMED FORMAT: index header plus independently compressed frames
+        if data.get("format") == RECORD_FORMAT_BLOCKS:
+            try:
+                return decode_block_record(data)
+            except Exception as e:
+                self.logger.error("❌ Failed to decode block-framed record: %s", str(e))
+                raise Exception(f"Decompression failed: {str(e)}") from e
+
         # NEW FORMAT: Check for isCompressed flag
-        if data.get("isCompressed"):
+        elif data.get("isCompressed"):
             compressed_base64 = data.get("record")
             if not compressed_base64:
                 self.logger.error("❌ isCompressed is true but no record found")
@@ -733,6 +811,8 @@ class BlobStorage(Transformer):
         if self.graph_provider:
             existing_lookup = await self.get_document_id_by_virtual_record_id(virtual_record_id)
 
+        block_frames = block_frames_enabled()
+
         if existing_lookup and existing_lookup.get("record_doc_id"):
             existing_doc_id = existing_lookup["record_doc_id"]
             self.logger.info(
@@ -741,7 +821,8 @@ class BlobStorage(Transformer):
             )
             try:
                 document_id, file_size_bytes = await self.upload_next_version(
-                    org_id, record_id, existing_doc_id, record_dict, virtual_record_id
+                    org_id, record_id, existing_doc_id, record_dict, virtual_record_id,
+                    block_frames=block_frames,
                 )
             except Exception as e:
                 if not self._is_non_versioned_exception(e):
@@ -751,7 +832,7 @@ class BlobStorage(Transformer):
                     existing_doc_id,
                 )
                 document_id, file_size_bytes = await self.save_record_to_storage(
-                    org_id, record_id, virtual_record_id, record_dict
+                    org_id, record_id, virtual_record_id, record_dict, block_frames=block_frames
                 )
         else:
             self.logger.info(
@@ -759,11 +840,16 @@ class BlobStorage(Transformer):
                 virtual_record_id
             )
             document_id, file_size_bytes = await self.save_record_to_storage(
-                org_id, record_id, virtual_record_id, record_dict
+                org_id, record_id, virtual_record_id, record_dict, block_frames=block_frames
             )
 
         if document_id and self.graph_provider:
-            await self.store_virtual_record_mapping(virtual_record_id, document_id, file_size_bytes)
+            # A hint for readers; if framing fell back to the whole-record
+            # layout, the reader sees that in the object's first bytes.
+            await self.store_virtual_record_mapping(
+                virtual_record_id, document_id, file_size_bytes,
+                storage_format=RECORD_FORMAT_BLOCKS if block_frames else RECORD_FORMAT_LEGACY,
+            )
 
         ctx.record = record
         return ctx
@@ -951,16 +1037,32 @@ class BlobStorage(Transformer):
             self.logger.error("❌ Unexpected error creating placeholder: %s", str(e))
             raise aiohttp.ClientError(f"Unexpected error: {str(e)}")
 
-    async def save_record_to_storage(self, org_id: str, record_id: str, virtual_record_id: str, record: dict) -> tuple[str | None, int | None]:
+    async def save_record_to_storage(
+        self,
+        org_id: str,
+        record_id: str,
+        virtual_record_id: str,
+        record: dict,
+        *,
+        block_frames: bool = False,
+    ) -> tuple[str | None, int | None]:
         """
         Save document to storage using FormData upload
+
+        Args:
+            block_frames: store the record in the block-framed layout
+                (``block_record_format``) so readers can fetch single blocks.
         Returns:
             tuple[str | None, int | None]: (document_id, file_size_bytes) if successful, (None, None) if failed
         """
         try:
             headers, nodejs_endpoint, storage_type = await self._get_auth_and_config(org_id)
 
-            compressed_record, use_compression = self._maybe_compress_record(record)
+            framed_body = self._encode_framed_record(record, virtual_record_id) if block_frames else None
+            if framed_body is not None:
+                compressed_record, use_compression = None, False
+            else:
+                compressed_record, use_compression = self._maybe_compress_record(record)
 
             if storage_type == "local":
                 try:
@@ -972,7 +1074,7 @@ class BlobStorage(Transformer):
                             "virtualRecordId": virtual_record_id
                         }
 
-                        json_data = json.dumps(upload_data).encode('utf-8')
+                        json_data = framed_body or json.dumps(upload_data).encode('utf-8')
                         file_size_bytes = len(json_data)
 
                         # Create form data
@@ -986,17 +1088,11 @@ class BlobStorage(Transformer):
                         form_data.add_field('isVersionedFile', 'true')
                         form_data.add_field('extension', 'json')
                         form_data.add_field('recordId', record_id)
-                        if use_compression:
+                        if use_compression or framed_body is not None:
                             compression_metadata = [
                                 {
                                     "key": "compression",
-                                    "value": {
-                                        "algorithm": "zstd",
-                                        "level": 10,
-                                        "format": "msgspec",
-                                        "version": "v1",
-                                        "compressed": True,
-                                    },
+                                    "value": self._compression_metadata(framed_body is not None),
                                 },
                             ]
                             for i, meta in enumerate(compression_metadata):
@@ -1036,7 +1132,7 @@ class BlobStorage(Transformer):
                     raise
             else:
                 # Prepare placeholder for S3 storage
-                if use_compression:
+                if use_compression or framed_body is not None:
                     # Prepare placeholder with compression metadata for MongoDB
                     placeholder_data = {
                         "documentName": f"record_{virtual_record_id}",
@@ -1047,13 +1143,7 @@ class BlobStorage(Transformer):
                         "customMetadata": [
                             {
                                 "key": "compression",
-                                "value": {
-                                    "algorithm": "zstd",
-                                    "level": 10,
-                                    "format": "msgspec",
-                                    "version": "v1",
-                                    "compressed": True
-                                }
+                                "value": self._compression_metadata(framed_body is not None),
                             },
                         ]
                     }
@@ -1085,6 +1175,13 @@ class BlobStorage(Transformer):
                             self.logger.error("❌ No signed URL in response for document: %s", document_id)
                             raise Exception("No signed URL in response for document")
 
+                        if framed_body is not None:
+                            await self._upload_raw_to_signed_url(
+                                session, signed_url, framed_body, "application/json"
+                            )
+                            self.logger.info("✅ Successfully completed record storage process for document: %s", document_id)
+                            return document_id, len(framed_body)
+
                         # Upload with isCompressed flag format
                         if compressed_record:
                             # Compressed format
@@ -1236,6 +1333,14 @@ class BlobStorage(Transformer):
         record_metadata_doc_id = doc.get("record_metadata_doc_id")
         if record_metadata_doc_id:
             result["record_metadata_doc_id"] = record_metadata_doc_id
+        storage_format = doc.get("storageFormat")
+        if storage_format:
+            result["storageFormat"] = storage_format
+        # Bumped by store_virtual_record_mapping on every reindex; versions the
+        # decoded-record cache entry.
+        updated_at = doc.get("updatedAt")
+        if updated_at is not None:
+            result["updatedAt"] = updated_at
         return result
 
     VIRTUAL_RECORD_LOOKUP_CHUNK_SIZE = 500
@@ -1330,6 +1435,7 @@ class BlobStorage(Transformer):
 
         return resolved
 
+    @timed_phase("blob_fetch")
     async def get_record_from_storage(
         self,
         virtual_record_id: str,
@@ -1365,64 +1471,289 @@ class BlobStorage(Transformer):
                 self.logger.debug("No document ID found for virtual record ID: %s", virtual_record_id)
                 return None
 
-            download_url = f"{nodejs_endpoint}{Routes.STORAGE_DOWNLOAD.value.format(documentId=document_id)}"
-            session = get_shared_session()
+            cache = get_decoded_record_cache()
+            updated_at = lookup_result.get("updatedAt")
+            if cache is not None and updated_at is not None:
+                return await cache.get_or_load(
+                    org_id,
+                    virtual_record_id,
+                    (document_id, updated_at),
+                    lambda: self._download_record(
+                        org_id, virtual_record_id, document_id, file_size_bytes,
+                        headers, nodejs_endpoint,
+                    ),
+                )
+            return await self._download_record(
+                org_id, virtual_record_id, document_id, file_size_bytes, headers, nodejs_endpoint
+            )
+        except Exception as e:
+            self.logger.exception(
+                "❌ Error retrieving record from storage (virtual_record_id=%s)",
+                virtual_record_id,
+            )
+            raise e
 
-            # A cached signed URL skips the gateway hop entirely. On any failure
-            # reading it back, fall through to the gateway and re-sign.
-            cached_url = await self._cached_signed_url(org_id, document_id)
-            if cached_url:
-                try:
+    async def _download_record(
+        self,
+        org_id: str,
+        virtual_record_id: str,
+        document_id: str,
+        file_size_bytes: int | None,
+        headers: dict,
+        nodejs_endpoint: str,
+    ) -> dict | None:
+        """Download and decode the stored record behind ``document_id``."""
+        download_url = f"{nodejs_endpoint}{Routes.STORAGE_DOWNLOAD.value.format(documentId=document_id)}"
+        session = get_shared_session()
+
+        # A cached signed URL skips the gateway hop entirely. On any failure
+        # reading it back, fall through to the gateway and re-sign.
+        cached_url = await self._cached_signed_url(org_id, document_id)
+        if cached_url:
+            try:
+                record = await self._record_from_signed_url(
+                    session, cached_url, file_size_bytes, virtual_record_id
+                )
+                if record is not None:
+                    return record
+            except Exception as e:
+                self.logger.debug(
+                    "Cached signed URL failed for %s, re-signing: %s", document_id, str(e)
+                )
+
+        async with session.get(download_url, headers=headers) as resp:
+            if resp.status == HttpStatusCode.SUCCESS.value:
+                data = await resp.json(loads=_decode_json)
+
+                if data.get("signedUrl"):
+                    await self._store_signed_url(org_id, document_id, data["signedUrl"])
+
+                if _has_record_payload(data):
+                    record = self._process_downloaded_record(data)
+                    record_name = record.get("record_name")
+                    self.logger.debug("✅ Successfully retrieved record %s from storage for virtual_record_id: %s", record_name, virtual_record_id)
+                    return record
+                elif data.get("signedUrl"):
                     record = await self._record_from_signed_url(
-                        session, cached_url, file_size_bytes, virtual_record_id
+                        session, data["signedUrl"], file_size_bytes, virtual_record_id
                     )
                     if record is not None:
                         return record
-                except Exception as e:
-                    self.logger.debug(
-                        "Cached signed URL failed for %s, re-signing: %s", document_id, str(e)
-                    )
+                    self.logger.error("❌ No record found for virtual_record_id: %s", virtual_record_id)
+                    raise Exception("No record found for virtual_record_id")
+                else:
+                    self.logger.error("❌ No record found for virtual_record_id: %s", virtual_record_id)
+                    raise Exception("No record found for virtual_record_id")
+            else:
+                self.logger.error("❌ Failed to retrieve record: status %s, virtual_record_id: %s", resp.status, virtual_record_id)
+                raise Exception("Failed to retrieve record from storage")
 
-            async with session.get(download_url, headers=headers) as resp:
-                if resp.status == HttpStatusCode.SUCCESS.value:
-                    data = await resp.json(loads=_decode_json)
+    @timed_phase("blob_fetch")
+    async def get_record_blocks_from_storage(
+        self,
+        virtual_record_id: str,
+        org_id: str,
+        block_indices: "set[int] | list[int]",
+        block_group_indices: "set[int] | list[int]" = (),
+        lookup_result: dict | None = None,
+    ) -> dict | None:
+        """Retrieve just the parts of a record that some search hits point at.
+
+        For a large record stored block-framed (``block_record_format``) this
+        reads the index header and then only the frames holding the hit
+        blocks, their neighbours and the groups around them, with HTTP range
+        requests on the signed storage URL. The result is a partial record
+        (see ``is_partial_record``); ``load_record_blocks`` extends it and
+        ``complete_partial_record`` turns it into the whole record.
+
+        Everything else -- legacy-format or small records, local storage, a
+        record already in the decoded-record cache, any failure on the ranged
+        path -- is served whole by ``get_record_from_storage``.
+        """
+        if lookup_result is None:
+            lookup_result = await self.get_document_id_by_virtual_record_id(virtual_record_id)
+        if not lookup_result or not lookup_result.get("record_doc_id"):
+            return await self.get_record_from_storage(
+                virtual_record_id, org_id, lookup_result=lookup_result
+            )
 
-                    if data.get("signedUrl"):
-                        await self._store_signed_url(org_id, document_id, data["signedUrl"])
+        document_id = lookup_result["record_doc_id"]
+        file_size_bytes = lookup_result.get("fileSizeBytes") or 0
+        cache = get_decoded_record_cache()
+        updated_at = lookup_result.get("updatedAt")
+        cached = (
+            cache.peek(org_id, virtual_record_id, (document_id, updated_at))
+            if cache is not None and updated_at is not None
+            else None
+        )
+        if (
+            cached is not None
+            or lookup_result.get("storageFormat") != RECORD_FORMAT_BLOCKS
+            or file_size_bytes < partial_read_min_bytes()
+        ):
+            return cached or await self.get_record_from_storage(
+                virtual_record_id, org_id, lookup_result=lookup_result
+            )
 
-                    if data.get("record"):
-                        record = self._process_downloaded_record(data)
-                        record_name = record.get("record_name")
-                        self.logger.debug("✅ Successfully retrieved record %s from storage for virtual_record_id: %s", record_name, virtual_record_id)
-                        return record
-                    elif data.get("signedUrl"):
-                        record = await self._record_from_signed_url(
-                            session, data["signedUrl"], file_size_bytes, virtual_record_id
+        try:
+            headers, nodejs_endpoint, storage_type = await self._get_auth_and_config(org_id)
+            if storage_type != "local":
+                record = await self._read_framed_header(
+                    org_id, document_id, headers, nodejs_endpoint
+                )
+                if record is not None:
+                    if is_partial_record(record):
+                        record["virtual_record_id"] = virtual_record_id
+                        await self.load_record_blocks(
+                            record, org_id, block_indices, block_group_indices
                         )
-                        if record is not None:
-                            return record
-                        self.logger.error("❌ No record found for virtual_record_id: %s", virtual_record_id)
-                        raise Exception("No record found for virtual_record_id")
-                    else:
-                        self.logger.error("❌ No record found for virtual_record_id: %s", virtual_record_id)
-                        raise Exception("No record found for virtual_record_id")
-                else:
-                    self.logger.error("❌ Failed to retrieve record: status %s, virtual_record_id: %s", resp.status, virtual_record_id)
-                    raise Exception("Failed to retrieve record from storage")
+                    return record
         except Exception as e:
-            self.logger.exception(
-                "❌ Error retrieving record from storage (virtual_record_id=%s)",
-                virtual_record_id,
+            self.logger.warning(
+                "⚠️ Partial read of %s failed, downloading the whole record: %s",
+                virtual_record_id, str(e),
             )
-            raise e
+        return await self.get_record_from_storage(
+            virtual_record_id, org_id, lookup_result=lookup_result
+        )
+
+    async def load_record_blocks(
+        self,
+        record: dict,
+        org_id: str,
+        block_indices: "set[int] | list[int]",
+        block_group_indices: "set[int] | list[int]" = (),
+    ) -> dict:
+        """Fetch, in place, the frames a partial record lacks for these hits.
 
-    async def store_virtual_record_mapping(self, virtual_record_id: str, document_id: str, file_size_bytes: int | None = None) -> bool:
+        A no-op for whole records. If the ranged read fails the record is
+        completed instead, so callers always end up with the blocks they asked
+        for.
+        """
+        if not is_partial_record(record):
+            return record
+        needed = missing_frames(record, block_indices, block_group_indices)
+        if not needed:
+            return record
+        try:
+            headers, nodejs_endpoint, _ = await self._get_auth_and_config(org_id)
+            signed_url = await self._signed_download_url(
+                org_id, record[PARTIAL_BLOCKS_KEY]["documentId"], headers, nodejs_endpoint
+            )
+            await self._fetch_frames(get_shared_session(), signed_url, record, needed)
+        except Exception as e:
+            self.logger.warning(
+                "⚠️ Ranged frame read failed for %s, downloading the whole record: %s",
+                record.get("virtual_record_id"), str(e),
+            )
+            await self.complete_partial_record(record, org_id)
+        return record
+
+    async def complete_partial_record(self, record: dict, org_id: str) -> dict:
+        """Replace a partial record's blocks with the whole stored record's, in place."""
+        if not is_partial_record(record):
+            return record
+        state = record[PARTIAL_BLOCKS_KEY]
+        virtual_record_id = record.get("virtual_record_id") or state["index"].get("virtualRecordId")
+        full = await self.get_record_from_storage(virtual_record_id, org_id)
+        if full is None:
+            raise Exception(f"Record {virtual_record_id} is no longer in storage")
+        record["block_containers"] = full.get("block_containers", {})
+        record.pop(PARTIAL_BLOCKS_KEY, None)
+        return record
+
+    async def _signed_download_url(
+        self, org_id: str, document_id: str, headers: dict, nodejs_endpoint: str
+    ) -> str:
+        cached_url = await self._cached_signed_url(org_id, document_id)
+        if cached_url:
+            return cached_url
+        download_url = f"{nodejs_endpoint}{Routes.STORAGE_DOWNLOAD.value.format(documentId=document_id)}"
+        async with get_shared_session().get(download_url, headers=headers) as resp:
+            if resp.status != HttpStatusCode.SUCCESS.value:
+                raise Exception(f"Failed to sign record download: status {resp.status}")
+            data = await resp.json(loads=_decode_json)
+        signed_url = data.get("signedUrl")
+        if not signed_url:
+            raise Exception("Storage did not return a signed URL")
+        await self._store_signed_url(org_id, document_id, signed_url)
+        return signed_url
+
+    async def _read_framed_header(
+        self, org_id: str, document_id: str, headers: dict, nodejs_endpoint: str
+    ) -> dict | None:
+        """Read a block-framed object's header into an empty partial record.
+
+        Returns the whole decoded record instead when the store ignored the
+        Range header and sent everything, and None when the object is not
+        block-framed after all (the mapping hint was stale).
+        """
+        session = get_shared_session()
+        signed_url = await self._signed_download_url(org_id, document_id, headers, nodejs_endpoint)
+        _, prefix = await self._download_chunk_with_retry(
+            session, signed_url, 0, HEADER_PROBE_BYTES - 1, 0
+        )
+        if len(prefix) > HEADER_PROBE_BYTES:
+            return self._process_downloaded_record(_decode_json(prefix))
+        length = header_length(prefix)
+        if length is None:
+            return None
+        if length > len(prefix):
+            _, rest = await self._download_chunk_with_retry(
+                session, signed_url, len(prefix), length - 1, 1
+            )
+            prefix += rest
+        return new_partial_record(parse_header(prefix), document_id)
+
+    async def _fetch_frames(
+        self,
+        session: aiohttp.ClientSession,
+        signed_url: str,
+        record: dict,
+        needed: list[tuple[str, int]],
+        max_connections: int = 6,
+    ) -> None:
+        """Download ``needed`` frames with coalesced range requests and decode them into ``record``."""
+        frames = sorted(
+            (frame_byte_range(record, kind, frame), kind, frame) for kind, frame in needed
+        )
+        spans = coalesce_ranges([span for span, _, _ in frames], FRAME_COALESCE_GAP_BYTES)
+        semaphore = asyncio.Semaphore(max_connections)
+
+        async def download(i: int, start: int, end: int) -> tuple[int, bytes]:
+            async with semaphore:
+                return await self._download_chunk_with_retry(session, signed_url, start, end, i)
+
+        results = await asyncio.gather(
+            *[download(i, start, end) for i, (start, end) in enumerate(spans)]
+        )
+        for (span_start, span_end), (_, data) in zip(spans, sorted(results, key=lambda r: r[0])):
+            if len(data) != span_end - span_start + 1:
+                raise Exception(
+                    f"Range {span_start}-{span_end} returned {len(data)} bytes"
+                )
+            for (start, end), kind, frame in frames:
+                if span_start <= start and end <= span_end:
+                    fill_frame(record, kind, frame, data[start - span_start:end - span_start + 1])
+        self.logger.debug(
+            "Partial record read: %d frames in %d range requests", len(frames), len(spans)
+        )
+
+    async def store_virtual_record_mapping(
+        self,
+        virtual_record_id: str,
+        document_id: str,
+        file_size_bytes: int | None = None,
+        storage_format: str | None = None,
+    ) -> bool:
         """
         Stores the mapping between virtual_record_id and document_id in graph database.
         Args:
             virtual_record_id: The virtual record ID
             document_id: The document ID
             file_size_bytes: Optional file size in bytes
+            storage_format: Optional layout of the stored object (``blocks-v1`` lets
+                readers fetch single frames)
         Returns:
             bool: True if successful, False otherwise.
         """
@@ -1442,6 +1773,8 @@ class BlobStorage(Transformer):
             # Add file size if provided
             if file_size_bytes is not None:
                 mapping_document["fileSizeBytes"] = file_size_bytes
+            if storage_format is not None:
+                mapping_document["storageFormat"] = storage_format
 
             success = await self.graph_provider.batch_upsert_nodes(
                 [mapping_document],
@@ -1469,7 +1802,9 @@ class BlobStorage(Transformer):
         record_id: str,
         document_id: str,
         record: dict,
-        virtual_record_id: str = None
+        virtual_record_id: str = None,
+        *,
+        block_frames: bool = False,
     ):
         """
         Args:
@@ -1478,6 +1813,7 @@ class BlobStorage(Transformer):
             document_id: Existing document ID to add version to
             record: Record data to upload
             virtual_record_id: Virtual record ID
+            block_frames: store the record in the block-framed layout
 
         Returns:
             tuple[str | None, int | None]: (document_id, file_size_bytes) if successful
@@ -1485,14 +1821,19 @@ class BlobStorage(Transformer):
         try:
             headers, nodejs_endpoint, storage_type = await self._get_auth_and_config(org_id)
 
-            compressed_record, use_compression = self._maybe_compress_record(record)
+            framed_body = self._encode_framed_record(record, virtual_record_id) if block_frames else None
+            if framed_body is not None:
+                upload_data = None
+                json_data = framed_body
+            else:
+                compressed_record, use_compression = self._maybe_compress_record(record)
 
-            upload_data = {
-                "isCompressed": use_compression,
-                "record": compressed_record if use_compression else record,
-                "virtualRecordId": virtual_record_id
-            }
-            json_data = json.dumps(upload_data).encode('utf-8')
+                upload_data = {
+                    "isCompressed": use_compression,
+                    "record": compressed_record if use_compression else record,
+                    "virtualRecordId": virtual_record_id
+                }
+                json_data = json.dumps(upload_data).encode('utf-8')
             file_size_bytes = len(json_data)
 
             if storage_type == "local":
@@ -1539,7 +1880,12 @@ class BlobStorage(Transformer):
                     if not signed_url:
                         raise Exception("No signed URL in response for next version upload")
 
-                    await self._upload_to_signed_url(session, signed_url, upload_data)
+                    if upload_data is None:
+                        await self._upload_raw_to_signed_url(
+                            session, signed_url, json_data, "application/json"
+                        )
+                    else:
+                        await self._upload_to_signed_url(session, signed_url, upload_data)
 
                     self.logger.info("✅ Successfully uploaded next version for document: %s", document_id)
                     return document_id, file_size_bytes
@@ -0,0 +1,396 @@
+"""Block-addressable storage layout for records in blob storage.
+
+The legacy layout stores a record's whole ``BlocksContainer`` as one JSON or
+zstd+msgpack blob, so answering a question about three blocks of a 2,000-page
+PDF downloads and decodes all of it. This layout splits the blocks and block
+groups into independently compressed frames and puts a small index in front:
+
+    {"format":"blocks-v1","headerBytes":"0000012345","header":{...},"frames":"<b64><b64>..."}
+
+* The envelope is still one JSON document, so the gateway's local-storage
+  download and every full reader keep working: :func:`decode_block_record`
+  rebuilds the whole record from the parsed JSON.
+* ``headerBytes`` is zero-padded to a fixed width, so the first bytes of the
+  object say where the frames start. A reader fetches that prefix with one
+  ranged GET, then only the frames it needs (:func:`frame_byte_range`).
+* Each frame is base64(zstd(msgpack(list of blocks))). Base64 is ASCII, so an
+  offset into the ``frames`` string is also a byte offset into the object.
+
+The header also carries the block/group structure (parents, children ranges,
+image-split fragments) so :func:`expand_selection` can widen a set of hit
+indices to everything the retrieval formatter walks from them without having
+the blocks in hand.
+
+A partially loaded record is an ordinary record dict whose block lists have
+the true length but hold empty dicts for blocks that were not fetched; its
+``partial_blocks`` entry remembers the index and which frames are loaded, so
+later hits on the same record can fetch just the frames they add.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import Any
+
+import msgspec
+import zstandard as zstd
+
+from app.models.blocks import GroupType
+
+RECORD_FORMAT_BLOCKS = "blocks-v1"
+# Recorded on the mapping node for records written whole, so a stale
+# ``blocks-v1`` hint from an earlier version does not outlive a rewrite.
+RECORD_FORMAT_LEGACY = "record-v1"
+PARTIAL_BLOCKS_KEY = "partial_blocks"
+
+_BLOCK_FRAMES_ENV = "PIPESHUB_RECORD_BLOCK_FRAMES"
+_FRAME_TARGET_BYTES_ENV = "PIPESHUB_RECORD_FRAME_TARGET_BYTES"
+FRAME_TARGET_BYTES_DEFAULT = 64 * 1024
+# Enough for the envelope prefix and, for most records, the whole header.
+HEADER_PROBE_BYTES = 64 * 1024
+
+_ZSTD_LEVEL = 10
+_HEADER_DIGITS = 10
+_PREFIX = b'{"format":"' + RECORD_FORMAT_BLOCKS.encode() + b'","headerBytes":"'
+_HEADER_KEY = b'","header":'
+_FRAMES_KEY = b',"frames":"'
+_SUFFIX = b'"}'
+# The prefix plus the padded header length: all a reader needs to find the frames.
+MIN_PREFIX_BYTES = len(_PREFIX) + _HEADER_DIGITS
+
+_BLOCKS = "blocks"
+_GROUPS = "block_groups"
+
+
+def block_frames_enabled() -> bool:
+    """Whether new records are written in the block-framed layout (opt-in)."""
+    return os.getenv(_BLOCK_FRAMES_ENV, "").lower() in ("1", "true", "yes")
+
+
+def frame_target_bytes() -> int:
+    """Uncompressed size at which a frame is closed; smaller frames mean less over-fetch."""
+    raw = os.getenv(_FRAME_TARGET_BYTES_ENV)
+    if raw is None:
+        return FRAME_TARGET_BYTES_DEFAULT
+    try:
+        return max(int(raw), 1024)
+    except ValueError:
+        return FRAME_TARGET_BYTES_DEFAULT
+
+
+# ---- writing ---------------------------------------------------------------
+
+
+def encode_block_record(
+    record: dict, virtual_record_id: str | None = None, *, target_bytes: int | None = None
+) -> bytes:
+    """Serialize ``record`` to the block-framed envelope."""
+    target = target_bytes or frame_target_bytes()
+    containers = record.get("block_containers") or {}
+    blocks = list(containers.get(_BLOCKS) or [])
+    groups = list(containers.get(_GROUPS) or [])
+
+    compressor = zstd.ZstdCompressor(level=_ZSTD_LEVEL)
+    segments: list[bytes] = []
+    offset = 0
+
+    def pack(items: list) -> list[list[int]]:
+        nonlocal offset
+        frames: list[list[int]] = []
+        first = 0
+        pending: list[msgspec.Raw] = []
+        pending_bytes = 0
+        for i, item in enumerate(items):
+            encoded = msgspec.msgpack.encode(item)
+            pending.append(msgspec.Raw(encoded))
+            pending_bytes += len(encoded)
+            if pending_bytes >= target or i == len(items) - 1:
+                frame = base64.b64encode(compressor.compress(msgspec.msgpack.encode(pending)))
+                frames.append([first, len(pending), offset, len(frame)])
+                segments.append(frame)
+                offset += len(frame)
+                first = i + 1
+                pending = []
+                pending_bytes = 0
+        return frames
+
+    header = {
+        "virtualRecordId": virtual_record_id,
+        "record": {k: v for k, v in record.items() if k != "block_containers"},
+        "containerExtras": {k: v for k, v in containers.items() if k not in (_BLOCKS, _GROUPS)},
+        "blockCount": len(blocks),
+        "groupCount": len(groups),
+        "blockFrames": pack(blocks),
+        "groupFrames": pack(groups),
+        **_structure(blocks, groups),
+    }
+    header_json = msgspec.json.encode(header)
+    header_bytes = len(_PREFIX) + _HEADER_DIGITS + len(_HEADER_KEY) + len(header_json) + len(_FRAMES_KEY)
+    return b"".join((
+        _PREFIX, b"%0*d" % (_HEADER_DIGITS, header_bytes), _HEADER_KEY, header_json, _FRAMES_KEY,
+        *segments, _SUFFIX,
+    ))
+
+
+def _structure(blocks: list, groups: list) -> dict[str, Any]:
+    """The parent/child links :func:`expand_selection` follows."""
+    fragments = [
+        [i, block["parent_block_index"]]
+        for i, block in enumerate(blocks)
+        if isinstance(block, dict) and block.get("parent_block_index") is not None
+    ]
+    return {
+        "blockParents": _runs(_field(block, "parent_index") for block in blocks),
+        "groupTypes": [_field(group, "type") for group in groups],
+        "groupChildren": [_children_ranges(group) for group in groups],
+        "fragments": fragments,
+    }
+
+
+def _field(item: Any, name: str) -> Any:  # noqa: ANN401 - stored blocks are free-form
+    return item.get(name) if isinstance(item, dict) else None
+
+
+def _runs(values: Iterable[int | None]) -> list[list[int]]:
+    """Run-length encode ``values`` as ``[start, end, value]``, skipping ``None``."""
+    runs: list[list[int]] = []
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if runs and runs[-1][2] == value and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i, value])
+    return runs
+
+
+def _children_ranges(group: Any) -> list[list[list[int]]]:  # noqa: ANN401
+    """``[block_ranges, block_group_ranges]`` for either children format."""
+    children = _field(group, "children")
+    if isinstance(children, dict):
+        return [
+            [[r["start"], r["end"]] for r in children.get("block_ranges") or []],
+            [[r["start"], r["end"]] for r in children.get("block_group_ranges") or []],
+        ]
+    block_ranges: list[list[int]] = []
+    group_ranges: list[list[int]] = []
+    for child in children or []:
+        if not isinstance(child, dict):
+            continue
+        if child.get("block_index") is not None:
+            block_ranges.append([child["block_index"], child["block_index"]])
+        elif child.get("block_group_index") is not None:
+            group_ranges.append([child["block_group_index"], child["block_group_index"]])
+    return [block_ranges, group_ranges]
+
+
+# ---- reading ---------------------------------------------------------------
+
+
+def header_length(prefix: bytes) -> int | None:
+    """Byte offset of the frames if ``prefix`` starts a block-framed object, else None."""
+    if len(prefix) < MIN_PREFIX_BYTES or not prefix.startswith(_PREFIX):
+        return None
+    digits = prefix[len(_PREFIX):MIN_PREFIX_BYTES]
+    return int(digits) if digits.isdigit() else None
+
+
+def parse_header(buf: bytes) -> dict:
+    """Parse the envelope up to the frames from the first ``header_length`` bytes."""
+    length = header_length(buf)
+    if length is None or len(buf) < length:
+        raise ValueError("Not a complete block-framed record header")
+    envelope = msgspec.json.decode(buf[:length - len(_FRAMES_KEY)] + b"}")
+    envelope["headerBytes"] = length
+    return envelope
+
+
+def decode_frame(segment: bytes | str, expected: int) -> list:
+    items = msgspec.msgpack.decode(zstd.ZstdDecompressor().decompress(base64.b64decode(segment)))
+    if not isinstance(items, list) or len(items) != expected:
+        raise ValueError(f"Record frame holds {len(items)} items, index says {expected}")
+    return items
+
+
+def decode_block_record(envelope: dict) -> dict:
+    """Rebuild the full record from a parsed block-framed envelope (``frames`` included)."""
+    header = envelope["header"]
+    frames = envelope.get("frames") or ""
+
+    def unpack(table: list[list[int]]) -> list:
+        items: list = []
+        for _, count, offset, length in table:
+            items.extend(decode_frame(frames[offset:offset + length], count))
+        return items
+
+    record = dict(header["record"])
+    containers = dict(header.get("containerExtras") or {})
+    containers[_BLOCKS] = unpack(header["blockFrames"])
+    containers[_GROUPS] = unpack(header["groupFrames"])
+    record["block_containers"] = containers
+    return record
+
+
+class _RunLookup:
+    """Point lookups into the ``[start, end, value]`` runs from :func:`_runs`."""
+
+    def __init__(self, runs: list[list[int]]) -> None:
+        self._runs = runs
+        self._starts = [run[0] for run in runs]
+
+    def get(self, index: int) -> int | None:
+        pos = bisect_right(self._starts, index) - 1
+        if pos >= 0 and self._runs[pos][1] >= index:
+            return self._runs[pos][2]
+        return None
+
+
+def expand_selection(
+    index: dict, block_indices: Iterable[int], group_indices: Iterable[int]
+) -> tuple[set[int], set[int]]:
+    """Widen hit indices to every block and group the retrieval formatter reads.
+
+    Mirrors ``get_flattened_results``: a hit brings its neighbours, its parent
+    group (with the group's children, except for table rows, which are
+    rendered one by one), the container of an image-split fragment and a
+    container's fragments; a block-group hit brings all of its children and
+    the blocks either side of them.
+    """
+    block_count = index["blockCount"]
+    group_count = index["groupCount"]
+    block_parents = _RunLookup(index["blockParents"])
+    group_types = index["groupTypes"]
+    group_children = index["groupChildren"]
+    container_of = dict(index["fragments"])
+    fragments_of: dict[int, list[int]] = {}
+    for fragment, container in index["fragments"]:
+        fragments_of.setdefault(container, []).append(fragment)
+
+    blocks: set[int] = set()
+    groups: set[int] = set()
+    expanded: set[int] = set()
+    pending_blocks: list[int] = []
+    pending_groups: list[tuple[int, bool]] = []
+
+    def add_block(i: int) -> None:
+        if 0 <= i < block_count and i not in blocks:
+            blocks.add(i)
+            pending_blocks.append(i)
+
+    def add_group(g: int, with_children: bool) -> None:
+        if 0 <= g < group_count and (g not in groups or (with_children and g not in expanded)):
+            groups.add(g)
+            pending_groups.append((g, with_children))
+
+    for i in block_indices:
+        for j in (i - 1, i, i + 1):
+            add_block(j)
+    for g in group_indices:
+        add_group(g, True)
+        block_ranges = group_children[g][0] if 0 <= g < group_count else []
+        if block_ranges:
+            add_block(block_ranges[0][0] - 1)
+            add_block(block_ranges[-1][1] + 1)
+
+    while pending_blocks or pending_groups:
+        while pending_blocks:
+            i = pending_blocks.pop()
+            for fragment in fragments_of.get(i, ()):
+                add_block(fragment)
+            if i in container_of:
+                add_block(container_of[i])
+            parent = block_parents.get(i)
+            if parent is not None and 0 <= parent < group_count:
+                add_group(parent, group_types[parent] != GroupType.TABLE.value)
+        while pending_groups:
+            g, with_children = pending_groups.pop()
+            if not with_children or g in expanded:
+                continue
+            expanded.add(g)
+            block_ranges, group_ranges = group_children[g]
+            for start, end in block_ranges:
+                for i in range(start, end + 1):
+                    add_block(i)
+            for start, end in group_ranges:
+                for child in range(start, end + 1):
+                    add_group(child, True)
+    return blocks, groups
+
+
+def _frame_of(table: list[list[int]], index: int) -> int:
+    return bisect_right([frame[0] for frame in table], index) - 1
+
+
+# ---- partially loaded records ---------------------------------------------
+
+
+def new_partial_record(envelope: dict, document_id: str) -> dict:
+    """A record with the header's metadata and empty slots for every block."""
+    header = envelope["header"]
+    record = dict(header["record"])
+    containers = dict(header.get("containerExtras") or {})
+    containers[_BLOCKS] = [{} for _ in range(header["blockCount"])]
+    containers[_GROUPS] = [{} for _ in range(header["groupCount"])]
+    record["block_containers"] = containers
+    record[PARTIAL_BLOCKS_KEY] = {
+        "documentId": document_id,
+        "headerBytes": envelope["headerBytes"],
+        "index": {k: v for k, v in header.items() if k != "record"},
+        "loaded": {_BLOCKS: [], _GROUPS: []},
+    }
+    return record
+
+
+def is_partial_record(record: dict | None) -> bool:
+    return bool(record) and PARTIAL_BLOCKS_KEY in record
+
+
+def missing_frames(
+    record: dict, block_indices: Iterable[int], group_indices: Iterable[int]
+) -> list[tuple[str, int]]:
+    """``(kind, frame)`` pairs needed for the selection and not yet loaded."""
+    state = record[PARTIAL_BLOCKS_KEY]
+    index = state["index"]
+    blocks, groups = expand_selection(index, block_indices, group_indices)
+    needed: list[tuple[str, int]] = []
+    for kind, table_key, selected in (
+        (_BLOCKS, "blockFrames", blocks), (_GROUPS, "groupFrames", groups),
+    ):
+        table = index[table_key]
+        loaded = set(state["loaded"][kind])
+        frames = {_frame_of(table, i) for i in selected} - loaded
+        needed.extend((kind, frame) for frame in sorted(frames) if frame >= 0)
+    return needed
+
+
+def frame_byte_range(record: dict, kind: str, frame: int) -> tuple[int, int]:
+    """Inclusive byte range of a frame within the stored object."""
+    state = record[PARTIAL_BLOCKS_KEY]
+    table = state["index"]["blockFrames" if kind == _BLOCKS else "groupFrames"]
+    _, _, offset, length = table[frame]
+    start = state["headerBytes"] + offset
+    return start, start + length - 1
+
+
+def fill_frame(record: dict, kind: str, frame: int, segment: bytes) -> None:
+    """Decode a downloaded frame into the record's empty slots."""
+    state = record[PARTIAL_BLOCKS_KEY]
+    table = state["index"]["blockFrames" if kind == _BLOCKS else "groupFrames"]
+    first, count, _, _ = table[frame]
+    items = decode_frame(segment, count)
+    record["block_containers"][kind][first:first + count] = items
+    state["loaded"][kind].append(frame)
+
+
+def coalesce_ranges(ranges: list[tuple[int, int]], max_gap: int) -> list[tuple[int, int]]:
+    """Merge sorted inclusive byte ranges whose gap is at most ``max_gap``."""
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start - merged[-1][1] - 1 <= max_gap:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
@@ -0,0 +1,215 @@
+"""Text chunking strategies for the indexing pipeline.
+
+``VectorStore`` turns every text block into one or more embedded points, and
+each point's ``blockId``/``blockIndex`` metadata maps a hit back to its parent
+block, which retrieval hydrates from blob storage. How a block is cut decides
+how many vectors a record costs:
+
+``sentence``
+    Every sentence, plus the whole block (the historical behaviour). Most
+    precise, and the most vectors: a block of *n* sentences costs *n + 1*.
+``sentence_window``
+    Consecutive sentences packed into windows of up to
+    ``SENTENCE_WINDOW_CHARS`` without overlap, so every sentence is embedded
+    exactly once. A block that fits in one window is a single point.
+``token_window``
+    Windows of ``TOKEN_WINDOW_SIZE`` whitespace tokens overlapping by
+    ``TOKEN_WINDOW_OVERLAP``, ignoring sentence boundaries. Tokens are
+    approximated by whitespace words, which is close enough for sizing and
+    independent of the embedding model's tokenizer.
+``block``
+    One point per block.
+
+The strategy is chosen per record by :func:`resolve_chunking_strategy` from
+the ``/services/chunking`` config::
+
+    {
+        "strategy": "sentence",
+        "connectors": {"SLACK": "block"},
+        "orgs": {"<orgId>": {"strategy": "sentence_window",
+                             "connectors": {"DRIVE": "token_window"}}}
+    }
+
+The most specific entry wins (org + connector, org, connector, global);
+``PIPESHUB_CHUNKING_STRATEGY`` is the default when none applies.
+``tests/integration/test_chunking_benchmark.py`` reports recall against
+vector count for each strategy on a fixture corpus.
+
+Changing a strategy only affects records indexed afterwards.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Mapping
+from enum import Enum
+from typing import Any, NamedTuple
+
+from app.modules.parsers.text_splitting import split_into_sentences
+from app.utils.logger import create_logger
+
+logger = create_logger("chunking")
+
+ENV_CHUNKING_STRATEGY = "PIPESHUB_CHUNKING_STRATEGY"
+
+SENTENCE_WINDOW_CHARS = 800
+TOKEN_WINDOW_SIZE = 200
+TOKEN_WINDOW_OVERLAP = 40
+# Rough characters per token, for text without whitespace (CJK).
+_CHARS_PER_TOKEN = 4
+
+
+class ChunkingStrategy(str, Enum):
+    SENTENCE = "sentence"
+    SENTENCE_WINDOW = "sentence_window"
+    TOKEN_WINDOW = "token_window"
+    BLOCK = "block"
+
+
+DEFAULT_CHUNKING_STRATEGY = ChunkingStrategy.SENTENCE
+
+
+class TextChunk(NamedTuple):
+    text: str
+    # True when the chunk is the whole block (the ``isBlock`` metadata flag).
+    is_block: bool
+
+
+Chunker = Callable[[str, str], list[TextChunk]]
+
+
+def pack_sentences(
+    sentences: list[str], max_chars: int, overlap_chars: int = 0
+) -> list[str]:
+    """Pack consecutive sentences into windows of about ``max_chars``.
+
+    Up to ``overlap_chars`` of trailing sentences are repeated at the start of
+    the next window to keep context across the boundary.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_len = 0
+
+    for sentence in sentences:
+        added_len = len(sentence) + (1 if current else 0)
+        if current and current_len + added_len > max_chars:
+            chunks.append(" ".join(current))
+            overlap_sentences: list[str] = []
+            overlap_len = 0
+            for s in reversed(current):
+                if overlap_len + len(s) > overlap_chars:
+                    break
+                overlap_sentences.insert(0, s)
+                overlap_len += len(s) + 1
+            current, current_len = overlap_sentences, overlap_len
+            added_len = len(sentence) + (1 if current else 0)
+        current.append(sentence)
+        current_len += added_len
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _sentence_chunks(text: str, language: str) -> list[TextChunk]:
+    sentences = split_into_sentences(text, language=language)
+    chunks = [TextChunk(s, False) for s in sentences] if len(sentences) > 1 else []
+    chunks.append(TextChunk(text, True))
+    return chunks
+
+
+def _sentence_window_chunks(text: str, language: str) -> list[TextChunk]:
+    if len(text) <= SENTENCE_WINDOW_CHARS:
+        return [TextChunk(text, True)]
+    sentences = split_into_sentences(text, language=language)
+    windows = pack_sentences(sentences, SENTENCE_WINDOW_CHARS)
+    if len(windows) <= 1:
+        return [TextChunk(text, True)]
+    return [TextChunk(w, False) for w in windows]
+
+
+def _token_window_chunks(text: str, language: str) -> list[TextChunk]:
+    words = text.split()
+    if len(words) <= 1 and len(text) > TOKEN_WINDOW_SIZE * _CHARS_PER_TOKEN:
+        # No whitespace to count by; fall back to a character budget.
+        windows = pack_sentences(
+            split_into_sentences(text, language=language),
+            TOKEN_WINDOW_SIZE * _CHARS_PER_TOKEN,
+            TOKEN_WINDOW_OVERLAP * _CHARS_PER_TOKEN,
+        )
+        if len(windows) <= 1:
+            return [TextChunk(text, True)]
+        return [TextChunk(w, False) for w in windows]
+    if len(words) <= TOKEN_WINDOW_SIZE:
+        return [TextChunk(text, True)]
+    step = TOKEN_WINDOW_SIZE - TOKEN_WINDOW_OVERLAP
+    chunks: list[TextChunk] = []
+    for start in range(0, len(words), step):
+        chunks.append(TextChunk(" ".join(words[start:start + TOKEN_WINDOW_SIZE]), False))
+        if start + TOKEN_WINDOW_SIZE >= len(words):
+            break
+    return chunks
+
+
+def _block_chunks(text: str, language: str) -> list[TextChunk]:
+    return [TextChunk(text, True)]
+
+
+CHUNKERS: dict[ChunkingStrategy, Chunker] = {
+    ChunkingStrategy.SENTENCE: _sentence_chunks,
+    ChunkingStrategy.SENTENCE_WINDOW: _sentence_window_chunks,
+    ChunkingStrategy.TOKEN_WINDOW: _token_window_chunks,
+    ChunkingStrategy.BLOCK: _block_chunks,
+}
+
+
+def chunk_block_text(
+    text: str,
+    language: str,
+    strategy: ChunkingStrategy = DEFAULT_CHUNKING_STRATEGY,
+) -> list[TextChunk]:
+    """Cut one block's text into the chunks to embed."""
+    return CHUNKERS[strategy](text, language)
+
+
+def _parse_strategy(value: object) -> ChunkingStrategy | None:
+    if value is None or value == "":
+        return None
+    try:
+        return ChunkingStrategy(str(value).strip().lower())
+    except ValueError:
+        logger.warning("Unknown chunking strategy %r; ignoring", value)
+        return None
+
+
+def default_chunking_strategy() -> ChunkingStrategy:
+    return _parse_strategy(os.getenv(ENV_CHUNKING_STRATEGY)) or DEFAULT_CHUNKING_STRATEGY
+
+
+def resolve_chunking_strategy(
+    config: Mapping[str, Any] | None,
+    org_id: str | None,
+    connector: str | None,
+) -> ChunkingStrategy:
+    """The strategy for a record of ``connector`` in ``org_id`` (see module docstring)."""
+    if not isinstance(config, Mapping):
+        return default_chunking_strategy()
+
+    def _connector_entry(scope: Mapping[str, Any]) -> object:
+        connectors = scope.get("connectors")
+        if connector and isinstance(connectors, Mapping):
+            return connectors.get(connector)
+        return None
+
+    orgs = config.get("orgs")
+    org_scope = orgs.get(org_id) if org_id and isinstance(orgs, Mapping) else None
+    candidates = []
+    if isinstance(org_scope, Mapping):
+        candidates += [_connector_entry(org_scope), org_scope.get("strategy")]
+    candidates += [_connector_entry(config), config.get("strategy")]
+
+    for candidate in candidates:
+        strategy = _parse_strategy(candidate)
+        if strategy is not None:
+            return strategy
+    return default_chunking_strategy()
@@ -210,14 +210,16 @@ class SinkOrchestrator(Transformer):
         self.logger.info(
             "✅ indexingStatus=COMPLETED recorded for %s", record.id
         )
-        # The record is only searchable now, so the accessible-record map that
-        # gates search is stale. KB-only: a connector sync flips thousands of
-        # records here in a burst and invalidates once, at sync completion.
+        # The record is only searchable now, so the accessible-record maps that
+        # gate search are missing it. KB and app-level connector maps take it
+        # as a patch; per-user maps wait for sync completion.
         await notify_record_indexed(
             connector_name=record.connector_name,
             connector_id=record.connector_id,
             external_record_group_id=record.external_record_group_id,
             org_id=record.org_id,
+            virtual_record_id=record.virtual_record_id,
+            record_id=record.id,
         )
 
     # ------------------------------------------------------------------
@@ -35,11 +35,24 @@ from app.models.blocks import Block, BlockType, BlocksContainer, SemanticMetadat
 from app.models.entities import Record
 from app.modules.extraction.prompt_template import prompt_for_image_description
 from app.modules.parsers.text_splitting import detect_language, split_into_sentences
+from app.modules.transformers.chunking import (
+    DEFAULT_CHUNKING_STRATEGY,
+    ChunkingStrategy,
+    chunk_block_text,
+    pack_sentences,
+    resolve_chunking_strategy,
+)
 from app.modules.transformers.transformer import TransformContext, Transformer
+from app.services.cache.embedding_cache import EmbeddingCache, embedding_namespace
 from app.services.embeddings.multimodal.config import MultimodalProviderConfig
 from app.services.embeddings.multimodal.factory import MultimodalEmbeddingFactory
 from app.services.embeddings.multimodal.interface import ImageEmbeddingResult
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
+from app.services.vector_db.acl import (
+    ACL_CONNECTOR_FIELD,
+    ACL_TOKENS_FIELD,
+    RecordAclLookup,
+)
 from app.services.vector_db.interface.vector_db import IVectorDBService
 from app.services.vector_db.models import (
     CollectionConfig,
@@ -50,10 +63,9 @@ from app.services.vector_db.sparse_embeddings import SparseEmbedder
 from app.utils.aimodels import (
     EmbeddingProvider,
     coerce_message_content_to_text,
-    get_default_embedding_model,
-    get_embedding_model,
     is_local_cpu_embedding_provider,
 )
+from app.utils.embedding_runtime import get_embedding_runtime
 from app.utils.image_utils import normalize_image_to_base64
 from app.utils.llm import get_llm
 
@@ -137,31 +149,7 @@ def _chunk_oversized_text(
     sentences = split_into_sentences(text, language=language)
     if not sentences:
         return [text]
-
-    chunks: List[str] = []
-    current: List[str] = []
-    current_len = 0
-
-    for sentence in sentences:
-        added_len = len(sentence) + (1 if current else 0)
-        if current and current_len + added_len > chunk_size:
-            chunks.append(" ".join(current))
-            overlap_sentences: List[str] = []
-            overlap_len = 0
-            for s in reversed(current):
-                if overlap_len + len(s) > overlap:
-                    break
-                overlap_sentences.insert(0, s)
-                overlap_len += len(s) + 1
-            current, current_len = overlap_sentences, overlap_len
-            added_len = len(sentence) + (1 if current else 0)
-        current.append(sentence)
-        current_len += added_len
-
-    if current:
-        chunks.append(" ".join(current))
-
-    return chunks or [text]
+    return pack_sentences(sentences, chunk_size, overlap) or [text]
 
 
 def _build_text_documents(
@@ -169,8 +157,9 @@ def _build_text_documents(
     virtual_record_id: str,
     org_id: str,
     language: str,
+    strategy: ChunkingStrategy = DEFAULT_CHUNKING_STRATEGY,
 ) -> List[Document]:
-    """Sentence-split each text block into embeddable Documents.
+    """Cut each text block into embeddable Documents per ``strategy``.
 
     CPU-bound (regex/rule-based sentence segmentation); callers should run
     this via ``asyncio.to_thread`` to keep the event loop responsive.
@@ -196,17 +185,9 @@ def _build_text_documents(
             )
             continue
 
-        sentences = split_into_sentences(block_text, language=language)
-        if len(sentences) > 1:
-            documents.extend(
-                Document(page_content=sentence, metadata={**metadata, "isBlock": False})
-                for sentence in sentences
-            )
-        documents.append(
-            Document(
-                page_content=block_text,
-                metadata={**metadata, "isBlock": True},
-            )
+        documents.extend(
+            Document(page_content=chunk.text, metadata={**metadata, "isBlock": chunk.is_block})
+            for chunk in chunk_block_text(block_text, language, strategy)
         )
     return documents
 
@@ -245,6 +226,7 @@ def _process_text_blocks(
     text_blocks: List,
     virtual_record_id: str,
     org_id: str,
+    strategy: ChunkingStrategy = DEFAULT_CHUNKING_STRATEGY,
 ) -> List[Document]:
     """Detect language and build embeddable Documents for a record's text blocks.
 
@@ -252,7 +234,9 @@ def _process_text_blocks(
     ``asyncio.to_thread`` call (see call site in ``index_documents``).
     """
     language = _detect_record_language(text_blocks)
-    return _build_text_documents(text_blocks, virtual_record_id, org_id, language)
+    return _build_text_documents(
+        text_blocks, virtual_record_id, org_id, language, strategy
+    )
 
 
 class VectorStore(Transformer):
@@ -264,6 +248,7 @@ class VectorStore(Transformer):
         graph_provider: IGraphDBProvider,
         collection_name: str,
         vector_db_service: IVectorDBService,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ) -> None:
         super().__init__()
         self.logger = logger
@@ -271,6 +256,11 @@ class VectorStore(Transformer):
         self.graph_provider = graph_provider
         self.vector_db_service = vector_db_service
         self.collection_name = collection_name
+        # Content-addressed vector cache; None embeds every chunk.
+        self.embedding_cache = embedding_cache
+        self._embedding_namespace: Optional[str] = None
+        # Coalesces the ACL lookups of records indexed concurrently.
+        self._acl_lookup = RecordAclLookup(graph_provider)
 
         self.dense_embeddings = None
         self.api_key = None
@@ -536,6 +526,8 @@ class VectorStore(Transformer):
             for field_name, schema in [
                 ("metadata.virtualRecordId", {"type": "keyword"}),
                 ("metadata.orgId", {"type": "keyword"}),
+                (f"metadata.{ACL_CONNECTOR_FIELD}", {"type": "keyword"}),
+                (f"metadata.{ACL_TOKENS_FIELD}", {"type": "keyword"}),
             ]:
                 await self.vector_db_service.create_index(
                     collection_name=self.collection_name,
@@ -579,28 +571,16 @@ class VectorStore(Transformer):
         self.logger.info("Getting embedding model")
 
         ai_models = await self.config_service.get_config(
-            config_node_constants.AI_MODELS.value, use_cache=False
+            config_node_constants.AI_MODELS.value, use_cache=True
         )
-        embedding_configs = ai_models["embedding"]
-        is_multimodal = False
-        provider = None
-        configuration = None
-
-        if not embedding_configs:
-            dense_embeddings = get_default_embedding_model()
-            self.logger.info("Using default embedding model")
-        else:
-            config = next(
-                (c for c in embedding_configs if c.get("isDefault")), embedding_configs[0]
-            )
-            provider = config["provider"]
-            configuration = config["configuration"]
-            dense_embeddings = get_embedding_model(provider, config)
-            is_multimodal = config.get("isMultimodal")
+        # Built once per consumer loop and config, and shared with every record.
+        dense_embeddings = await get_embedding_runtime(ai_models["embedding"])
+        provider = dense_embeddings.provider
+        configuration = dense_embeddings.configuration
+        is_multimodal = dense_embeddings.is_multimodal
 
         try:
-            sample = await dense_embeddings.aembed_query("test")
-            embedding_size = len(sample)
+            embedding_size = await dense_embeddings.dimension()
         except Exception as e:
             raise IndexingError(
                 "Failed to get embedding model: " + str(e),
@@ -638,6 +618,11 @@ class VectorStore(Transformer):
             self.aws_access_key_id = configuration.get("awsAccessKeyId")
             self.aws_secret_access_key = configuration.get("awsAccessSecretKey")
         self.is_multimodal_embedding = bool(is_multimodal)
+        # The runtime's config hash covers every provider setting, so two
+        # configs only share cached vectors when they are the same config.
+        self._embedding_namespace = embedding_namespace(
+            dense_embeddings.config_hash, model_name, embedding_size
+        )
         return self.is_multimodal_embedding
 
     # ------------------------------------------------------------------
@@ -753,7 +738,10 @@ class VectorStore(Transformer):
         )
 
     def _build_image_points(
-        self, image_chunks: List[dict], results: List[ImageEmbeddingResult]
+        self,
+        image_chunks: List[dict],
+        results: List[ImageEmbeddingResult],
+        acl_metadata: Optional[dict] = None,
     ) -> List[VectorPoint]:
         """Zip provider results back to their source chunk and build points.
 
@@ -785,7 +773,7 @@ class VectorStore(Transformer):
                     id=str(uuid.uuid4()),
                     dense_vector=result.embedding,
                     payload={
-                        "metadata": chunk.get("metadata", {}),
+                        "metadata": {**chunk.get("metadata", {}), **(acl_metadata or {})},
                         # Never the raw base64 URI — useless for lexical search and
                         # bloats payloads. The URI stays recoverable via blockId.
                         "page_content": chunk.get("description", ""),
@@ -795,11 +783,17 @@ class VectorStore(Transformer):
         return points
 
     async def _process_image_embeddings(
-        self, image_chunks: List[dict], image_base64s: List[str], record_id: str = ""
+        self,
+        image_chunks: List[dict],
+        image_base64s: List[str],
+        record_id: str = "",
+        acl_metadata: Optional[dict] = None,
     ) -> List[VectorPoint]:
         """Embed images via the provider the factory resolves for this config.
 
         Guard: skip entirely if the record was deleted mid-flight.
+        ``acl_metadata`` is resolved from the record when the caller has not
+        already done so.
         """
         record_doc = await self.graph_provider.get_document(
             record_id, CollectionNames.RECORDS.value
@@ -821,7 +815,9 @@ class VectorStore(Transformer):
             return []
 
         results = await provider.embed_images(image_base64s)
-        return self._build_image_points(image_chunks, results)
+        if acl_metadata is None:
+            acl_metadata = await self._record_acl_metadata(record_doc)
+        return self._build_image_points(image_chunks, results, acl_metadata)
 
     async def _store_image_points(self, points: List[VectorPoint]) -> None:
         if not points:
@@ -842,6 +838,61 @@ class VectorStore(Transformer):
     # Core document upsert (unified, all providers)
     # ------------------------------------------------------------------
 
+    async def _record_acl_metadata(self, record_doc: dict) -> dict:
+        """ACL tokens + connectorId merged into every point of the record.
+
+        Best-effort: a failed lookup indexes the points without tokens, which
+        only hides them from the ACL-filtered search path (the legacy
+        virtualRecordId path still finds them) until the ACL reconciler or a
+        reindex stamps them.
+        """
+        record_id = record_doc.get("_key") or record_doc.get("id")
+        org_id = record_doc.get("orgId")
+        if not record_id or not org_id:
+            return {}
+        return await self._lookup_acl_metadata(org_id, record_id)
+
+    async def _lookup_acl_metadata(self, org_id: str, record_id: str) -> dict:
+        try:
+            record = await self._acl_lookup.get(org_id, record_id)
+        except Exception as e:
+            self.logger.warning(f"Failed to resolve ACL principals for record {record_id}: {e}")
+            return {}
+        return record.payload_metadata() if record is not None else {}
+
+    async def _resolve_record_acl_metadata(
+        self, record_id: str, org_id: Optional[str] = None
+    ) -> dict:
+        """``_record_acl_metadata`` for ``record_id``, looked up once per record
+        so batches of the same record share one graph round trip. Callers that
+        know the org skip reading the record document."""
+        if org_id:
+            return await self._lookup_acl_metadata(org_id, record_id)
+        try:
+            record_doc = await self.graph_provider.get_document(
+                record_id, CollectionNames.RECORDS.value
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to load record {record_id} for ACL metadata: {e}")
+            return {}
+        if not isinstance(record_doc, dict):
+            return {}
+        return await self._record_acl_metadata(record_doc)
+
+    async def _chunking_strategy(
+        self, org_id: str, record: Optional["Record"] = None
+    ) -> ChunkingStrategy:
+        """Chunking strategy for this record's org and connector."""
+        connector = getattr(getattr(record, "connector_name", None), "value", None)
+        try:
+            config = await self.config_service.get_config(
+                config_node_constants.CHUNKING.value, default=None, use_cache=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to read chunking config, using default: {e}")
+            config = None
+        return resolve_chunking_strategy(config, org_id, connector)
+
     def _is_local_cpu_embedding(self) -> bool:
         return is_local_cpu_embedding_provider(self.embedding_provider)
 
@@ -852,15 +903,51 @@ class VectorStore(Transformer):
         embedder = await self._ensure_sparse_embeddings()
         if embedder is None:
             return [None] * len(texts)
-        return await embedder.embed_documents(texts)
+        if self.embedding_cache is None:
+            return await embedder.embed_documents(texts)
+        return await self.embedding_cache.get_or_embed_sparse(
+            embedding_namespace(embedder.model_name), texts, embedder.embed_documents
+        )
+
+    async def _compute_dense_embeddings(
+        self, texts: List[str], record_id: str
+    ) -> List[List[float]]:
+        """Dense vectors for ``texts``; only cache misses reach the model."""
+        embedding_timeout = (
+            _LOCAL_EMBEDDING_BATCH_TIMEOUT_S
+            if self._is_local_cpu_embedding()
+            else _REMOTE_EMBEDDING_BATCH_TIMEOUT_S
+        )
+
+        async def embed(batch: List[str]) -> List[List[float]]:
+            try:
+                return await asyncio.wait_for(
+                    self.dense_embeddings.aembed_documents(batch),
+                    timeout=embedding_timeout,
+                )
+            except asyncio.TimeoutError:
+                raise EmbeddingError(
+                    f"Dense embedding timed out after {embedding_timeout}s "
+                    f"for batch of {len(batch)} texts (record {record_id})"
+                )
+
+        if self.embedding_cache is None or self._embedding_namespace is None:
+            return await embed(texts)
+        return await self.embedding_cache.get_or_embed_dense(
+            self._embedding_namespace, texts, embed
+        )
 
     async def _embed_and_upsert_documents(
-        self, documents: List[Document], record_id: str
+        self,
+        documents: List[Document],
+        record_id: str,
+        acl_metadata: Optional[dict] = None,
     ) -> None:
         """Embed a batch of LangChain Documents and upsert to the vector DB.
 
         Guard: aborts if the record was deleted mid-flight (race condition fix
-        restored from commit 839a29499).
+        restored from commit 839a29499). ``acl_metadata`` is resolved once per
+        record by the caller; it is only looked up here when not given.
         """
         # Record-existence guard before upsert
         record_doc = await self.graph_provider.get_document(
@@ -874,25 +961,14 @@ class VectorStore(Transformer):
 
         texts = [doc.page_content for doc in documents]
 
-        embedding_timeout = (
-            _LOCAL_EMBEDDING_BATCH_TIMEOUT_S
-            if self._is_local_cpu_embedding()
-            else _REMOTE_EMBEDDING_BATCH_TIMEOUT_S
-        )
-        try:
-            dense_embeddings = await asyncio.wait_for(
-                self.dense_embeddings.aembed_documents(texts),
-                timeout=embedding_timeout,
-            )
-        except asyncio.TimeoutError:
-            raise EmbeddingError(
-                f"Dense embedding timed out after {embedding_timeout}s "
-                f"for batch of {len(texts)} texts (record {record_id})"
-            )
+        dense_embeddings = await self._compute_dense_embeddings(texts, record_id)
 
         # Sparse embeddings (provider-dependent)
         sparse_embeddings = await self._compute_sparse_embeddings(texts)
 
+        if acl_metadata is None:
+            acl_metadata = await self._record_acl_metadata(record_doc)
+
         points: List[VectorPoint] = [
             VectorPoint(
                 id=str(uuid.uuid4()),
@@ -900,7 +976,7 @@ class VectorStore(Transformer):
                 sparse_vector=sparse,
                 payload={
                     "page_content": doc.page_content,
-                    "metadata": doc.metadata,
+                    "metadata": {**doc.metadata, **acl_metadata},
                 },
             )
             for doc, dense, sparse in zip(documents, dense_embeddings, sparse_embeddings)
@@ -910,11 +986,16 @@ class VectorStore(Transformer):
         )
 
     async def _process_document_chunks(
-        self, langchain_document_chunks: List[Document], record_id: str = ""
+        self,
+        langchain_document_chunks: List[Document],
+        record_id: str = "",
+        acl_metadata: Optional[dict] = None,
     ) -> None:
         self.logger.info(
             f"⏱️ Embedding {len(langchain_document_chunks)} document chunks"
         )
+        if acl_metadata is None:
+            acl_metadata = await self._resolve_record_acl_metadata(record_id)
         use_local_sequential = self._is_local_cpu_embedding()
         batch_size = (
             _LOCAL_CPU_DOCUMENT_BATCH_SIZE if use_local_sequential else _DEFAULT_DOCUMENT_BATCH_SIZE
@@ -922,7 +1003,7 @@ class VectorStore(Transformer):
 
         async def process_batch(batch_start: int, batch: List[Document]) -> int:
             try:
-                await self._embed_and_upsert_documents(batch, record_id)
+                await self._embed_and_upsert_documents(batch, record_id, acl_metadata)
                 return len(batch)
             except Exception as e:
                 self.logger.warning(f"Batch at {batch_start} failed: {e}")
@@ -968,6 +1049,7 @@ class VectorStore(Transformer):
         chunks: List,
         record_id: str,
         virtual_record_id: str,
+        org_id: Optional[str] = None,
     ) -> None:
         if not chunks:
             raise EmbeddingError("No chunks provided for embedding creation")
@@ -988,14 +1070,18 @@ class VectorStore(Transformer):
             f"📊 Processing {len(langchain_docs)} text + {len(image_chunks)} image chunks"
         )
 
+        acl_metadata = await self._resolve_record_acl_metadata(record_id, org_id)
+
         if image_chunks:
             image_base64s = [c.get("image_uri") for c in image_chunks]
-            points = await self._process_image_embeddings(image_chunks, image_base64s, record_id)
+            points = await self._process_image_embeddings(
+                image_chunks, image_base64s, record_id, acl_metadata
+            )
             await self._store_image_points(points)
 
         if langchain_docs:
             try:
-                await self._process_document_chunks(langchain_docs, record_id)
+                await self._process_document_chunks(langchain_docs, record_id, acl_metadata)
             except Exception as e:
                 raise VectorStoreError(
                     "Failed to store documents in vector store: " + str(e),
@@ -1117,10 +1203,15 @@ class VectorStore(Transformer):
 
             # ── Text blocks ──
             if text_blocks:
+                strategy = await self._chunking_strategy(org_id, record)
                 try:
                     text_documents = await asyncio.wait_for(
                         asyncio.to_thread(
-                            _process_text_blocks, text_blocks, virtual_record_id, org_id
+                            _process_text_blocks,
+                            text_blocks,
+                            virtual_record_id,
+                            org_id,
+                            strategy,
                         ),
                         timeout=_TEXT_PROCESSING_TIMEOUT_S,
                     )
@@ -1387,16 +1478,21 @@ class VectorStore(Transformer):
                 # Partial update: no full delete; only changed blocks
                 langchain_docs = [d for d in documents_to_embed if isinstance(d, Document)]
                 image_chunks = [d for d in documents_to_embed if not isinstance(d, Document)]
+                acl_metadata = await self._resolve_record_acl_metadata(record_id, org_id)
                 if langchain_docs:
-                    await self._process_document_chunks(langchain_docs, record_id)
+                    await self._process_document_chunks(
+                        langchain_docs, record_id, acl_metadata
+                    )
                 if image_chunks:
                     image_base64s = [c.get("image_uri") for c in image_chunks]
                     points = await self._process_image_embeddings(
-                        image_chunks, image_base64s, record_id
+                        image_chunks, image_base64s, record_id, acl_metadata
                     )
                     await self._store_image_points(points)
             else:
-                await self._create_embeddings(documents_to_embed, record_id, virtual_record_id)
+                await self._create_embeddings(
+                    documents_to_embed, record_id, virtual_record_id, org_id
+                )
 
             if block_ids_to_delete:
                 self.logger.debug(f"📊 Deleting {len(block_ids_to_delete)} removed blocks")
@@ -12,6 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.middlewares.auth import authMiddleware
+from app.api.middlewares.query_timing import QueryTimingMiddleware
 from app.api.middlewares.request_context import RequestContextMiddleware
 from app.utils.request_context import set_service_suffix
 
@@ -31,6 +32,7 @@ from app.services.messaging.kafka.utils.utils import KafkaUtils
 from app.services.messaging.messaging_factory import MessagingFactory
 from app.services.messaging.utils import MessagingUtils
 from app.telemetry.setup import setup_telemetry
+from app.utils.embedding_runtime import EmbeddingRuntime
 from app.utils.llm_api_mode_store import get_llm_api_mode_store
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
 
@@ -179,6 +181,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"❌ Failed to register accessible-records invalidator: {e}")
 
+    # Retrieval re-reads the same popular records every turn; keep them decoded.
+    from app.services.cache.decoded_record_cache import init_decoded_record_cache
+
+    decoded_record_cache = init_decoded_record_cache(logger)
+    if decoded_record_cache is not None:
+        logger.info(
+            "Decoded-record cache enabled (max_bytes=%d)", decoded_record_cache.max_bytes
+        )
+
     # Start all message consumers centrally
     try:
         consumers = await start_kafka_consumers(app_container)
@@ -201,13 +212,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # download and load on a cold cache, which would otherwise block the
         # FastAPI lifespan and prevent the service from accepting traffic
         # (including health checks) until it finishes. Kick it off as a
-        # background task; callers of `get_embedding_model_instance()` will
-        # await/coordinate via the internal lock and lazy-load on first use
-        # if the warmup hasn't completed yet.
+        # background task; it builds the shared runtime in
+        # `app.utils.embedding_runtime` and sends one probe so the provider
+        # connection is open before the first query. Callers that arrive
+        # earlier wait on the runtime's build lock instead of building again.
         async def _warmup_embedding_model() -> None:
             try:
                 logger.info("🔥 Warming up embedding model in background")
-                await retrieval_service.get_embedding_model_instance()
+                runtime = await retrieval_service.get_embedding_model_instance()
+                if isinstance(runtime, EmbeddingRuntime):
+                    await runtime.dimension()
                 logger.info("✅ Embedding model warmup complete")
             except Exception as warmup_error:
                 logger.error(
@@ -307,6 +321,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"❌ Error shutting down PDF rasterization pool: {e}")
 
+    try:
+        from app.modules.parsers.pdf.opencv_layout_pool import shutdown_pdf_layout_pool
+        if shutdown_pdf_layout_pool():
+            logger.info("✅ PDF layout-analysis process pool shut down")
+    except Exception as e:
+        logger.error(f"❌ Error shutting down PDF layout-analysis pool: {e}")
+
     try:
         from app.modules.transformers.blob_storage import (
             close_shared_redis,
@@ -318,6 +339,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"❌ Error closing blob storage session: {e}")
 
+    try:
+        from app.utils.embedding_server_client import close_shared_clients
+        await close_shared_clients()
+        logger.info("✅ Embedding server clients closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing embedding server clients: {e}")
+
     try:
         accessible_records_cache = await app_container.accessible_records_cache()
         await accessible_records_cache.close()
@@ -371,6 +399,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-query phase timing (see app/utils/query_timing.py).
+app.add_middleware(QueryTimingMiddleware)
 # Trace context — outermost, before auth.
 app.add_middleware(RequestContextMiddleware)
 telemetry = setup_telemetry(app, service_name="query_service")
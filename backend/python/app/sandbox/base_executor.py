@@ -56,6 +56,9 @@ class BaseExecutor(ABC):
     ) -> ExecutionResult:
         """Run *code* in the given *language* and return an ExecutionResult."""
 
+    def close(self) -> None:
+        """Release long-lived resources (pooled containers, clients). No-op by default."""
+
     # ------------------------------------------------------------------
     # Shared helpers
     # ------------------------------------------------------------------
@@ -0,0 +1,206 @@
+"""Pool of pre-started, offline sandbox run containers for DockerExecutor.
+
+Creating and starting a container is most of the fixed cost of a cold
+execution. The pool keeps up to ``size`` idle containers per language already
+running ``sleep <lifetime>`` with the run container's isolation (no network,
+same memory / CPU limits), so an execution only has to copy its source in and
+``exec`` the command. The finite sleep (plus ``auto_remove``) means a container
+leaked by a crashed process removes itself; :meth:`WarmContainerPool.acquire`
+skips containers too close to the end of their lifetime for the run at hand.
+
+A container is handed to exactly one execution at a time and is only put back
+after the owner's ``reset`` callback has wiped it and confirmed nothing outside
+the scratch paths changed (see ``DockerExecutor._reset_warm_container``).
+Containers that fail the reset, timed out, or have served ``max_uses`` runs are
+removed instead, and a background thread tops every language back up to
+``size``.
+
+Docker calls block, so every method here is synchronous and meant to be called
+from a worker thread (``asyncio.to_thread``) or the pool's own filler thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from app.sandbox.models import SandboxLanguage
+
+logger = logging.getLogger(__name__)
+
+#: Seconds the filler waits before retrying after a failed container create
+#: (daemon down, image missing), so a broken setup is not hammered.
+_REFILL_BACKOFF_SECONDS = 30.0
+
+
+@dataclass
+class PooledContainer:
+    container: Any
+    language: SandboxLanguage
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class WarmContainerPool:
+    """Per-language pool of idle sandbox containers; see the module docstring."""
+
+    def __init__(
+        self,
+        *,
+        create: Callable[[SandboxLanguage], Any],
+        reset: Callable[[Any], bool],
+        destroy: Callable[[Any], None],
+        languages: Iterable[SandboxLanguage],
+        size: int,
+        max_uses: int,
+        lifetime_seconds: float,
+    ) -> None:
+        self._create = create
+        self._reset = reset
+        self._destroy = destroy
+        self.languages = tuple(languages)
+        self.size = size
+        self.max_uses = max_uses
+        self.lifetime_seconds = lifetime_seconds
+        self._idle: dict[SandboxLanguage, deque[PooledContainer]] = {
+            lang: deque() for lang in self.languages
+        }
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._filler: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background filler and request the initial warm-up."""
+        if self._filler is None:
+            self._filler = threading.Thread(
+                target=self._fill_loop, name="sandbox-warm-pool", daemon=True
+            )
+            self._filler.start()
+        self._wakeup.set()
+
+    def acquire(
+        self,
+        language: SandboxLanguage,
+        *,
+        min_remaining_seconds: float = 0.0,
+    ) -> PooledContainer | None:
+        """Take an idle container for *language*, or None if none is ready.
+
+        Containers with less than *min_remaining_seconds* of lifetime left are
+        removed rather than handed out.
+        """
+        idle = self._idle.get(language)
+        if idle is None:
+            return None
+        pooled = None
+        expired: list[PooledContainer] = []
+        with self._lock:
+            while idle:
+                candidate = idle.popleft()
+                remaining = self.lifetime_seconds - (time.monotonic() - candidate.created_at)
+                if remaining > min_remaining_seconds:
+                    pooled = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            self._safe_destroy(stale.container)
+        self._wakeup.set()
+        return pooled
+
+    def release(self, pooled: PooledContainer, *, reusable: bool) -> bool:
+        """Return *pooled* to the pool if it can be reused, else remove it.
+
+        Returns True if the container went back into the pool.
+        """
+        pooled.uses += 1
+        returned = False
+        if (
+            reusable
+            and not self._stopped.is_set()
+            and pooled.uses < self.max_uses
+            and self._safe_reset(pooled.container)
+        ):
+            with self._lock:
+                idle = self._idle[pooled.language]
+                if len(idle) < self.size:
+                    idle.append(pooled)
+                    returned = True
+        if not returned:
+            self._safe_destroy(pooled.container)
+        self._wakeup.set()
+        return returned
+
+    def fill(self) -> int:
+        """Create containers until every language has ``size`` idle. Returns how many were made."""
+        created = 0
+        for language in self.languages:
+            while not self._stopped.is_set():
+                with self._lock:
+                    if len(self._idle[language]) >= self.size:
+                        break
+                container = self._create(language)
+                with self._lock:
+                    self._idle[language].append(PooledContainer(container, language))
+                created += 1
+        return created
+
+    def idle_count(self, language: SandboxLanguage) -> int:
+        with self._lock:
+            return len(self._idle.get(language, ()))
+
+    def close(self) -> None:
+        """Stop the filler and remove every idle container."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._drain()
+
+    def _fill_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                created = self.fill()
+                if created:
+                    logger.debug("Sandbox warm pool: started %d container(s)", created)
+            except Exception as exc:
+                logger.warning(
+                    "Sandbox warm pool could not start a container (%s); retrying in %.0fs",
+                    exc, _REFILL_BACKOFF_SECONDS,
+                )
+                # Wakeups from acquire/release stay pending until the backoff
+                # ends; close() ends it early.
+                self._stopped.wait(_REFILL_BACKOFF_SECONDS)
+                self._wakeup.set()
+        # A create that finished after close() drained the pool lands here.
+        self._drain()
+
+    def _drain(self) -> None:
+        with self._lock:
+            drained = [p for idle in self._idle.values() for p in idle]
+            for idle in self._idle.values():
+                idle.clear()
+        for pooled in drained:
+            self._safe_destroy(pooled.container)
+
+    def _safe_reset(self, container: Any) -> bool:  # noqa: ANN401
+        try:
+            return bool(self._reset(container))
+        except Exception as exc:
+            logger.debug("Sandbox warm container reset failed: %s", exc)
+            return False
+
+    def _safe_destroy(self, container: Any) -> None:  # noqa: ANN401
+        try:
+            self._destroy(container)
+        except Exception as exc:
+            logger.debug("Sandbox warm container removal failed: %s", exc)
@@ -0,0 +1,176 @@
+"""Content-addressed cache of installed sandbox dependencies.
+
+Both executors used to run ``pip install`` / ``npm install`` from scratch for
+every execution that asked for packages. An entry here is the result of one
+such install, keyed by :func:`dependency_cache_key`: a hash of the install
+*namespace* (the sandbox image id for Docker, the host interpreter for local
+mode, since an install for one is not valid for the other), the language and
+the sorted, already-validated package specs. Any later execution asking for
+the same set reuses it.
+
+Layout on disk (``SANDBOX_DEPS_CACHE_DIR``, default ``<tmp>/pipeshub_sandbox_deps``)::
+
+    <root>/<key>/            published entry, never modified after publish
+    <root>/.staging-<rand>/  install in progress
+
+An install runs into a staging directory that is renamed into place only when
+it succeeds, so a reader never sees a half-written entry and a failed install
+leaves nothing behind. Concurrent requests for the same key in one process
+wait on a per-key lock and share the first install; across processes the
+rename simply lets the first finisher win.
+
+Entries are evicted least-recently-used beyond ``SANDBOX_DEPS_CACHE_MAX_ENTRIES``
+(default 32; ``0`` disables the cache). An entry used within the last
+``_EVICTION_GRACE_SECONDS`` is never evicted, because a local run may still
+have it on ``PYTHONPATH`` / ``NODE_PATH``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from app.sandbox.models import SandboxLanguage
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_ROOT = os.path.join(tempfile.gettempdir(), "pipeshub_sandbox_deps")
+DEFAULT_MAX_ENTRIES = 32
+_STAGING_PREFIX = ".staging-"
+_EVICTION_GRACE_SECONDS = 600
+
+
+def dependency_cache_key(
+    packages: list[str],
+    language: SandboxLanguage,
+    *,
+    namespace: str,
+) -> str:
+    """Return the cache key for installing *packages* (already validated) in *namespace*.
+
+    Order and duplicates do not matter: ``["numpy", "pandas"]`` and
+    ``["pandas", "numpy", "pandas"]`` share an entry.
+    """
+    spec = sorted({pkg.strip() for pkg in packages if pkg.strip()})
+    payload = json.dumps([namespace, language.value, spec], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _max_entries_from_env() -> int:
+    raw = os.environ.get("SANDBOX_DEPS_CACHE_MAX_ENTRIES")
+    if raw:
+        try:
+            return max(0, int(raw))
+        except ValueError:
+            logger.warning("Invalid SANDBOX_DEPS_CACHE_MAX_ENTRIES=%s, using %d", raw, DEFAULT_MAX_ENTRIES)
+    return DEFAULT_MAX_ENTRIES
+
+
+class DependencyCache:
+    """Directory-per-entry dependency cache; see the module docstring."""
+
+    def __init__(self, root: str | None = None, max_entries: int | None = None) -> None:
+        self.root = root or os.environ.get("SANDBOX_DEPS_CACHE_DIR") or _DEFAULT_ROOT
+        self.max_entries = _max_entries_from_env() if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self._locks: dict[str, asyncio.Lock] = {}
+        if self.enabled:
+            os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def lookup(self, key: str) -> str | None:
+        """Return the published entry directory for *key*, or None."""
+        path = self.entry_path(key)
+        if not os.path.isdir(path):
+            return None
+        # mtime doubles as the LRU clock.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return path
+
+    async def get_or_install(
+        self,
+        key: str,
+        install: Callable[[str], Awaitable[None]],
+    ) -> tuple[str, bool]:
+        """Return ``(entry_dir, cached)``, running ``install(staging_dir)`` on a miss.
+
+        *install* must populate the directory it is given and raise on
+        failure; the exception propagates and nothing is cached.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            path = self.lookup(key)
+            if path is not None:
+                self.hits += 1
+                return path, True
+
+            self.misses += 1
+            os.makedirs(self.root, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=_STAGING_PREFIX, dir=self.root)
+            try:
+                await install(staging)
+                path = self._publish(key, staging)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        await asyncio.to_thread(self._evict, keep=key)
+        return path, False
+
+    def _publish(self, key: str, staging: str) -> str:
+        path = self.entry_path(key)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            # Another process published the same key first; its entry is
+            # equivalent, so keep it and drop ours.
+            if not os.path.isdir(path):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        return path
+
+    def _evict(self, *, keep: str) -> None:
+        try:
+            names = [
+                name for name in os.listdir(self.root)
+                if not name.startswith(".") and name != keep
+            ]
+        except OSError:
+            return
+        excess = len(names) + 1 - self.max_entries
+        if excess <= 0:
+            return
+
+        now = time.time()
+        entries: list[tuple[float, str]] = []
+        for name in names:
+            try:
+                mtime = os.path.getmtime(self.entry_path(name))
+            except OSError:
+                continue
+            if now - mtime >= _EVICTION_GRACE_SECONDS:
+                entries.append((mtime, name))
+        for _, name in sorted(entries)[:excess]:
+            logger.debug("Evicting sandbox dependency cache entry %s", name)
+            shutil.rmtree(self.entry_path(name), ignore_errors=True)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -23,21 +23,38 @@ Security model:
   --target``) or ``/install/node_modules`` (``npm install --prefix``).
   Those deps are tarred via ``get_archive`` and injected into the run
   container, which stays fully offline.
+
+Latency:
+
+- Installed deps are kept in a :class:`DependencyCache` entry keyed by the
+  sandbox image id and the sorted, validated package set, so the install
+  container only runs the first time a given set is requested.
+- Runs take a pre-started offline container from a
+  :class:`WarmContainerPool` when one is idle (``SANDBOX_WARM_POOL_SIZE``
+  per language, default 2; ``0`` disables). Returned containers are wiped and
+  checked with ``container.diff()``; anything that changed outside the
+  scratch paths gets the container discarded instead of reused. With no idle
+  container the run falls back to a fresh one exactly as before.
 """
 
 from __future__ import annotations
 
 import asyncio
+import atexit
+import contextlib
 import io
 import logging
 import os
 import shutil
 import tarfile
 import tempfile
+import threading
 import time
 from uuid import uuid4
 
 from app.sandbox.base_executor import BaseExecutor, build_sandbox_env
+from app.sandbox.container_pool import PooledContainer, WarmContainerPool
+from app.sandbox.dependency_cache import DependencyCache, dependency_cache_key
 from app.sandbox.models import (
     DEFAULT_CPU_LIMIT,
     DEFAULT_MEMORY_LIMIT_MB,
@@ -47,6 +64,7 @@ from app.sandbox.models import (
     SandboxLanguage,
     validate_packages,
 )
+from app.telemetry.modules.sandbox_metrics import SANDBOX_EXECUTION_DURATION
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +81,62 @@ _DEFAULT_EGRESS_NETWORK = "pipeshub_sandbox_egress"
 _DEFAULT_PIP_INDEX_URL = os.environ.get("SANDBOX_PIP_INDEX_URL", "https://pypi.org/simple")
 _DEFAULT_NPM_REGISTRY = os.environ.get("SANDBOX_NPM_REGISTRY", "https://registry.npmjs.org")
 
+#: Where each language's installed deps are extracted in the run container.
+_DEPS_MOUNT_POINTS: dict[SandboxLanguage, str] = {
+    SandboxLanguage.PYTHON: "/deps",
+    SandboxLanguage.TYPESCRIPT: "/node_modules",
+}
+_DEPS_TAR_NAME = "deps.tar"
+
+_DEFAULT_WARM_POOL_SIZE = 2
+#: Languages that get pre-started containers; the rest always run cold.
+_WARM_POOL_LANGUAGES = (SandboxLanguage.PYTHON, SandboxLanguage.TYPESCRIPT)
+#: Runs a warm container serves before it is replaced regardless.
+_WARM_POOL_MAX_USES = 50
+#: A warm container's ``sleep`` lifetime. Bounds how long a container leaked
+#: by a crashed process lingers (``auto_remove`` cleans it up after).
+_WARM_CONTAINER_LIFETIME_SECONDS = 1800
+#: Headroom beyond the run timeout a warm container must have left to be used.
+_WARM_CONTAINER_MIN_HEADROOM_SECONDS = 60
+
+#: Paths a run may change in a warm container. The reset wipes them and a
+#: change anywhere else (``container.diff()``) retires the container. The
+#: home-directory caches are where matplotlib / fontconfig / npm write.
+_WARM_SCRATCH_PATHS = (
+    "/src",
+    "/output",
+    "/deps",
+    "/node_modules",
+    "/home/sandbox/.cache",
+    "/home/sandbox/.config",
+    "/home/sandbox/.npm",
+)
+#: In-memory mounts a run can write to. ``container.diff()`` does not see
+#: mounts, so the reset empties these and then checks they really are empty;
+#: a container with any other mount is never reused.
+_WARM_WIPED_MOUNTS = ("/tmp", "/dev/shm")
+#: Runs as root: kills everything the last run left behind (``kill -1`` skips
+#: PID 1 and the caller), wipes the scratch paths and the in-memory mounts,
+#: and exits non-zero if anything survived in the latter.
+_WARM_RESET_SCRIPT = (
+    "kill -9 -1 2>/dev/null; "
+    f"rm -rf {' '.join(_WARM_SCRATCH_PATHS)} "
+    + " ".join(f"{m}/* {m}/.[!.]*" for m in _WARM_WIPED_MOUNTS)
+    + " 2>/dev/null; "
+    "mkdir -p -m 777 /src /output; "
+    f'[ -z "$(find {" ".join(_WARM_WIPED_MOUNTS)} -mindepth 1 -print -quit 2>/dev/null)" ]'
+)
+
+
+def _warm_pool_size_from_env() -> int:
+    raw = os.environ.get("SANDBOX_WARM_POOL_SIZE")
+    if raw:
+        try:
+            return max(0, int(raw))
+        except ValueError:
+            logger.warning("Invalid SANDBOX_WARM_POOL_SIZE=%s, using %d", raw, _DEFAULT_WARM_POOL_SIZE)
+    return _DEFAULT_WARM_POOL_SIZE
+
 
 class DockerExecutor(BaseExecutor):
     """Execute code inside ephemeral Docker containers."""
@@ -74,6 +148,8 @@ class DockerExecutor(BaseExecutor):
         cpu_limit: float = DEFAULT_CPU_LIMIT,
         network_disabled: bool = True,
         egress_network: str | None = None,
+        warm_pool_size: int | None = None,
+        deps_cache: DependencyCache | None = None,
     ) -> None:
         self.memory_limit_mb = memory_limit_mb
         self.cpu_limit = cpu_limit
@@ -85,6 +161,34 @@ class DockerExecutor(BaseExecutor):
         )
         os.makedirs(_SANDBOX_ROOT, exist_ok=True)
 
+        self.deps_cache = deps_cache or DependencyCache()
+        self._client = None
+        self._client_lock = threading.Lock()
+        pool_size = _warm_pool_size_from_env() if warm_pool_size is None else warm_pool_size
+        self.warm_pool: WarmContainerPool | None = None
+        if pool_size > 0:
+            self.warm_pool = WarmContainerPool(
+                create=self._create_warm_container,
+                reset=self._reset_warm_container,
+                destroy=_remove_container,
+                languages=_WARM_POOL_LANGUAGES,
+                size=pool_size,
+                max_uses=_WARM_POOL_MAX_USES,
+                lifetime_seconds=_WARM_CONTAINER_LIFETIME_SECONDS,
+            )
+            self.warm_pool.start()
+            atexit.register(self.close)
+
+    def close(self) -> None:
+        """Remove the idle warm containers and release the Docker client."""
+        if self.warm_pool is not None:
+            self.warm_pool.close()
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            with contextlib.suppress(Exception):
+                client.close()
+
     async def execute(
         self,
         code: str,
@@ -114,13 +218,14 @@ class DockerExecutor(BaseExecutor):
             # offline run container.
             deps_tar: bytes | None = None
             deps_target: str | None = None
+            deps_source = "none"
             if safe_packages:
-                deps_tar, deps_target = await asyncio.to_thread(
-                    self._install_dependencies,
+                deps_tar, deps_target, cached = await self._resolve_dependencies(
                     safe_packages,
                     lang,
                     timeout_seconds,
                 )
+                deps_source = "cached" if cached else "installed"
 
             cmd = self._build_command(code, lang, src_dir)
             # Pass only the shared allowlist + caller-provided env into the
@@ -133,19 +238,44 @@ class DockerExecutor(BaseExecutor):
                 run_env["NODE_PATH"] = "/node_modules"
             container_env = build_sandbox_env(run_env)
 
-            result = await self._run_container(
-                image=SANDBOX_IMAGE,
-                command=cmd,
-                work_dir=work_dir,
-                src_dir=src_dir,
-                output_dir=output_dir,
-                env=container_env,
-                timeout=timeout_seconds,
-                deps_tar=deps_tar,
-                deps_target=deps_target,
-            )
+            pooled = None
+            if self.warm_pool is not None:
+                pooled = await asyncio.to_thread(
+                    self.warm_pool.acquire,
+                    lang,
+                    min_remaining_seconds=timeout_seconds + _WARM_CONTAINER_MIN_HEADROOM_SECONDS,
+                )
+            if pooled is not None:
+                result = await self._run_warm_container(
+                    pooled,
+                    command=cmd,
+                    src_dir=src_dir,
+                    output_dir=output_dir,
+                    env=container_env,
+                    timeout=timeout_seconds,
+                    deps_tar=deps_tar,
+                    deps_target=deps_target,
+                )
+            else:
+                result = await self._run_container(
+                    image=SANDBOX_IMAGE,
+                    command=cmd,
+                    work_dir=work_dir,
+                    src_dir=src_dir,
+                    output_dir=output_dir,
+                    env=container_env,
+                    timeout=timeout_seconds,
+                    deps_tar=deps_tar,
+                    deps_target=deps_target,
+                )
             result.artifacts = self.collect_artifacts(output_dir)
             result.execution_time_ms = _now_ms() - start_ms
+            SANDBOX_EXECUTION_DURATION.observe(
+                "docker",
+                "warm" if pooled is not None else "cold",
+                deps_source,
+                value=result.execution_time_ms / 1000,
+            )
             return result
 
         except asyncio.TimeoutError:
@@ -206,6 +336,50 @@ class DockerExecutor(BaseExecutor):
     # Install phase
     # ------------------------------------------------------------------
 
+    async def _resolve_dependencies(
+        self,
+        packages: list[str],
+        language: SandboxLanguage,
+        timeout: int,
+    ) -> tuple[bytes, str, bool]:
+        """Return ``(deps_tar, mount_point, cached)`` for *packages*.
+
+        Served from the dependency cache when this image has installed the
+        same package set before; otherwise runs :meth:`_install_dependencies`
+        and caches its tar.
+        """
+        if not self.deps_cache.enabled:
+            deps_tar, mount_point = await asyncio.to_thread(
+                self._install_dependencies, packages, language, timeout,
+            )
+            return deps_tar, mount_point, False
+
+        namespace = await asyncio.to_thread(self._dependency_namespace)
+        key = dependency_cache_key(packages, language, namespace=namespace)
+
+        async def _install(staging_dir: str) -> None:
+            deps_tar, _ = await asyncio.to_thread(
+                self._install_dependencies, packages, language, timeout,
+            )
+            await asyncio.to_thread(
+                _write_bytes, os.path.join(staging_dir, _DEPS_TAR_NAME), deps_tar,
+            )
+
+        entry_dir, cached = await self.deps_cache.get_or_install(key, _install)
+        if cached:
+            logger.info("Sandbox deps cache hit for %s packages %s", language.value, packages)
+        deps_tar = await asyncio.to_thread(_read_bytes, os.path.join(entry_dir, _DEPS_TAR_NAME))
+        return deps_tar, _DEPS_MOUNT_POINTS[language], cached
+
+    def _dependency_namespace(self) -> str:
+        """Identify the sandbox image build, so deps are never reused across rebuilds."""
+        try:
+            image_id = self._docker_client().images.get(SANDBOX_IMAGE).id
+        except Exception as exc:
+            logger.debug("Could not resolve sandbox image id (%s); keying deps by tag", exc)
+            return f"docker:{SANDBOX_IMAGE}"
+        return f"docker:{image_id}"
+
     def _install_dependencies(
         self,
         packages: list[str],
@@ -238,7 +412,6 @@ class DockerExecutor(BaseExecutor):
                     + " ".join(packages),
                 ]
                 extract_path = "/deps"
-                mount_point = "/deps"
             elif language == SandboxLanguage.TYPESCRIPT:
                 cmd = [
                     "sh", "-c",
@@ -248,9 +421,9 @@ class DockerExecutor(BaseExecutor):
                     + " ".join(packages),
                 ]
                 extract_path = "/install/node_modules"
-                mount_point = "/node_modules"
             else:
                 raise ValueError(f"Cannot install packages for language: {language}")
+            mount_point = _DEPS_MOUNT_POINTS[language]
 
             mem_bytes = self.memory_limit_mb * 1024 * 1024
             nano_cpus = int(self.cpu_limit * 1e9)
@@ -476,6 +649,130 @@ class DockerExecutor(BaseExecutor):
             except Exception:
                 pass
 
+    # ------------------------------------------------------------------
+    # Warm pool
+    # ------------------------------------------------------------------
+
+    def _docker_client(self) -> object:
+        """Long-lived client for the warm pool and image lookups."""
+        with self._client_lock:
+            if self._client is None:
+                import docker
+
+                self._client = docker.from_env()
+            return self._client
+
+    def _create_warm_container(self, language: SandboxLanguage) -> object:
+        """Create and start an idle run container (same isolation as :meth:`_run_container`)."""
+        client = self._docker_client()
+        container = client.containers.create(
+            image=SANDBOX_IMAGE,
+            command=["sleep", str(_WARM_CONTAINER_LIFETIME_SECONDS)],
+            environment={},
+            working_dir="/src",
+            mem_limit=self.memory_limit_mb * 1024 * 1024,
+            nano_cpus=int(self.cpu_limit * 1e9),
+            network_mode="none",
+            network_disabled=self.network_disabled,
+            read_only=False,
+            tmpfs={"/tmp": "size=100M"},
+            shm_size="64m",
+            auto_remove=True,
+            labels={"pipeshub.sandbox": "warm", "pipeshub.sandbox.language": language.value},
+            detach=True,
+        )
+        try:
+            container.put_archive("/", _tar_empty_dir("src", mode=0o777))
+            container.put_archive("/", _tar_empty_dir("output", mode=0o777))
+            container.start()
+        except Exception:
+            _remove_container(container)
+            raise
+        return container
+
+    @staticmethod
+    def _reset_warm_container(container: object) -> bool:
+        """Wipe a returned warm container; False if it must not be reused."""
+        attrs = getattr(container, "attrs", None) or {}
+        mounts = {m.get("Destination") for m in attrs.get("Mounts") or []}
+        mounts.update((attrs.get("HostConfig") or {}).get("Tmpfs") or {})
+        unwiped = mounts - set(_WARM_WIPED_MOUNTS)
+        if unwiped:
+            logger.info("Retiring warm sandbox container: unwiped mounts %s", sorted(unwiped))
+            return False
+        exit_code, _ = container.exec_run(["sh", "-c", _WARM_RESET_SCRIPT], user="root")
+        if exit_code != 0:
+            return False
+        for change in container.diff() or []:
+            path = change.get("Path", "")
+            if not any(path == p or path.startswith(p + "/") for p in _WARM_SCRATCH_PATHS):
+                logger.info("Retiring warm sandbox container: run changed %s", path)
+                return False
+        return True
+
+    async def _run_warm_container(
+        self,
+        pooled: PooledContainer,
+        *,
+        command: list[str],
+        src_dir: str,
+        output_dir: str,
+        env: dict[str, str],
+        timeout: int,
+        deps_tar: bytes | None = None,
+        deps_target: str | None = None,
+    ) -> ExecutionResult:
+        """Run *command* via ``exec`` in a pooled container, then hand it back.
+
+        The container only goes back to the pool if the run completed; a
+        timeout or any Docker error discards it.
+        """
+        container = pooled.container
+        reusable = False
+
+        def _prepare() -> None:
+            container.put_archive("/src", _tar_directory(src_dir))
+            if deps_tar and deps_target:
+                container.put_archive("/", _tar_empty_dir(deps_target.lstrip("/"), mode=0o755))
+                container.put_archive(deps_target, deps_tar)
+
+        def _blocking_exec() -> tuple[int, str, str]:
+            exit_code, (stdout, stderr) = container.exec_run(
+                command, environment=env, workdir="/src", demux=True,
+            )
+            return (
+                exit_code if exit_code is not None else -1,
+                (stdout or b"").decode(errors="replace"),
+                (stderr or b"").decode(errors="replace"),
+            )
+
+        try:
+            await asyncio.to_thread(_prepare)
+            try:
+                exit_code, stdout, stderr = await asyncio.wait_for(
+                    asyncio.to_thread(_blocking_exec),
+                    timeout=timeout + 5,
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # Discarding the container (below) kills the command.
+                logger.warning("Warm container execution timed out after %ds, discarding container", timeout)
+                return ExecutionResult(
+                    success=False,
+                    exit_code=-1,
+                    error=f"Execution timed out after {timeout}s",
+                )
+
+            await asyncio.to_thread(_extract_container_dir, container, "/output", output_dir)
+            reusable = True
+            return ExecutionResult(
+                success=exit_code == 0,
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=exit_code,
+            )
+        finally:
+            await asyncio.to_thread(self.warm_pool.release, pooled, reusable=reusable)
+
     @staticmethod
     def cleanup_execution(execution_id: str) -> None:
         path = os.path.join(_SANDBOX_ROOT, execution_id)
@@ -491,6 +788,20 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def _remove_container(container: object) -> None:
+    container.remove(force=True)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
 # ------------------------------------------------------------------
 # Tar helpers for put_archive / get_archive
 # ------------------------------------------------------------------
@@ -2,6 +2,11 @@
 
 Runs code on the host OS via ``asyncio.create_subprocess_exec``.
 Each invocation gets its own temp directory for source files and artifacts.
+
+Packages that are not already on the host are installed into a
+:class:`~app.sandbox.dependency_cache.DependencyCache` entry shared by every
+execution that asks for the same package set, rather than into the
+per-execution directory.
 """
 
 from __future__ import annotations
@@ -14,9 +19,11 @@ import shutil
 import sys
 import tempfile
 import time
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from app.sandbox.base_executor import BaseExecutor, build_sandbox_env
+from app.sandbox.dependency_cache import DependencyCache, dependency_cache_key
 from app.sandbox.models import (
     DEFAULT_TIMEOUT_SECONDS,
     ExecutionResult,
@@ -24,6 +31,10 @@ from app.sandbox.models import (
     validate_packages,
 )
 from app.sandbox.package_policy import canonicalize
+from app.telemetry.modules.sandbox_metrics import SANDBOX_EXECUTION_DURATION
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -69,11 +80,27 @@ def _looks_offline(stderr: str) -> bool:
     return any(signal in stderr for signal in _PIP_OFFLINE_SIGNALS)
 
 
+def _install_namespace(language: SandboxLanguage) -> str:
+    """Dependency-cache namespace: the host toolchain the install is only valid for."""
+    if language == SandboxLanguage.PYTHON:
+        return f"local:{sys.executable}:{sys.version_info.major}.{sys.version_info.minor}"
+    return f"local:{shutil.which('node') or 'node'}"
+
+
+class _InstallFailed(Exception):
+    """Carries a failed pip/npm result out of a dependency-cache install."""
+
+    def __init__(self, result: ExecutionResult) -> None:
+        super().__init__(result.stderr)
+        self.result = result
+
+
 class LocalExecutor(BaseExecutor):
     """Execute code in a local subprocess (developer mode)."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, deps_cache: DependencyCache | None = None) -> None:
         os.makedirs(_SANDBOX_ROOT, exist_ok=True)
+        self.deps_cache = deps_cache or DependencyCache()
 
     async def execute(
         self,
@@ -152,6 +179,7 @@ class LocalExecutor(BaseExecutor):
         safe_packages = validate_packages(packages, language=SandboxLanguage.PYTHON)
 
         deps_dir = os.path.join(work_dir, "deps")
+        deps_source = "none"
         run_env: dict[str, str] = {**(env or {}), "OUTPUT_DIR": output_dir}
 
         if safe_packages:
@@ -168,25 +196,29 @@ class LocalExecutor(BaseExecutor):
                 )
 
             if needs_install:
-                # Install into a per-execution directory with ``--target`` so
-                # the host's global site-packages is never mutated. Invoke pip
-                # via ``python -m pip`` to avoid requiring a ``pip`` shim on
-                # PATH (notably absent for some Windows service accounts).
-                os.makedirs(deps_dir, exist_ok=True)
-                pip_result = await self._subprocess(
-                    [
-                        sys.executable, "-m", "pip", "install",
-                        "--quiet", "--no-cache-dir",
-                        "--disable-pip-version-check",
-                        "--retries", "1", "--timeout", "10",
-                        "--target", deps_dir,
-                        *needs_install,
-                    ],
-                    work_dir,
-                    timeout,
-                    env,
+                # Install with ``--target`` so the host's global site-packages
+                # is never mutated. Invoke pip via ``python -m pip`` to avoid
+                # requiring a ``pip`` shim on PATH (notably absent for some
+                # Windows service accounts).
+                pip_result, deps_dir, deps_source = await self._install_packages(
+                    needs_install,
+                    SandboxLanguage.PYTHON,
+                    deps_dir,
+                    lambda target: self._subprocess(
+                        [
+                            sys.executable, "-m", "pip", "install",
+                            "--quiet", "--no-cache-dir",
+                            "--disable-pip-version-check",
+                            "--retries", "1", "--timeout", "10",
+                            "--target", target,
+                            *needs_install,
+                        ],
+                        work_dir,
+                        timeout,
+                        env,
+                    ),
                 )
-                if pip_result.exit_code != 0:
+                if pip_result is not None:
                     pip_result.execution_time_ms = _now_ms() - start_ms
                     if _looks_offline(pip_result.stderr):
                         pip_result.error = (
@@ -225,6 +257,7 @@ class LocalExecutor(BaseExecutor):
         )
         result.artifacts = self.collect_artifacts(output_dir)
         result.execution_time_ms = _now_ms() - start_ms
+        _observe_latency(result, deps_source)
         return result
 
     async def _run_typescript(
@@ -241,23 +274,29 @@ class LocalExecutor(BaseExecutor):
 
         run_env: dict[str, str] = {**(env or {}), "OUTPUT_DIR": output_dir}
 
+        deps_source = "none"
         if safe_packages:
-            # Install into the per-execution ``work_dir`` so that the host
-            # project's node_modules / package.json is never touched.
-            npm_result = await self._subprocess(
-                [
-                    "npm", "install", "--prefix", work_dir, "--no-save",
-                    "--loglevel=error", *safe_packages,
-                ],
+            # ``--prefix`` keeps the host project's node_modules /
+            # package.json untouched.
+            npm_result, prefix_dir, deps_source = await self._install_packages(
+                safe_packages,
+                SandboxLanguage.TYPESCRIPT,
                 work_dir,
-                timeout,
-                env,
+                lambda target: self._subprocess(
+                    [
+                        "npm", "install", "--prefix", target, "--no-save",
+                        "--loglevel=error", *safe_packages,
+                    ],
+                    work_dir,
+                    timeout,
+                    env,
+                ),
             )
-            if npm_result.exit_code != 0:
+            if npm_result is not None:
                 npm_result.execution_time_ms = _now_ms() - start_ms
                 npm_result.error = f"npm install failed: {npm_result.stderr}"
                 return npm_result
-            node_modules_dir = os.path.join(work_dir, "node_modules")
+            node_modules_dir = os.path.join(prefix_dir, "node_modules")
             existing = run_env.get("NODE_PATH", "")
             run_env["NODE_PATH"] = (
                 f"{node_modules_dir}{os.pathsep}{existing}" if existing else node_modules_dir
@@ -275,6 +314,7 @@ class LocalExecutor(BaseExecutor):
         )
         result.artifacts = self.collect_artifacts(output_dir)
         result.execution_time_ms = _now_ms() - start_ms
+        _observe_latency(result, deps_source)
         return result
 
     async def _run_sqlite(
@@ -302,6 +342,7 @@ class LocalExecutor(BaseExecutor):
         )
         result.artifacts = self.collect_artifacts(output_dir)
         result.execution_time_ms = _now_ms() - start_ms
+        _observe_latency(result, "none")
         return result
 
     async def _run_postgresql(
@@ -330,8 +371,46 @@ class LocalExecutor(BaseExecutor):
         )
         result.artifacts = self.collect_artifacts(output_dir)
         result.execution_time_ms = _now_ms() - start_ms
+        _observe_latency(result, "none")
         return result
 
+    # ------------------------------------------------------------------
+    # Dependency install
+    # ------------------------------------------------------------------
+
+    async def _install_packages(
+        self,
+        packages: list[str],
+        language: SandboxLanguage,
+        default_target: str,
+        install: Callable[[str], Awaitable[ExecutionResult]],
+    ) -> tuple[ExecutionResult | None, str, str]:
+        """Run ``install(target)`` through the dependency cache.
+
+        Returns ``(failed_result, target, deps_source)``: ``failed_result`` is
+        the pip/npm result when the install failed (None otherwise), and
+        ``deps_source`` is ``"cached"`` or ``"installed"``. With the cache
+        disabled the install goes to *default_target* as before.
+        """
+        if not self.deps_cache.enabled:
+            os.makedirs(default_target, exist_ok=True)
+            result = await install(default_target)
+            return (result if result.exit_code != 0 else None), default_target, "installed"
+
+        async def _build(staging_dir: str) -> None:
+            result = await install(staging_dir)
+            if result.exit_code != 0:
+                raise _InstallFailed(result)
+
+        key = dependency_cache_key(packages, language, namespace=_install_namespace(language))
+        try:
+            entry_dir, cached = await self.deps_cache.get_or_install(key, _build)
+        except _InstallFailed as exc:
+            return exc.result, default_target, "installed"
+        if cached:
+            logger.info("[LocalExecutor] deps cache hit for %s packages %s", language.value, packages)
+        return None, entry_dir, "cached" if cached else "installed"
+
     # ------------------------------------------------------------------
     # Subprocess helper
     # ------------------------------------------------------------------
@@ -403,3 +482,9 @@ class LocalExecutor(BaseExecutor):
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
+
+
+def _observe_latency(result: ExecutionResult, deps_source: str) -> None:
+    SANDBOX_EXECUTION_DURATION.observe(
+        "local", "local", deps_source, value=result.execution_time_ms / 1000,
+    )
@@ -50,6 +50,8 @@ def get_executor() -> BaseExecutor:
 
 
 def reset_executor() -> None:
-    """Reset the singleton (useful for testing)."""
+    """Close and reset the singleton (useful for testing)."""
     global _executor_instance
+    if _executor_instance is not None:
+        _executor_instance.close()
     _executor_instance = None
@@ -21,6 +21,31 @@ Every entry carries a TTL. Event-driven invalidation is best-effort by design 
 it must never fail a sync or a delete — so the TTL is the backstop that bounds
 staleness when an invalidation is lost.
 
+Events that touch a single record patch the cached maps instead of dropping
+them. Rewriting a map that can hold a whole connector's records on every
+event would cost more than recomputing it, so each entry has two small side
+hashes read alongside it:
+
+* ``<key>:added`` — records that became searchable after the map was
+  computed (KB and app-level entries, whose contents do not depend on the
+  user). Each is one ``HSETNX``.
+* ``<key>:changed`` — a sorted set of records whose ACL changed, scored by
+  the time of the change (per-user entries). A record is hidden from every
+  per-user map computed before its change until that map is recomputed, so a
+  revoked grant takes effect at once; a new grant still arrives with the
+  recompute that connector sync completion triggers. A read fetches only the
+  changes newer than its map, and every write prunes changes older than the
+  TTL: no live map is older than that, so they can no longer hide anything.
+
+Dropping an entry drops its side hashes with it.
+
+A miss is computed once across every worker and pod: the first process to
+miss takes a short Redis lease on the entry and computes it, and the others
+poll for the winner's result instead of running the same traversal. Without
+this, the invalidation at the end of a connector sync sent every query worker
+to the graph at the same moment. A waiter that sees the lease vanish without
+a result — the winner failed or died — computes the entry itself.
+
 Redis is never allowed to break or stall a search: any error falls through to
 the live query and trips a short circuit-breaker so the next requests skip
 Redis entirely instead of paying a timeout each.
@@ -32,12 +57,15 @@ import asyncio
 import json
 import os
 import time
+import uuid
 import zlib
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING
 
 from redis.asyncio import Redis
 
+from app.utils.query_timing import backend_call
+
 if TYPE_CHECKING:
     from logging import Logger
 
@@ -51,6 +79,16 @@ Loader = Callable[[], Awaitable[dict[str, str]]]
 
 _DISABLED_VALUES = {"0", "off", "false", "no"}
 
+# Compare-and-delete: drop the lease only while it still holds our token. A
+# GET followed by a DEL could delete a lease that expired in between and was
+# taken by another process.
+_RELEASE_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
 
 def _cache_enabled_from_env() -> bool:
     raw = os.getenv(AccessibleRecordsCache.ENV_ENABLED)
@@ -70,12 +108,18 @@ def _ttl_from_env(default: int) -> int:
 class AccessibleRecordsCache:
     """Read-through cache of accessible-record maps, shared across workers."""
 
-    KEY_PREFIX = "pipeshub:accessible_records:v1"
+    # v2: ``:changed`` became a sorted set.
+    KEY_PREFIX = "pipeshub:accessible_records:v2"
     ENV_ENABLED = "PIPESHUB_ACCESSIBLE_RECORDS_CACHE"
     ENV_TTL = "PIPESHUB_ACCESSIBLE_RECORDS_CACHE_TTL"
     DEFAULT_TTL_SECONDS = 300
     OP_TIMEOUT_SECONDS = 2.0
     DOWN_BACKOFF_SECONDS = 30.0
+    # How long one process may hold the right to compute an entry. A waiter
+    # never waits longer than this for the winner's result.
+    LEASE_SECONDS = 15.0
+    LEASE_POLL_SECONDS = 0.025
+    LEASE_POLL_MAX_SECONDS = 0.4
     # Striped locks, not one per key. A per-key table could only be trimmed of
     # *unlocked* entries, so under enough concurrent misses on distinct keys it
     # grew without limit. A fixed stripe array is bounded by construction; two
@@ -94,6 +138,11 @@ class AccessibleRecordsCache:
         self._redis = redis_client
         self._ttl = ttl_seconds
         self._enabled = enabled and redis_client is not None
+        self._release_script = (
+            redis_client.register_script(_RELEASE_LEASE_SCRIPT)
+            if redis_client is not None
+            else None
+        )
         self._down_until = 0.0
         self._locks: tuple[asyncio.Lock, ...] = tuple(
             asyncio.Lock() for _ in range(self.LOCK_STRIPES)
@@ -161,6 +210,18 @@ class AccessibleRecordsCache:
     def _user_connector_key(self, org_id: str, connector_id: str) -> str:
         return f"{self.KEY_PREFIX}:cusr:{org_id}:{connector_id}"
 
+    @staticmethod
+    def _added_key(key: str) -> str:
+        return f"{key}:added"
+
+    @staticmethod
+    def _changed_key(key: str) -> str:
+        return f"{key}:changed"
+
+    @staticmethod
+    def _lease_key(lock_key: str) -> str:
+        return f"{lock_key}:lease"
+
     # ---- read-through -------------------------------------------------
 
     async def get_or_compute_kb(
@@ -207,12 +268,74 @@ class AccessibleRecordsCache:
             cached = await self._read(key, field)
             if cached is not None:
                 return cached
+            if not self.enabled:
+                return await loader()
 
-            value = await loader()
-            if self.enabled:
-                await self._write(key, field, value)
+            lease_key = self._lease_key(lock_key)
+            token = await self._acquire_lease(lease_key)
+            if token is None:
+                cached = await self._await_winner(key, field, lease_key)
+                if cached is not None:
+                    return cached
+
+            try:
+                value = await loader()
+                if self.enabled:
+                    await self._write(key, field, value)
+            finally:
+                if token:
+                    await self._release_lease(lease_key, token)
             return value
 
+    async def _acquire_lease(self, lease_key: str) -> str | None:
+        """Claim the right to compute an entry across processes.
+
+        Returns the lease token when this process should compute -- ``""`` if
+        Redis failed, so there is nothing to release -- and None when another
+        process holds the lease.
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._redis.set(
+                lease_key, token, nx=True, px=int(self.LEASE_SECONDS * 1000)
+            )
+        except Exception as e:
+            self._mark_down("lease", e)
+            return ""
+        return token if acquired else None
+
+    async def _release_lease(self, lease_key: str, token: str) -> None:
+        """Drop the lease if it is still ours; an expired one may belong to
+        another process by now."""
+        try:
+            await self._release_script(keys=[lease_key], args=[token])
+        except Exception as e:
+            self._mark_down("lease release", e)
+
+    async def _await_winner(
+        self, key: str, field: str | None, lease_key: str
+    ) -> dict[str, str] | None:
+        """Wait for the lease holder's result. None when it gave up or the
+        wait ran out, in which case the caller computes the entry itself."""
+        deadline = time.monotonic() + self.LEASE_SECONDS
+        delay = self.LEASE_POLL_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.LEASE_POLL_MAX_SECONDS)
+            cached = await self._read(key, field)
+            if cached is not None:
+                return cached
+            if not self.enabled:
+                return None
+            try:
+                if not await self._redis.exists(lease_key):
+                    # Released without a write, or expired: the winner failed.
+                    return await self._read(key, field)
+            except Exception as e:
+                self._mark_down("lease wait", e)
+                return None
+        return None
+
     def _lock_for(self, lock_key: str) -> asyncio.Lock:
         """Stripe for this key. crc32 rather than hash() so the mapping is
         stable across processes and test runs."""
@@ -220,9 +343,10 @@ class AccessibleRecordsCache:
 
     async def _read(self, key: str, field: str | None) -> dict[str, str] | None:
         try:
-            raw = await (
-                self._redis.get(key) if field is None else self._redis.hget(key, field)
-            )
+            with backend_call("redis"):
+                raw = await (
+                    self._redis.get(key) if field is None else self._redis.hget(key, field)
+                )
         except Exception as e:
             self._mark_down("read", e)
             return None
@@ -236,7 +360,14 @@ class AccessibleRecordsCache:
             return None
 
         if field is None:
-            return payload if isinstance(payload, dict) else None
+            if not isinstance(payload, dict):
+                return None
+            added = await self._read_side_hash(self._added_key(key))
+            if added is None:
+                return None
+            for vid, rid in added.items():
+                payload.setdefault(vid, rid)
+            return payload
 
         # Hash fields carry their own timestamp: Redis expires whole keys only,
         # and the key's TTL is refreshed by every other user's write, so a field
@@ -249,8 +380,29 @@ class AccessibleRecordsCache:
             return None
         if time.time() - written_at > self._ttl:
             return None
+        try:
+            with backend_call("redis"):
+                changed = await self._redis.zrangebyscore(
+                    self._changed_key(key), written_at, "+inf"
+                )
+        except Exception as e:
+            # Not served without its patches: a revoked record would reappear.
+            self._mark_down("read", e)
+            return None
+        for vid in changed:
+            stored.pop(vid, None)
         return stored
 
+    async def _read_side_hash(self, key: str) -> dict[str, str] | None:
+        """A patch hash; None when Redis failed, so the entry is not served
+        without its patches."""
+        try:
+            with backend_call("redis"):
+                return await self._redis.hgetall(key) or {}
+        except Exception as e:
+            self._mark_down("read", e)
+            return None
+
     async def _write(self, key: str, field: str | None, value: dict[str, str]) -> None:
         try:
             if field is None:
@@ -262,6 +414,54 @@ class AccessibleRecordsCache:
         except Exception as e:
             self._mark_down("write", e)
 
+    # ---- patches ------------------------------------------------------
+
+    async def add_kb_records(self, org_id: str, kb_id: str, records: dict[str, str]) -> None:
+        """Records that became searchable in a KB: add them to its entry."""
+        await self._add(self._kb_key(org_id, kb_id), records)
+
+    async def add_app_connector_records(
+        self, org_id: str, connector_id: str, records: dict[str, str]
+    ) -> None:
+        """Records that became searchable in an app-level connector."""
+        await self._add(self._app_connector_key(org_id, connector_id), records)
+
+    async def mark_records_changed(
+        self, org_id: str, connector_id: str, virtual_record_ids: list[str]
+    ) -> None:
+        """These records' ACLs changed: hide them from every per-user map of
+        the connector computed before now."""
+        if not virtual_record_ids or not self.enabled:
+            return
+        key = self._changed_key(self._user_connector_key(org_id, connector_id))
+        now = time.time()
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(key, dict.fromkeys(virtual_record_ids, now))
+                # No live per-user map is older than the TTL, so older
+                # changes can no longer hide anything.
+                pipe.zremrangebyscore(key, "-inf", f"({now - self._ttl}")
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._mark_down("patch", e)
+
+    async def _add(self, key: str, records: dict[str, str]) -> None:
+        # Unconditional: if the entry is missing or being recomputed, the
+        # additions are merged into whatever is written next, and every one
+        # of them is still true then -- removals drop the side hash too.
+        if not records or not self.enabled:
+            return
+        added_key = self._added_key(key)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for vid, rid in records.items():
+                    pipe.hsetnx(added_key, vid, rid)
+                pipe.expire(added_key, self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._mark_down("patch", e)
+
     # ---- invalidation -------------------------------------------------
 
     async def invalidate_connector(self, org_id: str, connector_id: str) -> None:
@@ -277,8 +477,11 @@ class AccessibleRecordsCache:
     async def _delete(self, *keys: str) -> None:
         if not self.enabled:
             return
+        side_keys = [self._added_key(key) for key in keys] + [
+            self._changed_key(key) for key in keys
+        ]
         try:
-            await self._redis.delete(*keys)
+            await self._redis.delete(*keys, *side_keys)
         except Exception as e:
             self._mark_down("delete", e)
 
@@ -313,6 +516,9 @@ class AccessibleRecordsInvalidator:
         self.logger = logger
         self.cache = cache
         self.graph_provider = graph_provider
+        # connector id -> whether it declares app-level permissions. Read on
+        # every indexed record, and a connector's permission model is fixed.
+        self._app_level: dict[str, bool] = {}
 
     async def on_connector_sync_completed(
         self, connector_id: str, org_id: str | None = None
@@ -366,34 +572,87 @@ class AccessibleRecordsInvalidator:
         connector_id: str | None = None,
         external_record_group_id: str | None = None,
         org_id: str | None = None,
+        record_id: str | None = None,
+        virtual_record_id: str | None = None,
     ) -> None:
-        """Invalidate when a KB record becomes searchable.
-
-        Deliberately KB-only. Connector records also flip to COMPLETED here, but
-        a full sync does that thousands of times in a burst; dropping the
-        connector entry per record would leave the cache empty exactly when the
-        graph is busiest. Connectors invalidate once, on sync completion.
+        """Add a record that just became searchable to the maps it belongs in.
+
+        Only user-independent entries can take it: a KB's, or an app-level
+        connector's. A record-level connector's per-user maps would need the
+        permission traversal to know who gained the record, so those still
+        wait for sync completion -- a full sync flips thousands of records
+        here in a burst, and dropping the entry per record would leave the
+        cache empty exactly when the graph is busiest. Without the record's
+        ids a KB entry is dropped, as before.
         """
         try:
             from app.config.constants.arangodb import Connectors
 
             name = getattr(connector_name, "value", connector_name)
-            if name != Connectors.KNOWLEDGE_BASE.value:
+            if name == Connectors.KNOWLEDGE_BASE.value:
+                kb_id = connector_id or external_record_group_id
+                if not kb_id:
+                    return
+                if not org_id:
+                    app = await self._app_doc(kb_id)
+                    org_id = (app or {}).get("orgId")
+                if not org_id:
+                    return
+                if record_id and virtual_record_id:
+                    await self.cache.add_kb_records(org_id, kb_id, {virtual_record_id: record_id})
+                else:
+                    await self.cache.invalidate_kb(org_id, kb_id)
                 return
-            kb_id = connector_id or external_record_group_id
-            if not kb_id:
+
+            if not (name and connector_id and record_id and virtual_record_id):
+                return
+            if not await self._is_app_level(connector_id):
                 return
+            org_id = org_id or await self._org_for_app(connector_id)
             if not org_id:
-                app = await self._app_doc(kb_id)
-                org_id = (app or {}).get("orgId")
+                return
+            await self.cache.add_app_connector_records(
+                org_id, connector_id, {virtual_record_id: record_id}
+            )
+        except Exception as e:
+            self.logger.warning(
+                "Could not update accessible-records cache after indexing: %s", str(e)
+            )
+
+    async def on_record_permissions_changed(
+        self,
+        connector_id: str,
+        org_id: str | None = None,
+        virtual_record_ids: "list[str] | None" = None,
+    ) -> None:
+        """Hide records whose ACL changed from the connector's per-user maps
+        until they are recomputed."""
+        try:
+            if not connector_id or not virtual_record_ids:
+                return
+            org_id = org_id or await self._org_for_app(connector_id)
             if not org_id:
                 return
-            await self.cache.invalidate_kb(org_id, kb_id)
+            await self.cache.mark_records_changed(org_id, connector_id, virtual_record_ids)
         except Exception as e:
             self.logger.warning(
-                "Could not invalidate accessible-records cache after indexing: %s", str(e)
+                "Could not update accessible-records cache after a permission change on %s: %s",
+                connector_id, str(e),
             )
 
+    async def _is_app_level(self, connector_id: str) -> bool:
+        known = self._app_level.get(connector_id)
+        if known is not None:
+            return known
+        from app.config.constants.arangodb import PermissionModel
+
+        app = await self._app_doc(connector_id)
+        if app is None:
+            return False
+        app_level = app.get("permissionModel") == PermissionModel.APP_LEVEL.value
+        self._app_level[connector_id] = app_level
+        return app_level
+
     async def _app_doc(self, app_id: str) -> dict | None:
         from app.config.constants.arangodb import CollectionNames
 
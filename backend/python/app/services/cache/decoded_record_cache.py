@@ -0,0 +1,327 @@
+"""Process-local LRU of decoded blob-storage records for the query service.
+
+Every retrieval turn ends in ``get_record_from_storage`` for each hit record:
+download the stored envelope, then zstd + msgpack (or JSON) decode it. The same
+popular documents come back turn after turn and conversation after
+conversation, so the query service kept paying that download and decode for
+data it had just thrown away.
+
+Entries are keyed by ``(org, virtualRecordId)`` and carry the storage version
+they were decoded from — the mapping node's ``documentId`` plus its
+``updatedAt``, which ``store_virtual_record_mapping`` bumps on every reindex.
+A lookup whose version differs is a miss that replaces the entry, so a stale
+record is never served even when the reindex happened in another process and
+no invalidation reached this one. The invalidation hooks
+(``services/cache/invalidation_hooks.py``) still drop entries eagerly when the
+process hears about a change.
+
+Size is bounded by the msgpack-encoded size of the records, a stable proxy for
+their in-memory footprint; a single record larger than a fraction of the budget
+is served but not kept, so one huge document cannot flush the cache.
+
+Concurrent misses for the same record share one download (single-flight).
+
+Hits hand out a shallow copy: callers may set top-level keys (``get_record``
+does), but the nested block containers are shared and must be treated as
+read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+import msgspec
+
+__all__ = [
+    "DecodedRecordCache",
+    "DecodedRecordCacheStats",
+    "get_decoded_record_cache",
+    "init_decoded_record_cache",
+    "reset_decoded_record_cache",
+]
+
+Loader = Callable[[], Awaitable["dict | None"]]
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecodedRecordCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    bytes: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "bytes": self.bytes,
+            "entries": self.entries,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+@dataclass
+class _Entry:
+    version: Hashable
+    record: dict
+    size: int
+
+
+def _record_size(record: dict) -> int:
+    try:
+        return len(msgspec.msgpack.encode(record))
+    except Exception:
+        # Unencodable value somewhere in the record: fall back to a size that
+        # cannot fit, which serves the record without keeping it.
+        return -1
+
+
+class DecodedRecordCache:
+    """Byte-bounded LRU of decoded records with single-flight misses.
+
+    Safe to share across event loops: the LRU is guarded by a thread lock, and
+    miss coalescing only joins a download started on the caller's own loop.
+    """
+
+    ENV_MAX_BYTES = "PIPESHUB_DECODED_RECORD_CACHE_MAX_BYTES"
+    ENV_REPORT_SECONDS = "PIPESHUB_DECODED_RECORD_CACHE_REPORT_SECONDS"
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    DEFAULT_REPORT_SECONDS = 30.0
+    # A record larger than this share of the budget is served but not cached.
+    MAX_ENTRY_FRACTION = 0.125
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        *,
+        report_seconds: float = DEFAULT_REPORT_SECONDS,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.max_entry_bytes = int(self.max_bytes * self.MAX_ENTRY_FRACTION)
+        self.stats = DecodedRecordCacheStats()
+        self.logger = logger or _logger
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[str, str, Hashable], asyncio.Future] = {}
+        self._report_seconds = report_seconds
+        self._last_report = time.monotonic()
+
+    @classmethod
+    def from_env(cls, logger: logging.Logger | None = None) -> "DecodedRecordCache":
+        return cls(
+            _int_from_env(cls.ENV_MAX_BYTES, cls.DEFAULT_MAX_BYTES),
+            report_seconds=_float_from_env(cls.ENV_REPORT_SECONDS, cls.DEFAULT_REPORT_SECONDS),
+            logger=logger,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    # ---- read-through -------------------------------------------------
+
+    async def get_or_load(
+        self,
+        org_id: str,
+        virtual_record_id: str,
+        version: Hashable,
+        loader: Loader,
+    ) -> dict | None:
+        """Return the decoded record at ``version``, downloading it at most once.
+
+        ``None`` from the loader (no such record) is passed through and not
+        cached. Loader errors propagate to every caller waiting on that miss.
+        """
+        if not self.enabled or version is None:
+            return await loader()
+
+        key = (org_id, virtual_record_id)
+        cached = self._get(key, version)
+        if cached is not None:
+            self._maybe_report()
+            return dict(cached)
+
+        flight_key = (org_id, virtual_record_id, version)
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(flight_key)
+        if pending is not None and pending.get_loop() is loop:
+            self.stats.coalesced += 1
+            try:
+                record = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The request that owned the download was cancelled, not this
+                # one: start a fresh download instead of failing too.
+                if pending.cancelled():
+                    return await self.get_or_load(org_id, virtual_record_id, version, loader)
+                raise
+            return dict(record) if record is not None else None
+
+        self.stats.misses += 1
+        future = loop.create_future()
+        self._inflight[flight_key] = future
+        try:
+            record = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved: with no coalesced waiters nothing else reads it.
+            future.exception()
+            raise
+        else:
+            future.set_result(record)
+        finally:
+            if self._inflight.get(flight_key) is future:
+                del self._inflight[flight_key]
+
+        if record is not None:
+            self._put(key, version, record)
+        self._maybe_report()
+        return dict(record) if record is not None else None
+
+    def peek(self, org_id: str, virtual_record_id: str, version: Hashable) -> dict | None:
+        """The cached record at ``version``, or None; never loads."""
+        if not self.enabled or version is None:
+            return None
+        cached = self._get((org_id, virtual_record_id), version)
+        return dict(cached) if cached is not None else None
+
+    def _get(self, key: tuple[str, str], version: Hashable) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.record
+
+    def _put(self, key: tuple[str, str], version: Hashable, record: dict) -> None:
+        size = _record_size(record)
+        with self._lock:
+            self._drop(key)
+            if size < 0 or size > self.max_entry_bytes:
+                return
+            self._entries[key] = _Entry(version, record, size)
+            self.stats.bytes += size
+            while self.stats.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.stats.bytes -= evicted.size
+                self.stats.evictions += 1
+            self.stats.entries = len(self._entries)
+
+    def _drop(self, key: tuple[str, str]) -> bool:
+        """Remove ``key``; caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.stats.bytes -= entry.size
+        self.stats.entries = len(self._entries)
+        return True
+
+    # ---- invalidation -------------------------------------------------
+
+    def invalidate_record(self, virtual_record_id: str, org_id: str | None = None) -> None:
+        """Drop a record; without ``org_id``, from every org that holds it."""
+        with self._lock:
+            if org_id is not None:
+                keys = [(org_id, virtual_record_id)]
+            else:
+                keys = [key for key in self._entries if key[1] == virtual_record_id]
+            for key in keys:
+                if self._drop(key):
+                    self.stats.invalidations += 1
+
+    def invalidate_org(self, org_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == org_id]:
+                if self._drop(key):
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats.bytes = 0
+            self.stats.entries = 0
+
+    # ---- reporting ----------------------------------------------------
+
+    def _maybe_report(self) -> None:
+        """Periodic cumulative counters for the load-test reports
+        (``loadtest/instr/agg_record_cache.py``)."""
+        if self._report_seconds <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_report < self._report_seconds:
+            return
+        self._last_report = now
+        stats = self.stats
+        self.logger.info(
+            "RECORDCACHE pid=%d hits=%d misses=%d coalesced=%d evictions=%d "
+            "invalidations=%d bytes=%d entries=%d",
+            os.getpid(), stats.hits, stats.misses, stats.coalesced, stats.evictions,
+            stats.invalidations, stats.bytes, stats.entries,
+        )
+
+
+def _int_from_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return default
+
+
+def _float_from_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        return default
+
+
+# A holder rather than a bare module global, as in invalidation_hooks.
+_state: dict[str, DecodedRecordCache | None] = {"cache": None}
+
+
+def init_decoded_record_cache(logger: logging.Logger | None = None) -> DecodedRecordCache | None:
+    """Enable the cache for this process. Returns None when configured off."""
+    cache = DecodedRecordCache.from_env(logger)
+    if not cache.enabled:
+        _state["cache"] = None
+        return None
+    _state["cache"] = cache
+    return cache
+
+
+def get_decoded_record_cache() -> DecodedRecordCache | None:
+    return _state["cache"]
+
+
+def reset_decoded_record_cache() -> None:
+    _state["cache"] = None
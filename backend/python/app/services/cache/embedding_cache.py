@@ -0,0 +1,553 @@
+"""Content-addressed cache of chunk embeddings, keyed by model and chunk text.
+
+Every reindex used to call the embedding model for every chunk of the record,
+even when connector re-syncs, duplicate attachments or a one-line page edit
+left almost all of that text byte-identical to what was already embedded.
+Vectors are a pure function of (model configuration, text), so they are cached
+under exactly that:
+
+    <prefix>:<kind>:<model namespace>:<sha256 of the normalized chunk text>
+
+Only the key is normalized (NFC, surrounding whitespace stripped); a miss
+embeds the caller's text unchanged, so a chunk gets the same vector whether or
+not the cache is on.
+
+``kind`` separates dense from sparse (BM25) vectors and the namespace is a
+fingerprint of the embedding configuration (see ``embedding_namespace``), so a
+model or dimension change can never serve a stale vector — it simply misses.
+
+The cache is off unless ``PIPESHUB_EMBEDDING_CACHE`` picks a backend:
+
+* ``disk`` — a local SQLite file under ``PIPESHUB_EMBEDDING_CACHE_DIR``, bounded by
+  ``PIPESHUB_EMBEDDING_CACHE_MAX_BYTES`` and evicted least-recently-used. The
+  byte total lives in the file itself, so the bound holds when several
+  indexing workers share it.
+* ``redis`` — shared by every indexing worker. Entries carry a sliding TTL
+  that a hit refreshes, and a sorted-set index of last access bounds the
+  cache to ``PIPESHUB_EMBEDDING_CACHE_MAX_KEYS`` entries, evicting the
+  least-recently-used first — the Redis instance is shared with the rest of
+  the platform, so its ``maxmemory`` policy cannot be relied on for this.
+
+Hit/miss counts, evictions and errors are exported as metrics (see
+``app.telemetry.modules.embedding_cache_metrics``).
+
+Like the accessible-records cache, the cache is never allowed to fail or stall
+indexing: any backend error falls through to the embedding model and trips a
+short circuit-breaker so the following batches skip the cache entirely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+import numpy as np
+from redis.asyncio import Redis
+
+from app.services.vector_db.models import SparseVector
+from app.telemetry.modules.embedding_cache_metrics import (
+    EMBEDDING_CACHE_ERRORS,
+    EMBEDDING_CACHE_EVICTIONS,
+    EMBEDDING_CACHE_HIT_RATIO,
+    EMBEDDING_CACHE_LOOKUPS,
+)
+from app.utils.query_timing import backend_call
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from app.config.configuration_service import ConfigurationService
+
+__all__ = [
+    "DiskEmbeddingCacheBackend",
+    "EmbeddingCache",
+    "EmbeddingCacheStats",
+    "RedisEmbeddingCacheBackend",
+    "embedding_namespace",
+]
+
+T = TypeVar("T")
+Embedder = Callable[[list[str]], Awaitable[list[T]]]
+
+_DISABLED_VALUES = {"0", "off", "false", "no"}
+_SPARSE_HEADER = struct.Struct("<I")
+# Keys per IN (...) list; SQLite builds before 3.32 allow 999 variables.
+_SQLITE_IN_CHUNK = 500
+
+
+def embedding_namespace(*parts: object) -> str:
+    """Stable short fingerprint of everything that determines a vector."""
+    raw = json.dumps([str(p) if p is not None else None for p in parts], separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def _text_digest(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _encode_dense(vector: list[float]) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def _decode_dense(raw: bytes) -> list[float]:
+    return np.frombuffer(raw, dtype="<f4").tolist()
+
+
+def _encode_sparse(vector: SparseVector) -> bytes:
+    return b"".join((
+        _SPARSE_HEADER.pack(len(vector.indices)),
+        np.asarray(vector.indices, dtype="<u4").tobytes(),
+        np.asarray(vector.values, dtype="<f4").tobytes(),
+    ))
+
+
+def _decode_sparse(raw: bytes) -> SparseVector:
+    (count,) = _SPARSE_HEADER.unpack_from(raw)
+    offset = _SPARSE_HEADER.size
+    indices = np.frombuffer(raw, dtype="<u4", count=count, offset=offset)
+    values = np.frombuffer(raw, dtype="<f4", count=count, offset=offset + 4 * count)
+    return SparseVector(indices=indices.tolist(), values=values.tolist())
+
+
+@dataclass
+class EmbeddingCacheStats:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class EmbeddingCacheBackend(ABC):
+    name: str = ""
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """Return the stored value for every key that is present."""
+
+    @abstractmethod
+    async def set_many(self, items: dict[str, bytes]) -> int:
+        """Store values; returns the number of entries evicted to make room."""
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """Redis LRU bounded by entry count.
+
+    ``index_key`` is a sorted set of cache key -> last access time. Members
+    older than the TTL are dropped on write (their values have expired), and
+    when the set grows past ``max_keys`` the oldest entries are popped and
+    deleted down to the low watermark.
+    """
+
+    name = "redis"
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, client: Redis, ttl_seconds: int, max_keys: int, index_key: str) -> None:
+        self._redis = client
+        self._ttl = ttl_seconds
+        self._max_keys = max_keys
+        self._index_key = index_key
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        with backend_call("redis"):
+            values = await self._redis.mget(keys)
+        found = {k: v for k, v in zip(keys, values) if v is not None}
+        if found:
+            # Sliding TTL: a hit keeps the vector alive, so only unused ones expire.
+            pipe = self._redis.pipeline(transaction=False)
+            for key in found:
+                pipe.expire(key, self._ttl)
+            pipe.zadd(self._index_key, dict.fromkeys(found, time.time()))
+            await pipe.execute()
+        return found
+
+    async def set_many(self, items: dict[str, bytes]) -> int:
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=self._ttl)
+        pipe.zadd(self._index_key, dict.fromkeys(items, now))
+        pipe.zremrangebyscore(self._index_key, "-inf", now - self._ttl)
+        pipe.zcard(self._index_key)
+        size = (await pipe.execute())[-1]
+        if size <= self._max_keys:
+            return 0
+        victims = await self._redis.zpopmin(
+            self._index_key, size - int(self._max_keys * self.LOW_WATERMARK)
+        )
+        keys = [key for key, _ in victims]
+        if keys:
+            await self._redis.delete(*keys)
+        return len(keys)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class DiskEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """SQLite-backed LRU bounded by total value bytes.
+
+    SQLite calls run in a worker thread; one connection is shared behind a
+    lock, which is plenty for the handful of batched statements per chunk batch.
+
+    Several processes may share the file, so the byte total is a row in
+    ``meta`` kept current by triggers, and each write checks it and evicts
+    inside one ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    name = "disk"
+    # Evict down to this fraction of the budget so a full cache does not pay an
+    # eviction pass on every single write.
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed)"
+        )
+        with self._transaction():
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            # Seeded once, from whatever a file written before the meta row holds.
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM embeddings"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS embeddings_insert AFTER INSERT ON embeddings BEGIN "
+                "UPDATE meta SET value = value + NEW.size WHERE name = 'total_bytes'; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS embeddings_update AFTER UPDATE OF size ON embeddings BEGIN "
+                "UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'total_bytes'; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS embeddings_delete AFTER DELETE ON embeddings BEGIN "
+                "UPDATE meta SET value = value - OLD.size WHERE name = 'total_bytes'; END"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Write transaction that takes SQLite's write lock up front."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set_many(self, items: dict[str, bytes]) -> int:
+        return await asyncio.to_thread(self._set_many, items)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get_many(self, keys: list[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_IN_CHUNK):
+                chunk = keys[start:start + _SQLITE_IN_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET accessed = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [now, *(k for k, _ in rows)],
+                    )
+                found.update((k, bytes(v)) for k, v in rows)
+        return found
+
+    def _set_many(self, items: dict[str, bytes]) -> int:
+        now = time.time()
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "INSERT INTO embeddings (key, value, size, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, accessed = excluded.accessed",
+                [(k, v, len(v), now) for k, v in items.items()],
+            )
+            total = self._total_bytes()
+            if total <= self._max_bytes:
+                return 0
+            return self._evict(total - int(self._max_bytes * self.LOW_WATERMARK))
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()
+        return int(row[0])
+
+    def _evict(self, excess: int) -> int:
+        victims: list[str] = []
+        freed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY accessed ASC"
+        ):
+            if freed >= excess:
+                break
+            victims.append(key)
+            freed += size
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(k,) for k in victims])
+        return len(victims)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+class EmbeddingCache:
+    """Read-through cache in front of dense and sparse embedding calls."""
+
+    KEY_PREFIX = "pipeshub:embeddings:v1"
+    ENV_BACKEND = "PIPESHUB_EMBEDDING_CACHE"
+    ENV_TTL = "PIPESHUB_EMBEDDING_CACHE_TTL"
+    ENV_DIR = "PIPESHUB_EMBEDDING_CACHE_DIR"
+    ENV_MAX_BYTES = "PIPESHUB_EMBEDDING_CACHE_MAX_BYTES"
+    ENV_MAX_KEYS = "PIPESHUB_EMBEDDING_CACHE_MAX_KEYS"
+    DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+    DEFAULT_DIR = "/tmp/pipeshub/embedding_cache"
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+    # ~1.5 GiB of 1536-dim float32 vectors.
+    DEFAULT_MAX_KEYS = 250_000
+    OP_TIMEOUT_SECONDS = 2.0
+    DOWN_BACKOFF_SECONDS = 30.0
+    STATS_LOG_INTERVAL = 5000
+
+    def __init__(
+        self,
+        logger: "Logger",
+        backend: EmbeddingCacheBackend | None,
+    ) -> None:
+        self.logger = logger
+        self._backend = backend
+        self._down_until = 0.0
+        self._next_stats_log = self.STATS_LOG_INTERVAL
+        self.stats = EmbeddingCacheStats()
+
+    @classmethod
+    async def create(
+        cls, logger: "Logger", config_service: "ConfigurationService"
+    ) -> "EmbeddingCache":
+        """Build a cache from the environment. Never raises — a failure yields a disabled cache."""
+        mode = (os.getenv(cls.ENV_BACKEND) or "off").strip().lower()
+        if mode in _DISABLED_VALUES:
+            logger.info("Embedding cache disabled via %s", cls.ENV_BACKEND)
+            return cls(logger, None)
+
+        try:
+            if mode == "disk":
+                directory = os.getenv(cls.ENV_DIR) or cls.DEFAULT_DIR
+                max_bytes = _int_from_env(cls.ENV_MAX_BYTES, cls.DEFAULT_MAX_BYTES)
+                backend: EmbeddingCacheBackend = await asyncio.to_thread(
+                    DiskEmbeddingCacheBackend, os.path.join(directory, "embeddings.sqlite3"), max_bytes
+                )
+                logger.info("Embedding cache ready (disk, dir=%s, max_bytes=%s)", directory, max_bytes)
+                return cls(logger, backend)
+
+            ttl = _int_from_env(cls.ENV_TTL, cls.DEFAULT_TTL_SECONDS)
+            max_keys = _int_from_env(cls.ENV_MAX_KEYS, cls.DEFAULT_MAX_KEYS)
+            redis_config = await config_service.get_redis_config()
+            client = Redis(
+                host=redis_config.host,
+                port=redis_config.port,
+                password=redis_config.password,
+                db=redis_config.db,
+                decode_responses=False,
+                socket_timeout=cls.OP_TIMEOUT_SECONDS,
+                socket_connect_timeout=cls.OP_TIMEOUT_SECONDS,
+            )
+            await client.ping()
+        except Exception as e:
+            logger.warning("Embedding cache unavailable (%s); embedding every chunk", str(e))
+            return cls(logger, None)
+
+        logger.info("Embedding cache ready (redis, ttl=%ss, max_keys=%s)", ttl, max_keys)
+        return cls(
+            logger,
+            RedisEmbeddingCacheBackend(client, ttl, max_keys, f"{cls.KEY_PREFIX}:lru"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """False while unconfigured or inside the post-failure backoff."""
+        return self._backend is not None and time.monotonic() >= self._down_until
+
+    @property
+    def _backend_name(self) -> str:
+        return self._backend.name if self._backend is not None else "off"
+
+    async def close(self) -> None:
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            try:
+                await backend.close()
+            except Exception as e:
+                self.logger.debug("Error closing embedding cache: %s", str(e))
+
+    # ---- read-through -------------------------------------------------
+
+    async def get_or_embed_dense(
+        self, namespace: str, texts: list[str], embed: Embedder[list[float]]
+    ) -> list[list[float]]:
+        return await self._get_or_embed("dense", namespace, texts, embed, _encode_dense, _decode_dense)
+
+    async def get_or_embed_sparse(
+        self, namespace: str, texts: list[str], embed: Embedder[SparseVector]
+    ) -> list[SparseVector]:
+        return await self._get_or_embed("sparse", namespace, texts, embed, _encode_sparse, _decode_sparse)
+
+    async def _get_or_embed(
+        self,
+        kind: str,
+        namespace: str,
+        texts: list[str],
+        embed: Embedder[T],
+        encode: Callable[[T], bytes],
+        decode: Callable[[bytes], T],
+    ) -> list[T]:
+        if not texts or not self.enabled:
+            return await embed(texts)
+
+        keys = [
+            f"{self.KEY_PREFIX}:{kind}:{namespace}:{_text_digest(_normalize_text(t))}"
+            for t in texts
+        ]
+        found: dict[str, T] = {}
+        for key, raw in (await self._read(keys)).items():
+            try:
+                found[key] = decode(raw)
+            except Exception:
+                continue  # corrupt entry: treat as a miss and overwrite it
+
+        # Identical chunks inside one batch are embedded once.
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        misses = sum(1 for k in keys if k in missing)
+        self._record_lookups(kind, len(texts) - misses, misses)
+
+        if missing:
+            vectors = await embed(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            found.update(computed)
+            await self._write({k: encode(v) for k, v in computed.items() if v is not None})
+
+        self._maybe_log_stats()
+        return [found[k] for k in keys]
+
+    async def _read(self, keys: list[str]) -> dict[str, bytes]:
+        try:
+            return await self._backend.get_many(keys)
+        except Exception as e:
+            self._mark_down("read", e)
+            return {}
+
+    async def _write(self, items: dict[str, bytes]) -> None:
+        if not items or not self.enabled:
+            return
+        try:
+            evicted = await self._backend.set_many(items)
+        except Exception as e:
+            self._mark_down("write", e)
+            return
+        if evicted:
+            self.stats.evictions += evicted
+            EMBEDDING_CACHE_EVICTIONS.inc(self._backend_name, value=evicted)
+
+    def _record_lookups(self, kind: str, hits: int, misses: int) -> None:
+        backend = self._backend_name
+        self.stats.hits += hits
+        self.stats.misses += misses
+        if hits:
+            EMBEDDING_CACHE_LOOKUPS.inc(backend, kind, "hit", value=hits)
+        if misses:
+            EMBEDDING_CACHE_LOOKUPS.inc(backend, kind, "miss", value=misses)
+        EMBEDDING_CACHE_HIT_RATIO.set(backend, value=self.stats.hit_rate)
+
+    def _maybe_log_stats(self) -> None:
+        if self.stats.lookups < self._next_stats_log:
+            return
+        self._next_stats_log = self.stats.lookups + self.STATS_LOG_INTERVAL
+        self.logger.info(
+            "Embedding cache (%s): lookups=%d hits=%d hit_rate=%.1f%% evictions=%d errors=%d",
+            self._backend_name,
+            self.stats.lookups, self.stats.hits, self.stats.hit_rate * 100,
+            self.stats.evictions, self.stats.errors,
+        )
+
+    # ---- failure handling ---------------------------------------------
+
+    def _mark_down(self, op: str, error: Exception) -> None:
+        """Skip the backend for a while so a dead server costs one timeout, not one per batch."""
+        self.stats.errors += 1
+        EMBEDDING_CACHE_ERRORS.inc(self._backend_name, op)
+        first = time.monotonic() >= self._down_until
+        self._down_until = time.monotonic() + self.DOWN_BACKOFF_SECONDS
+        if first:
+            self.logger.warning(
+                "Embedding cache %s failed (%s); bypassing cache for %ss",
+                op, str(error), self.DOWN_BACKOFF_SECONDS,
+            )
+
+
+def _int_from_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        return default
@@ -10,6 +10,10 @@ and the hook sites call these module functions.
 Every function is a no-op when nothing is registered — which is the case for any
 service that never enabled the cache, and during tests — and none of them can
 raise: invalidation is best-effort, and the cache TTL is the backstop.
+
+The same hooks drop entries from the process-local decoded-record cache
+(``decoded_record_cache.py``) when one is enabled. That cache is versioned by
+the record's storage mapping, so these drops only release memory early.
 """
 
 from __future__ import annotations
@@ -17,6 +21,8 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from app.services.cache.decoded_record_cache import get_decoded_record_cache
+
 if TYPE_CHECKING:
     from app.config.constants.arangodb import Connectors
     from app.services.cache.accessible_records_cache import (
@@ -32,6 +38,7 @@ __all__ = [
     "notify_connector_sync_completed",
     "notify_kb_records_changed",
     "notify_record_indexed",
+    "notify_record_permissions_changed",
 ]
 
 # A holder rather than a bare module global so registration does not need the
@@ -86,8 +93,12 @@ async def notify_record_indexed(
     connector_id: str | None = None,
     external_record_group_id: str | None = None,
     org_id: str | None = None,
+    virtual_record_id: str | None = None,
+    record_id: str | None = None,
 ) -> None:
-    """A record became searchable. KB-only — see `on_record_indexed`."""
+    """A record became searchable. Patches the user-independent maps it
+    belongs in — see `on_record_indexed`."""
+    _drop_decoded_record(virtual_record_id, org_id)
     invalidator = _state["invalidator"]
     if invalidator is None:
         return
@@ -97,6 +108,35 @@ async def notify_record_indexed(
             connector_id=connector_id,
             external_record_group_id=external_record_group_id,
             org_id=org_id,
+            record_id=record_id,
+            virtual_record_id=virtual_record_id,
         )
     except Exception as e:  # pragma: no cover - the invalidator already swallows
         _logger.warning("accessible-records invalidation failed: %s", str(e))
+
+
+async def notify_record_permissions_changed(
+    connector_id: str,
+    org_id: str | None = None,
+    virtual_record_ids: list[str] | None = None,
+) -> None:
+    """A connector replaced these records' permission edges."""
+    invalidator = _state["invalidator"]
+    if invalidator is None:
+        return
+    try:
+        await invalidator.on_record_permissions_changed(connector_id, org_id, virtual_record_ids)
+    except Exception as e:  # pragma: no cover - the invalidator already swallows
+        _logger.warning("accessible-records invalidation failed: %s", str(e))
+
+
+def _drop_decoded_record(virtual_record_id: str | None, org_id: str | None) -> None:
+    """A reindexed record's cached decode is superseded. Applies to every
+    connector, unlike the accessible-records invalidation above."""
+    cache = get_decoded_record_cache()
+    if cache is None or not virtual_record_id:
+        return
+    try:
+        cache.invalidate_record(virtual_record_id, org_id)
+    except Exception as e:  # pragma: no cover - in-memory, cannot fail in practice
+        _logger.warning("decoded-record invalidation failed: %s", str(e))
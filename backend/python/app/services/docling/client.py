@@ -14,11 +14,22 @@ import httpx
 from docling_core.types.doc.document import DoclingDocument
 
 from app.config.constants.http_status_code import HttpStatusCode
+from app.utils.docling_wire_format import (
+    DOCLING_BINARY_CONTENT_TYPE,
+    RESPONSE_FORMAT_BINARY,
+    RESPONSE_FORMAT_FIELD,
+    binary_transfer_enabled,
+    decode_document,
+)
 from app.utils.logger import create_logger
-from app.utils.pdf_utils import PAGE_BATCH_SIZE, get_pdf_page_count
+from app.utils.pdf_utils import PAGE_BATCH_SIZE, get_pdf_page_count, slice_pdf_pages
 from app.utils.request_context import inject_request_headers
 
 MAX_PDF_BYTES = 100 * 1024 * 1024
+# Page-range batches of one document in flight at once. The Docling side's
+# HEAVY_PARSE gate still decides how many actually run; beyond its capacity
+# the extra batches just wait out its 429 backpressure.
+DOCLING_BATCH_CONCURRENCY = max(1, int(os.getenv("DOCLING_BATCH_CONCURRENCY", "2")))
 
 
 class DoclingClient(BaseServiceClient):
@@ -162,13 +173,31 @@ class DoclingClient(BaseServiceClient):
         if not self._validate_pdf_binary(pdf_binary):
             return None
 
+        response = await self._post_parse_pdf(record_name, pdf_binary, page_range)
+        if response is None:
+            return None
+        result = await self._decode_parse_response(record_name, response)
+        if result is None:
+            return None
+        return result["parse_result"]
+
+    async def _post_parse_pdf(
+        self,
+        record_name: str,
+        pdf_binary: bytes,
+        page_range: tuple[int, int] | None,
+        *,
+        binary: bool = False,
+    ) -> httpx.Response | None:
         form_data: dict = {"record_name": record_name}
         if page_range is not None:
             form_data["start_page"] = str(page_range[0])
             form_data["end_page"] = str(page_range[1])
+        if binary:
+            form_data[RESPONSE_FORMAT_FIELD] = RESPONSE_FORMAT_BINARY
 
         try:
-            response = await self._post_multipart(
+            return await self._post_multipart(
                 "/parse-pdf",
                 files={"file": (record_name, pdf_binary, "application/pdf")},
                 data=form_data,
@@ -178,6 +207,8 @@ class DoclingClient(BaseServiceClient):
             self.logger.error(f"❌ Parsing PDF {record_name} failed: {exc}")
             return None
 
+    async def _decode_parse_response(self, record_name: str, response: httpx.Response) -> dict | None:
+        """Return the JSON ``ParseResponse`` body of a successful parse, else None."""
         try:
             result = await asyncio.to_thread(response.json)
         except ValueError:
@@ -188,16 +219,60 @@ class DoclingClient(BaseServiceClient):
         if not result.get("success"):
             self.logger.error(f"❌ Docling service returned error for {record_name}: {result.get('error', 'Unknown error')}")
             return None
+        return result
 
-        return result["parse_result"]
+    async def _parse_pdf_document(
+        self,
+        record_name: str,
+        pdf_binary: bytes,
+        page_range: tuple[int, int] | None = None,
+    ) -> Optional[DoclingDocument]:
+        """Parse *pdf_binary* and return the validated DoclingDocument.
+
+        With ``DOCLING_BINARY_TRANSFER`` set the binary envelope is requested
+        and decoded without going through JSON text; a JSON reply (an older
+        Docling service, or any failure) is handled the same as ``parse_pdf``.
+        """
+        if not binary_transfer_enabled():
+            serialized = await self.parse_pdf(record_name, pdf_binary, page_range=page_range)
+            if serialized is None:
+                return None
+            return await asyncio.to_thread(DoclingDocument.model_validate_json, serialized)
+
+        if not self._validate_pdf_binary(pdf_binary):
+            return None
+        response = await self._post_parse_pdf(record_name, pdf_binary, page_range, binary=True)
+        if response is None:
+            return None
+        if response.headers.get("content-type", "").startswith(DOCLING_BINARY_CONTENT_TYPE):
+            try:
+                document, _ = await asyncio.to_thread(decode_document, response.content)
+            except ValueError as exc:
+                self.logger.error(f"❌ Docling service returned a malformed binary document for {record_name}: {exc}")
+                return None
+            return await asyncio.to_thread(DoclingDocument.model_validate, document)
+
+        result = await self._decode_parse_response(record_name, response)
+        if result is None:
+            return None
+        return await asyncio.to_thread(DoclingDocument.model_validate_json, result["parse_result"])
 
     async def parse_pdf_batched(
-        self, record_name: str, pdf_binary: bytes, batch_size: int = PAGE_BATCH_SIZE
+        self,
+        record_name: str,
+        pdf_binary: bytes,
+        batch_size: int = PAGE_BATCH_SIZE,
+        concurrency: int = DOCLING_BATCH_CONCURRENCY,
     ) -> Optional[DoclingDocument]:
         """Parse a PDF via the Docling service, splitting it into page-range batches
         to cap Docling's peak memory usage, then concatenate the results into a
         single DoclingDocument.
 
+        Each batch uploads only its own pages (see ``slice_pdf_pages``) rather
+        than the whole file, and up to *concurrency* batches are in flight at
+        once. Batches are deserialized as they complete; the first failure
+        cancels the rest.
+
         Returns:
             DoclingDocument if successful, None if failed
         """
@@ -211,22 +286,48 @@ class DoclingClient(BaseServiceClient):
             return None
 
         if page_count <= batch_size:
-            serialized = await self.parse_pdf(record_name, pdf_binary)
-            if serialized is None:
-                return None
-            return await asyncio.to_thread(DoclingDocument.model_validate_json, serialized)
+            return await self._parse_pdf_document(record_name, pdf_binary)
 
+        page_ranges = [
+            (start, min(start + batch_size - 1, page_count))
+            for start in range(1, page_count + 1, batch_size)
+        ]
         self.logger.info(
-            f"Parsing '{record_name}' ({page_count} pages) in batches of {batch_size} pages"
+            f"Parsing '{record_name}' ({page_count} pages) in {len(page_ranges)} batches "
+            f"of {batch_size} pages, {concurrency} at a time"
         )
-        docs: list[DoclingDocument] = []
-        for start in range(1, page_count + 1, batch_size):
-            end = min(start + batch_size - 1, page_count)
-            serialized = await self.parse_pdf(record_name, pdf_binary, page_range=(start, end))
-            if serialized is None:
-                return None
-            docs.append(await asyncio.to_thread(DoclingDocument.model_validate_json, serialized))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def parse_batch(index: int) -> tuple[int, DoclingDocument | None]:
+            start, end = page_ranges[index]
+            async with semaphore:
+                try:
+                    batch_binary = await asyncio.to_thread(slice_pdf_pages, pdf_binary, start, end)
+                except Exception as e:
+                    self.logger.warning(
+                        f"⚠️ Could not slice pages {start}-{end} of '{record_name}', "
+                        f"uploading the full document for this batch: {str(e)}"
+                    )
+                    batch_binary = pdf_binary
+                doc = await self._parse_pdf_document(record_name, batch_binary, page_range=(start, end))
+                del batch_binary
+            if doc is None:
+                return index, None
             self.logger.info(f"Parsed pages {start}-{end} of {page_count} for '{record_name}'")
+            return index, doc
+
+        docs: list[DoclingDocument | None] = [None] * len(page_ranges)
+        tasks = [asyncio.create_task(parse_batch(i)) for i in range(len(page_ranges))]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, doc = await finished
+                if doc is None:
+                    return None
+                docs[index] = doc
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         merged = await asyncio.to_thread(DoclingDocument.concatenate, docs)
         # concatenate() names the result by joining every input name with " + ".
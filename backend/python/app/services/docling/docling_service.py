@@ -4,7 +4,7 @@ from typing import Any
 
 from docling_core.types.doc.document import DoclingDocument
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from app.modules.parsers.pdf.docling_processor import DoclingProcessor
@@ -15,6 +15,11 @@ from app.services.resource_governor import (
     gate_pool,
     parse_cost,
 )
+from app.utils.docling_wire_format import (
+    DOCLING_BINARY_CONTENT_TYPE,
+    RESPONSE_FORMAT_BINARY,
+    encode_document,
+)
 from app.utils.logger import create_logger
 
 logger = logging.getLogger(__name__)
@@ -215,14 +220,28 @@ def serialize_docling_doc(doc: DoclingDocument) -> str:
         raise TypeError(f"Failed to serialize DoclingDocument: {e}") from e
 
 
+def encode_docling_doc(doc: DoclingDocument) -> bytes:
+    """Encode DoclingDocument as the binary envelope (see app.utils.docling_wire_format)."""
+    try:
+        return encode_document(doc.model_dump(mode="json"))
+    except Exception as e:
+        raise TypeError(f"Failed to encode DoclingDocument: {e}") from e
+
+
 @app.post("/parse-pdf", response_model=ParseResponse)
 async def parse_pdf_endpoint(
     file: UploadFile = File(...),
     record_name: str = Form(...),
     start_page: int | None = Form(default=None),
     end_page: int | None = Form(default=None),
-) -> ParseResponse | JSONResponse:
-    """Parse PDF document (phase 1 - no block creation, no LLM calls)"""
+    response_format: str | None = Form(default=None),
+) -> ParseResponse | Response:
+    """Parse PDF document (phase 1 - no block creation, no LLM calls).
+
+    With ``response_format=binary`` a successful parse is returned as the
+    binary DoclingDocument envelope instead of a ``ParseResponse``; failures
+    are always ``ParseResponse`` JSON.
+    """
     cost = 0
     try:
         pdf_binary = await file.read()
@@ -244,6 +263,10 @@ async def parse_pdf_endpoint(
             timeout=PDF_PARSING_TIMEOUT_SECONDS
         )
 
+        if response_format == RESPONSE_FORMAT_BINARY:
+            body = await asyncio.to_thread(encode_docling_doc, doc)
+            return Response(content=body, media_type=DOCLING_BINARY_CONTENT_TYPE)
+
         serialized_result = await asyncio.to_thread(serialize_docling_doc, doc)
 
         return ParseResponse(
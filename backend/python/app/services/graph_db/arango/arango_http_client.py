@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional, Union
 import aiohttp
 
 from app.config.constants.http_status_code import HttpStatusCode
+from app.utils.query_timing import aiohttp_trace_config
 
 # ArangoDB Error Code Constants
 ARANGO_ERROR_DOCUMENT_NOT_FOUND = 1202
@@ -80,7 +81,9 @@ class ArangoHTTPClient:
                     pass  # Ignore errors closing old session
 
             # Create new session for current loop
-            self._session = aiohttp.ClientSession(auth=self.auth)
+            self._session = aiohttp.ClientSession(
+                auth=self.auth, trace_configs=[aiohttp_trace_config("arango")]
+            )
             self._session_loop = current_loop
             self.logger.debug("🔄 Created new HTTP session for current event loop")
 
@@ -31,6 +31,7 @@ from app.config.constants.arangodb import (
     DepartmentNames,
     GraphNames,
     OriginTypes,
+    PermissionModel,
     ProgressStatus,
     RecordTypes,
 )
@@ -129,6 +130,11 @@ from app.services.graph_db.common.utils import build_connector_stats_response, d
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
 from app.utils.time_conversion import get_epoch_timestamp_in_ms
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from app.services.cache.accessible_records_cache import AccessibleRecordsCache
+
 # Constants for ArangoDB document ID format
 ARANGO_ID_PARTS_COUNT = 2  # ArangoDB document IDs are in format "collection/key"
 MAX_REINDEX_DEPTH = 100  # Maximum depth for reindexing records (unlimited depth is capped at this value)
@@ -232,6 +238,7 @@ class ArangoHTTPProvider(IGraphDBProvider):
         self,
         logger: Logger,
         config_service: ConfigurationService,
+        accessible_records_cache: "AccessibleRecordsCache | None" = None,
     ) -> None:
         """
         Initialize ArangoDB HTTP provider.
@@ -239,10 +246,13 @@ class ArangoHTTPProvider(IGraphDBProvider):
         Args:
             logger: Logger instance
             config_service: Configuration service for database credentials
+            accessible_records_cache: Optional cache for accessible-record maps.
+                Only the query service passes one; without it every read is live.
         """
         self.logger = logger
         self.config_service = config_service
         self.http_client: ArangoHTTPClient | None = None
+        self.accessible_records_cache = accessible_records_cache
 
         # Connector-specific delete permissions
         self.connector_delete_permissions = {
@@ -3164,6 +3174,37 @@ class ArangoHTTPProvider(IGraphDBProvider):
             self.logger.error(f"❌ Get record by external ID failed: {str(e)}")
             return None
 
+    async def get_records_by_external_ids(
+        self,
+        connector_id: str,
+        external_ids: list[str],
+        transaction: str | None = None
+    ) -> list[Record]:
+        """Get a connector's records for a list of external IDs"""
+        query = f"""
+        FOR doc IN {CollectionNames.RECORDS.value}
+            FILTER doc.connectorId == @connector_id
+            AND doc.externalRecordId IN @external_ids
+            RETURN doc
+        """
+
+        try:
+            results = await self.http_client.execute_aql(
+                query,
+                bind_vars={
+                    "external_ids": external_ids,
+                    "connector_id": connector_id
+                },
+                txn_id=transaction
+            )
+            return [
+                Record.from_arango_base_record(self._translate_node_from_arango(doc))
+                for doc in results or []
+            ]
+        except Exception as e:
+            self.logger.error(f"❌ Get records by external IDs failed: {str(e)}")
+            raise
+
     async def find_slack_burst_record_by_ts(
         self,
         connector_id: str,
@@ -5158,13 +5199,18 @@ class ArangoHTTPProvider(IGraphDBProvider):
             self.logger.warning(f"DUPLICATE RECORD IDS IN BATCH: {duplicates}")
 
         try:
-            for record in records:
-                # Define record type configurations
-                record_type_config = {
-                    RecordType(record_type_str): {"collection": collection}
-                    for record_type_str, collection in RECORD_TYPE_COLLECTION_MAPPING.items()
-                }
+            # Define record type configurations
+            record_type_config = {
+                RecordType(record_type_str): {"collection": collection}
+                for record_type_str, collection in RECORD_TYPE_COLLECTION_MAPPING.items()
+            }
 
+            # One write per collection rather than three round trips per
+            # record: sync batches hold hundreds of records.
+            base_records: list[dict] = []
+            typed_records: dict[str, list[dict]] = {}
+            is_of_type_records: list[dict] = []
+            for record in records:
                 # Get the configuration for the current record type
                 record_type = record.record_type
                 if record_type not in record_type_config:
@@ -5173,31 +5219,35 @@ class ArangoHTTPProvider(IGraphDBProvider):
 
                 config = record_type_config[record_type]
 
-                # Create the IS_OF_TYPE edge
-                is_of_type_record = {
+                base_records.append(record.to_arango_base_record())
+                typed_records.setdefault(config["collection"], []).append(record.to_arango_record())
+                is_of_type_records.append({
                     "_from": f"{CollectionNames.RECORDS.value}/{record.id}",
                     "_to": f"{config['collection']}/{record.id}",
                     "createdAtTimestamp": get_epoch_timestamp_in_ms(),
                     "updatedAtTimestamp": get_epoch_timestamp_in_ms(),
-                }
+                })
 
-                # Upsert base record
+            if base_records:
+                # Upsert base records
                 await self.batch_upsert_nodes(
-                    [record.to_arango_base_record()],
+                    base_records,
                     collection=CollectionNames.RECORDS.value,
                     transaction=transaction
                 )
 
-                # Upsert specific record type
+            # Upsert specific record types
+            for collection, docs in typed_records.items():
                 await self.batch_upsert_nodes(
-                    [record.to_arango_record()],
-                    collection=config["collection"],
+                    docs,
+                    collection=collection,
                     transaction=transaction
                 )
 
-                # Create IS_OF_TYPE edge
+            if is_of_type_records:
+                # Create IS_OF_TYPE edges
                 await self.batch_create_edges(
-                    [is_of_type_record],
+                    is_of_type_records,
                     collection=CollectionNames.IS_OF_TYPE.value,
                     transaction=transaction
                 )
@@ -18872,6 +18922,178 @@ class ArangoHTTPProvider(IGraphDBProvider):
             self.logger.error(f"Failed to get KB virtual IDs: {e}", exc_info=True)
             return {}
 
+    async def _get_accessible_kb_ids(self, user_id: str) -> list[str]:
+        """KB App keys this user can reach, directly or through a team.
+
+        Mirrors the access paths `_get_kb_virtual_ids` resolves inline, so that
+        the per-KB record maps can be cached org-wide while *which* KBs a user
+        may see stays a live check. Raises on failure so callers can fall back
+        to the uncached path rather than silently narrowing the result.
+        """
+        query = f"""
+        LET userDoc = FIRST(
+            FOR user IN @@users
+            FILTER user.userId == @userId
+            RETURN user
+        )
+        LET directIds = (
+            FOR kb IN 1..1 ANY userDoc._id {CollectionNames.PERMISSION.value}
+                FILTER IS_SAME_COLLECTION("apps", kb)
+                FILTER kb.type == @kb_type
+                RETURN kb._key
+        )
+        LET teamIds = (
+            FOR team, userTeamEdge IN 1..1 OUTBOUND userDoc._id {CollectionNames.PERMISSION.value}
+                FILTER IS_SAME_COLLECTION("teams", team)
+                FILTER userTeamEdge.type == "USER"
+            FOR kb, teamKbEdge IN 1..1 OUTBOUND team._id {CollectionNames.PERMISSION.value}
+                FILTER IS_SAME_COLLECTION("apps", kb)
+                FILTER kb.type == @kb_type
+                FILTER teamKbEdge.type == "TEAM"
+                RETURN kb._key
+        )
+        RETURN UNIQUE(APPEND(directIds, teamIds))
+        """
+        results = await self.http_client.execute_aql(
+            query,
+            bind_vars={
+                "userId": user_id,
+                "kb_type": Connectors.KNOWLEDGE_BASE.value,
+                "@users": CollectionNames.USERS.value,
+            },
+        )
+        return [kb_id for kb_id in (results[0] if results else []) if kb_id]
+
+    async def _get_kb_virtual_ids_for_kb(self, kb_id: str) -> dict[str, str]:
+        """Every completed upload in one KB, independent of user.
+
+        Same record predicates as `_get_kb_virtual_ids` — a record only becomes
+        searchable once indexing completes, and KB records are uploads.
+        """
+        query = f"""
+        FOR record IN 1..1 ANY @kb_id {CollectionNames.BELONGS_TO.value}
+            FILTER IS_SAME_COLLECTION("records", record)
+            FILTER record.origin == @uploadOrigin
+            FILTER record.indexingStatus == @completedStatus
+            FILTER record.virtualRecordId != null
+            RETURN {{virtualRecordId: record.virtualRecordId, recordId: record._key}}
+        """
+        results = await self.http_client.execute_aql(
+            query,
+            bind_vars={
+                "kb_id": f"{CollectionNames.APPS.value}/{kb_id}",
+                "uploadOrigin": OriginTypes.UPLOAD.value,
+                "completedStatus": ProgressStatus.COMPLETED.value,
+            },
+        )
+
+        virtual_id_to_record_id: dict[str, str] = {}
+        for r in results or []:
+            vid = r.get("virtualRecordId")
+            rid = r.get("recordId")
+            if vid and rid and vid not in virtual_id_to_record_id:
+                virtual_id_to_record_id[vid] = rid
+        return virtual_id_to_record_id
+
+    async def _get_all_virtual_ids_for_connector(self, connector_id: str) -> dict[str, str]:
+        """Every completed record of an app-level-permission connector.
+
+        These connectors have no per-record ACLs — reaching the connector means
+        reaching its records — so this supersets the per-user 8-path traversal
+        (including its "Anyone" branch) with a single scan. Only valid for
+        connectors declaring `PermissionModel.APP_LEVEL`.
+        """
+        query = """
+        FOR record IN @@records
+            FILTER record.connectorId == @connectorId
+            FILTER record.indexingStatus == @completedStatus
+            FILTER record.virtualRecordId != null
+            RETURN {virtualRecordId: record.virtualRecordId, recordId: record._key}
+        """
+        results = await self.http_client.execute_aql(
+            query,
+            bind_vars={
+                "connectorId": connector_id,
+                "completedStatus": ProgressStatus.COMPLETED.value,
+                "@records": CollectionNames.RECORDS.value,
+            },
+        )
+
+        virtual_id_to_record_id: dict[str, str] = {}
+        for r in results or []:
+            vid = r.get("virtualRecordId")
+            rid = r.get("recordId")
+            if vid and rid and vid not in virtual_id_to_record_id:
+                virtual_id_to_record_id[vid] = rid
+        return virtual_id_to_record_id
+
+    async def _get_connector_virtual_ids_cached(
+        self, user_id: str, org_id: str, connector_id: str, permission_model: str | None
+    ) -> dict[str, str]:
+        """One connector's map, through the cache appropriate to its ACL model.
+
+        Only valid for an unfiltered request: the cached maps carry no metadata
+        filter or time range, so the caller must have ruled both out.
+        """
+        try:
+            if permission_model == PermissionModel.APP_LEVEL.value:
+                return await self.accessible_records_cache.get_or_compute_app_connector(
+                    org_id,
+                    connector_id,
+                    lambda: self._get_all_virtual_ids_for_connector(connector_id),
+                )
+            return await self.accessible_records_cache.get_or_compute_user_connector(
+                org_id,
+                connector_id,
+                user_id,
+                lambda: self._get_virtual_ids_for_connector(user_id, org_id, connector_id, None),
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Cached connector lookup failed for {connector_id}, using live query: {str(e)}"
+            )
+            return await self._get_virtual_ids_for_connector(user_id, org_id, connector_id, None)
+
+    async def _get_kb_virtual_ids_cached(
+        self, user_id: str, org_id: str, kb_ids: list[str] | None
+    ) -> dict[str, str]:
+        """KB half of the accessible map: live access check, cached contents.
+
+        Only valid for an unfiltered request — the cached per-KB maps carry no
+        metadata filter or time range, so the caller must have ruled both out.
+        Falls back to the single uncached query on any failure.
+        """
+        try:
+            accessible = await self._get_accessible_kb_ids(user_id)
+            accessible_set = set(accessible)
+            targets = [kb for kb in kb_ids if kb in accessible_set] if kb_ids else accessible
+
+            if not targets:
+                return {}
+
+            maps = await asyncio.gather(
+                *[
+                    self.accessible_records_cache.get_or_compute_kb(
+                        org_id, kb_id, lambda kb_id=kb_id: self._get_kb_virtual_ids_for_kb(kb_id)
+                    )
+                    for kb_id in targets
+                ],
+                return_exceptions=True,
+            )
+
+            # Iterated in `targets` order so the merge stays first-seen-wins.
+            merged: dict[str, str] = {}
+            for result in maps:
+                if isinstance(result, Exception):
+                    raise result
+                for vid, rid in result.items():
+                    if vid not in merged:
+                        merged[vid] = rid
+            return merged
+        except Exception as e:
+            self.logger.warning(f"Cached KB lookup failed, using live query: {str(e)}")
+            return await self._get_kb_virtual_ids(user_id, org_id, kb_ids, None)
+
     async def get_accessible_virtual_record_ids(
         self,
         user_id: str,
@@ -18930,79 +19152,97 @@ class ArangoHTTPProvider(IGraphDBProvider):
             has_kb_filter = bool(kb_ids)
             has_app_filter = bool(connector_ids_filter)
 
+            # Metadata filters and a time range both narrow what each query
+            # returns, and neither is part of the cache key, so a filtered
+            # request must go to the live path rather than read a map built for
+            # the unfiltered one.
+            use_cache = (
+                self.accessible_records_cache is not None
+                and self.accessible_records_cache.enabled
+                and not metadata_filters
+                and not time_range
+            )
+
             tasks = []
 
-            # Fetch app types once to distinguish KB apps (type == "KB") from connector apps
+            # Fetch app types once to distinguish KB apps (type == "KB") from
+            # connector apps -- and, for the cache, each connector's permission
+            # model, which decides whether its map is shared or per user.
             kb_app_ids: set[str] = set()
+            app_permission_map: dict[str, str | None] = {}
             if user_apps_ids:
-                type_query = """
-                FOR app IN @@apps
-                    FILTER app._key IN @app_ids AND app.type == @kb_type
-                    RETURN app._key
-                """
+                if use_cache:
+                    type_query = """
+                    FOR app IN @@apps
+                        FILTER app._key IN @app_ids
+                        RETURN {key: app._key, type: app.type, permissionModel: app.permissionModel}
+                    """
+                    bind_vars = {
+                        "app_ids": list(user_apps_ids),
+                        "@apps": CollectionNames.APPS.value,
+                    }
+                else:
+                    type_query = """
+                    FOR app IN @@apps
+                        FILTER app._key IN @app_ids AND app.type == @kb_type
+                        RETURN app._key
+                    """
+                    bind_vars = {
+                        "app_ids": list(user_apps_ids),
+                        "kb_type": Connectors.KNOWLEDGE_BASE.value,
+                        "@apps": CollectionNames.APPS.value,
+                    }
                 try:
-                    kb_app_keys = await self.http_client.execute_aql(
-                        type_query,
-                        bind_vars={
-                            "app_ids": list(user_apps_ids),
-                            "kb_type": Connectors.KNOWLEDGE_BASE.value,
-                            "@apps": CollectionNames.APPS.value,
-                        },
-                    )
-                    kb_app_ids = set(kb_app_keys or [])
+                    app_rows = await self.http_client.execute_aql(type_query, bind_vars=bind_vars)
+                    if use_cache:
+                        for row in app_rows or []:
+                            if row.get("type") == Connectors.KNOWLEDGE_BASE.value:
+                                kb_app_ids.add(row["key"])
+                            app_permission_map[row["key"]] = row.get("permissionModel")
+                    else:
+                        kb_app_ids = set(app_rows or [])
                 except Exception as e:
                     self.logger.warning(f"⚠️ Failed to fetch KB app types for filtering, treating all apps as connectors: {e}")
 
+            def connector_task(connector_id: str) -> "Awaitable[dict[str, str]]":
+                if use_cache:
+                    return self._get_connector_virtual_ids_cached(
+                        user_id, org_id, connector_id, app_permission_map.get(connector_id)
+                    )
+                return self._get_virtual_ids_for_connector(
+                    user_id, org_id, connector_id, metadata_filters, time_range=time_range
+                )
+
+            def kb_task(kb_filter: list[str] | None) -> "Awaitable[dict[str, str]]":
+                if use_cache:
+                    return self._get_kb_virtual_ids_cached(user_id, org_id, kb_filter)
+                return self._get_kb_virtual_ids(
+                    user_id, org_id, kb_filter, metadata_filters, time_range=time_range
+                )
+
             if has_app_filter and has_kb_filter:
                 connectors_to_query = [
                     cid for cid in user_apps_ids
                     if cid in connector_ids_filter and cid not in kb_app_ids
                 ]
-                for connector_id in connectors_to_query:
-                    tasks.append(
-                        self._get_virtual_ids_for_connector(
-                            user_id, org_id, connector_id, metadata_filters, time_range=time_range
-                        )
-                    )
-                tasks.append(
-                    self._get_kb_virtual_ids(
-                        user_id, org_id, kb_ids, metadata_filters, time_range=time_range
-                    )
-                )
+                tasks.extend(connector_task(cid) for cid in connectors_to_query)
+                tasks.append(kb_task(kb_ids))
 
             elif not has_app_filter and has_kb_filter:
-                tasks.append(
-                    self._get_kb_virtual_ids(
-                        user_id, org_id, kb_ids, metadata_filters, time_range=time_range
-                    )
-                )
+                tasks.append(kb_task(kb_ids))
 
             elif not has_app_filter and not has_kb_filter:
-                for connector_id in user_apps_ids:
-                    if connector_id in kb_app_ids:
-                        continue
-                    tasks.append(
-                        self._get_virtual_ids_for_connector(
-                            user_id, org_id, connector_id, metadata_filters, time_range=time_range
-                        )
-                    )
-                tasks.append(
-                    self._get_kb_virtual_ids(
-                        user_id, org_id, None, metadata_filters, time_range=time_range
-                    )
+                tasks.extend(
+                    connector_task(cid) for cid in user_apps_ids if cid not in kb_app_ids
                 )
+                tasks.append(kb_task(None))
 
             else:  # has_app_filter and not has_kb_filter
                 connectors_to_query = [
                     cid for cid in user_apps_ids
                     if cid in connector_ids_filter and cid not in kb_app_ids
                 ]
-                for connector_id in connectors_to_query:
-                    tasks.append(
-                        self._get_virtual_ids_for_connector(
-                            user_id, org_id, connector_id, metadata_filters, time_range=time_range
-                        )
-                    )
+                tasks.extend(connector_task(cid) for cid in connectors_to_query)
 
             if not tasks:
                 self.logger.warning(f"No queries to execute for user {user_id} with filters {filters}")
@@ -19077,6 +19317,195 @@ class ArangoHTTPProvider(IGraphDBProvider):
             self.logger.error(f"Failed to fetch records by record IDs: {e}\n{traceback.format_exc()}")
             return []
 
+    async def get_user_acl_principals(
+        self,
+        user_id: str,
+        org_id: str,
+    ) -> dict[str, Any] | None:
+        """
+        Resolve the permission principals a user can be matched on.
+
+        Principals are the groups/orgs the user BELONGS_TO and the groups/roles
+        the user holds a PERMISSION on — the intermediate nodes of the paths in
+        `_get_virtual_ids_for_connector`. KBs are resolved the way
+        `_get_kb_virtual_ids` does (direct or team permission on the KB app).
+
+        Args:
+            user_id (str): The userId field value in users collection
+            org_id (str): Organization ID
+
+        Returns:
+            Optional[Dict]: ``{"userKey", "principalIds", "apps", "kbIds"}``, or None
+            if the user does not exist or the lookup failed
+        """
+        try:
+            query = f"""
+            LET userDoc = FIRST(
+                FOR user IN @@users
+                FILTER user.userId == @userId
+                RETURN user
+            )
+            FILTER userDoc != null
+
+            LET belongsTo = (
+                FOR node IN 1..1 ANY userDoc._id {CollectionNames.BELONGS_TO.value}
+                    FILTER IS_SAME_COLLECTION("{CollectionNames.GROUPS.value}", node)
+                        OR IS_SAME_COLLECTION("{CollectionNames.ORGS.value}", node)
+                    RETURN node._key
+            )
+
+            LET permittedGroups = (
+                FOR node IN 1..1 ANY userDoc._id {CollectionNames.PERMISSION.value}
+                    FILTER IS_SAME_COLLECTION("{CollectionNames.GROUPS.value}", node)
+                        OR IS_SAME_COLLECTION("{CollectionNames.ROLES.value}", node)
+                    RETURN node._key
+            )
+
+            LET directKbs = (
+                FOR kb IN 1..1 ANY userDoc._id {CollectionNames.PERMISSION.value}
+                    FILTER IS_SAME_COLLECTION("{CollectionNames.APPS.value}", kb)
+                    FILTER kb.type == @kb_type
+                    RETURN kb._key
+            )
+
+            LET teamKbs = (
+                FOR team, userTeamEdge IN 1..1 OUTBOUND userDoc._id {CollectionNames.PERMISSION.value}
+                    FILTER IS_SAME_COLLECTION("{CollectionNames.TEAMS.value}", team)
+                    FILTER userTeamEdge.type == "USER"
+                FOR kb, teamKbEdge IN 1..1 OUTBOUND team._id {CollectionNames.PERMISSION.value}
+                    FILTER IS_SAME_COLLECTION("{CollectionNames.APPS.value}", kb)
+                    FILTER kb.type == @kb_type
+                    FILTER teamKbEdge.type == "TEAM"
+                    RETURN kb._key
+            )
+
+            RETURN {{
+                userKey: userDoc._key,
+                principalIds: UNIQUE(APPEND(belongsTo, permittedGroups)),
+                kbIds: UNIQUE(APPEND(directKbs, teamKbs))
+            }}
+            """
+            results = await self.execute_query(
+                query,
+                bind_vars={
+                    "userId": user_id,
+                    "kb_type": Connectors.KNOWLEDGE_BASE.value,
+                    "@users": CollectionNames.USERS.value,
+                },
+            )
+            if not results or not results[0]:
+                return None
+            principals = dict(results[0])
+
+            apps = await self.get_user_apps(principals["userKey"])
+            principals["apps"] = [
+                {
+                    "id": app.get("_key") or app.get("id"),
+                    "type": app.get("type"),
+                    "permissionModel": app.get("permissionModel"),
+                }
+                for app in apps or []
+                if app and (app.get("_key") or app.get("id"))
+            ]
+            return principals
+        except Exception as e:
+            self.logger.error(f"Failed to get ACL principals for user {user_id}: {e}")
+            return None
+
+    async def get_records_acl_principals(
+        self,
+        org_id: str,
+        record_ids: list[str] | None = None,
+        virtual_record_ids: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Resolve, per record, the principals that may read it.
+
+        Mirrors the permission paths of `_get_virtual_ids_for_connector` from the
+        record's side: PERMISSION edges on the record itself, PERMISSION edges on
+        the record groups it inherits from (org grants only up to depth 2, as in
+        `orgRecordGroupRecords`), and the org-wide ``anyone`` share.
+
+        Args:
+            org_id (str): Organization ID
+            record_ids (Optional[List[str]]): Record _keys to resolve
+            virtual_record_ids (Optional[List[str]]): Virtual record IDs to resolve
+
+        Returns:
+            List[Dict]: One principal descriptor per matching record
+        """
+        if not record_ids and not virtual_record_ids:
+            return []
+        try:
+            if record_ids:
+                selector = "FILTER record._key IN @ids"
+                ids = record_ids
+            else:
+                selector = "FILTER record.virtualRecordId IN @ids"
+                ids = virtual_record_ids
+
+            principal_filter = f"""
+                        FILTER IS_SAME_COLLECTION("{CollectionNames.USERS.value}", principal)
+                            OR IS_SAME_COLLECTION("{CollectionNames.GROUPS.value}", principal)
+                            OR IS_SAME_COLLECTION("{CollectionNames.ROLES.value}", principal)
+                            OR IS_SAME_COLLECTION("{CollectionNames.ORGS.value}", principal)"""
+
+            query = f"""
+            FOR record IN @@records
+                {selector}
+                FILTER record.orgId == @orgId
+                LET app = DOCUMENT(@@apps, record.connectorId)
+
+                LET direct = (
+                    FOR principal IN 1..1 ANY record._id {CollectionNames.PERMISSION.value}
+                        {principal_filter}
+                        RETURN principal._key
+                )
+
+                LET inherited = (
+                    FOR recordGroup, edge, path IN 1..5 OUTBOUND record._id {CollectionNames.INHERIT_PERMISSIONS.value}
+                        FILTER IS_SAME_COLLECTION("{CollectionNames.RECORD_GROUPS.value}", recordGroup)
+                        FOR principal IN 1..1 ANY recordGroup._id {CollectionNames.PERMISSION.value}
+                            {principal_filter}
+                            FILTER NOT IS_SAME_COLLECTION("{CollectionNames.ORGS.value}", principal)
+                                OR LENGTH(path.edges) <= 2
+                            RETURN principal._key
+                )
+
+                LET anyone = LENGTH(
+                    FOR share IN @@anyone
+                        FILTER share.file_key == record._key AND share.organization == @orgId
+                        LIMIT 1
+                        RETURN 1
+                ) > 0
+
+                RETURN {{
+                    recordId: record._key,
+                    virtualRecordId: record.virtualRecordId,
+                    connectorId: record.connectorId,
+                    orgId: record.orgId,
+                    indexingStatus: record.indexingStatus,
+                    appType: app.type,
+                    permissionModel: app.permissionModel,
+                    principalIds: UNIQUE(APPEND(direct, inherited)),
+                    anyone: anyone
+                }}
+            """
+            results = await self.execute_query(
+                query,
+                bind_vars={
+                    "ids": ids,
+                    "orgId": org_id,
+                    "@records": CollectionNames.RECORDS.value,
+                    "@apps": CollectionNames.APPS.value,
+                    "@anyone": CollectionNames.ANYONE.value,
+                },
+            )
+            return [r for r in results if r] if results else []
+        except Exception as e:
+            self.logger.error(f"Failed to get record ACL principals: {e}\n{traceback.format_exc()}")
+            return []
+
     async def get_records_by_virtual_record_id(
         self,
         virtual_record_id: str,
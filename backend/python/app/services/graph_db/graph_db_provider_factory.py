@@ -89,6 +89,7 @@ class GraphDBProviderFactory:
                 provider = await GraphDBProviderFactory._create_arango_http_provider(
                     logger=logger,
                     config_service=config_service,
+                    accessible_records_cache=accessible_records_cache,
                 )
                 return provider
 
@@ -112,6 +113,7 @@ class GraphDBProviderFactory:
     async def _create_arango_http_provider(
         logger: Logger,
         config_service: ConfigurationService,
+        accessible_records_cache: "AccessibleRecordsCache | None" = None,
     ) -> ArangoHTTPProvider:
         """
         Create and connect an ArangoDB HTTP provider (fully async).
@@ -122,6 +124,7 @@ class GraphDBProviderFactory:
         Args:
             logger: Logger instance
             config_service: Configuration service
+            accessible_records_cache: Optional accessible-record map cache
         Returns:
             ArangoHTTPProvider: Connected ArangoDB HTTP provider
 
@@ -133,6 +136,7 @@ class GraphDBProviderFactory:
             provider = ArangoHTTPProvider(
                 logger=logger,
                 config_service=config_service,
+                accessible_records_cache=accessible_records_cache,
             )
             logger.debug("🔌 Connecting ArangoDB HTTP provider...")
             connected = await provider.connect()
@@ -1020,6 +1020,26 @@ class IGraphDBProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_records_by_external_ids(
+        self,
+        connector_id: str,
+        external_ids: list[str],
+        transaction: str | None = None
+    ) -> list['Record']:
+        """
+        Get a connector's records for a list of external IDs in one query.
+
+        Args:
+            connector_id (str): Connector ID
+            external_ids (List[str]): External record IDs
+            transaction (Optional[Any]): Optional transaction context
+
+        Returns:
+            List[Record]: The records found; IDs with no record are left out
+        """
+        pass
+
     @abstractmethod
     async def find_slack_burst_record_by_ts(
         self,
@@ -2576,6 +2596,59 @@ class IGraphDBProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_user_acl_principals(
+        self,
+        user_id: str,
+        org_id: str,
+    ) -> dict[str, Any] | None:
+        """
+        Resolve the permission principals a user can be matched on.
+
+        Used to filter vector search on the ACL tokens written into each point
+        at indexing time (see ``app.services.vector_db.acl``) instead of an
+        IN-list of every accessible virtualRecordId.
+
+        Args:
+            user_id (str): The userId field value in users collection
+            org_id (str): Organization ID
+
+        Returns:
+            Optional[Dict]: ``{"userKey", "principalIds", "apps", "kbIds"}`` where
+            ``principalIds`` are the keys of the groups/roles/orgs the user belongs
+            to or holds a permission on, ``apps`` are ``{"id", "type",
+            "permissionModel"}`` for the user's apps, and ``kbIds`` the knowledge
+            bases reachable directly or through a team. None if the user is unknown.
+        """
+        pass
+
+    @abstractmethod
+    async def get_records_acl_principals(
+        self,
+        org_id: str,
+        record_ids: list[str] | None = None,
+        virtual_record_ids: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Resolve, per record, the principals that may read it.
+
+        Exactly one of ``record_ids`` / ``virtual_record_ids`` selects the records.
+        Principals are collected from PERMISSION edges on the record and on every
+        record group it inherits permissions from, using the same paths as
+        ``get_accessible_virtual_record_ids``.
+
+        Args:
+            org_id (str): Organization ID
+            record_ids (Optional[List[str]]): Record keys/ids to resolve
+            virtual_record_ids (Optional[List[str]]): Virtual record IDs to resolve
+
+        Returns:
+            List[Dict]: ``{"recordId", "virtualRecordId", "connectorId", "orgId",
+            "indexingStatus", "appType", "permissionModel", "principalIds", "anyone"}``
+            per matching record
+        """
+        pass
+
     @abstractmethod
     async def batch_upsert_record_permissions(
         self,
@@ -12,6 +12,8 @@ from typing import TYPE_CHECKING, Any
 from neo4j import AsyncGraphDatabase
 from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired
 
+from app.utils.query_timing import backend_call
+
 if TYPE_CHECKING:
     from neo4j import AsyncSession
 
@@ -250,6 +252,15 @@ class Neo4jClient:
         Returns:
             List[Dict]: Query results as list of dictionaries
         """
+        with backend_call("neo4j"):
+            return await self._execute_query(query, parameters, txn_id)
+
+    async def _execute_query(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None,
+        txn_id: str | None,
+    ) -> list[dict[str, Any]]:
         if not self.driver:
             await self.connect()
             if not self.driver:
@@ -1991,6 +1991,37 @@ class Neo4jProvider(IGraphDBProvider):
             self.logger.error(f"❌ Get record by external ID failed: {str(e)}")
             return None
 
+    async def get_records_by_external_ids(
+        self,
+        connector_id: str,
+        external_ids: list[str],
+        transaction: str | None = None
+    ) -> list[Record]:
+        """Get a connector's records for a list of external IDs"""
+        try:
+            query = """
+            MATCH (r:Record {connectorId: $connector_id})
+            WHERE r.externalRecordId IN $external_ids
+            RETURN r
+            """
+
+            results = await self.client.execute_query(
+                query,
+                parameters={"external_ids": external_ids, "connector_id": connector_id},
+                txn_id=transaction
+            )
+
+            return [
+                Record.from_arango_base_record(
+                    self._neo4j_to_arango_node(dict(result["r"]), CollectionNames.RECORDS.value)
+                )
+                for result in results
+            ]
+
+        except Exception as e:
+            self.logger.error(f"❌ Get records by external IDs failed: {str(e)}")
+            raise
+
     async def find_slack_burst_record_by_ts(
         self,
         connector_id: str,
@@ -5073,6 +5104,141 @@ class Neo4jProvider(IGraphDBProvider):
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             return []
 
+    async def get_user_acl_principals(
+        self,
+        user_id: str,
+        org_id: str,
+    ) -> dict[str, Any] | None:
+        """
+        Resolve the permission principals a user can be matched on.
+
+        Principals are the intermediate nodes of the paths in
+        `_get_virtual_ids_for_connector` (Group/Organization via BELONGS_TO,
+        Group/Role via PERMISSION); KBs come from `_get_accessible_kb_ids`.
+
+        Returns:
+            Optional[Dict]: ``{"userKey", "principalIds", "apps", "kbIds"}``, or None
+            if the user does not exist or the lookup failed
+        """
+        try:
+            query = """
+            MATCH (userDoc:User {userId: $userId})
+
+            CALL {
+                WITH userDoc
+                OPTIONAL MATCH (userDoc)-[:BELONGS_TO]->(n)
+                WHERE n:Group OR n:Organization
+                RETURN collect(DISTINCT n.id) AS belongsTo
+            }
+
+            CALL {
+                WITH userDoc
+                OPTIONAL MATCH (userDoc)-[:PERMISSION]->(n)
+                WHERE n:Group OR n:Role
+                RETURN collect(DISTINCT n.id) AS permittedGroups
+            }
+
+            RETURN userDoc.id AS userKey, belongsTo + permittedGroups AS principalIds
+            """
+            results = await self.client.execute_query(query, parameters={"userId": user_id})
+            if not results:
+                return None
+
+            user_key = results[0].get("userKey")
+            principal_ids = list(dict.fromkeys(p for p in results[0].get("principalIds") or [] if p))
+            apps, kb_ids = await asyncio.gather(
+                self.get_user_apps(user_key),
+                self._get_accessible_kb_ids(user_id),
+            )
+            return {
+                "userKey": user_key,
+                "principalIds": principal_ids,
+                "kbIds": kb_ids,
+                "apps": [
+                    {
+                        "id": app.get("id") or app.get("_key"),
+                        "type": app.get("type"),
+                        "permissionModel": app.get("permissionModel"),
+                    }
+                    for app in apps or []
+                    if app and (app.get("id") or app.get("_key"))
+                ],
+            }
+        except Exception as e:
+            self.logger.error(f"❌ Failed to get ACL principals for user {user_id}: {str(e)}")
+            return None
+
+    async def get_records_acl_principals(
+        self,
+        org_id: str,
+        record_ids: list[str] | None = None,
+        virtual_record_ids: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Resolve, per record, the principals that may read it.
+
+        Mirrors `_get_virtual_ids_for_connector` from the record's side: PERMISSION
+        edges on the record, PERMISSION edges on inherited record groups (org grants
+        only up to depth 2, as in Path 5), and the org-wide ``Anyone`` share.
+
+        Returns:
+            List[Dict]: One principal descriptor per matching record
+        """
+        if not record_ids and not virtual_record_ids:
+            return []
+        try:
+            if record_ids:
+                selector = "r.id IN $ids"
+                ids = record_ids
+            else:
+                selector = "r.virtualRecordId IN $ids"
+                ids = virtual_record_ids
+
+            query = f"""
+            MATCH (r:Record)
+            WHERE {selector} AND r.orgId = $orgId
+            OPTIONAL MATCH (app:App {{id: r.connectorId}})
+
+            CALL {{
+                WITH r
+                OPTIONAL MATCH (p)-[:PERMISSION]->(r)
+                WHERE p:User OR p:Group OR p:Role OR p:Organization
+                RETURN collect(DISTINCT p.id) AS direct
+            }}
+
+            CALL {{
+                WITH r
+                OPTIONAL MATCH path = (r)-[:INHERIT_PERMISSIONS*1..5]->(rg:RecordGroup)
+                OPTIONAL MATCH (p)-[:PERMISSION]->(rg)
+                WHERE p:User OR p:Group OR p:Role
+                   OR (p:Organization AND length(path) <= 2)
+                RETURN collect(DISTINCT p.id) AS inherited
+            }}
+
+            CALL {{
+                WITH r
+                OPTIONAL MATCH (anyone:Anyone {{organization: $orgId, file_key: r.id}})
+                RETURN count(anyone) > 0 AS anyone
+            }}
+
+            RETURN r.id AS recordId,
+                   r.virtualRecordId AS virtualRecordId,
+                   r.connectorId AS connectorId,
+                   r.orgId AS orgId,
+                   r.indexingStatus AS indexingStatus,
+                   app.type AS appType,
+                   app.permissionModel AS permissionModel,
+                   direct + inherited AS principalIds,
+                   anyone
+            """
+            results = await self.client.execute_query(
+                query, parameters={"ids": ids, "orgId": org_id}
+            )
+            return [dict(r) for r in results or [] if r]
+        except Exception as e:
+            self.logger.error(f"❌ Failed to get record ACL principals: {str(e)}")
+            return []
+
     # ==================== Permission Operations ====================
 
     async def batch_upsert_records(
@@ -5082,39 +5248,47 @@ class Neo4jProvider(IGraphDBProvider):
     ) -> None:
         """Batch upsert records (base + specific type + IS_OF_TYPE edge)"""
         try:
+            # One UNWIND per label rather than three round trips per record:
+            # sync batches hold hundreds of records.
+            base_records: list[dict] = []
+            typed_records: dict[str, list[dict]] = {}
+            is_of_type_edges: list[dict] = []
             for record in records:
-                # Upsert base record
-                record_dict = record.to_arango_base_record()
-                await self.batch_upsert_nodes(
-                    [record_dict],
-                    collection=CollectionNames.RECORDS.value,
-                    transaction=transaction
-                )
+                base_records.append(record.to_arango_base_record())
 
-                # Upsert specific type if applicable
+                # Specific type if applicable
                 if record.record_type in RECORD_TYPE_COLLECTION_MAPPING:
                     collection = RECORD_TYPE_COLLECTION_MAPPING[record.record_type]
-                    type_dict = record.to_arango_record()
-                    await self.batch_upsert_nodes(
-                        [type_dict],
-                        collection=collection,
-                        transaction=transaction
-                    )
-
-                    # Create IS_OF_TYPE edge
-                    is_of_type_edge = {
+                    typed_records.setdefault(collection, []).append(record.to_arango_record())
+                    is_of_type_edges.append({
                         "from_id": record.id,
                         "from_collection": CollectionNames.RECORDS.value,
                         "to_id": record.id,
                         "to_collection": collection,
                         "createdAtTimestamp": get_epoch_timestamp_in_ms(),
                         "updatedAtTimestamp": get_epoch_timestamp_in_ms(),
-                    }
-                    await self.batch_create_edges(
-                        [is_of_type_edge],
-                        collection=CollectionNames.IS_OF_TYPE.value,
-                        transaction=transaction
-                    )
+                    })
+
+            if base_records:
+                await self.batch_upsert_nodes(
+                    base_records,
+                    collection=CollectionNames.RECORDS.value,
+                    transaction=transaction
+                )
+
+            for collection, type_dicts in typed_records.items():
+                await self.batch_upsert_nodes(
+                    type_dicts,
+                    collection=collection,
+                    transaction=transaction
+                )
+
+            if is_of_type_edges:
+                await self.batch_create_edges(
+                    is_of_type_edges,
+                    collection=CollectionNames.IS_OF_TYPE.value,
+                    transaction=transaction
+                )
 
         except Exception as e:
             self.logger.error(f"❌ Batch upsert records failed: {str(e)}")
@@ -760,6 +760,8 @@ class RecordEventHandler(BaseEventService):
                                 connector_id=record.get("connectorId"),
                                 external_record_group_id=record.get("externalGroupId"),
                                 org_id=record.get("orgId"),
+                                virtual_record_id=virtual_record_id,
+                                record_id=record_id,
                             )
                     elif indexing_status == ProgressStatus.ENABLE_MULTIMODAL_MODELS.value:
                         # Find and trigger indexing for the next queued duplicate
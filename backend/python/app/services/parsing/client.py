@@ -34,6 +34,13 @@ from app.services.parsing.interface import (
     ParserProvider,
 )
 from app.utils.converters.caption_map import apply_caption_map
+from app.utils.docling_wire_format import (
+    DOCLING_BINARY_CONTENT_TYPE,
+    RESPONSE_FORMAT_BINARY,
+    RESPONSE_FORMAT_FIELD,
+    binary_transfer_enabled,
+    decode_document,
+)
 from app.utils.image_utils import get_extension_from_mimetype
 
 if TYPE_CHECKING:
@@ -149,6 +156,8 @@ class ParsingClient(BaseServiceClient):
             form_data["org_id"] = org_id
         if provider is not None:
             form_data["provider"] = provider.value
+        if binary_transfer_enabled():
+            form_data[RESPONSE_FORMAT_FIELD] = RESPONSE_FORMAT_BINARY
 
         try:
             response = await self._post_multipart(
@@ -164,6 +173,9 @@ class ParsingClient(BaseServiceClient):
                 details={"retry_after": exc.retry_after},
             ) from exc
 
+        if response.headers.get("content-type", "").startswith(DOCLING_BINARY_CONTENT_TYPE):
+            return await self._parse_result_from_binary(response.content, skip_table_enrichment=skip_table_enrichment)
+
         body = response.json()
 
         if not body.get("success"):
@@ -190,8 +202,6 @@ class ParsingClient(BaseServiceClient):
         metadata = payload.metadata
         raw_document = payload.raw_document
         if raw_document is not None:
-            # Docling-backed provider deferred block construction (incl. LLM table
-            # enrichment) to keep the Parsing service stateless - finish it here.
             try:
                 doc = await asyncio.to_thread(DoclingDocument.model_validate_json, raw_document)
             except ValidationError as exc:
@@ -199,12 +209,7 @@ class ParsingClient(BaseServiceClient):
                     code=ParseErrorCode.PARSE_FAILED,
                     message=f"Malformed raw_document from parsing service: {exc}",
                 ) from exc
-            block_container = await self._get_docling_processor().create_blocks(
-                doc, skip_table_enrichment=skip_table_enrichment
-            )
-            caption_map = metadata.get("caption_map")
-            if isinstance(caption_map, dict) and caption_map:
-                apply_caption_map(block_container, caption_map, logger)
+            block_container = await self._build_docling_blocks(doc, metadata, skip_table_enrichment=skip_table_enrichment)
         else:
             block_container = BlocksContainer(**(payload.block_container or {}))
 
@@ -219,6 +224,42 @@ class ParsingClient(BaseServiceClient):
             metadata=metadata,
         )
 
+    async def _build_docling_blocks(
+        self, doc: DoclingDocument, metadata: dict[str, Any], *, skip_table_enrichment: bool
+    ) -> BlocksContainer:
+        # Docling-backed provider deferred block construction (incl. LLM table
+        # enrichment) to keep the Parsing service stateless - finish it here.
+        block_container = await self._get_docling_processor().create_blocks(
+            doc, skip_table_enrichment=skip_table_enrichment
+        )
+        caption_map = metadata.get("caption_map")
+        if isinstance(caption_map, dict) and caption_map:
+            apply_caption_map(block_container, caption_map, logger)
+        return block_container
+
+    async def _parse_result_from_binary(self, body: bytes, *, skip_table_enrichment: bool) -> ParseResult:
+        """Build a ParseResult from a binary DoclingDocument envelope response."""
+        try:
+            document, meta = await asyncio.to_thread(decode_document, body)
+            doc = await asyncio.to_thread(DoclingDocument.model_validate, document)
+        except (ValueError, ValidationError) as exc:
+            raise ParsingClientError(
+                code=ParseErrorCode.PARSE_FAILED,
+                message=f"Malformed binary document from parsing service: {exc}",
+            ) from exc
+        del document
+        metadata = meta.get("metadata") or {}
+        block_container = await self._build_docling_blocks(doc, metadata, skip_table_enrichment=skip_table_enrichment)
+        try:
+            provider_used = ParserProvider(meta.get("provider_used") or ParserProvider.DOCLING.value)
+        except ValueError:
+            provider_used = ParserProvider.DOCLING
+        return ParseResult(
+            block_container=block_container,
+            provider_used=provider_used,
+            metadata=metadata,
+        )
+
     async def list_providers(self) -> dict[str, list[str]]:
         """Return {format -> [provider_names]} from the service."""
         response = await self._get_json("/api/v1/parse/providers", operation="list_providers")
@@ -54,6 +54,11 @@ LIGHT_MIME_TYPES: frozenset[str] = frozenset({
 # page count and DPI, not just format (plan section 4, XL_HEAVY_BYTES).
 XL_HEAVY_BYTES = 25 * 1024 * 1024
 
+# Spreadsheets compress well, so byte size understates them: a 5 MB xlsx can
+# span millions of cells, and parse time/RSS follow the cell count. A
+# workbook at or above this many cells is extra-large whatever its size.
+XL_HEAVY_CELLS = 500_000
+
 
 def classify(extension: str | None, mime_type: str | None) -> ParseTier:
     """Return the parse tier for a document.
@@ -77,9 +82,17 @@ def classify(extension: str | None, mime_type: str | None) -> ParseTier:
     return ParseTier.HEAVY
 
 
-def parse_cost(tier: ParseTier, size_bytes: int | None) -> int:
-    """Admission cost in permits: 1 normally, 2 for an extra-large heavy doc."""
-    if tier is ParseTier.HEAVY and size_bytes is not None and size_bytes > XL_HEAVY_BYTES:
+def parse_cost(tier: ParseTier, size_bytes: int | None, cells: int | None = None) -> int:
+    """Admission cost in permits: 1 normally, 2 for an extra-large heavy doc.
+
+    ``cells`` is the estimated cell count for spreadsheets (see
+    ``estimate_workbook_cells``); ``None`` when unknown or not a spreadsheet.
+    """
+    if tier is not ParseTier.HEAVY:
+        return 1
+    if size_bytes is not None and size_bytes > XL_HEAVY_BYTES:
+        return 2
+    if cells is not None and cells >= XL_HEAVY_CELLS:
         return 2
     return 1
 
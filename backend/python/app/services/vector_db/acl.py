@@ -0,0 +1,286 @@
+"""Indexing-time permission principals ("ACL tokens") for vector payloads.
+
+Search used to gate every query with ``virtualRecordId IN (<every record the
+user can reach>)``. For large tenants that list holds hundreds of thousands of
+ids: it is serialised on every query, shipped to the vector DB and evaluated
+as a huge terms filter. Instead, every point now carries a handful of compact
+tokens naming *who* may read it, and a query filters on the handful of tokens
+the user holds:
+
+* ``a:<connectorId>`` — the record lives in an ``APP_LEVEL`` connector or a
+  knowledge base, where access to the app implies access to every record.
+* ``p:<key>`` — a user/group/role/org with a PERMISSION edge to the record,
+  or to one of the record groups it inherits permissions from.
+* ``o:<orgId>`` — the record is shared with anyone in the org.
+
+Tokens are a snapshot taken at indexing time, so they go stale whenever a
+record's permissions change:
+
+* a revocation leaves an extra token behind. The vector DB filter only
+  *narrows* the candidate set; the top-k hits are post-verified against the
+  live graph with the same principal semantics (``verify_accessible_records``)
+  before anything is returned, so this never leaks.
+* a grant leaves a token missing, hiding the record from the new principal on
+  this path until the record is reindexed, or, when it is enabled, until
+  ``app.services.vector_db.acl_reconciler`` rewrites the stale tokens.
+
+Indexing resolves a record's tokens once, and :class:`RecordAclLookup`
+coalesces the lookups of records indexed concurrently into one graph query.
+
+The filter path is opt-in (``VECTOR_DB_ACL_FILTER``) because points indexed
+before tokens existed carry none and would be invisible to it; enable it once
+the collection has been reindexed or backfilled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
+
+from app.config.constants.arangodb import Connectors, PermissionModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
+
+ACL_TOKENS_FIELD = "aclTokens"
+ACL_CONNECTOR_FIELD = "connectorId"
+
+ENV_ACL_FILTER = "VECTOR_DB_ACL_FILTER"
+_ENABLED_VALUES = {"1", "on", "true", "yes"}
+
+
+class AclTokenKind(Enum):
+    APP = "a"
+    PRINCIPAL = "p"
+    ORG_ANYONE = "o"
+
+
+def acl_token(kind: AclTokenKind, value: str) -> str:
+    return f"{kind.value}:{value}"
+
+
+def acl_filter_enabled() -> bool:
+    raw = os.getenv(ENV_ACL_FILTER)
+    return raw is not None and raw.strip().lower() in _ENABLED_VALUES
+
+
+def _implies_record_access(app_type: str | None, permission_model: str | None) -> bool:
+    """Whether access to the app alone grants access to all of its records."""
+    return (
+        app_type == Connectors.KNOWLEDGE_BASE.value
+        or permission_model == PermissionModel.APP_LEVEL.value
+    )
+
+
+@dataclass
+class RecordAclPrincipals:
+    """Who may read one record, as resolved from the graph."""
+
+    record_id: str
+    virtual_record_id: str | None = None
+    connector_id: str | None = None
+    org_id: str | None = None
+    indexing_status: str | None = None
+    app_type: str | None = None
+    permission_model: str | None = None
+    principal_ids: list[str] = field(default_factory=list)
+    shared_with_org: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RecordAclPrincipals":
+        return cls(
+            record_id=data.get("recordId") or "",
+            virtual_record_id=data.get("virtualRecordId"),
+            connector_id=data.get("connectorId"),
+            org_id=data.get("orgId"),
+            indexing_status=data.get("indexingStatus"),
+            app_type=data.get("appType"),
+            permission_model=data.get("permissionModel"),
+            principal_ids=[p for p in (data.get("principalIds") or []) if p],
+            shared_with_org=bool(data.get("anyone")),
+        )
+
+    def tokens(self) -> list[str]:
+        tokens: list[str] = []
+        if self.connector_id and _implies_record_access(self.app_type, self.permission_model):
+            tokens.append(acl_token(AclTokenKind.APP, self.connector_id))
+        tokens.extend(acl_token(AclTokenKind.PRINCIPAL, p) for p in self.principal_ids)
+        if self.shared_with_org and self.org_id:
+            tokens.append(acl_token(AclTokenKind.ORG_ANYONE, self.org_id))
+        return sorted(set(tokens))
+
+    def payload_metadata(self) -> dict[str, Any]:
+        """Fields merged into every vector point's ``metadata`` for this record."""
+        meta: dict[str, Any] = {ACL_TOKENS_FIELD: self.tokens()}
+        if self.connector_id:
+            meta[ACL_CONNECTOR_FIELD] = self.connector_id
+        return meta
+
+
+@dataclass
+class UserAclPrincipals:
+    """Everything a user can be matched on, as resolved from the graph."""
+
+    user_key: str
+    org_id: str
+    principal_ids: list[str] = field(default_factory=list)
+    # Connector apps the user is attached to: {"id", "type", "permissionModel"}
+    apps: list[dict[str, Any]] = field(default_factory=list)
+    kb_ids: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], org_id: str) -> "UserAclPrincipals":
+        return cls(
+            user_key=data.get("userKey") or "",
+            org_id=org_id,
+            principal_ids=[p for p in (data.get("principalIds") or []) if p],
+            apps=[a for a in (data.get("apps") or []) if a and a.get("id")],
+            kb_ids=[k for k in (data.get("kbIds") or []) if k],
+        )
+
+    def connector_ids(self) -> list[str]:
+        """Apps whose records the user may see at all (connectors + reachable KBs).
+
+        KB apps are admitted through ``kb_ids`` (a PERMISSION edge to the KB),
+        not through the user-app relation, exactly as the graph traversal does.
+        """
+        ids = [
+            a["id"] for a in self.apps
+            if a.get("type") != Connectors.KNOWLEDGE_BASE.value
+        ]
+        ids.extend(self.kb_ids)
+        return sorted(set(ids))
+
+    def tokens(self) -> list[str]:
+        tokens = [acl_token(AclTokenKind.PRINCIPAL, p) for p in self.principal_ids]
+        if self.user_key:
+            tokens.append(acl_token(AclTokenKind.PRINCIPAL, self.user_key))
+        tokens.extend(
+            acl_token(AclTokenKind.APP, a["id"])
+            for a in self.apps
+            if a.get("permissionModel") == PermissionModel.APP_LEVEL.value
+            and a.get("type") != Connectors.KNOWLEDGE_BASE.value
+        )
+        tokens.extend(acl_token(AclTokenKind.APP, kb_id) for kb_id in self.kb_ids)
+        tokens.append(acl_token(AclTokenKind.ORG_ANYONE, self.org_id))
+        return sorted(set(tokens))
+
+
+def verify_accessible_records(
+    user: UserAclPrincipals,
+    records: Iterable[RecordAclPrincipals],
+    completed_status: str | None = None,
+) -> dict[str, str]:
+    """``virtualRecordId -> recordId`` for the records the user may read *now*.
+
+    First readable record per virtualRecordId wins, mirroring how the full
+    accessible-records map deduplicates records shared across connectors.
+    """
+    connector_ids = set(user.connector_ids())
+    user_tokens = set(user.tokens())
+    verified: dict[str, str] = {}
+    for record in records:
+        vid = record.virtual_record_id
+        if not vid or vid in verified or not record.record_id:
+            continue
+        if record.org_id and record.org_id != user.org_id:
+            continue
+        if completed_status is not None and record.indexing_status != completed_status:
+            continue
+        if record.connector_id not in connector_ids:
+            continue
+        if user_tokens.isdisjoint(record.tokens()):
+            continue
+        verified[vid] = record.record_id
+    return verified
+
+
+class RecordAclLookup:
+    """Single-record ACL lookups, coalesced into one graph query per org.
+
+    The indexing consumers embed many records concurrently and each needs its
+    own principals. Lookups for the same org that arrive within ``window``
+    seconds of the first pending one share a ``get_records_acl_principals``
+    call, up to ``max_batch`` record ids. Pending batches are kept per event
+    loop, since each consumer runs its own.
+    """
+
+    BATCH_WINDOW_SECONDS = 0.005
+    MAX_BATCH = 256
+
+    def __init__(
+        self,
+        graph_provider: IGraphDBProvider,
+        window: float | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        self.graph_provider = graph_provider
+        self.window = self.BATCH_WINDOW_SECONDS if window is None else window
+        self.max_batch = max(1, max_batch or self.MAX_BATCH)
+        # loop -> org_id -> record_id -> futures waiting on it
+        self._pending: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, dict[str, list[asyncio.Future]]]
+        ] = WeakKeyDictionary()
+        self._flushes: set[asyncio.Task] = set()
+
+    async def get(self, org_id: str, record_id: str) -> RecordAclPrincipals | None:
+        """Principals of ``record_id``; None if the graph has no such record.
+
+        Raises whatever the batched graph query raised.
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(loop, {})
+        batch = pending.get(org_id)
+        if batch is None:
+            batch = pending[org_id] = {}
+            loop.call_later(self.window, self._flush, loop, org_id, batch)
+        future = loop.create_future()
+        batch.setdefault(record_id, []).append(future)
+        if len(batch) >= self.max_batch:
+            self._flush(loop, org_id, batch)
+        return await future
+
+    def _flush(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        org_id: str,
+        batch: dict[str, list[asyncio.Future]],
+    ) -> None:
+        pending = self._pending.get(loop)
+        if pending is None or pending.get(org_id) is not batch:
+            return  # already flushed when it filled up
+        del pending[org_id]
+        task = loop.create_task(self._resolve(org_id, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _resolve(self, org_id: str, batch: dict[str, list[asyncio.Future]]) -> None:
+        try:
+            rows = await self.graph_provider.get_records_acl_principals(
+                org_id, record_ids=list(batch)
+            )
+            records = {
+                record.record_id: record
+                for record in (RecordAclPrincipals.from_dict(row) for row in rows or [])
+            }
+            for record_id, futures in batch.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(records.get(record_id))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            # Cancelled mid-query (loop shutdown): never leave a caller hanging.
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
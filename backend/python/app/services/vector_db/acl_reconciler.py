@@ -0,0 +1,169 @@
+"""Periodic refresh of the ACL tokens stamped on vector points.
+
+Tokens are written when a record is indexed (see ``app.services.vector_db.acl``)
+and are not touched when its permissions change afterwards. A revocation is
+harmless — every ACL-filtered hit is re-checked against the live graph — but a
+grant is not: the newly permitted principal's token is missing from the
+record's points, so the ACL-filtered search cannot return them to that user
+until the payload is refreshed. Points whose token lookup failed at indexing
+time carry no tokens at all and are invisible to that path for everyone.
+
+``AclPayloadReconciler`` closes that gap without reindexing: it pages through
+each org's points, recomputes the tokens of the records behind every
+``virtualRecordId`` from the graph, and rewrites ``aclTokens`` /
+``connectorId`` wherever they differ. Records sharing a ``virtualRecordId``
+share its points, so the points carry the union of their tokens; post-
+verification still picks the record the user may read. The worst-case
+staleness of a grant is one pass plus ``VECTOR_DB_ACL_RECONCILE_INTERVAL``.
+
+A pass scrolls every point of every org, which is a full collection read, so
+the loop is opt-in (``VECTOR_DB_ACL_RECONCILE``) and off by default. Without
+it a grant reaches the ACL-filtered path when the record is next reindexed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING
+
+from app.services.vector_db.acl import (
+    ACL_CONNECTOR_FIELD,
+    ACL_TOKENS_FIELD,
+    RecordAclPrincipals,
+)
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
+    from app.services.vector_db.interface.vector_db import IVectorDBService
+    from app.services.vector_db.models import VectorPoint
+
+ENV_ACL_RECONCILE = "VECTOR_DB_ACL_RECONCILE"
+ENV_ACL_RECONCILE_INTERVAL = "VECTOR_DB_ACL_RECONCILE_INTERVAL"
+DEFAULT_ACL_RECONCILE_INTERVAL_SECONDS = 3600.0
+_ENABLED_VALUES = {"1", "on", "true", "yes"}
+
+
+def acl_reconcile_enabled() -> bool:
+    """Whether the periodic full-collection reconcile runs (``VECTOR_DB_ACL_RECONCILE``)."""
+    raw = os.getenv(ENV_ACL_RECONCILE)
+    return raw is not None and raw.strip().lower() in _ENABLED_VALUES
+
+
+def acl_reconcile_interval() -> float:
+    """Seconds between reconcile passes (``VECTOR_DB_ACL_RECONCILE_INTERVAL``)."""
+    try:
+        return max(
+            60.0,
+            float(os.getenv(ENV_ACL_RECONCILE_INTERVAL, DEFAULT_ACL_RECONCILE_INTERVAL_SECONDS)),
+        )
+    except ValueError:
+        return DEFAULT_ACL_RECONCILE_INTERVAL_SECONDS
+
+
+def _stamp_of(metadata: dict) -> tuple[tuple[str, ...], str | None]:
+    return tuple(sorted(metadata.get(ACL_TOKENS_FIELD) or [])), metadata.get(ACL_CONNECTOR_FIELD)
+
+
+class AclPayloadReconciler:
+    """Rewrites stale ACL tokens on vector points from the live graph."""
+
+    PAGE_SIZE = 256
+
+    def __init__(
+        self,
+        logger: Logger,
+        graph_provider: IGraphDBProvider,
+        vector_db_service: IVectorDBService,
+        collection_name: str,
+        page_size: int | None = None,
+    ) -> None:
+        self.logger = logger
+        self.graph_provider = graph_provider
+        self.vector_db_service = vector_db_service
+        self.collection_name = collection_name
+        self.page_size = page_size or self.PAGE_SIZE
+
+    async def run_once(self) -> int:
+        """One pass over every active org; returns the virtualRecordIds refreshed."""
+        refreshed = 0
+        for org in await self.graph_provider.get_all_orgs():
+            org_id = org.get("_key") or org.get("id")
+            if org_id:
+                refreshed += await self.reconcile_org(org_id)
+        return refreshed
+
+    async def reconcile_org(self, org_id: str) -> int:
+        scroll_filter = await self.vector_db_service.filter_collection(must={"orgId": org_id})
+        refreshed = 0
+        offset = None
+        while True:
+            page = await self.vector_db_service.scroll(
+                self.collection_name, scroll_filter, self.page_size, offset
+            )
+            refreshed += await self._reconcile_points(org_id, page.points)
+            offset = page.next_offset
+            if not offset or not page.points:
+                return refreshed
+            # Background job: let the consumers in this loop run between pages.
+            await asyncio.sleep(0)
+
+    async def _reconcile_points(self, org_id: str, points: list[VectorPoint]) -> int:
+        # virtualRecordId -> distinct (tokens, connectorId) stamps on its points
+        stamped: dict[str, set[tuple[tuple[str, ...], str | None]]] = {}
+        for point in points:
+            metadata = (point.payload or {}).get("metadata") or {}
+            vid = metadata.get("virtualRecordId")
+            if vid:
+                stamped.setdefault(vid, set()).add(_stamp_of(metadata))
+        if not stamped:
+            return 0
+
+        rows = await self.graph_provider.get_records_acl_principals(
+            org_id, virtual_record_ids=list(stamped)
+        )
+        live: dict[str, list[RecordAclPrincipals]] = {}
+        for row in rows or []:
+            record = RecordAclPrincipals.from_dict(row)
+            if record.virtual_record_id in stamped:
+                live.setdefault(record.virtual_record_id, []).append(record)
+
+        refreshed = 0
+        for vid, seen in stamped.items():
+            records = live.get(vid)
+            if not records:
+                continue  # no record left in the graph; deleting it removes the points
+            metadata = records[0].payload_metadata()
+            metadata[ACL_TOKENS_FIELD] = sorted({t for r in records for t in r.tokens()})
+            if seen == {_stamp_of(metadata)}:
+                continue
+            await self.vector_db_service.set_metadata_fields(
+                self.collection_name,
+                metadata,
+                await self.vector_db_service.filter_collection(
+                    must={"orgId": org_id, "virtualRecordId": vid}
+                ),
+            )
+            refreshed += 1
+        return refreshed
+
+
+async def run_acl_reconcile_loop(
+    reconciler: AclPayloadReconciler, interval_seconds: float | None = None
+) -> None:
+    """Run ``reconciler`` forever, one pass every ``interval_seconds``."""
+    interval = interval_seconds or acl_reconcile_interval()
+    while True:
+        try:
+            refreshed = await reconciler.run_once()
+            if refreshed:
+                reconciler.logger.info(
+                    "ACL reconcile refreshed tokens on %d virtual record(s)", refreshed
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            reconciler.logger.warning(f"ACL reconcile pass failed: {e}")
+        await asyncio.sleep(interval)
@@ -185,6 +185,16 @@ class IVectorDBService(ABC):
     ) -> None:
         raise NotImplementedError
 
+    async def set_metadata_fields(
+        self,
+        collection_name: str,
+        metadata: dict,
+        points: FilterExpression,
+    ) -> None:
+        """Merge ``metadata`` into the ``metadata`` payload of every matched
+        point, leaving all other payload fields untouched."""
+        raise NotImplementedError
+
     # ------------------------------------------------------------------
     # Performance utilities (optional — providers that don't support these
     # inherit the no-op default; override in OpenSearch / others as needed)
@@ -69,6 +69,10 @@ class VectorChunkMetadata:
         bytes) rather than a text embedding of a description. Absent/None on
         VLM-description-fallback image points, which are text embeddings and
         should be treated like any other text point for search purposes.
+    connectorId: connector app (or knowledge base) the record belongs to.
+    aclTokens: permission principals snapshotted at indexing time; see
+        ``app.services.vector_db.acl``. Absent on points indexed before ACL
+        tokens existed.
     """
     orgId: Optional[str] = None
     virtualRecordId: Optional[str] = None
@@ -76,6 +80,8 @@ class VectorChunkMetadata:
     blockIndex: Optional[int] = None
     blockType: Optional[str] = None
     isImage: Optional[bool] = None
+    connectorId: Optional[str] = None
+    aclTokens: Optional[List[str]] = None
 
 
 @dataclass
@@ -100,6 +106,8 @@ class VectorChunkPayload:
             blockIndex=meta_raw.get("blockIndex"),
             blockType=meta_raw.get("blockType"),
             isImage=meta_raw.get("isImage"),
+            connectorId=meta_raw.get("connectorId"),
+            aclTokens=meta_raw.get("aclTokens"),
         )
         return cls(page_content=data.get("page_content", ""), metadata=metadata)
 
@@ -112,6 +120,54 @@ class VectorPoint:
     payload: Dict[str, Any] = field(default_factory=dict)
 
 
+class SearchPrecision(Enum):
+    """Recall/latency trade-off for a single search request.
+
+    - FAST — narrow HNSW beam and shallow per-leg candidates; quantized
+      scores are used as-is (no rescoring).
+    - BALANCED — the index's own HNSW/quantization defaults and ``limit * 2``
+      per-leg candidates with a floor of 20. That is the rule Redis and
+      OpenSearch always used; Qdrant used ``limit * 2`` without the floor, so
+      its prefetch is now deeper for limits under 10.
+    - EXACT — wide HNSW beam, deep per-leg candidates, quantized candidates
+      oversampled and rescored against the original vectors.
+    """
+    FAST = "fast"
+    BALANCED = "balanced"
+    EXACT = "exact"
+
+
+@dataclass(frozen=True)
+class PrecisionProfile:
+    """Provider-neutral knobs a ``SearchPrecision`` resolves to.
+
+    ``None`` means "keep the provider/index default".  Providers forward only
+    what they support: ``hnsw_ef`` maps to Qdrant ``hnsw_ef``, OpenSearch
+    ``method_parameters.ef_search`` and Redis ``EF_RUNTIME``; ``oversampling``
+    and ``rescore`` only apply where quantized search can be rescored (Qdrant).
+    """
+    candidate_multiplier: int             # Per-leg candidates = limit * multiplier ...
+    min_candidates: int                   # ... but never fewer than this
+    hnsw_ef: Optional[int] = None         # Query-time HNSW beam width
+    oversampling: Optional[float] = None  # Quantized candidates fetched per result
+    rescore: Optional[bool] = None        # Re-rank quantized hits with original vectors
+
+    def candidates(self, limit: int) -> int:
+        """Candidates each leg should hand to fusion for ``limit`` results."""
+        return max(limit * self.candidate_multiplier, self.min_candidates)
+
+
+PRECISION_PROFILES: Dict[SearchPrecision, PrecisionProfile] = {
+    SearchPrecision.FAST: PrecisionProfile(
+        candidate_multiplier=1, min_candidates=10, hnsw_ef=32, rescore=False,
+    ),
+    SearchPrecision.BALANCED: PrecisionProfile(candidate_multiplier=2, min_candidates=20),
+    SearchPrecision.EXACT: PrecisionProfile(
+        candidate_multiplier=4, min_candidates=40, hnsw_ef=256, oversampling=2.0, rescore=True,
+    ),
+}
+
+
 @dataclass
 class HybridSearchRequest:
     dense_query: Optional[List[float]] = None
@@ -122,6 +178,11 @@ class HybridSearchRequest:
     limit: int = 10
     fusion_method: FusionMethod = FusionMethod.RRF
     with_payload: bool = True
+    precision: SearchPrecision = SearchPrecision.BALANCED
+
+    @property
+    def precision_profile(self) -> PrecisionProfile:
+        return PRECISION_PROFILES[self.precision]
 
 
 @dataclass
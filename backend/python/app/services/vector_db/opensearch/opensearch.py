@@ -40,6 +40,15 @@ Performance optimisations
 - RRF ``rank_constant`` is now configurable via ``OpenSearchConfig``.
 - JVM heap + container memory limits raised in docker-compose (2 GB JVM,
   4 GB container) to give the Lucene mmap engine a larger OS page cache.
+- ``query_nearest_points`` sends every request of a call in one ``_msearch``
+  body (one round trip, one coordinating-node fan-out).  Hybrid requests
+  select the RRF pipeline through the per-request ``search_pipeline``
+  header, so dense-only and BM25-only requests can share the same body.
+- ``scroll`` pages internally with ``search_after`` when ``limit`` exceeds
+  ``index.max_result_window`` instead of silently truncating at 10 000.
+- Search, scroll and bulk responses are trimmed with ``filter_path`` so the
+  client does not decode fields (``_index``, shard stats, per-item
+  ``_version``/``_seq_no``) that are thrown away.
 """
 
 import asyncio
@@ -48,6 +57,11 @@ import time
 from typing import Any, Dict, List, Optional, Union
 
 from opensearchpy import AsyncOpenSearch, helpers as os_helpers  # type: ignore
+from opensearchpy.exceptions import (  # type: ignore
+    HTTP_EXCEPTIONS,
+    RequestError,
+    TransportError,
+)
 
 from app.config.configuration_service import ConfigurationService
 from app.config.constants.service import config_node_constants
@@ -72,6 +86,7 @@ from app.services.vector_db.models import (
 from app.services.vector_db.opensearch.config import OpenSearchConfig
 from app.services.vector_db.opensearch.utils import OpenSearchUtils
 from app.utils.logger import create_logger
+from app.utils.query_timing import backend_call
 
 logger = create_logger("opensearch_service")
 
@@ -95,10 +110,29 @@ _DEFAULT_QUANTIZATION_BITS = 7
 _DEFAULT_CONFIDENCE_INTERVAL = 0.99
 _DEFAULT_RRF_RANK_CONSTANT = 60
 
+# OpenSearch's default index.max_result_window; larger scrolls are paged.
+_MAX_RESULT_WINDOW = 10000
+# Bulk requests are split at this size as well as at ``batch_size`` docs.
+# Dense vectors make documents large, so a fixed doc count alone can produce
+# bodies well past the 5-15 MB range OpenSearch ingests most efficiently.
+_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+_SEARCH_FILTER_PATH = "hits.hits._id,hits.hits._score,hits.hits._source"
+_SCROLL_FILTER_PATH = "hits.hits._id,hits.hits._source,hits.hits.sort"
+_MSEARCH_FILTER_PATH = (
+    "responses.hits.hits._id,responses.hits.hits._score,"
+    "responses.hits.hits._source,responses.error,responses.status"
+)
+_BULK_FILTER_PATH = "errors,items.*.status,items.*.error"
+
 
 class OpenSearchService(IVectorDBService):
     """Fully-async OpenSearch provider implementing IVectorDBService."""
 
+    # Cleared when the cluster rejects ``search_pipeline`` in _msearch
+    # headers (OpenSearch < 2.18); hybrid requests then use _search.
+    _msearch_pipelines: bool = True
+
     def __init__(
         self,
         config_service: ConfigurationService | OpenSearchConfig,
@@ -391,6 +425,8 @@ class OpenSearchService(IVectorDBService):
                                 "orgId": {"type": "keyword"},
                                 "virtualRecordId": {"type": "keyword"},
                                 "blockId": {"type": "keyword"},
+                                "connectorId": {"type": "keyword"},
+                                "aclTokens": {"type": "keyword"},
                             },
                         },
                     },
@@ -584,24 +620,39 @@ class OpenSearchService(IVectorDBService):
         """
         await self._assert_connected()
         bool_query = OpenSearchUtils.filter_expression_to_bool_query(scroll_filter)
-        body: Dict[str, Any] = {
-            "query": bool_query,
-            "size": min(limit, 10000),
-            "_source": {"exclude": ["dense_embedding"]},
-            "sort": [{"_id": "asc"}],
-        }
 
+        search_after: Optional[List[Any]] = None
         if offset is not None:
-            import json as _json
             try:
-                body["search_after"] = _json.loads(offset)
+                search_after = json.loads(offset)
             except (ValueError, TypeError):
-                body["search_after"] = [offset]
+                search_after = [offset]
+
+        # A single search cannot return more than max_result_window hits, so
+        # larger limits are served as consecutive search_after pages.
+        hits: List[Dict[str, Any]] = []
+        while len(hits) < limit:
+            size = min(limit - len(hits), _MAX_RESULT_WINDOW)
+            body: Dict[str, Any] = {
+                "query": bool_query,
+                "size": size,
+                "_source": {"exclude": ["dense_embedding"]},
+                "sort": [{"_id": "asc"}],
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
+
+            result = await self.client.search(  # type: ignore
+                index=collection_name, body=body, filter_path=_SCROLL_FILTER_PATH
+            )
+            page = result.get("hits", {}).get("hits", [])[:size]
+            hits.extend(page)
+            if len(page) < size:
+                break
+            search_after = page[-1].get("sort")
+            if not search_after:
+                break
 
-        result = await self.client.search(index=collection_name, body=body)  # type: ignore
-        hits = result.get("hits", {}).get("hits", [])
-        if len(hits) > limit:
-            hits = hits[:limit]
         points = [
             VectorPoint(
                 id=hit["_id"],
@@ -615,10 +666,9 @@ class OpenSearchService(IVectorDBService):
         # Return a cursor for the next page when the result set is full
         next_offset = None
         if len(hits) == limit and hits:
-            import json as _json
             last_sort = hits[-1].get("sort")
             if last_sort:
-                next_offset = _json.dumps(last_sort)
+                next_offset = json.dumps(last_sort)
 
         return ScrollResult(points=points, next_offset=next_offset)
 
@@ -630,34 +680,108 @@ class OpenSearchService(IVectorDBService):
         await self._assert_connected()
         pipeline_name = f"{collection_name}-rrf-pipeline"
 
-        has_hybrid = any(
-            r.dense_query is not None and r.text_query is not None
+        # Only attach the RRF pipeline when the request is genuinely hybrid
+        # (has both a dense leg and a text/BM25 leg).  Single-leg queries
+        # must not use it — the score-ranker-processor produces nonsensical
+        # scores when only one sub-query is present.
+        pipelines = [
+            pipeline_name
+            if r.dense_query is not None and r.text_query is not None
+            else None
             for r in requests
-        )
-        if has_hybrid:
+        ]
+        if any(pipelines):
             await self._ensure_rrf_pipeline(collection_name)
+        bodies = [OpenSearchUtils.build_hybrid_query(r) for r in requests]
 
-        async def _one_search(req: HybridSearchRequest) -> List[SearchResult]:
-            body = OpenSearchUtils.build_hybrid_query(req)
-            # Only attach the RRF pipeline when the request is genuinely hybrid
-            # (has both a dense leg and a text/BM25 leg).  Single-leg queries
-            # must not use it — the score-ranker-processor produces nonsensical
-            # scores when only one sub-query is present.
-            is_hybrid = (
-                req.dense_query is not None and req.text_query is not None
-            )
+        async def _one_search(i: int) -> List[SearchResult]:
             search_kwargs: Dict[str, Any] = {
                 "index": collection_name,
-                "body": body,
+                "body": bodies[i],
+                "filter_path": _SEARCH_FILTER_PATH,
             }
-            if is_hybrid:
-                search_kwargs["params"] = {"search_pipeline": pipeline_name}
+            if pipelines[i]:
+                search_kwargs["params"] = {"search_pipeline": pipelines[i]}
 
-            result = await self.client.search(**search_kwargs)  # type: ignore
+            with backend_call("opensearch"):
+                result = await self.client.search(**search_kwargs)  # type: ignore
             hits = result.get("hits", {}).get("hits", [])
             return [OpenSearchUtils.hit_to_search_result(h) for h in hits]
 
-        return list(await asyncio.gather(*[_one_search(r) for r in requests]))
+        batched = [
+            i for i in range(len(requests))
+            if self._msearch_pipelines or pipelines[i] is None
+        ]
+        if len(batched) < 2:
+            return list(await asyncio.gather(*[_one_search(i) for i in range(len(requests))]))
+
+        results: List[Optional[List[SearchResult]]] = [None] * len(requests)
+        batch = await self._msearch(collection_name, bodies, pipelines, batched)
+        if batch is None:
+            return await self.query_nearest_points(collection_name, requests)
+        for i, hits in zip(batched, batch):
+            results[i] = hits
+
+        rest = [i for i in range(len(requests)) if results[i] is None]
+        for i, hits in zip(rest, await asyncio.gather(*[_one_search(i) for i in rest])):
+            results[i] = hits
+        return results  # type: ignore[return-value]
+
+    async def _msearch(
+        self,
+        collection_name: str,
+        bodies: List[Dict[str, Any]],
+        pipelines: List[Optional[str]],
+        indices: List[int],
+    ) -> Optional[List[List[SearchResult]]]:
+        """Run ``bodies[indices]`` as one ``_msearch`` request.
+
+        Results come back in request order.  A failed sub-search raises the
+        same exception type ``client.search`` would have raised for it.
+        Returns ``None`` when the cluster rejects ``search_pipeline`` headers;
+        the caller should retry with hybrid requests routed to ``_search``.
+        """
+        with_pipelines = any(pipelines[i] for i in indices)
+        lines: List[Dict[str, Any]] = []
+        for i in indices:
+            header: Dict[str, Any] = {"index": collection_name}
+            if pipelines[i]:
+                header["search_pipeline"] = pipelines[i]
+            lines.append(header)
+            lines.append(bodies[i])
+
+        try:
+            with backend_call("opensearch"):
+                result = await self.client.msearch(  # type: ignore
+                    body=lines, filter_path=_MSEARCH_FILTER_PATH
+                )
+        except RequestError:
+            # Header parsing fails for the whole body, so a 400 here (not a
+            # per-response error) on a body with pipelines means no support.
+            if not with_pipelines:
+                raise
+            logger.warning(
+                "OpenSearch rejected search_pipeline in _msearch headers; "
+                "hybrid queries will use one _search request each"
+            )
+            self._msearch_pipelines = False
+            return None
+
+        out: List[List[SearchResult]] = []
+        for response in result.get("responses", []):
+            if "error" in response:
+                status = response.get("status", 500)
+                error = response["error"]
+                error_type = error.get("type", "") if isinstance(error, dict) else str(error)
+                raise HTTP_EXCEPTIONS.get(status, TransportError)(status, error_type, response)
+            hits = response.get("hits", {}).get("hits", [])
+            out.append([OpenSearchUtils.hit_to_search_result(h) for h in hits])
+        if len(out) != len(indices):
+            raise TransportError(
+                "N/A",
+                f"_msearch returned {len(out)} responses for {len(indices)} searches",
+            )
+        return out
 
     async def upsert_points(
         self,
@@ -708,8 +832,10 @@ class OpenSearchService(IVectorDBService):
             self.client,
             actions,
             chunk_size=batch_size,
+            max_chunk_bytes=_BULK_MAX_CHUNK_BYTES,
             raise_on_error=True,
             refresh=refresh,
+            filter_path=_BULK_FILTER_PATH,
         )
 
         elapsed = time.perf_counter() - start
@@ -787,6 +913,18 @@ class OpenSearchService(IVectorDBService):
             },
         )
 
+    async def set_metadata_fields(
+        self,
+        collection_name: str,
+        metadata: dict,
+        points: FilterExpression,
+    ) -> None:
+        await self.overwrite_payload(
+            collection_name,
+            {f"metadata.{key}": value for key, value in metadata.items()},
+            points,
+        )
+
     # ------------------------------------------------------------------
     # Performance utilities
     # ------------------------------------------------------------------
@@ -103,17 +103,23 @@ class OpenSearchUtils:
           which ensures the Lucene k-NN engine only scans qualifying documents
           rather than post-filtering the top-k results (which loses recall).
 
-        Per-leg k is raised to ``limit * 2`` so that the RRF merger has enough
-        candidates from each leg to produce ``limit`` high-quality final results.
+        Per-leg k comes from the request's precision profile (``limit * 2``,
+        floor 20, for BALANCED) so that the RRF merger has enough candidates
+        from each leg to produce ``limit`` high-quality final results.  A
+        profile ``hnsw_ef`` is sent as ``method_parameters.ef_search`` and
+        overrides the index-level ``ef_search`` for this query only.  The
+        Lucene scalar-quantized index has no query-time rescore, so the
+        profile's oversampling/rescore knobs do not apply here.
         """
         filter_query: Dict[str, Any] = {}
         if request.filter is not None and not request.filter.is_empty():
             filter_query = OpenSearchUtils.filter_expression_to_bool_query(request.filter)
 
         # Give the RRF merger enough candidates from each leg to produce
-        # ``limit`` high-quality final results.  limit*2 with a floor of 20
-        # keeps k-NN scan cost proportional to the requested result size.
-        per_leg_k = max(request.limit * 2, 20)
+        # ``limit`` high-quality final results while keeping k-NN scan cost
+        # proportional to the requested result size.
+        profile = request.precision_profile
+        per_leg_k = profile.candidates(request.limit)
         queries: List[Dict[str, Any]] = []
 
         # BM25 text leg — wrap filter around the match query
@@ -129,6 +135,8 @@ class OpenSearchUtils:
             }
             if filter_query and filter_query != {"match_all": {}}:
                 knn_params["filter"] = filter_query
+            if profile.hnsw_ef is not None:
+                knn_params["method_parameters"] = {"ef_search": profile.hnsw_ef}
             knn: Dict[str, Any] = {"knn": {"dense_embedding": knn_params}}
             queries.append(knn)
 
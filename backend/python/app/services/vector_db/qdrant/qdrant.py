@@ -58,6 +58,7 @@ from app.services.vector_db.models import (
 from app.services.vector_db.qdrant.config import QdrantConfig
 from app.services.vector_db.qdrant.utils import QdrantUtils
 from app.utils.logger import create_logger
+from app.utils.query_timing import backend_call
 
 logger = create_logger("qdrant_service")
 
@@ -510,10 +511,11 @@ class QdrantService(IVectorDBService):
     ) -> List[List[SearchResult]]:
         self._assert_connected()
         qdrant_requests = [QdrantUtils.search_request_to_qdrant(req) for req in requests]
-        raw_results = await self.client.query_batch_points(  # type: ignore
-            collection_name=collection_name,
-            requests=qdrant_requests,
-        )
+        with backend_call("qdrant"):
+            raw_results = await self.client.query_batch_points(  # type: ignore
+                collection_name=collection_name,
+                requests=qdrant_requests,
+            )
         results: List[List[SearchResult]] = []
         for batch_result in raw_results:
             results.append(
@@ -584,6 +586,21 @@ class QdrantService(IVectorDBService):
             points=FilterSelector(filter=qdrant_filter),
         )
 
+    async def set_metadata_fields(
+        self,
+        collection_name: str,
+        metadata: dict,
+        points: FilterExpression,
+    ) -> None:
+        self._assert_connected()
+        qdrant_filter = QdrantUtils.filter_expression_to_qdrant(points)
+        await self.client.set_payload(  # type: ignore
+            collection_name=collection_name,
+            payload=metadata,
+            key="metadata",
+            points=FilterSelector(filter=qdrant_filter),
+        )
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
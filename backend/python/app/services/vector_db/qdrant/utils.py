@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from qdrant_client.http.models import (  # type: ignore
     FieldCondition,
@@ -10,7 +10,9 @@ from qdrant_client.http.models import (  # type: ignore
     MinShould,
     PointStruct,
     Prefetch,
+    QuantizationSearchParams,
     QueryRequest,
+    SearchParams,
     SparseVector as QdrantSparseVector,
 )
 
@@ -20,6 +22,7 @@ from app.services.vector_db.models import (
     FilterValue,
     FusionMethod,
     HybridSearchRequest,
+    PrecisionProfile,
     SearchResult,
     SparseVector,
     VectorPoint,
@@ -143,10 +146,17 @@ class QdrantUtils:
 
     @staticmethod
     def search_request_to_qdrant(req: HybridSearchRequest) -> QueryRequest:
+        profile = req.precision_profile
+        per_leg_limit = profile.candidates(req.limit)
         prefetch_list = []
         if req.dense_query is not None:
             prefetch_list.append(
-                Prefetch(query=req.dense_query, using="dense", limit=req.limit * 2)
+                Prefetch(
+                    query=req.dense_query,
+                    using="dense",
+                    limit=per_leg_limit,
+                    params=QdrantUtils.precision_to_search_params(profile),
+                )
             )
         if req.sparse_query is not None:
             prefetch_list.append(
@@ -156,7 +166,7 @@ class QdrantUtils:
                         values=req.sparse_query.values,
                     ),
                     using="sparse",
-                    limit=req.limit * 2,
+                    limit=per_leg_limit,
                 )
             )
 
@@ -177,6 +187,24 @@ class QdrantUtils:
             filter=qdrant_filter,
         )
 
+    @staticmethod
+    def precision_to_search_params(profile: PrecisionProfile) -> Optional[SearchParams]:
+        """Dense-leg ``SearchParams`` for a precision profile.
+
+        Returns ``None`` when the profile keeps every collection default, so
+        BALANCED requests are sent exactly as before.  Quantization params
+        are ignored by Qdrant on collections created without quantization.
+        """
+        quantization = None
+        if profile.oversampling is not None or profile.rescore is not None:
+            quantization = QuantizationSearchParams(
+                oversampling=profile.oversampling,
+                rescore=profile.rescore,
+            )
+        if profile.hnsw_ef is None and quantization is None:
+            return None
+        return SearchParams(hnsw_ef=profile.hnsw_ef, quantization=quantization)
+
     @staticmethod
     def qdrant_result_to_search_result(scored_point: Any) -> SearchResult:
         return SearchResult(
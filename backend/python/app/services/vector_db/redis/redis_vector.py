@@ -18,6 +18,8 @@ Hash fields::
     dense_embedding    bytes   (binary FLOAT16/FLOAT32 blob for HNSW)
     metadata_orgId     str     (TAG-indexed for tenant filtering)
     metadata_virtualRecordId  str  (TAG-indexed)
+    metadata_connectorId      str  (TAG-indexed)
+    metadata_aclTokens        str  (comma-joined, TAG-indexed per token)
     metadata_*         str     (any additional metadata, stored but not indexed)
 
 The Search index is named::
@@ -67,6 +69,7 @@ from app.services.vector_db.redis.utils import (
     escape_tag_value,
     field_conditions_to_redis_query,
     filter_expression_to_redis_query,
+    metadata_to_hash_fields,
     parse_ft_hybrid_reply,
     parse_ft_search_reply,
     reconstruct_metadata,
@@ -74,6 +77,7 @@ from app.services.vector_db.redis.utils import (
     vector_to_bytes,
 )
 from app.utils.logger import create_logger
+from app.utils.query_timing import backend_call
 
 logger = create_logger("redis_vector_service")
 
@@ -306,6 +310,8 @@ class RedisVectorService(IVectorDBService):
         #   dense_embedding    VECTOR HNSW (binary blob stored directly in hash field)
         #   metadata_orgId     TAG   (tenant filter)
         #   metadata_virtualRecordId TAG
+        #   metadata_connectorId     TAG
+        #   metadata_aclTokens       TAG   (comma-joined list, see utils)
         #
         # No JSONPath (``$.``) prefixes — hash field names map directly to
         # the SCHEMA field names.  The HNSW index reads the binary blob from
@@ -325,6 +331,8 @@ class RedisVectorService(IVectorDBService):
             "DISTANCE_METRIC", dist,
             "metadata_orgId", "TAG",
             "metadata_virtualRecordId", "TAG",
+            "metadata_connectorId", "TAG",
+            "metadata_aclTokens", "TAG", "SEPARATOR", ",",
         ]
         await self.client.execute_command(*cmd)  # type: ignore
         logger.info(
@@ -570,6 +578,25 @@ class RedisVectorService(IVectorDBService):
                 pipeline.execute_command("HSET", key, *flat)
         await pipeline.execute()
 
+    async def set_metadata_fields(
+        self,
+        collection_name: str,
+        metadata: dict,
+        points: FilterExpression,
+    ) -> None:
+        self._assert_connected()
+        fields = metadata_to_hash_fields(metadata)
+        if not fields:
+            return
+        keys = await self._keys_matching_filter(collection_name, points)
+        if not keys:
+            return
+        flat = [item for pair in fields.items() for item in pair]
+        pipeline = self.client.pipeline(transaction=False)  # type: ignore
+        for key in keys:
+            pipeline.execute_command("HSET", key, *flat)
+        await pipeline.execute()
+
     async def scroll(
         self,
         collection_name: str,
@@ -651,11 +678,12 @@ class RedisVectorService(IVectorDBService):
     ) -> List[List[SearchResult]]:
         self._assert_connected()
         idx = self._index_name(collection_name)
-        tasks = [
-            self._run_single_hybrid_query(idx, collection_name, req)
-            for req in requests
-        ]
-        return list(await asyncio.gather(*tasks))
+
+        async def _timed(req: HybridSearchRequest) -> List[SearchResult]:
+            with backend_call("redis"):
+                return await self._run_single_hybrid_query(idx, collection_name, req)
+
+        return list(await asyncio.gather(*[_timed(req) for req in requests]))
 
     # ------------------------------------------------------------------
     # Internal query helpers
@@ -693,12 +721,17 @@ class RedisVectorService(IVectorDBService):
 
         vec_bytes = vector_to_bytes(req.dense_query, self._dense_dtype)
         k = req.limit
-        window = max(k * 2, 20)
+        profile = req.precision_profile
+        window = profile.candidates(k)
+        knn_args = ["K", str(window)]
+        if profile.hnsw_ef is not None:
+            knn_args += ["EF_RUNTIME", str(profile.hnsw_ef)]
 
         # FT.HYBRID <idx>
         #   SEARCH <text+filter query>            ← lexical BM25 leg + filter
         #   VSIM @dense_embedding $vec
         #       KNN 2 K <window>                  ← 2 = arg-count for "K <value>"
+        #           [EF_RUNTIME <ef>]             ← precision profile; count becomes 4
         #       [FILTER <tag_query>]               ← pre-filter on the KNN leg
         #   COMBINE RRF 4 WINDOW <w> CONSTANT 60  ← 4 = arg-count for the 2 pairs
         #   LIMIT 0 <k>
@@ -715,7 +748,7 @@ class RedisVectorService(IVectorDBService):
             "FT.HYBRID", idx,
             "SEARCH", search_query,
             "VSIM", "@dense_embedding", "$vec",
-            "KNN", "2", "K", str(window),
+            "KNN", str(len(knn_args)), *knn_args,
         ]
         # Apply the same filter to the KNN leg so org/tenant isolation is enforced
         # on both the lexical and vector branches.
@@ -19,6 +19,7 @@ Redis treats as special inside ``{}``.
 import struct
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from app.services.vector_db.acl import ACL_TOKENS_FIELD
 from app.services.vector_db.models import (
     FieldCondition,
     FilterExpression,
@@ -27,6 +28,10 @@ from app.services.vector_db.models import (
 )
 
 
+# List-valued metadata stored as a comma-joined string rather than JSON so the
+# TAG index (default SEPARATOR ",") matches each element individually.
+_TAG_LIST_FIELDS = frozenset({ACL_TOKENS_FIELD})
+
 # Characters that need escaping inside a Redis tag value
 _TAG_ESCAPE_CHARS = set(r",.<>{}[]\"':;!@#$%^&*()\- +=/\\|~`")
 
@@ -149,10 +154,18 @@ def vector_point_to_hash_fields(point: VectorPoint, dtype: str = "FLOAT16") -> D
     if point.dense_vector is not None:
         fields["dense_embedding"] = vector_to_bytes(point.dense_vector, dtype)
 
-    metadata = point.payload.get("metadata", {})
-    for k, v in metadata.items():
-        fields[f"metadata_{k}"] = _coerce_hash_value(v)
+    fields.update(metadata_to_hash_fields(point.payload.get("metadata", {})))
+    return fields
+
 
+def metadata_to_hash_fields(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a ``metadata`` dict into ``metadata_*`` HSET fields."""
+    fields: Dict[str, Any] = {}
+    for k, v in metadata.items():
+        if k in _TAG_LIST_FIELDS and isinstance(v, (list, tuple)):
+            fields[f"metadata_{k}"] = ",".join(str(item) for item in v)
+        else:
+            fields[f"metadata_{k}"] = _coerce_hash_value(v)
     return fields
 
 
@@ -186,11 +199,16 @@ def reconstruct_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
     """
     if "metadata" in doc and isinstance(doc["metadata"], dict):
         return doc["metadata"]
-    return {
-        k[len("metadata_"):]: _recover_typed_value(v)
-        for k, v in doc.items()
-        if k.startswith("metadata_")
-    }
+    metadata: Dict[str, Any] = {}
+    for k, v in doc.items():
+        if not k.startswith("metadata_"):
+            continue
+        name = k[len("metadata_"):]
+        if name in _TAG_LIST_FIELDS and isinstance(v, str):
+            metadata[name] = [item for item in v.split(",") if item]
+        else:
+            metadata[name] = _recover_typed_value(v)
+    return metadata
 
 
 def _recover_typed_value(v: Any) -> Any:
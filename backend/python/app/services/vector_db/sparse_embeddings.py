@@ -84,6 +84,10 @@ class SparseEmbedder:
     # Public API
     # ------------------------------------------------------------------
 
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
     async def embed_query(self, text: str) -> SparseVector:
         """Embed a single query text and return a generic ``SparseVector``.
 
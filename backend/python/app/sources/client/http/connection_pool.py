@@ -0,0 +1,492 @@
+"""Process-wide connection pools for connector source clients.
+
+Every ``HTTPClient`` used to build its own ``httpx.AsyncClient``, so each
+connector data source (Jira, Confluence, Zendesk, ServiceNow, ...) paid its
+own DNS lookups and TLS handshakes and kept its own idle connections. Clients
+now borrow a pooled ``httpx.AsyncClient`` keyed by ``(scheme, host, auth
+scope)``:
+
+* syncs against the same SaaS host with the same credentials share warm
+  connections (and HTTP/2 streams when ``PIPESHUB_HTTP2`` is set, ``h2`` is
+  installed and the server negotiates it);
+* the auth scope is a digest of every credential-bearing header and query
+  parameter (``Authorization``, API-key headers such as ``x-sn-apikey``,
+  Trello-style ``key``/``token`` params, ...), so tenants never share a pool;
+* pooled clients keep no cookies at all: a cookie one caller's response sets
+  is never sent on another caller's request, whatever its scope;
+* resolved addresses are cached for ``PIPESHUB_HTTP_DNS_TTL`` seconds;
+* pools no client holds are closed after ``PIPESHUB_HTTP_POOL_IDLE_TTL``
+  seconds, so rotated tokens do not accumulate pools. A pool that is still
+  held but has sent nothing for ``PIPESHUB_HTTP_POOL_ABANDONED_TTL`` seconds
+  is closed too (its holder never called ``close()``); ``HTTPClient``
+  borrows a fresh one if it turns out to still be in use.
+
+The pooled client carries no default headers, timeout or redirect policy;
+``HTTPClient`` passes its own with every request. It does honour
+``HTTP_PROXY`` / ``HTTPS_PROXY`` / ``ALL_PROXY`` / ``NO_PROXY`` like a plain
+``httpx.AsyncClient``: httpx skips them once a custom transport is given, so
+the pool reads them with ``urllib.request.getproxies`` and mounts a pooled
+proxy transport per proxied pattern itself.
+
+Settings (read when a pool is created):
+  PIPESHUB_HTTP_SHARED_POOL             (default: true; false restores one
+                                         client per HTTPClient)
+  PIPESHUB_HTTP_MAX_CONNECTIONS         (default: 100, per pool)
+  PIPESHUB_HTTP_MAX_KEEPALIVE           (default: 20, per pool)
+  PIPESHUB_HTTP_KEEPALIVE_EXPIRY        (default: 60 seconds)
+  PIPESHUB_HTTP2                        (default: false; needs ``h2``)
+  PIPESHUB_HTTP_DNS_TTL                 (default: 300 seconds; 0 disables)
+  PIPESHUB_HTTP_POOL_IDLE_TTL           (default: 300 seconds)
+  PIPESHUB_HTTP_POOL_ABANDONED_TTL      (default: 3600 seconds)
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import ipaddress
+import os
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import NamedTuple
+from urllib.request import getproxies
+from weakref import WeakKeyDictionary
+
+import httpcore  # type: ignore
+import httpx  # type: ignore
+
+ENV_SHARED_POOL = "PIPESHUB_HTTP_SHARED_POOL"
+ENV_MAX_CONNECTIONS = "PIPESHUB_HTTP_MAX_CONNECTIONS"
+ENV_MAX_KEEPALIVE = "PIPESHUB_HTTP_MAX_KEEPALIVE"
+ENV_KEEPALIVE_EXPIRY = "PIPESHUB_HTTP_KEEPALIVE_EXPIRY"
+ENV_HTTP2 = "PIPESHUB_HTTP2"
+ENV_DNS_TTL = "PIPESHUB_HTTP_DNS_TTL"
+ENV_POOL_IDLE_TTL = "PIPESHUB_HTTP_POOL_IDLE_TTL"
+ENV_POOL_ABANDONED_TTL = "PIPESHUB_HTTP_POOL_ABANDONED_TTL"
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_DNS_TTL = 300.0
+DEFAULT_POOL_IDLE_TTL = 300.0
+DEFAULT_POOL_ABANDONED_TTL = 3600.0
+# Pooled clients are shared, so this only applies to callers that use the
+# client directly without a timeout; HTTPClient always sends its own.
+DEFAULT_TIMEOUT = 30.0
+
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def _env_flag(name: str, *, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in _FALSE_VALUES
+
+
+def _env_number(name: str, default: float, minimum: float = 0.0) -> float:
+    try:
+        return max(minimum, float(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def shared_pool_enabled() -> bool:
+    return _env_flag(ENV_SHARED_POOL, default=True)
+
+
+def http2_available() -> bool:
+    """HTTP/2 is optional: httpx only speaks it when ``h2`` is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    http2: bool
+    dns_ttl: float
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            max_connections=int(_env_number(ENV_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS, 1)),
+            max_keepalive_connections=int(_env_number(ENV_MAX_KEEPALIVE, DEFAULT_MAX_KEEPALIVE)),
+            keepalive_expiry=_env_number(ENV_KEEPALIVE_EXPIRY, DEFAULT_KEEPALIVE_EXPIRY),
+            http2=_env_flag(ENV_HTTP2, default=False) and http2_available(),
+            dns_ttl=_env_number(ENV_DNS_TTL, DEFAULT_DNS_TTL),
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class PoolKey(NamedTuple):
+    scheme: str
+    host: str
+    auth_scope: str
+
+
+# Header and query-parameter names that carry credentials: Authorization,
+# x-api-key, x-sn-apikey, X-Auth-Token, Trello's key/token, access_token, ...
+_CREDENTIAL_NAME = re.compile(
+    r"auth|key|token|secret|session|signature|password|credential|cookie", re.IGNORECASE
+)
+# ...minus per-request values that merely look like one (pageToken,
+# nextPageToken, syncToken, Idempotency-Key, ...); scoping on those would
+# open a new pool for every page of a listing.
+_NOT_CREDENTIAL_NAME = re.compile(
+    r"page|next|sync|delta|cursor|continuation|idempotency|request-?id", re.IGNORECASE
+)
+
+
+def credential_scope(
+    headers: Mapping[str, object] | None = None,
+    params: Mapping[str, object] | None = None,
+) -> str:
+    """Stable, non-reversible scope for the credentials in *headers* and *params*."""
+    parts = []
+    for kind, values in (("header", headers), ("param", params)):
+        for raw_name, value in (values or {}).items():
+            name = str(raw_name)
+            text = "" if value is None else str(value).strip()
+            if text and _CREDENTIAL_NAME.search(name) and not _NOT_CREDENTIAL_NAME.search(name):
+                parts.append(f"{kind}:{name.lower()}={text}")
+    if not parts:
+        return "anonymous"
+    return hashlib.sha256("\n".join(sorted(parts)).encode("utf-8")).hexdigest()[:16]
+
+
+def pool_key_for(
+    url: str | None,
+    headers: Mapping[str, object] | None = None,
+    params: Mapping[str, object] | None = None,
+) -> PoolKey:
+    """Pool for *url*'s host and the credentials in *headers*, *params* and the URL's query."""
+    scheme, host = "", ""
+    merged_params: dict[str, object] = {}
+    if url:
+        try:
+            parsed = httpx.URL(url)
+            scheme, host = parsed.scheme, parsed.host
+            merged_params.update(parsed.params.items())
+        except (httpx.InvalidURL, TypeError):
+            pass
+    merged_params.update(params or {})
+    return PoolKey(scheme, host, credential_scope(headers, merged_params))
+
+
+# ---------------------------------------------------------------------------
+# Per-host stats
+# ---------------------------------------------------------------------------
+@dataclass
+class HostPoolStats:
+    """Counters for one host across every pool that reached it."""
+    requests: int = 0
+    connections_opened: int = 0
+    dns_lookups: int = 0
+    dns_cache_hits: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        """Requests served on an already open connection (or HTTP/2 stream)."""
+        return max(0, self.requests - self.connections_opened)
+
+
+_stats: dict[str, HostPoolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, **increments: int) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(host, HostPoolStats())
+        for name, value in increments.items():
+            setattr(stats, name, getattr(stats, name) + value)
+
+
+def pool_stats() -> dict[str, HostPoolStats]:
+    """Snapshot of per-host counters since start-up (or the last reset)."""
+    with _stats_lock:
+        return {host: HostPoolStats(**vars(stats)) for host, stats in _stats.items()}
+
+
+# ---------------------------------------------------------------------------
+# DNS cache
+# ---------------------------------------------------------------------------
+_dns_cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+_dns_lock = threading.Lock()
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+async def _resolve(host: str, port: int, ttl: float, timeout: float | None) -> list[str]:
+    key = (host, port)
+    now = time.monotonic()
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        _record(host, dns_cache_hits=1)
+        return cached[1]
+
+    loop = asyncio.get_running_loop()
+    infos = await asyncio.wait_for(
+        loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+    )
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    _record(host, dns_lookups=1)
+    with _dns_lock:
+        _dns_cache[key] = (now + ttl, addresses)
+    return addresses
+
+
+def _forget(host: str, port: int) -> None:
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+
+
+class _CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Resolves through the DNS cache and counts new connections per host.
+
+    TLS still uses the original host name for SNI and certificate checks:
+    httpcore takes ``server_hostname`` from the request origin, not from the
+    address the socket was opened to.
+    """
+
+    def __init__(self, inner: httpcore.AsyncNetworkBackend, dns_ttl: float) -> None:
+        self._inner = inner
+        self._dns_ttl = dns_ttl
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        if self._dns_ttl <= 0 or _is_ip_literal(host):
+            stream = await self._inner.connect_tcp(
+                host, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+            )
+            _record(host, connections_opened=1)
+            return stream
+        try:
+            addresses = await _resolve(host, port, self._dns_ttl, timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise httpcore.ConnectError(f"DNS resolution failed for {host}: {e}") from e
+
+        last_error: Exception | None = None
+        for address in addresses:
+            try:
+                stream = await self._inner.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+                continue
+            _record(host, connections_opened=1)
+            return stream
+        # Every cached address failed; the next attempt resolves again.
+        _forget(host, port)
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+class _PooledTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, settings: PoolSettings, proxy: str | None = None) -> None:
+        super().__init__(http2=settings.http2, limits=settings.limits, proxy=proxy)
+        # httpx does not expose the network backend; the httpcore pool reads
+        # it each time it opens a connection. Fail at pool creation rather than
+        # silently lose the DNS cache and connection counts if that changes.
+        pool = getattr(self, "_pool", None)
+        backend = getattr(pool, "_network_backend", None)
+        if not isinstance(backend, httpcore.AsyncNetworkBackend):
+            raise RuntimeError(
+                f"httpx {httpx.__version__} no longer exposes the httpcore network "
+                "backend; update connection_pool._PooledTransport"
+            )
+        pool._network_backend = _CachingNetworkBackend(backend, settings.dns_ttl)
+
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _record(request.url.host, requests=1)
+        self.last_used = time.monotonic()
+        self.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+def _cookieless_jar() -> CookieJar:
+    """A jar whose policy accepts and returns no cookie for any domain."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _environment_proxies() -> dict[str, str | None]:
+    """httpx mount patterns for ``*_PROXY`` / ``NO_PROXY``, as ``trust_env`` reads them.
+
+    ``None`` marks a ``NO_PROXY`` pattern, which falls through to the
+    client's direct transport.
+    """
+    environment = getproxies()
+    proxies: dict[str, str | None] = {}
+    for scheme in ("http", "https", "all"):
+        proxy = environment.get(scheme)
+        if proxy:
+            proxies[f"{scheme}://"] = proxy if "://" in proxy else f"http://{proxy}"
+    for host in (h.strip() for h in environment.get("no", "").split(",")):
+        if host == "*":
+            return {}
+        if not host:
+            continue
+        if "://" in host:
+            proxies[host] = None
+        elif _is_ip_literal(host):
+            proxies[f"all://[{host}]" if ":" in host else f"all://{host}"] = None
+        elif host.lower() == "localhost":
+            proxies[f"all://{host}"] = None
+        else:
+            proxies[f"all://*{host}"] = None
+    return proxies
+
+
+def _environment_proxy_mounts(settings: PoolSettings) -> dict[str, _PooledTransport | None]:
+    """The mounts ``httpx.AsyncClient`` would build from the proxy environment."""
+    return {
+        pattern: None if proxy is None else _PooledTransport(settings, proxy=proxy)
+        for pattern, proxy in _environment_proxies().items()
+    }
+
+
+class _SharedPool:
+    def __init__(self, settings: PoolSettings) -> None:
+        self.transport = _PooledTransport(settings)
+        mounts = _environment_proxy_mounts(settings)
+        self.transports = [self.transport, *(t for t in mounts.values() if t is not None)]
+        self.client = httpx.AsyncClient(
+            transport=self.transport,
+            mounts=mounts,
+            timeout=DEFAULT_TIMEOUT,
+            cookies=_cookieless_jar(),
+        )
+        self.holders = 0
+        self.released_at = time.monotonic()
+
+    def idle_for(self, now: float) -> float:
+        if any(t.in_flight for t in self.transports):
+            return 0.0
+        return now - max(self.released_at, *(t.last_used for t in self.transports))
+
+
+# httpx clients (and their connections) belong to the loop that opened them,
+# and this process runs several loops in different threads, so each loop
+# gets its own registry.
+_pools_by_loop: "WeakKeyDictionary[asyncio.AbstractEventLoop, dict[PoolKey, _SharedPool]]" = (
+    WeakKeyDictionary()
+)
+_pools_lock = threading.Lock()
+# Background closes of idle pools, kept referenced until they finish.
+_closing: "set[asyncio.Task]" = set()
+
+
+def _loop_pools() -> dict[PoolKey, _SharedPool]:
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pools = _pools_by_loop.get(loop)
+        if pools is None:
+            pools = {}
+            _pools_by_loop[loop] = pools
+    return pools
+
+
+def acquire_client(
+    url: str | None,
+    headers: Mapping[str, object] | None = None,
+    params: Mapping[str, object] | None = None,
+) -> httpx.AsyncClient:
+    """Borrow the shared client for ``url``'s host and these credentials.
+
+    Must be called from a running event loop. Pair with ``release_client``.
+    """
+    pools = _loop_pools()
+    _close_idle_pools(pools)
+    key = pool_key_for(url, headers, params)
+    pool = pools.get(key)
+    if pool is None or pool.client.is_closed:
+        pool = _SharedPool(PoolSettings.from_env())
+        pools[key] = pool
+    pool.holders += 1
+    return pool.client
+
+
+def release_client(client: httpx.AsyncClient) -> None:
+    """Give back a client from ``acquire_client``; its connections stay warm."""
+    for pool in _loop_pools().values():
+        if pool.client is client:
+            pool.holders = max(0, pool.holders - 1)
+            pool.released_at = time.monotonic()
+            return
+
+
+def _close_idle_pools(pools: dict[PoolKey, _SharedPool]) -> None:
+    idle_ttl = _env_number(ENV_POOL_IDLE_TTL, DEFAULT_POOL_IDLE_TTL)
+    abandoned_ttl = _env_number(ENV_POOL_ABANDONED_TTL, DEFAULT_POOL_ABANDONED_TTL)
+    now = time.monotonic()
+    for key, pool in list(pools.items()):
+        idle = pool.idle_for(now)
+        if idle > (idle_ttl if pool.holders == 0 else abandoned_ttl):
+            del pools[key]
+            task = asyncio.get_running_loop().create_task(pool.client.aclose())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+
+async def close_shared_pools() -> None:
+    """Close every pool owned by the running loop (application shutdown)."""
+    pools = _loop_pools()
+    clients = [pool.client for pool in pools.values()]
+    pools.clear()
+    await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
+def reset_connection_pools() -> None:
+    """Forget pools, cached addresses and stats (tests)."""
+    with _pools_lock:
+        _pools_by_loop.clear()
+    with _dns_lock:
+        _dns_cache.clear()
+    with _stats_lock:
+        _stats.clear()
@@ -2,6 +2,7 @@ from typing import Optional
 
 import httpx  # type: ignore
 
+from app.sources.client.http import connection_pool, rate_limiter
 from app.sources.client.http.http_request import HTTPRequest
 from app.sources.client.http.http_response import HTTPResponse
 from app.sources.client.iclient import IClient
@@ -21,19 +22,58 @@ class HTTPClient(IClient):
         self.timeout = timeout
         self.follow_redirects = follow_redirects
         self.client: Optional[httpx.AsyncClient] = None
+        # True when self.client is borrowed from the shared connection pool
+        self._pooled = False
+        # Credential scope of the borrowed pool
+        self._pool_scope: Optional[str] = None
+        # Tenant half of the rate-limit key; set it to something stable (an
+        # org or connector id) when credentials rotate or differ per pod.
+        # Defaults to a digest of the credentials in the request's headers
+        # and query parameters.
+        self.rate_limit_scope: Optional[str] = None
 
     def get_client(self) -> "HTTPClient":
         """Get the client"""
         return self
 
-    async def _ensure_client(self) -> httpx.AsyncClient:
-        """Ensure client is created and available"""
-        if self.client is None:
-            self.client = httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=self.follow_redirects,
-                headers=self.headers
-            )
+    async def _ensure_client(
+        self,
+        url: Optional[str] = None,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+    ) -> httpx.AsyncClient:
+        """Ensure client is created and available
+
+        Args:
+            url: A URL the client is about to call; picks the shared pool for
+                its host. Defaults to the subclass's ``base_url``, if any.
+            headers: Headers of that call (default: the client's own).
+            params: Query parameters of that call.
+        The pool is scoped by the credentials among ``headers`` and ``params``;
+        a borrowed client is swapped when they change or when the pool was
+        closed for inactivity.
+        """
+        if self.client is None or self._pooled:
+            if connection_pool.shared_pool_enabled():
+                base_url = getattr(self, "base_url", None)
+                url = url or (base_url if isinstance(base_url, str) else None)
+                headers = self.headers if headers is None else headers
+                key = connection_pool.pool_key_for(url, headers, params)
+                if self.client is not None and (
+                    self.client.is_closed or key.auth_scope != self._pool_scope
+                ):
+                    connection_pool.release_client(self.client)
+                    self.client = None
+                if self.client is None:
+                    self.client = connection_pool.acquire_client(url, headers, params)
+                    self._pooled = True
+                    self._pool_scope = key.auth_scope
+            elif self.client is None:
+                self.client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    follow_redirects=self.follow_redirects,
+                    headers=self.headers
+                )
         return self.client
 
     async def execute(self, request: HTTPRequest, **kwargs) -> HTTPResponse:
@@ -45,13 +85,17 @@ class HTTPClient(IClient):
             A HTTPResponse object containing the response from the server
         """
         url = f"{request.url.format(**request.path_params)}"
-        client = await self._ensure_client()
-
         # Merge client headers with request headers (request headers take precedence)
         merged_headers = {**self.headers, **request.headers}
+        client = await self._ensure_client(url, merged_headers, request.query_params)
+
         request_kwargs = {
             "params": request.query_params,
             "headers": merged_headers,
+            # Sent per request because a pooled client is shared by clients
+            # with different settings
+            "timeout": self.timeout,
+            "follow_redirects": self.follow_redirects,
             **kwargs
         }
 
@@ -67,14 +111,38 @@ class HTTPClient(IClient):
         elif isinstance(request.body, bytes):
             request_kwargs["content"] = request.body
 
-        response = await client.request(request.method, url, **request_kwargs)
+        if not rate_limiter.rate_limit_enabled():
+            response = await client.request(request.method, url, **request_kwargs)
+            return HTTPResponse(response)
+
+        limiter = rate_limiter.get_rate_limiter()
+        limiter_key = self._rate_limit_key(url, merged_headers, request.query_params)
+        slot = await limiter.acquire(limiter_key)
+        try:
+            response = await client.request(request.method, url, **request_kwargs)
+            await limiter.observe(limiter_key, response.status_code, response.headers, slot)
+        finally:
+            # No-op once observe settled it; frees the slot when the request raised
+            await limiter.release(slot)
         return HTTPResponse(response)
 
+    def _rate_limit_key(
+        self, url: str, headers: dict, params: Optional[dict] = None
+    ) -> rate_limiter.RateLimitKey:
+        """(provider, tenant) key shared by every client calling the same API as the same tenant"""
+        key = connection_pool.pool_key_for(url, headers, params)
+        return key.host, self.rate_limit_scope or key.auth_scope
+
     async def close(self) -> None:
-        """Close the client"""
+        """Close the client; a pooled client is returned to the pool"""
         if self.client:
-            await self.client.aclose()
+            if self._pooled:
+                connection_pool.release_client(self.client)
+            else:
+                await self.client.aclose()
             self.client = None
+            self._pooled = False
+            self._pool_scope = None
 
     async def __aenter__(self) -> "HTTPClient":
         """Async context manager entry"""
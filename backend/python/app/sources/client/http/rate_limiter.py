@@ -0,0 +1,560 @@
+"""Adaptive rate limiting for connector API calls.
+
+``call_with_retry`` only reacts once a provider has answered 429, and every
+concurrent task for the same tenant keeps sending until it is throttled too,
+so a large sync spends its time in 429 storms. ``HTTPClient`` now asks the
+limiter for a slot before each request and reports every response back:
+
+* the budget is learnt from the response headers providers already send:
+  ``X-RateLimit-*`` (GitHub, Atlassian, Zendesk), ``RateLimit-*`` and the
+  combined ``RateLimit`` field (IETF draft, Microsoft Graph), Atlassian's
+  ``X-RateLimit-NearLimit`` and ``Retry-After`` (Slack, Graph, everyone);
+* each key has a token bucket that mirrors the provider's window: it holds
+  the reported ``remaining`` budget minus a headroom
+  (``PIPESHUB_RATE_LIMIT_HEADROOM``, default 10% of the limit) and minus the
+  requests still in flight, and refills when the window resets. Callers
+  spend it at full speed and, once only the headroom is left, wait for the
+  reset instead of running into 429s;
+* a ``Retry-After`` blocks every caller sharing the key, not just the one
+  that was throttled;
+* the key is ``(provider, tenant)``: the API host plus the client's
+  ``rate_limit_scope`` (by default a digest of every credential among its
+  headers and query parameters, the same scope its connection pool uses);
+* ``acquire`` hands out a ``RateLimitSlot`` that counts as in flight until
+  ``observe`` (a response) or ``release`` (no response) settles it, so
+  failed requests and responses without rate-limit headers give their slot
+  back instead of leaking it until the window rolls over.
+
+Until a provider sends rate-limit headers for a key the limiter never waits.
+With Redis configured (``configure_shared_store``) the bucket lives in Redis
+and every acquire consults it, so every connector pod (including one that has
+not seen a response for the key yet) paces against the same budget; any Redis
+error falls back to the local bucket for ``DOWN_BACKOFF_SECONDS``.
+
+``PIPESHUB_RATE_LIMIT=false`` turns the limiter off.
+"""
+
+import asyncio
+import email.utils
+import math
+import os
+import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from logging import Logger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.commands.core import AsyncScript
+
+    from app.config.configuration_service import ConfigurationService
+
+ENV_RATE_LIMIT = "PIPESHUB_RATE_LIMIT"
+ENV_HEADROOM = "PIPESHUB_RATE_LIMIT_HEADROOM"
+
+DEFAULT_HEADROOM = 0.1
+# Longest a single acquire waits; a longer block (a bad header, a day-long
+# quota reset) is left to the provider's 429 and call_with_retry.
+MAX_WAIT_SECONDS = 60.0
+# A provider that only says "near the limit", without numbers, pauses the key.
+NEAR_LIMIT_PAUSE_SECONDS = 1.0
+# Shortest window a bucket refills over once the reported reset has passed,
+# so a reset of "now" (or 0) cannot refill the bucket on every take.
+MIN_WINDOW_SECONDS = 1.0
+THROTTLE_STATUSES = frozenset({429, 503})
+
+_FALSE_VALUES = ("0", "false", "no", "off")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def rate_limit_enabled() -> bool:
+    return os.getenv(ENV_RATE_LIMIT, "true").strip().lower() not in _FALSE_VALUES
+
+
+def _headroom() -> float:
+    try:
+        return min(0.9, max(0.0, float(os.getenv(ENV_HEADROOM, DEFAULT_HEADROOM))))
+    except ValueError:
+        return DEFAULT_HEADROOM
+
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class RateLimitObservation:
+    """What one response said about the caller's budget."""
+    limit: float | None = None
+    remaining: float | None = None
+    # Seconds until the budget resets.
+    reset_after: float | None = None
+    # Seconds the provider asked every caller to wait.
+    retry_after: float | None = None
+    near_limit: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return (
+            self.remaining is None
+            and self.retry_after is None
+            and not self.near_limit
+        )
+
+
+def _header(headers: Mapping, *names: str) -> str | None:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            value = headers.get(name.lower())
+        # Only real header values; test doubles return arbitrary objects.
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _first_number(value: str | None) -> float | None:
+    # List-valued fields ("100, 100;w=60") start with the effective value.
+    if value is None:
+        return None
+    match = _NUMBER.search(value)
+    return float(match.group()) if match else None
+
+
+def _seconds_until(value: str | None, now: float) -> float | None:
+    """A reset given as delta seconds, epoch seconds/ms, ISO 8601 or HTTP date."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    if number is not None:
+        if number > 1e12:
+            return max(0.0, number / 1000 - now)
+        if number > 1e9:
+            return max(0.0, number - now)
+        return max(0.0, number)
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            moment = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        return None
+    return max(0.0, moment.timestamp() - now)
+
+
+def _structured_field(value: str | None) -> dict[str, str]:
+    # "limit=100, remaining=50, reset=5" or '"default";r=50;t=30'
+    if value is None:
+        return {}
+    return dict(re.findall(r"(\w+)=([^,;\s]+)", value))
+
+
+def parse_rate_limit_headers(
+    headers: Mapping, status: int, now: float | None = None
+) -> RateLimitObservation:
+    now = time.time() if now is None else now
+    combined = _structured_field(_header(headers, "RateLimit"))
+
+    limit = _first_number(
+        _header(headers, "X-RateLimit-Limit", "RateLimit-Limit", "X-Rate-Limit-Limit", "X-Rate-Limit")
+        or combined.get("limit")
+    )
+    remaining = _first_number(
+        _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining", "X-Rate-Limit-Remaining")
+        or combined.get("remaining")
+        or combined.get("r")
+    )
+    reset_after = _seconds_until(
+        _header(headers, "X-RateLimit-Reset", "RateLimit-Reset", "X-Rate-Limit-Reset")
+        or combined.get("reset")
+        or combined.get("t"),
+        now,
+    )
+    retry_after = None
+    if status in THROTTLE_STATUSES:
+        retry_after = _seconds_until(_header(headers, "Retry-After"), now)
+        if retry_after is None and status == 429:
+            retry_after = reset_after
+    near_limit = (_header(headers, "X-RateLimit-NearLimit") or "").lower() == "true"
+    return RateLimitObservation(limit, remaining, reset_after, retry_after, near_limit)
+
+
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class PacingUpdate:
+    """How an observation changes a bucket. ``None`` fields are left alone."""
+    # Requests that may still be sent before ``reset_after`` seconds from now.
+    tokens: float | None = None
+    # Requests a fresh window allows.
+    capacity: float | None = None
+    reset_after: float | None = None
+    # Seconds from now during which nobody may send.
+    block_for: float | None = None
+
+
+def pacing_for(observation: RateLimitObservation, headroom: float) -> PacingUpdate:
+    block_for = observation.retry_after
+    if observation.near_limit and observation.remaining is None:
+        block_for = max(block_for or 0.0, NEAR_LIMIT_PAUSE_SECONDS)
+    if observation.remaining is None or observation.reset_after is None:
+        return PacingUpdate(block_for=block_for)
+    limit = max(observation.limit or 0.0, observation.remaining)
+    reserve = math.ceil(limit * headroom)
+    return PacingUpdate(
+        tokens=max(0.0, observation.remaining - reserve),
+        capacity=max(1.0, limit - reserve),
+        reset_after=observation.reset_after,
+        block_for=block_for,
+    )
+
+
+@dataclass
+class _Bucket:
+    """The provider's window as last reported, minus requests still in flight.
+
+    Times are on the ``time.time()`` clock.
+    """
+    # None until a response reports a remaining budget.
+    tokens: float | None = None
+    capacity: float = 0.0
+    # Longest reset seen, used as the window length when it rolls over
+    # before the next response re-syncs the bucket.
+    window: float = 0.0
+    window_end: float = 0.0
+    blocked_until: float = 0.0
+    # Requests sent from this bucket that the provider has not reported yet.
+    in_flight: int = 0
+
+    def take(self, now: float) -> tuple[float, bool]:
+        """Take a token: ``(seconds until one may be free, whether one was taken)``.
+
+        An unpaced bucket (no budget reported yet) answers ``(0.0, False)``.
+        """
+        if self.blocked_until > now:
+            return self.blocked_until - now, False
+        if self.tokens is None:
+            return 0.0, False
+        if now >= self.window_end:
+            self.tokens = self.capacity
+            self.window_end = now + max(self.window, MIN_WINDOW_SECONDS)
+            self.in_flight = 0
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.in_flight += 1
+            return 0.0, True
+        return self.window_end - now, False
+
+    def release(self) -> None:
+        """A request taken from this bucket ended without a budget report."""
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def apply(self, update: PacingUpdate, now: float, *, settles: bool = False) -> None:
+        """Apply ``update``; ``settles`` when it answers a request taken from this bucket."""
+        if update.block_for:
+            self.blocked_until = max(self.blocked_until, now + update.block_for)
+        if update.tokens is not None:
+            if settles:
+                self.in_flight = max(0, self.in_flight - 1)
+            self.tokens = max(0.0, update.tokens - self.in_flight)
+            self.capacity = update.capacity or self.capacity
+            self.window = max(self.window, update.reset_after or 0.0)
+            self.window_end = now + (update.reset_after or 0.0)
+
+
+RateLimitKey = tuple[str, str]
+
+
+@dataclass
+class RateLimitSlot:
+    """One request's claim on a key's budget, settled by ``observe`` or ``release``."""
+    key: RateLimitKey
+    waited: float = 0.0
+    # Which bucket the token came from ("local" or "shared"); None when no
+    # token was taken (unpaced key, wait cap reached) or once settled.
+    taken_from: str | None = None
+
+# The same bucket in Redis, so every pod takes from one budget. Times are
+# milliseconds on Redis' own clock.
+_TAKE_SCRIPT = """
+local key = KEYS[1]
+local ttl_ms = tonumber(ARGV[1])
+local min_window_ms = tonumber(ARGV[2])
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local s = redis.call("HMGET", key, "tokens", "capacity", "window", "window_end", "blocked", "in_flight")
+local blocked = tonumber(s[5]) or 0
+if blocked > now then
+    return blocked - now
+end
+local tokens = tonumber(s[1])
+if not tokens then
+    return 0
+end
+local window_end = tonumber(s[4]) or 0
+local in_flight = tonumber(s[6]) or 0
+if now >= window_end then
+    tokens = tonumber(s[2]) or 0
+    window_end = now + math.max(tonumber(s[3]) or 0, min_window_ms)
+    in_flight = 0
+end
+local wait = -1
+if tokens >= 1 then
+    tokens = tokens - 1
+    in_flight = in_flight + 1
+else
+    wait = window_end - now
+end
+redis.call("HSET", key, "tokens", tokens, "window_end", window_end, "in_flight", in_flight)
+redis.call("PEXPIRE", key, ttl_ms)
+return wait
+"""
+
+_APPLY_SCRIPT = """
+local key = KEYS[1]
+local tokens = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local reset_ms = tonumber(ARGV[3])
+local block_ms = tonumber(ARGV[4])
+local ttl_ms = tonumber(ARGV[5])
+local settles = tonumber(ARGV[6])
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+if block_ms > 0 then
+    local blocked = tonumber(redis.call("HGET", key, "blocked")) or 0
+    redis.call("HSET", key, "blocked", math.max(blocked, now + block_ms))
+end
+if tokens >= 0 then
+    local s = redis.call("HMGET", key, "window", "in_flight")
+    local in_flight = math.max(0, (tonumber(s[2]) or 0) - settles)
+    redis.call("HSET", key,
+        "tokens", math.max(0, tokens - in_flight),
+        "capacity", capacity,
+        "window", math.max(tonumber(s[1]) or 0, reset_ms),
+        "window_end", now + reset_ms,
+        "in_flight", in_flight)
+end
+redis.call("PEXPIRE", key, ttl_ms)
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+local key = KEYS[1]
+local in_flight = tonumber(redis.call("HGET", key, "in_flight")) or 0
+if in_flight > 0 then
+    redis.call("HSET", key, "in_flight", in_flight - 1)
+end
+return 1
+"""
+
+
+class RedisRateLimitStore:
+    """Buckets in Redis, shared by every connector pod."""
+
+    KEY_PREFIX = "pipeshub:ratelimit:v1"
+    OP_TIMEOUT_SECONDS = 1.0
+    DOWN_BACKOFF_SECONDS = 30.0
+    # Idle buckets expire; a provider's window is rarely longer than an hour.
+    KEY_TTL_MS = 3_600_000
+
+    def __init__(self, logger: Logger, redis_client: "Redis") -> None:
+        self.logger = logger
+        self._redis = redis_client
+        self._loop = asyncio.get_running_loop()
+        self._take_script: AsyncScript = redis_client.register_script(_TAKE_SCRIPT)
+        self._apply_script: AsyncScript = redis_client.register_script(_APPLY_SCRIPT)
+        self._release_script: AsyncScript = redis_client.register_script(_RELEASE_SCRIPT)
+        self._down_until = 0.0
+
+    @classmethod
+    async def create(
+        cls, logger: Logger, config_service: "ConfigurationService"
+    ) -> "RedisRateLimitStore | None":
+        """Connect to the configured Redis. Never raises; ``None`` on failure."""
+        from redis.asyncio import Redis
+
+        try:
+            redis_config = await config_service.get_redis_config()
+            client = Redis(
+                host=redis_config.host,
+                port=redis_config.port,
+                password=redis_config.password,
+                db=redis_config.db,
+                decode_responses=True,
+                socket_timeout=cls.OP_TIMEOUT_SECONDS,
+                socket_connect_timeout=cls.OP_TIMEOUT_SECONDS,
+            )
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"Connector rate limits stay per process; Redis unavailable: {e}")
+            return None
+        return cls(logger, client)
+
+    @property
+    def available(self) -> bool:
+        # The Redis connection belongs to the loop that created it.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return loop is self._loop and time.monotonic() >= self._down_until
+
+    def _key(self, key: RateLimitKey) -> str:
+        return f"{self.KEY_PREFIX}:{key[0]}:{key[1]}"
+
+    async def take(self, key: RateLimitKey) -> tuple[float, bool] | None:
+        """``_Bucket.take`` in Redis; ``None`` if Redis failed."""
+        try:
+            wait_ms = await self._take_script(
+                keys=[self._key(key)],
+                args=[self.KEY_TTL_MS, int(MIN_WINDOW_SECONDS * 1000)],
+            )
+        except Exception as e:
+            self._trip(e)
+            return None
+        wait_ms = float(wait_ms)
+        return max(0.0, wait_ms / 1000), wait_ms < 0
+
+    async def release(self, key: RateLimitKey) -> bool:
+        try:
+            await self._release_script(keys=[self._key(key)])
+        except Exception as e:
+            self._trip(e)
+            return False
+        return True
+
+    async def apply(self, key: RateLimitKey, update: PacingUpdate, *, settles: bool = False) -> bool:
+        try:
+            await self._apply_script(
+                keys=[self._key(key)],
+                args=[
+                    -1 if update.tokens is None else update.tokens,
+                    update.capacity or 0,
+                    int((update.reset_after or 0.0) * 1000),
+                    int((update.block_for or 0.0) * 1000),
+                    self.KEY_TTL_MS,
+                    1 if settles else 0,
+                ],
+            )
+        except Exception as e:
+            self._trip(e)
+            return False
+        return True
+
+    def _trip(self, error: Exception) -> None:
+        self._down_until = time.monotonic() + self.DOWN_BACKOFF_SECONDS
+        self.logger.warning(
+            f"Connector rate-limit store unavailable ({error}); "
+            f"pacing per process for {self.DOWN_BACKOFF_SECONDS:.0f}s"
+        )
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class AdaptiveRateLimiter:
+    """Per ``(provider, tenant)`` pacing learnt from response headers."""
+
+    def __init__(self, shared_store: RedisRateLimitStore | None = None) -> None:
+        self.shared_store = shared_store
+        self._buckets: dict[RateLimitKey, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: RateLimitKey) -> RateLimitSlot:
+        """Wait for a token for ``key``.
+
+        Settle the returned slot with ``observe`` once the response arrives,
+        or with ``release`` if the request failed.
+        """
+        slot = RateLimitSlot(key)
+        # Without a shared store, keys no response has described are never
+        # paced. With one, Redis is asked even then: other pods may already
+        # have drawn the budget down.
+        if self.shared_store is None:
+            with self._lock:
+                if key not in self._buckets:
+                    return slot
+        while True:
+            wait, slot.taken_from = await self._take(key)
+            if wait <= 0 or slot.waited >= MAX_WAIT_SECONDS:
+                return slot
+            wait = min(wait, MAX_WAIT_SECONDS - slot.waited)
+            await asyncio.sleep(wait)
+            slot.waited += wait
+
+    async def _take(self, key: RateLimitKey) -> tuple[float, str | None]:
+        if self.shared_store is not None and self.shared_store.available:
+            taken = await self.shared_store.take(key)
+            if taken is not None:
+                return taken[0], "shared" if taken[1] else None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return 0.0, None
+            wait, took = bucket.take(time.time())
+        return wait, "local" if took else None
+
+    async def observe(
+        self,
+        key: RateLimitKey,
+        status: int,
+        headers: Mapping,
+        slot: RateLimitSlot | None = None,
+    ) -> None:
+        """Learn from one response to ``key``; settles ``slot`` if given."""
+        observation = parse_rate_limit_headers(headers, status)
+        update = None if observation.empty else pacing_for(observation, _headroom())
+        if update is None or update.tokens is None:
+            # Nothing re-syncs the in-flight count; give the slot back.
+            if slot is not None:
+                await self.release(slot)
+            if update is None:
+                return
+        taken_from = slot.taken_from if slot is not None else None
+        if slot is not None:
+            slot.taken_from = None
+        with self._lock:
+            self._buckets.setdefault(key, _Bucket()).apply(
+                update, time.time(), settles=taken_from == "local"
+            )
+        if self.shared_store is not None and self.shared_store.available:
+            await self.shared_store.apply(key, update, settles=taken_from == "shared")
+
+    async def release(self, slot: RateLimitSlot) -> None:
+        """Give back ``slot`` for a request that got no usable response."""
+        taken_from, slot.taken_from = slot.taken_from, None
+        if taken_from == "local":
+            with self._lock:
+                bucket = self._buckets.get(slot.key)
+                if bucket is not None:
+                    bucket.release()
+        elif taken_from == "shared" and self.shared_store is not None and self.shared_store.available:
+            await self.shared_store.release(slot.key)
+
+
+_limiter = AdaptiveRateLimiter()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    return _limiter
+
+
+def configure_shared_store(store: RedisRateLimitStore | None) -> None:
+    """Share buckets across pods through ``store`` (``None`` to stop)."""
+    _limiter.shared_store = store
+
+
+def reset_rate_limiter() -> None:
+    """Forget every learnt budget and the shared store (tests)."""
+    with _limiter._lock:
+        _limiter._buckets.clear()
+    _limiter.shared_store = None
@@ -143,7 +143,7 @@ class ConfluenceDataSource:
             raise ValueError("HTTP client is not initialized")
         
         # Reuse the existing httpx client to avoid creating new connections for each download
-        httpx_client = await self._client._ensure_client()
+        httpx_client = await self._client._ensure_client(download_url)
         
         async with httpx_client.stream(
             "GET",
@@ -232,7 +232,7 @@ class ConfluenceDataSource:
             return None
         
         # Reuse the existing httpx client to avoid creating new connections for each image
-        httpx_client = await self._client._ensure_client()
+        httpx_client = await self._client._ensure_client(url)
         
         try:
             async with httpx_client.stream(
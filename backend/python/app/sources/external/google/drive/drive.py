@@ -1,7 +1,10 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.sources.client.google.google import GoogleClient
 
+# Google batch HTTP requests accept at most 100 calls.
+MAX_BATCH_REQUESTS = 100
+
 
 class GoogleDriveDataSource:
     """
@@ -2017,6 +2020,33 @@ class GoogleDriveDataSource:
         request = self.client.accessproposals().list(**kwargs) # type: ignore
         return request.execute()
 
+    async def permissions_list_batch(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Google Drive API: permissions.list for many files, sent as batch HTTP requests.
+
+        HTTP POST batch/drive/v3, up to 100 permissions.list calls per request
+
+        Args:
+            requests (List[Dict[str, Any]], required): permissions_list keyword arguments, one dict per call.
+
+        Returns:
+            List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]: (response, error) per call, in request order
+        """
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = [(None, None)] * len(requests)
+
+        def _callback(request_id: str, response: Optional[Dict[str, Any]], exception: Optional[Exception]) -> None:
+            results[int(request_id)] = (response, exception)
+
+        for start in range(0, len(requests), MAX_BATCH_REQUESTS):
+            batch = self.client.new_batch_http_request(callback=_callback) # type: ignore
+            for index in range(start, min(start + MAX_BATCH_REQUESTS, len(requests))):
+                kwargs = {k: v for k, v in requests[index].items() if v is not None}
+                batch.add(self.client.permissions().list(**kwargs), request_id=str(index)) # type: ignore
+            batch.execute()
+        return results
+
     async def get_client(self) -> object:
         """Get the underlying Google API client."""
         return self.client
@@ -12156,16 +12156,17 @@ class JiraDataSource:
             httpx_params = [(k, v) for k, v in query_params.items()]
             httpx_params.extend([('keys', str(k)) for k in keys])
 
-            # Use httpx directly for this special case
-            httpx_client = await self._client._ensure_client()
-            merged_headers = {**self._client.headers, **_as_str_dict(_headers)}
-            response = await httpx_client.request(
-                'GET',
-                url,
-                params=httpx_params,
-                headers=merged_headers,
+            # Override the params execute() sends; it still applies the client's
+            # timeout, redirect policy and rate limiting
+            req = HTTPRequest(
+                method='GET',
+                url=url,
+                headers=_as_str_dict(_headers),
+                path_params=_as_str_dict(_path),
+                query_params=query_params,
+                body=_body,
             )
-            return HTTPResponse(response)
+            return await self._client.execute(req, params=httpx_params)
 
         # Normal path: single key or no keys
         req = HTTPRequest(
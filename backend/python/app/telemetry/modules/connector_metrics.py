@@ -27,3 +27,28 @@ def set_connector_active(counts: dict) -> None:
         else:
             connector, domain = (key or "unknown"), "unknown"
         CONNECTOR_ACTIVE.set(connector, domain, value=count)
+
+
+# Sync write throughput, observed by SyncWriteScheduler
+# (app/connectors/core/base/data_processor/sync_write_scheduler.py). Records/sec
+# per connector is rate(pipeshub_sync_records_written_total).
+SYNC_RECORDS_WRITTEN = METRICS_BACKEND.counter(
+    "pipeshub_sync_records_written_total",
+    "Records written to the graph by connector syncs",
+    ["connector"],
+)
+
+# ``outcome`` is ok, conflict (the batch deadlocked and was rerun alone) or
+# error.
+SYNC_WRITE_BATCH_DURATION = METRICS_BACKEND.histogram(
+    "pipeshub_sync_write_batch_duration_seconds",
+    "Time to write one connector sync batch, including any conflict rerun, in seconds",
+    ["connector", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+SYNC_WRITES_IN_FLIGHT = METRICS_BACKEND.gauge(
+    "pipeshub_sync_writes_in_flight",
+    "Connector sync batches currently being written concurrently",
+    ["connector"],
+)
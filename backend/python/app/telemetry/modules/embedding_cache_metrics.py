@@ -0,0 +1,33 @@
+"""Embedding-cache effectiveness, emitted by ``app.services.cache.embedding_cache``.
+
+``backend`` is ``redis`` or ``disk`` and ``kind`` is ``dense`` or ``sparse``,
+so every label stays low cardinality. The hit rate over any window is
+``rate(hits) / (rate(hits) + rate(misses))``; the gauge carries the process's
+running ratio for dashboards that just want one number.
+"""
+
+from app.telemetry.backend import METRICS_BACKEND
+
+EMBEDDING_CACHE_LOOKUPS = METRICS_BACKEND.counter(
+    "pipeshub_embedding_cache_lookups_total",
+    "Chunk embedding lookups against the embedding cache, by result (hit/miss)",
+    ["backend", "kind", "result"],
+)
+
+EMBEDDING_CACHE_HIT_RATIO = METRICS_BACKEND.gauge(
+    "pipeshub_embedding_cache_hit_ratio",
+    "Fraction of chunk embedding lookups served from the cache since process start",
+    ["backend"],
+)
+
+EMBEDDING_CACHE_EVICTIONS = METRICS_BACKEND.counter(
+    "pipeshub_embedding_cache_evictions_total",
+    "Embedding cache entries evicted to stay within the configured budget",
+    ["backend"],
+)
+
+EMBEDDING_CACHE_ERRORS = METRICS_BACKEND.counter(
+    "pipeshub_embedding_cache_errors_total",
+    "Embedding cache backend failures that fell through to the embedding model",
+    ["backend", "op"],
+)
@@ -0,0 +1,27 @@
+"""Query-service latency breakdown: where a search or chat turn spends its time.
+
+``phase`` is one of the fixed names in ``app.utils.query_timing.PHASES`` and
+``backend`` one of a handful of store names, so both labels stay low
+cardinality. Observed by ``app.utils.query_timing``; call sites never touch
+these directly.
+"""
+
+from app.telemetry.backend import METRICS_BACKEND
+
+# Wall time a request spent with at least one span of the phase open, observed
+# once per request, so concurrent fetches inside a phase are not double counted.
+QUERY_PHASE_DURATION = METRICS_BACKEND.histogram(
+    "pipeshub_query_phase_duration_seconds",
+    "Per-request wall time spent in each query phase, in seconds",
+    ["phase"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# One observation per call, measured caller side, so it includes time queued
+# for a pooled connection as well as the backend's own latency.
+BACKEND_CALL_DURATION = METRICS_BACKEND.histogram(
+    "pipeshub_backend_call_duration_seconds",
+    "Latency of individual backend calls made by the query service, in seconds",
+    ["backend"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0),
+)
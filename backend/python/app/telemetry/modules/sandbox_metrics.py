@@ -0,0 +1,17 @@
+"""Sandbox code-execution latency, split by how the run was set up.
+
+``container`` is ``cold`` (container created for this run), ``warm`` (taken
+from DockerExecutor's pre-started pool) or ``local`` (LocalExecutor
+subprocess). ``deps`` is ``none`` (no packages to install), ``cached`` (the
+install came from the dependency cache) or ``installed`` (pip / npm ran for
+this request). Observed by the executors.
+"""
+
+from app.telemetry.backend import METRICS_BACKEND
+
+SANDBOX_EXECUTION_DURATION = METRICS_BACKEND.histogram(
+    "pipeshub_sandbox_execution_duration_seconds",
+    "End-to-end latency of a sandbox code execution, in seconds",
+    ["executor", "container", "deps"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
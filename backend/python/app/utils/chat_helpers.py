@@ -41,6 +41,7 @@ from app.modules.qna.prompt_templates import (
 )
 from app.connectors.sources.atlassian.jira.enrichment.record_identifiers import is_jira_ticket_record
 from app.modules.transformers.blob_storage import BlobStorage
+from app.modules.transformers.block_record_format import RECORD_FORMAT_BLOCKS, is_partial_record
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
 from app.services.vector_db.const.const import VECTOR_DB_COLLECTION_NAME
 from app.utils.image_utils import get_extension_from_mimetype
@@ -1811,8 +1812,9 @@ async def get_flattened_results(result_set: List[Dict[str, Any]], blob_store: Bl
                 graph_provider, list(by_record_id), by_record_id
             )
 
-    await asyncio.gather(*[get_record(virtual_record_id,virtual_record_id_to_result,blob_store,org_id,virtual_to_record_map,graph_provider,frontend_url,batched_lookups.get(virtual_record_id),type_docs) for virtual_record_id in records_to_fetch])
-    # Prefetch reconciliation metadata in parallel (records were fully fetched above).
+    # Prefetch reconciliation metadata in parallel. It only depends on the hits,
+    # and resolving blockId -> blockIndex first lets the record fetch below
+    # know which blocks each record needs.
     vrids_needing_recon: set = set[Any]()
 
     for result in sorted_new_type_results:
@@ -1832,6 +1834,34 @@ async def get_flattened_results(result_set: List[Dict[str, Any]], blob_store: Bl
     if vrids_needing_recon:
         await asyncio.gather(*[_prefetch_recon(vrid) for vrid in vrids_needing_recon])
 
+    # Large block-framed records are read frame by frame: collect the blocks and
+    # groups the hits point at, so only those (and what is rendered around them)
+    # are downloaded.
+    block_selection: dict[str, tuple[set[int], set[int]]] = {}
+    for result in sorted_new_type_results:
+        meta = result.get("metadata") or {}
+        vrid = meta.get("virtualRecordId")
+        if not vrid or meta.get("isRecordSummary"):
+            continue
+        blocks_needed, groups_needed = block_selection.setdefault(vrid, (set(), set()))
+        index = meta.get("blockIndex")
+        if index is None and meta.get("blockId"):
+            recon_metadata = virtual_record_id_to_recon_metadata.get(vrid)
+            if recon_metadata:
+                index = ReconciliationMetadata.from_dict(recon_metadata).block_id_to_index.get(meta["blockId"])
+        if index is not None:
+            (groups_needed if meta.get("isBlockGroup") else blocks_needed).add(index)
+
+    await asyncio.gather(*[get_record(virtual_record_id,virtual_record_id_to_result,blob_store,org_id,virtual_to_record_map,graph_provider,frontend_url,batched_lookups.get(virtual_record_id),type_docs,block_selection.get(virtual_record_id, (set(), set()))) for virtual_record_id in records_to_fetch])
+    # Records read partially by an earlier call in this conversation may lack
+    # the frames these hits need.
+    await asyncio.gather(*[
+        blob_store.load_record_blocks(record, org_id, *selection)
+        for vrid, selection in block_selection.items()
+        if vrid not in records_to_fetch
+        and is_partial_record(record := virtual_record_id_to_result.get(vrid))
+    ])
+
     for result in sorted_new_type_results:
         virtual_record_id = result["metadata"].get("virtualRecordId")
         if not virtual_record_id:
@@ -2484,9 +2514,26 @@ def extract_bounding_boxes(citation_metadata) -> list[dict[str, float]]:
         except Exception as e:
             raise e
 
-async def get_record(virtual_record_id: str,virtual_record_id_to_result: dict[str, dict[str, Any]],blob_store: BlobStorage,org_id: str,virtual_to_record_map: dict[str, dict[str, Any]]=None,graph_provider: IGraphDBProvider | None = None,frontend_url: str | None = None,lookup_result: dict[str, Any] | None = None,type_docs: dict[str, dict[str, Any]] | None = None) -> None:
+async def get_record(virtual_record_id: str,virtual_record_id_to_result: dict[str, dict[str, Any]],blob_store: BlobStorage,org_id: str,virtual_to_record_map: dict[str, dict[str, Any]]=None,graph_provider: IGraphDBProvider | None = None,frontend_url: str | None = None,lookup_result: dict[str, Any] | None = None,type_docs: dict[str, dict[str, Any]] | None = None,block_selection: tuple[set[int], set[int]] | None = None) -> None:
+    """Fetch a record from blob storage, enrich it from the graph and store it in
+    ``virtual_record_id_to_result``.
+
+    ``block_selection`` -- (block indices, block group indices) the caller's hits
+    point at. When given and the record is stored block-framed, only the frames
+    around those blocks are read and the stored record is partial (see
+    ``BlobStorage.get_record_blocks_from_storage``).
+    """
     try:
-        record = await blob_store.get_record_from_storage(virtual_record_id=virtual_record_id, org_id=org_id, lookup_result=lookup_result)
+        if (
+            block_selection is not None
+            and isinstance(lookup_result, dict)
+            and lookup_result.get("storageFormat") == RECORD_FORMAT_BLOCKS
+        ):
+            record = await blob_store.get_record_blocks_from_storage(
+                virtual_record_id, org_id, *block_selection, lookup_result=lookup_result
+            )
+        else:
+            record = await blob_store.get_record_from_storage(virtual_record_id=virtual_record_id, org_id=org_id, lookup_result=lookup_result)
         if record:
             graphDb_record = (virtual_to_record_map or {}).get(virtual_record_id)
             if graphDb_record:
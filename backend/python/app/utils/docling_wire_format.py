@@ -0,0 +1,146 @@
+"""Binary wire format for parsed DoclingDocuments.
+
+By default a parsed document travels from the Docling service and the
+Parsing Service as ``model_dump_json`` text. With ``generate_picture_images``
+every picture rides inline as a base64 data URI, so an image-heavy PDF is
+hundreds of MB of JSON the receiver must hold as one string and validate in
+one pass. The binary envelope keeps the structure and the bitmaps apart:
+
+    MAGIC | u32 header length | header | structure | part 0 | part 1 | ...
+
+* ``header``: msgpack map with the byte length of ``structure``, each part's
+  length and data-URI prefix (``data:image/png;base64,``), and a free-form
+  ``meta`` map for the sender (provider, parse metadata).
+* ``structure``: zstd(msgpack(document dict)) with every base64 data URI
+  replaced by ``part:<n>``.
+* ``part n``: the decoded bitmap bytes, uncompressed (PNG/JPEG already are).
+
+Opt-in via ``DOCLING_BINARY_TRANSFER``. A client asks for it per request with
+the ``response_format=binary`` form field; a server that predates the field
+ignores it and answers with JSON, which the clients still accept.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import struct
+from typing import Any
+
+import msgspec
+import zstandard as zstd
+
+DOCLING_BINARY_CONTENT_TYPE = "application/vnd.docling-document+zstd"
+RESPONSE_FORMAT_FIELD = "response_format"
+RESPONSE_FORMAT_BINARY = "binary"
+
+_BINARY_TRANSFER_ENV = "DOCLING_BINARY_TRANSFER"
+_MAGIC = b"DLDOC1\n"
+_HEADER_LEN = struct.Struct("<I")
+_PART_PREFIX = "part:"
+_BASE64_MARKER = ";base64,"
+_URI_KEY = "uri"
+# Level 3 keeps encoding close to JSON-dump speed; the structure is small
+# once the bitmaps are split out, so higher levels buy little.
+_ZSTD_LEVEL = 3
+
+
+def binary_transfer_enabled() -> bool:
+    """Whether clients request the binary envelope (opt-in)."""
+    return os.getenv(_BINARY_TRANSFER_ENV, "").lower() in ("1", "true", "yes")
+
+
+def encode_document(document: dict[str, Any] | str | bytes, meta: dict[str, Any] | None = None) -> bytes:
+    """Serialize a DoclingDocument dict (or its JSON text) to the binary envelope.
+
+    The dict is modified in place (data URIs are swapped for part references),
+    so pass one the caller no longer needs, e.g. ``doc.model_dump(mode="json")``.
+    """
+    if not isinstance(document, dict):
+        document = msgspec.json.decode(document)
+
+    parts: list[bytes] = []
+    part_index: list[list[Any]] = []
+
+    def extract(uri: str) -> str | None:
+        head, sep, payload = uri.partition(_BASE64_MARKER)
+        if not sep or not head.startswith("data:"):
+            return None
+        raw = base64.b64decode(payload)
+        part_index.append([head + sep, len(raw)])
+        parts.append(raw)
+        return f"{_PART_PREFIX}{len(parts) - 1}"
+
+    _swap_uris(document, extract)
+    structure = zstd.ZstdCompressor(level=_ZSTD_LEVEL).compress(msgspec.msgpack.encode(document))
+    header = msgspec.msgpack.encode({
+        "structure": len(structure),
+        "parts": part_index,
+        "meta": meta or {},
+    })
+    return b"".join((_MAGIC, _HEADER_LEN.pack(len(header)), header, structure, *parts))
+
+
+def decode_document(body: bytes | bytearray | memoryview) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Inverse of :func:`encode_document`: returns ``(document dict, meta)``.
+
+    Parts are read straight out of *body* through a memoryview and re-encoded
+    as data URIs one at a time, so no JSON text of the whole document is ever
+    built. Raises ``ValueError`` on a body that is not a complete envelope.
+    """
+    view = memoryview(body)
+    if bytes(view[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError("Not a binary DoclingDocument envelope")
+    offset = len(_MAGIC)
+    if len(view) < offset + _HEADER_LEN.size:
+        raise ValueError("Truncated DoclingDocument envelope header")
+    (header_len,) = _HEADER_LEN.unpack_from(view, offset)
+    offset += _HEADER_LEN.size
+    try:
+        header = msgspec.msgpack.decode(view[offset:offset + header_len])
+    except msgspec.DecodeError as exc:
+        raise ValueError(f"Malformed DoclingDocument envelope header: {exc}") from exc
+    offset += header_len
+
+    structure_end = offset + header["structure"]
+    part_offsets: list[tuple[str, int, int]] = []
+    cursor = structure_end
+    for prefix, length in header["parts"]:
+        part_offsets.append((prefix, cursor, length))
+        cursor += length
+    if cursor != len(view):
+        raise ValueError(
+            f"DoclingDocument envelope is {len(view)} bytes, expected {cursor}"
+        )
+
+    try:
+        packed = zstd.ZstdDecompressor().decompress(view[offset:structure_end])
+        document = msgspec.msgpack.decode(packed)
+    except (zstd.ZstdError, msgspec.DecodeError) as exc:
+        raise ValueError(f"Malformed DoclingDocument envelope structure: {exc}") from exc
+    del packed
+
+    def restore(uri: str) -> str | None:
+        if not uri.startswith(_PART_PREFIX):
+            return None
+        prefix, start, length = part_offsets[int(uri[len(_PART_PREFIX):])]
+        return prefix + base64.b64encode(view[start:start + length]).decode("ascii")
+
+    _swap_uris(document, restore)
+    return document, header.get("meta") or {}
+
+
+def _swap_uris(node: Any, replace: Any) -> None:  # noqa: ANN401
+    """Walk *node* and rewrite every string ``uri`` value ``replace`` maps to non-None."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            uri = current.get(_URI_KEY)
+            if isinstance(uri, str):
+                swapped = replace(uri)
+                if swapped is not None:
+                    current[_URI_KEY] = swapped
+            stack.extend(v for v in current.values() if isinstance(v, (dict, list)))
+        elif isinstance(current, list):
+            stack.extend(v for v in current if isinstance(v, (dict, list)))
@@ -0,0 +1,287 @@
+"""Process-wide embedding model runtimes.
+
+Building an embedding model is not free: a provider SDK client with its own
+connection pool and, for the SDKs that fetch it, model metadata.
+``RetrievalService`` and ``VectorStore`` used to build one per query and per
+indexed record. Both now ask :func:`get_embedding_runtime` for the shared
+:class:`EmbeddingRuntime` of the configured model instead.
+
+A runtime is keyed by :func:`embedding_config_hash` of the selected config.
+When the hash changes (the admin picked another model or rotated a key) a new
+runtime is built beside the old one and swapped in with a single assignment;
+calls already holding the old runtime finish on it, and then its provider
+client is closed.
+
+There is one runtime per event loop, for the same reason
+``app.utils.concurrency`` keeps a semaphore per loop: the indexing consumers
+run their own loops in worker threads, and the async HTTP clients inside a
+provider SDK cannot be shared across loops. This never loads a model per
+loop: the local providers (see ``LOCAL_CPU_EMBEDDING_PROVIDERS``) build an
+``EmbeddingServerEmbeddings`` client, and the weights stay loaded once in the
+embedding server.
+
+``PIPESHUB_EMBEDDING_MAX_CONCURRENCY`` (default 16) caps in-flight calls per
+runtime. ``PIPESHUB_EMBEDDING_BATCH_SIZE`` (default 256) is the most texts a
+single provider call receives; larger ``aembed_documents`` inputs are split
+and embedded concurrently within the cap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import threading
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from langchain_core.embeddings import Embeddings
+
+from app.utils.aimodels import get_default_embedding_model, get_embedding_model
+from app.utils.logger import create_logger
+
+__all__ = [
+    "EmbeddingRuntime",
+    "current_embedding_runtime",
+    "embedding_config_hash",
+    "get_embedding_runtime",
+    "reset_embedding_runtimes",
+    "select_embedding_config",
+]
+
+logger = create_logger("embedding_runtime")
+
+ENV_MAX_CONCURRENCY = "PIPESHUB_EMBEDDING_MAX_CONCURRENCY"
+ENV_BATCH_SIZE = "PIPESHUB_EMBEDDING_BATCH_SIZE"
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_BATCH_SIZE = 256
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("Invalid %s=%r; using default %d", name, raw, default)
+        return default
+
+
+def select_embedding_config(
+    embedding_configs: list[dict[str, Any]] | None,
+) -> dict[str, Any] | None:
+    """The ``isDefault`` config, else the first; None means the built-in model."""
+    if not embedding_configs:
+        return None
+    return next((c for c in embedding_configs if c.get("isDefault")), embedding_configs[0])
+
+
+def embedding_config_hash(config: dict[str, Any] | None) -> str:
+    """Deterministic hash of everything that goes into building the model."""
+    if config is None:
+        return "default"
+    serialisable = {
+        "provider": config.get("provider"),
+        "isMultimodal": bool(config.get("isMultimodal")),
+        "configuration": config.get("configuration") or {},
+    }
+    return hashlib.sha256(
+        json.dumps(serialisable, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+class EmbeddingRuntime(Embeddings):
+    """A built embedding model plus the limits every caller on its loop shares.
+
+    Attribute reads it does not define (``model_name``, ``model``...) fall
+    through to the wrapped model, so existing ``getattr`` probes keep working.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        *,
+        config: dict[str, Any] | None = None,
+        config_hash: str = "default",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.embeddings = embeddings
+        self.config_hash = config_hash
+        self.provider: str | None = config.get("provider") if config else None
+        self.configuration: dict[str, Any] | None = (
+            config.get("configuration") if config else None
+        )
+        self.is_multimodal = bool(config.get("isMultimodal")) if config else False
+        self.batch_size = max(1, batch_size)
+        self.embedding_size: int | None = None
+        self._max_concurrency = max(1, max_concurrency)
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._probe_lock = asyncio.Lock()
+
+    def __getattr__(self, name: str) -> object:
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        async with self._slots:
+            return await self.embeddings.aembed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        if len(texts) <= self.batch_size:
+            async with self._slots:
+                return await self.embeddings.aembed_documents(texts)
+        batches = [
+            texts[start:start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(*(self.aembed_documents(batch) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    async def dimension(self) -> int:
+        """Output dimension, probed once with a throwaway query."""
+        if self.embedding_size is None:
+            async with self._probe_lock:
+                if self.embedding_size is None:
+                    self.embedding_size = len(await self.aembed_query("test"))
+        return self.embedding_size
+
+    async def aclose(self) -> None:
+        """Close the wrapped model's clients once the calls on it have finished.
+
+        Taking every slot waits out the calls in flight or already queued.
+        Models without clients of their own (``EmbeddingServerEmbeddings``
+        uses the process-wide ones) are left alone.
+        """
+        for _ in range(self._max_concurrency):
+            await self._slots.acquire()
+        try:
+            for client in _model_clients(self.embeddings):
+                close = getattr(client, "aclose", None) or getattr(client, "close", None)
+                if not callable(close):
+                    continue
+                try:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.warning("Closing embedding client %r failed: %s", client, e)
+        finally:
+            for _ in range(self._max_concurrency):
+                self._slots.release()
+
+
+def _model_clients(embeddings: Embeddings) -> list[object]:
+    """The SDK clients a langchain embeddings model built for itself.
+
+    Provider integrations keep them as ``client``/``async_client``, often as a
+    resource of the SDK client (``AsyncOpenAI().embeddings``) whose ``_client``
+    is what owns the connection pool.
+    """
+    clients: list[object] = []
+    for name in ("async_client", "client"):
+        client = getattr(embeddings, name, None)
+        if client is None:
+            continue
+        owner = getattr(client, "_client", client)
+        if not any(owner is seen for seen in clients):
+            clients.append(owner)
+    return clients
+
+
+# Keyed by loop, so a runtime goes away with the consumer loop that built it.
+_state: dict[str, "WeakKeyDictionary[asyncio.AbstractEventLoop, Any]"] = {
+    "runtimes": WeakKeyDictionary(),
+    "build_locks": WeakKeyDictionary(),
+}
+_state_lock = threading.Lock()
+# Strong references to the replaced runtimes still draining.
+_retiring: set[asyncio.Task[None]] = set()
+
+
+def _build_lock(loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+    lock = _state["build_locks"].get(loop)
+    if lock is None:
+        with _state_lock:
+            lock = _state["build_locks"].get(loop)
+            if lock is None:
+                lock = asyncio.Lock()
+                _state["build_locks"][loop] = lock
+    return lock
+
+
+async def _build_runtime(config: dict[str, Any] | None, config_hash: str) -> EmbeddingRuntime:
+    if config is None:
+        logger.info("No embedding config found; using default embedding model")
+        embeddings = await asyncio.to_thread(get_default_embedding_model)
+    else:
+        provider = config["provider"]
+        logger.info("Building embedding runtime for provider: %s", provider)
+        embeddings = await asyncio.to_thread(get_embedding_model, provider, config)
+    if embeddings is None:
+        raise ValueError("No supported embedding provider found in configuration")
+    return EmbeddingRuntime(
+        embeddings,
+        config=config,
+        config_hash=config_hash,
+        max_concurrency=_env_int(ENV_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+        batch_size=_env_int(ENV_BATCH_SIZE, DEFAULT_BATCH_SIZE),
+    )
+
+
+def current_embedding_runtime() -> EmbeddingRuntime | None:
+    """The running loop's runtime, if one has been built."""
+    return _state["runtimes"].get(asyncio.get_running_loop())
+
+
+async def get_embedding_runtime(
+    embedding_configs: list[dict[str, Any]] | None,
+) -> EmbeddingRuntime:
+    """Runtime for the ``embedding`` section of the AI models config.
+
+    Returns the running loop's runtime when its hash matches; otherwise builds
+    one (off the loop, once per loop however many callers are waiting) and
+    swaps it in.
+    """
+    config = select_embedding_config(embedding_configs)
+    config_hash = embedding_config_hash(config)
+    loop = asyncio.get_running_loop()
+
+    runtime = _state["runtimes"].get(loop)
+    if runtime is not None and runtime.config_hash == config_hash:
+        return runtime
+
+    async with _build_lock(loop):
+        runtime = _state["runtimes"].get(loop)
+        if runtime is not None and runtime.config_hash == config_hash:
+            return runtime
+        previous = runtime
+        runtime = await _build_runtime(config, config_hash)
+        with _state_lock:
+            _state["runtimes"][loop] = runtime
+        if previous is not None:
+            logger.info(
+                "Swapped embedding runtime %s -> %s", previous.config_hash, config_hash
+            )
+            task = loop.create_task(previous.aclose())
+            _retiring.add(task)
+            task.add_done_callback(_retiring.discard)
+        return runtime
+
+
+def reset_embedding_runtimes() -> None:
+    """Drop every runtime (tests)."""
+    with _state_lock:
+        _state["runtimes"] = WeakKeyDictionary()
+        _state["build_locks"] = WeakKeyDictionary()
@@ -5,10 +5,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import threading
 import time
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, TypeVar
 
+import httpx
 import openai
 from langchain_core.embeddings import Embeddings
 from langchain_openai.embeddings import OpenAIEmbeddings
@@ -21,6 +23,13 @@ from app.config.constants.ai_models import (
 )
 from app.services.base_client import parse_retry_after
 from app.services.messaging.backpressure import get_default_backpressure_coordinator
+from app.utils.embedding_wire_format import (
+    BINARY_DTYPES,
+    HEADER_COUNT,
+    HEADER_DIMENSIONS,
+    HEADER_DTYPE,
+    decode_matrix,
+)
 from app.utils.logger import create_logger
 
 if TYPE_CHECKING:
@@ -30,6 +39,10 @@ logger = create_logger("embedding_server_client")
 
 _EMBEDDING_SERVER_API_KEY = "not-needed"
 _EMBEDDING_SERVER_SERVICE_NAME = "EmbeddingServer"
+# Scheduling hints understood by the embedding server's batcher: query
+# embeddings jump ahead of queued indexing batches.
+_PRIORITY_INTERACTIVE = "interactive"
+_PRIORITY_BULK = "bulk"
 T = TypeVar("T")
 
 
@@ -62,8 +75,65 @@ def _embedding_server_timeout() -> float:
         return EMBEDDING_SERVER_REQUEST_TIMEOUT_SECONDS
 
 
+def _embedding_server_binary_dtype() -> str | None:
+    """Opt-in binary wire format (float32 / float16 / int8); None keeps JSON."""
+    raw = os.getenv("EMBEDDING_SERVER_BINARY_DTYPE")
+    if not raw:
+        return None
+    dtype = raw.strip().lower()
+    if dtype not in BINARY_DTYPES:
+        logger.warning("Invalid EMBEDDING_SERVER_BINARY_DTYPE=%r; using JSON responses", raw)
+        return None
+    return dtype
+
+
 _RETRIABLE_HTTP_STATUS_CODES = frozenset({429, 502, 503, 504})
 
+# The binary path talks to the server with httpx directly. Embedding clients
+# are built per model config, so the connection pools are shared
+# process-wide instead: one sync client, and one async client per running
+# event loop (an AsyncClient binds to the loop that first uses it).
+_shared_sync_client: dict[str, httpx.Client] = {}
+_shared_client_lock = threading.Lock()
+_shared_async_clients: "dict[asyncio.AbstractEventLoop, httpx.AsyncClient]" = {}
+
+
+def _get_shared_client() -> httpx.Client:
+    with _shared_client_lock:
+        client = _shared_sync_client.get("client")
+        if client is None or client.is_closed:
+            client = _shared_sync_client["client"] = httpx.Client()
+        return client
+
+
+def _get_shared_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _shared_async_clients.get(loop)
+    if client is not None and not client.is_closed:
+        return client
+
+    if len(_shared_async_clients) > 1:
+        for stale_loop in [lp for lp in _shared_async_clients if lp.is_closed()]:
+            _shared_async_clients.pop(stale_loop, None)
+
+    client = httpx.AsyncClient()
+    _shared_async_clients[loop] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled binary-path clients; call from service shutdown.
+
+    Closes the sync client and the async client of the running loop.
+    """
+    with _shared_client_lock:
+        client = _shared_sync_client.pop("client", None)
+    if client is not None:
+        client.close()
+    async_client = _shared_async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None and not async_client.is_closed:
+        await async_client.aclose()
+
 
 def _is_retriable_embedding_error(exc: BaseException) -> bool:
     """Return True only for transient embedding-server failures worth retrying.
@@ -77,11 +147,14 @@ def _is_retriable_embedding_error(exc: BaseException) -> bool:
             openai.APIConnectionError,
             openai.APITimeoutError,
             openai.RateLimitError,
+            httpx.TransportError,
         ),
     ):
         return True
     if isinstance(exc, openai.APIStatusError):
         return exc.status_code in _RETRIABLE_HTTP_STATUS_CODES
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRIABLE_HTTP_STATUS_CODES
     return False
 
 
@@ -100,7 +173,12 @@ def _signal_backpressure_if_rate_limited(
     of the outcome of) this call's own retry budget below — mirrors
     BaseServiceClient._request_with_retry's signal-on-every-occurrence for
     ParsingClient/DoclingClient."""
-    if coordinator is None or not isinstance(exc, openai.RateLimitError):
+    if coordinator is None:
+        return
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code != 429:
+            return
+    elif not isinstance(exc, openai.RateLimitError):
         return
     retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
     if retry_after is not None:
@@ -171,6 +249,18 @@ async def _await_with_retry(
     raise RuntimeError(f"Embedding server {operation} failed without exception")
 
 
+def _decode_binary_response(response: httpx.Response) -> list[list[float]]:
+    response.raise_for_status()
+    headers = response.headers
+    matrix = decode_matrix(
+        response.content,
+        int(headers[HEADER_COUNT]),
+        int(headers[HEADER_DIMENSIONS]),
+        headers[HEADER_DTYPE],
+    )
+    return matrix.tolist()
+
+
 class EmbeddingServerEmbeddings(Embeddings):
     """LangChain embeddings client for the local embedding server with retries."""
 
@@ -182,11 +272,15 @@ class EmbeddingServerEmbeddings(Embeddings):
         timeout: float | None = None,
         trust_remote_code: bool = False,
         backpressure_coordinator: "BackpressureCoordinator | None" = None,
+        binary_dtype: str | None = None,
     ) -> None:
         self.model = model or DEFAULT_EMBEDDING_MODEL
         self.max_retries = max_retries if max_retries is not None else _embedding_server_max_retries()
         self.timeout = timeout if timeout is not None else _embedding_server_timeout()
         self.trust_remote_code = trust_remote_code
+        self.binary_dtype = binary_dtype if binary_dtype is not None else _embedding_server_binary_dtype()
+        if self.binary_dtype is not None and self.binary_dtype not in BINARY_DTYPES:
+            raise ValueError(f"Unsupported binary_dtype: {self.binary_dtype}")
         # Falls back to the process-wide default so this shares a pause
         # signal with ParsingClient/DoclingClient in the same indexing
         # worker without every construction site needing to plumb one in.
@@ -202,9 +296,63 @@ class EmbeddingServerEmbeddings(Embeddings):
             extra_body=extra_body,
         )
 
+    def _request_body(self, priority: str) -> dict[str, Any]:
+        body: dict[str, Any] = {"priority": priority}
+        if self.trust_remote_code:
+            body["trust_remote_code"] = True
+        return body
+
+    def _binary_payload(self, texts: list[str], priority: str) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "input": texts,
+            "encoding_format": self.binary_dtype,
+            **self._request_body(priority),
+        }
+
+    def _binary_chunks(self, texts: list[str]) -> list[list[str]]:
+        # Same per-request input cap OpenAIEmbeddings applies on the JSON path.
+        size = self._inner.chunk_size
+        return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+    def _post_binary(self, texts: list[str], priority: str) -> list[list[float]]:
+        if not texts:
+            return []
+        client = _get_shared_client()
+        url = f"{_embedding_server_base_url()}/embeddings"
+        embeddings: list[list[float]] = []
+        for chunk in self._binary_chunks(texts):
+            response = client.post(
+                url, json=self._binary_payload(chunk, priority), timeout=self.timeout
+            )
+            embeddings.extend(_decode_binary_response(response))
+        return embeddings
+
+    async def _apost_binary(self, texts: list[str], priority: str) -> list[list[float]]:
+        if not texts:
+            return []
+        client = _get_shared_async_client()
+        url = f"{_embedding_server_base_url()}/embeddings"
+        embeddings: list[list[float]] = []
+        for chunk in self._binary_chunks(texts):
+            response = await client.post(
+                url, json=self._binary_payload(chunk, priority), timeout=self.timeout
+            )
+            embeddings.extend(_decode_binary_response(response))
+        return embeddings
+
+    async def _apost_binary_query(self, text: str) -> list[float]:
+        return (await self._apost_binary([text], _PRIORITY_INTERACTIVE))[0]
+
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         return _call_with_retry(
-            lambda: self._inner.embed_documents(texts),
+            lambda: (
+                self._post_binary(texts, _PRIORITY_BULK)
+                if self.binary_dtype is not None
+                else self._inner.embed_documents(
+                    texts, extra_body=self._request_body(_PRIORITY_BULK)
+                )
+            ),
             max_retries=self.max_retries,
             operation="embed_documents",
             backpressure_coordinator=self._backpressure_coordinator,
@@ -212,7 +360,13 @@ class EmbeddingServerEmbeddings(Embeddings):
 
     def embed_query(self, text: str) -> list[float]:
         return _call_with_retry(
-            lambda: self._inner.embed_query(text),
+            lambda: (
+                self._post_binary([text], _PRIORITY_INTERACTIVE)[0]
+                if self.binary_dtype is not None
+                else self._inner.embed_query(
+                    text, extra_body=self._request_body(_PRIORITY_INTERACTIVE)
+                )
+            ),
             max_retries=self.max_retries,
             operation="embed_query",
             backpressure_coordinator=self._backpressure_coordinator,
@@ -220,7 +374,13 @@ class EmbeddingServerEmbeddings(Embeddings):
 
     async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
         return await _await_with_retry(
-            lambda: self._inner.aembed_documents(texts),
+            lambda: (
+                self._apost_binary(texts, _PRIORITY_BULK)
+                if self.binary_dtype is not None
+                else self._inner.aembed_documents(
+                    texts, extra_body=self._request_body(_PRIORITY_BULK)
+                )
+            ),
             max_retries=self.max_retries,
             operation="aembed_documents",
             backpressure_coordinator=self._backpressure_coordinator,
@@ -228,7 +388,13 @@ class EmbeddingServerEmbeddings(Embeddings):
 
     async def aembed_query(self, text: str) -> list[float]:
         return await _await_with_retry(
-            lambda: self._inner.aembed_query(text),
+            lambda: (
+                self._apost_binary_query(text)
+                if self.binary_dtype is not None
+                else self._inner.aembed_query(
+                    text, extra_body=self._request_body(_PRIORITY_INTERACTIVE)
+                )
+            ),
             max_retries=self.max_retries,
             operation="aembed_query",
             backpressure_coordinator=self._backpressure_coordinator,
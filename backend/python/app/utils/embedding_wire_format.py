@@ -0,0 +1,67 @@
+"""Binary wire format shared by the embedding server and its client.
+
+A binary ``/v1/embeddings`` response is a single ``application/octet-stream``
+body holding the whole ``count x dimensions`` matrix in row-major,
+little-endian order; the shape, dtype and token usage travel in headers.
+
+* ``float32`` / ``float16``: the matrix itself.
+* ``int8``: ``count`` float32 per-row scales followed by the int8 matrix;
+  row ``i`` decodes as ``q[i] * scale[i]`` (symmetric quantization).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+HEADER_COUNT = "X-Embedding-Count"
+HEADER_DIMENSIONS = "X-Embedding-Dimensions"
+HEADER_DTYPE = "X-Embedding-Dtype"
+HEADER_PROMPT_TOKENS = "X-Embedding-Prompt-Tokens"
+
+BINARY_DTYPES: dict[str, np.dtype] = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+    "int8": np.dtype("i1"),
+}
+
+_INT8_MAX = 127.0
+
+
+def encode_matrix(embeddings: np.ndarray, dtype: str) -> bytes:
+    """Serialize a 2-D embedding matrix to the binary body for ``dtype``."""
+    target = BINARY_DTYPES.get(dtype)
+    if target is None:
+        raise ValueError(f"Unsupported binary embedding dtype: {dtype}")
+    if dtype != "int8":
+        return np.ascontiguousarray(embeddings, dtype=target).tobytes()
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(matrix).max(axis=1, initial=0.0) / _INT8_MAX
+    safe = np.where(scales > 0, scales, 1.0)
+    quantized = np.clip(np.rint(matrix / safe[:, None]), -_INT8_MAX, _INT8_MAX)
+    return scales.astype("<f4").tobytes() + quantized.astype(target).tobytes()
+
+
+def decode_matrix(body: bytes, count: int, dimensions: int, dtype: str) -> np.ndarray:
+    """Inverse of :func:`encode_matrix`; always returns a float32 matrix."""
+    source = BINARY_DTYPES.get(dtype)
+    if source is None:
+        raise ValueError(f"Unsupported binary embedding dtype: {dtype}")
+    offset = 0
+    scales = None
+    if dtype == "int8":
+        scales = np.frombuffer(body, dtype="<f4", count=count)
+        offset = scales.nbytes
+    expected = offset + count * dimensions * source.itemsize
+    if len(body) != expected:
+        raise ValueError(
+            f"Binary embedding body is {len(body)} bytes, expected {expected} "
+            f"for {count}x{dimensions} {dtype}"
+        )
+    matrix = np.frombuffer(body, dtype=source, count=count * dimensions, offset=offset)
+    matrix = matrix.reshape(count, dimensions).astype(np.float32)
+    if scales is not None:
+        matrix *= scales[:, None]
+    return matrix
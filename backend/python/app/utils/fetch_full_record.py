@@ -11,6 +11,7 @@ from app.config.constants.arangodb import CollectionNames, ProgressStatus
 from app.config.constants.service import config_node_constants
 from app.models.entities import RecordType, TicketRecord
 from app.modules.transformers.blob_storage import BlobStorage
+from app.modules.transformers.block_record_format import is_partial_record
 from app.services.graph_db.interface.graph_db_provider import IGraphDBProvider
 from app.utils.chat_helpers import collection_map, create_record_instance_from_dict, get_record
 from app.utils.logger import create_logger
@@ -198,6 +199,17 @@ async def _fetch_multiple_records_impl(
                 found_record = record
                 break
 
+        if found_record and is_partial_record(found_record):
+            # Retrieval reads only the hit frames of large block-framed records.
+            try:
+                if blob_store is None:
+                    blob_store = BlobStorage(logger=logger, config_service=graph_provider.config_service, graph_provider=graph_provider)
+                await blob_store.complete_partial_record(found_record, org_id)
+            except Exception as e:
+                logger.warning("Could not load the rest of record %s: %s", record_id, str(e))
+                not_available_ids.append(record_id)
+                continue
+
         if found_record:
             found_record["virtual_record_id"] = virtual_record_id
             await _apply_live_ticket_context_metadata(
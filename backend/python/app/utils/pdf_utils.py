@@ -5,6 +5,8 @@ page-count/batching info (e.g. the external Docling HTTP client) don't pull in
 the full conversion stack.
 """
 import os
+import threading
+from io import BytesIO
 
 import pypdfium2 as pdfium
 
@@ -23,11 +25,39 @@ def _get_page_batch_size() -> int:
 
 PAGE_BATCH_SIZE = _get_page_batch_size()
 
+# PDFium keeps global state and is not thread-safe; callers reach these
+# helpers through asyncio.to_thread, possibly several at once.
+_PDFIUM_LOCK = threading.Lock()
+
 
 def get_pdf_page_count(content: bytes) -> int:
     """Return the number of pages in a PDF binary using pypdfium2."""
-    pdf = pdfium.PdfDocument(content)
-    try:
-        return len(pdf)
-    finally:
-        pdf.close()
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(content)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def slice_pdf_pages(content: bytes, start: int, end: int) -> bytes:
+    """Return a PDF holding only pages ``start..end`` (1-based, inclusive) of *content*.
+
+    Pages before ``start`` are kept as blank 1pt placeholders rather than
+    dropped, so the sliced pages keep their original page numbers and a
+    Docling ``page_range=(start, end)`` request against the slice yields the
+    same page numbering as one against the full document.
+    """
+    with _PDFIUM_LOCK:
+        src = pdfium.PdfDocument(content)
+        out = pdfium.PdfDocument.new()
+        try:
+            for _ in range(start - 1):
+                out.new_page(1, 1)
+            out.import_pages(src, pages=list(range(start - 1, end)))
+            buf = BytesIO()
+            out.save(buf)
+            return buf.getvalue()
+        finally:
+            out.close()
+            src.close()
@@ -0,0 +1,342 @@
+"""Per-request phase timing and backend-call latency for the query service.
+
+``QueryTimingMiddleware`` (``app/api/middlewares/query_timing.py``) opens a
+:class:`QueryTimer` per HTTP request and binds it to a contextvar. Call sites
+only say which phase or backend they are in::
+
+    with phase("vector_search"):
+        results = await self.vector_db_service.query_nearest_points(...)
+
+    with backend_call("neo4j"):
+        result = await session.run(query, parameters)
+
+and never thread the timer through a signature. ``asyncio.create_task`` and
+``gather`` copy the current context, so the bridge's producer task and the
+prefetch running beside it mutate the same timer by reference. Outside a timed
+request (other services, background jobs, tests) every hook is a no-op.
+
+A phase's duration is the wall time during which at least one span of it was
+open, so twenty blob fetches running concurrently count once, not twenty
+times. Phases can overlap one another (retrieval runs beside agent setup), so
+they are not expected to sum to the request total.
+
+When the request finishes the timer:
+
+* observes ``pipeshub_query_phase_duration_seconds`` once per phase it saw;
+* logs one ``PHASE qid=... step=<phase> ms=... cum=...`` line per phase and a
+  closing ``step=total`` line, the format ``loadtest/instr/agg_phases.py``
+  reads (``PIPESHUB_QUERY_PHASE_LOG=0`` turns the lines off);
+* with ``PIPESHUB_SERVER_TIMING=1``, reports the same numbers in a
+  ``Server-Timing`` response header (see the middleware for streamed turns).
+
+Backend calls are observed individually into
+``pipeshub_backend_call_duration_seconds`` and summed per backend on the timer.
+``PIPESHUB_QUERY_TIMING=0`` disables all of it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, TypeVar
+
+from app.telemetry.modules.query_metrics import (
+    BACKEND_CALL_DURATION,
+    QUERY_PHASE_DURATION,
+)
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Awaitable, Callable
+    from types import SimpleNamespace
+
+    import aiohttp
+
+__all__ = [
+    "PHASES",
+    "QueryTimer",
+    "aiohttp_trace_config",
+    "backend_call",
+    "current_query_timer",
+    "phase",
+    "query_timing_settings",
+    "record_phase",
+    "reset_query_timer",
+    "reset_query_timing_settings",
+    "start_query_timer",
+    "timed_phase",
+]
+
+ENV_ENABLED = "PIPESHUB_QUERY_TIMING"
+ENV_PHASE_LOG = "PIPESHUB_QUERY_PHASE_LOG"
+ENV_SERVER_TIMING = "PIPESHUB_SERVER_TIMING"
+
+# In the order a chat turn usually reaches them; reports list phases this way.
+PHASES = (
+    "permission_fetch",
+    "embedding",
+    "vector_search",
+    "graph_hydrate",
+    "blob_fetch",
+    "rerank",
+    "llm_first_token",
+    "llm_total",
+)
+
+_FALSEY = ("0", "false", "no", "off")
+
+_T = TypeVar("_T")
+
+
+def _flag(name: str, *, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() not in _FALSEY
+
+
+class _Settings:
+    __slots__ = ("enabled", "phase_log", "server_timing")
+
+    def __init__(self) -> None:
+        self.enabled = _flag(ENV_ENABLED, default=True)
+        self.phase_log = _flag(ENV_PHASE_LOG, default=True)
+        self.server_timing = _flag(ENV_SERVER_TIMING, default=False)
+
+
+# A holder rather than a bare module global, as in invalidation_hooks.
+_state: dict[str, _Settings] = {"settings": _Settings()}
+
+
+def query_timing_settings() -> _Settings:
+    return _state["settings"]
+
+
+def reset_query_timing_settings() -> None:
+    """Re-read the environment (tests, or after an operator changes it)."""
+    _state["settings"] = _Settings()
+
+
+class QueryTimer:
+    """Phase and backend totals for one request."""
+
+    __slots__ = ("qid", "started", "durations", "ended_at", "backends", "_depth", "_opened_at")
+
+    def __init__(self, qid: str | None = None) -> None:
+        self.qid = qid or uuid.uuid4().hex[:12]
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        # Offset from ``started`` at which each phase last closed, for ``cum``.
+        self.ended_at: dict[str, float] = {}
+        self.backends: dict[str, list[float]] = {}
+        self._depth: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+
+    def open(self, name: str, now: float) -> None:
+        depth = self._depth.get(name, 0)
+        if depth == 0:
+            self._opened_at[name] = now
+        self._depth[name] = depth + 1
+
+    def close(self, name: str, now: float) -> None:
+        depth = self._depth.get(name, 0)
+        if depth <= 0:
+            return
+        self._depth[name] = depth - 1
+        if depth == 1:
+            opened = self._opened_at.pop(name)
+            self.durations[name] = self.durations.get(name, 0.0) + (now - opened)
+            self.ended_at[name] = now - self.started
+
+    def record(self, name: str, seconds: float) -> None:
+        """A point measurement (time to first token); the first one wins."""
+        if name in self.durations:
+            return
+        self.durations[name] = seconds
+        self.ended_at[name] = time.perf_counter() - self.started
+
+    def add_backend_call(self, backend: str, seconds: float) -> None:
+        totals = self.backends.get(backend)
+        if totals is None:
+            self.backends[backend] = [1, seconds]
+        else:
+            totals[0] += 1
+            totals[1] += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value: phases, backend sums, then the total."""
+        parts = [
+            f"{name};dur={seconds * 1000.0:.1f}"
+            for name, seconds in self._ordered_phases()
+        ]
+        parts.extend(
+            f'backend.{backend};dur={seconds * 1000.0:.1f};desc="{int(calls)} calls"'
+            for backend, (calls, seconds) in self.backends.items()
+        )
+        parts.append(f"total;dur={self.elapsed() * 1000.0:.1f}")
+        return ", ".join(parts)
+
+    def finish(self, logger: logging.Logger | None = None) -> None:
+        """Observe the phase histograms and log the PHASE lines.
+
+        A request that entered no phase (health checks, config reads) records
+        nothing, so the histograms and the log only describe query work.
+        """
+        if not self.durations:
+            return
+        total_ms = self.elapsed() * 1000.0
+        for name, seconds in self.durations.items():
+            QUERY_PHASE_DURATION.observe(name, value=seconds)
+        if logger is None or not query_timing_settings().phase_log:
+            return
+        try:
+            for name, seconds in sorted(self._ordered_phases(), key=lambda p: self.ended_at[p[0]]):
+                logger.info(
+                    "PHASE qid=%s step=%s ms=%.0f cum=%.0f",
+                    self.qid, name, seconds * 1000.0, self.ended_at[name] * 1000.0,
+                )
+            logger.info("PHASE qid=%s step=total ms=%.0f cum=%.0f", self.qid, total_ms, total_ms)
+        except Exception as e:
+            # Timing must never fail the request it describes.
+            logger.debug("PHASE log failed for qid=%s: %s", self.qid, e)
+
+    def _ordered_phases(self) -> list[tuple[str, float]]:
+        known = [(name, self.durations[name]) for name in PHASES if name in self.durations]
+        extra = [(name, sec) for name, sec in self.durations.items() if name not in PHASES]
+        return known + extra
+
+
+_current: contextvars.ContextVar[QueryTimer | None] = contextvars.ContextVar(
+    "query_timer", default=None
+)
+
+
+def start_query_timer(timer: QueryTimer) -> contextvars.Token:
+    return _current.set(timer)
+
+
+def reset_query_timer(token: contextvars.Token) -> None:
+    try:
+        _current.reset(token)
+    except (ValueError, LookupError):
+        # Token created in a different context.
+        _current.set(None)
+
+
+def current_query_timer() -> QueryTimer | None:
+    return _current.get()
+
+
+class _PhaseSpan:
+    __slots__ = ("name", "timer")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.timer: QueryTimer | None = None
+
+    def __enter__(self) -> "_PhaseSpan":
+        self.timer = _current.get()
+        if self.timer is not None:
+            self.timer.open(self.name, time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.timer is not None:
+            self.timer.close(self.name, time.perf_counter())
+
+
+class _BackendSpan:
+    __slots__ = ("backend", "timer", "started")
+
+    def __init__(self, backend: str) -> None:
+        self.backend = backend
+        self.timer: QueryTimer | None = None
+        self.started = 0.0
+
+    def __enter__(self) -> "_BackendSpan":
+        self.timer = _current.get()
+        if self.timer is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.timer is not None:
+            _observe_backend(self.timer, self.backend, time.perf_counter() - self.started)
+
+
+def _observe_backend(timer: QueryTimer, backend: str, seconds: float) -> None:
+    BACKEND_CALL_DURATION.observe(backend, value=seconds)
+    timer.add_backend_call(backend, seconds)
+
+
+def phase(name: str) -> _PhaseSpan:
+    """Context manager attributing the enclosed wall time to ``name``."""
+    return _PhaseSpan(name)
+
+
+def backend_call(backend: str) -> _BackendSpan:
+    """Context manager timing one call to ``backend``."""
+    return _BackendSpan(backend)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Record a point measurement against the current request, if any."""
+    timer = _current.get()
+    if timer is not None:
+        timer.record(name, seconds)
+
+
+def timed_phase(
+    name: str,
+) -> Callable[[Callable[..., Awaitable[_T]]], Callable[..., Awaitable[_T]]]:
+    """Decorator form of :func:`phase` for coroutine functions."""
+
+    def decorate(func: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: object, **kwargs: object) -> _T:
+            with _PhaseSpan(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def aiohttp_trace_config(backend: str) -> "aiohttp.TraceConfig":
+    """Trace hooks timing every request a session makes as a ``backend`` call.
+
+    Timed until the response headers arrive: time queued for a pooled
+    connection is included, reading the body is not.
+    """
+    import aiohttp
+
+    async def _on_start(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        timer = _current.get()
+        ctx.query_timer = timer
+        if timer is not None:
+            ctx.query_timer_started = time.perf_counter()
+
+    async def _on_end(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams | aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        timer = getattr(ctx, "query_timer", None)
+        if timer is not None:
+            _observe_backend(timer, backend, time.perf_counter() - ctx.query_timer_started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_start)
+    trace_config.on_request_end.append(_on_end)
+    trace_config.on_request_exception.append(_on_end)
+    return trace_config
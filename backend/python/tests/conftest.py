@@ -216,6 +216,17 @@ def _reset_default_backpressure_coordinator():
     set_default_backpressure_coordinator(None)
 
 
+@pytest.fixture(autouse=True)
+def _reset_embedding_runtimes():
+    """Embedding runtimes are cached process-wide per event loop (see
+    app.utils.embedding_runtime); pytest-asyncio may reuse a loop across
+    tests, so a model one test built would be handed to the next."""
+    from app.utils.embedding_runtime import reset_embedding_runtimes
+    reset_embedding_runtimes()
+    yield
+    reset_embedding_runtimes()
+
+
 @pytest.fixture
 def logger():
     """Provide a silent logger for tests."""
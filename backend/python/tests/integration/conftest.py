@@ -0,0 +1,24 @@
+"""
+Shared hooks for integration tests.
+
+Benchmarks (``*_benchmark.py``) build large synthetic corpora, run for
+minutes and some need Docker or a search cluster, so a plain ``pytest`` run
+skips them. Opt in with:
+
+  PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/<benchmark>.py -m integration -s
+"""
+
+import os
+
+import pytest
+
+ENV_RUN_BENCHMARKS = "PIPESHUB_RUN_BENCHMARKS"
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get(ENV_RUN_BENCHMARKS, "").strip().lower() in ("1", "true", "yes", "on"):
+        return
+    skip = pytest.mark.skip(reason=f"benchmark; set {ENV_RUN_BENCHMARKS}=1 to run")
+    for item in items:
+        if item.path.name.endswith("_benchmark.py"):
+            item.add_marker(skip)
@@ -0,0 +1,326 @@
+"""
+Benchmark: per-record vs. set-based ``DataSourceEntitiesProcessor.on_new_records``.
+
+Syncs ``BULK_BENCH_RECORDS`` file records (folders, record groups, user and
+group permissions, a share of external-user grants) in connector-sized
+batches through both paths, against an in-memory graph that charges
+``BULK_BENCH_LATENCY_MS`` per store call to stand in for a database round
+trip. Reports records/sec and round trips for an initial sync and an
+unchanged re-sync. Asserts only what must hold regardless of hardware: both
+paths leave the same graph behind and the bulk path makes far fewer calls.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_bulk_record_sync_benchmark.py -m integration -s
+
+Environment variables used:
+  BULK_BENCH_RECORDS     (default: 10000)
+  BULK_BENCH_BATCH       (default: 500)
+  BULK_BENCH_LATENCY_MS  (default: 0.5)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.config.constants.arangodb import CollectionNames, Connectors, OriginTypes
+from app.connectors.core.base.data_processor.data_source_entities_processor import (
+    DataSourceEntitiesProcessor,
+)
+from app.models.entities import (
+    AppUserGroup,
+    FileRecord,
+    Record,
+    RecordGroup,
+    RecordType,
+    User,
+)
+from app.models.permission import EntityType, Permission, PermissionType
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio, pytest.mark.timeout(900)]
+
+NUM_RECORDS = int(os.environ.get("BULK_BENCH_RECORDS", "10000"))
+BATCH_SIZE = int(os.environ.get("BULK_BENCH_BATCH", "500"))
+LATENCY_SECONDS = float(os.environ.get("BULK_BENCH_LATENCY_MS", "0.5")) / 1000
+ORG_ID = "org-bulk-bench"
+CONNECTOR_ID = "drive-bench"
+NUM_FOLDERS = 50
+NUM_DRIVES = 20
+NUM_USERS = 100
+NUM_GROUPS = 10
+
+
+def _edge_ends(edge: dict) -> tuple[str, str]:
+    if "_from" in edge:
+        return edge["_from"], edge["_to"]
+    return (
+        f"{edge['from_collection']}/{edge['from_id']}",
+        f"{edge['to_collection']}/{edge['to_id']}",
+    )
+
+
+class InMemoryGraphStore:
+    """The TransactionStore calls on_new_records makes, over dicts.
+
+    Edges are keyed on (_from, _to) like the providers' UPSERTs. Every call
+    awaits one simulated round trip and is counted.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict[str, dict]] = {}
+        self.edges: dict[str, dict[tuple[str, str], dict]] = {}
+        # (collection, connectorId, external id) -> _key, so the per-record
+        # path's lookups do not dominate the run with linear scans.
+        self.by_external_id: dict[tuple[str, str, str], str] = {}
+        self.round_trips = 0
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(LATENCY_SECONDS)
+
+    def _find(self, collection: str, connector_id: str, external_id: str) -> dict | None:
+        key = self.by_external_id.get((collection, connector_id, external_id))
+        return self.nodes[collection][key] if key else None
+
+    def put_node(self, collection: str, doc: dict) -> None:
+        stored = self.nodes.setdefault(collection, {}).setdefault(doc["_key"], {})
+        stored.update(doc)
+        external_id = stored.get("externalRecordId") or stored.get("externalGroupId")
+        if external_id:
+            self.by_external_id[(collection, stored.get("connectorId"), external_id)] = doc["_key"]
+
+    # ---- reads ----------------------------------------------------------
+
+    async def get_record_by_external_id(self, connector_id: str, external_id: str):
+        await self._round_trip()
+        doc = self._find(CollectionNames.RECORDS.value, connector_id, external_id)
+        return Record.from_arango_base_record(doc) if doc else None
+
+    async def get_record_group_by_external_id(self, connector_id: str, external_id: str):
+        await self._round_trip()
+        doc = self._find(CollectionNames.RECORD_GROUPS.value, connector_id, external_id)
+        return RecordGroup.from_arango_base_record_group(doc) if doc else None
+
+    async def get_user_by_email(self, email: str):
+        await self._round_trip()
+        for doc in self.nodes.get(CollectionNames.USERS.value, {}).values():
+            if doc["email"].lower() == email.lower():
+                return User.from_arango_user(doc)
+        return None
+
+    async def get_user_group_by_external_id(self, connector_id: str, external_id: str):
+        await self._round_trip()
+        doc = self._find(CollectionNames.GROUPS.value, connector_id, external_id)
+        return AppUserGroup.from_arango_base_user_group(doc) if doc else None
+
+    async def get_app_role_by_external_id(self, connector_id: str, external_id: str):
+        await self._round_trip()
+        return None
+
+    async def get_nodes_by_field_in(self, collection: str, field: str, values: list) -> list[dict]:
+        await self._round_trip()
+        wanted = set(values)
+        return [dict(doc) for doc in self.nodes.get(collection, {}).values() if doc.get(field) in wanted]
+
+    # ---- writes ---------------------------------------------------------
+
+    async def batch_upsert_records(self, records: list[Record]) -> None:
+        await self._round_trip()
+        for record in records:
+            self.put_node(CollectionNames.RECORDS.value, record.to_arango_base_record())
+            self.put_node(CollectionNames.FILES.value, record.to_arango_record())
+            key = (f"{CollectionNames.RECORDS.value}/{record.id}", f"{CollectionNames.FILES.value}/{record.id}")
+            self.edges.setdefault(CollectionNames.IS_OF_TYPE.value, {})[key] = {}
+
+    async def batch_upsert_record_groups(self, record_groups: list[RecordGroup]) -> None:
+        await self._round_trip()
+        for record_group in record_groups:
+            self.put_node(CollectionNames.RECORD_GROUPS.value, record_group.to_arango_base_record_group())
+
+    async def batch_create_edges(self, edges: list[dict], collection: str) -> None:
+        await self._round_trip()
+        for edge in edges:
+            self.edges.setdefault(collection, {})[_edge_ends(edge)] = edge
+
+    async def batch_delete_edges(self, edges: list[dict], collection: str) -> int:
+        await self._round_trip()
+        stored = self.edges.get(collection, {})
+        return sum(stored.pop(_edge_ends(edge), None) is not None for edge in edges)
+
+    async def delete_edge(self, from_id, from_collection, to_id, to_collection, collection) -> None:
+        await self._round_trip()
+        self.edges.get(collection, {}).pop((f"{from_collection}/{from_id}", f"{to_collection}/{to_id}"), None)
+
+    async def create_record_group_relation(self, record_id: str, record_group_id: str) -> None:
+        await self.batch_create_edges(
+            [{"_from": f"{CollectionNames.RECORDS.value}/{record_id}", "_to": f"{CollectionNames.RECORD_GROUPS.value}/{record_group_id}"}],
+            CollectionNames.BELONGS_TO.value,
+        )
+
+    async def create_inherit_permissions_relation_record_group(self, record_id: str, record_group_id: str) -> None:
+        await self.batch_create_edges(
+            [{"_from": f"{CollectionNames.RECORDS.value}/{record_id}", "_to": f"{CollectionNames.RECORD_GROUPS.value}/{record_group_id}"}],
+            CollectionNames.INHERIT_PERMISSIONS.value,
+        )
+
+    async def delete_inherit_permissions_relation_record_group(self, record_id: str, record_group_id: str) -> None:
+        await self.delete_edge(
+            record_id, CollectionNames.RECORDS.value, record_group_id, CollectionNames.RECORD_GROUPS.value,
+            CollectionNames.INHERIT_PERMISSIONS.value,
+        )
+
+    async def create_record_relation(self, from_record_id: str, to_record_id: str, relation_type: str) -> None:
+        await self.batch_create_edges(
+            [{
+                "_from": f"{CollectionNames.RECORDS.value}/{from_record_id}",
+                "_to": f"{CollectionNames.RECORDS.value}/{to_record_id}",
+                "relationshipType": relation_type,
+            }],
+            CollectionNames.RECORD_RELATIONS.value,
+        )
+
+    async def delete_parent_child_edge_to_record(self, record_id: str) -> int:
+        await self._round_trip()
+        stored = self.edges.get(CollectionNames.RECORD_RELATIONS.value, {})
+        target = f"{CollectionNames.RECORDS.value}/{record_id}"
+        stale = [key for key in stored if key[1] == target]
+        for key in stale:
+            del stored[key]
+        return len(stale)
+
+    # ---- comparison -----------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """The graph with generated ids replaced by external ids."""
+        names: dict[str, str] = {}
+        for collection, field in (
+            (CollectionNames.RECORDS.value, "externalRecordId"),
+            (CollectionNames.RECORD_GROUPS.value, "externalGroupId"),
+            (CollectionNames.USERS.value, "email"),
+            (CollectionNames.GROUPS.value, "externalGroupId"),
+        ):
+            for key, doc in self.nodes.get(collection, {}).items():
+                names[f"{collection}/{key}"] = f"{collection}:{doc[field]}"
+        edges = {
+            (collection, names.get(src, src), names.get(dst, dst), edge.get("relationshipType"), edge.get("role"))
+            for collection, stored in self.edges.items()
+            if collection != CollectionNames.IS_OF_TYPE.value
+            for (src, dst), edge in stored.items()
+        }
+        records = {
+            doc["externalRecordId"]: (doc["version"], doc["isPlaceholder"], names.get(f"{CollectionNames.RECORD_GROUPS.value}/{doc['recordGroupId']}"))
+            for doc in self.nodes.get(CollectionNames.RECORDS.value, {}).values()
+        }
+        return {"records": records, "edges": edges}
+
+
+class InMemoryDataStoreProvider:
+    def __init__(self, store: InMemoryGraphStore) -> None:
+        self.store = store
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self.store
+
+    async def compare_and_set_indexing_status(self, record_ids, expected, new_status):
+        return list(record_ids)
+
+
+def _seed_principals(store: InMemoryGraphStore) -> None:
+    for i in range(NUM_USERS):
+        store.put_node(CollectionNames.USERS.value, {"_key": f"u-{i}", "email": f"user{i}@example.com", "orgId": ORG_ID})
+    for i in range(NUM_GROUPS):
+        store.put_node(
+            CollectionNames.GROUPS.value,
+            {
+                "_key": f"g-{i}", "externalGroupId": f"team-{i}", "connectorId": CONNECTOR_ID,
+                "connectorName": Connectors.GOOGLE_DRIVE.value, "name": f"team-{i}", "orgId": ORG_ID,
+                "createdAtTimestamp": 0, "updatedAtTimestamp": 0,
+            },
+        )
+
+
+def _sync_batch() -> list[tuple[Record, list[Permission]]]:
+    """Folders first, then files spread over folders and shared drives."""
+    items = []
+    for i in range(NUM_RECORDS):
+        is_folder = i < NUM_FOLDERS
+        record = FileRecord(
+            org_id=ORG_ID,
+            external_record_id=f"folder-{i}" if is_folder else f"file-{i}",
+            external_revision_id="rev-1",
+            record_name=f"item-{i}",
+            origin=OriginTypes.CONNECTOR,
+            connector_name=Connectors.GOOGLE_DRIVE,
+            connector_id=CONNECTOR_ID,
+            record_type=RecordType.FILE,
+            record_group_type="DRIVE",
+            external_record_group_id=f"drive-{i % NUM_DRIVES}",
+            parent_external_record_id=None if is_folder else f"folder-{i % NUM_FOLDERS}",
+            parent_record_type=None if is_folder else RecordType.FILE,
+            version=1,
+            is_file=not is_folder,
+            extension=None if is_folder else "pdf",
+            size_in_bytes=0,
+            weburl=f"https://drive.example.com/{i}",
+            inherit_permissions=bool(i % 4),
+        )
+        permissions = [
+            Permission(email=f"user{i % NUM_USERS}@example.com", type=PermissionType.OWNER, entity_type=EntityType.USER),
+            Permission(external_id=f"team-{i % NUM_GROUPS}", type=PermissionType.READ, entity_type=EntityType.GROUP),
+        ]
+        if i % 10 == 0:
+            permissions.append(
+                Permission(email=f"guest{i % 37}@partner.example", type=PermissionType.READ, entity_type=EntityType.USER)
+            )
+        items.append((record, permissions))
+    return items
+
+
+async def _run_sync(min_batch: int) -> tuple[InMemoryGraphStore, list[dict]]:
+    store = InMemoryGraphStore()
+    _seed_principals(store)
+    processor = DataSourceEntitiesProcessor(
+        logging.getLogger("bench.bulk_records"), InMemoryDataStoreProvider(store), AsyncMock()
+    )
+    processor.org_id = ORG_ID
+    processor.bulk_records_min_batch = min_batch
+    processor.messaging_producer = AsyncMock()
+    processor.messaging_producer.send_messages = AsyncMock(side_effect=lambda topic, messages: [True] * len(messages))
+
+    passes = []
+    for label in ("initial", "re-sync"):
+        items = _sync_batch()
+        store.round_trips = 0
+        started = time.perf_counter()
+        for start in range(0, len(items), BATCH_SIZE):
+            await processor.on_new_records(items[start:start + BATCH_SIZE])
+        elapsed = time.perf_counter() - started
+        passes.append({
+            "pass": label,
+            "seconds": elapsed,
+            "records_per_sec": len(items) / elapsed,
+            "round_trips": store.round_trips,
+        })
+    return store, passes
+
+
+class TestBulkRecordSyncBenchmark:
+    async def test_bulk_path_matches_per_record_path_with_fewer_round_trips(self) -> None:
+        per_record_store, per_record = await _run_sync(min_batch=0)
+        bulk_store, bulk = await _run_sync(min_batch=1)
+
+        print(f"\n{NUM_RECORDS} records, batches of {BATCH_SIZE}, {LATENCY_SECONDS * 1000:.2f} ms per round trip")
+        for label, passes in (("per-record", per_record), ("bulk", bulk)):
+            for p in passes:
+                print(
+                    f"  {label:<10} {p['pass']:<8} {p['records_per_sec']:>10.0f} records/s "
+                    f"{p['round_trips']:>8} round trips  {p['seconds']:.2f}s"
+                )
+
+        assert bulk_store.snapshot() == per_record_store.snapshot()
+        for slow, fast in zip(per_record, bulk):
+            assert fast["round_trips"] * 20 < slow["round_trips"]
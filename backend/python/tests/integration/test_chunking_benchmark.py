@@ -0,0 +1,138 @@
+"""
+Benchmark: recall vs. vector count for each text chunking strategy.
+
+Builds a seeded fixture corpus of ``CHUNK_BENCH_BLOCKS`` text blocks, each one
+to four facts about a distinct entity mixed into shared filler sentences, and
+one query per fact. Every strategy in
+``app.modules.transformers.chunking`` cuts the corpus through the real
+``_build_text_documents`` path; hits are mapped back to their parent
+``blockId`` the way retrieval does, and block-level recall@k is reported
+beside the number of vectors the strategy would store.
+
+The default scorer is an exact term-frequency cosine, so the run is
+deterministic and needs no model. Set ``CHUNK_BENCH_EMBEDDINGS=default`` to
+embed with the configured default embedding model (embedding server) for
+numbers closer to production. Asserts only what holds for any scorer: every
+point maps back to a real block, and the strategies order by vector count.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_chunking_benchmark.py -m integration -s
+
+Environment variables used:
+  CHUNK_BENCH_BLOCKS      (default: 300)
+  CHUNK_BENCH_K           (default: 5)
+  CHUNK_BENCH_EMBEDDINGS  (default: unset = term-frequency cosine)
+"""
+
+import math
+import os
+import random
+import re
+from collections import Counter
+
+import pytest
+
+from app.models.blocks import Block
+from app.modules.transformers.chunking import ChunkingStrategy
+from app.modules.transformers.vectorstore import _build_text_documents
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+NUM_BLOCKS = int(os.environ.get("CHUNK_BENCH_BLOCKS", "300"))
+TOP_K = int(os.environ.get("CHUNK_BENCH_K", "5"))
+EMBEDDINGS = os.environ.get("CHUNK_BENCH_EMBEDDINGS", "")
+
+_SYSTEMS = ["billing", "search", "ingest", "payments", "auth", "reporting", "mobile", "gateway"]
+_RELATIONS = [
+    ("retains audit logs for", "how long does {e} retain audit logs", ["30 days", "90 days", "one year"]),
+    ("is owned by", "who owns {e}", ["the platform team", "the data team", "the edge team"]),
+    ("deploys during", "when does {e} deploy", ["the Tuesday window", "business hours", "the weekend freeze"]),
+    ("stores backups in", "where are {e} backups stored", ["the EU bucket", "cold storage", "the secondary region"]),
+    ("pages the on-call engineer after", "when is on-call paged for {e}", ["two failed checks", "five minutes of errors", "any data loss"]),
+]
+_FILLER = [
+    "This section was reviewed during the last quarterly audit.",
+    "Questions about this page go to the internal help channel.",
+    "The values below reflect the current production configuration.",
+    "Older revisions of this document are kept in the archive.",
+    "Changes to these settings require an approved change request.",
+    "Numbers here are rounded for readability.",
+]
+
+
+def _corpus(rng: random.Random) -> tuple[list[Block], list[tuple[str, str]]]:
+    blocks: list[Block] = []
+    queries: list[tuple[str, str]] = []
+    for index in range(NUM_BLOCKS):
+        entity = f"the {rng.choice(_SYSTEMS)} service {index}"
+        sentences = [rng.choice(_FILLER) for _ in range(rng.randint(4, 24))]
+        facts = rng.sample(_RELATIONS, rng.randint(1, 4))
+        for relation, _, values in facts:
+            sentences.insert(
+                rng.randrange(len(sentences) + 1),
+                f"{entity.capitalize()} {relation} {rng.choice(values)}.",
+            )
+        block = Block(index=index, type="text", format="txt", data=" ".join(sentences))
+        blocks.append(block)
+        queries.extend((question.format(e=entity) + "?", block.id) for _, question, _ in facts)
+    return blocks, queries
+
+
+def _terms(text: str) -> Counter:
+    return Counter(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _unit(counts: Counter) -> dict:
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {t: v / norm for t, v in counts.items()}
+
+
+async def _embed(texts: list[str]) -> list[dict]:
+    if EMBEDDINGS != "default":
+        return [_unit(_terms(t)) for t in texts]
+    from app.utils.aimodels import get_default_embedding_model
+
+    model = get_default_embedding_model()
+    return [dict(enumerate(v)) for v in await model.aembed_documents(texts)]
+
+
+def _top_blocks(query: dict, points: list[tuple[dict, str]], k: int) -> list[str]:
+    scored = sorted(
+        ((sum(w * vec.get(t, 0.0) for t, w in query.items()), block_id) for vec, block_id in points),
+        reverse=True,
+    )
+    seen: list[str] = []
+    for _, block_id in scored:
+        if block_id not in seen:
+            seen.append(block_id)
+        if len(seen) == k:
+            break
+    return seen
+
+
+async def test_chunking_recall_vs_vector_count() -> None:
+    rng = random.Random(7)
+    blocks, queries = _corpus(rng)
+    block_ids = {b.id for b in blocks}
+    query_vectors = await _embed([q for q, _ in queries])
+
+    results: dict[ChunkingStrategy, tuple[int, float]] = {}
+    for strategy in ChunkingStrategy:
+        docs = _build_text_documents(blocks, "vr-bench", "org-bench", "en", strategy)
+        assert {d.metadata["blockId"] for d in docs} <= block_ids
+        vectors = await _embed([d.page_content for d in docs])
+        points = [(v, d.metadata["blockId"]) for v, d in zip(vectors, docs)]
+        hits = sum(
+            gold in _top_blocks(qv, points, TOP_K)
+            for qv, (_, gold) in zip(query_vectors, queries)
+        )
+        results[strategy] = (len(docs), hits / len(queries))
+
+    print(f"\n{NUM_BLOCKS} blocks, {len(queries)} queries, recall@{TOP_K} at block level")
+    print(f"{'strategy':<16}{'vectors':>9}{'per block':>11}{'recall':>9}")
+    for strategy, (count, recall) in results.items():
+        print(f"{strategy.value:<16}{count:>9}{count / NUM_BLOCKS:>11.2f}{recall:>9.3f}")
+
+    counts = {s: c for s, (c, _) in results.items()}
+    assert counts[ChunkingStrategy.BLOCK] == NUM_BLOCKS
+    assert counts[ChunkingStrategy.BLOCK] <= counts[ChunkingStrategy.SENTENCE_WINDOW]
+    assert counts[ChunkingStrategy.SENTENCE_WINDOW] < counts[ChunkingStrategy.SENTENCE]
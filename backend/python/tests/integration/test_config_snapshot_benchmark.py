@@ -0,0 +1,133 @@
+"""
+Benchmark: per-query configuration overhead with and without the config snapshot.
+
+Stores a realistic ``AI_MODELS`` document (``CONFIG_BENCH_MODELS`` LLM and
+embedding entries) encrypted in an ``EncryptedKeyValueStore`` over an
+in-memory backend that adds ``CONFIG_BENCH_RTT_MS`` of simulated network
+round trip per read. Each "query" then makes the ``CONFIG_BENCH_READS``
+``get_config(AI_MODELS)`` calls a chat request makes (chatbot model lookup,
+RetrievalService, VectorStore) two ways: ``use_cache=False`` (the old default
+and still the forced-fresh path: round trip + decrypt + ``json.loads``) and
+the default read with a live watch (snapshot: msgpack decode of the decrypted
+value). Reports p50/p95 per query. Asserts only what holds on any hardware:
+both paths return the same document.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_config_snapshot_benchmark.py -m integration -s --timeout=600
+
+Environment variables used:
+  CONFIG_BENCH_QUERIES  (default: 2000)
+  CONFIG_BENCH_READS    (default: 3)
+  CONFIG_BENCH_MODELS   (default: 8)
+  CONFIG_BENCH_RTT_MS   (default: 0.5)
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config.configuration_service import ConfigurationService
+from app.config.constants.service import config_node_constants
+from app.config.providers.encrypted_store import EncryptedKeyValueStore
+from app.config.providers.in_memory_store import InMemoryKeyValueStore
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+NUM_QUERIES = int(os.environ.get("CONFIG_BENCH_QUERIES", "2000"))
+READS_PER_QUERY = int(os.environ.get("CONFIG_BENCH_READS", "3"))
+NUM_MODELS = int(os.environ.get("CONFIG_BENCH_MODELS", "8"))
+RTT_SECONDS = float(os.environ.get("CONFIG_BENCH_RTT_MS", "0.5")) / 1000
+AI_MODELS = config_node_constants.AI_MODELS.value
+
+
+class _RemoteStore(InMemoryKeyValueStore):
+    """In-memory backend that pays a network round trip per read."""
+
+    async def get_key(self, key: str):
+        await asyncio.sleep(RTT_SECONDS)
+        return await super().get_key(key)
+
+
+def _ai_models() -> dict:
+    def entry(kind: str, i: int) -> dict:
+        return {
+            "provider": ["openAI", "anthropic", "azureOpenAI", "bedrock"][i % 4],
+            "modelKey": f"{kind}-{i:04d}",
+            "isDefault": i == 0,
+            "isMultimodal": i % 2 == 0,
+            "configuration": {
+                "model": f"{kind}-model-{i}",
+                "apiKey": "sk-" + "x" * 48,
+                "endpoint": f"https://models.example.com/{kind}/{i}",
+                "deploymentName": f"deployment-{i}",
+                "temperature": 0.2,
+                "maxTokens": 4096,
+            },
+        }
+
+    return {
+        "llm": [entry("llm", i) for i in range(NUM_MODELS)],
+        "embedding": [entry("embedding", i) for i in range(NUM_MODELS)],
+        "ocr": [],
+        "slm": [],
+        "reasoning": [],
+        "multiModal": [],
+    }
+
+
+async def _service(monkeypatch) -> ConfigurationService:
+    monkeypatch.setenv("SECRET_KEY", os.environ.get("SECRET_KEY", "config-snapshot-benchmark"))
+    logger = logging.getLogger("config-bench")
+    backend = _RemoteStore(logger)
+    with patch.object(EncryptedKeyValueStore, "_create_store", return_value=backend):
+        store = EncryptedKeyValueStore(logger)
+    with patch.object(ConfigurationService, "_start_watch"):
+        svc = ConfigurationService(logger, store)
+    await svc.set_config(AI_MODELS, _ai_models())
+    return svc
+
+
+async def _time_queries(svc: ConfigurationService, use_cache: bool | None) -> tuple[list, object]:
+    latencies = []
+    value = None
+    for _ in range(NUM_QUERIES):
+        started = time.perf_counter()
+        for _ in range(READS_PER_QUERY):
+            value = await svc.get_config(AI_MODELS, use_cache=use_cache)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return latencies, value
+
+
+def _percentiles(samples: list) -> tuple:
+    cuts = statistics.quantiles(samples, n=20)
+    return statistics.median(samples), cuts[-1]
+
+
+class TestConfigSnapshotBenchmark:
+    async def test_snapshot_vs_store_reads(self, monkeypatch):
+        logging.disable(logging.CRITICAL)
+        try:
+            svc = await _service(monkeypatch)
+            store_us, store_value = await _time_queries(svc, use_cache=False)
+
+            svc._watch_active = True  # what a registered etcd watch / Pub/Sub subscription sets
+            snapshot_us, snapshot_value = await _time_queries(svc, use_cache=None)
+            stats = svc.snapshot_stats()
+        finally:
+            logging.disable(logging.NOTSET)
+
+        store_p50, store_p95 = _percentiles(store_us)
+        snap_p50, snap_p95 = _percentiles(snapshot_us)
+        print(
+            f"\n[config] queries={NUM_QUERIES} reads/query={READS_PER_QUERY} "
+            f"models={NUM_MODELS} rtt={RTT_SECONDS * 1000:.2f} ms\n"
+            f"  store read (decrypt+json): p50={store_p50:9.1f} us  p95={store_p95:9.1f} us per query\n"
+            f"  snapshot:                  p50={snap_p50:9.1f} us  p95={snap_p95:9.1f} us per query\n"
+            f"  snapshot stats: {stats}"
+        )
+
+        assert snapshot_value == store_value == _ai_models()
@@ -0,0 +1,119 @@
+"""
+Benchmark: peak RSS and rows/sec for in-memory vs. streaming CSV parsing.
+
+Writes a seeded synthetic export of ``CSV_BENCH_ROWS`` rows by
+``CSV_BENCH_COLS`` mixed text / number / timestamp columns (one header row,
+one table, like a warehouse export), then builds its BlocksContainer two ways:
+decode → ``read_raw_rows`` → ``find_tables_in_csv`` →
+``get_blocks_from_csv_with_multiple_tables`` (the pre-streaming path), and
+``get_blocks_from_csv_stream``. Header detection and the table summary are
+stubbed so no model is needed; row text is the simple format either way since
+the table is far above ``MAX_TABLE_ROWS_FOR_LLM``. Each mode runs in a fresh
+process so its peak RSS is its own. Asserts only what holds on any hardware:
+both modes emit the same rows.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_csv_streaming_benchmark.py -m integration -s
+
+Environment variables used:
+  CSV_BENCH_ROWS  (default: 500000)
+  CSV_BENCH_COLS  (default: 12)
+"""
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.modules.parsers.csv.csv_parser import CSVParser
+from app.modules.parsers.excel.prompt_template import CSVHeaderDetection
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio, pytest.mark.timeout(600)]
+
+NUM_ROWS = int(os.environ.get("CSV_BENCH_ROWS", "500000"))
+NUM_COLS = int(os.environ.get("CSV_BENCH_COLS", "12"))
+WORDS = ["north", "south", "retail", "wholesale", "pending", "shipped", "refund", "priority"]
+
+
+def _synthetic_csv() -> bytes:
+    rng = random.Random(20)
+    out = io.StringIO()
+    out.write(",".join(f"column_{c}" for c in range(NUM_COLS)) + "\n")
+    for r in range(NUM_ROWS):
+        cells = []
+        for c in range(NUM_COLS):
+            kind = c % 3
+            if kind == 0:
+                cells.append(" ".join(rng.sample(WORDS, 2)))
+            elif kind == 1:
+                cells.append(f"{rng.random() * 10_000:.2f}")
+            else:
+                cells.append(f"2024-01-01T{r % 24:02d}:00:00")
+        out.write(",".join(cells) + "\n")
+    return out.getvalue().encode("utf-8")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _parse(mode: str, parser: CSVParser, content: bytes):
+    if mode == "streaming":
+        return await parser.get_blocks_from_csv_stream(content, MagicMock())
+    all_rows = parser.read_raw_rows(io.StringIO(content.decode("utf-8")))
+    tables = parser.find_tables_in_csv(all_rows)
+    return await parser.get_blocks_from_csv_with_multiple_tables(tables, MagicMock())
+
+
+def _run_mode(mode: str, content: bytes, queue: multiprocessing.Queue) -> None:
+    parser = CSVParser(config_service=MagicMock())
+    parser.detect_headers_with_llm = AsyncMock(
+        return_value=CSVHeaderDetection(has_headers=True, num_header_rows=1, confidence="high", reasoning="")
+    )
+    parser.get_table_summary = AsyncMock(return_value="")
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    container = asyncio.run(_parse(mode, parser, content))
+    elapsed = time.perf_counter() - started
+    digest = hashlib.sha256()
+    for block in container.blocks:
+        digest.update(block.data["row_natural_language_text"].encode())
+    queue.put((len(container.blocks), digest.hexdigest(), elapsed, baseline, _peak_rss_mb()))
+
+
+def _measure(mode: str, content: bytes) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_mode, args=(mode, content, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+class TestCsvStreamingBenchmark:
+    async def test_streaming_vs_in_memory(self):
+        content = _synthetic_csv()
+
+        mem_rows, mem_digest, mem_s, mem_base, mem_peak = _measure("in-memory", content)
+        stream_rows, stream_digest, stream_s, stream_base, stream_peak = _measure("streaming", content)
+
+        print(
+            f"\n[csv] rows={NUM_ROWS} cols={NUM_COLS} file={len(content) / 1e6:.1f} MB\n"
+            f"  in-memory: {mem_rows / mem_s:10.0f} rows/s  peak RSS {mem_peak:8.1f} MB "
+            f"(after imports {mem_base:.1f} MB)\n"
+            f"  streaming: {stream_rows / stream_s:10.0f} rows/s  peak RSS {stream_peak:8.1f} MB "
+            f"(after imports {stream_base:.1f} MB)"
+        )
+
+        assert stream_rows == mem_rows == NUM_ROWS
+        assert stream_digest == mem_digest
@@ -0,0 +1,122 @@
+"""
+Benchmark: bytes, CPU and receiver peak RSS for JSON vs. binary DoclingDocument transfer.
+
+Parses every PDF in ``DOCLING_WIRE_BENCH_DIR`` once with the local Docling
+pipeline (``generate_picture_images=True``, as in production), then for each
+document produces both wire forms the Docling / Parsing services can send:
+``model_dump_json`` text and the ``app.utils.docling_wire_format`` envelope.
+Sender CPU is timed in this process; each receiver mode (JSON text →
+``model_validate_json``, envelope → ``decode_document`` → ``model_validate``)
+runs in a fresh process per document so its peak RSS is its own. Asserts
+only what holds on any corpus: both forms rebuild the same document.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 DOCLING_WIRE_BENCH_DIR=/path/to/pdfs pytest tests/integration/test_docling_wire_benchmark.py -m integration -s --timeout=3600
+
+Environment variables used:
+  DOCLING_WIRE_BENCH_DIR    (required: directory of large PDFs)
+  DOCLING_WIRE_BENCH_LIMIT  (default: 5, PDFs taken from the directory)
+"""
+
+import hashlib
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("docling")
+
+from docling_core.types.doc.document import DoclingDocument  # noqa: E402
+
+from app.modules.parsers.pdf.docling_processor import _parse_document_in_worker  # noqa: E402
+from app.utils.docling_wire_format import decode_document, encode_document  # noqa: E402
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+CORPUS_DIR = os.environ.get("DOCLING_WIRE_BENCH_DIR", "")
+LIMIT = int(os.environ.get("DOCLING_WIRE_BENCH_LIMIT", "5"))
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _receive(mode: str, payload_path: str, queue: multiprocessing.Queue) -> None:
+    baseline = _peak_rss_mb()
+    payload = Path(payload_path).read_bytes()
+    started = time.process_time()
+    if mode == "json":
+        doc = DoclingDocument.model_validate_json(payload)
+    else:
+        document, _ = decode_document(payload)
+        doc = DoclingDocument.model_validate(document)
+        del document
+    cpu = time.process_time() - started
+    digest = hashlib.sha256(doc.model_dump_json().encode()).hexdigest()
+    queue.put((cpu, baseline, _peak_rss_mb(), digest))
+
+
+def _measure(mode: str, payload_path: str) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_receive, args=(mode, payload_path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+@pytest.mark.skipif(not CORPUS_DIR, reason="DOCLING_WIRE_BENCH_DIR not set")
+class TestDoclingWireBenchmark:
+    async def test_binary_vs_json_transfer(self):
+        pdfs = sorted(Path(CORPUS_DIR).glob("*.pdf"))[:LIMIT]
+        assert pdfs, f"no PDFs in {CORPUS_DIR}"
+
+        totals = {"json": [0, 0.0, 0.0], "binary": [0, 0.0, 0.0]}
+        lines = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for pdf in pdfs:
+                doc = DoclingDocument.model_validate_json(
+                    _parse_document_in_worker(pdf.name, pdf.read_bytes())
+                )
+
+                started = time.process_time()
+                json_body = doc.model_dump_json().encode()
+                json_send = time.process_time() - started
+                started = time.process_time()
+                binary_body = encode_document(doc.model_dump(mode="json"))
+                binary_send = time.process_time() - started
+
+                json_path = Path(tmp, "doc.json")
+                binary_path = Path(tmp, "doc.bin")
+                json_path.write_bytes(json_body)
+                binary_path.write_bytes(binary_body)
+                json_recv, json_base, json_peak, json_digest = _measure("json", str(json_path))
+                bin_recv, bin_base, bin_peak, bin_digest = _measure("binary", str(binary_path))
+
+                assert bin_digest == json_digest, pdf.name
+                for mode, size, cpu in (
+                    ("json", len(json_body), json_send + json_recv),
+                    ("binary", len(binary_body), binary_send + bin_recv),
+                ):
+                    totals[mode][0] += size
+                    totals[mode][1] += cpu
+                totals["json"][2] = max(totals["json"][2], json_peak - json_base)
+                totals["binary"][2] = max(totals["binary"][2], bin_peak - bin_base)
+                lines.append(
+                    f"  {pdf.name[:40]:40s} json {len(json_body) / 1e6:8.1f} MB "
+                    f"cpu {json_send:.2f}+{json_recv:.2f}s peak {json_peak:7.1f} MB | "
+                    f"binary {len(binary_body) / 1e6:8.1f} MB "
+                    f"cpu {binary_send:.2f}+{bin_recv:.2f}s peak {bin_peak:7.1f} MB"
+                )
+
+        print(f"\n[docling-wire] documents={len(pdfs)} (cpu = send+receive, peak = receiver RSS)")
+        print("\n".join(lines))
+        for mode, (size, cpu, rss) in totals.items():
+            print(f"  {mode:6s} total {size / 1e6:9.1f} MB  cpu {cpu:8.2f}s  max receiver RSS growth {rss:8.1f} MB")
@@ -0,0 +1,121 @@
+"""
+Benchmark: peak RSS and rows/sec for full vs. streaming Excel ingestion.
+
+Writes a seeded synthetic workbook of ``EXCEL_BENCH_SHEETS`` sheets, each
+``EXCEL_BENCH_ROWS`` rows by ``EXCEL_BENCH_COLS`` mixed text / number / date
+columns, then builds the no-LLM SHEET → TABLE → TABLE_ROW container two ways:
+from a fully loaded openpyxl workbook (``_build_basic_block_container``) and
+from read-only row iterators (``_build_streaming_block_container``). Each mode
+runs in a fresh process so its peak RSS is its own. Asserts only what holds on
+any hardware: both modes emit the same rows.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_excel_streaming_benchmark.py -m integration -s
+
+Environment variables used:
+  EXCEL_BENCH_SHEETS  (default: 3)
+  EXCEL_BENCH_ROWS    (default: 100000)
+  EXCEL_BENCH_COLS    (default: 12)
+"""
+
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from openpyxl import Workbook
+
+from app.modules.parsers.excel.excel_parser import ExcelParser, estimate_workbook_cells
+
+# Full mode loads ~3.6M cells; well past the suite's default --timeout=30.
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio, pytest.mark.timeout(600)]
+
+NUM_SHEETS = int(os.environ.get("EXCEL_BENCH_SHEETS", "3"))
+NUM_ROWS = int(os.environ.get("EXCEL_BENCH_ROWS", "100000"))
+NUM_COLS = int(os.environ.get("EXCEL_BENCH_COLS", "12"))
+WORDS = ["north", "south", "retail", "wholesale", "pending", "shipped", "refund", "priority"]
+
+
+def _synthetic_workbook() -> bytes:
+    rng = random.Random(19)
+    wb = Workbook(write_only=True)
+    start = datetime(2024, 1, 1)  # noqa: DTZ001 - xlsx cells hold naive datetimes
+    for s in range(NUM_SHEETS):
+        ws = wb.create_sheet(f"Sheet{s + 1}")
+        ws.append([f"column_{c}" for c in range(NUM_COLS)])
+        for r in range(NUM_ROWS):
+            row = []
+            for c in range(NUM_COLS):
+                kind = c % 3
+                if kind == 0:
+                    row.append(" ".join(rng.sample(WORDS, 2)))
+                elif kind == 1:
+                    row.append(round(rng.random() * 10_000, 2))
+                else:
+                    row.append(start + timedelta(hours=r))
+            ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_mode(mode: str, content: bytes, queue: multiprocessing.Queue) -> None:
+    logging.disable(logging.CRITICAL)
+    parser = ExcelParser(logger=logging.getLogger("excel-bench"), config_service=MagicMock())
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    if mode == "full":
+        parser.load_workbook_from_binary(content)
+        container = parser._build_basic_block_container()
+        parser.workbook.close()
+    else:
+        container = parser._build_streaming_block_container(content)
+    elapsed = time.perf_counter() - started
+    digest = hashlib.sha256()
+    for block in container.blocks:
+        digest.update(block.data["row_natural_language_text"].encode())
+    queue.put((len(container.blocks), digest.hexdigest(), elapsed, baseline, _peak_rss_mb()))
+
+
+def _measure(mode: str, content: bytes) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_mode, args=(mode, content, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+class TestExcelStreamingBenchmark:
+    async def test_streaming_vs_full_load(self):
+        content = _synthetic_workbook()
+        cells = estimate_workbook_cells(content)
+
+        full_rows, full_digest, full_s, full_base, full_peak = _measure("full", content)
+        stream_rows, stream_digest, stream_s, stream_base, stream_peak = _measure("streaming", content)
+
+        print(
+            f"\n[excel] sheets={NUM_SHEETS} rows/sheet={NUM_ROWS} cols={NUM_COLS} "
+            f"file={len(content) / 1e6:.1f} MB cells~{cells}\n"
+            f"  full load: {full_rows / full_s:10.0f} rows/s  peak RSS {full_peak:8.1f} MB "
+            f"(after imports {full_base:.1f} MB)\n"
+            f"  streaming: {stream_rows / stream_s:10.0f} rows/s  peak RSS {stream_peak:8.1f} MB "
+            f"(after imports {stream_base:.1f} MB)"
+        )
+
+        assert stream_rows == full_rows == NUM_SHEETS * NUM_ROWS
+        assert stream_digest == full_digest
@@ -0,0 +1,154 @@
+"""
+Benchmark: pages/sec and peak RSS for PDF layout analysis, eager vs. sharded.
+
+Writes a seeded synthetic ``PDF_LAYOUT_BENCH_PAGES``-page PDF (two text
+columns, a ruled table, a vector chart and an embedded photo per page, so
+every page needs its raster), then runs OpenCV layout analysis three ways:
+the previous path (one thread, every page rasterized up front and held for
+the whole document), ``analyze_pages`` (one thread, rasters rendered in
+windows and released per page) and ``analyze_pages_in_pool`` (page shards on
+the layout process pool). Each mode runs in a fresh process; peak RSS is
+reported for that process and for its largest child (rasterizer / layout
+worker). Asserts only what holds on any hardware: all modes produce the same
+regions.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_pdf_layout_parallel_benchmark.py -m integration -s --timeout=600
+
+Environment variables used:
+  PDF_LAYOUT_BENCH_PAGES  (default: 48)
+  PDF_LAYOUT_WORKERS      (default: min(cpu_count, 4))
+  PDF_LAYOUT_SHARD_PAGES  (default: 4)
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+
+import pytest
+
+reportlab = pytest.importorskip("reportlab")
+
+import pdfplumber  # noqa: E402
+from PIL import Image  # noqa: E402
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.lib.utils import ImageReader  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from app.modules.parsers.pdf import opencv_layout_pool as layout_pool  # noqa: E402
+from app.modules.parsers.pdf import pdf_rasterizer  # noqa: E402
+from app.modules.parsers.pdf.opencv_layout_analyzer import (  # noqa: E402
+    DocumentRasterCache,
+    extract_layout_regions,
+)
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+NUM_PAGES = int(os.environ.get("PDF_LAYOUT_BENCH_PAGES", "48"))
+WORDS = ["quarterly", "revenue", "region", "forecast", "margin", "pipeline", "customer", "retention"]
+
+
+def _synthetic_pdf(path: str) -> None:
+    rng = random.Random(25)
+    photo = Image.frombytes(
+        "RGB", (160, 120), bytes(rng.randrange(256) for _ in range(160 * 120 * 3))
+    )
+    c = canvas.Canvas(path, pagesize=letter)
+    for n in range(1, NUM_PAGES + 1):
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(72, 740, f"Section {n}: {' '.join(rng.sample(WORDS, 3)).title()}")
+        c.setFont("Helvetica", 10)
+        for col_x in (72, 320):
+            for line in range(18):
+                c.drawString(col_x, 710 - line * 13, " ".join(rng.choices(WORDS, k=6)))
+        # Ruled 4x5 table.
+        for row in range(6):
+            c.line(72, 450 - row * 18, 540, 450 - row * 18)
+        for col in range(5):
+            c.line(72 + col * 117, 450, 72 + col * 117, 360)
+        for row in range(5):
+            for col in range(4):
+                c.drawString(78 + col * 117, 437 - row * 18, f"{rng.random() * 1000:.1f}")
+        # Bar chart and photo.
+        for bar in range(8):
+            c.rect(80 + bar * 24, 120, 16, rng.randrange(20, 180), fill=1)
+        c.drawImage(ImageReader(photo), 340, 120, width=200, height=150)
+        c.showPage()
+    c.save()
+
+
+def _peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _eager(pdf_path: str) -> list:
+    """The pre-sharding path: one render pass for the whole document, held until the end."""
+    out = []
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        raster_cache = DocumentRasterCache(pdf_path, page_count=page_count, batch_pages=page_count)
+        for page_number, page in enumerate(pdf.pages, start=1):
+            regions = extract_layout_regions(page, pdf_path=pdf_path, raster_cache=raster_cache)
+            out.append(layout_pool.ParsedPageData(page_number, float(page.width), float(page.height), regions))
+    return out
+
+
+def _run_mode(mode: str, pdf_path: str, queue: multiprocessing.Queue) -> None:
+    baseline = _peak_rss_mb(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    if mode == "eager":
+        pages = _eager(pdf_path)
+    elif mode == "windowed":
+        pages = layout_pool.analyze_pages(pdf_path)
+    else:
+        pages = asyncio.run(layout_pool.analyze_pages_in_pool(pdf_path, layout_pool.count_pages(pdf_path)))
+    elapsed = time.perf_counter() - started
+    digest = hashlib.sha256(repr(pages).encode()).hexdigest()
+    regions = sum(len(p.regions) for p in pages)
+    # Idle pool workers would otherwise block this process's exit.
+    layout_pool.shutdown_pdf_layout_pool()
+    pdf_rasterizer.shutdown_pdf_raster_pool()
+    queue.put((
+        len(pages), regions, digest, elapsed, baseline,
+        _peak_rss_mb(resource.RUSAGE_SELF), _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    ))
+
+
+def _measure(mode: str, pdf_path: str) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_mode, args=(mode, pdf_path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+class TestPdfLayoutParallelBenchmark:
+    async def test_eager_vs_windowed_vs_sharded(self, tmp_path):
+        pdf_path = str(tmp_path / "bench.pdf")
+        _synthetic_pdf(pdf_path)
+
+        results = {mode: _measure(mode, pdf_path) for mode in ("eager", "windowed", "sharded")}
+
+        lines = [
+            f"\n[pdf-layout] pages={NUM_PAGES} workers={layout_pool.PDF_LAYOUT_WORKERS} "
+            f"shard_pages={layout_pool.PDF_LAYOUT_SHARD_PAGES} file={os.path.getsize(pdf_path) / 1e6:.1f} MB"
+        ]
+        for mode, (pages, regions, _, elapsed, baseline, self_peak, child_peak) in results.items():
+            lines.append(
+                f"  {mode:8s}: {pages / elapsed:6.2f} pages/s  regions={regions:5d}  "
+                f"peak RSS {self_peak:8.1f} MB (after imports {baseline:.1f} MB, "
+                f"largest child {child_peak:.1f} MB)"
+            )
+        print("\n".join(lines))
+
+        digests = {mode: (r[0], r[2]) for mode, r in results.items()}
+        assert len(set(digests.values())) == 1, digests
+        assert results["eager"][0] == NUM_PAGES
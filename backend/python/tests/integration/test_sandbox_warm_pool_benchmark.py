@@ -0,0 +1,102 @@
+"""
+Benchmark: DockerExecutor latency for cold, warm-pool and dependency-cached runs.
+
+Runs a trivial Python snippet ``SANDBOX_BENCH_RUNS`` times three ways against
+a real Docker daemon and the sandbox image (``SANDBOX_DOCKER_IMAGE``):
+a fresh container per run (pool off, the previous behaviour), a pre-started
+container from the warm pool, and a run that also requests
+``SANDBOX_BENCH_PACKAGE`` — the first of those installs it through the egress
+network, the rest are served from the dependency cache. Reports p50/p95 per
+mode. Asserts only what holds on any host: every run succeeds and prints the
+same output.
+
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/test_sandbox_warm_pool_benchmark.py -m integration -s --timeout=600
+
+Environment variables used:
+  SANDBOX_BENCH_RUNS     (default: 10)
+  SANDBOX_BENCH_PACKAGE  (default: tabulate)
+  SANDBOX_DOCKER_IMAGE   (default: pipeshub/sandbox:latest)
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+
+docker = pytest.importorskip("docker")
+
+from app.sandbox.dependency_cache import DependencyCache  # noqa: E402
+from app.sandbox.docker_executor import DockerExecutor  # noqa: E402
+from app.sandbox.models import SANDBOX_IMAGE, SandboxLanguage  # noqa: E402
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+RUNS = int(os.environ.get("SANDBOX_BENCH_RUNS", "10"))
+PACKAGE = os.environ.get("SANDBOX_BENCH_PACKAGE", "tabulate")
+CODE = "print(sum(range(1000)))"
+
+
+def _docker_ready() -> bool:
+    try:
+        client = docker.from_env()
+        client.images.get(SANDBOX_IMAGE)
+        client.close()
+        return True
+    except Exception:
+        return False
+
+
+async def _timed_runs(executor: DockerExecutor, runs: int, packages: list[str] | None = None) -> tuple[list, list]:
+    latencies, outputs = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await executor.execute(CODE, SandboxLanguage.PYTHON, packages=packages)
+        latencies.append(time.perf_counter() - started)
+        assert result.success, result.error or result.stderr
+        outputs.append(result.stdout)
+    return latencies, outputs
+
+
+async def _wait_for_idle(executor: DockerExecutor, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while executor.warm_pool.idle_count(SandboxLanguage.PYTHON) < executor.warm_pool.size:
+        assert time.monotonic() < deadline, "warm pool never filled"
+        await asyncio.sleep(0.2)
+
+
+def _fmt(samples: list) -> str:
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+    return f"p50={statistics.median(samples) * 1000:8.0f} ms  p95={p95 * 1000:8.0f} ms"
+
+
+@pytest.mark.skipif(not _docker_ready(), reason=f"Docker daemon or image {SANDBOX_IMAGE} not available")
+class TestSandboxWarmPoolBenchmark:
+    async def test_cold_vs_warm_vs_cached(self, tmp_path):
+        cold = DockerExecutor(warm_pool_size=0, deps_cache=DependencyCache(max_entries=0))
+        cold_s, cold_out = await _timed_runs(cold, RUNS)
+        cold.close()
+
+        warm = DockerExecutor(warm_pool_size=2, deps_cache=DependencyCache(root=str(tmp_path / "deps")))
+        try:
+            await _wait_for_idle(warm)
+            warm_s, warm_out = await _timed_runs(warm, RUNS)
+            await _wait_for_idle(warm)
+            installed_s, _ = await _timed_runs(warm, 1, packages=[PACKAGE])
+            cached_s, cached_out = await _timed_runs(warm, RUNS, packages=[PACKAGE])
+            deps_stats = warm.deps_cache.stats()
+        finally:
+            warm.close()
+
+        print(
+            f"\n[sandbox] runs={RUNS} image={SANDBOX_IMAGE} package={PACKAGE}\n"
+            f"  cold container:        {_fmt(cold_s)}\n"
+            f"  warm container:        {_fmt(warm_s)}\n"
+            f"  warm + deps installed: {installed_s[0] * 1000:8.0f} ms (first request)\n"
+            f"  warm + deps cached:    {_fmt(cached_s)}\n"
+            f"  deps cache: {deps_stats}"
+        )
+
+        assert set(cold_out) == set(warm_out) == set(cached_out) == {"499500\n"}
+        assert deps_stats == {"hits": RUNS, "misses": 1}
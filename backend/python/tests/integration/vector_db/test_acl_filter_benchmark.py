@@ -0,0 +1,170 @@
+"""
+Benchmark: ACL-token filter vs. the virtualRecordId IN-list filter.
+
+Indexes ``ACL_BENCH_RECORDS`` points that one user can read through a single
+group, then runs the same dense query through both permission filters and
+reports filter size and p95 latency per provider. Asserts only what must
+hold regardless of hardware: both filters admit the same records and the
+ACL filter is a small constant size.
+
+Requires: docker compose -f deployment/docker-compose/docker-compose.integration.vector-db.yml up -d
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/vector_db/test_acl_filter_benchmark.py -m integration -s --timeout=600
+
+Environment variables used:
+  ACL_BENCH_RECORDS   (default: 20000)
+  ACL_BENCH_QUERIES   (default: 50)
+"""
+
+import json
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+from app.services.vector_db.acl import (
+    ACL_CONNECTOR_FIELD,
+    ACL_TOKENS_FIELD,
+    RecordAclPrincipals,
+    UserAclPrincipals,
+)
+from app.services.vector_db.models import HybridSearchRequest, VectorPoint
+from tests.integration.vector_db.conftest import make_collection
+from tests.integration.vector_db.helpers import DIM, make_collection_config
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+NUM_RECORDS = int(os.environ.get("ACL_BENCH_RECORDS", "20000"))
+NUM_QUERIES = int(os.environ.get("ACL_BENCH_QUERIES", "50"))
+UPSERT_BATCH = 1000
+ORG_ID = "org-acl-bench"
+CONNECTOR_ID = "drive-bench"
+LIMIT = 10
+
+
+def _bench_user() -> UserAclPrincipals:
+    return UserAclPrincipals.from_dict(
+        {
+            "userKey": "user-bench",
+            "principalIds": ["group-readers"],
+            "apps": [{"id": CONNECTOR_ID, "type": "DRIVE", "permissionModel": "RECORD_LEVEL"}],
+        },
+        org_id=ORG_ID,
+    )
+
+
+def _bench_points(rng: random.Random) -> list:
+    points = []
+    for i in range(NUM_RECORDS):
+        # Every tenth record is readable by a group the user is not in.
+        principal = "group-readers" if i % 10 else "group-other"
+        acl = RecordAclPrincipals(
+            record_id=f"rec-{i}",
+            virtual_record_id=f"vr-{i}",
+            connector_id=CONNECTOR_ID,
+            org_id=ORG_ID,
+            principal_ids=[principal],
+        )
+        points.append(
+            VectorPoint(
+                id=f"pt-{i}",
+                dense_vector=[rng.random() for _ in range(DIM)],
+                payload={
+                    "page_content": f"chunk {i}",
+                    "metadata": {
+                        "orgId": ORG_ID,
+                        "virtualRecordId": f"vr-{i}",
+                        **acl.payload_metadata(),
+                    },
+                },
+            )
+        )
+    return points
+
+
+def _p95(samples: list) -> float:
+    return statistics.quantiles(samples, n=20)[-1]
+
+
+async def _time_queries(vector_service, col, flt, queries) -> tuple:
+    latencies = []
+    hits = []
+    for query in queries:
+        started = time.perf_counter()
+        results = await vector_service.query_nearest_points(
+            col, [HybridSearchRequest(dense_query=query, filter=flt, limit=LIMIT)]
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits.append({p.payload["metadata"]["virtualRecordId"] for p in results[0]})
+    return latencies, hits
+
+
+class _AclFilterBenchmark:
+    async def test_acl_filter_vs_virtual_record_id_in_list(self, vector_service):
+        provider = vector_service.get_service_name()
+        col = make_collection(f"{provider}_aclbench")
+        rng = random.Random(7)
+        user = _bench_user()
+        points = _bench_points(rng)
+        accessible_vids = [
+            p.payload["metadata"]["virtualRecordId"]
+            for p in points
+            if "p:group-readers" in p.payload["metadata"][ACL_TOKENS_FIELD]
+        ]
+        queries = [[rng.random() for _ in range(DIM)] for _ in range(NUM_QUERIES)]
+
+        try:
+            await vector_service.create_collection(col, make_collection_config())
+            for field_name in ("metadata.orgId", "metadata.virtualRecordId",
+                               f"metadata.{ACL_CONNECTOR_FIELD}", f"metadata.{ACL_TOKENS_FIELD}"):
+                await vector_service.create_index(col, field_name, {"type": "keyword"})
+            for start in range(0, len(points), UPSERT_BATCH):
+                await vector_service.upsert_points(col, points[start:start + UPSERT_BATCH])
+
+            legacy_must = {"orgId": ORG_ID, "virtualRecordId": accessible_vids}
+            acl_must = {
+                "orgId": ORG_ID,
+                ACL_CONNECTOR_FIELD: user.connector_ids(),
+                ACL_TOKENS_FIELD: user.tokens(),
+            }
+            legacy_filter = await vector_service.filter_collection(must=legacy_must)
+            acl_filter = await vector_service.filter_collection(must=acl_must)
+
+            legacy_ms, legacy_hits = await _time_queries(vector_service, col, legacy_filter, queries)
+            acl_ms, acl_hits = await _time_queries(vector_service, col, acl_filter, queries)
+
+            legacy_bytes = len(json.dumps(legacy_must))
+            acl_bytes = len(json.dumps(acl_must))
+            print(
+                f"\n[{provider}] records={NUM_RECORDS} accessible={len(accessible_vids)} "
+                f"queries={NUM_QUERIES}\n"
+                f"  IN-list filter: {legacy_bytes:>9} bytes  p95={_p95(legacy_ms):8.2f} ms\n"
+                f"  ACL filter:     {acl_bytes:>9} bytes  p95={_p95(acl_ms):8.2f} ms"
+            )
+
+            assert acl_bytes < 1024
+            assert acl_bytes * 100 < legacy_bytes
+            for legacy, acl in zip(legacy_hits, acl_hits):
+                assert acl <= set(accessible_vids)
+                assert legacy <= set(accessible_vids)
+        finally:
+            await vector_service.delete_collection(col)
+
+
+class TestQdrantAclFilterBenchmark(_AclFilterBenchmark):
+    @pytest.fixture
+    async def vector_service(self, qdrant_service):
+        return qdrant_service
+
+
+class TestOpenSearchAclFilterBenchmark(_AclFilterBenchmark):
+    @pytest.fixture
+    async def vector_service(self, opensearch_service):
+        return opensearch_service
+
+
+class TestRedisAclFilterBenchmark(_AclFilterBenchmark):
+    @pytest.fixture
+    async def vector_service(self, redis_service):
+        return redis_service
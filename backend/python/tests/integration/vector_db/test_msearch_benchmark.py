@@ -0,0 +1,130 @@
+"""
+Benchmark: OpenSearch multi-query retrieval via _msearch vs. one _search each.
+
+Indexes ``MSEARCH_BENCH_RECORDS`` points, then answers ``MSEARCH_BENCH_CALLS``
+multi-query retrievals of ``MSEARCH_BENCH_QUERIES`` mixed dense / BM25 /
+hybrid requests two ways: through ``query_nearest_points`` (one ``_msearch``
+body) and through the previous per-request ``_search`` fan-out. Reports p50
+and p95 per call. Asserts only what must hold regardless of hardware: both
+paths return the same hits.
+
+Requires: docker compose -f deployment/docker-compose/docker-compose.integration.vector-db.yml up -d
+Run: PIPESHUB_RUN_BENCHMARKS=1 pytest tests/integration/vector_db/test_msearch_benchmark.py -m integration -s --timeout=600
+
+Environment variables used:
+  MSEARCH_BENCH_RECORDS   (default: 20000)
+  MSEARCH_BENCH_QUERIES   (default: 6)
+  MSEARCH_BENCH_CALLS     (default: 50)
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+from app.services.vector_db.models import HybridSearchRequest, VectorPoint
+from app.services.vector_db.opensearch.utils import OpenSearchUtils
+from tests.integration.vector_db.conftest import make_collection
+from tests.integration.vector_db.helpers import DIM, make_collection_config
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+NUM_RECORDS = int(os.environ.get("MSEARCH_BENCH_RECORDS", "20000"))
+QUERIES_PER_CALL = int(os.environ.get("MSEARCH_BENCH_QUERIES", "6"))
+NUM_CALLS = int(os.environ.get("MSEARCH_BENCH_CALLS", "50"))
+UPSERT_BATCH = 1000
+LIMIT = 10
+WORDS = ["invoice", "roadmap", "budget", "contract", "hiring", "launch", "incident", "review"]
+
+
+def _requests(rng: random.Random) -> list:
+    requests = []
+    for i in range(QUERIES_PER_CALL):
+        dense = [rng.random() for _ in range(DIM)]
+        text = " ".join(rng.sample(WORDS, 2))
+        kind = i % 3
+        requests.append(HybridSearchRequest(
+            dense_query=dense if kind != 1 else None,
+            text_query=text if kind != 0 else None,
+            limit=LIMIT,
+        ))
+    return requests
+
+
+async def _per_request_search(svc, col: str, requests: list) -> list:
+    """The pre-_msearch path: one ``client.search`` per request, gathered."""
+    async def one(req: HybridSearchRequest) -> list:
+        kwargs = {"index": col, "body": OpenSearchUtils.build_hybrid_query(req)}
+        if req.dense_query is not None and req.text_query is not None:
+            kwargs["params"] = {"search_pipeline": f"{col}-rrf-pipeline"}
+        result = await svc.client.search(**kwargs)
+        return [OpenSearchUtils.hit_to_search_result(h) for h in result["hits"]["hits"]]
+
+    return list(await asyncio.gather(*[one(r) for r in requests]))
+
+
+async def _time_calls(fn, calls: list) -> tuple:
+    latencies = []
+    ids = []
+    for requests in calls:
+        started = time.perf_counter()
+        results = await fn(requests)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ids.append([[p.id for p in hits] for hits in results])
+    return latencies, ids
+
+
+def _percentiles(samples: list) -> tuple:
+    cuts = statistics.quantiles(samples, n=20)
+    return statistics.median(samples), cuts[-1]
+
+
+class TestOpenSearchMsearchBenchmark:
+    async def test_msearch_vs_per_request_search(self, opensearch_service):
+        svc = opensearch_service
+        col = make_collection("os_msearchbench")
+        rng = random.Random(11)
+        points = [
+            VectorPoint(
+                id=f"pt-{i}",
+                dense_vector=[rng.random() for _ in range(DIM)],
+                payload={
+                    "page_content": " ".join(rng.sample(WORDS, 3)),
+                    "metadata": {"orgId": "org-msearch-bench"},
+                },
+            )
+            for i in range(NUM_RECORDS)
+        ]
+        calls = [_requests(rng) for _ in range(NUM_CALLS)]
+
+        try:
+            await svc.create_collection(col, make_collection_config())
+            for start in range(0, len(points), UPSERT_BATCH):
+                await svc.upsert_points(col, points[start:start + UPSERT_BATCH], refresh=True)
+
+            # Warm both paths so neither pays for cold caches or pipeline setup.
+            await svc.query_nearest_points(col, calls[0])
+            await _per_request_search(svc, col, calls[0])
+
+            gather_ms, gather_ids = await _time_calls(
+                lambda reqs: _per_request_search(svc, col, reqs), calls
+            )
+            msearch_ms, msearch_ids = await _time_calls(
+                lambda reqs: svc.query_nearest_points(col, reqs), calls
+            )
+
+            gather_p50, gather_p95 = _percentiles(gather_ms)
+            msearch_p50, msearch_p95 = _percentiles(msearch_ms)
+            print(
+                f"\n[opensearch] records={NUM_RECORDS} queries/call={QUERIES_PER_CALL} "
+                f"calls={NUM_CALLS}\n"
+                f"  per-request _search: p50={gather_p50:8.2f} ms  p95={gather_p95:8.2f} ms\n"
+                f"  _msearch:            p50={msearch_p50:8.2f} ms  p95={msearch_p95:8.2f} ms"
+            )
+
+            assert msearch_ids == gather_ids
+        finally:
+            await svc.delete_collection(col)
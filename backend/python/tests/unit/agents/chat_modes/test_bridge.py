@@ -609,6 +609,51 @@ class TestRunChatStream:
         assert captured["context"].attachment_image_blocks == collected_images
         assert captured_prefetch_kwargs["image_budget"] is captured["context"].tool_state["image_budget"]
 
+    async def test_wire_chat_mode_reaches_retrieval_precision(self) -> None:
+        """The policy name and loop mode replace `chatMode` for the agent
+        loop, but retrieval must still see the wire value: a legacy
+        `deep_research` request resolves to `INTERNAL_SEARCH_POLICY`, yet
+        its prefetch (and later retrieval tool calls) search at EXACT."""
+        from app.modules.retrieval.retrieval_service import search_precision_for_chat_mode
+        from app.services.vector_db.models import SearchPrecision
+
+        captured: dict[str, Any] = {}
+
+        async def _fake_create(self, context, llm, chat_mode, *, query, model_name="", model_key=None):
+            captured["loop_chat_mode"] = chat_mode
+            captured["tool_state"] = context.tool_state
+            agent = _stream_agent(MagicMock(success=True, error=None, output="ok"))
+            return agent, MagicMock(constraints=[]), MagicMock(constraints=[]), []
+
+        async def _fake_finalizer_run(self, *, agent_success, agent_error, event_sink, agent_output=None, streamed_answer="", reasoning_turns=None):
+            await event_sink.write({"event": "complete", "data": {"answer": agent_output}})
+            return {"answer": agent_output}
+
+        kwargs = self._base_kwargs(policy=INTERNAL_SEARCH_POLICY)
+        kwargs["query_info"] = {"query": "hello", "chatMode": "deep_research", "filters": {}}
+        kwargs["retrieval_service"].search_with_filters.return_value = {"status_code": 404}
+
+        sql_patch, slack_patch = _patch_connectors()
+        with (
+            patch(
+                "app.modules.agents.qna.chat_state.build_initial_state",
+                return_value={"org_id": "org-1", "user_id": "user-1", "query": "hello"},
+            ),
+            sql_patch,
+            slack_patch,
+            patch("app.agents.chat_modes.bridge.PipesHubAgentFactory.create", new=_fake_create),
+            patch("app.agents.chat_modes.bridge.AnswerFinalizer.run", new=_fake_finalizer_run),
+        ):
+            events = [chunk async for chunk in run_chat_stream(**kwargs)]
+
+        assert events[-1].startswith("event: complete\n")
+        search_mode = kwargs["retrieval_service"].search_with_filters.call_args.kwargs["chat_mode"]
+        assert search_mode == "deep_research"
+        assert search_precision_for_chat_mode(search_mode) is SearchPrecision.EXACT
+        assert captured["tool_state"]["search_chat_mode"] == "deep_research"
+        assert captured["tool_state"]["chat_mode"] == "internal_search"
+        assert captured["loop_chat_mode"] == INTERNAL_SEARCH_POLICY.loop_chat_mode
+
     async def test_agent_run_failure_emits_error_event(self) -> None:
         async def _fake_create(self, context, llm, chat_mode, *, query, model_name="", model_key=None):
             raise RuntimeError("transport exploded")
@@ -777,6 +822,7 @@ class TestRunChatStreamNoToolsDegradation:
 
         # `force=True` regardless of follow-up detection -- no tool exists to fall back on.
         assert mock_prefetch.call_args.kwargs["force"] is True
+        assert mock_prefetch.call_args.kwargs["chat_mode"] == "internal_search"
         event_names = [chunk.split("\n", 1)[0] for chunk in events]
         assert "event: status" in event_names
         assert event_names[-1] == "event: complete"
@@ -0,0 +1,117 @@
+"""Tests for app.api.middlewares.query_timing (the ASGI wiring)."""
+
+import pytest
+
+from app.api.middlewares.query_timing import QueryTimingMiddleware
+from app.utils import query_timing as qt
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings(monkeypatch):
+    for name in (qt.ENV_ENABLED, qt.ENV_PHASE_LOG, qt.ENV_SERVER_TIMING):
+        monkeypatch.delenv(name, raising=False)
+    qt.reset_query_timing_settings()
+    yield
+    qt.reset_query_timing_settings()
+
+
+async def _noop_receive():
+    return {"type": "http.request"}
+
+
+def _json_app(captured):
+    async def app(scope, receive, send):
+        captured["timer"] = qt.current_query_timer()
+        with qt.phase("vector_search"):
+            pass
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+def _sse_app():
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream; charset=utf-8")],
+        })
+        with qt.phase("llm_total"):
+            await send({"type": "http.response.body", "body": b"data: 1\n\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    return app
+
+
+async def _run(app):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await QueryTimingMiddleware(app)({"type": "http", "headers": []}, _noop_receive, send)
+    return sent
+
+
+class TestQueryTimingMiddleware:
+    @pytest.mark.asyncio
+    async def test_binds_a_timer_for_the_request_and_resets_it(self):
+        captured = {}
+        await _run(_json_app(captured))
+
+        assert isinstance(captured["timer"], qt.QueryTimer)
+        assert "vector_search" in captured["timer"].durations
+        assert qt.current_query_timer() is None
+
+    @pytest.mark.asyncio
+    async def test_no_server_timing_header_by_default(self):
+        sent = await _run(_json_app({}))
+
+        assert all(key != b"server-timing" for key, _ in sent[0]["headers"])
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header_when_enabled(self, monkeypatch):
+        monkeypatch.setenv(qt.ENV_SERVER_TIMING, "1")
+        qt.reset_query_timing_settings()
+
+        sent = await _run(_json_app({}))
+
+        value = dict(sent[0]["headers"])[b"server-timing"].decode()
+        assert value.startswith("vector_search;dur=")
+
+    @pytest.mark.asyncio
+    async def test_event_stream_gets_timing_as_trailing_comment(self, monkeypatch):
+        monkeypatch.setenv(qt.ENV_SERVER_TIMING, "1")
+        qt.reset_query_timing_settings()
+
+        sent = await _run(_sse_app())
+
+        assert all(key != b"server-timing" for key, _ in sent[0]["headers"])
+        assert sent[1]["body"] == b"data: 1\n\n"
+        assert sent[-1]["body"].startswith(b": server-timing llm_total;dur=")
+
+    @pytest.mark.asyncio
+    async def test_disabled_binds_no_timer(self, monkeypatch):
+        monkeypatch.setenv(qt.ENV_ENABLED, "off")
+        qt.reset_query_timing_settings()
+        captured = {}
+
+        await _run(_json_app(captured))
+
+        assert captured["timer"] is None
+
+    @pytest.mark.asyncio
+    async def test_non_http_scopes_pass_through(self):
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen["timer"] = qt.current_query_timer()
+
+        await QueryTimingMiddleware(app)({"type": "lifespan"}, _noop_receive, None)
+
+        assert seen["timer"] is None
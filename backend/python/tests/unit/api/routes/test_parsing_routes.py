@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from unittest.mock import AsyncMock, MagicMock
 
@@ -21,6 +22,7 @@ from app.services.parsing.interface import (
 from app.services.parsing.registry import ParserRegistry
 from app.services.resource_governor import Pool, ResourceGovernor
 from app.services.resource_governor.models import ResourceSnapshot
+from app.utils.docling_wire_format import DOCLING_BINARY_CONTENT_TYPE, decode_document
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -143,6 +145,48 @@ def test_parse_endpoint_with_explicit_provider() -> None:
     mock_parser.parse.assert_awaited_once()
 
 
+def test_parse_endpoint_binary_raw_document() -> None:
+    raw_document = '{"schema_name": "DoclingDocument", "pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]}'
+    registry = MagicMock(spec=ParserRegistry)
+    mock_parser = MagicMock()
+    mock_parser.parse = AsyncMock(return_value=ParseResult(
+        raw_document=raw_document,
+        provider_used=ParserProvider.DOCLING,
+        metadata={"record_name": "test.pdf"},
+    ))
+    registry.resolve = MagicMock(return_value=mock_parser)
+
+    client = TestClient(_build_app(registry))
+    response = client.post(
+        "/api/v1/parse",
+        files={"file": ("test.pdf", b"%PDF-1.4", "application/pdf")},
+        data={"extension": "pdf", "provider": "docling", "response_format": "binary"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == DOCLING_BINARY_CONTENT_TYPE
+    document, meta = decode_document(response.content)
+    assert document == json.loads(raw_document)
+    assert meta == {"provider_used": "docling", "metadata": {"record_name": "test.pdf"}}
+
+
+def test_parse_endpoint_binary_request_keeps_block_containers_json() -> None:
+    registry = MagicMock(spec=ParserRegistry)
+    mock_parser = MagicMock()
+    mock_parser.parse = AsyncMock(return_value=_ok_result())
+    registry.resolve = MagicMock(return_value=mock_parser)
+
+    client = TestClient(_build_app(registry))
+    response = client.post(
+        "/api/v1/parse",
+        files={"file": ("test.csv", b"a,b\n1,2", "text/csv")},
+        data={"extension": "csv", "provider": "default", "response_format": "binary"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["block_container"] == {"blocks": [], "block_groups": []}
+
+
 # ---------------------------------------------------------------------------
 # POST /api/v1/parse — error cases
 # ---------------------------------------------------------------------------
@@ -0,0 +1,75 @@
+"""Tests for app.config.config_snapshot.ConfigSnapshot."""
+
+from unittest.mock import patch
+
+from app.config.config_snapshot import ConfigSnapshot
+
+
+class TestLookup:
+    def test_hit_returns_private_copy(self):
+        snap = ConfigSnapshot()
+        snap.install("/ai", {"llm": [{"provider": "openai"}]}, snap.version)
+
+        found, first = snap.lookup("/ai")
+        first["llm"].append({"provider": "mutated"})
+        _, second = snap.lookup("/ai")
+
+        assert found is True
+        assert second == {"llm": [{"provider": "openai"}]}
+
+    def test_scalars_are_served_as_is(self):
+        snap = ConfigSnapshot()
+        snap["/flag"] = "on"
+
+        assert snap.lookup("/flag") == (True, "on")
+
+    def test_counts_hits_and_misses(self):
+        snap = ConfigSnapshot()
+        snap["/a"] = 1
+
+        snap.lookup("/a")
+        snap.lookup("/a")
+        snap.lookup("/b")
+
+        stats = snap.snapshot_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    def test_entries_past_max_age_are_misses(self):
+        snap = ConfigSnapshot(max_age_seconds=10)
+        with patch("app.config.config_snapshot.time.monotonic", return_value=100.0):
+            snap["/a"] = {"v": 1}
+        with patch("app.config.config_snapshot.time.monotonic", return_value=111.0):
+            assert snap.lookup("/a") == (False, None)
+
+        assert "/a" not in snap
+        assert snap.snapshot_stats()["expired"] == 1
+
+
+class TestVersioning:
+    def test_install_after_invalidation_is_dropped(self):
+        snap = ConfigSnapshot()
+        version = snap.version  # a store read starts here
+        snap.pop("/ai", None)  # watch event lands mid-read
+
+        assert snap.install("/ai", {"old": True}, version) is False
+        assert "/ai" not in snap
+
+    def test_writes_and_clears_bump_version(self):
+        snap = ConfigSnapshot()
+        start = snap.version
+        snap["/a"] = 1
+        snap.clear()
+
+        assert snap.version == start + 2
+        assert snap.snapshot_stats()["invalidations"] == 1
+
+    def test_behaves_like_a_mapping(self):
+        snap = ConfigSnapshot(maxsize=2)
+        snap["/a"] = 1
+        snap["/b"] = 2
+        snap["/c"] = 3
+
+        assert len(snap) == 2
+        assert sorted(snap) == ["/b", "/c"]
+        assert snap.pop("/b") == 2
+        assert snap.pop("/missing", "dflt") == "dflt"
@@ -146,6 +146,62 @@ class TestGetConfig:
         assert svc.cache["/services/redis"] == {"host": "localhost"}
 
 
+class TestSnapshotServing:
+    """Default reads come from the snapshot only while a watch keeps it current."""
+
+    @pytest.mark.asyncio
+    async def test_default_read_uses_store_until_watch_is_live(self):
+        store = AsyncMock()
+        store.get_key = AsyncMock(return_value={"llm": []})
+        svc = _build_service(store)
+
+        await svc.get_config("/services/aiModels")
+        await svc.get_config("/services/aiModels")
+
+        assert store.get_key.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_default_read_served_from_snapshot_with_watch(self):
+        store = AsyncMock()
+        store.get_key = AsyncMock(return_value={"llm": [{"provider": "openai"}]})
+        svc = _build_service(store)
+        svc._watch_active = True
+
+        first = await svc.get_config("/services/aiModels")
+        first["llm"].clear()
+        second = await svc.get_config("/services/aiModels")
+
+        store.get_key.assert_awaited_once()
+        assert second == {"llm": [{"provider": "openai"}]}
+        stats = svc.snapshot_stats()
+        assert (stats["hits"], stats["misses"], stats["watch_active"]) == (1, 1, True)
+
+    @pytest.mark.asyncio
+    async def test_watch_event_during_store_read_is_not_overwritten(self):
+        svc = _build_service()
+        svc._watch_active = True
+
+        async def slow_get(key):
+            # The key changes (and the watch fires) while this read is in flight.
+            svc._redis_invalidation_callback(key)
+            return "old"
+
+        svc.store.get_key = AsyncMock(side_effect=slow_get)
+
+        assert await svc.get_config("/k") == "old"
+        assert "/k" not in svc.cache
+
+    def test_broken_etcd_watch_stops_snapshot_serving(self):
+        svc = _build_service()
+        svc._watch_active = True
+        svc.cache["/a"] = 1
+
+        svc._etcd_watch_callback(RuntimeError("watch cancelled"))
+
+        assert svc._watch_active is False
+        assert len(svc.cache) == 0
+
+
 # =========================================================================
 # _get_env_fallback
 # =========================================================================
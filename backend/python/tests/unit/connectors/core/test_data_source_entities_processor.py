@@ -5242,3 +5242,242 @@ class TestPlaceholderFlag:
         assert kwargs["record_group_id"] == "rg-1"
         assert kwargs["is_placeholder"] is True
         assert kwargs["status_filters"] is None
+
+
+# ===========================================================================
+# on_new_records - set-based bulk path
+# ===========================================================================
+
+
+class TestOnNewRecordsBulk:
+    """Batches at or over ``bulk_records_min_batch`` are resolved with IN-list
+    lookups and written with one batch call per collection."""
+
+    def _setup(self, stored_docs=None, user_docs=None, group_docs=None, record_group_docs=None):
+        proc = _make_processor()
+        proc.bulk_records_min_batch = 2
+        tx_store = _make_tx_store()
+        tx_store.batch_delete_edges = AsyncMock(return_value=0)
+        by_collection = {
+            CollectionNames.USERS.value: user_docs or [],
+            CollectionNames.GROUPS.value: group_docs or [],
+            CollectionNames.RECORD_GROUPS.value: record_group_docs or [],
+        }
+
+        async def nodes_in(collection, field, values):
+            return [doc for doc in by_collection[collection] if doc.get(field) in values]
+
+        async def records_in(connector_id, external_ids):
+            return [
+                Record.from_arango_base_record(doc)
+                for doc in stored_docs or []
+                if doc["connectorId"] == connector_id and doc["externalRecordId"] in external_ids
+            ]
+
+        tx_store.get_nodes_by_field_in = AsyncMock(side_effect=nodes_in)
+        tx_store.get_records_by_external_ids = AsyncMock(side_effect=records_in)
+        proc.data_store_provider.transaction.return_value = _make_ctx(tx_store)
+        return proc, tx_store
+
+    @staticmethod
+    def _edges(tx_store, collection):
+        return [
+            edge
+            for call in tx_store.batch_create_edges.await_args_list
+            if call.kwargs["collection"] == collection
+            for edge in call.args[0]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_small_batch_keeps_the_per_record_path(self):
+        proc, tx_store = self._setup()
+        proc.bulk_records_min_batch = 3
+
+        await proc.on_new_records([(_make_record(external_record_id=f"e{i}"), []) for i in range(2)])
+
+        assert tx_store.get_record_by_external_id.await_count == 2
+        tx_store.get_records_by_external_ids.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_zero_threshold_disables_bulk(self):
+        proc, tx_store = self._setup()
+        proc.bulk_records_min_batch = 0
+
+        await proc.on_new_records([(_make_record(external_record_id=f"e{i}"), []) for i in range(5)])
+
+        tx_store.get_records_by_external_ids.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_threshold_from_env(self, monkeypatch):
+        monkeypatch.setenv(DataSourceEntitiesProcessor.ENV_BULK_RECORDS_MIN_BATCH, "50")
+        assert DataSourceEntitiesProcessor(MagicMock(), MagicMock(), AsyncMock()).bulk_records_min_batch == 50
+        monkeypatch.setenv(DataSourceEntitiesProcessor.ENV_BULK_RECORDS_MIN_BATCH, "many")
+        assert (
+            DataSourceEntitiesProcessor(MagicMock(), MagicMock(), AsyncMock()).bulk_records_min_batch
+            == DataSourceEntitiesProcessor.DEFAULT_BULK_RECORDS_MIN_BATCH
+        )
+
+    @pytest.mark.asyncio
+    async def test_new_and_changed_records_are_upserted_in_one_call(self):
+        unchanged = _make_record(external_record_id="same", external_revision_id="r1")
+        unchanged.id = "stored-same"
+        changed = _make_record(external_record_id="edit", external_revision_id="r1")
+        changed.id = "stored-edit"
+        proc, tx_store = self._setup(
+            stored_docs=[unchanged.to_arango_base_record(), changed.to_arango_base_record()]
+        )
+        batch = [
+            _make_record(external_record_id="same", external_revision_id="r1"),
+            _make_record(external_record_id="edit", external_revision_id="r2"),
+            _make_record(external_record_id="new", external_revision_id="r1"),
+        ]
+
+        await proc.on_new_records([(record, []) for record in batch])
+
+        tx_store.get_record_by_external_id.assert_not_awaited()
+        tx_store.batch_upsert_records.assert_awaited_once()
+        upserted = tx_store.batch_upsert_records.await_args.args[0]
+        assert [r.external_record_id for r in upserted] == ["edit", "new"]
+        assert batch[0].id == "stored-same"
+        assert batch[1].id == "stored-edit"
+
+    @pytest.mark.asyncio
+    async def test_stored_records_are_looked_up_per_connector(self):
+        proc, tx_store = self._setup()
+        batch = [
+            _make_record(external_record_id="a", connector_id="conn-1"),
+            _make_record(external_record_id="b", connector_id="conn-2", parent_external_record_id="folder"),
+        ]
+
+        await proc.on_new_records([(record, []) for record in batch])
+
+        assert sorted(call.args for call in tx_store.get_records_by_external_ids.await_args_list) == [
+            ("conn-1", ["a"]),
+            ("conn-2", ["b", "folder"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_records_are_published_in_input_order(self):
+        proc, _ = self._setup()
+        batch = [_make_record(external_record_id=f"e{i}") for i in range(4)]
+
+        await proc.on_new_records([(record, []) for record in batch])
+
+        messages = proc.messaging_producer.send_messages.await_args.args[1]
+        assert [key for key, _ in messages] == [record.id for record in batch]
+
+    @pytest.mark.asyncio
+    async def test_record_groups_resolved_and_missing_ones_created_once(self):
+        stored_group = RecordGroup(
+            external_group_id="space-a", name="A", group_type="DRIVE", connector_name=ConnectorsEnum.GOOGLE_MAIL, connector_id="conn-1",
+        )
+        proc, tx_store = self._setup(record_group_docs=[stored_group.to_arango_base_record_group()])
+        batch = [
+            _make_record(external_record_id="e1", external_record_group_id="space-a"),
+            _make_record(external_record_id="e2", external_record_group_id="space-b", record_group_type="DRIVE"),
+            _make_record(external_record_id="e3", external_record_group_id="space-b", record_group_type="DRIVE"),
+        ]
+
+        await proc.on_new_records([(record, []) for record in batch])
+
+        tx_store.get_record_group_by_external_id.assert_not_awaited()
+        tx_store.batch_upsert_record_groups.assert_awaited_once()
+        created = tx_store.batch_upsert_record_groups.await_args.args[0]
+        assert [group.external_group_id for group in created] == ["space-b"]
+        assert batch[0].record_group_id == stored_group.id
+        assert batch[1].record_group_id == batch[2].record_group_id == created[0].id
+        belongs_to = self._edges(tx_store, CollectionNames.BELONGS_TO.value)
+        assert {(e["from_id"], e["to_id"]) for e in belongs_to} == {
+            (record.id, record.record_group_id) for record in batch
+        }
+
+    @pytest.mark.asyncio
+    async def test_parent_in_batch_links_without_placeholder(self):
+        proc, tx_store = self._setup()
+        parent = _make_record(external_record_id="folder")
+        child = _make_record(
+            external_record_id="doc", parent_external_record_id="folder", parent_record_type=RecordType.FILE,
+        )
+
+        await proc.on_new_records([(child, []), (parent, [])])
+
+        upserted = tx_store.batch_upsert_records.await_args.args[0]
+        assert not any(record.is_placeholder for record in upserted)
+        relations = self._edges(tx_store, CollectionNames.RECORD_RELATIONS.value)
+        assert [(e["from_id"], e["to_id"], e["relationshipType"]) for e in relations] == [
+            (parent.id, child.id, RecordRelations.PARENT_CHILD.value)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_parent_gets_one_placeholder(self):
+        proc, tx_store = self._setup()
+        children = [
+            _make_record(
+                external_record_id=f"doc-{i}", parent_external_record_id="folder", parent_record_type=RecordType.FILE,
+            )
+            for i in range(3)
+        ]
+
+        await proc.on_new_records([(child, []) for child in children])
+
+        placeholders = [r for r in tx_store.batch_upsert_records.await_args.args[0] if r.is_placeholder]
+        assert len(placeholders) == 1
+        relations = self._edges(tx_store, CollectionNames.RECORD_RELATIONS.value)
+        assert {e["from_id"] for e in relations} == {placeholders[0].id}
+
+    @pytest.mark.asyncio
+    async def test_changed_parent_drops_old_edge(self):
+        stored = _make_record(external_record_id="doc", parent_external_record_id="old-folder")
+        stored.id = "stored-doc"
+        proc, tx_store = self._setup(stored_docs=[stored.to_arango_base_record()])
+        batch = [
+            _make_record(external_record_id="doc", parent_external_record_id="new-folder"),
+            _make_record(external_record_id="other"),
+        ]
+
+        await proc.on_new_records([(record, []) for record in batch])
+
+        tx_store.delete_parent_child_edge_to_record.assert_awaited_once_with("stored-doc")
+
+    @pytest.mark.asyncio
+    async def test_permission_principals_resolved_per_batch(self):
+        user = {"_key": "u-1", "email": "alice@example.com", "userId": "user-1", "orgId": "org-1"}
+        group = {
+            "_key": "g-1", "externalGroupId": "eng", "connectorId": "conn-1", "name": "eng", "orgId": "org-1",
+            "connectorName": ConnectorsEnum.GOOGLE_MAIL.value, "createdAtTimestamp": 1, "updatedAtTimestamp": 1,
+        }
+        proc, tx_store = self._setup(user_docs=[user], group_docs=[group])
+        batch = [_make_record(external_record_id=f"e{i}") for i in range(3)]
+        permissions = [
+            Permission(email="Alice@example.com", type=PermissionType.READ, entity_type=EntityType.USER),
+            Permission(external_id="eng", type=PermissionType.READ, entity_type=EntityType.GROUP),
+            Permission(email="guest@elsewhere.com", type=PermissionType.READ, entity_type=EntityType.USER),
+        ]
+
+        await proc.on_new_records([(record, permissions) for record in batch])
+
+        tx_store.get_user_group_by_external_id.assert_not_awaited()
+        # Only the email the IN-list query could not place is looked up, once.
+        tx_store.get_user_by_email.assert_awaited_once_with("guest@elsewhere.com")
+        edges = self._edges(tx_store, CollectionNames.PERMISSION.value)
+        assert len(edges) == 6
+        assert {(edge["from_id"], edge["to_id"]) for edge in edges} == {
+            (principal, record.id) for principal in ("u-1", "g-1") for record in batch
+        }
+
+    @pytest.mark.asyncio
+    async def test_typed_and_repeated_records_fall_back_to_per_record_path(self):
+        proc, tx_store = self._setup()
+        ticket = TicketRecord(
+            org_id="org-1", external_record_id="T-1", record_name="T-1", origin=OriginTypes.CONNECTOR.value,
+            connector_name=ConnectorsEnum.GOOGLE_MAIL, connector_id="conn-1", record_type=RecordType.TICKET,
+            version=1, mime_type="text/plain",
+        )
+        first = _make_record(external_record_id="dup", external_revision_id="r1")
+        repeat = _make_record(external_record_id="dup", external_revision_id="r2")
+        proc._process_record = AsyncMock(side_effect=lambda record, permissions, tx: record)
+
+        await proc.on_new_records([(ticket, []), (first, []), (repeat, [])])
+
+        assert [call.args[0] for call in proc._process_record.await_args_list] == [ticket, repeat]
+        assert tx_store.batch_upsert_records.await_args.args[0] == [first]
@@ -0,0 +1,142 @@
+"""Tests for SyncWriteScheduler — partitioned concurrent sync writes."""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config.constants.arangodb import Connectors
+from app.connectors.core.base.data_processor import sync_write_scheduler as sws
+from app.connectors.core.base.data_processor.sync_write_scheduler import (
+    SyncWriteScheduler,
+    partition_key_for,
+)
+
+
+def _deadlock() -> Exception:
+    class TransientError(Exception):
+        pass
+
+    return TransientError("{neo4j_code: Neo.TransientError.Transaction.DeadlockDetected}")
+
+
+def _scheduler(max_parallel=4) -> SyncWriteScheduler:
+    return SyncWriteScheduler(
+        Connectors.GOOGLE_DRIVE_WORKSPACE, logging.getLogger("test"), max_parallel
+    )
+
+
+def _record(group_id=None):
+    record = MagicMock()
+    record.external_record_group_id = group_id
+    return record
+
+
+class _Tracker:
+    """Records which partitions are writing at the same time."""
+
+    def __init__(self) -> None:
+        self.active: list[str] = []
+        self.peak = 0
+        self.overlaps: set[frozenset] = set()
+        self.order: list[tuple[str, int]] = []
+
+    def write(self, key: str, seq: int):
+        async def _write():
+            self.active.append(key)
+            self.peak = max(self.peak, len(self.active))
+            self.overlaps.add(frozenset(self.active))
+            self.order.append((key, seq))
+            await asyncio.sleep(0.01)
+            self.active.remove(key)
+
+        return _write
+
+
+class TestScheduling:
+    @pytest.mark.asyncio
+    async def test_same_partition_writes_are_serial_and_ordered(self):
+        scheduler = _scheduler()
+        tracker = _Tracker()
+
+        await asyncio.gather(*(scheduler.run("drive-a", tracker.write("drive-a", i)) for i in range(5)))
+
+        assert tracker.peak == 1
+        assert tracker.order == [("drive-a", i) for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_partitions_run_concurrently_up_to_the_limit(self):
+        scheduler = _scheduler(max_parallel=2)
+        tracker = _Tracker()
+
+        await asyncio.gather(*(scheduler.run(k, tracker.write(k, 0)) for k in "abcde"))
+
+        assert tracker.peak == 2
+        assert scheduler._partitions == {}
+
+    @pytest.mark.asyncio
+    async def test_deadlocked_batch_is_rerun_alone(self):
+        scheduler = _scheduler()
+        tracker = _Tracker()
+        attempts = 0
+
+        async def conflicting():
+            nonlocal attempts
+            attempts += 1
+            tracker.active.append("x")
+            tracker.overlaps.add(frozenset(tracker.active))
+            await asyncio.sleep(0.005)
+            tracker.active.remove("x")
+            if attempts == 1:
+                raise _deadlock()
+            return "written"
+
+        results = await asyncio.gather(
+            scheduler.run("x", conflicting),
+            *(scheduler.run(k, tracker.write(k, 0)) for k in "abc"),
+        )
+
+        assert results[0] == "written"
+        assert attempts == 2
+        # The rerun saw no other writer.
+        assert frozenset({"x"}) in tracker.overlaps
+
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate_without_rerun(self):
+        scheduler = _scheduler()
+        write = AsyncMock(side_effect=ValueError("bad batch"))
+
+        with pytest.raises(ValueError):
+            await scheduler.run("a", write)
+
+        write.assert_awaited_once()
+        assert scheduler._in_flight == 0
+
+
+class TestWriteRecords:
+    @pytest.mark.asyncio
+    async def test_calls_on_new_records_and_skips_empty_batches(self):
+        scheduler = _scheduler()
+        processor = MagicMock()
+        processor.on_new_records = AsyncMock()
+        batch = [(_record("drive-1"), [])]
+
+        await scheduler.write_records(processor, [])
+        await scheduler.write_records(processor, batch, partition_key="drive-1")
+
+        processor.on_new_records.assert_awaited_once_with(batch)
+
+    def test_partition_falls_back_to_record_group(self):
+        assert partition_key_for([(_record(), []), (_record("g-2"), [])]) == "g-2"
+        assert partition_key_for([(_record(), [])]) == sws.DEFAULT_PARTITION
+
+
+class TestParallelism:
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv(sws.ENV_SYNC_WRITE_PARALLELISM, "8")
+        assert _scheduler(max_parallel=None).max_parallel == 8
+
+    def test_invalid_env_uses_default(self, monkeypatch):
+        monkeypatch.setenv(sws.ENV_SYNC_WRITE_PARALLELISM, "many")
+        assert sws.sync_write_parallelism() == sws.DEFAULT_SYNC_WRITE_PARALLELISM
@@ -333,7 +333,7 @@ class TestInit:
     def test_init_defaults(self):
         conn = _make_connector()
         assert conn.batch_size == 100
-        assert conn.max_concurrent_batches == 1
+        assert conn.max_concurrent_batches == conn.write_scheduler.max_parallel
         assert conn.synced_users == []
         assert conn.admin_client is not None
         assert conn.drive_client is not None
@@ -2374,6 +2374,40 @@ class TestHandleRecordUpdates:
         conn.data_entities_processor.on_record_content_update.assert_called_once()
         conn.data_entities_processor.on_updated_record_permissions.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_writes_are_scheduled_in_the_drive_partition(self):
+        conn = _make_connector()
+        real_run = conn.write_scheduler.run
+        partitions = []
+
+        async def spy(partition_key, write):
+            partitions.append(partition_key)
+            return await real_run(partition_key, write)
+
+        conn.write_scheduler.run = spy
+        fr = MagicMock()
+        fr.record_name = "perm.txt"
+        await conn._handle_record_updates(
+            RecordUpdate(
+                record=fr, is_new=False, is_updated=True, is_deleted=False,
+                metadata_changed=False, content_changed=False, permissions_changed=True,
+                new_permissions=[],
+            ),
+            partition_key="drive-1",
+        )
+        await conn._handle_record_updates(
+            RecordUpdate(
+                record=None, is_new=False, is_updated=False, is_deleted=True,
+                metadata_changed=False, content_changed=False, permissions_changed=False,
+                external_record_id="file-1",
+            ),
+            partition_key="drive-1",
+        )
+
+        assert partitions == ["drive-1", "drive-1"]
+        conn.data_entities_processor.on_updated_record_permissions.assert_awaited_once_with(fr, [])
+        conn.data_entities_processor.on_record_deleted.assert_awaited_once_with(record_id="file-1")
+
     @pytest.mark.asyncio
     async def test_error_does_not_propagate(self):
         conn = _make_connector()
@@ -4850,3 +4884,178 @@ class TestSweepPlaceholderRecords:
         submitted = conn.data_entities_processor.on_new_records.await_args.args[0]
         assert submitted == [(stub, [])]
         assert stub.is_placeholder is True
+
+
+# ---------------------------------------------------------------------------
+# Tests: inline permissions and batched permissions.list
+# ---------------------------------------------------------------------------
+
+def _perm(perm_id, email, role="reader", perm_type="user"):
+    return {"id": perm_id, "type": perm_type, "role": role, "emailAddress": email}
+
+
+class _CountingDriveDataSource:
+    """Drive data source that counts HTTP round trips for permission lookups."""
+
+    def __init__(self, permissions_by_file, errors=None, next_page=()):
+        self.permissions_by_file = permissions_by_file
+        self.errors = errors or {}
+        self.next_page = set(next_page)
+        self.http_calls = 0
+
+    def _answer(self, fileId, pageToken=None, **_):
+        if fileId in self.errors:
+            raise self.errors[fileId]
+        result = {"permissions": self.permissions_by_file.get(fileId, [])}
+        if fileId in self.next_page and not pageToken:
+            result["nextPageToken"] = "p2"
+        return result
+
+    async def permissions_list(self, **kwargs):
+        self.http_calls += 1
+        return self._answer(**kwargs)
+
+    async def permissions_list_batch(self, requests):
+        self.http_calls += -(-len(requests) // 100)
+        results = []
+        for kwargs in requests:
+            try:
+                results.append((self._answer(**kwargs), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+
+class TestPrefetchFilePermissions:
+
+    @pytest.mark.asyncio
+    async def test_complete_inline_permissions_need_no_call(self):
+        conn = _make_connector()
+        ds = _CountingDriveDataSource({})
+        meta = _make_file_metadata(file_id="f1")
+        meta["permissionIds"] = ["p1"]
+        meta["permissions"] = [_perm("p1", "a@example.com", role="writer")]
+
+        resolved = await conn._prefetch_file_permissions([meta], "u@example.com", ds)
+
+        perms, is_fallback, _ = resolved["f1"]
+        assert ds.http_calls == 0
+        assert is_fallback is False
+        assert [(p.email, p.type) for p in perms] == [("a@example.com", PermissionType.WRITE)]
+
+    @pytest.mark.asyncio
+    async def test_missing_or_truncated_inline_permissions_are_batched(self):
+        conn = _make_connector()
+        ds = _CountingDriveDataSource({
+            "shared-drive-file": [_perm("p1", "a@example.com")],
+            "truncated": [_perm("p1", "a@example.com"), _perm("p2", "b@example.com")],
+        })
+        shared_drive_file = _make_file_metadata(file_id="shared-drive-file")
+        shared_drive_file["permissionIds"] = ["p1"]
+        truncated = _make_file_metadata(file_id="truncated")
+        truncated["permissionIds"] = ["p1", "p2"]
+        truncated["permissions"] = [_perm("p1", "a@example.com")]
+
+        resolved = await conn._prefetch_file_permissions(
+            [shared_drive_file, truncated], "u@example.com", ds
+        )
+
+        assert ds.http_calls == 1
+        assert len(resolved["truncated"][0]) == 2
+        assert len(resolved["shared-drive-file"][0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_batched_403_keeps_single_user_fallback(self):
+        conn = _make_connector()
+        error = _make_http_error(HttpStatusCode.FORBIDDEN.value)
+        error.error_details = [{"reason": "insufficientFilePermissions"}]
+        ds = _CountingDriveDataSource({}, errors={"f1": error})
+
+        resolved = await conn._prefetch_file_permissions(
+            [_make_file_metadata(file_id="f1")], "u@example.com", ds
+        )
+
+        perms, is_fallback, _ = resolved["f1"]
+        assert is_fallback is True
+        assert perms[0].email == "u@example.com"
+
+    @pytest.mark.asyncio
+    async def test_multi_page_permissions_are_left_to_fetch_permissions(self):
+        conn = _make_connector()
+        ds = _CountingDriveDataSource({"f1": [_perm("p1", "a@example.com")]}, next_page={"f1"})
+
+        resolved = await conn._prefetch_file_permissions(
+            [_make_file_metadata(file_id="f1")], "u@example.com", ds
+        )
+
+        assert "f1" not in resolved
+
+    @pytest.mark.asyncio
+    async def test_calls_per_file_before_and_after(self):
+        conn = _make_connector()
+        conn.data_entities_processor.get_record_by_external_id = AsyncMock(return_value=None)
+        conn.indexing_filters = MagicMock()
+        conn.indexing_filters.is_enabled = MagicMock(return_value=True)
+        # 150 My Drive files with inline permissions, 50 Shared Drive files without.
+        files, permissions_by_file = [], {}
+        for i in range(200):
+            meta = _make_file_metadata(file_id=f"f{i}", name=f"doc{i}.txt")
+            perms = [_perm(f"p{i}", f"user{i}@example.com")]
+            meta["permissionIds"] = [f"p{i}"]
+            if i < 150:
+                meta["permissions"] = perms
+            permissions_by_file[f"f{i}"] = perms
+            files.append(meta)
+
+        per_file = _CountingDriveDataSource(permissions_by_file)
+        for meta in files:
+            await conn._fetch_permissions(meta["id"], user_email="u@example.com", drive_data_source=per_file)
+
+        inline = _CountingDriveDataSource(permissions_by_file)
+        records = [
+            r async for r in conn._process_drive_items_generator(
+                files, "uid", "u@example.com", "drive-1", drive_data_source=inline
+            )
+        ]
+
+        assert len(records) == 200
+        assert per_file.http_calls / len(files) == 1.0
+        assert inline.http_calls / len(files) == 0.005
+        assert all(len(perms) == 1 for _, perms, _ in records)
+
+
+class TestPermissionsListBatch:
+
+    @pytest.mark.asyncio
+    async def test_splits_at_100_and_keeps_request_order(self):
+        from app.sources.external.google.drive.drive import GoogleDriveDataSource
+
+        executed = []
+
+        class _Batch:
+            def __init__(self, callback):
+                self.callback, self.calls = callback, []
+
+            def add(self, request, request_id):
+                self.calls.append((request_id, request))
+
+            def execute(self):
+                executed.append(len(self.calls))
+                for request_id, request in reversed(self.calls):
+                    if request["fileId"] == "bad":
+                        self.callback(request_id, None, ValueError("denied"))
+                    else:
+                        self.callback(request_id, {"permissions": [request["fileId"]]}, None)
+
+        client = MagicMock()
+        client.new_batch_http_request = lambda callback: _Batch(callback)
+        client.permissions.return_value.list = lambda **kwargs: kwargs
+        ds = GoogleDriveDataSource(client)
+
+        ids = [f"f{i}" for i in range(150)] + ["bad"]
+        results = await ds.permissions_list_batch([{"fileId": i, "pageToken": None} for i in ids])
+
+        assert executed == [100, 51]
+        assert results[0] == ({"permissions": ["f0"]}, None)
+        assert results[149][0] == {"permissions": ["f149"]}
+        assert isinstance(results[150][1], ValueError)
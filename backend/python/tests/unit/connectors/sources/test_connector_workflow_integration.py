@@ -278,6 +278,16 @@ class MockTransactionStore:
             self._s.upsert_node(collection, node)
         return True
 
+    async def get_nodes_by_field_in(
+        self, collection: str, field: str, values: List[Any], return_fields: Optional[List[str]] = None
+    ) -> List[Dict]:
+        wanted = set(values)
+        return [
+            dict(doc)
+            for doc in self._s.collections.get(collection, {}).values()
+            if doc.get(field) in wanted
+        ]
+
     # -- record groups ---
 
     async def get_record_group_by_external_id(self, connector_id: str, external_id: str) -> Optional[RecordGroup]:
@@ -449,6 +459,14 @@ class MockTransactionStore:
                           to_collection: str, collection: str) -> bool:
         return self._s.delete_edge(collection, from_id, from_collection, to_id, to_collection)
 
+    async def batch_delete_edges(self, edges: List[Dict], collection: str) -> int:
+        return sum(
+            self._s.delete_edge(
+                collection, e["from_id"], e["from_collection"], e["to_id"], e["to_collection"]
+            )
+            for e in edges
+        )
+
     async def delete_edges_by_relationship_types(
         self, from_id: str, from_collection: str, collection: str, relationship_types: List[str]
     ) -> int:
@@ -0,0 +1,175 @@
+"""Tests for Microsoft Graph $batch support (msgraph_batch + MSGraphClient).
+
+Requests go through a real GraphServiceClient/kiota stack into an in-process
+mock Graph server (httpx.MockTransport), so the HTTP call counts below are
+what the connectors would send.
+"""
+
+import json
+import logging
+import re
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from aiolimiter import AsyncLimiter
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from msgraph import GraphRequestAdapter, GraphServiceClient
+
+from app.connectors.sources.microsoft.common import msgraph_batch
+from app.connectors.sources.microsoft.common.msgraph_batch import (
+    BatchSubRequest,
+    GraphBatcher,
+)
+from app.connectors.sources.microsoft.common.msgraph_client import MSGraphClient
+
+logger = logging.getLogger("test_msgraph_batch")
+
+_ITEM = re.compile(r"^/(?:v1\.0/)?drives/(?P<drive>[^/]+)/items/(?P<item>[^/]+)(?P<perms>/permissions)?$")
+
+
+class MockGraph:
+    """Answers drive item and permission GETs, directly or inside $batch."""
+
+    def __init__(self) -> None:
+        self.http_calls = 0
+        self.throttle_once: set[str] = set()
+        self.fail: set[str] = set()
+        self.paged: set[str] = set()
+
+    def answer(self, path: str) -> tuple[int, dict, dict]:
+        match = _ITEM.match(path)
+        if not match:
+            return 404, {}, {"error": {"code": "itemNotFound", "message": "not found"}}
+        item = match["item"]
+        if item in self.fail:
+            return 403, {}, {"error": {"code": "accessDenied", "message": "denied"}}
+        if match["perms"]:
+            body = {"value": [{"id": f"p-{item}", "roles": ["write"],
+                               "grantedToV2": {"user": {"id": f"u-{item}", "email": f"{item}@x.com"}}}]}
+            if item in self.paged:
+                body["@odata.nextLink"] = (
+                    f"https://graph.microsoft.com/v1.0/drives/{match['drive']}/items/{item}/permissions?page=2"
+                )
+            return 200, {}, body
+        return 200, {}, {"id": item, "@microsoft.graph.downloadUrl": f"https://dl/{item}"}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.http_calls += 1
+        if request.url.path.endswith("/$batch"):
+            responses = []
+            for sub in json.loads(request.content)["requests"]:
+                if sub["id"] in self.throttle_once:
+                    self.throttle_once.discard(sub["id"])
+                    responses.append({"id": sub["id"], "status": 429, "headers": {"Retry-After": "2"},
+                                      "body": {"error": {"code": "TooManyRequests", "message": "slow down"}}})
+                    continue
+                status, headers, body = self.answer(sub["url"])
+                responses.append({"id": sub["id"], "status": status, "headers": headers, "body": body})
+            return httpx.Response(200, json={"responses": responses})
+        status, headers, body = self.answer(request.url.path)
+        if request.url.params.get("page"):
+            body = {"value": [{"id": "p-extra", "roles": ["read"]}]}
+        return httpx.Response(status, json=body, headers=headers)
+
+
+@pytest.fixture
+def graph():
+    return MockGraph()
+
+
+@pytest.fixture
+def client(graph):
+    adapter = GraphRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        client=httpx.AsyncClient(transport=httpx.MockTransport(graph.handler)),
+    )
+    return MSGraphClient("ONEDRIVE", "connector-1", GraphServiceClient(request_adapter=adapter), logger, 1000)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch.object(msgraph_batch.asyncio, "sleep", new=AsyncMock()) as sleep:
+        yield sleep
+
+
+class TestGraphBatcher:
+    @pytest.mark.asyncio
+    async def test_splits_into_calls_of_twenty(self, graph, client):
+        requests = [BatchSubRequest(id=str(i), url=f"/drives/d/items/i{i}") for i in range(45)]
+
+        responses = await client.batcher.execute(requests)
+
+        assert graph.http_calls == 3
+        assert set(responses) == {str(i) for i in range(45)}
+        assert all(r.ok for r in responses.values())
+
+    @pytest.mark.asyncio
+    async def test_only_throttled_sub_requests_are_resent_after_retry_after(self, graph, client, no_sleep):
+        graph.throttle_once = {"3", "7"}
+        requests = [BatchSubRequest(id=str(i), url=f"/drives/d/items/i{i}") for i in range(10)]
+
+        responses = await client.batcher.execute(requests)
+
+        assert graph.http_calls == 2
+        assert all(r.ok for r in responses.values())
+        no_sleep.assert_awaited_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, no_sleep):
+        adapter = AsyncMock()
+        adapter.send_primitive_async.return_value = json.dumps(
+            {"responses": [{"id": "a", "status": 429, "headers": {"Retry-After": "1"}}]}
+        ).encode()
+        batcher = GraphBatcher(adapter, AsyncLimiter(100, 1), logger, max_retries=2)
+
+        responses = await batcher.execute([BatchSubRequest(id="a", url="/me")])
+
+        assert responses["a"].status == 429
+        assert adapter.send_primitive_async.await_count == 3
+
+
+class TestGetDriveItemsDetails:
+    @pytest.mark.asyncio
+    async def test_returns_permissions_and_download_urls(self, client):
+        details = await client.get_drive_items_details("d", ["f1", "folder"], download_url_ids=["f1"])
+
+        assert details["f1"].download_url == "https://dl/f1"
+        assert details["folder"].download_url is None
+        assert details["f1"].permissions[0].granted_to_v2.user.id == "u-f1"
+        assert details["f1"].permissions[0].roles == ["write"]
+
+    @pytest.mark.asyncio
+    async def test_failed_sub_requests_match_per_item_behaviour(self, graph, client):
+        graph.fail = {"f2"}
+
+        details = await client.get_drive_items_details("d", ["f1", "f2"], download_url_ids=["f1", "f2"])
+
+        assert details["f2"].permissions == []
+        assert details["f2"].download_url is None
+        assert details["f1"].download_url == "https://dl/f1"
+
+    @pytest.mark.asyncio
+    async def test_paged_permissions_are_completed_per_item(self, graph, client):
+        graph.paged = {"f1"}
+
+        details = await client.get_drive_items_details("d", ["f1"])
+
+        assert [p.id for p in details["f1"].permissions] == ["p-f1", "p-extra"]
+
+
+class TestRequestsPerRecord:
+    @pytest.mark.asyncio
+    async def test_batched_details_cut_requests_per_record(self, graph, client):
+        files = [f"f{i}" for i in range(100)]
+
+        for item_id in files:
+            await client.get_signed_url("d", item_id)
+            await client.get_file_permission("d", item_id)
+        per_item_calls, graph.http_calls = graph.http_calls, 0
+
+        details = await client.get_drive_items_details("d", files, download_url_ids=files)
+
+        assert per_item_calls / len(files) == 2
+        assert graph.http_calls / len(files) == 0.1
+        assert details["f42"].download_url == "https://dl/f42"
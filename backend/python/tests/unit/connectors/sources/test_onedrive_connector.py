@@ -7,7 +7,10 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from app.config.constants.arangodb import Connectors, MimeTypes, OriginTypes, ProgressStatus
-from app.connectors.sources.microsoft.common.msgraph_client import RecordUpdate
+from app.connectors.sources.microsoft.common.msgraph_client import (
+    DriveItemDetails,
+    RecordUpdate,
+)
 from app.connectors.sources.microsoft.onedrive.connector import (
     OneDriveConnector,
     OneDriveCredentials,
@@ -244,6 +247,28 @@ class TestProcessDeltaItem:
         assert result.record.record_name == "report.docx"
         assert result.record.is_file is True
 
+    @pytest.mark.asyncio
+    async def test_prefetched_details_skip_per_item_calls(self):
+        connector = _make_connector()
+        connector.msgraph_client = MagicMock()
+        connector.msgraph_client.get_signed_url = AsyncMock()
+        connector.msgraph_client.get_file_permission = AsyncMock()
+
+        mock_tx_store = AsyncMock()
+        mock_tx_store.get_record_by_external_id = AsyncMock(return_value=None)
+        mock_tx = AsyncMock()
+        mock_tx.__aenter__ = AsyncMock(return_value=mock_tx_store)
+        mock_tx.__aexit__ = AsyncMock(return_value=False)
+        connector.data_store_provider.transaction = MagicMock(return_value=mock_tx)
+
+        item = _make_drive_item(name="report.docx")
+        details = DriveItemDetails(download_url="https://prefetched.url", permissions=[])
+
+        result = await connector._process_delta_item(item, details)
+        assert result.record.signed_url == "https://prefetched.url"
+        connector.msgraph_client.get_signed_url.assert_not_awaited()
+        connector.msgraph_client.get_file_permission.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_folder_item(self):
         connector = _make_connector()
@@ -1101,6 +1126,33 @@ class TestProcessDeltaItemsGenerator:
 
         assert len(results) == 0
 
+    @pytest.mark.asyncio
+    async def test_page_details_are_fetched_in_one_batch(self):
+        connector = _make_connector()
+        connector.indexing_filters = MagicMock()
+        details = {
+            "a": DriveItemDetails(download_url="https://a"),
+            "b": DriveItemDetails(),
+        }
+        connector.msgraph_client = MagicMock()
+        connector.msgraph_client.get_drive_items_details = AsyncMock(return_value=details)
+        connector._process_delta_item = AsyncMock(return_value=None)
+        items = [
+            _make_drive_item(item_id="a"),
+            _make_drive_item(item_id="b", is_folder=True),
+            _make_drive_item(item_id="gone", is_deleted=True),
+        ]
+
+        async for _ in connector._process_delta_items_generator(items):
+            pass
+
+        connector.msgraph_client.get_drive_items_details.assert_awaited_once_with(
+            "drive-1", ["a", "b"], download_url_ids=["a"]
+        )
+        assert [c.args[1] for c in connector._process_delta_item.await_args_list] == [
+            details["a"], details["b"], None
+        ]
+
 
 # ===========================================================================
 # Deep Sync: _process_users_in_batches
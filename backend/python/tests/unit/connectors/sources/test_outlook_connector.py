@@ -4621,6 +4621,76 @@ class TestGetGroupPostAttachments:
         assert result == []
 
 
+class TestGetGroupPostsAttachments:
+
+    @pytest.mark.asyncio
+    async def test_lists_posts_in_one_batch_and_falls_back_per_post(self):
+        from app.connectors.sources.microsoft.common.msgraph_batch import BatchSubResponse
+
+        connector = _make_connector()
+        connector.external_client = MagicMock()
+        connector._get_group_post_attachments = AsyncMock(return_value=[MagicMock()])
+        responses = {
+            "0": BatchSubResponse(id="0", status=200, body={"value": [
+                {"@odata.type": "#microsoft.graph.fileAttachment", "id": "a1", "name": "q3.xlsx"},
+            ]}),
+            "1": BatchSubResponse(id="1", status=404, body={"error": {"message": "gone"}}),
+        }
+
+        with patch(
+            "app.connectors.sources.microsoft.outlook.connector.GraphBatcher"
+        ) as batcher_cls:
+            batcher_cls.return_value.execute = AsyncMock(return_value=responses)
+            result = await connector._get_group_posts_attachments("g1", "t1", ["p1", "p2"])
+
+        requests = batcher_cls.return_value.execute.await_args.args[0]
+        assert [r.url for r in requests] == [
+            "/groups/g1/threads/t1/posts/p1/attachments",
+            "/groups/g1/threads/t1/posts/p2/attachments",
+        ]
+        assert [a.id for a in result["p1"]] == ["a1"]
+        assert len(result["p2"]) == 1
+        connector._get_group_post_attachments.assert_awaited_once_with("g1", "t1", "p2")
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_lists_every_post(self):
+        connector = _make_connector()
+        connector.external_client = MagicMock()
+        connector._get_group_post_attachments = AsyncMock(return_value=[])
+
+        with patch(
+            "app.connectors.sources.microsoft.outlook.connector.GraphBatcher"
+        ) as batcher_cls:
+            batcher_cls.return_value.execute = AsyncMock(side_effect=RuntimeError("down"))
+            result = await connector._get_group_posts_attachments("g1", "t1", ["p1", "p2"])
+
+        assert result == {"p1": [], "p2": []}
+        assert connector._get_group_post_attachments.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_prefetched_attachments_skip_the_per_post_call(self):
+        connector = _make_connector()
+        connector._get_group_post_attachments = AsyncMock()
+        connector._get_existing_record = AsyncMock(return_value=None)
+        connector.indexing_filters = MagicMock()
+        connector.indexing_filters.is_enabled = MagicMock(return_value=True)
+        group = AppUserGroup(
+            app_name=Connectors.OUTLOOK, connector_id="conn-1",
+            source_user_group_id="g1", name="Eng",
+        )
+        post = MagicMock(id="p1", conversation_thread_id="t1")
+        att = MagicMock(id="a1", content_type="text/plain", size=3, last_modified_date_time=None)
+        att.name = "notes.txt"
+
+        result = await connector._process_group_post_attachments(
+            "org-1", group, MagicMock(), post, [], parent_post_record_id="rec-1",
+            attachments=[att],
+        )
+
+        assert len(result) == 1
+        connector._get_group_post_attachments.assert_not_awaited()
+
+
 # ===========================================================================
 # _sync_user_folders
 # ===========================================================================
@@ -1363,6 +1363,35 @@ class TestProcessDelimitedDocument:
         assert events[0].event == "parsing_complete"
         assert events[1].event == "indexing_complete"
 
+    @pytest.mark.asyncio
+    async def test_large_file_is_streamed(self):
+        """Files at the streaming threshold skip the up-front row read."""
+        proc, _, gp, _ = _make_processor()
+        gp.get_document.return_value = _base_record_dict()
+
+        mock_parser = MagicMock()
+        mock_parser.get_blocks_from_csv_stream = AsyncMock(return_value=MagicMock())
+        proc.parsers["csv"] = mock_parser
+
+        with patch("app.events.processor.get_llm_for_role", new_callable=AsyncMock) as mock_llm, \
+                patch("app.events.processor.CSV_STREAMING_THRESHOLD_BYTES", 4), \
+                patch("app.events.processor.IndexingPipeline") as mock_pipeline:
+            mock_llm.return_value = (MagicMock(), {})
+            mock_pipeline.return_value = AsyncMock()
+
+            events = await _collect(
+                proc.process_delimited_document(
+                    recordName="test.csv",
+                    recordId="rec-1",
+                    file_binary=b"a,b\n1,2",
+                    virtual_record_id="vr-1",
+                )
+            )
+
+        assert [e.event for e in events] == ["parsing_complete", "indexing_complete"]
+        mock_parser.read_raw_rows.assert_not_called()
+        mock_parser.get_blocks_from_csv_stream.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_uses_custom_extension(self):
         """Uses custom extension parser when provided."""
@@ -1603,3 +1603,97 @@ class TestGetTableSummaryContentCoercion:
 
         result = await parser.get_table_summary(llm=MagicMock(), rows=[{"a": 1}])
         assert result == "Final summary"
+
+
+# ---------------------------------------------------------------------------
+# get_blocks_from_csv_stream
+# ---------------------------------------------------------------------------
+class TestGetBlocksFromCsvStream:
+    @pytest.fixture
+    def stream_parser(self, parser, monkeypatch):
+        from unittest.mock import patch
+        from app.modules.parsers.csv import csv_parser
+        from app.modules.parsers.excel.prompt_template import CSVHeaderDetection
+
+        monkeypatch.setattr(csv_parser, "CSV_STREAMING_WINDOW_ROWS", 20)
+        monkeypatch.setenv("MAX_TABLE_ROWS_FOR_LLM", "0")
+        detection = CSVHeaderDetection(has_headers=True, num_header_rows=1, confidence="high", reasoning="")
+        with patch.object(parser, "detect_headers_with_llm", new_callable=AsyncMock, return_value=detection), \
+                patch.object(parser, "get_table_summary", new_callable=AsyncMock, return_value="Summary"):
+            yield parser
+
+    @staticmethod
+    async def _both(parser, text: str):
+        content = text.encode("utf-8")
+        tables = parser.find_tables_in_csv(parser.read_raw_rows(io.StringIO(text)))
+        in_memory = await parser.get_blocks_from_csv_with_multiple_tables(tables, AsyncMock())
+        streamed = await parser.get_blocks_from_csv_stream(content, AsyncMock())
+        return in_memory, streamed
+
+    @staticmethod
+    def _shape(container):
+        return (
+            [b.data for b in container.blocks],
+            [(g.data, g.table_metadata, g.children) for g in container.block_groups],
+        )
+
+    @pytest.mark.asyncio
+    async def test_single_table_matches_in_memory(self, stream_parser):
+        text = "id,name,score\n" + "".join(f"{i},n{i},{i * 0.5}\n" for i in range(95))
+
+        in_memory, streamed = await self._both(stream_parser, text)
+
+        assert self._shape(streamed) == self._shape(in_memory)
+        assert streamed.blocks[-1].data["row_number"] == 96
+
+    @pytest.mark.asyncio
+    async def test_tables_across_window_boundaries(self, stream_parser):
+        first = "a,b\n" + "".join(f"{i},{i}\n" for i in range(30))
+        second = "x,y\n" + "".join(f"{i},\n" if i % 7 == 0 else f"{i},v{i}\n" for i in range(50))
+        text = first + "\n" + second
+
+        in_memory, streamed = await self._both(stream_parser, text)
+
+        assert len(streamed.block_groups) == 2
+        assert self._shape(streamed) == self._shape(in_memory)
+
+    @pytest.mark.asyncio
+    async def test_side_by_side_open_tables_fall_back(self, stream_parser):
+        text = "".join(f"l{i},l{i},,r{i},r{i}\n" for i in range(40))
+
+        in_memory, streamed = await self._both(stream_parser, text)
+
+        assert len(streamed.block_groups) == 2
+        assert self._shape(streamed) == self._shape(in_memory)
+
+    @pytest.mark.asyncio
+    async def test_side_by_side_tables_are_spooled_not_truncated(self, stream_parser):
+        text = (
+            "".join(f"l{i},l{i},,r{i},r{i}\n" for i in range(100))
+            + "".join(f"l{i},l{i},,,\n" for i in range(100, 110))
+            + "\nx,y\n1,2\n"
+        )
+
+        in_memory, streamed = await self._both(stream_parser, text)
+
+        rows_per_table = [g.table_metadata.num_of_rows for g in streamed.block_groups]
+        assert rows_per_table == [109, 99, 1]
+        assert self._shape(streamed) == self._shape(in_memory)
+        assert streamed.blocks[-1].data["row_number"] == 113
+
+    def test_detect_encoding(self, parser):
+        assert parser.detect_encoding("naïve,ü\n".encode("utf-8")) == "utf-8"
+        assert parser.detect_encoding("naïve,ü\n".encode("latin1")) == "latin1"
+
+    @pytest.mark.asyncio
+    async def test_max_table_rows_caps_streamed_blocks(self, stream_parser, monkeypatch):
+        from app.modules.parsers.csv import csv_parser
+
+        monkeypatch.setattr(csv_parser, "CSV_STREAMING_MAX_TABLE_ROWS", 30)
+        text = "a,b\n" + "".join(f"{i},{i}\n" for i in range(100)) + "\nx,y\n1,2\n"
+
+        streamed = await stream_parser.get_blocks_from_csv_stream(text.encode(), AsyncMock())
+
+        rows_per_table = [g.table_metadata.num_of_rows for g in streamed.block_groups]
+        assert rows_per_table == [30, 1]
+        assert streamed.blocks[-1].data["row_number"] == 104
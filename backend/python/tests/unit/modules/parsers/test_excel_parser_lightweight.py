@@ -1,12 +1,15 @@
-"""Unit tests for ExcelParser.create_blocks_lightweight."""
+"""Unit tests for ExcelParser's no-LLM paths: create_blocks_lightweight and streaming."""
 
 import io
+import re
+import zipfile
 from unittest.mock import MagicMock
 
 import pytest
 from openpyxl import Workbook
 
 from app.models.blocks import BlockType, GroupType
+from app.modules.parsers.excel import excel_parser
 from app.modules.parsers.excel.excel_parser import ExcelParser
 
 
@@ -64,3 +67,122 @@ async def test_create_blocks_lightweight_closes_workbook(parser):
     wb.close = close
     await parser.create_blocks_lightweight()
     close.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Streaming (read-only) ingestion
+# ---------------------------------------------------------------------------
+def _multi_sheet_bytes() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Orders"
+    ws.append(["id", "customer", None, "total"])
+    for i in range(30):
+        ws.append([i, f"c{i}", None if i % 2 else "x", i * 1.5])
+    other = wb.create_sheet("Wide")
+    other.append(["h"])
+    other.append([1, 2, 3])
+    wb.create_sheet("Blank")
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def _without_ids(container) -> dict:
+    dumped = container.model_dump()
+    for item in dumped["blocks"] + dumped["block_groups"]:
+        item.pop("id", None)
+    return dumped
+
+
+def _with_dimension(content: bytes, ref: str) -> bytes:
+    """Rewrite every sheet's <dimension> element, as some writers do."""
+    src = zipfile.ZipFile(io.BytesIO(content))
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename.startswith("xl/worksheets/sheet"):
+                data = re.sub(rb'<dimension ref="[^"]+"', f'<dimension ref="{ref}"'.encode(), data)
+            dst.writestr(info, data)
+    return out.getvalue()
+
+
+def test_streaming_matches_full_load(parser):
+    content = _multi_sheet_bytes()
+    parser.load_workbook_from_binary(content)
+
+    full = parser._build_basic_block_container()
+    streamed = parser._build_streaming_block_container(content)
+
+    assert _without_ids(streamed) == _without_ids(full)
+
+
+def test_streaming_skips_empty_rows_and_respects_caps(parser):
+    content = _xlsx_bytes([["col"], [1], [None], [2], [3], [4]])
+
+    container = parser._build_streaming_block_container(content, max_rows_per_sheet=3)
+
+    assert [b.data["row_number"] for b in container.blocks] == [2, 4, 5]
+    assert container.block_groups[1].table_metadata.num_of_rows == 3
+
+
+def test_streaming_recovers_placeholder_dimension(parser):
+    content = _with_dimension(_xlsx_bytes([["a", "b"], [1, 2], [3, 4]]), "A1")
+
+    container = parser._build_streaming_block_container(content)
+
+    assert [b.data["row_natural_language_text"] for b in container.blocks] == ["a: 1, b: 2", "a: 3, b: 4"]
+
+
+@pytest.mark.asyncio
+async def test_parse_workbook_streams_with_row_cap(parser):
+    content = _xlsx_bytes([["col"]] + [[i] for i in range(50)])
+
+    container = await parser.parse_workbook(content, max_rows=5)
+
+    assert len(container.blocks) == 5
+    assert parser.workbook is None
+
+
+@pytest.mark.asyncio
+async def test_large_workbook_streams_instead_of_loading(parser, monkeypatch):
+    monkeypatch.setattr(excel_parser, "EXCEL_STREAMING_MIN_CELLS", 10)
+    monkeypatch.setattr(excel_parser, "EXCEL_MAX_TABLE_ROWS_TO_INDEX", 4)
+    content = _xlsx_bytes([["name", "amount"]] + [[f"r{i}", i] for i in range(20)])
+    llm = MagicMock()
+
+    parser.load_workbook_from_binary(content)
+    container = await parser.create_blocks(llm)
+
+    assert parser.streaming is True
+    assert parser.workbook is None
+    assert len(container.blocks) == 4
+    llm.assert_not_called()
+
+
+def test_estimate_workbook_cells():
+    content = _xlsx_bytes([["a", "b", "c"]] + [[i, i, i] for i in range(99)])
+
+    # dimension A1:C100, capped by what ~11 KB of sheet XML can hold
+    assert 250 <= excel_parser.estimate_workbook_cells(content) <= 300
+    assert excel_parser.estimate_workbook_cells(b"not a zip") is None
+
+
+@pytest.mark.asyncio
+async def test_styled_mostly_empty_sheet_keeps_enrichment(parser, monkeypatch):
+    # Formatting applied to whole columns makes writers declare the full
+    # sheet as the dimension even though only a few cells hold values.
+    content = _with_dimension(_xlsx_bytes([["name", "amount"], ["a", 1], ["b", 2]]), "A1:XFD1048576")
+    monkeypatch.setattr(excel_parser, "EXCEL_STREAMING_MIN_CELLS", 1_000_000)
+
+    assert excel_parser.estimate_workbook_cells(content) < 1_000
+    parser.load_workbook_from_binary(content)
+    assert parser.streaming is False
+    assert parser.workbook is not None
+
+
+def test_estimate_workbook_cells_without_dimension_uses_xml_size():
+    content = _with_dimension(_xlsx_bytes([["a"]] + [[f"value-{i}"] for i in range(500)]), "A1")
+
+    assert excel_parser.estimate_workbook_cells(content) > 100
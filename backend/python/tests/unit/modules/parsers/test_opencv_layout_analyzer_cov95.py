@@ -60,7 +60,7 @@ from app.modules.parsers.pdf.opencv_layout_analyzer import (
     _region_column_side,
     _region_is_predominantly_monospace,
     _region_side,
-    _render_all_pages,
+    _render_pages,
     _resolve_line_sides,
     _resolve_overlaps,
     _rasterize_page,
@@ -797,11 +797,35 @@ class TestDocumentRasterCache:
     def test_cache_get(self):
         fake_pages = {1: (np.zeros((10, 10, 3), dtype=np.uint8), 2.0)}
         cache = DocumentRasterCache("/tmp/fake.pdf")
-        with patch.object(ola, "_render_all_pages", return_value=fake_pages):
+        with patch.object(ola, "_render_pages", return_value=fake_pages):
             img, scale = cache.get(1)
         assert img.shape == (10, 10, 3)
         assert scale == 2.0
 
+    def test_miss_renders_a_window_capped_at_page_count(self):
+        calls = []
+
+        def render(numbers, dpi):
+            calls.append(list(numbers))
+            return {n: (np.zeros((2, 2, 3), dtype=np.uint8), 1.0) for n in numbers}
+
+        cache = DocumentRasterCache("/tmp/fake.pdf", page_count=5, batch_pages=3, render=render)
+        cache.get(1)
+        cache.get(3)
+        cache.get(4)
+        assert calls == [[1, 2, 3], [4, 5]]
+
+    def test_release_drops_the_page_and_get_re_renders(self):
+        render = MagicMock(side_effect=lambda numbers, dpi: {
+            n: (np.zeros((2, 2, 3), dtype=np.uint8), 1.0) for n in numbers
+        })
+        cache = DocumentRasterCache("/tmp/fake.pdf", page_count=2, batch_pages=2, render=render)
+        cache.get(1)
+        cache.release(1)
+        cache.release(1)  # releasing twice is harmless
+        cache.get(1)
+        assert [c.args[0] for c in render.call_args_list] == [[1, 2], [1]]
+
 
 class TestReextractAndSafeText:
     def test_safe_text_in_bbox(self):
@@ -1247,7 +1271,7 @@ class TestRasterize:
         assert img.shape[2] == 3
         assert scale == 1.0
 
-    def test_render_all_pages(self):
+    def test_render_pages(self):
         pytest.importorskip("reportlab")
         from reportlab.lib.pagesizes import letter
         from reportlab.pdfgen import canvas
@@ -1267,11 +1291,12 @@ class TestRasterize:
             fake_pil.convert.return_value = fake_pil
             arr = np.zeros((10, 10, 3), dtype=np.uint8)
             with patch(
-                "app.modules.parsers.pdf.pdf_rasterizer.render_all_pages_from_path_sync",
+                "app.modules.parsers.pdf.pdf_rasterizer.render_batch_from_path_sync",
                 return_value={1: (arr, 1.0)},
-            ):
-                pages = _render_all_pages(path, 72)
+            ) as mock_render:
+                pages = _render_pages(path, [1], 72)
             assert 1 in pages
+            mock_render.assert_called_once_with(path, [1], 72)
         finally:
             os.unlink(path)
 
@@ -1339,7 +1364,7 @@ class TestExtractLayoutExtended:
         page = _make_pdf_page(lambda c: c.drawString(72, 700, "cached"))
         fake_img = np.full((100, 80, 3), 128, dtype=np.uint8)
         cache = DocumentRasterCache("/tmp/x.pdf")
-        with patch.object(ola, "_render_all_pages", return_value={1: (fake_img, 2.0)}):
+        with patch.object(ola, "_render_pages", return_value={1: (fake_img, 2.0)}):
             regions = extract_layout_regions(page, raster_cache=cache)
         assert regions
 
@@ -3310,7 +3335,7 @@ class TestCoveragePush95Phase3:
         page = _make_pdf_page(lambda c: c.drawString(72, 700, "cached"))
         fake_img = np.full((100, 80, 3), 128, dtype=np.uint8)
         cache = DocumentRasterCache("/tmp/cache.pdf")
-        with patch.object(ola, "_render_all_pages", return_value={1: (fake_img, 2.0)}):
+        with patch.object(ola, "_render_pages", return_value={1: (fake_img, 2.0)}):
             regions = extract_layout_regions(page, raster_cache=cache)
         assert regions
 
@@ -4629,7 +4654,7 @@ class TestCoveragePush95Phase6:
     def test_document_raster_cache_lazy_load(self):
         cache = DocumentRasterCache("/tmp/fake.pdf")
         fake = (np.zeros((10, 10, 3), dtype=np.uint8), 2.0)
-        with patch.object(ola, "_render_all_pages", return_value={1: fake}):
+        with patch.object(ola, "_render_pages", return_value={1: fake}):
             img, scale = cache.get(1)
         assert img.shape == (10, 10, 3)
         assert scale == 2.0
@@ -5710,7 +5735,7 @@ class TestCoveragePush95Phase6:
         page.hyperlinks = []
         cache = DocumentRasterCache("/tmp/fake.pdf")
         fake = (np.full((10, 10, 3), 128, dtype=np.uint8), 2.0)
-        with patch.object(ola, "_render_all_pages", return_value={1: fake}):
+        with patch.object(ola, "_render_pages", return_value={1: fake}):
             regions = extract_layout_regions(page, raster_cache=cache)
         assert regions
 
@@ -6184,7 +6209,7 @@ class TestCoveragePush95Phase6:
     def test_document_raster_cache_second_get(self):
         cache = DocumentRasterCache("/tmp/fake2.pdf")
         fake = (np.zeros((5, 5, 3), dtype=np.uint8), 2.0)
-        with patch.object(ola, "_render_all_pages", return_value={1: fake}) as mock_render:
+        with patch.object(ola, "_render_pages", return_value={1: fake}) as mock_render:
             cache.get(1)
             cache.get(1)
         assert mock_render.call_count == 1
@@ -0,0 +1,136 @@
+"""Tests for page-sharded PDF layout analysis."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.modules.parsers.pdf import opencv_layout_pool as layout_pool
+from app.modules.parsers.pdf.opencv_layout_pool import ParsedPageData
+
+
+def _write_pdf(tmp_path, pages: int) -> str:
+    pytest.importorskip("reportlab")
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for n in range(1, pages + 1):
+        c.drawString(72, 700, f"Heading for page {n}")
+        c.drawString(72, 680, "Body text that the layout analyzer should keep.")
+        c.showPage()
+    c.save()
+    path = os.path.join(tmp_path, "doc.pdf")
+    with open(path, "wb") as f:
+        f.write(buf.getvalue())
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool_cache():
+    layout_pool.shutdown_pdf_layout_pool()
+    yield
+    layout_pool.shutdown_pdf_layout_pool()
+
+
+class TestAnalyzePages:
+    def test_in_process_render_matches_pool_render(self, tmp_path):
+        path = _write_pdf(tmp_path, 3)
+
+        in_process = layout_pool.analyze_pages(path, render_in_process=True)
+        via_rasterizer = layout_pool.analyze_pages(path)
+
+        assert [p.page_number for p in in_process] == [1, 2, 3]
+        assert in_process == via_rasterizer
+        assert "page 2" in " ".join(r.text for r in in_process[1].regions)
+
+    def test_subset_of_pages_and_release_after_each(self, tmp_path):
+        path = _write_pdf(tmp_path, 4)
+        released = []
+        real_release = layout_pool.DocumentRasterCache.release
+
+        def spy(self, page_number):
+            released.append(page_number)
+            real_release(self, page_number)
+
+        with patch.object(layout_pool.DocumentRasterCache, "release", spy):
+            result = layout_pool.analyze_pages(path, [2, 3], render_in_process=True)
+
+        assert [p.page_number for p in result] == [2, 3]
+        assert released == [2, 3]
+
+    def test_count_pages(self, tmp_path):
+        assert layout_pool.count_pages(_write_pdf(tmp_path, 5)) == 5
+
+
+class TestAnalyzePagesInPool:
+    @pytest.mark.asyncio
+    async def test_shards_bounded_and_reassembled_in_order(self):
+        in_flight = 0
+        peak = 0
+        shards = []
+
+        def fake_worker(pdf_path, page_numbers):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            shards.append(page_numbers)
+            # Later shards finish first so ordering has to be restored.
+            time.sleep(0.01 * (10 - page_numbers[0]))
+            in_flight -= 1
+            return [ParsedPageData(n, 612.0, 792.0, []) for n in page_numbers]
+
+        with ThreadPoolExecutor(max_workers=4) as executor, patch.object(
+            layout_pool, "_get_pdf_layout_pool", return_value=executor
+        ), patch.object(layout_pool, "_worker_analyze_pages", fake_worker):
+            result = await layout_pool.analyze_pages_in_pool(
+                "/tmp/doc.pdf", 7, shard_pages=2, max_in_flight=2
+            )
+
+        assert [p.page_number for p in result] == [1, 2, 3, 4, 5, 6, 7]
+        assert sorted(shards) == [[1, 2], [3, 4], [5, 6], [7]]
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_recreated_and_reported(self):
+        governor = MagicMock()
+        broken = MagicMock()
+        broken.submit.side_effect = BrokenProcessPool("worker died")
+
+        with patch.object(layout_pool, "_resource_governor", governor), patch.object(
+            layout_pool, "_get_pdf_layout_pool", return_value=broken
+        ) as get_pool:
+            with pytest.raises(BrokenProcessPool):
+                await layout_pool.analyze_pages_in_pool("/tmp/doc.pdf", 3, shard_pages=1)
+
+        get_pool.cache_clear.assert_called_once()
+        governor.report_memory_incident.assert_called_once()
+
+
+class TestProcessorRouting:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "workers,page_count,sharded",
+        [(4, 9, True), (4, 3, False), (1, 9, False)],
+    )
+    async def test_parse_document_picks_sharded_or_in_thread(self, workers, page_count, sharded):
+        from app.modules.parsers.pdf import pdfplumber_opencv_processor as proc_mod
+
+        proc = proc_mod.PDFPlumberOpenCVProcessor(logger=MagicMock(), config=MagicMock())
+        pages = [ParsedPageData(1, 612.0, 792.0, [])]
+
+        with patch.object(proc_mod, "PDF_LAYOUT_WORKERS", workers), patch.object(
+            proc_mod, "PDF_LAYOUT_SHARD_PAGES", 4
+        ), patch.object(proc_mod, "count_pages", return_value=page_count), patch.object(
+            proc_mod, "analyze_pages_in_pool", new=MagicMock(side_effect=lambda *a: asyncio.sleep(0, pages))
+        ) as pooled, patch.object(proc_mod, "analyze_pages", return_value=pages) as threaded:
+            assert await proc.parse_document("doc.pdf", b"%PDF") == pages
+
+        assert pooled.called is sharded
+        assert threaded.called is not sharded
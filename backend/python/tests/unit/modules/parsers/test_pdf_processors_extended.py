@@ -818,10 +818,10 @@ class TestPyMuPDFOpenCVProcessorExtended:
         mock_cm.__exit__.return_value = None
 
         with patch(
-            "app.modules.parsers.pdf.pdfplumber_opencv_processor.pdfplumber.open",
+            "app.modules.parsers.pdf.opencv_layout_pool.pdfplumber.open",
             return_value=mock_cm,
         ), patch(
-            "app.modules.parsers.pdf.pdfplumber_opencv_processor.extract_layout_regions",
+            "app.modules.parsers.pdf.opencv_layout_pool.extract_layout_regions",
             return_value=[],
         ):
             result = await proc.parse_document("test.pdf", BytesIO(b"fake-pdf-bytes"))
@@ -845,10 +845,10 @@ class TestPyMuPDFOpenCVProcessorExtended:
         mock_cm.__exit__.return_value = None
 
         with patch(
-            "app.modules.parsers.pdf.pdfplumber_opencv_processor.pdfplumber.open",
+            "app.modules.parsers.pdf.opencv_layout_pool.pdfplumber.open",
             return_value=mock_cm,
         ), patch(
-            "app.modules.parsers.pdf.pdfplumber_opencv_processor.extract_layout_regions",
+            "app.modules.parsers.pdf.opencv_layout_pool.extract_layout_regions",
             return_value=[],
         ), patch(
             "app.modules.parsers.pdf.pdfplumber_opencv_processor.os.unlink",
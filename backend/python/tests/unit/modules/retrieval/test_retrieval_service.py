@@ -313,7 +313,7 @@ class TestGetEmbeddingModelInstance:
     async def test_uses_default_when_no_embedding_config(self, retrieval_service, mock_config_service):
         """With no embedding config present, falls back to the built-in default model."""
         mock_config_service.get_config.return_value = {"embedding": []}
-        with patch("app.modules.retrieval.retrieval_service.get_default_embedding_model") as mock_def:
+        with patch("app.utils.embedding_runtime.get_default_embedding_model") as mock_def:
             mock_def.return_value = MagicMock()
             result = await retrieval_service.get_embedding_model_instance()
             assert result is not None
@@ -328,11 +328,11 @@ class TestGetEmbeddingModelInstance:
                  "configuration": {"model": "text-embedding-3-small"}}
             ]
         }
-        with patch("app.modules.retrieval.retrieval_service.get_embedding_model") as mock_emb:
+        with patch("app.utils.embedding_runtime.get_embedding_model") as mock_emb:
             mock_emb.return_value = MagicMock()
             first = await retrieval_service.get_embedding_model_instance()
             second = await retrieval_service.get_embedding_model_instance()
-            # Cached: config read twice (to check for changes), model built once.
+            # Config read twice (from the service's cache), model built once.
             assert mock_emb.call_count == 1
             assert first is second
         assert mock_config_service.get_config.await_count >= 2
@@ -346,7 +346,7 @@ class TestGetEmbeddingModelInstance:
                  "configuration": {"model": "text-embedding-3-small"}}
             ]
         }
-        with patch("app.modules.retrieval.retrieval_service.get_embedding_model") as mock_emb:
+        with patch("app.utils.embedding_runtime.get_embedding_model") as mock_emb:
             model_a = MagicMock()
             model_b = MagicMock()
             mock_emb.side_effect = [model_a, model_b]
@@ -360,8 +360,8 @@ class TestGetEmbeddingModelInstance:
             }
             second = await retrieval_service.get_embedding_model_instance()
             assert mock_emb.call_count == 2
-            assert first is model_a
-            assert second is model_b
+            assert first.embeddings is model_a
+            assert second.embeddings is model_b
 
     @pytest.mark.asyncio
     async def test_prefers_is_default_config(self, retrieval_service, mock_config_service):
@@ -375,7 +375,7 @@ class TestGetEmbeddingModelInstance:
                  "configuration": {"model": "default-model"}},
             ]
         }
-        with patch("app.modules.retrieval.retrieval_service.get_embedding_model") as mock_emb:
+        with patch("app.utils.embedding_runtime.get_embedding_model") as mock_emb:
             mock_emb.return_value = MagicMock()
             await retrieval_service.get_embedding_model_instance()
             provider_arg = mock_emb.call_args[0][0]
@@ -397,7 +397,7 @@ class TestGetEmbeddingModelInstance:
                  "configuration": {"model": "custom-embed-model"}}
             ]
         }
-        with patch("app.modules.retrieval.retrieval_service.get_embedding_model") as mock_emb:
+        with patch("app.utils.embedding_runtime.get_embedding_model") as mock_emb:
             mock_emb.return_value = MagicMock()
             result = await retrieval_service.get_embedding_model_instance()
             assert result is not None
@@ -1852,3 +1852,130 @@ class TestSearchWithFiltersTimeRange:
         )
         assert "time_range" not in filters_passed
         assert result.get("appliedFilters") == {"kb": ["kb-123"], "kb_count": 1}
+
+
+# ============================================================================
+# search_with_filters ACL-token path
+# ============================================================================
+
+
+class TestSearchWithFiltersAclTokens:
+    @pytest.fixture(autouse=True)
+    def _enable_acl_filter(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_DB_ACL_FILTER", "true")
+
+    @pytest.fixture
+    def acl_graph_provider(self, mock_graph_provider):
+        mock_graph_provider.get_user_acl_principals = AsyncMock(return_value={
+            "userKey": "user1",
+            "principalIds": ["group1"],
+            "apps": [{"id": "drive", "type": "DRIVE", "permissionModel": "RECORD_LEVEL"}],
+            "kbIds": [],
+        })
+        mock_graph_provider.get_records_acl_principals = AsyncMock(return_value=[
+            {
+                "recordId": "rec1",
+                "virtualRecordId": "vr1",
+                "connectorId": "drive",
+                "orgId": "o1",
+                "indexingStatus": "COMPLETED",
+                "principalIds": ["group1"],
+            },
+            {
+                "recordId": "rec2",
+                "virtualRecordId": "vr2",
+                "connectorId": "drive",
+                "orgId": "o1",
+                "indexingStatus": "COMPLETED",
+                "principalIds": ["revoked-group"],
+            },
+        ])
+        mock_graph_provider.get_user_by_user_id.return_value = {"email": "u@t.com"}
+        mock_graph_provider.get_records_by_record_ids.return_value = [
+            {
+                "_key": "rec1",
+                "virtualRecordId": "vr1",
+                "origin": "drive",
+                "recordName": "Doc",
+                "webUrl": "https://example.com/doc",
+                "mimeType": "text/plain",
+            }
+        ]
+        return mock_graph_provider
+
+    @staticmethod
+    def _hits(*virtual_record_ids):
+        return AsyncMock(return_value=[
+            {
+                "score": 0.9,
+                "content": "hello",
+                "citationType": "vectordb|document",
+                "metadata": {"virtualRecordId": vid, "orgId": "o1"},
+            }
+            for vid in virtual_record_ids
+        ])
+
+    @pytest.mark.asyncio
+    async def test_filters_on_principals_instead_of_virtual_record_ids(
+        self, retrieval_service, acl_graph_provider, mock_vector_db_service
+    ):
+        retrieval_service._execute_parallel_searches = self._hits("vr1")
+        await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1"
+        )
+
+        acl_graph_provider.get_accessible_virtual_record_ids.assert_not_called()
+        must = mock_vector_db_service.filter_collection.call_args.kwargs["must"]
+        assert "virtualRecordId" not in must
+        assert must["connectorId"] == ["drive"]
+        assert must["aclTokens"] == ["o:o1", "p:group1", "p:user1"]
+
+    @pytest.mark.asyncio
+    async def test_top_k_is_post_verified_against_graph(
+        self, retrieval_service, acl_graph_provider
+    ):
+        retrieval_service._execute_parallel_searches = self._hits("vr1", "vr2")
+        result = await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1"
+        )
+
+        acl_graph_provider.get_records_acl_principals.assert_awaited_once()
+        assert acl_graph_provider.get_records_by_record_ids.call_args.args[0] == ["rec1"]
+        assert [r["metadata"]["virtualRecordId"] for r in result["searchResults"]] == ["vr1"]
+
+    @pytest.mark.asyncio
+    async def test_no_verified_hits_returns_404(self, retrieval_service, acl_graph_provider):
+        retrieval_service._execute_parallel_searches = self._hits("vr2")
+        result = await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1"
+        )
+        assert result["status"] == Status.ACCESSIBLE_RECORDS_NOT_FOUND.value
+
+    @pytest.mark.asyncio
+    async def test_apps_filter_narrows_connector_scope(
+        self, retrieval_service, acl_graph_provider
+    ):
+        result = await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1", filter_groups={"apps": ["slack"]}
+        )
+        assert result["status"] == Status.ACCESSIBLE_RECORDS_NOT_FOUND.value
+
+    @pytest.mark.asyncio
+    async def test_metadata_filters_fall_back_to_graph_path(
+        self, retrieval_service, acl_graph_provider
+    ):
+        acl_graph_provider.get_accessible_virtual_record_ids.return_value = {}
+        await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1",
+            filter_groups={"departments": ["Engineering"]},
+        )
+        acl_graph_provider.get_accessible_virtual_record_ids.assert_awaited_once()
+        acl_graph_provider.get_user_acl_principals.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_returns_404(self, retrieval_service, acl_graph_provider):
+        acl_graph_provider.get_user_acl_principals.return_value = None
+        result = await retrieval_service.search_with_filters(
+            queries=["test"], user_id="u1", org_id="o1"
+        )
+        assert result["status"] == Status.ACCESSIBLE_RECORDS_NOT_FOUND.value
@@ -2,11 +2,17 @@
 
 import base64
 import json
+import random
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.modules.transformers.blob_storage import BlobStorage
+from app.services.cache.decoded_record_cache import (
+    DecodedRecordCache,
+    init_decoded_record_cache,
+    reset_decoded_record_cache,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -313,7 +319,7 @@ class TestBlobStorageApply:
 
         bs.save_record_to_storage.assert_awaited_once()
         bs.store_virtual_record_mapping.assert_awaited_once_with(
-            "vr-1", "doc-id-123", 4096
+            "vr-1", "doc-id-123", 4096, storage_format="record-v1"
         )
         assert result.record == record
 
@@ -385,7 +391,7 @@ class TestBlobStorageApply:
         bs.upload_next_version.assert_awaited_once()
         bs.save_record_to_storage.assert_awaited_once()
         bs.store_virtual_record_mapping.assert_awaited_once_with(
-            "vr-1", "new-doc", 2048
+            "vr-1", "new-doc", 2048, storage_format="record-v1"
         )
 
 
@@ -681,6 +687,57 @@ class TestGetRecordFromStorage:
                 await bs.get_record_from_storage("vr-1", "org-1")
 
 
+class TestGetRecordFromStorageDecodedCache:
+    """get_record_from_storage reads through the process decoded-record cache."""
+
+    @pytest.fixture(autouse=True)
+    def _cache(self, monkeypatch):
+        monkeypatch.setenv(DecodedRecordCache.ENV_MAX_BYTES, str(1024 * 1024))
+        init_decoded_record_cache()
+        yield
+        reset_decoded_record_cache()
+
+    def _storage(self, lookup):
+        bs = _make_blob_storage()
+        bs._get_auth_and_config = AsyncMock(
+            return_value=({"Authorization": "Bearer t"}, "http://localhost:3001", "local")
+        )
+        bs.get_document_id_by_virtual_record_id = AsyncMock(return_value=lookup)
+        bs._download_record = AsyncMock(return_value={"id": "rec-1", "content": "hello"})
+        return bs
+
+    @pytest.mark.asyncio
+    async def test_repeat_read_skips_download(self):
+        bs = self._storage({"record_doc_id": "doc-1", "fileSizeBytes": 500, "updatedAt": 1})
+
+        first = await bs.get_record_from_storage("vr-1", "org-1")
+        second = await bs.get_record_from_storage("vr-1", "org-1")
+
+        assert first == second == {"id": "rec-1", "content": "hello"}
+        bs._download_record.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reindexed_record_is_downloaded_again(self):
+        bs = self._storage({"record_doc_id": "doc-1", "fileSizeBytes": 500, "updatedAt": 1})
+        await bs.get_record_from_storage("vr-1", "org-1")
+        bs.get_document_id_by_virtual_record_id.return_value = {
+            "record_doc_id": "doc-2", "fileSizeBytes": 500, "updatedAt": 2,
+        }
+
+        await bs.get_record_from_storage("vr-1", "org-1")
+
+        assert bs._download_record.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unversioned_mapping_is_not_cached(self):
+        bs = self._storage({"record_doc_id": "doc-1", "fileSizeBytes": 500})
+
+        await bs.get_record_from_storage("vr-1", "org-1")
+        await bs.get_record_from_storage("vr-1", "org-1")
+
+        assert bs._download_record.await_count == 2
+
+
 # ===================================================================
 # _get_content_length
 # ===================================================================
@@ -1857,3 +1914,174 @@ class TestDownloadWithRangeRequestsDeep:
             await bs._download_with_range_requests(
                 mock_session, "https://s3.example.com/file", chunk_size_mb=1
             )
+
+
+# ===================================================================
+# Block-framed records
+# ===================================================================
+
+def _big_record(block_count=400):
+    rng = random.Random(0)
+    return {
+        "id": "rec-1",
+        "record_name": "Big PDF",
+        "block_containers": {
+            "blocks": [
+                {"index": i, "type": "text", "data": f"block {i} " + rng.randbytes(600).hex()}
+                for i in range(block_count)
+            ],
+            "block_groups": [],
+        },
+    }
+
+
+def _framed_body(record):
+    from app.modules.transformers.block_record_format import encode_block_record
+
+    return encode_block_record(record, "vr-1", target_bytes=2048)
+
+
+def _framed_lookup(size):
+    return {
+        "record_doc_id": "doc-1",
+        "fileSizeBytes": size,
+        "storageFormat": "blocks-v1",
+        "updatedAt": 1,
+    }
+
+
+def _ranged_storage(body, calls=None):
+    """A BlobStorage on S3 whose ranged reads slice ``body``."""
+    bs = _make_blob_storage()
+    bs._get_auth_and_config = AsyncMock(return_value=({}, "http://node", "s3"))
+    bs._signed_download_url = AsyncMock(return_value="https://s3/signed")
+
+    async def chunk(session, url, start, end, index, max_retries=3):
+        if calls is not None:
+            calls.append((start, end))
+        return index, body[start:end + 1]
+
+    bs._download_chunk_with_retry = chunk
+    return bs
+
+
+class TestBlockFramedRecords:
+    def test_process_downloaded_record_decodes_framed_envelope(self):
+        record = _big_record(20)
+        bs = _make_blob_storage()
+        assert bs._process_downloaded_record(json.loads(_framed_body(record))) == record
+
+    @pytest.mark.asyncio
+    async def test_reads_only_frames_for_hits(self, monkeypatch):
+        monkeypatch.setenv("PIPESHUB_PARTIAL_RECORD_READ_MIN_BYTES", "0")
+        record = _big_record()
+        body = _framed_body(record)
+        calls = []
+        bs = _ranged_storage(body, calls)
+        bs.get_record_from_storage = AsyncMock()
+
+        result = await bs.get_record_blocks_from_storage(
+            "vr-1", "org-1", {200}, lookup_result=_framed_lookup(len(body))
+        )
+
+        blocks = result["block_containers"]["blocks"]
+        assert len(blocks) == 400
+        assert [blocks[i] for i in (199, 200, 201)] == record["block_containers"]["blocks"][199:202]
+        assert blocks[0] == {} and blocks[399] == {}
+        assert result["virtual_record_id"] == "vr-1"
+        # The header probe, then one small read for the frame holding the hits.
+        assert len(body) > 64 * 1024
+        assert sum(end - start + 1 for start, end in calls[1:]) < len(body) / 20
+        bs.get_record_from_storage.assert_not_awaited()
+
+        await bs.load_record_blocks(result, "org-1", {5})
+        assert blocks[5] == record["block_containers"]["blocks"][5]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "lookup, storage_type",
+        [
+            ({"record_doc_id": "doc-1", "fileSizeBytes": 10**9, "storageFormat": "record-v1"}, "s3"),
+            (_framed_lookup(100), "s3"),
+            (_framed_lookup(10**9), "local"),
+        ],
+    )
+    async def test_falls_back_to_whole_record(self, lookup, storage_type):
+        bs = _make_blob_storage()
+        bs._get_auth_and_config = AsyncMock(return_value=({}, "http://node", storage_type))
+        bs.get_record_from_storage = AsyncMock(return_value={"id": "whole"})
+
+        result = await bs.get_record_blocks_from_storage("vr-1", "org-1", {1}, lookup_result=lookup)
+
+        assert result == {"id": "whole"}
+        bs.get_record_from_storage.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_hint_on_legacy_object_falls_back(self, monkeypatch):
+        monkeypatch.setenv("PIPESHUB_PARTIAL_RECORD_READ_MIN_BYTES", "0")
+        bs = _ranged_storage(json.dumps({"isCompressed": False, "record": {"id": "x"}}).encode())
+        bs.get_record_from_storage = AsyncMock(return_value={"id": "whole"})
+
+        result = await bs.get_record_blocks_from_storage(
+            "vr-1", "org-1", {1}, lookup_result=_framed_lookup(10**6)
+        )
+
+        assert result == {"id": "whole"}
+
+    @pytest.mark.asyncio
+    async def test_failed_frame_read_completes_record(self, monkeypatch):
+        monkeypatch.setenv("PIPESHUB_PARTIAL_RECORD_READ_MIN_BYTES", "0")
+        record = _big_record()
+        body = _framed_body(record)
+        bs = _ranged_storage(body)
+        bs.get_record_from_storage = AsyncMock(return_value=record)
+        partial = await bs._read_framed_header("org-1", "doc-1", {}, "http://node")
+        partial["virtual_record_id"] = "vr-1"
+        bs._fetch_frames = AsyncMock(side_effect=Exception("range refused"))
+
+        await bs.load_record_blocks(partial, "org-1", {200})
+
+        assert partial["block_containers"] == record["block_containers"]
+        assert "partial_blocks" not in partial
+
+    @pytest.mark.asyncio
+    async def test_local_save_uploads_framed_body(self):
+        bs = _make_blob_storage()
+        bs._get_auth_and_config = AsyncMock(return_value=({}, "http://node", "local"))
+        uploaded = {}
+
+        class Response:
+            status = 200
+
+            async def json(self):
+                return {"_id": "doc-1"}
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class Session:
+            def post(self, url, data=None, headers=None):
+                uploaded["size"] = sum(
+                    len(value) for _, _, value in data._fields if isinstance(value, bytes)
+                )
+                uploaded["fields"] = data._fields
+                return Response()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        record = _big_record(20)
+        with patch("app.modules.transformers.blob_storage.aiohttp.ClientSession", return_value=Session()):
+            document_id, size = await bs.save_record_to_storage(
+                "org-1", "rec-1", "vr-1", record, block_frames=True
+            )
+
+        assert document_id == "doc-1"
+        assert size == uploaded["size"]
+        assert bs._process_downloaded_record(json.loads(uploaded["fields"][0][2])) == record
@@ -0,0 +1,145 @@
+"""Block-framed record layout: round trip, header parsing, the hit expansion
+rules, and filling a partial record frame by frame."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.modules.transformers import block_record_format as fmt
+
+
+def _record(block_count: int = 300) -> dict:
+    blocks = [
+        {"index": i, "type": "text", "data": f"block {i} " + "x" * 300}
+        for i in range(block_count)
+    ]
+    # Group 0: a list at blocks 10-12, block 11 split around an image (fragment 13).
+    for i in (10, 11, 12):
+        blocks[i]["parent_index"] = 0
+    blocks[13]["parent_block_index"] = 11
+    # Group 1: a table at blocks 100-199, rendered row by row.
+    for i in range(100, 200):
+        blocks[i]["type"] = "table_row"
+        blocks[i]["parent_index"] = 1
+    groups = [
+        {"index": 0, "type": "list",
+         "children": {"block_ranges": [{"start": 10, "end": 12}], "block_group_ranges": []}},
+        {"index": 1, "type": "table",
+         "children": {"block_ranges": [{"start": 100, "end": 199}], "block_group_ranges": []}},
+        # Old children format.
+        {"index": 2, "type": "text_section",
+         "children": [{"block_index": 250}, {"block_group_index": 0}]},
+    ]
+    return {
+        "id": "rec-1",
+        "record_name": "Big PDF",
+        "block_containers": {"blocks": blocks, "block_groups": groups},
+    }
+
+
+def _encode(record: dict) -> bytes:
+    return fmt.encode_block_record(record, "vr-1", target_bytes=2048)
+
+
+class TestRoundTrip:
+    def test_full_decode_from_json_envelope(self) -> None:
+        record = _record()
+        assert fmt.decode_block_record(json.loads(_encode(record))) == record
+
+    def test_record_without_blocks(self) -> None:
+        record = {"id": "rec-1", "block_containers": {"blocks": [], "block_groups": []}}
+        assert fmt.decode_block_record(json.loads(_encode(record))) == record
+
+    def test_header_length_points_at_frames(self) -> None:
+        body = _encode(_record())
+        length = fmt.header_length(body[: fmt.MIN_PREFIX_BYTES])
+        assert body[length - len(b',"frames":"'):length] == b',"frames":"'
+
+    def test_legacy_envelope_is_not_block_framed(self) -> None:
+        assert fmt.header_length(b'{"isCompressed": false, "record": {}}') is None
+
+    def test_truncated_header_is_rejected(self) -> None:
+        body = _encode(_record())
+        with pytest.raises(ValueError):
+            fmt.parse_header(body[:100])
+
+
+class TestExpandSelection:
+    @pytest.fixture
+    def index(self) -> dict:
+        body = _encode(_record())
+        return fmt.parse_header(body[: fmt.header_length(body)])["header"]
+
+    def test_plain_block_brings_neighbours(self, index) -> None:
+        assert fmt.expand_selection(index, [50], []) == ({49, 50, 51}, set())
+
+    def test_group_member_brings_group_and_siblings_and_fragments(self, index) -> None:
+        blocks, groups = fmt.expand_selection(index, [12], [])
+        assert {10, 11, 12, 13} <= blocks
+        assert 0 in groups
+
+    def test_table_row_brings_table_but_not_every_row(self, index) -> None:
+        blocks, groups = fmt.expand_selection(index, [150], [])
+        assert groups == {1}
+        assert blocks == {149, 150, 151}
+
+    def test_table_hit_brings_all_rows_and_the_blocks_around_them(self, index) -> None:
+        blocks, groups = fmt.expand_selection(index, [], [1])
+        assert set(range(99, 201)) <= blocks
+        assert 1 in groups
+
+    def test_nested_groups_in_old_children_format(self, index) -> None:
+        blocks, groups = fmt.expand_selection(index, [], [2])
+        assert {250, 10, 11, 12, 13} <= blocks
+        assert {0, 2} <= groups
+
+    def test_out_of_range_indices_are_ignored(self, index) -> None:
+        assert fmt.expand_selection(index, [10_000], [99]) == (set(), set())
+
+
+class TestPartialRecord:
+    def test_fills_only_the_needed_frames(self) -> None:
+        record = _record()
+        body = _encode(record)
+        partial = fmt.new_partial_record(fmt.parse_header(body[: fmt.header_length(body)]), "doc-1")
+
+        needed = fmt.missing_frames(partial, [50], [])
+        for kind, frame in needed:
+            start, end = fmt.frame_byte_range(partial, kind, frame)
+            fmt.fill_frame(partial, kind, frame, body[start:end + 1])
+
+        blocks = partial["block_containers"]["blocks"]
+        assert len(blocks) == 300
+        assert blocks[50] == record["block_containers"]["blocks"][50]
+        assert blocks[299] == {}
+        assert partial["record_name"] == "Big PDF"
+        assert fmt.is_partial_record(partial)
+        assert fmt.missing_frames(partial, [50], []) == []
+
+    def test_frame_with_wrong_item_count_is_rejected(self) -> None:
+        body = _encode(_record())
+        partial = fmt.new_partial_record(fmt.parse_header(body[: fmt.header_length(body)]), "doc-1")
+        first = fmt.frame_byte_range(partial, "blocks", 0)
+        second = fmt.frame_byte_range(partial, "blocks", 1)
+        with pytest.raises(ValueError):
+            fmt.fill_frame(partial, "blocks", 0, body[second[0]:second[1] + 1])
+        assert first != second
+
+
+class TestCoalesceRanges:
+    def test_merges_close_ranges_only(self) -> None:
+        assert fmt.coalesce_ranges([(200, 299), (0, 99), (110, 150)], max_gap=10) == [
+            (0, 150), (200, 299),
+        ]
+
+
+class TestBlockFramesEnabled:
+    def test_off_by_default(self, monkeypatch) -> None:
+        monkeypatch.delenv("PIPESHUB_RECORD_BLOCK_FRAMES", raising=False)
+        assert fmt.block_frames_enabled() is False
+
+    def test_opt_in(self, monkeypatch) -> None:
+        monkeypatch.setenv("PIPESHUB_RECORD_BLOCK_FRAMES", "true")
+        assert fmt.block_frames_enabled() is True
@@ -0,0 +1,116 @@
+"""Tests for app.modules.transformers.chunking."""
+
+import pytest
+
+from app.models.blocks import Block
+from app.modules.transformers import chunking
+from app.modules.transformers.chunking import (
+    ChunkingStrategy,
+    chunk_block_text,
+    pack_sentences,
+    resolve_chunking_strategy,
+)
+from app.modules.transformers.vectorstore import _build_text_documents
+
+SENTENCE = "This is a moderately long sentence used for chunking tests. "
+
+
+class TestStrategies:
+    def test_sentence_embeds_every_sentence_and_the_block(self):
+        chunks = chunk_block_text("First one. Second one.", "en", ChunkingStrategy.SENTENCE)
+
+        assert [c.is_block for c in chunks] == [False, False, True]
+
+    def test_block_is_one_chunk(self):
+        chunks = chunk_block_text(SENTENCE * 50, "en", ChunkingStrategy.BLOCK)
+
+        assert len(chunks) == 1
+        assert chunks[0].is_block
+
+    def test_sentence_window_embeds_each_sentence_once(self):
+        text = (SENTENCE * 40).strip()
+        chunks = chunk_block_text(text, "en", ChunkingStrategy.SENTENCE_WINDOW)
+
+        assert len(chunks) > 1
+        assert not any(c.is_block for c in chunks)
+        assert all(len(c.text) <= chunking.SENTENCE_WINDOW_CHARS for c in chunks)
+        assert sum(c.text.count("moderately") for c in chunks) == 40
+
+    def test_short_block_is_a_single_window(self):
+        chunks = chunk_block_text("One. Two. Three.", "en", ChunkingStrategy.SENTENCE_WINDOW)
+
+        assert chunks == [chunking.TextChunk("One. Two. Three.", True)]
+
+    def test_token_window_overlaps(self, monkeypatch):
+        monkeypatch.setattr(chunking, "TOKEN_WINDOW_SIZE", 10)
+        monkeypatch.setattr(chunking, "TOKEN_WINDOW_OVERLAP", 2)
+        text = " ".join(f"w{i}" for i in range(25))
+
+        chunks = chunk_block_text(text, "en", ChunkingStrategy.TOKEN_WINDOW)
+
+        assert [c.text.split()[0] for c in chunks] == ["w0", "w8", "w16"]
+        assert chunks[-1].text.split()[-1] == "w24"
+
+    def test_token_window_without_whitespace_uses_a_character_budget(self, monkeypatch):
+        monkeypatch.setattr(chunking, "TOKEN_WINDOW_SIZE", 10)
+        monkeypatch.setattr(chunking, "TOKEN_WINDOW_OVERLAP", 0)
+        text = "这是一个句子。" * 20
+
+        chunks = chunk_block_text(text, "zh", ChunkingStrategy.TOKEN_WINDOW)
+
+        assert len(chunks) > 1
+
+    def test_pack_sentences_respects_budget(self):
+        windows = pack_sentences(["aaaa", "bbbb", "cccc"], max_chars=9)
+
+        assert windows == ["aaaa bbbb", "cccc"]
+
+
+class TestResolveChunkingStrategy:
+    CONFIG = {
+        "strategy": "sentence_window",
+        "connectors": {"SLACK": "block"},
+        "orgs": {
+            "org-1": {"strategy": "token_window", "connectors": {"DRIVE": "sentence"}},
+        },
+    }
+
+    @pytest.mark.parametrize(
+        ("org_id", "connector", "expected"),
+        [
+            ("org-1", "DRIVE", ChunkingStrategy.SENTENCE),
+            ("org-1", "SLACK", ChunkingStrategy.TOKEN_WINDOW),
+            ("org-2", "SLACK", ChunkingStrategy.BLOCK),
+            ("org-2", "DRIVE", ChunkingStrategy.SENTENCE_WINDOW),
+        ],
+    )
+    def test_most_specific_entry_wins(self, org_id, connector, expected):
+        assert resolve_chunking_strategy(self.CONFIG, org_id, connector) is expected
+
+    def test_env_default_without_config(self, monkeypatch):
+        monkeypatch.setenv(chunking.ENV_CHUNKING_STRATEGY, "block")
+
+        assert resolve_chunking_strategy(None, "org-1", "DRIVE") is ChunkingStrategy.BLOCK
+
+    def test_unknown_values_are_skipped(self, monkeypatch):
+        monkeypatch.delenv(chunking.ENV_CHUNKING_STRATEGY, raising=False)
+        config = {"strategy": "paragraph"}
+
+        assert resolve_chunking_strategy(config, "org-1", None) is ChunkingStrategy.SENTENCE
+
+
+class TestBuildTextDocumentsStrategy:
+    def test_every_document_maps_back_to_its_block(self):
+        blocks = [
+            Block(index=i, type="text", format="txt", data=(SENTENCE * 30).strip(), comments=[])
+            for i in range(2)
+        ]
+
+        docs = _build_text_documents(
+            blocks, "vr-1", "org-1", "en", ChunkingStrategy.SENTENCE_WINDOW
+        )
+
+        assert {d.metadata["blockId"] for d in docs} == {b.id for b in blocks}
+        assert len(docs) < len(
+            _build_text_documents(blocks, "vr-1", "org-1", "en", ChunkingStrategy.SENTENCE)
+        )
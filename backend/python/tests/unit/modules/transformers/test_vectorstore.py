@@ -299,7 +299,7 @@ class TestGetEmbeddingModelInstance:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 768)
         mock_embed.model_name = "test-model"
 
-        with patch("app.modules.transformers.vectorstore.get_default_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_default_embedding_model", return_value=mock_embed):
             result = await vs.get_embedding_model_instance()
 
         assert result is False  # default model is not multimodal
@@ -324,7 +324,7 @@ class TestGetEmbeddingModelInstance:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 1536)
         mock_embed.model_name = "text-embedding-3-small"
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             result = await vs.get_embedding_model_instance()
 
         assert result is True
@@ -353,7 +353,7 @@ class TestGetEmbeddingModelInstance:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 768)
         mock_embed.model_name = "nomic-embed-text"
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             await vs.get_embedding_model_instance()
 
         assert vs.base_url == "http://localhost:11434"
@@ -376,7 +376,7 @@ class TestGetEmbeddingModelInstance:
         mock_embed = MagicMock()
         mock_embed.aembed_query = AsyncMock(side_effect=RuntimeError("API error"))
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             with pytest.raises(IndexingError):
                 await vs.get_embedding_model_instance()
 
@@ -401,7 +401,7 @@ class TestGetEmbeddingModelInstance:
         # Add only 'model' attribute
         mock_embed.model = "test-model-via-model"
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             await vs.get_embedding_model_instance()
 
         assert vs.model_name == "test-model-via-model"
@@ -426,7 +426,7 @@ class TestGetEmbeddingModelInstance:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 1024)
         mock_embed.model_id = "test-model-via-id"
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             await vs.get_embedding_model_instance()
 
         assert vs.model_name == "test-model-via-id"
@@ -669,7 +669,57 @@ class TestProcessDocumentChunks:
         chunks = [Document(page_content="test", metadata={})]
         await vs._process_document_chunks(chunks, "rec-1")
 
-        vs.graph_provider.get_document.assert_awaited_once()
+        vs.graph_provider.get_document.assert_awaited()
+        vs.vector_db_service.upsert_points.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_acl_metadata_resolved_once_per_record(self):
+        """Every batch of a record shares one ACL lookup."""
+        from langchain_core.documents import Document
+        from app.modules.transformers.vectorstore import _DEFAULT_DOCUMENT_BATCH_SIZE
+        from app.services.vector_db.acl import ACL_TOKENS_FIELD
+
+        vs = _make_vectorstore()
+        vs.embedding_provider = "openai"
+        vs.graph_provider.get_document = AsyncMock(
+            return_value={"_key": "rec-1", "orgId": "org-1"}
+        )
+        vs.graph_provider.get_records_acl_principals = AsyncMock(
+            return_value=[{"recordId": "rec-1", "principalIds": ["user-1"]}]
+        )
+        vs._compute_dense_embeddings = AsyncMock(
+            side_effect=lambda texts, _: [[0.1]] * len(texts)
+        )
+        vs._compute_sparse_embeddings = AsyncMock(side_effect=lambda texts: [None] * len(texts))
+
+        chunks = [
+            Document(page_content=f"test {i}", metadata={})
+            for i in range(3 * _DEFAULT_DOCUMENT_BATCH_SIZE)
+        ]
+        await vs._process_document_chunks(chunks, "rec-1")
+
+        vs.graph_provider.get_records_acl_principals.assert_awaited_once()
+        assert vs.vector_db_service.upsert_points.await_count == 3
+        for call in vs.vector_db_service.upsert_points.await_args_list:
+            assert all(
+                point.payload["metadata"][ACL_TOKENS_FIELD] for point in call.kwargs["points"]
+            )
+
+    @pytest.mark.asyncio
+    async def test_known_org_skips_the_record_read(self):
+        """With the org in hand the ACL lookup goes straight to the batched query."""
+        vs = _make_vectorstore()
+        vs.graph_provider.get_records_acl_principals = AsyncMock(
+            return_value=[{"recordId": "rec-1", "connectorId": "drive", "principalIds": ["u1"]}]
+        )
+
+        metadata = await vs._resolve_record_acl_metadata("rec-1", "org-1")
+
+        vs.graph_provider.get_document.assert_not_awaited()
+        vs.graph_provider.get_records_acl_principals.assert_awaited_once_with(
+            "org-1", record_ids=["rec-1"]
+        )
+        assert metadata["connectorId"] == "drive"
 
     @pytest.mark.asyncio
     async def test_local_batch_failure_raises(self):
@@ -686,6 +736,56 @@ class TestProcessDocumentChunks:
             await vs._process_document_chunks(chunks, "rec-1")
 
 
+# ===================================================================
+# Embedding cache
+# ===================================================================
+
+class TestEmbeddingCacheIntegration:
+    """VectorStore routes dense embedding through the EmbeddingCache when set."""
+
+    @staticmethod
+    def _with_cache():
+        from app.services.cache.embedding_cache import EmbeddingCache
+
+        vs = _make_vectorstore()
+        vs.embedding_provider = "openAI"
+        vs._embedding_namespace = "ns"
+        vs.embedding_cache = MagicMock(spec=EmbeddingCache)
+        vs.embedding_cache.get_or_embed_dense = AsyncMock(return_value=[[0.1, 0.2]])
+        vs.dense_embeddings = MagicMock()
+        vs.dense_embeddings.aembed_documents = AsyncMock(return_value=[[0.3, 0.4]])
+        return vs
+
+    @pytest.mark.asyncio
+    async def test_dense_goes_through_cache(self):
+        vs = self._with_cache()
+
+        result = await vs._compute_dense_embeddings(["hello"], "rec-1")
+
+        assert result == [[0.1, 0.2]]
+        namespace, texts, embed = vs.embedding_cache.get_or_embed_dense.await_args.args
+        assert (namespace, texts) == ("ns", ["hello"])
+        # The miss callback is the model itself, wrapped in the batch timeout.
+        assert await embed(["x"]) == [[0.3, 0.4]]
+        vs.dense_embeddings.aembed_documents.assert_awaited_once_with(["x"])
+
+    @pytest.mark.asyncio
+    async def test_without_cache_embeds_directly(self):
+        vs = self._with_cache()
+        vs.embedding_cache = None
+
+        assert await vs._compute_dense_embeddings(["hello"], "rec-1") == [[0.3, 0.4]]
+
+    @pytest.mark.asyncio
+    async def test_cache_bypassed_before_model_is_initialised(self):
+        vs = self._with_cache()
+        vs._embedding_namespace = None
+
+        await vs._compute_dense_embeddings(["hello"], "rec-1")
+
+        vs.embedding_cache.get_or_embed_dense.assert_not_awaited()
+
+
 # ===================================================================
 # _create_embeddings
 # ===================================================================
@@ -1370,7 +1470,7 @@ class TestGetEmbeddingModelInstance:
             "embedding": []
         })
 
-        with patch("app.modules.transformers.vectorstore.get_default_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_default_embedding_model", return_value=mock_embeddings):
             result = await vs.get_embedding_model_instance()
 
         assert result is False  # Default is not multimodal
@@ -1399,7 +1499,7 @@ class TestGetEmbeddingModelInstance:
 
         vs.config_service.get_config = AsyncMock(return_value=config)
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embeddings):
             result = await vs.get_embedding_model_instance()
 
         assert result is True
@@ -1421,7 +1521,7 @@ class TestGetEmbeddingModelInstance:
             }]
         })
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embeddings):
             with pytest.raises(IndexingError, match="Failed to get embedding model"):
                 await vs.get_embedding_model_instance()
 
@@ -1437,7 +1537,7 @@ class TestGetEmbeddingModelInstance:
 
         vs.config_service.get_config = AsyncMock(return_value={"embedding": []})
 
-        with patch("app.modules.transformers.vectorstore.get_default_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_default_embedding_model", return_value=mock_embeddings):
             result = await vs.get_embedding_model_instance()
 
         assert vs.model_name == "my-model"
@@ -1454,7 +1554,7 @@ class TestGetEmbeddingModelInstance:
 
         vs.config_service.get_config = AsyncMock(return_value={"embedding": []})
 
-        with patch("app.modules.transformers.vectorstore.get_default_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_default_embedding_model", return_value=mock_embeddings):
             result = await vs.get_embedding_model_instance()
 
         assert vs.model_name == "my-model-id"
@@ -1470,7 +1570,7 @@ class TestGetEmbeddingModelInstance:
 
         vs.config_service.get_config = AsyncMock(return_value={"embedding": []})
 
-        with patch("app.modules.transformers.vectorstore.get_default_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_default_embedding_model", return_value=mock_embeddings):
             await vs.get_embedding_model_instance()
 
         assert vs.model_name == "unknown"
@@ -1502,7 +1602,7 @@ class TestGetEmbeddingModelInstance:
 
         vs.config_service.get_config = AsyncMock(return_value=config)
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embeddings):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embeddings):
             await vs.get_embedding_model_instance()
 
         assert vs.aws_access_key_id == "AKID"
@@ -2342,11 +2442,38 @@ class TestGetEmbeddingModelInstanceUnknown:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 1024)
         # No model_name, model, or model_id attributes
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             await vs.get_embedding_model_instance()
 
         assert vs.model_name == "unknown"
 
+    @pytest.mark.asyncio
+    async def test_cache_namespace_follows_the_full_config(self):
+        """Configs that differ only in provider settings never share cached vectors."""
+        from app.utils.embedding_runtime import reset_embedding_runtimes
+
+        namespaces = []
+        for endpoint in ("https://a.example", "https://b.example"):
+            reset_embedding_runtimes()
+            vs = _make_vectorstore()
+            config = {
+                "provider": "openAICompatible",
+                "configuration": {"apiKey": "key", "model": "m", "endpoint": endpoint},
+                "isDefault": True,
+            }
+            vs.config_service.get_config = AsyncMock(return_value={"embedding": [config]})
+            vs._initialize_collection = AsyncMock()
+            mock_embed = MagicMock(spec=[])
+            mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 8)
+
+            with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
+                await vs.get_embedding_model_instance()
+            namespaces.append(vs._embedding_namespace)
+        reset_embedding_runtimes()
+
+        assert vs.model_name == "unknown"
+        assert namespaces[0] != namespaces[1]
+
     @pytest.mark.asyncio
     async def test_aws_bedrock_credentials_stored(self):
         """AWS Bedrock credentials are stored during initialization."""
@@ -2374,7 +2501,7 @@ class TestGetEmbeddingModelInstanceUnknown:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 1024)
         mock_embed.model_name = "titan-embed"
 
-        with patch("app.modules.transformers.vectorstore.get_embedding_model", return_value=mock_embed):
+        with patch("app.utils.embedding_runtime.get_embedding_model", return_value=mock_embed):
             await vs.get_embedding_model_instance()
 
         assert vs.aws_access_key_id == "AKID"
@@ -524,7 +524,7 @@ class TestGetEmbeddingModelInstanceBedrock:
         mock_embed.model_name = "amazon.titan-embed-v1"
 
         with patch(
-            "app.modules.transformers.vectorstore.get_embedding_model",
+            "app.utils.embedding_runtime.get_embedding_model",
             return_value=mock_embed,
         ):
             await vs.get_embedding_model_instance()
@@ -554,7 +554,7 @@ class TestGetEmbeddingModelInstanceBedrock:
         mock_embed.aembed_query = AsyncMock(return_value=[0.1] * 1024)
 
         with patch(
-            "app.modules.transformers.vectorstore.get_embedding_model",
+            "app.utils.embedding_runtime.get_embedding_model",
             return_value=mock_embed,
         ):
             await vs.get_embedding_model_instance()
@@ -581,12 +581,12 @@ class TestGetEmbeddingModelInstanceBedrock:
         mock_embed.model_name = "test-model"
 
         with patch(
-            "app.modules.transformers.vectorstore.get_embedding_model",
+            "app.utils.embedding_runtime.get_embedding_model",
             return_value=mock_embed,
         ):
             await vs.get_embedding_model_instance()
 
-        assert vs.dense_embeddings is mock_embed
+        assert vs.dense_embeddings.embeddings is mock_embed
 
 
 # ===================================================================
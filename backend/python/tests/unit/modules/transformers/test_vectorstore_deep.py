@@ -209,12 +209,12 @@ class TestGetEmbeddingModelInstance:
         vs._initialize_collection = AsyncMock()
 
         with patch(
-            "app.modules.transformers.vectorstore.get_default_embedding_model",
+            "app.utils.embedding_runtime.get_default_embedding_model",
             return_value=mock_embeddings,
         ):
             result = await vs.get_embedding_model_instance()
 
-        assert vs.dense_embeddings is mock_embeddings
+        assert vs.dense_embeddings.embeddings is mock_embeddings
         assert vs.model_name == "default-model"
 
     @pytest.mark.asyncio
@@ -242,12 +242,12 @@ class TestGetEmbeddingModelInstance:
         vs._initialize_collection = AsyncMock()
 
         with patch(
-            "app.modules.transformers.vectorstore.get_embedding_model",
+            "app.utils.embedding_runtime.get_embedding_model",
             return_value=mock_embeddings,
         ):
             result = await vs.get_embedding_model_instance()
 
-        assert vs.dense_embeddings is mock_embeddings
+        assert vs.dense_embeddings.embeddings is mock_embeddings
         assert vs.is_multimodal_embedding is False
 
     @pytest.mark.asyncio
@@ -263,7 +263,7 @@ class TestGetEmbeddingModelInstance:
         )
 
         with patch(
-            "app.modules.transformers.vectorstore.get_default_embedding_model",
+            "app.utils.embedding_runtime.get_default_embedding_model",
             return_value=mock_embeddings,
         ):
             with pytest.raises(IndexingError):
@@ -1334,6 +1334,8 @@ def _make_vectorstore_p1(supports_sparse=False):
     vs._capabilities = caps
     vs._sparse_embedder = None
     vs._sparse_embedder_lock = None
+    vs.embedding_cache = None
+    vs._embedding_namespace = None
 
     # Dense embeddings pre-configured
     dense = MagicMock()
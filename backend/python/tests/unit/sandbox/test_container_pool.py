@@ -0,0 +1,94 @@
+"""Tests for app.sandbox.container_pool."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.sandbox.container_pool import WarmContainerPool
+from app.sandbox.models import SandboxLanguage
+
+
+def _make_pool(*, size=2, max_uses=3, lifetime_seconds=600.0, reset_ok=True):
+    created = []
+    destroyed = []
+
+    def create(language):
+        container = MagicMock(name=f"{language.value}-{len(created)}")
+        created.append(container)
+        return container
+
+    pool = WarmContainerPool(
+        create=create,
+        reset=MagicMock(return_value=reset_ok),
+        destroy=destroyed.append,
+        languages=[SandboxLanguage.PYTHON, SandboxLanguage.TYPESCRIPT],
+        size=size,
+        max_uses=max_uses,
+        lifetime_seconds=lifetime_seconds,
+    )
+    return pool, created, destroyed
+
+
+class TestWarmContainerPool:
+    def test_fill_tops_up_every_language(self):
+        pool, created, _ = _make_pool(size=2)
+        assert pool.fill() == 4
+        assert pool.idle_count(SandboxLanguage.PYTHON) == 2
+        assert pool.idle_count(SandboxLanguage.TYPESCRIPT) == 2
+        assert pool.fill() == 0
+        assert len(created) == 4
+
+    def test_acquire_returns_none_when_empty_or_not_pooled(self):
+        pool, _, _ = _make_pool()
+        assert pool.acquire(SandboxLanguage.PYTHON) is None
+        pool.fill()
+        assert pool.acquire(SandboxLanguage.SQLITE) is None
+
+    def test_release_resets_and_reuses(self):
+        pool, _, destroyed = _make_pool(size=1)
+        pool.fill()
+        pooled = pool.acquire(SandboxLanguage.PYTHON)
+        assert pool.idle_count(SandboxLanguage.PYTHON) == 0
+
+        assert pool.release(pooled, reusable=True) is True
+        pool._reset.assert_called_once_with(pooled.container)
+        assert pool.acquire(SandboxLanguage.PYTHON) is pooled
+        assert destroyed == []
+
+    @pytest.mark.parametrize("reusable,reset_ok", [(False, True), (True, False)])
+    def test_unusable_containers_are_destroyed(self, reusable, reset_ok):
+        pool, _, destroyed = _make_pool(size=1, reset_ok=reset_ok)
+        pool.fill()
+        pooled = pool.acquire(SandboxLanguage.PYTHON)
+
+        assert pool.release(pooled, reusable=reusable) is False
+        assert destroyed == [pooled.container]
+        assert pool.idle_count(SandboxLanguage.PYTHON) == 0
+
+    def test_container_retired_after_max_uses(self):
+        pool, _, destroyed = _make_pool(size=1, max_uses=2)
+        pool.fill()
+        pooled = pool.acquire(SandboxLanguage.PYTHON)
+        assert pool.release(pooled, reusable=True) is True
+        pooled = pool.acquire(SandboxLanguage.PYTHON)
+        assert pool.release(pooled, reusable=True) is False
+        assert destroyed == [pooled.container]
+
+    def test_acquire_skips_containers_near_end_of_lifetime(self):
+        pool, _, destroyed = _make_pool(size=1, lifetime_seconds=100.0)
+        pool.fill()
+        assert pool.acquire(SandboxLanguage.PYTHON, min_remaining_seconds=500) is None
+        assert len(destroyed) == 1
+        pool.fill()
+        assert pool.acquire(SandboxLanguage.PYTHON, min_remaining_seconds=10) is not None
+
+    def test_close_removes_idle_and_refuses_returns(self):
+        pool, _, destroyed = _make_pool(size=1)
+        pool.fill()
+        pooled = pool.acquire(SandboxLanguage.PYTHON)
+        pool.close()
+
+        assert len(destroyed) == 1  # the idle TypeScript container
+        assert pool.release(pooled, reusable=True) is False
+        assert len(destroyed) == 2
+        assert pool.fill() == 0
@@ -0,0 +1,106 @@
+"""Tests for app.sandbox.dependency_cache."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.sandbox.dependency_cache import DependencyCache, dependency_cache_key
+from app.sandbox.models import SandboxLanguage
+
+
+class TestDependencyCacheKey:
+    def test_order_and_duplicates_do_not_matter(self):
+        a = dependency_cache_key(["pandas", "numpy"], SandboxLanguage.PYTHON, namespace="img")
+        b = dependency_cache_key(["numpy", "pandas", "pandas"], SandboxLanguage.PYTHON, namespace="img")
+        assert a == b
+
+    def test_namespace_language_and_versions_are_part_of_the_key(self):
+        base = dependency_cache_key(["pandas"], SandboxLanguage.PYTHON, namespace="img-1")
+        assert base != dependency_cache_key(["pandas"], SandboxLanguage.PYTHON, namespace="img-2")
+        assert base != dependency_cache_key(["pandas"], SandboxLanguage.TYPESCRIPT, namespace="img-1")
+        assert base != dependency_cache_key(["pandas==2.2.0"], SandboxLanguage.PYTHON, namespace="img-1")
+
+
+class TestDependencyCache:
+    @pytest.mark.asyncio
+    async def test_miss_installs_then_hit_reuses(self, tmp_path):
+        cache = DependencyCache(root=str(tmp_path), max_entries=4)
+        calls = []
+
+        async def install(target):
+            calls.append(target)
+            with open(os.path.join(target, "marker"), "w") as f:
+                f.write("ok")
+
+        path, cached = await cache.get_or_install("k1", install)
+        assert cached is False
+        assert path == cache.entry_path("k1")
+        assert open(os.path.join(path, "marker")).read() == "ok"
+
+        again, cached = await cache.get_or_install("k1", install)
+        assert (again, cached) == (path, True)
+        assert len(calls) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_failed_install_caches_nothing(self, tmp_path):
+        cache = DependencyCache(root=str(tmp_path), max_entries=4)
+
+        async def install(target):
+            raise RuntimeError("pip failed")
+
+        with pytest.raises(RuntimeError, match="pip failed"):
+            await cache.get_or_install("k1", install)
+        assert cache.lookup("k1") is None
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_install(self, tmp_path):
+        cache = DependencyCache(root=str(tmp_path), max_entries=4)
+        calls = 0
+
+        async def install(target):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        results = await asyncio.gather(*(cache.get_or_install("k1", install) for _ in range(5)))
+        assert calls == 1
+        assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_beyond_max(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.sandbox.dependency_cache._EVICTION_GRACE_SECONDS", 0)
+        cache = DependencyCache(root=str(tmp_path), max_entries=2)
+
+        async def install(target):
+            pass
+
+        await cache.get_or_install("old", install)
+        await cache.get_or_install("mid", install)
+        os.utime(cache.entry_path("old"), (time.time() - 100, time.time() - 100))
+        await cache.get_or_install("new", install)
+
+        assert cache.lookup("old") is None
+        assert cache.lookup("mid") is not None
+        assert cache.lookup("new") is not None
+
+    @pytest.mark.asyncio
+    async def test_recently_used_entries_survive_eviction(self, tmp_path):
+        cache = DependencyCache(root=str(tmp_path), max_entries=1)
+
+        async def install(target):
+            pass
+
+        await cache.get_or_install("a", install)
+        await cache.get_or_install("b", install)
+        # "a" may still be on a running execution's PYTHONPATH.
+        assert cache.lookup("a") is not None
+
+    def test_disabled_by_zero_max_entries(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SANDBOX_DEPS_CACHE_MAX_ENTRIES", "0")
+        cache = DependencyCache(root=str(tmp_path / "cache"))
+        assert cache.enabled is False
+        assert not os.path.exists(tmp_path / "cache")
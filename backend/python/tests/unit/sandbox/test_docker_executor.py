@@ -6,23 +6,29 @@ import os
 import sys
 import tarfile
 import types
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
-from app.sandbox.docker_executor import DockerExecutor
+from app.sandbox.docker_executor import _WARM_RESET_SCRIPT, DockerExecutor
 from app.sandbox.models import ExecutionResult, SandboxLanguage
 
 
 @pytest.fixture(autouse=True)
-def _fake_docker_module():
+def _fake_docker_module(tmp_path, monkeypatch):
     """Provide a fake ``docker`` top-level module for tests.
 
     The real docker SDK is not a dependency of this unit-test runner; the
     executor imports it lazily inside methods, so we stuff a minimal stand-in
     into ``sys.modules`` before each test and tear it down after. Tests that
     want to verify behaviour patch ``docker.from_env`` on this fake module.
+
+    The warm pool is off and the dependency cache is per-test unless a test
+    opts in, so the cold-path tests below see exactly one install and one
+    ``_run_container`` per execution.
     """
+    monkeypatch.setenv("SANDBOX_WARM_POOL_SIZE", "0")
+    monkeypatch.setenv("SANDBOX_DEPS_CACHE_DIR", str(tmp_path / "deps_cache"))
     created = False
     if "docker" not in sys.modules:
         fake = types.ModuleType("docker")
@@ -1260,3 +1266,212 @@ class TestRunContainerKillFailureInExcept:
                     timeout=5,
                 )
         container.kill.assert_called()
+
+
+# ---------------------------------------------------------------------------
+# Dependency cache and warm container pool
+# ---------------------------------------------------------------------------
+
+
+class TestDependencyCacheReuse:
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        root = str(tmp_path / "docker_sandbox")
+        monkeypatch.setattr("app.sandbox.docker_executor._SANDBOX_ROOT", root)
+        return DockerExecutor()
+
+    @pytest.mark.asyncio
+    async def test_same_package_set_installs_once(self, executor):
+        captured_tars = []
+
+        async def fake_run_container(*, deps_tar, deps_target, **kwargs):
+            captured_tars.append((deps_tar, deps_target))
+            return ExecutionResult(success=True, exit_code=0)
+
+        with patch.object(
+            executor, "_install_dependencies", return_value=(b"deps-tar", "/deps"),
+        ) as install, patch.object(executor, "_run_container", side_effect=fake_run_container):
+            await executor.execute("import pandas", SandboxLanguage.PYTHON, packages=["pandas", "numpy"])
+            await executor.execute("import numpy", SandboxLanguage.PYTHON, packages=["numpy", "pandas"])
+
+        install.assert_called_once()
+        assert captured_tars == [(b"deps-tar", "/deps"), (b"deps-tar", "/deps")]
+        assert executor.deps_cache.stats() == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_different_image_reinstalls(self, executor):
+        with patch.object(
+            executor, "_install_dependencies", return_value=(b"deps-tar", "/deps"),
+        ) as install, patch.object(
+            executor, "_run_container", new_callable=AsyncMock,
+            return_value=ExecutionResult(success=True, exit_code=0),
+        ):
+            with patch.object(executor, "_dependency_namespace", return_value="docker:sha256:aaa"):
+                await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+            with patch.object(executor, "_dependency_namespace", return_value="docker:sha256:bbb"):
+                await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+
+        assert install.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_install_is_not_cached(self, executor):
+        with patch.object(
+            executor, "_install_dependencies", side_effect=RuntimeError("Package install failed"),
+        ) as install, patch.object(executor, "_run_container", new_callable=AsyncMock) as run:
+            first = await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+            second = await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+
+        assert first.success is False and second.success is False
+        assert install.call_count == 2
+        run.assert_not_called()
+
+
+def _make_warm_container(*, diff=None, exec_results=None):
+    container = MagicMock()
+    container.exec_run.side_effect = exec_results or [
+        (0, (b"hello\n", b"")),  # the run
+        (0, b""),                # the reset
+    ]
+    container.diff.return_value = diff or []
+    container.get_archive.side_effect = Exception("no output")
+    container.attrs = {"Mounts": [], "HostConfig": {"Tmpfs": {"/tmp": "size=100M"}}}
+    return container
+
+
+class TestWarmPoolExecution:
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        root = str(tmp_path / "docker_sandbox")
+        monkeypatch.setattr("app.sandbox.docker_executor._SANDBOX_ROOT", root)
+        with patch("app.sandbox.container_pool.WarmContainerPool.start"):
+            executor = DockerExecutor(warm_pool_size=1)
+        yield executor
+        executor.close()
+
+    def _stock_pool(self, executor, container):
+        executor.warm_pool._create = lambda language: container
+        executor.warm_pool.fill()
+
+    @pytest.mark.asyncio
+    async def test_uses_idle_container_and_returns_it(self, executor):
+        container = _make_warm_container()
+        self._stock_pool(executor, container)
+
+        with patch.object(executor, "_run_container", new_callable=AsyncMock) as cold:
+            result = await executor.execute("print('hello')", SandboxLanguage.PYTHON, env={"A": "1"})
+
+        cold.assert_not_called()
+        assert result.success is True
+        assert result.stdout == "hello\n"
+        run_call = container.exec_run.call_args_list[0]
+        assert run_call.args[0] == ["sh", "-c", "python3 /src/main.py"]
+        assert run_call.kwargs["environment"]["A"] == "1"
+        assert run_call.kwargs["workdir"] == "/src"
+        reset_call = container.exec_run.call_args_list[1]
+        assert reset_call.kwargs["user"] == "root"
+        assert executor.warm_pool.idle_count(SandboxLanguage.PYTHON) == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_cold_container_when_pool_is_empty(self, executor):
+        with patch.object(
+            executor, "_run_container", new_callable=AsyncMock,
+            return_value=ExecutionResult(success=True, exit_code=0),
+        ) as cold:
+            result = await executor.execute("print(1)", SandboxLanguage.PYTHON)
+        assert result.success is True
+        cold.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_deps_are_injected_into_warm_container(self, executor):
+        container = _make_warm_container()
+        self._stock_pool(executor, container)
+
+        with patch.object(executor, "_install_dependencies", return_value=(b"deps-tar", "/deps")):
+            await executor.execute("import pandas", SandboxLanguage.PYTHON, packages=["pandas"])
+
+        assert call("/deps", b"deps-tar") in container.put_archive.call_args_list
+        assert container.exec_run.call_args_list[0].kwargs["environment"]["PYTHONPATH"] == "/deps"
+
+    @pytest.mark.asyncio
+    async def test_container_touched_outside_scratch_paths_is_retired(self, executor):
+        container = _make_warm_container(diff=[
+            {"Path": "/src/main.py", "Kind": 1},
+            {"Path": "/home/sandbox/node_modules/docx/index.js", "Kind": 0},
+        ])
+        self._stock_pool(executor, container)
+
+        await executor.execute("console.log(1)", SandboxLanguage.TYPESCRIPT)
+
+        container.remove.assert_called_once_with(force=True)
+        assert executor.warm_pool.idle_count(SandboxLanguage.TYPESCRIPT) == 0
+
+    def test_reset_wipes_and_verifies_dev_shm(self):
+        script = _WARM_RESET_SCRIPT
+        assert "/dev/shm/*" in script and "/dev/shm/.[!.]*" in script
+        # The trailing check fails the reset if anything is left in /dev/shm.
+        assert script.rstrip().endswith('-print -quit 2>/dev/null)" ]')
+        assert "/dev/shm" in script.rsplit("find", 1)[1]
+
+    @pytest.mark.asyncio
+    async def test_leftover_in_memory_files_retire_container(self, executor):
+        container = _make_warm_container(exec_results=[
+            (0, (b"", b"")),
+            (1, b""),  # reset found files left in /dev/shm
+        ])
+        self._stock_pool(executor, container)
+
+        await executor.execute("print(1)", SandboxLanguage.PYTHON)
+
+        container.remove.assert_called_once_with(force=True)
+        assert executor.warm_pool.idle_count(SandboxLanguage.PYTHON) == 0
+
+    @pytest.mark.asyncio
+    async def test_container_with_unwiped_mount_is_retired(self, executor):
+        container = _make_warm_container()
+        container.attrs["Mounts"] = [{"Type": "volume", "Destination": "/data"}]
+        self._stock_pool(executor, container)
+
+        await executor.execute("print(1)", SandboxLanguage.PYTHON)
+
+        assert len(container.exec_run.call_args_list) == 1  # the run; no reset
+        container.remove.assert_called_once_with(force=True)
+
+    @pytest.mark.asyncio
+    async def test_timeout_discards_container(self, executor):
+        container = _make_warm_container()
+        self._stock_pool(executor, container)
+
+        async def _raise_timeout(coro, timeout):
+            coro.close()
+            raise asyncio.TimeoutError()
+
+        with patch("app.sandbox.docker_executor.asyncio.wait_for", side_effect=_raise_timeout):
+            result = await executor.execute("while True: pass", SandboxLanguage.PYTHON, timeout_seconds=1)
+
+        assert result.success is False
+        assert "timed out" in (result.error or "")
+        container.remove.assert_called_once_with(force=True)
+        assert executor.warm_pool.idle_count(SandboxLanguage.PYTHON) == 0
+
+    def test_reset_allows_scratch_only_changes(self):
+        container = _make_warm_container(
+            exec_results=[(0, b"")],
+            diff=[
+                {"Path": "/src", "Kind": 0},
+                {"Path": "/output", "Kind": 0},
+                {"Path": "/home/sandbox/.cache/matplotlib", "Kind": 1},
+            ],
+        )
+        assert DockerExecutor._reset_warm_container(container) is True
+
+    def test_create_warm_container_is_offline_and_self_expiring(self, executor):
+        client = MagicMock()
+        with patch("docker.from_env", return_value=client):
+            executor._create_warm_container(SandboxLanguage.PYTHON)
+
+        kwargs = client.containers.create.call_args.kwargs
+        assert kwargs["network_mode"] == "none"
+        assert kwargs["network_disabled"] is True
+        assert kwargs["auto_remove"] is True
+        assert kwargs["command"][0] == "sleep"
+        client.containers.create.return_value.start.assert_called_once()
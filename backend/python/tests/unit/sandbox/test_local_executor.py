@@ -8,10 +8,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.sandbox.dependency_cache import DependencyCache
 from app.sandbox.local_executor import LocalExecutor, _SANDBOX_ROOT
 from app.sandbox.models import ExecutionResult, SandboxLanguage
 
 
+@pytest.fixture(autouse=True)
+def _isolated_deps_cache(tmp_path, monkeypatch):
+    """Give every test its own dependency cache so installs never leak between tests."""
+    monkeypatch.setenv("SANDBOX_DEPS_CACHE_DIR", str(tmp_path / "deps_cache"))
+
+
 class TestLocalExecutorInit:
     def test_creates_sandbox_root(self, tmp_path, monkeypatch):
         monkeypatch.setattr("app.sandbox.local_executor._SANDBOX_ROOT", str(tmp_path / "sandbox"))
@@ -179,7 +186,8 @@ class TestLocalExecutorPython:
 
     @pytest.mark.asyncio
     async def test_python_install_uses_target_and_sets_pythonpath(self, executor, tmp_path):
-        """pip must install to <work_dir>/deps and PYTHONPATH must point there."""
+        """With the deps cache off, pip installs to <work_dir>/deps and PYTHONPATH points there."""
+        executor.deps_cache = DependencyCache(max_entries=0)
         captured_calls = []
 
         async def _mock_sub(cmd, cwd, timeout, env, **kwargs):
@@ -251,7 +259,8 @@ class TestLocalExecutorTypescript:
 
     @pytest.mark.asyncio
     async def test_typescript_install_uses_prefix_and_sets_node_path(self, executor):
-        """npm must install with --prefix <work_dir> and NODE_PATH must point at <work_dir>/node_modules."""
+        """With the deps cache off, npm installs with --prefix <work_dir> and NODE_PATH points at <work_dir>/node_modules."""
+        executor.deps_cache = DependencyCache(max_entries=0)
         captured_calls = []
 
         async def _mock_sub(cmd, cwd, timeout, env, **kwargs):
@@ -467,3 +476,67 @@ class TestCleanup:
     def test_cleanup_nonexistent(self, tmp_path, monkeypatch):
         monkeypatch.setattr("app.sandbox.local_executor._SANDBOX_ROOT", str(tmp_path))
         LocalExecutor.cleanup_execution("nonexistent")  # should not raise
+
+
+class TestLocalDependencyCache:
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.sandbox.local_executor._SANDBOX_ROOT", str(tmp_path / "sandbox"))
+        return LocalExecutor(deps_cache=DependencyCache(root=str(tmp_path / "deps_cache"), max_entries=4))
+
+    @pytest.mark.asyncio
+    async def test_python_packages_installed_once_and_shared(self, executor, tmp_path):
+        captured_calls = []
+
+        async def _mock_sub(cmd, cwd, timeout, env, **kwargs):
+            captured_calls.append({"cmd": cmd, "env": env})
+            return ExecutionResult(success=True, exit_code=0)
+
+        with patch(
+            "app.sandbox.local_executor._split_host_installed_python",
+            side_effect=lambda pkgs: ([], pkgs),
+        ), patch.object(executor, "_subprocess", side_effect=_mock_sub):
+            await executor.execute("import a", SandboxLanguage.PYTHON, packages=["pandas", "numpy"])
+            await executor.execute("import b", SandboxLanguage.PYTHON, packages=["numpy", "pandas"])
+
+        pip_calls = [c for c in captured_calls if c["cmd"][1:4] == ["-m", "pip", "install"]]
+        assert len(pip_calls) == 1
+        run_paths = [c["env"]["PYTHONPATH"] for c in captured_calls if c not in pip_calls]
+        assert len(run_paths) == 2 and run_paths[0] == run_paths[1]
+        assert run_paths[0].startswith(str(tmp_path / "deps_cache"))
+        assert os.path.isdir(run_paths[0])
+
+    @pytest.mark.asyncio
+    async def test_failed_pip_install_is_not_cached(self, executor):
+        pip_result = ExecutionResult(success=False, stderr="ERROR", exit_code=1)
+
+        with patch(
+            "app.sandbox.local_executor._split_host_installed_python",
+            return_value=([], ["pandas"]),
+        ), patch.object(
+            executor, "_subprocess", new_callable=AsyncMock, return_value=pip_result,
+        ) as mock_sub:
+            first = await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+            second = await executor.execute("1", SandboxLanguage.PYTHON, packages=["pandas"])
+
+        assert "pip install failed" in (first.error or "")
+        assert "pip install failed" in (second.error or "")
+        assert mock_sub.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_typescript_node_path_points_at_cache_entry(self, executor, tmp_path):
+        captured_calls = []
+
+        async def _mock_sub(cmd, cwd, timeout, env, **kwargs):
+            captured_calls.append({"cmd": cmd, "env": env})
+            return ExecutionResult(success=True, exit_code=0)
+
+        with patch.object(executor, "_subprocess", side_effect=_mock_sub):
+            await executor.execute("console.log(1)", SandboxLanguage.TYPESCRIPT, packages=["chart.js"])
+            await executor.execute("console.log(2)", SandboxLanguage.TYPESCRIPT, packages=["chart.js"])
+
+        npm_calls = [c for c in captured_calls if c["cmd"][0] == "npm"]
+        assert len(npm_calls) == 1
+        node_path = captured_calls[-1]["env"]["NODE_PATH"]
+        assert node_path.startswith(str(tmp_path / "deps_cache"))
+        assert node_path.endswith("node_modules")
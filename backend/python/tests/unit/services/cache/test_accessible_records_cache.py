@@ -24,29 +24,84 @@ class FakeRedis:
     def __init__(self) -> None:
         self.strings: dict[str, str] = {}
         self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
         self.expires: dict[str, int] = {}
         self.calls: list[tuple] = []
+        self.pipelines_executed = 0
+
+    def register_script(self, script):
+        async def release_lease(keys, args):
+            # The cache's only script: compare-and-delete of a lease.
+            self.calls.append(("release_lease", keys[0]))
+            if self.strings.get(keys[0]) == args[0]:
+                return await self.delete(keys[0])
+            return 0
+        return release_lease
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
 
     async def get(self, key):
         self.calls.append(("get", key))
         return self.strings.get(key)
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, nx=False, px=None):
         self.calls.append(("set", key, ex))
+        if nx and key in self.strings:
+            return None
         self.strings[key] = value
         if ex is not None:
             self.expires[key] = ex
         return True
 
+    async def exists(self, key):
+        self.calls.append(("exists", key))
+        return int(key in self.strings or key in self.hashes)
+
     async def hget(self, key, field):
         self.calls.append(("hget", key, field))
         return self.hashes.get(key, {}).get(field)
 
-    async def hset(self, key, field, value):
+    async def hgetall(self, key):
+        self.calls.append(("hgetall", key))
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, field=None, value=None, mapping=None):
         self.calls.append(("hset", key, field))
-        self.hashes.setdefault(key, {})[field] = value
+        entries = dict(mapping or {})
+        if field is not None:
+            entries[field] = value
+        self.hashes.setdefault(key, {}).update(entries)
+        return len(entries)
+
+    async def hsetnx(self, key, field, value):
+        self.calls.append(("hsetnx", key, field))
+        fields = self.hashes.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = value
         return 1
 
+    async def zadd(self, key, mapping):
+        self.calls.append(("zadd", key))
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zremrangebyscore(self, key, min_score, max_score):
+        self.calls.append(("zremrangebyscore", key))
+        assert min_score == "-inf" and max_score.startswith("(")
+        bound = float(max_score[1:])
+        members = self.zsets.get(key, {})
+        stale = [m for m, score in members.items() if score < bound]
+        for member in stale:
+            del members[member]
+        return len(stale)
+
+    async def zrangebyscore(self, key, min_score, max_score):
+        self.calls.append(("zrangebyscore", key, min_score))
+        assert max_score == "+inf"
+        return [m for m, score in self.zsets.get(key, {}).items() if score >= min_score]
+
     async def expire(self, key, ttl):
         self.calls.append(("expire", key, ttl))
         self.expires[key] = ttl
@@ -58,6 +113,7 @@ class FakeRedis:
         for key in keys:
             removed += 1 if self.strings.pop(key, None) is not None else 0
             removed += 1 if self.hashes.pop(key, None) is not None else 0
+            removed += 1 if self.zsets.pop(key, None) is not None else 0
             self.expires.pop(key, None)
         return removed
 
@@ -68,17 +124,57 @@ class FakeRedis:
         return None
 
 
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._queued: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._queued.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self._redis.pipelines_executed += 1
+        queued, self._queued = self._queued, []
+        return [await command(*args, **kwargs) for command, args, kwargs in queued]
+
+
 class BrokenRedis(FakeRedis):
     async def get(self, key):
         raise ConnectionError("redis down")
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, nx=False, px=None):
         raise ConnectionError("redis down")
 
     async def hget(self, key, field):
         raise ConnectionError("redis down")
 
-    async def hset(self, key, field, value):
+    async def hgetall(self, key):
+        raise ConnectionError("redis down")
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        raise ConnectionError("redis down")
+
+    async def hsetnx(self, key, field, value):
+        raise ConnectionError("redis down")
+
+    async def zadd(self, key, mapping):
+        raise ConnectionError("redis down")
+
+    async def zrangebyscore(self, key, min_score, max_score):
         raise ConnectionError("redis down")
 
     async def delete(self, *keys):
@@ -100,9 +196,9 @@ def _loader(value, counter=None):
 class TestKeySchema:
     def test_keys_are_namespaced_and_org_scoped(self) -> None:
         cache = _cache()
-        assert cache._kb_key(ORG, KB) == f"pipeshub:accessible_records:v1:kb:{ORG}:{KB}"
-        assert cache._app_connector_key(ORG, CONNECTOR) == f"pipeshub:accessible_records:v1:capp:{ORG}:{CONNECTOR}"
-        assert cache._user_connector_key(ORG, CONNECTOR) == f"pipeshub:accessible_records:v1:cusr:{ORG}:{CONNECTOR}"
+        assert cache._kb_key(ORG, KB) == f"pipeshub:accessible_records:v2:kb:{ORG}:{KB}"
+        assert cache._app_connector_key(ORG, CONNECTOR) == f"pipeshub:accessible_records:v2:capp:{ORG}:{CONNECTOR}"
+        assert cache._user_connector_key(ORG, CONNECTOR) == f"pipeshub:accessible_records:v2:cusr:{ORG}:{CONNECTOR}"
 
     def test_key_classes_do_not_collide(self) -> None:
         cache = _cache()
@@ -321,6 +417,11 @@ class TestOutageCost:
         async def delete(self, *a, **k) -> None:
             await self._fail("delete")
 
+        def register_script(self, script):
+            async def run(*a, **k) -> None:
+                await self._fail("evalsha")
+            return run
+
     async def test_one_redis_op_per_call_when_down(self) -> None:
         dead = self.DeadRedis()
         cache = _cache(dead)
@@ -490,3 +591,197 @@ class TestClose:
         cache = _cache(FakeRedis())
         await cache.close()
         await cache.close()
+
+
+class TestCrossProcessSingleFlight:
+    """Two cache instances over one Redis stand in for two query workers."""
+
+    def _pair(self, redis):
+        first, second = _cache(redis), _cache(redis)
+        for cache in (first, second):
+            cache.LEASE_POLL_SECONDS = 0.001
+            cache.LEASE_POLL_MAX_SECONDS = 0.005
+        return first, second
+
+    async def test_concurrent_misses_in_two_processes_run_the_loader_once(self) -> None:
+        redis = FakeRedis()
+        first, second = self._pair(redis)
+        calls: list = []
+
+        async def slow_loader():
+            calls.append(1)
+            await asyncio.sleep(0.03)
+            return {"vr-1": "rec-1"}
+
+        results = await asyncio.gather(
+            first.get_or_compute_app_connector(ORG, CONNECTOR, slow_loader),
+            second.get_or_compute_app_connector(ORG, CONNECTOR, slow_loader),
+        )
+
+        assert results == [{"vr-1": "rec-1"}, {"vr-1": "rec-1"}]
+        assert len(calls) == 1
+        assert not any(key.endswith(":lease") for key in redis.strings), "lease must be released"
+
+    async def test_waiter_computes_when_the_winner_fails(self) -> None:
+        redis = FakeRedis()
+        first, second = self._pair(redis)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("graph timeout")
+
+        results = await asyncio.gather(
+            first.get_or_compute_kb(ORG, KB, failing),
+            second.get_or_compute_kb(ORG, KB, _loader({"vr-1": "rec-1"})),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == {"vr-1": "rec-1"}
+
+    async def test_wait_is_bounded_by_the_lease(self) -> None:
+        """A lease left by a crashed worker costs one lease period at most."""
+        redis = FakeRedis()
+        cache = _cache(redis)
+        cache.LEASE_SECONDS = 0.02
+        cache.LEASE_POLL_SECONDS = 0.005
+        redis.strings[cache._lease_key(cache._kb_key(ORG, KB))] = "someone-else"
+        redis.exists = AsyncMock(return_value=1)  # never released
+
+        assert await cache.get_or_compute_kb(ORG, KB, _loader({"a": "b"})) == {"a": "b"}
+
+    async def test_only_the_lease_owner_releases_it(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis)
+        redis.strings["lease"] = "other-token"
+
+        await cache._release_lease("lease", "my-token")
+
+        assert redis.strings["lease"] == "other-token"
+
+    async def test_release_is_an_atomic_compare_and_delete(self) -> None:
+        """Runs the real script: a lease that expired and was re-taken survives."""
+        fakeredis_aioredis = pytest.importorskip("fakeredis.aioredis")
+        redis = fakeredis_aioredis.FakeRedis(decode_responses=True)
+        cache = _cache(redis)
+        try:
+            await redis.set("lease", "other-token")
+            await cache._release_lease("lease", "my-token")
+            assert await redis.get("lease") == "other-token"
+
+            await redis.set("lease", "my-token")
+            await cache._release_lease("lease", "my-token")
+            assert await redis.exists("lease") == 0
+        finally:
+            await redis.aclose()
+
+
+class TestPatches:
+    async def test_added_kb_records_are_served_with_the_entry(self) -> None:
+        cache = _cache(FakeRedis())
+        calls: list = []
+        await cache.get_or_compute_kb(ORG, KB, _loader({"vr-1": "rec-1"}, calls))
+
+        await cache.add_kb_records(ORG, KB, {"vr-2": "rec-2", "vr-1": "other"})
+
+        assert await cache.get_or_compute_kb(ORG, KB, _loader({}, calls)) == {
+            "vr-1": "rec-1",
+            "vr-2": "rec-2",
+        }
+        assert len(calls) == 1, "a patch must not force a recompute"
+
+    async def test_additions_made_while_the_entry_is_missing_survive_the_write(self) -> None:
+        cache = _cache(FakeRedis())
+
+        await cache.add_app_connector_records(ORG, CONNECTOR, {"vr-2": "rec-2"})
+        await cache.get_or_compute_app_connector(ORG, CONNECTOR, _loader({"vr-1": "rec-1"}))
+        out = await cache.get_or_compute_app_connector(ORG, CONNECTOR, _loader({}))
+
+        assert out == {"vr-1": "rec-1", "vr-2": "rec-2"}
+
+    async def test_invalidation_drops_the_patches_too(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis)
+        await cache.add_kb_records(ORG, KB, {"vr-2": "rec-2"})
+        await cache.mark_records_changed(ORG, CONNECTOR, ["vr-1"])
+
+        await cache.invalidate_kb(ORG, KB)
+        await cache.invalidate_connector(ORG, CONNECTOR)
+
+        assert not redis.hashes
+        assert not redis.zsets
+
+    async def test_changed_record_is_hidden_from_older_per_user_maps(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis, ttl=600)
+        key = cache._user_connector_key(ORG, CONNECTOR)
+        redis.hashes[key] = {
+            USER: json.dumps({"t": int(time.time()) - 60, "m": {"vr-1": "rec-1", "vr-2": "rec-2"}})
+        }
+
+        await cache.mark_records_changed(ORG, CONNECTOR, ["vr-1"])
+        calls: list = []
+        out = await cache.get_or_compute_user_connector(ORG, CONNECTOR, USER, _loader({}, calls))
+
+        assert out == {"vr-2": "rec-2"}
+        assert not calls
+
+    async def test_per_user_map_written_after_the_change_is_served_whole(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis)
+        redis.zsets[cache._changed_key(cache._user_connector_key(ORG, CONNECTOR))] = {
+            "vr-1": time.time() - 60
+        }
+
+        await cache.get_or_compute_user_connector(ORG, CONNECTOR, USER, _loader({"vr-1": "rec-1"}))
+        out = await cache.get_or_compute_user_connector(ORG, CONNECTOR, USER, _loader({}))
+
+        assert out == {"vr-1": "rec-1"}
+
+    async def test_additions_are_one_round_trip(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis)
+
+        await cache.add_kb_records(ORG, KB, {f"vr-{i}": f"rec-{i}" for i in range(50)})
+
+        assert redis.pipelines_executed == 1
+        assert len(redis.hashes[cache._added_key(cache._kb_key(ORG, KB))]) == 50
+
+    async def test_changes_older_than_the_ttl_are_pruned(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis, ttl=300)
+        changed_key = cache._changed_key(cache._user_connector_key(ORG, CONNECTOR))
+        redis.zsets[changed_key] = {"vr-old": time.time() - 301, "vr-recent": time.time() - 10}
+
+        await cache.mark_records_changed(ORG, CONNECTOR, ["vr-new"])
+
+        assert redis.pipelines_executed == 1
+        assert set(redis.zsets[changed_key]) == {"vr-recent", "vr-new"}
+
+    async def test_read_fetches_only_changes_newer_than_the_map(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis, ttl=600)
+        key = cache._user_connector_key(ORG, CONNECTOR)
+        written_at = int(time.time()) - 60
+        redis.hashes[key] = {
+            USER: json.dumps({"t": written_at, "m": {"vr-1": "rec-1", "vr-2": "rec-2"}})
+        }
+        redis.zsets[cache._changed_key(key)] = {
+            "vr-1": written_at - 30,
+            "vr-2": written_at + 30,
+        }
+
+        out = await cache.get_or_compute_user_connector(ORG, CONNECTOR, USER, _loader({}))
+
+        assert out == {"vr-1": "rec-1"}
+        assert ("zrangebyscore", cache._changed_key(key), written_at) in redis.calls
+        assert not any(call[0] == "hgetall" for call in redis.calls)
+
+    async def test_patches_are_skipped_while_redis_is_down(self) -> None:
+        redis = BrokenRedis()
+        cache = _cache(redis)
+        await cache.add_kb_records(ORG, KB, {"vr-1": "rec-1"})
+        assert cache.enabled is False
+        redis.calls.clear()
+        await cache.add_kb_records(ORG, KB, {"vr-1": "rec-1"})
+        assert not redis.calls
@@ -17,6 +17,9 @@ def _make(app_doc=None, get_document_error=None, org_edges=None):
     cache = MagicMock()
     cache.invalidate_connector = AsyncMock()
     cache.invalidate_kb = AsyncMock()
+    cache.add_kb_records = AsyncMock()
+    cache.add_app_connector_records = AsyncMock()
+    cache.mark_records_changed = AsyncMock()
 
     graph = MagicMock()
     if get_document_error is not None:
@@ -182,3 +185,63 @@ class TestRecordIndexed:
         inv, cache, _ = _make(app_doc={"orgId": ORG})
         cache.invalidate_kb = AsyncMock(side_effect=RuntimeError("redis down"))
         await inv.on_record_indexed(connector_name="KB", connector_id="kb-1", org_id=ORG)
+
+
+class TestRecordIndexedPatches:
+    async def test_kb_record_is_added_not_invalidated(self) -> None:
+        inv, cache, _ = _make()
+
+        await inv.on_record_indexed(
+            connector_name="KB", connector_id="kb-1", org_id=ORG,
+            record_id="rec-1", virtual_record_id="vr-1",
+        )
+
+        cache.add_kb_records.assert_awaited_once_with(ORG, "kb-1", {"vr-1": "rec-1"})
+        cache.invalidate_kb.assert_not_called()
+
+    async def test_app_level_connector_record_is_added(self) -> None:
+        inv, cache, graph = _make(app_doc={"type": "S3", "permissionModel": "APP_LEVEL"})
+
+        for i in range(3):
+            await inv.on_record_indexed(
+                connector_name="S3", connector_id="conn-1", org_id=ORG,
+                record_id=f"rec-{i}", virtual_record_id=f"vr-{i}",
+            )
+
+        assert cache.add_app_connector_records.await_count == 3
+        cache.add_app_connector_records.assert_awaited_with(ORG, "conn-1", {"vr-2": "rec-2"})
+        # The permission model is looked up once per connector.
+        graph.get_document.assert_awaited_once()
+
+    async def test_record_level_connector_is_left_for_sync_completion(self) -> None:
+        inv, cache, _ = _make(app_doc={"type": "DRIVE", "permissionModel": "RECORD_LEVEL"})
+
+        await inv.on_record_indexed(
+            connector_name="DRIVE", connector_id="conn-1", org_id=ORG,
+            record_id="rec-1", virtual_record_id="vr-1",
+        )
+
+        cache.add_app_connector_records.assert_not_called()
+        cache.invalidate_connector.assert_not_called()
+
+
+class TestRecordPermissionsChanged:
+    async def test_marks_the_records_changed(self) -> None:
+        inv, cache, _ = _make()
+        await inv.on_record_permissions_changed("conn-1", ORG, ["vr-1"])
+        cache.mark_records_changed.assert_awaited_once_with(ORG, "conn-1", ["vr-1"])
+
+    async def test_resolves_org_when_missing(self) -> None:
+        inv, cache, _ = _make(app_doc={"orgId": ORG})
+        await inv.on_record_permissions_changed("conn-1", "", ["vr-1"])
+        cache.mark_records_changed.assert_awaited_once_with(ORG, "conn-1", ["vr-1"])
+
+    async def test_no_records_is_a_noop(self) -> None:
+        inv, cache, graph = _make()
+        await inv.on_record_permissions_changed("conn-1", ORG, [])
+        cache.mark_records_changed.assert_not_called()
+
+    async def test_failures_are_swallowed(self) -> None:
+        inv, cache, _ = _make()
+        cache.mark_records_changed = AsyncMock(side_effect=RuntimeError("redis down"))
+        await inv.on_record_permissions_changed("conn-1", ORG, ["vr-1"])
@@ -0,0 +1,245 @@
+"""DecodedRecordCache: version-checked hits, the byte-bounded LRU, single-flight
+misses, invalidation, and the process-wide registration."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.cache import decoded_record_cache as module
+from app.services.cache.decoded_record_cache import (
+    DecodedRecordCache,
+    get_decoded_record_cache,
+    init_decoded_record_cache,
+    reset_decoded_record_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_registration():
+    reset_decoded_record_cache()
+    yield
+    reset_decoded_record_cache()
+
+
+def _record(name: str, payload_bytes: int = 10) -> dict:
+    return {"record_name": name, "block_containers": {"blocks": ["x" * payload_bytes]}}
+
+
+def _loader(record: dict | None):
+    return AsyncMock(return_value=record)
+
+
+class TestReadThrough:
+    async def test_second_read_is_a_hit(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        load = _loader(_record("doc"))
+
+        first = await cache.get_or_load("org-1", "vr-1", ("doc-1", 1), load)
+        second = await cache.get_or_load("org-1", "vr-1", ("doc-1", 1), load)
+
+        load.assert_awaited_once()
+        assert first == second == _record("doc")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    async def test_new_version_misses_and_replaces(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        await cache.get_or_load("org-1", "vr-1", ("doc-1", 1), _loader(_record("old")))
+
+        newer = await cache.get_or_load("org-1", "vr-1", ("doc-1", 2), _loader(_record("new")))
+
+        assert newer["record_name"] == "new"
+        assert cache.stats.entries == 1
+        assert cache.stats.misses == 2
+
+    async def test_orgs_are_isolated(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        await cache.get_or_load("org-1", "vr-1", 1, _loader(_record("a")))
+        load = _loader(_record("b"))
+
+        await cache.get_or_load("org-2", "vr-1", 1, load)
+
+        load.assert_awaited_once()
+
+    async def test_callers_get_independent_top_level_dicts(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        first = await cache.get_or_load("org-1", "vr-1", 1, _loader(_record("doc")))
+        first["id"] = "mutated-by-caller"
+
+        second = await cache.get_or_load("org-1", "vr-1", 1, _loader(None))
+
+        assert "id" not in second
+
+    async def test_missing_record_is_not_cached(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        load = _loader(None)
+
+        assert await cache.get_or_load("org-1", "vr-1", 1, load) is None
+        assert await cache.get_or_load("org-1", "vr-1", 1, load) is None
+
+        assert load.await_count == 2
+
+    async def test_unversioned_lookup_bypasses_cache(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        load = _loader(_record("doc"))
+
+        await cache.get_or_load("org-1", "vr-1", None, load)
+        await cache.get_or_load("org-1", "vr-1", None, load)
+
+        assert load.await_count == 2
+        assert cache.stats.entries == 0
+
+
+class TestEviction:
+    async def test_least_recently_used_is_evicted_over_budget(self) -> None:
+        cache = DecodedRecordCache(1000)
+        cache.max_entry_bytes = 1000
+        for vrid in ("vr-1", "vr-2", "vr-3"):
+            await cache.get_or_load("org", vrid, 1, _loader(_record(vrid, 250)))
+        # Touch vr-1 so vr-2 is now the least recently used.
+        await cache.get_or_load("org", "vr-1", 1, _loader(None))
+
+        await cache.get_or_load("org", "vr-4", 1, _loader(_record("vr-4", 250)))
+
+        assert cache.stats.evictions == 1
+        assert cache.stats.bytes <= 1000
+        reload = _loader(_record("vr-2", 250))
+        await cache.get_or_load("org", "vr-2", 1, reload)
+        reload.assert_awaited_once()
+
+    async def test_oversized_record_is_served_but_not_kept(self) -> None:
+        cache = DecodedRecordCache(8000)
+        record = _record("huge", 5000)
+
+        assert await cache.get_or_load("org", "vr-1", 1, _loader(record)) == record
+
+        assert cache.stats.entries == 0
+        assert cache.stats.bytes == 0
+
+
+class TestSingleFlight:
+    async def test_concurrent_misses_share_one_download(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        release = asyncio.Event()
+        calls = 0
+
+        async def load() -> dict:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return _record("doc")
+
+        tasks = [
+            asyncio.create_task(cache.get_or_load("org", "vr-1", 1, load)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(r == _record("doc") for r in results)
+        assert cache.stats.coalesced == 4
+
+    async def test_failure_reaches_every_waiter_and_is_not_cached(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        release = asyncio.Event()
+
+        async def load() -> dict:
+            await release.wait()
+            raise RuntimeError("storage down")
+
+        tasks = [
+            asyncio.create_task(cache.get_or_load("org", "vr-1", 1, load)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        recovered = await cache.get_or_load("org", "vr-1", 1, _loader(_record("doc")))
+        assert recovered == _record("doc")
+
+    async def test_waiters_retry_when_owner_is_cancelled(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        started = asyncio.Event()
+
+        async def slow() -> dict:
+            started.set()
+            await asyncio.sleep(10)
+            return _record("never")
+
+        owner = asyncio.create_task(cache.get_or_load("org", "vr-1", 1, slow))
+        await started.wait()
+        waiter = asyncio.create_task(
+            cache.get_or_load("org", "vr-1", 1, _loader(_record("retry")))
+        )
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert (await waiter)["record_name"] == "retry"
+
+
+class TestInvalidation:
+    async def test_invalidate_record_in_one_org(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        await cache.get_or_load("org-1", "vr-1", 1, _loader(_record("a")))
+        await cache.get_or_load("org-2", "vr-1", 1, _loader(_record("b")))
+
+        cache.invalidate_record("vr-1", "org-1")
+
+        assert cache.stats.entries == 1
+        assert cache.stats.invalidations == 1
+
+    async def test_invalidate_record_without_org_drops_every_copy(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        await cache.get_or_load("org-1", "vr-1", 1, _loader(_record("a")))
+        await cache.get_or_load("org-2", "vr-1", 1, _loader(_record("b")))
+
+        cache.invalidate_record("vr-1")
+
+        assert cache.stats.entries == 0
+        assert cache.stats.bytes == 0
+
+    async def test_invalidate_org(self) -> None:
+        cache = DecodedRecordCache(1024 * 1024)
+        await cache.get_or_load("org-1", "vr-1", 1, _loader(_record("a")))
+        await cache.get_or_load("org-1", "vr-2", 1, _loader(_record("b")))
+        await cache.get_or_load("org-2", "vr-3", 1, _loader(_record("c")))
+
+        cache.invalidate_org("org-1")
+
+        assert cache.stats.entries == 1
+
+
+class TestRegistration:
+    def test_nothing_registered_by_default(self) -> None:
+        assert get_decoded_record_cache() is None
+
+    def test_init_registers_cache_from_env(self, monkeypatch) -> None:
+        monkeypatch.setenv(DecodedRecordCache.ENV_MAX_BYTES, "4096")
+        cache = init_decoded_record_cache()
+        assert cache is get_decoded_record_cache()
+        assert cache.max_bytes == 4096
+
+    def test_zero_budget_disables(self, monkeypatch) -> None:
+        monkeypatch.setenv(DecodedRecordCache.ENV_MAX_BYTES, "0")
+        assert init_decoded_record_cache() is None
+        assert get_decoded_record_cache() is None
+
+    def test_invalid_env_uses_default(self, monkeypatch) -> None:
+        monkeypatch.setenv(DecodedRecordCache.ENV_MAX_BYTES, "lots")
+        assert DecodedRecordCache.from_env().max_bytes == DecodedRecordCache.DEFAULT_MAX_BYTES
+
+
+class TestReporting:
+    async def test_reports_cumulative_counters(self, caplog) -> None:
+        cache = DecodedRecordCache(1024 * 1024, report_seconds=1)
+        cache._last_report = 0.0
+        with caplog.at_level("INFO", logger=module.__name__):
+            await cache.get_or_load("org", "vr-1", 1, _loader(_record("doc")))
+        assert "RECORDCACHE" in caplog.text
+        assert "misses=1" in caplog.text
@@ -0,0 +1,386 @@
+"""EmbeddingCache: content-addressed keys, batch dedup, hit-rate stats, the
+disk and Redis LRU bounds, and the guarantee that a broken backend never fails
+indexing."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.cache.embedding_cache import (
+    DiskEmbeddingCacheBackend,
+    EmbeddingCache,
+    RedisEmbeddingCacheBackend,
+    embedding_namespace,
+)
+from app.services.vector_db.models import SparseVector
+from app.telemetry.backend import METRICS_BACKEND
+
+NS = embedding_namespace("openAI", "text-embedding-3-small", 4, None)
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops: list[tuple] = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append(("set", key, value, ex))
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    def zadd(self, name, mapping):
+        self.ops.append(("zadd", name, mapping))
+
+    def zremrangebyscore(self, name, low, high):
+        self.ops.append(("zremrangebyscore", name, high))
+
+    def zcard(self, name):
+        self.ops.append(("zcard", name))
+
+    async def execute(self):
+        results = []
+        for op in self.ops:
+            if op[0] == "set":
+                self.redis.store[op[1]] = op[2]
+                self.redis.expires[op[1]] = op[3]
+            elif op[0] == "expire":
+                self.redis.expires[op[1]] = op[2]
+            elif op[0] == "zadd":
+                self.redis.index.update(op[2])
+            elif op[0] == "zremrangebyscore":
+                for key in [k for k, score in self.redis.index.items() if score <= op[2]]:
+                    del self.redis.index[key]
+            else:
+                results.append(len(self.redis.index))
+                continue
+            results.append(True)
+        return results
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.expires: dict[str, int] = {}
+        self.index: dict[str, float] = {}
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def zpopmin(self, name, count):
+        victims = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for key, _ in victims:
+            del self.index[key]
+        return victims
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+        return len(keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        return None
+
+
+class BrokenRedis(FakeRedis):
+    async def mget(self, keys):
+        raise ConnectionError("redis down")
+
+
+def _counting_embedder():
+    calls: list[list[str]] = []
+
+    async def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 0.5, -1.0, 2.0] for t in texts]
+
+    return embed, calls
+
+
+def _cache(redis=None, max_keys=1000) -> EmbeddingCache:
+    backend = RedisEmbeddingCacheBackend(
+        redis or FakeRedis(), ttl_seconds=60, max_keys=max_keys, index_key="lru"
+    )
+    return EmbeddingCache(MagicMock(), backend)
+
+
+class TestEmbeddingNamespace:
+    def test_stable(self):
+        assert embedding_namespace("a", "m", 4) == embedding_namespace("a", "m", 4)
+
+    def test_model_change_changes_namespace(self):
+        assert embedding_namespace("a", "m1", 4) != embedding_namespace("a", "m2", 4)
+        assert embedding_namespace("a", "m", 4) != embedding_namespace("a", "m", 8)
+
+
+class TestDenseReadThrough:
+    @pytest.mark.asyncio
+    async def test_second_pass_is_served_from_cache(self):
+        cache = _cache()
+        embed, calls = _counting_embedder()
+
+        first = await cache.get_or_embed_dense(NS, ["alpha", "beta"], embed)
+        second = await cache.get_or_embed_dense(NS, ["alpha", "beta"], embed)
+
+        assert calls == [["alpha", "beta"]]
+        assert first == second == [[5.0, 0.5, -1.0, 2.0], [4.0, 0.5, -1.0, 2.0]]
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 2
+        assert cache.stats.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_only_changed_chunks_are_embedded(self):
+        cache = _cache()
+        embed, calls = _counting_embedder()
+        await cache.get_or_embed_dense(NS, ["a", "b", "c"], embed)
+
+        result = await cache.get_or_embed_dense(NS, ["a", "b-edited", "c"], embed)
+
+        assert calls[-1] == ["b-edited"]
+        assert len(result) == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicates_in_one_batch_embedded_once(self):
+        cache = _cache()
+        embed, calls = _counting_embedder()
+
+        result = await cache.get_or_embed_dense(NS, ["same", "same ", "other"], embed)
+
+        assert calls == [["same", "other"]]
+        assert result[0] == result[1]
+
+    @pytest.mark.asyncio
+    async def test_normalizes_the_key_but_embeds_the_callers_text(self):
+        cache = _cache()
+        embed, calls = _counting_embedder()
+
+        await cache.get_or_embed_dense(NS, ["  padded\n"], embed)
+        await cache.get_or_embed_dense(NS, ["padded"], embed)
+
+        assert calls == [["  padded\n"]]
+
+    @pytest.mark.asyncio
+    async def test_namespace_isolates_models(self):
+        cache = _cache()
+        embed, calls = _counting_embedder()
+        await cache.get_or_embed_dense(NS, ["alpha"], embed)
+        await cache.get_or_embed_dense(embedding_namespace("other-model"), ["alpha"], embed)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_hits_refresh_ttl(self):
+        redis = FakeRedis()
+        cache = _cache(redis)
+        embed, _ = _counting_embedder()
+        await cache.get_or_embed_dense(NS, ["alpha"], embed)
+        redis.expires.clear()
+
+        await cache.get_or_embed_dense(NS, ["alpha"], embed)
+
+        assert list(redis.expires.values()) == [60]
+
+
+class TestRedisBound:
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_over_key_budget(self):
+        redis = FakeRedis()
+        backend = RedisEmbeddingCacheBackend(redis, ttl_seconds=60, max_keys=3, index_key="lru")
+        await backend.set_many({"old": b"1", "used": b"2"})
+        redis.index["old"] -= 10
+        redis.index["used"] -= 5
+        await backend.get_many(["old"])  # touch: "used" is now the LRU entry
+        await backend.set_many({"new": b"3"})
+        redis.index["new"] -= 1
+
+        evicted = await backend.set_many({"newer": b"4"})
+
+        assert evicted == 2
+        assert set(redis.store) == {"old", "newer"}
+        assert set(redis.index) == {"old", "newer"}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_leave_the_index(self):
+        redis = FakeRedis()
+        backend = RedisEmbeddingCacheBackend(redis, ttl_seconds=60, max_keys=10, index_key="lru")
+        await backend.set_many({"stale": b"1"})
+        redis.index["stale"] -= 120
+
+        assert await backend.set_many({"fresh": b"2"}) == 0
+        assert set(redis.index) == {"fresh"}
+
+
+class TestMetrics:
+    @pytest.mark.asyncio
+    async def test_hit_rate_exported(self):
+        cache = _cache()
+        embed, _ = _counting_embedder()
+        await cache.get_or_embed_sparse(NS, ["alpha"], AsyncMock(return_value=[SparseVector([1], [1.0])]))
+        await cache.get_or_embed_sparse(NS, ["alpha"], embed)
+
+        lines = METRICS_BACKEND.serialize().splitlines()
+        hit = next(
+            line for line in lines
+            if line.startswith("pipeshub_embedding_cache_lookups_total")
+            and 'kind="sparse"' in line and 'result="hit"' in line
+        )
+        assert 'backend="redis"' in hit
+        assert any(
+            line.startswith("pipeshub_embedding_cache_hit_ratio") and 'backend="redis"' in line
+            for line in lines
+        )
+
+
+class TestSparseReadThrough:
+    @pytest.mark.asyncio
+    async def test_sparse_round_trip(self):
+        cache = _cache()
+        embed = AsyncMock(return_value=[SparseVector(indices=[3, 17], values=[0.25, 1.5])])
+
+        await cache.get_or_embed_sparse(NS, ["text"], embed)
+        cached = await cache.get_or_embed_sparse(NS, ["text"], embed)
+
+        embed.assert_awaited_once()
+        assert cached == [SparseVector(indices=[3, 17], values=[0.25, 1.5])]
+
+
+class TestFailureHandling:
+    @pytest.mark.asyncio
+    async def test_disabled_cache_embeds_directly(self):
+        cache = EmbeddingCache(MagicMock(), None)
+        embed, calls = _counting_embedder()
+        await cache.get_or_embed_dense(NS, ["alpha"], embed)
+        await cache.get_or_embed_dense(NS, ["alpha"], embed)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_broken_backend_falls_through_and_trips_breaker(self):
+        cache = _cache(BrokenRedis())
+        embed, calls = _counting_embedder()
+
+        result = await cache.get_or_embed_dense(NS, ["alpha"], embed)
+
+        assert result == [[5.0, 0.5, -1.0, 2.0]]
+        assert cache.stats.errors == 1
+        assert cache.enabled is False
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_is_treated_as_miss(self):
+        redis = FakeRedis()
+        cache = _cache(redis)
+        embed, calls = _counting_embedder()
+        await cache.get_or_embed_sparse(NS, ["alpha"], AsyncMock(return_value=[SparseVector([1], [1.0])]))
+        for key in redis.store:
+            redis.store[key] = b"\x01"
+
+        sparse_embed = AsyncMock(return_value=[SparseVector([2], [2.0])])
+        result = await cache.get_or_embed_sparse(NS, ["alpha"], sparse_embed)
+
+        sparse_embed.assert_awaited_once()
+        assert result == [SparseVector([2], [2.0])]
+
+
+class TestCreate:
+    @pytest.mark.asyncio
+    async def test_off_yields_disabled_cache(self, monkeypatch):
+        monkeypatch.setenv(EmbeddingCache.ENV_BACKEND, "off")
+        cache = await EmbeddingCache.create(MagicMock(), MagicMock())
+        assert cache.enabled is False
+
+    @pytest.mark.asyncio
+    async def test_off_by_default(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(EmbeddingCache.ENV_BACKEND, raising=False)
+        monkeypatch.setenv(EmbeddingCache.ENV_DIR, str(tmp_path))
+        config_service = MagicMock()
+        config_service.get_redis_config = AsyncMock()
+        cache = await EmbeddingCache.create(MagicMock(), config_service)
+        assert cache.enabled is False
+        assert not any(tmp_path.iterdir())
+        config_service.get_redis_config.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_yields_disabled_cache(self, monkeypatch):
+        monkeypatch.setenv(EmbeddingCache.ENV_BACKEND, "redis")
+        config_service = MagicMock()
+        config_service.get_redis_config = AsyncMock(side_effect=RuntimeError("no config"))
+        cache = await EmbeddingCache.create(MagicMock(), config_service)
+        assert cache.enabled is False
+
+    @pytest.mark.asyncio
+    async def test_disk_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(EmbeddingCache.ENV_BACKEND, "disk")
+        monkeypatch.setenv(EmbeddingCache.ENV_DIR, str(tmp_path))
+        cache = await EmbeddingCache.create(MagicMock(), MagicMock())
+        try:
+            assert cache.enabled is True
+            assert (tmp_path / "embeddings.sqlite3").exists()
+        finally:
+            await cache.close()
+
+
+class TestDiskBackend:
+    @pytest.mark.asyncio
+    async def test_round_trip_and_persistence(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        backend = DiskEmbeddingCacheBackend(path, max_bytes=1024)
+        await backend.set_many({"k1": b"v1", "k2": b"v2"})
+        await backend.close()
+
+        reopened = DiskEmbeddingCacheBackend(path, max_bytes=1024)
+        try:
+            assert await reopened.get_many(["k1", "k2", "k3"]) == {"k1": b"v1", "k2": b"v2"}
+        finally:
+            await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        backend = DiskEmbeddingCacheBackend(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+        try:
+            await backend.set_many({"old": b"x" * 100})
+            await backend.set_many({"used": b"x" * 100})
+            await backend.get_many(["old"])  # touch: "used" is now the LRU entry
+            evicted = await backend.set_many({"new": b"x" * 150})
+
+            assert evicted == 1
+            assert set(await backend.get_many(["old", "used", "new"])) == {"old", "new"}
+        finally:
+            await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_is_shared_by_every_process_on_the_file(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        worker_a = DiskEmbeddingCacheBackend(path, max_bytes=300)
+        worker_b = DiskEmbeddingCacheBackend(path, max_bytes=300)
+        try:
+            await worker_a.set_many({"a1": b"x" * 100, "a2": b"x" * 100})
+            # worker_b never wrote a1/a2 but still sees the file is full.
+            evicted = await worker_b.set_many({"b1": b"x" * 150})
+
+            assert evicted == 1
+            assert set(await worker_a.get_many(["a1", "a2", "b1"])) == {"a2", "b1"}
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_overwrite_does_not_double_count(self, tmp_path):
+        backend = DiskEmbeddingCacheBackend(str(tmp_path / "cache.sqlite3"), max_bytes=250)
+        try:
+            for _ in range(3):
+                assert await backend.set_many({"same": b"x" * 200}) == 0
+        finally:
+            await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_large_batches_stay_under_the_variable_limit(self, tmp_path):
+        backend = DiskEmbeddingCacheBackend(str(tmp_path / "cache.sqlite3"), max_bytes=10 ** 7)
+        items = {f"k{i}": b"v" for i in range(2500)}
+        try:
+            await backend.set_many(items)
+            assert len(await backend.get_many(list(items))) == 2500
+        finally:
+            await backend.close()
@@ -19,6 +19,11 @@ from app.connectors.core.factory.connector_factory import ConnectorFactory
 from app.connectors.services.event_service import EventService
 from app.modules.transformers.sink_orchestrator import SinkOrchestrator
 from app.services.cache import invalidation_hooks as hooks
+from app.services.cache.decoded_record_cache import (
+    get_decoded_record_cache,
+    init_decoded_record_cache,
+    reset_decoded_record_cache,
+)
 from app.services.graph_db.neo4j.neo4j_provider import Neo4jProvider
 
 _PROCESSOR_MODULE = (
@@ -29,8 +34,10 @@ _PROCESSOR_MODULE = (
 @pytest.fixture(autouse=True)
 def _reset_hooks():
     hooks.reset_accessible_records_invalidator()
+    reset_decoded_record_cache()
     yield
     hooks.reset_accessible_records_invalidator()
+    reset_decoded_record_cache()
 
 
 def _register() -> MagicMock:
@@ -38,6 +45,7 @@ def _register() -> MagicMock:
     invalidator.on_connector_sync_completed = AsyncMock()
     invalidator.on_kb_records_changed = AsyncMock()
     invalidator.on_record_indexed = AsyncMock()
+    invalidator.on_record_permissions_changed = AsyncMock()
     hooks._state["invalidator"] = invalidator
     return invalidator
 
@@ -66,9 +74,12 @@ class TestRegistration:
         await hooks.notify_kb_records_changed("kb-1", "org-1")
         await hooks.notify_record_indexed(connector_name="KB", connector_id="kb-1", org_id="org-1")
 
+        await hooks.notify_record_permissions_changed("conn-1", "org-1", ["vr-1"])
+
         invalidator.on_connector_sync_completed.assert_awaited_once_with("conn-1", "org-1")
         invalidator.on_kb_records_changed.assert_awaited_once_with("kb-1", "org-1")
         invalidator.on_record_indexed.assert_awaited_once()
+        invalidator.on_record_permissions_changed.assert_awaited_once_with("conn-1", "org-1", ["vr-1"])
 
     async def test_a_raising_invalidator_cannot_break_the_caller(self) -> None:
         invalidator = _register()
@@ -80,6 +91,19 @@ class TestRegistration:
         await hooks.notify_kb_records_changed("kb-1")
         await hooks.notify_record_indexed(connector_name="KB", connector_id="kb-1")
 
+    async def test_record_indexed_drops_decoded_record_without_invalidator(
+        self, monkeypatch
+    ) -> None:
+        monkeypatch.setenv("PIPESHUB_DECODED_RECORD_CACHE_MAX_BYTES", str(1024 * 1024))
+        cache = init_decoded_record_cache()
+        await cache.get_or_load("org-1", "vr-1", 1, AsyncMock(return_value={"id": "r"}))
+
+        await hooks.notify_record_indexed(
+            connector_name="KB", connector_id="kb-1", org_id="org-1", virtual_record_id="vr-1"
+        )
+
+        assert get_decoded_record_cache().stats.entries == 0
+
 
 class TestSyncCompletionSite:
     async def test_fires_after_a_successful_sync(self) -> None:
@@ -180,6 +204,37 @@ class TestCascadeDeleteSite:
         notify.assert_not_called()
 
 
+class TestPermissionUpdateSite:
+    async def test_fires_after_the_permission_edges_are_replaced(self) -> None:
+        processor = DataSourceEntitiesProcessor.__new__(DataSourceEntitiesProcessor)
+        processor.logger = MagicMock()
+        processor.org_id = "org-1"
+        processor._handle_record_permissions = AsyncMock()
+
+        tx_store = MagicMock()
+        tx_store.get_edges_from_node = AsyncMock(return_value=[{"_to": "recordGroups/rg-1"}])
+        tx_store.delete_edges_to = AsyncMock(return_value=1)
+        tx_store.get_record_group_by_external_id = AsyncMock(return_value=None)
+        transaction = MagicMock()
+        transaction.__aenter__ = AsyncMock(return_value=tx_store)
+        transaction.__aexit__ = AsyncMock(return_value=False)
+        processor.data_store_provider = MagicMock()
+        processor.data_store_provider.transaction = MagicMock(return_value=transaction)
+
+        record = MagicMock()
+        record.id = "rec-1"
+        record.virtual_record_id = "vr-1"
+        record.connector_id = "conn-1"
+        record.shared_with_me_record_group_ids = None
+        record.inherit_permissions = False
+        notify = AsyncMock()
+
+        with patch(f"{_PROCESSOR_MODULE}.notify_record_permissions_changed", new=notify):
+            await processor.on_updated_record_permissions(record, [MagicMock()])
+
+        notify.assert_awaited_once_with("conn-1", "org-1", ["vr-1"])
+
+
 class TestIndexingCompletionSite:
     async def test_fires_when_a_record_becomes_searchable(self) -> None:
         orchestrator = SinkOrchestrator.__new__(SinkOrchestrator)
@@ -209,6 +264,8 @@ class TestIndexingCompletionSite:
             connector_id="kb-1",
             external_record_group_id=None,
             org_id="org-1",
+            virtual_record_id="vr-1",
+            record_id="rec-1",
         )
 
 
@@ -7,10 +7,12 @@ behaviour:
   - __init__ (URL, timeout, retry config)
   - _validate_pdf_binary (type / size guards)
   - parse_pdf / parse_pdf_batched: request shape, response translation,
-    and failure-to-None mapping
+    failure-to-None mapping, per-batch page slicing and bounded concurrency
 """
 from __future__ import annotations
 
+import asyncio
+import copy
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -18,6 +20,7 @@ import pytest
 
 from app.services.base_client import ServiceUnavailableError
 from app.services.docling.client import DoclingClient
+from app.utils.docling_wire_format import DOCLING_BINARY_CONTENT_TYPE, encode_document
 
 # ===========================================================================
 # Fixtures
@@ -146,31 +149,104 @@ class TestParsePdfBatched:
         MockDoc.concatenate.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_each_batch_is_parsed_before_concatenate(self, client, small_pdf):
-        """Page-range batches are parsed sequentially, then concatenated."""
-        call_ranges = []
+    async def test_each_batch_uploads_only_its_pages(self, client, small_pdf):
+        """Every batch sends its own page slice, and results are concatenated
+        in page order whatever order the batches finish in."""
+        sent = {}
 
         async def fake_parse(record_name, pdf_binary, page_range=None):
-            call_ranges.append(page_range)
-            return f'{{"range": "{page_range}"}}'
+            sent[page_range] = pdf_binary
+            # Later batches finish first.
+            await asyncio.sleep(0.01 * (5 - page_range[0]))
+            return f"{page_range[0]}"
 
-        docs = [MagicMock(), MagicMock(), MagicMock()]
+        docs = {"1": MagicMock(), "3": MagicMock(), "5": MagicMock()}
         merged = MagicMock()
 
         with (
             patch("app.services.docling.client.get_pdf_page_count", return_value=5),
+            patch(
+                "app.services.docling.client.slice_pdf_pages",
+                side_effect=lambda content, start, end: f"slice-{start}-{end}".encode(),
+            ),
             patch.object(client, "parse_pdf", side_effect=fake_parse),
             patch("app.services.docling.client.DoclingDocument") as MockDoc,
         ):
-            MockDoc.model_validate_json.side_effect = docs
+            MockDoc.model_validate_json.side_effect = docs.__getitem__
             MockDoc.concatenate.return_value = merged
-            result = await client.parse_pdf_batched("doc.pdf", small_pdf, batch_size=2)
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf, batch_size=2, concurrency=3)
 
-        assert call_ranges == [(1, 2), (3, 4), (5, 5)]
-        MockDoc.concatenate.assert_called_once_with(docs)
+        assert sent == {(1, 2): b"slice-1-2", (3, 4): b"slice-3-4", (5, 5): b"slice-5-5"}
+        MockDoc.concatenate.assert_called_once_with([docs["1"], docs["3"], docs["5"]])
         assert result is merged
         assert merged.name == "doc.pdf"
 
+    @pytest.mark.asyncio
+    async def test_in_flight_batches_are_bounded(self, client, small_pdf):
+        in_flight = 0
+        peak = 0
+
+        async def fake_parse(record_name, pdf_binary, page_range=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "{}"
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=10),
+            patch("app.services.docling.client.slice_pdf_pages", return_value=b"slice"),
+            patch.object(client, "parse_pdf", side_effect=fake_parse),
+            patch("app.services.docling.client.DoclingDocument"),
+        ):
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf, batch_size=1, concurrency=3)
+
+        assert result is not None
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_cancels_the_rest(self, client, small_pdf):
+        started = []
+
+        async def fake_parse(record_name, pdf_binary, page_range=None):
+            started.append(page_range)
+            if page_range == (1, 1):
+                return None
+            await asyncio.sleep(10)
+            return "{}"
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=6),
+            patch("app.services.docling.client.slice_pdf_pages", return_value=b"slice"),
+            patch.object(client, "parse_pdf", side_effect=fake_parse),
+            patch("app.services.docling.client.DoclingDocument") as MockDoc,
+        ):
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf, batch_size=1, concurrency=2)
+
+        assert result is None
+        assert len(started) < 6
+        MockDoc.concatenate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unsliceable_pdf_falls_back_to_full_upload(self, client, small_pdf):
+        sent = []
+
+        async def fake_parse(record_name, pdf_binary, page_range=None):
+            sent.append(pdf_binary)
+            return "{}"
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=4),
+            patch("app.services.docling.client.slice_pdf_pages", side_effect=RuntimeError("bad xref")),
+            patch.object(client, "parse_pdf", side_effect=fake_parse),
+            patch("app.services.docling.client.DoclingDocument"),
+        ):
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf, batch_size=2)
+
+        assert result is not None
+        assert sent == [small_pdf, small_pdf]
+
     @pytest.mark.asyncio
     async def test_service_error_response_returns_none(self, client, small_pdf):
         with (
@@ -200,6 +276,55 @@ class TestParsePdfBatched:
         assert result is None
 
 
+class TestBinaryTransfer:
+    @pytest.fixture(autouse=True)
+    def binary_enabled(self, monkeypatch):
+        monkeypatch.setenv("DOCLING_BINARY_TRANSFER", "true")
+
+    @pytest.mark.asyncio
+    async def test_requests_and_decodes_binary_document(self, client, small_pdf):
+        document = {"pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]}
+        response = httpx.Response(
+            200, content=encode_document(copy.deepcopy(document)),
+            headers={"content-type": DOCLING_BINARY_CONTENT_TYPE},
+        )
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=1),
+            patch.object(client, "_post_multipart", new=AsyncMock(return_value=response)) as mock_post,
+            patch("app.services.docling.client.DoclingDocument") as MockDoc,
+        ):
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf)
+
+        assert mock_post.call_args.kwargs["data"]["response_format"] == "binary"
+        MockDoc.model_validate.assert_called_once_with(document)
+        assert result is MockDoc.model_validate.return_value
+
+    @pytest.mark.asyncio
+    async def test_json_reply_from_older_service_is_accepted(self, client, small_pdf):
+        response = _make_response(200, {"success": True, "parse_result": '{"pages": {}}'})
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=1),
+            patch.object(client, "_post_multipart", new=AsyncMock(return_value=response)),
+            patch("app.services.docling.client.DoclingDocument") as MockDoc,
+        ):
+            result = await client.parse_pdf_batched("doc.pdf", small_pdf)
+
+        MockDoc.model_validate_json.assert_called_once_with('{"pages": {}}')
+        assert result is MockDoc.model_validate_json.return_value
+
+    @pytest.mark.asyncio
+    async def test_malformed_binary_document_returns_none(self, client, small_pdf):
+        response = httpx.Response(200, content=b"junk", headers={"content-type": DOCLING_BINARY_CONTENT_TYPE})
+
+        with (
+            patch("app.services.docling.client.get_pdf_page_count", return_value=1),
+            patch.object(client, "_post_multipart", new=AsyncMock(return_value=response)),
+        ):
+            assert await client.parse_pdf_batched("doc.pdf", small_pdf) is None
+
+
 # ===========================================================================
 # parse_pdf
 # ===========================================================================
@@ -478,6 +478,33 @@ class TestParsePdfEndpoint:
         finally:
             mod.docling_service = original
 
+    @pytest.mark.asyncio
+    async def test_parse_pdf_endpoint_binary_response(self):
+        import app.services.docling.docling_service as mod
+        from app.utils.docling_wire_format import DOCLING_BINARY_CONTENT_TYPE, decode_document
+        original = mod.docling_service
+        svc = DoclingService()
+        mock_doc = MagicMock()
+        mock_doc.model_dump.return_value = {"pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]}
+        svc.parse_pdf_only = AsyncMock(return_value=mock_doc)
+        mod.docling_service = svc
+        try:
+            from app.services.docling.docling_service import parse_pdf_endpoint
+            resp = await parse_pdf_endpoint(
+                file=_make_upload_file(b"data"),
+                record_name="test.pdf",
+                start_page=None,
+                end_page=None,
+                response_format="binary",
+            )
+            assert resp.media_type == DOCLING_BINARY_CONTENT_TYPE
+            document, _ = decode_document(resp.body)
+            assert document == {"pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]}
+            mock_doc.model_dump.assert_called_once_with(mode="json")
+            mock_doc.model_dump_json.assert_not_called()
+        finally:
+            mod.docling_service = original
+
     @pytest.mark.asyncio
     async def test_parse_pdf_endpoint_with_page_range(self):
         import app.services.docling.docling_service as mod
@@ -219,6 +219,7 @@ class TestAbstractMethodInventory:
         # Record operations
         "get_record_by_path",
         "get_record_by_external_id",
+        "get_records_by_external_ids",
         "get_record_by_external_revision_id",
         "get_child_record_ids_by_relation_type",
         "get_parent_record_ids_by_relation_type",
@@ -305,6 +306,8 @@ class TestAbstractMethodInventory:
         "create_record_groups_relation",
         "create_inherit_permissions_relation_record_group",
         "get_accessible_virtual_record_ids",
+        "get_user_acl_principals",
+        "get_records_acl_principals",
         "get_records_by_record_ids",
         "batch_upsert_record_permissions",
         "get_file_permissions",
@@ -0,0 +1,77 @@
+"""batch_upsert_records writes one batch per collection, not three per record.
+
+Sync batches hand hundreds of records to a single call; the per-record loop
+made that 3N round trips inside the transaction. Both providers must still
+write every base record, every typed record to its own collection, and one
+IS_OF_TYPE edge per typed record.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config.constants.arangodb import CollectionNames, Connectors, OriginTypes
+from app.models.entities import FileRecord, MailRecord, RecordType
+from app.services.graph_db.arango.arango_http_provider import ArangoHTTPProvider
+from app.services.graph_db.neo4j.neo4j_provider import Neo4jProvider
+
+
+def _file(i: int) -> FileRecord:
+    return FileRecord(
+        org_id="org-1", external_record_id=f"f-{i}", record_name=f"f-{i}.txt",
+        origin=OriginTypes.CONNECTOR, connector_name=Connectors.GOOGLE_DRIVE,
+        connector_id="conn-1", record_type=RecordType.FILE, version=1,
+        is_file=True, extension="txt", size_in_bytes=1, weburl="https://x",
+    )
+
+
+def _mail(i: int) -> MailRecord:
+    return MailRecord(
+        org_id="org-1", external_record_id=f"m-{i}", record_name=f"m-{i}",
+        origin=OriginTypes.CONNECTOR, connector_name=Connectors.GOOGLE_MAIL,
+        connector_id="conn-1", record_type=RecordType.MAIL, version=1,
+    )
+
+
+def _arango() -> ArangoHTTPProvider:
+    return ArangoHTTPProvider(MagicMock(), AsyncMock())
+
+
+def _neo4j() -> Neo4jProvider:
+    return Neo4jProvider(logger=MagicMock(), config_service=MagicMock())
+
+
+@pytest.mark.parametrize("make_provider", [_arango, _neo4j], ids=["arango", "neo4j"])
+class TestGroupedWrites:
+    @pytest.mark.asyncio
+    async def test_one_write_per_collection(self, make_provider) -> None:
+        provider = make_provider()
+        provider.batch_upsert_nodes = AsyncMock(return_value=True)
+        provider.batch_create_edges = AsyncMock(return_value=True)
+        records = [_file(0), _mail(0), _file(1), _mail(1), _file(2)]
+
+        await provider.batch_upsert_records(records)
+
+        writes = {
+            call.kwargs["collection"]: call.args[0]
+            for call in provider.batch_upsert_nodes.await_args_list
+        }
+        assert provider.batch_upsert_nodes.await_count == 3
+        assert len(writes[CollectionNames.RECORDS.value]) == 5
+        assert len(writes[CollectionNames.FILES.value]) == 3
+        assert len(writes[CollectionNames.MAILS.value]) == 2
+        provider.batch_create_edges.assert_awaited_once()
+        edges = provider.batch_create_edges.await_args.args[0]
+        assert len(edges) == 5
+        assert provider.batch_create_edges.await_args.kwargs["collection"] == CollectionNames.IS_OF_TYPE.value
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_writes_nothing(self, make_provider) -> None:
+        provider = make_provider()
+        provider.batch_upsert_nodes = AsyncMock(return_value=True)
+        provider.batch_create_edges = AsyncMock(return_value=True)
+
+        await provider.batch_upsert_records([])
+
+        provider.batch_upsert_nodes.assert_not_awaited()
+        provider.batch_create_edges.assert_not_awaited()
@@ -15,6 +15,7 @@ from app.services.base_client import (
 )
 from app.services.parsing.client import ParsingClient, ParsingClientError
 from app.services.parsing.interface import ParseErrorCode, ParseResult, ParserProvider
+from app.utils.docling_wire_format import DOCLING_BINARY_CONTENT_TYPE, encode_document
 
 
 def _bc_dict() -> dict:
@@ -111,6 +112,61 @@ async def test_parse_with_raw_document_builds_blocks_locally() -> None:
     mock_processor.create_blocks.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_parse_binary_document_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With DOCLING_BINARY_TRANSFER the client asks for, and decodes, the binary envelope."""
+    monkeypatch.setenv("DOCLING_BINARY_TRANSFER", "true")
+    client = ParsingClient(service_url="http://fake-parsing:8092", max_retries=1)
+    caption_map = {"Image_1": "data:image/png;base64,AAAA"}
+    body = encode_document(
+        {"schema_name": "DoclingDocument", "pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]},
+        {"provider_used": "docling", "metadata": {"record_name": "test.pdf", "caption_map": caption_map}},
+    )
+    response = httpx.Response(200, content=body, headers={"content-type": DOCLING_BINARY_CONTENT_TYPE})
+
+    mock_block_container = BlocksContainer(**_bc_dict())
+    mock_processor = MagicMock()
+    mock_processor.create_blocks = AsyncMock(return_value=mock_block_container)
+
+    with patch.object(
+        client, "_post_multipart", new=AsyncMock(return_value=response)
+    ) as mock_post, patch.object(
+        client, "_get_docling_processor", return_value=mock_processor
+    ), patch(
+        "app.services.parsing.client.DoclingDocument"
+    ) as MockDoc, patch(
+        "app.services.parsing.client.apply_caption_map"
+    ) as mock_apply:
+        result = await client.parse(
+            file_content=b"%PDF-1.4",
+            record_name="test.pdf",
+            mime_type="application/pdf",
+            provider=ParserProvider.DOCLING,
+        )
+
+    assert mock_post.call_args.kwargs["data"]["response_format"] == "binary"
+    MockDoc.model_validate.assert_called_once_with(
+        {"schema_name": "DoclingDocument", "pictures": [{"image": {"uri": "data:image/png;base64,AAECAw=="}}]}
+    )
+    MockDoc.model_validate_json.assert_not_called()
+    assert result.block_container is mock_block_container
+    assert result.provider_used == ParserProvider.DOCLING
+    assert result.metadata["record_name"] == "test.pdf"
+    mock_apply.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_malformed_binary_document_raises() -> None:
+    client = ParsingClient(service_url="http://fake-parsing:8092", max_retries=1)
+    response = httpx.Response(200, content=b"garbage", headers={"content-type": DOCLING_BINARY_CONTENT_TYPE})
+
+    with patch.object(client, "_post_multipart", new=AsyncMock(return_value=response)):
+        with pytest.raises(ParsingClientError) as exc_info:
+            await client.parse(file_content=b"%PDF-1.4", record_name="test.pdf")
+
+    assert exc_info.value.code == ParseErrorCode.PARSE_FAILED
+
+
 @pytest.mark.asyncio
 async def test_parse_with_explicit_provider() -> None:
     client = ParsingClient(service_url="http://fake-parsing:8092", max_retries=1)
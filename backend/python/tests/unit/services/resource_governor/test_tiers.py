@@ -3,6 +3,7 @@ import pytest
 from app.services.resource_governor.models import ParseTier, Pool
 from app.services.resource_governor.tiers import (
     XL_HEAVY_BYTES,
+    XL_HEAVY_CELLS,
     classify,
     gate_pool,
     parse_cost,
@@ -58,6 +59,11 @@ class TestParseCost:
     def test_heavy_unknown_size_is_cost_one(self) -> None:
         assert parse_cost(ParseTier.HEAVY, None) == 1
 
+    def test_large_spreadsheet_is_cost_two_despite_small_file(self) -> None:
+        assert parse_cost(ParseTier.HEAVY, 1024, cells=XL_HEAVY_CELLS - 1) == 1
+        assert parse_cost(ParseTier.HEAVY, 1024, cells=XL_HEAVY_CELLS) == 2
+        assert parse_cost(ParseTier.LIGHT, 1024, cells=XL_HEAVY_CELLS * 10) == 1
+
 
 class TestGatePool:
     def test_heavy_routes_to_heavy_parse_pool(self) -> None:
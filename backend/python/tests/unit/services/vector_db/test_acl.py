@@ -0,0 +1,195 @@
+"""Tests for app.services.vector_db.acl (indexing-time ACL tokens)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config.constants.arangodb import Connectors, PermissionModel
+from app.services.vector_db.acl import (
+    ACL_CONNECTOR_FIELD,
+    ACL_TOKENS_FIELD,
+    ENV_ACL_FILTER,
+    RecordAclLookup,
+    RecordAclPrincipals,
+    UserAclPrincipals,
+    acl_filter_enabled,
+    verify_accessible_records,
+)
+
+COMPLETED = "COMPLETED"
+
+
+def _user(**overrides) -> UserAclPrincipals:
+    data = {
+        "userKey": "user1",
+        "principalIds": ["group1", "org1"],
+        "apps": [
+            {"id": "drive", "type": "DRIVE", "permissionModel": PermissionModel.RECORD_LEVEL.value},
+            {"id": "jira", "type": "JIRA", "permissionModel": PermissionModel.APP_LEVEL.value},
+        ],
+        "kbIds": ["kb1"],
+    }
+    data.update(overrides)
+    return UserAclPrincipals.from_dict(data, org_id="org1")
+
+
+def _record(**overrides) -> RecordAclPrincipals:
+    data = {
+        "recordId": "rec1",
+        "virtualRecordId": "vr1",
+        "connectorId": "drive",
+        "orgId": "org1",
+        "indexingStatus": COMPLETED,
+        "appType": "DRIVE",
+        "permissionModel": PermissionModel.RECORD_LEVEL.value,
+        "principalIds": ["group1"],
+        "anyone": False,
+    }
+    data.update(overrides)
+    return RecordAclPrincipals.from_dict(data)
+
+
+class TestAclFilterEnabled:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv(ENV_ACL_FILTER, raising=False)
+        assert acl_filter_enabled() is False
+
+    @pytest.mark.parametrize("value", ["1", "true", "ON", " yes "])
+    def test_truthy_values(self, monkeypatch, value):
+        monkeypatch.setenv(ENV_ACL_FILTER, value)
+        assert acl_filter_enabled() is True
+
+    def test_other_values_disable(self, monkeypatch):
+        monkeypatch.setenv(ENV_ACL_FILTER, "0")
+        assert acl_filter_enabled() is False
+
+
+class TestRecordTokens:
+    def test_record_level_connector_emits_principals_only(self):
+        assert _record(principalIds=["group1", "user9"]).tokens() == ["p:group1", "p:user9"]
+
+    def test_app_level_connector_emits_app_token(self):
+        record = _record(
+            connectorId="jira", appType="JIRA",
+            permissionModel=PermissionModel.APP_LEVEL.value, principalIds=[],
+        )
+        assert record.tokens() == ["a:jira"]
+
+    def test_knowledge_base_emits_app_token(self):
+        record = _record(connectorId="kb1", appType=Connectors.KNOWLEDGE_BASE.value, principalIds=[])
+        assert record.tokens() == ["a:kb1"]
+
+    def test_anyone_share_emits_org_token(self):
+        assert "o:org1" in _record(anyone=True).tokens()
+
+    def test_payload_metadata_carries_connector(self):
+        meta = _record().payload_metadata()
+        assert meta == {ACL_TOKENS_FIELD: ["p:group1"], ACL_CONNECTOR_FIELD: "drive"}
+
+    def test_drops_empty_principals(self):
+        assert _record(principalIds=[None, "", "group1"]).tokens() == ["p:group1"]
+
+
+class TestUserTokens:
+    def test_user_tokens(self):
+        assert _user().tokens() == [
+            "a:jira", "a:kb1", "o:org1", "p:group1", "p:org1", "p:user1",
+        ]
+
+    def test_kb_apps_admitted_only_via_kb_ids(self):
+        user = _user(
+            apps=[{"id": "kb2", "type": Connectors.KNOWLEDGE_BASE.value}],
+            kbIds=["kb1"],
+        )
+        assert user.connector_ids() == ["kb1"]
+        assert "a:kb2" not in user.tokens()
+
+    def test_token_count_is_independent_of_corpus_size(self):
+        assert len(_user().tokens()) < 10
+
+
+class TestVerifyAccessibleRecords:
+    def test_shared_principal_is_readable(self):
+        assert verify_accessible_records(_user(), [_record()], COMPLETED) == {"vr1": "rec1"}
+
+    def test_revoked_permission_is_dropped(self):
+        assert verify_accessible_records(_user(), [_record(principalIds=["other"])], COMPLETED) == {}
+
+    def test_connector_not_attached_to_user_is_dropped(self):
+        assert verify_accessible_records(_user(), [_record(connectorId="slack")], COMPLETED) == {}
+
+    def test_other_org_is_dropped(self):
+        assert verify_accessible_records(_user(), [_record(orgId="org2")], COMPLETED) == {}
+
+    def test_incomplete_record_is_dropped(self):
+        record = _record(indexingStatus="IN_PROGRESS")
+        assert verify_accessible_records(_user(), [record], COMPLETED) == {}
+
+    def test_first_readable_record_per_virtual_id_wins(self):
+        records = [
+            _record(recordId="rec1", principalIds=["other"]),
+            _record(recordId="rec2"),
+            _record(recordId="rec3"),
+        ]
+        assert verify_accessible_records(_user(), records, COMPLETED) == {"vr1": "rec2"}
+
+
+class TestRecordAclLookup:
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_query(self):
+        graph = MagicMock()
+        graph.get_records_acl_principals = AsyncMock(
+            return_value=[
+                {"recordId": "rec1", "principalIds": ["u1"]},
+                {"recordId": "rec2", "principalIds": ["u2"]},
+            ]
+        )
+        lookup = RecordAclLookup(graph)
+
+        rec1, rec2, missing = await asyncio.gather(
+            lookup.get("org1", "rec1"), lookup.get("org1", "rec2"), lookup.get("org1", "gone")
+        )
+
+        graph.get_records_acl_principals.assert_awaited_once()
+        args, kwargs = graph.get_records_acl_principals.await_args
+        assert args == ("org1",)
+        assert sorted(kwargs["record_ids"]) == ["gone", "rec1", "rec2"]
+        assert rec1.principal_ids == ["u1"]
+        assert rec2.principal_ids == ["u2"]
+        assert missing is None
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        graph = MagicMock()
+        graph.get_records_acl_principals = AsyncMock(return_value=[])
+        lookup = RecordAclLookup(graph, window=60.0, max_batch=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(lookup.get("org1", "rec1"), lookup.get("org1", "rec2")), 1.0
+        )
+
+        assert results == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_orgs_are_queried_separately(self):
+        graph = MagicMock()
+        graph.get_records_acl_principals = AsyncMock(return_value=[])
+        lookup = RecordAclLookup(graph)
+
+        await asyncio.gather(lookup.get("org1", "rec1"), lookup.get("org2", "rec2"))
+
+        orgs = sorted(call.args[0] for call in graph.get_records_acl_principals.await_args_list)
+        assert orgs == ["org1", "org2"]
+
+    @pytest.mark.asyncio
+    async def test_query_failure_reaches_every_caller(self):
+        graph = MagicMock()
+        graph.get_records_acl_principals = AsyncMock(side_effect=RuntimeError("graph down"))
+        lookup = RecordAclLookup(graph)
+
+        results = await asyncio.gather(
+            lookup.get("org1", "rec1"), lookup.get("org1", "rec2"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
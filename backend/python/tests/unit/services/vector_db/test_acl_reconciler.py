@@ -0,0 +1,103 @@
+"""Tests for app.services.vector_db.acl_reconciler (stale ACL token refresh)."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.vector_db.acl import ACL_CONNECTOR_FIELD, ACL_TOKENS_FIELD
+from app.services.vector_db.acl_reconciler import (
+    ENV_ACL_RECONCILE,
+    AclPayloadReconciler,
+    acl_reconcile_enabled,
+)
+from app.services.vector_db.models import ScrollResult, VectorPoint
+
+
+def _point(point_id: str, vid: str, tokens=None, connector_id="drive") -> VectorPoint:
+    metadata = {"orgId": "org1", "virtualRecordId": vid}
+    if tokens is not None:
+        metadata[ACL_TOKENS_FIELD] = tokens
+        metadata[ACL_CONNECTOR_FIELD] = connector_id
+    return VectorPoint(id=point_id, payload={"metadata": metadata})
+
+
+def _row(record_id: str, vid: str, principal_ids: list[str]) -> dict:
+    return {
+        "recordId": record_id,
+        "virtualRecordId": vid,
+        "connectorId": "drive",
+        "orgId": "org1",
+        "appType": "DRIVE",
+        "principalIds": principal_ids,
+    }
+
+
+def _reconciler(pages: list[ScrollResult], rows: list[dict]) -> AclPayloadReconciler:
+    graph = MagicMock()
+    graph.get_all_orgs = AsyncMock(return_value=[{"_key": "org1"}])
+    graph.get_records_acl_principals = AsyncMock(return_value=rows)
+    vdb = MagicMock()
+    vdb.filter_collection = AsyncMock(side_effect=lambda **kw: kw["must"])
+    vdb.scroll = AsyncMock(side_effect=pages)
+    vdb.set_metadata_fields = AsyncMock()
+    return AclPayloadReconciler(MagicMock(), graph, vdb, "records", page_size=2)
+
+
+class TestAclReconcileEnabled:
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv(ENV_ACL_RECONCILE, raising=False)
+        assert acl_reconcile_enabled() is False
+
+    def test_opt_in(self, monkeypatch):
+        monkeypatch.setenv(ENV_ACL_RECONCILE, "true")
+        assert acl_reconcile_enabled() is True
+
+
+class TestAclPayloadReconciler:
+    @pytest.mark.asyncio
+    async def test_refreshes_only_stale_virtual_records(self):
+        pages = [
+            ScrollResult(points=[_point("1", "vr1", ["p:u1"]), _point("2", "vr2", ["p:u1"])], next_offset="2"),
+            ScrollResult(points=[_point("3", "vr2", ["p:u1"])], next_offset=None),
+        ]
+        rows = [_row("rec1", "vr1", ["u1"]), _row("rec2", "vr2", ["u1", "u2"])]
+        reconciler = _reconciler(pages, rows)
+
+        assert await reconciler.run_once() == 2  # vr2 appears on both pages
+
+        vdb = reconciler.vector_db_service
+        assert vdb.scroll.await_count == 2
+        for call in vdb.set_metadata_fields.await_args_list:
+            collection, metadata, selector = call.args
+            assert collection == "records"
+            assert metadata == {ACL_TOKENS_FIELD: ["p:u1", "p:u2"], ACL_CONNECTOR_FIELD: "drive"}
+            assert selector == {"orgId": "org1", "virtualRecordId": "vr2"}
+
+    @pytest.mark.asyncio
+    async def test_stamps_points_indexed_without_tokens(self):
+        pages = [ScrollResult(points=[_point("1", "vr1")], next_offset=None)]
+        reconciler = _reconciler(pages, [_row("rec1", "vr1", ["u1"])])
+
+        assert await reconciler.run_once() == 1
+
+        metadata = reconciler.vector_db_service.set_metadata_fields.await_args.args[1]
+        assert metadata[ACL_TOKENS_FIELD] == ["p:u1"]
+
+    @pytest.mark.asyncio
+    async def test_shared_virtual_record_gets_union_of_tokens(self):
+        pages = [ScrollResult(points=[_point("1", "vr1", ["p:u1"])], next_offset=None)]
+        rows = [_row("rec1", "vr1", ["u1"]), _row("rec2", "vr1", ["g1"])]
+        reconciler = _reconciler(pages, rows)
+
+        await reconciler.run_once()
+
+        metadata = reconciler.vector_db_service.set_metadata_fields.await_args.args[1]
+        assert metadata[ACL_TOKENS_FIELD] == ["p:g1", "p:u1"]
+
+    @pytest.mark.asyncio
+    async def test_records_missing_from_graph_are_left_alone(self):
+        pages = [ScrollResult(points=[_point("1", "gone", ["p:u1"])], next_offset=None)]
+        reconciler = _reconciler(pages, [])
+
+        assert await reconciler.run_once() == 0
+        reconciler.vector_db_service.set_metadata_fields.assert_not_awaited()
@@ -672,18 +672,82 @@ class TestQueryNearestPoints:
 
     @pytest.mark.asyncio
     async def test_query_multiple_requests(self, connected_service):
-        connected_service.client.search = AsyncMock(return_value={
-            "hits": {"hits": [
+        connected_service.client.search = AsyncMock()
+        connected_service.client.msearch = AsyncMock(return_value={"responses": [
+            {"status": 200, "hits": {"hits": [
                 {"_id": "d1", "_score": 0.9, "_source": {"metadata": {}, "page_content": "a"}},
-            ]}
-        })
+            ]}},
+            {"status": 200, "hits": {"hits": []}},
+        ]})
 
         req1 = HybridSearchRequest(dense_query=[0.1], limit=5)
         req2 = HybridSearchRequest(text_query="test", limit=5)
         results = await connected_service.query_nearest_points("my-idx", [req1, req2])
 
-        assert len(results) == 2
-        assert connected_service.client.search.await_count == 2
+        assert [[r.id for r in hits] for hits in results] == [["d1"], []]
+        connected_service.client.msearch.assert_awaited_once()
+        connected_service.client.search.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_msearch_selects_pipeline_per_request(self, connected_service):
+        connected_service.client.transport = MagicMock()
+        connected_service.client.transport.perform_request = AsyncMock()
+        connected_service.client.msearch = AsyncMock(return_value={"responses": [
+            {"status": 200, "hits": {"hits": []}},
+            {"status": 200, "hits": {"hits": []}},
+        ]})
+
+        await connected_service.query_nearest_points("my-idx", [
+            HybridSearchRequest(dense_query=[0.1], text_query="q", limit=5),
+            HybridSearchRequest(dense_query=[0.1], limit=5),
+        ])
+
+        lines = connected_service.client.msearch.call_args.kwargs["body"]
+        assert lines[0] == {"index": "my-idx", "search_pipeline": "my-idx-rrf-pipeline"}
+        assert lines[2] == {"index": "my-idx"}
+
+    @pytest.mark.asyncio
+    async def test_msearch_item_error_raises_like_search(self, connected_service):
+        from opensearchpy.exceptions import NotFoundError
+
+        connected_service.client.msearch = AsyncMock(return_value={"responses": [
+            {"status": 200, "hits": {"hits": []}},
+            {"status": 404, "error": {"type": "index_not_found_exception"}},
+        ]})
+
+        with pytest.raises(NotFoundError):
+            await connected_service.query_nearest_points("my-idx", [
+                HybridSearchRequest(dense_query=[0.1], limit=5),
+                HybridSearchRequest(text_query="q", limit=5),
+            ])
+
+    @pytest.mark.asyncio
+    async def test_msearch_without_pipeline_header_support(self, connected_service):
+        from opensearchpy.exceptions import RequestError
+
+        connected_service.client.transport = MagicMock()
+        connected_service.client.transport.perform_request = AsyncMock()
+        connected_service.client.search = AsyncMock(return_value={"hits": {"hits": [
+            {"_id": "h", "_score": 1.0, "_source": {"metadata": {}, "page_content": "h"}},
+        ]}})
+        connected_service.client.msearch = AsyncMock(side_effect=[
+            RequestError(400, "illegal_argument_exception", {}),
+            {"responses": [{"status": 200, "hits": {"hits": []}}] * 2},
+        ])
+        requests = [
+            HybridSearchRequest(dense_query=[0.1], text_query="q", limit=5),
+            HybridSearchRequest(dense_query=[0.1], limit=5),
+            HybridSearchRequest(text_query="q", limit=5),
+        ]
+
+        results = await connected_service.query_nearest_points("my-idx", requests)
+
+        assert [[r.id for r in hits] for hits in results] == [["h"], [], []]
+        assert connected_service.client.search.call_args.kwargs["params"] == {
+            "search_pipeline": "my-idx-rrf-pipeline"
+        }
+        retried = connected_service.client.msearch.call_args.kwargs["body"]
+        assert all("search_pipeline" not in line for line in retried[::2])
 
     @pytest.mark.asyncio
     async def test_query_with_filter(self, connected_service):
@@ -794,6 +858,28 @@ class TestScroll:
         assert isinstance(result, ScrollResult)
         assert len(result.points) == 5
 
+    @pytest.mark.asyncio
+    async def test_scroll_past_max_result_window_pages_with_search_after(self, connected_service):
+        bodies = []
+
+        async def search_side_effect(**kwargs):
+            body = kwargs["body"]
+            bodies.append(body)
+            start = int(body.get("search_after", [-1])[0]) + 1
+            return {"hits": {"hits": [
+                {"_id": str(i), "sort": [str(i)], "_source": {"metadata": {}, "page_content": ""}}
+                for i in range(start, min(start + body["size"], 25000))
+            ]}}
+
+        connected_service.client.search = search_side_effect
+
+        result = await connected_service.scroll("my-idx", FilterExpression(), 100000)
+
+        assert len(result.points) == 25000
+        assert [b["size"] for b in bodies] == [10000, 10000, 10000]
+        assert bodies[1]["search_after"] == ["9999"]
+        assert result.next_offset is None
+
     @pytest.mark.asyncio
     async def test_scroll_not_connected(self, service):
         with pytest.raises(RuntimeError, match="config not loaded"):
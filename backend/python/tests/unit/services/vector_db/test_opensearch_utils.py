@@ -461,6 +461,23 @@ class TestBuildHybridQuery:
         body = OpenSearchUtils.build_hybrid_query(req)
         assert body["_source"]["exclude"] == ["dense_embedding"]
 
+    def test_balanced_precision_keeps_index_ef_search(self):
+        req = HybridSearchRequest(dense_query=[0.1], limit=15)
+        knn = OpenSearchUtils.build_hybrid_query(req)["query"]["knn"]["dense_embedding"]
+        assert knn["k"] == 30
+        assert "method_parameters" not in knn
+
+    def test_precision_profile_sets_k_and_ef_search(self):
+        from app.services.vector_db.models import SearchPrecision
+        fast = HybridSearchRequest(dense_query=[0.1], limit=15, precision=SearchPrecision.FAST)
+        exact = HybridSearchRequest(dense_query=[0.1], limit=15, precision=SearchPrecision.EXACT)
+
+        fast_knn = OpenSearchUtils.build_hybrid_query(fast)["query"]["knn"]["dense_embedding"]
+        exact_knn = OpenSearchUtils.build_hybrid_query(exact)["query"]["knn"]["dense_embedding"]
+
+        assert (fast_knn["k"], fast_knn["method_parameters"]) == (15, {"ef_search": 32})
+        assert (exact_knn["k"], exact_knn["method_parameters"]) == (60, {"ef_search": 256})
+
 
 # ---------------------------------------------------------------------------
 # OpenSearchService.filter_collection (returns FilterExpression)
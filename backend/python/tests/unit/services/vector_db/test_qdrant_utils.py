@@ -550,3 +550,47 @@ class TestMinShouldTranslation:
         result: Filter = QdrantUtils.filter_expression_to_qdrant(expr)
 
         assert result.min_should is None
+
+
+# ---------------------------------------------------------------------------
+# QdrantUtils.search_request_to_qdrant — precision profiles
+# ---------------------------------------------------------------------------
+
+@_skip_if_qdrant_stub
+class TestSearchRequestPrecision:
+
+    def _request(self, precision):
+        from app.services.vector_db.models import HybridSearchRequest, SparseVector
+        return HybridSearchRequest(
+            dense_query=[0.1, 0.2],
+            sparse_query=SparseVector(indices=[1], values=[0.5]),
+            limit=10,
+            precision=precision,
+        )
+
+    def test_balanced_sends_no_search_params(self):
+        from app.services.vector_db.models import SearchPrecision
+        query = QdrantUtils.search_request_to_qdrant(self._request(SearchPrecision.BALANCED))
+
+        assert [p.limit for p in query.prefetch] == [20, 20]
+        assert all(p.params is None for p in query.prefetch)
+
+    def test_exact_oversamples_and_rescores_dense_leg(self):
+        from app.services.vector_db.models import SearchPrecision
+        dense, sparse = QdrantUtils.search_request_to_qdrant(
+            self._request(SearchPrecision.EXACT)
+        ).prefetch
+
+        assert dense.limit == sparse.limit == 40
+        assert dense.params.hnsw_ef == 256
+        assert dense.params.quantization.oversampling == 2.0
+        assert dense.params.quantization.rescore is True
+        assert sparse.params is None
+
+    def test_fast_skips_rescore(self):
+        from app.services.vector_db.models import SearchPrecision
+        dense = QdrantUtils.search_request_to_qdrant(self._request(SearchPrecision.FAST)).prefetch[0]
+
+        assert dense.limit == 10
+        assert dense.params.hnsw_ef == 32
+        assert dense.params.quantization.rescore is False
@@ -268,6 +268,23 @@ class TestRedisUpsert:
         assert "metadata_virtualRecordId" in fields_dict
         assert "metadata_blockIndex" in fields_dict
 
+    @pytest.mark.asyncio
+    async def test_set_metadata_fields_hsets_only_those_fields(self, service, mock_redis_client):
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(return_value=[1, 1])
+        mock_redis_client.pipeline = MagicMock(return_value=pipeline)
+        service._keys_matching_filter = AsyncMock(return_value=["coll:p1", "coll:p2"])
+
+        await service.set_metadata_fields(
+            "coll", {"aclTokens": ["p:g1", "p:u1"], "connectorId": "drive"}, MagicMock()
+        )
+
+        calls = pipeline.execute_command.call_args_list
+        assert [c.args[1] for c in calls] == ["coll:p1", "coll:p2"]
+        assert calls[0].args == (
+            "HSET", "coll:p1", "metadata_aclTokens", "p:g1,p:u1", "metadata_connectorId", "drive",
+        )
+
 
 # ---------------------------------------------------------------------------
 # FT.HYBRID command construction
@@ -337,6 +354,22 @@ class TestRedisHybridQuery:
         params_idx = args.index("PARAMS")
         assert args[params_idx + 2] == "vec", "PARAMS name must be bare 'vec'"
 
+    @pytest.mark.asyncio
+    async def test_ft_hybrid_precision_sets_ef_runtime(self, service, mock_redis_client):
+        """EXACT precision widens the KNN window and adds EF_RUNTIME (arg-count 4)."""
+        from app.services.vector_db.models import SearchPrecision
+
+        mock_redis_client.execute_command = AsyncMock(return_value=[0])
+        req = HybridSearchRequest(
+            dense_query=[0.1, 0.2], text_query="hello", limit=5,
+            precision=SearchPrecision.EXACT,
+        )
+        await service.query_nearest_points("coll", [req])
+
+        args = list(mock_redis_client.execute_command.call_args.args)
+        knn_idx = args.index("KNN")
+        assert args[knn_idx + 1:knn_idx + 6] == ["4", "K", "40", "EF_RUNTIME", "256"]
+
     @pytest.mark.asyncio
     async def test_ft_hybrid_hash_reply_parsing(self, service, mock_redis_client):
         """Verify parse_ft_hybrid_reply handles the HASH-style FT.HYBRID reply.
@@ -764,6 +797,28 @@ class TestHashDocDecoding:
         fields = vector_point_to_hash_fields(point, dtype="FLOAT32")
         assert len(fields["dense_embedding"]) == 8  # 2 dims × 4 bytes
 
+    def test_acl_tokens_stored_comma_joined_and_restored_as_list(self):
+        """aclTokens must be a comma-joined TAG value, not JSON, and read back as a list."""
+        from app.services.vector_db.redis.utils import (
+            reconstruct_metadata,
+            vector_point_to_hash_fields,
+        )
+
+        point = VectorPoint(
+            id="p1",
+            dense_vector=[1.0],
+            payload={
+                "page_content": "",
+                "metadata": {"orgId": "o1", "aclTokens": ["a:conn1", "p:group1"]},
+            },
+        )
+        fields = vector_point_to_hash_fields(point, dtype="FLOAT32")
+        assert fields["metadata_aclTokens"] == "a:conn1,p:group1"
+
+        metadata = reconstruct_metadata({k: v for k, v in fields.items() if k != "dense_embedding"})
+        assert metadata["aclTokens"] == ["a:conn1", "p:group1"]
+        assert metadata["orgId"] == "o1"
+
 
 # ---------------------------------------------------------------------------
 # Connection Lifecycle Tests
@@ -227,3 +227,41 @@ class TestExecuteParallelSearches:
         req = requests[0]
         assert req.sparse_query is None, "No client-side sparse for text-search providers"
         assert req.text_query == "find documents"
+
+
+# ---------------------------------------------------------------------------
+# Search precision per chat mode
+# ---------------------------------------------------------------------------
+
+
+class TestSearchPrecision:
+    @pytest.mark.parametrize("chat_mode, expected", [
+        (None, "balanced"),
+        ("internal_search", "balanced"),
+        ("quick", "fast"),
+        ("deep", "exact"),
+        ("planExecute", "exact"),
+        ("Deep_Research", "exact"),
+        ("something-new", "balanced"),
+    ])
+    def test_chat_mode_mapping(self, chat_mode, expected):
+        from app.modules.retrieval.retrieval_service import search_precision_for_chat_mode
+
+        assert search_precision_for_chat_mode(chat_mode).value == expected
+
+    @pytest.mark.asyncio
+    async def test_precision_reaches_every_request(self):
+        from app.services.vector_db.models import SearchPrecision
+
+        svc = _make_vector_db_service(supports_sparse=False, supports_text=True)
+        rs = _make_retrieval_service(svc)
+        mock_embed = AsyncMock()
+        mock_embed.aembed_query = AsyncMock(return_value=[0.1])
+        rs.get_embedding_model_instance = AsyncMock(return_value=mock_embed)
+
+        await rs._execute_parallel_searches(
+            ["q1", "q2"], FilterExpression(), 5, precision=SearchPrecision.EXACT,
+        )
+
+        requests = svc.query_nearest_points.call_args.kwargs["requests"]
+        assert [r.precision for r in requests] == [SearchPrecision.EXACT] * 2
@@ -0,0 +1,269 @@
+"""Tests for app.sources.client.http.connection_pool.
+
+Requests go to a keep-alive HTTP/1.1 server on localhost, so connection and
+DNS counts are what a sync would see against a SaaS host.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.sources.client.http import connection_pool
+from app.sources.client.http.http_client import HTTPClient
+from app.sources.client.http.http_request import HTTPRequest
+
+
+class KeepAliveServer:
+    """Answers every request with ``200 ok`` and counts accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.request_heads: list[bytes] = []
+        self.set_cookie = False
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://localhost:{port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                self.request_heads.append(head.lower())
+                cookie = b"Set-Cookie: session=tenant-a; Path=/\r\n" if self.set_cookie else b""
+                writer.write(b"HTTP/1.1 200 OK\r\n" + cookie + b"Content-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def server():
+    connection_pool.reset_connection_pools()
+    srv = KeepAliveServer()
+    await srv.start()
+    yield srv
+    await connection_pool.close_shared_pools()
+    await srv.stop()
+    connection_pool.reset_connection_pools()
+
+
+async def _sync(token: str, url: str, pages: int) -> None:
+    """One connector sync: its own HTTPClient, a few sequential pages."""
+    client = HTTPClient(token=token)
+    for page in range(pages):
+        response = await client.execute(HTTPRequest(url=f"{url}/items", method="GET", query={"page": str(page)}))
+        assert response.status == 200
+    await client.close()
+
+
+class TestSharedPool:
+    @pytest.mark.asyncio
+    async def test_syncs_against_one_host_share_warm_connections(self, server):
+        for _ in range(5):
+            await _sync("tok", server.url, pages=4)
+
+        stats = connection_pool.pool_stats()["localhost"]
+        assert server.connections == 1
+        assert stats.requests == 20
+        assert stats.connections_opened == 1
+        assert stats.reused_requests == 19
+
+    @pytest.mark.asyncio
+    async def test_per_instance_clients_reconnect_every_sync(self, server, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_SHARED_POOL, "false")
+
+        for _ in range(5):
+            await _sync("tok", server.url, pages=4)
+
+        assert server.connections == 5
+
+    @pytest.mark.asyncio
+    async def test_credentials_get_separate_pools(self, server):
+        await _sync("tenant-a", server.url, pages=2)
+        await _sync("tenant-b", server.url, pages=2)
+        await _sync("tenant-a", server.url, pages=2)
+
+        assert server.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_dns_is_resolved_once_per_ttl(self, server, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_MAX_KEEPALIVE, "0")
+
+        for _ in range(3):
+            await _sync("tok", server.url, pages=1)
+
+        stats = connection_pool.pool_stats()["localhost"]
+        assert server.connections == 3
+        assert stats.dns_lookups == 1
+        assert stats.dns_cache_hits == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_pools_are_closed(self, server, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_POOL_IDLE_TTL, "0")
+        held = HTTPClient(token="held")
+        held_client = await held._ensure_client(server.url)
+        released = HTTPClient(token="released")
+        released_client = await released._ensure_client(server.url)
+        await released.close()
+
+        await HTTPClient(token="other")._ensure_client(server.url)
+        await asyncio.sleep(0)
+
+        assert released_client.is_closed
+        assert not held_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_abandoned_pools_are_closed_and_replaced(self, server, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_POOL_ABANDONED_TTL, "0")
+        leaked = HTTPClient(token="leaked")  # never closed
+        await leaked.execute(HTTPRequest(url=f"{server.url}/items", method="GET"))
+        leaked_client = leaked.client
+
+        await HTTPClient(token="other")._ensure_client(server.url)
+        await asyncio.sleep(0)
+        assert leaked_client.is_closed
+
+        response = await leaked.execute(HTTPRequest(url=f"{server.url}/items", method="GET"))
+        assert response.status == 200
+        assert leaked.client is not leaked_client
+
+    @pytest.mark.asyncio
+    async def test_pooled_clients_keep_no_cookies(self, server):
+        server.set_cookie = True
+        await _sync("tenant-a", server.url, pages=2)
+        await _sync("tenant-a", server.url, pages=1)
+
+        assert server.connections == 1
+        assert not any(b"\r\ncookie:" in head for head in server.request_heads)
+
+    @pytest.mark.asyncio
+    async def test_query_and_api_key_credentials_get_separate_pools(self, server):
+        async def trello_style(key: str) -> None:
+            client = HTTPClient(token="", token_type="")
+            client.headers = {"Accept": "application/json"}
+            for page in range(2):
+                await client.execute(HTTPRequest(
+                    url=f"{server.url}/1/boards", method="GET",
+                    query={"key": key, "token": "t", "pageToken": str(page)},
+                ))
+            await client.close()
+
+        async def api_key_style(api_key: str) -> None:
+            client = HTTPClient(token="", token_type="")
+            client.headers = {"x-sn-apikey": api_key}
+            await client.execute(HTTPRequest(url=f"{server.url}/api/now/table", method="GET"))
+            await client.close()
+
+        await trello_style("tenant-a")
+        await trello_style("tenant-b")
+        await trello_style("tenant-a")
+        assert server.connections == 2
+
+        await api_key_style("tenant-a")
+        await api_key_style("tenant-b")
+        assert server.connections == 4
+
+    @pytest.mark.asyncio
+    async def test_environment_proxies_are_honoured(self, server, monkeypatch):
+        for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy", "HTTP_PROXY", "ALL_PROXY"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("HTTP_PROXY", server.url)
+        monkeypatch.setenv("HTTPS_PROXY", server.url)
+        monkeypatch.setenv("NO_PROXY", "localhost")
+
+        # The stub server cannot speak TLS, so the tunnelled request times out.
+        client = HTTPClient(token="tok", timeout=1.0)
+        response = await client.execute(HTTPRequest(url="http://source.example/items", method="GET"))
+        assert response.status == 200
+        with pytest.raises(httpx.HTTPError):
+            await client.execute(HTTPRequest(url="https://source.example/items", method="GET"))
+        await client.execute(HTTPRequest(url=f"{server.url}/direct", method="GET"))
+        await client.close()
+
+        assert server.request_heads[0].startswith(b"get http://source.example/items ")
+        assert server.request_heads[1].startswith(b"connect source.example:443 ")
+        assert server.request_heads[2].startswith(b"get /direct ")
+
+
+class TestSettings:
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_MAX_CONNECTIONS, "7")
+        monkeypatch.setenv(connection_pool.ENV_KEEPALIVE_EXPIRY, "bad")
+        monkeypatch.setenv(connection_pool.ENV_HTTP2, "off")
+
+        settings = connection_pool.PoolSettings.from_env()
+
+        assert settings.limits == httpx.Limits(
+            max_connections=7,
+            max_keepalive_connections=connection_pool.DEFAULT_MAX_KEEPALIVE,
+            keepalive_expiry=connection_pool.DEFAULT_KEEPALIVE_EXPIRY,
+        )
+        assert settings.http2 is False
+
+    def test_http2_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv(connection_pool.ENV_HTTP2, raising=False)
+        monkeypatch.setattr(connection_pool, "http2_available", lambda: True)
+        assert connection_pool.PoolSettings.from_env().http2 is False
+
+    def test_http2_needs_h2(self, monkeypatch):
+        monkeypatch.setenv(connection_pool.ENV_HTTP2, "true")
+        monkeypatch.setattr(connection_pool, "http2_available", lambda: False)
+        assert connection_pool.PoolSettings.from_env().http2 is False
+
+    def test_transport_exposes_network_backend(self):
+        # Guards the one httpx internal the pool relies on: a version bump that
+        # drops it must fail here, not silently disable the DNS cache.
+        transport = connection_pool._PooledTransport(connection_pool.PoolSettings.from_env())
+        assert isinstance(transport._pool._network_backend, connection_pool._CachingNetworkBackend)
+
+    def test_environment_proxy_patterns(self, monkeypatch):
+        for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy", "HTTP_PROXY", "ALL_PROXY"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("HTTPS_PROXY", "proxy.internal:3128")
+        monkeypatch.setenv("NO_PROXY", "localhost,10.0.0.1,::1,.corp.example")
+
+        assert connection_pool._environment_proxies() == {
+            "https://": "http://proxy.internal:3128",
+            "all://localhost": None,
+            "all://10.0.0.1": None,
+            "all://[::1]": None,
+            "all://*.corp.example": None,
+        }
+
+    def test_pool_key_hides_credentials(self):
+        key = connection_pool.pool_key_for(
+            "https://acme.atlassian.net/rest/api/3", {"Authorization": "Bearer secret"}
+        )
+
+        assert key.scheme == "https"
+        assert key.host == "acme.atlassian.net"
+        assert "secret" not in key.auth_scope
+        assert connection_pool.pool_key_for(None, {"Authorization": ""}).auth_scope == "anonymous"
+
+    def test_pool_key_scopes_on_every_credential(self):
+        scope = lambda *a: connection_pool.pool_key_for(*a).auth_scope  # noqa: E731
+        url = "https://api.trello.com/1/members/me/boards"
+
+        assert scope(url, {"Accept": "application/json"}, {"fields": "name"}) == "anonymous"
+        assert scope(url, {}, {"key": "a", "token": "t"}) != scope(url, {}, {"key": "b", "token": "t"})
+        assert scope(f"{url}?key=a&token=t", {}) == scope(url, {}, {"key": "a", "token": "t"})
+        assert scope(url, {"x-sn-apikey": "a"}) != scope(url, {"X-SN-APIKEY": "b"})
+        assert scope(url, {"x-sn-apikey": "a"}) == scope(url, {"X-SN-APIKEY": "a"})
+        assert scope(url, {"Authorization": "x"}, {"pageToken": "1", "syncToken": "s"}) == scope(
+            url, {"Authorization": "x", "Idempotency-Key": "k"}, {"pageToken": "2"}
+        )
@@ -0,0 +1,357 @@
+"""Tests for app.sources.client.http.rate_limiter."""
+
+import asyncio
+import logging
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.sources.client.http import rate_limiter
+from app.sources.client.http.http_client import HTTPClient
+from app.sources.client.http.http_request import HTTPRequest
+from app.sources.client.http.http_retry import call_with_retry
+from app.sources.client.http.rate_limiter import (
+    AdaptiveRateLimiter,
+    PacingUpdate,
+    RateLimitObservation,
+    RedisRateLimitStore,
+    pacing_for,
+    parse_rate_limit_headers,
+)
+
+fakeredis_aioredis = pytest.importorskip("fakeredis.aioredis")
+
+NOW = 1_700_000_000.0
+KEY = ("api.example.com", "tenant-a")
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter():
+    rate_limiter.reset_rate_limiter()
+    yield
+    rate_limiter.reset_rate_limiter()
+
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+class TestParseHeaders:
+    def test_github_epoch_reset(self):
+        obs = parse_rate_limit_headers(
+            {"x-ratelimit-limit": "5000", "x-ratelimit-remaining": "4990", "x-ratelimit-reset": str(int(NOW) + 600)},
+            200,
+            NOW,
+        )
+        assert (obs.limit, obs.remaining, obs.reset_after) == (5000, 4990, 600)
+
+    def test_atlassian_iso_reset_and_near_limit(self):
+        obs = parse_rate_limit_headers(
+            {
+                "X-RateLimit-Limit": "100",
+                "X-RateLimit-Remaining": "12",
+                "X-RateLimit-Reset": "2023-11-14T22:14:20Z",
+                "X-RateLimit-NearLimit": "true",
+            },
+            200,
+            NOW,
+        )
+        assert obs.reset_after == pytest.approx(60)
+        assert obs.near_limit is True
+
+    def test_ietf_fields_and_list_values(self):
+        obs = parse_rate_limit_headers(
+            {"RateLimit-Limit": "100, 100;w=60", "RateLimit-Remaining": "40", "RateLimit-Reset": "30"}, 200, NOW
+        )
+        assert (obs.limit, obs.remaining, obs.reset_after) == (100, 40, 30)
+
+    def test_combined_ratelimit_field(self):
+        assert parse_rate_limit_headers({"ratelimit": "limit=10, remaining=3, reset=5"}, 200, NOW).remaining == 3
+        obs = parse_rate_limit_headers({"ratelimit": '"default";r=7;t=20'}, 200, NOW)
+        assert (obs.remaining, obs.reset_after) == (7, 20)
+
+    def test_retry_after_only_on_throttle(self):
+        assert parse_rate_limit_headers({"Retry-After": "30"}, 429, NOW).retry_after == 30
+        assert parse_rate_limit_headers({"Retry-After": "30"}, 200, NOW).empty
+        http_date = parse_rate_limit_headers({"Retry-After": "Tue, 14 Nov 2023 22:13:50 GMT"}, 503, NOW)
+        assert http_date.retry_after == pytest.approx(30)
+
+    def test_ignores_non_string_headers(self):
+        assert parse_rate_limit_headers(MagicMock(), MagicMock(), NOW).empty
+
+
+class TestPacing:
+    def test_bucket_holds_remaining_budget_minus_headroom(self):
+        update = pacing_for(RateLimitObservation(limit=100, remaining=60, reset_after=25), headroom=0.1)
+        assert update == PacingUpdate(tokens=50, capacity=90, reset_after=25)
+
+    def test_headroom_only_means_wait_for_reset(self):
+        update = pacing_for(RateLimitObservation(limit=100, remaining=10, reset_after=25), headroom=0.1)
+        assert update.tokens == 0
+
+    def test_near_limit_without_numbers_pauses(self):
+        update = pacing_for(RateLimitObservation(near_limit=True), 0.1)
+        assert update == PacingUpdate(block_for=rate_limiter.NEAR_LIMIT_PAUSE_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+def _budget(remaining: int, reset: float, limit: int = 10) -> dict:
+    return {"RateLimit-Limit": str(limit), "RateLimit-Remaining": str(remaining), "RateLimit-Reset": str(reset)}
+
+
+class TestAdaptiveRateLimiter:
+    @pytest.mark.asyncio
+    async def test_unknown_provider_is_never_paced(self):
+        limiter = AdaptiveRateLimiter()
+        slot = await limiter.acquire(KEY)
+
+        assert slot.waited == 0.0
+        assert slot.taken_from is None
+
+    @pytest.mark.asyncio
+    async def test_retry_after_blocks_every_caller_for_the_tenant(self):
+        limiter = AdaptiveRateLimiter()
+        await limiter.observe(KEY, 429, {"Retry-After": "0.2"})
+
+        waits = await asyncio.gather(*(limiter.acquire(KEY) for _ in range(3)))
+        other_tenant = await limiter.acquire(("api.example.com", "tenant-b"))
+
+        assert all(w.waited == pytest.approx(0.2, abs=0.05) for w in waits)
+        assert other_tenant.waited == 0.0
+
+    @pytest.mark.asyncio
+    async def test_budget_is_spent_then_callers_wait_for_reset(self):
+        limiter = AdaptiveRateLimiter()
+        # limit 10, headroom 1: 5 usable requests left in this window
+        await limiter.observe(KEY, 200, _budget(remaining=6, reset=0.2))
+
+        waits = [(await limiter.acquire(KEY)).waited for _ in range(6)]
+
+        assert waits[:5] == [0.0] * 5
+        assert waits[5] == pytest.approx(0.2, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_requests_in_flight_are_not_counted_twice(self):
+        limiter = AdaptiveRateLimiter()
+        await limiter.observe(KEY, 200, _budget(remaining=9, reset=30))
+        slots = [await limiter.acquire(KEY) for _ in range(4)]
+
+        # The provider answers the first of the four; three are still in flight.
+        await limiter.observe(KEY, 200, _budget(remaining=8, reset=30), slots[0])
+
+        assert limiter._buckets[KEY].tokens == 8 - 1 - 3
+
+    @pytest.mark.asyncio
+    async def test_failed_and_unreported_requests_give_their_slot_back(self):
+        limiter = AdaptiveRateLimiter()
+        await limiter.observe(KEY, 200, _budget(remaining=9, reset=30))
+        failed, unreported, pending = [await limiter.acquire(KEY) for _ in range(3)]
+        assert limiter._buckets[KEY].in_flight == 3
+
+        await limiter.release(failed)
+        await limiter.observe(KEY, 200, {}, unreported)
+        await limiter.release(unreported)  # already settled: no-op
+
+        assert limiter._buckets[KEY].in_flight == 1
+        await limiter.observe(KEY, 200, _budget(remaining=7, reset=30), pending)
+        assert limiter._buckets[KEY].in_flight == 0
+        assert limiter._buckets[KEY].tokens == 7 - 1
+
+    @pytest.mark.asyncio
+    async def test_response_to_an_unpaced_request_does_not_settle_others(self):
+        limiter = AdaptiveRateLimiter()
+        early = await limiter.acquire(KEY)  # sent before any budget was known
+        await limiter.observe(KEY, 200, _budget(remaining=9, reset=30))
+        taken = await limiter.acquire(KEY)
+
+        await limiter.observe(KEY, 200, _budget(remaining=8, reset=30), early)
+
+        assert taken.taken_from == "local"
+        assert limiter._buckets[KEY].in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_reset_does_not_disable_pacing(self):
+        limiter = AdaptiveRateLimiter()
+        await limiter.observe(KEY, 200, _budget(remaining=3, reset=0))
+
+        slots = [await limiter.acquire(KEY) for _ in range(3)]
+        bucket = limiter._buckets[KEY]
+
+        # The reported reset has passed: one refill, then a full window.
+        assert all(slot.taken_from == "local" for slot in slots)
+        assert bucket.tokens == bucket.capacity - 3
+        assert bucket.window_end - time.time() == pytest.approx(
+            rate_limiter.MIN_WINDOW_SECONDS, abs=0.1
+        )
+
+    @pytest.mark.asyncio
+    async def test_wait_is_capped(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter, "MAX_WAIT_SECONDS", 0.1)
+        limiter = AdaptiveRateLimiter()
+        await limiter.observe(KEY, 429, {"Retry-After": "3600"})
+
+        assert (await limiter.acquire(KEY)).waited == pytest.approx(0.1)
+
+
+class TestRedisStore:
+    @pytest.fixture
+    async def store(self):
+        redis = fakeredis_aioredis.FakeRedis(decode_responses=True)
+        yield RedisRateLimitStore(logging.getLogger("test"), redis)
+        await redis.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pods_share_one_bucket(self, store):
+        pod_a = AdaptiveRateLimiter(store)
+        pod_b = AdaptiveRateLimiter(store)
+        await pod_a.observe(KEY, 200, _budget(remaining=5, reset=0.3))
+        await pod_b.observe(KEY, 200, _budget(remaining=5, reset=0.3))
+
+        # 4 usable tokens between both pods
+        slots = [await pod.acquire(KEY) for pod in (pod_a, pod_b, pod_a, pod_b)]
+        assert [slot.waited for slot in slots] == [0.0] * 4
+        assert {slot.taken_from for slot in slots} == {"shared"}
+        assert (await pod_b.acquire(KEY)).waited > 0.1
+
+    @pytest.mark.asyncio
+    async def test_fresh_pod_paces_against_the_shared_budget(self, store):
+        warm_pod = AdaptiveRateLimiter(store)
+        await warm_pod.observe(KEY, 200, _budget(remaining=2, reset=0.3))
+        assert (await warm_pod.acquire(KEY)).taken_from == "shared"
+
+        # This pod has seen no response for the key yet.
+        fresh_pod = AdaptiveRateLimiter(store)
+        assert (await fresh_pod.acquire(KEY)).waited > 0.1
+
+    @pytest.mark.asyncio
+    async def test_shared_slot_is_released_in_redis(self, store):
+        limiter = AdaptiveRateLimiter(store)
+        await limiter.observe(KEY, 200, _budget(remaining=9, reset=30))
+        slot = await limiter.acquire(KEY)
+        assert await store._redis.hget(store._key(KEY), "in_flight") == "1"
+
+        await limiter.release(slot)
+
+        assert await store._redis.hget(store._key(KEY), "in_flight") == "0"
+
+    @pytest.mark.asyncio
+    async def test_retry_after_seen_by_one_pod_blocks_the_other(self, store):
+        pod_a = AdaptiveRateLimiter(store)
+        pod_b = AdaptiveRateLimiter(store)
+        await pod_b.observe(KEY, 200, _budget(remaining=9, reset=30))
+        await pod_a.observe(KEY, 429, {"Retry-After": "0.2"})
+
+        assert (await pod_b.acquire(KEY)).waited == pytest.approx(0.2, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_local_bucket(self, store):
+        store._take_script = AsyncMock(side_effect=ConnectionError("down"))
+        limiter = AdaptiveRateLimiter(store)
+        await limiter.observe(KEY, 429, {"Retry-After": "0.1"})
+
+        assert (await limiter.acquire(KEY)).waited == pytest.approx(0.1, abs=0.05)
+        assert not store.available
+
+
+# ---------------------------------------------------------------------------
+# HTTPClient against a provider with a fixed-window budget
+# ---------------------------------------------------------------------------
+class FixedWindowProvider:
+    """Allows ``limit`` requests per ``window`` seconds and says so in headers."""
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.ok = 0
+        self.throttled = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        if now - self.window_start >= self.window:
+            self.window_start, self.used = now, 0
+        reset = self.window - (now - self.window_start)
+        if self.used >= self.limit:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": f"{reset:.3f}"})
+        self.used += 1
+        self.ok += 1
+        return httpx.Response(
+            200,
+            headers={
+                "RateLimit-Limit": str(self.limit),
+                "RateLimit-Remaining": str(self.limit - self.used),
+                "RateLimit-Reset": f"{reset:.3f}",
+            },
+        )
+
+
+async def _run_sync(provider: FixedWindowProvider, tasks: int, requests_per_task: int) -> None:
+    client = HTTPClient(token="tenant-a")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(provider.handler))
+
+    async def worker() -> None:
+        for _ in range(requests_per_task):
+            await call_with_retry(
+                lambda: client.execute(HTTPRequest(url="https://api.example.com/items", method="GET")),
+                logger=logging.getLogger("test"),
+                max_attempts=10,
+            )
+
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    await client.close()
+
+
+class TestProviderCeiling:
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_stay_under_the_budget(self):
+        provider = FixedWindowProvider(limit=20, window=0.25)
+
+        await _run_sync(provider, tasks=8, requests_per_task=10)
+
+        assert provider.ok == 80
+        assert provider.throttled == 0
+
+    @pytest.mark.asyncio
+    async def test_without_limiter_tasks_hit_429s(self, monkeypatch):
+        monkeypatch.setenv(rate_limiter.ENV_RATE_LIMIT, "false")
+        provider = FixedWindowProvider(limit=20, window=0.25)
+
+        await _run_sync(provider, tasks=8, requests_per_task=10)
+
+        assert provider.ok == 80
+        assert provider.throttled > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_requests_do_not_leak_in_flight_slots(self):
+        provider = FixedWindowProvider(limit=20, window=30)
+        client = HTTPClient(token="tenant-a")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(provider.handler))
+        request = HTTPRequest(url="https://api.example.com/items", method="GET")
+        await client.execute(request)
+
+        client.client.request = AsyncMock(side_effect=httpx.ConnectError("reset"))
+        for _ in range(5):
+            with pytest.raises(httpx.ConnectError):
+                await client.execute(request)
+
+        key = client._rate_limit_key(request.url, client.headers)
+        assert rate_limiter.get_rate_limiter()._buckets[key].in_flight == 0
+
+    def test_key_scopes_on_query_and_api_key_credentials(self):
+        client = HTTPClient(token="", token_type="")
+        client.headers = {"Accept": "application/json"}
+        url = "https://api.trello.com/1/boards"
+
+        tenant_a = client._rate_limit_key(url, client.headers, {"key": "a", "token": "t"})
+        tenant_b = client._rate_limit_key(url, client.headers, {"key": "b", "token": "t"})
+        api_key = client._rate_limit_key(url, {"x-sn-apikey": "a"})
+
+        assert tenant_a[0] == tenant_b[0] == "api.trello.com"
+        assert len({tenant_a[1], tenant_b[1], api_key[1], "anonymous"}) == 4
+        client.rate_limit_scope = "org-1"
+        assert client._rate_limit_key(url, {"x-sn-apikey": "a"}) == ("api.trello.com", "org-1")
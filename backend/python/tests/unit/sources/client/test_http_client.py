@@ -4,11 +4,25 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.sources.client.http import connection_pool
 from app.sources.client.http.http_client import HTTPClient
 from app.sources.client.http.http_request import HTTPRequest
 from app.sources.client.http.http_response import HTTPResponse
 
 
+@pytest.fixture
+def per_instance_client(monkeypatch):
+    """Each HTTPClient builds its own httpx.AsyncClient (shared pool off)."""
+    monkeypatch.setenv(connection_pool.ENV_SHARED_POOL, "false")
+
+
+@pytest.fixture
+def shared_pools():
+    connection_pool.reset_connection_pools()
+    yield
+    connection_pool.reset_connection_pools()
+
+
 # ---------------------------------------------------------------------------
 # Constructor / defaults
 # ---------------------------------------------------------------------------
@@ -56,7 +70,7 @@ class TestGetClient:
 # ---------------------------------------------------------------------------
 class TestEnsureClient:
     @pytest.mark.asyncio
-    async def test_creates_client_on_first_call(self):
+    async def test_creates_client_on_first_call(self, per_instance_client):
         client = HTTPClient(token="t")
         assert client.client is None
         with patch("app.sources.client.http.http_client.httpx.AsyncClient") as MockAsyncClient:
@@ -79,6 +93,31 @@ class TestEnsureClient:
         result = await client._ensure_client()
         assert result is sentinel
 
+    @pytest.mark.asyncio
+    async def test_borrows_shared_client_by_host_and_credentials(self, shared_pools):
+        a = HTTPClient(token="t")
+        b = HTTPClient(token="t")
+        other_tenant = HTTPClient(token="u")
+
+        shared = await a._ensure_client("https://api.example.com/items")
+        assert await b._ensure_client("https://api.example.com/other") is shared
+        assert await other_tenant._ensure_client("https://api.example.com/items") is not shared
+        assert shared.headers.get("Authorization") is None
+
+        await a.close()
+        await b.close()
+        await other_tenant.close()
+        assert not shared.is_closed
+
+    @pytest.mark.asyncio
+    async def test_base_url_picks_pool_when_no_url_given(self, shared_pools):
+        a = HTTPClient(token="t")
+        a.base_url = "https://one.example.com/api"
+        b = HTTPClient(token="t")
+
+        assert await a._ensure_client() is not await b._ensure_client("https://two.example.com")
+        assert await HTTPClient(token="t")._ensure_client("https://one.example.com/x") is a.client
+
 
 # ---------------------------------------------------------------------------
 # execute
@@ -100,6 +139,8 @@ class TestExecute:
             "https://api.example.com/items",
             params={},
             headers={"Authorization": "Bearer mytoken"},
+            timeout=30.0,
+            follow_redirects=True,
         )
         assert isinstance(response, HTTPResponse)
 
@@ -250,7 +291,7 @@ class TestExecute:
         assert call_args[1]["timeout"] == 60
 
     @pytest.mark.asyncio
-    async def test_execute_creates_client_if_none(self):
+    async def test_execute_creates_client_if_none(self, per_instance_client):
         client = HTTPClient(token="t")
         assert client.client is None
 
@@ -289,13 +330,24 @@ class TestClose:
         await client.close()
         assert client.client is None
 
+    @pytest.mark.asyncio
+    async def test_close_returns_pooled_client_without_closing_it(self, shared_pools):
+        client = HTTPClient(token="t")
+        pooled = await client._ensure_client("https://api.example.com")
+
+        await client.close()
+
+        assert client.client is None
+        assert not pooled.is_closed
+        assert await HTTPClient(token="t")._ensure_client("https://api.example.com") is pooled
+
 
 # ---------------------------------------------------------------------------
 # Context manager
 # ---------------------------------------------------------------------------
 class TestContextManager:
     @pytest.mark.asyncio
-    async def test_aenter_returns_self(self):
+    async def test_aenter_returns_self(self, per_instance_client):
         with patch("app.sources.client.http.http_client.httpx.AsyncClient") as MockAsyncClient:
             MockAsyncClient.return_value = MagicMock()
             client = HTTPClient(token="t")
@@ -315,7 +367,7 @@ class TestContextManager:
         assert client.client is None
 
     @pytest.mark.asyncio
-    async def test_async_with_block(self):
+    async def test_async_with_block(self, per_instance_client):
         with patch("app.sources.client.http.http_client.httpx.AsyncClient") as MockAsyncClient:
             mock_httpx = AsyncMock()
             MockAsyncClient.return_value = mock_httpx
@@ -1,7 +1,9 @@
 """Unit tests for the embedding server FastAPI app."""
 
+import asyncio
 import base64
 import struct
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
@@ -12,15 +14,30 @@ from fastapi.testclient import TestClient
 from app.config.constants.ai_models import DEFAULT_EMBEDDING_MODEL
 from app.embedding_main import (
     DownloadStatus,
+    EncodeBatcher,
+    EncodePriority,
+    EncodeSlots,
     ModelManager,
     _compute_expected_total_bytes,
-    _format_embedding_vector,
+    _format_embeddings,
     _measure_blobs_dir_bytes,
     _normalize_input,
     app,
     model_manager,
     run,
 )
+from app.utils.embedding_wire_format import (
+    BINARY_CONTENT_TYPE,
+    HEADER_COUNT,
+    HEADER_DIMENSIONS,
+    HEADER_DTYPE,
+    HEADER_PROMPT_TOKENS,
+    decode_matrix,
+)
+
+
+def _matrix(*rows):
+    return np.array(rows, dtype=np.float32)
 
 
 async def _passthrough_to_thread(func, *args, **kwargs):
@@ -32,7 +49,7 @@ async def _passthrough_to_thread(func, *args, **kwargs):
 def client():
     mock_manager = MagicMock(spec=ModelManager)
     mock_manager.list_loaded_models.return_value = [DEFAULT_EMBEDDING_MODEL]
-    mock_manager.encode = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
+    mock_manager.encode = AsyncMock(return_value=_matrix([0.5, 0.25, 0.125]))
 
     mock_manager.warmup = AsyncMock()
     with patch("app.embedding_main.model_manager", mock_manager):
@@ -67,15 +84,18 @@ class TestEmbeddingServerRoutes:
         body = response.json()
         assert body["object"] == "list"
         assert len(body["data"]) == 1
-        assert body["data"][0]["embedding"] == [0.1, 0.2, 0.3]
+        assert body["data"][0]["embedding"] == [0.5, 0.25, 0.125]
         mock_manager.encode.assert_awaited_once_with(
-            DEFAULT_EMBEDDING_MODEL, ["hello"], trust_remote_code=False
+            DEFAULT_EMBEDDING_MODEL,
+            ["hello"],
+            trust_remote_code=False,
+            priority=EncodePriority.INTERACTIVE,
         )
 
     def test_create_embeddings_batch_input(self, client):
         test_client, mock_manager = client
         mock_manager.encode = AsyncMock(
-            return_value=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+            return_value=_matrix([0.5, 0.25, 0.125], [1.0, 2.0, 4.0])
         )
         response = test_client.post(
             "/v1/embeddings",
@@ -86,7 +106,10 @@ class TestEmbeddingServerRoutes:
         )
         assert response.status_code == 200
         mock_manager.encode.assert_awaited_once_with(
-            DEFAULT_EMBEDDING_MODEL, ["hello", "world"], trust_remote_code=False
+            DEFAULT_EMBEDDING_MODEL,
+            ["hello", "world"],
+            trust_remote_code=False,
+            priority=EncodePriority.BULK,
         )
 
     def test_create_embeddings_empty_input_rejected(self, client):
@@ -99,7 +122,7 @@ class TestEmbeddingServerRoutes:
 
     def test_create_embeddings_base64_format(self, client):
         test_client, mock_manager = client
-        mock_manager.encode = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
+        mock_manager.encode = AsyncMock(return_value=_matrix([0.1, 0.2, 0.3]))
         response = test_client.post(
             "/v1/embeddings",
             json={
@@ -116,6 +139,42 @@ class TestEmbeddingServerRoutes:
         assert body["data"][0]["embedding"] == expected
         assert isinstance(body["data"][0]["embedding"], str)
 
+    @pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+    def test_create_embeddings_binary_format(self, client, dtype):
+        test_client, mock_manager = client
+        vectors = _matrix([0.5, -0.25, 0.125], [1.0, 0.0, -1.0])
+        mock_manager.encode = AsyncMock(return_value=vectors)
+        response = test_client.post(
+            "/v1/embeddings",
+            json={
+                "model": DEFAULT_EMBEDDING_MODEL,
+                "input": ["hello", "world"],
+                "encoding_format": dtype,
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == BINARY_CONTENT_TYPE
+        assert response.headers[HEADER_COUNT] == "2"
+        assert response.headers[HEADER_DIMENSIONS] == "3"
+        assert response.headers[HEADER_DTYPE] == dtype
+        assert int(response.headers[HEADER_PROMPT_TOKENS]) > 0
+        decoded = decode_matrix(response.content, 2, 3, dtype)
+        np.testing.assert_allclose(decoded, vectors, atol=1e-2)
+
+    def test_create_embeddings_float32_binary_is_raw_buffer(self, client):
+        test_client, mock_manager = client
+        vectors = _matrix([0.1, 0.2, 0.3])
+        mock_manager.encode = AsyncMock(return_value=vectors)
+        response = test_client.post(
+            "/v1/embeddings",
+            json={
+                "model": DEFAULT_EMBEDDING_MODEL,
+                "input": "hello",
+                "encoding_format": "float32",
+            },
+        )
+        assert response.content == struct.pack("<3f", 0.1, 0.2, 0.3)
+
     def test_create_embeddings_passes_trust_remote_code(self, client):
         test_client, mock_manager = client
         with patch("app.embedding_main.ALLOW_REMOTE_CODE", True):
@@ -132,8 +191,36 @@ class TestEmbeddingServerRoutes:
             "nomic-ai/nomic-embed-text-v2-moe",
             ["hello"],
             trust_remote_code=True,
+            priority=EncodePriority.INTERACTIVE,
         )
 
+    def test_create_embeddings_explicit_priority(self, client):
+        test_client, mock_manager = client
+        mock_manager.encode = AsyncMock(return_value=_matrix([0.1, 0.2, 0.3]))
+        response = test_client.post(
+            "/v1/embeddings",
+            json={
+                "model": DEFAULT_EMBEDDING_MODEL,
+                "input": ["chunk"],
+                "priority": "bulk",
+            },
+        )
+        assert response.status_code == 200
+        assert mock_manager.encode.await_args.kwargs["priority"] is EncodePriority.BULK
+
+    def test_create_embeddings_invalid_priority_rejected(self, client):
+        test_client, mock_manager = client
+        response = test_client.post(
+            "/v1/embeddings",
+            json={
+                "model": DEFAULT_EMBEDDING_MODEL,
+                "input": "hello",
+                "priority": "urgent",
+            },
+        )
+        assert response.status_code == 400
+        mock_manager.encode.assert_not_awaited()
+
 
 class TestEmbeddingServerSecurityPolicy:
     def test_trust_remote_code_rejected_by_default(self, client):
@@ -218,17 +305,25 @@ class TestEmbeddingHelpers:
             _normalize_input([])
         assert exc_info.value.status_code == 400
 
-    def test_format_embedding_vector_float(self):
-        assert _format_embedding_vector([0.1, 0.2], "float") == [0.1, 0.2]
+    def test_format_embeddings_float(self):
+        assert _format_embeddings(_matrix([0.5, 0.25]), "float") == [[0.5, 0.25]]
 
-    def test_format_embedding_vector_base64(self):
-        vector = [0.1, 0.2, 0.3]
-        expected = base64.b64encode(struct.pack("<3f", *vector)).decode("ascii")
-        assert _format_embedding_vector(vector, "base64") == expected
+    def test_format_embeddings_base64(self):
+        vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        expected = [
+            base64.b64encode(struct.pack("<3f", *vector)).decode("ascii")
+            for vector in vectors
+        ]
+        assert _format_embeddings(_matrix(*vectors), "base64") == expected
+
+    def test_format_embeddings_base64_from_non_float32_input(self):
+        vectors = np.array([[0.1, 0.2]], dtype=np.float64)
+        expected = base64.b64encode(struct.pack("<2f", 0.1, 0.2)).decode("ascii")
+        assert _format_embeddings(vectors, "base64") == [expected]
 
-    def test_format_embedding_vector_unsupported_raises(self):
+    def test_format_embeddings_unsupported_raises(self):
         with pytest.raises(HTTPException) as exc_info:
-            _format_embedding_vector([0.1], "json")
+            _format_embeddings(_matrix([0.1]), "json")
         assert exc_info.value.status_code == 400
         assert "Unsupported encoding_format" in exc_info.value.detail
 
@@ -265,6 +360,21 @@ class TestModelManager:
         assert result is cached
         mock_st.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_reloaded_model_retires_old_batcher(self):
+        manager = ModelManager()
+        key = "m::trust_remote_code=False"
+        manager._models[key] = MagicMock(encode=lambda batch, **_: np.ones((len(batch), 2)))
+        await manager.encode("m", ["a"])
+        old_worker = manager._batchers[key][1]._worker
+
+        manager._models[key] = MagicMock(encode=lambda batch, **_: np.zeros((len(batch), 2)))
+        result = await manager.encode("m", ["a"])
+        await asyncio.sleep(0)
+
+        assert result.tolist() == [[0.0, 0.0]]
+        assert old_worker.done()
+
     @pytest.mark.asyncio
     async def test_get_model_loads_from_local_cache(self):
         manager = ModelManager(device="cpu")
@@ -353,7 +463,7 @@ class TestModelManager:
         mock_get.assert_awaited_once_with("warm-model")
 
     @pytest.mark.asyncio
-    async def test_encode_returns_tolist_from_model(self):
+    async def test_encode_returns_float32_matrix_from_model(self):
         manager = ModelManager(normalize_embeddings=True, max_concurrency=2)
         mock_model = MagicMock()
         mock_model.encode.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
@@ -369,13 +479,240 @@ class TestModelManager:
                     "encode-model", ["hello", "world"], trust_remote_code=True
                 )
 
-        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        assert result.dtype == np.float32
+        assert result.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(result, [[0.1, 0.2], [0.3, 0.4]], rtol=1e-6)
         mock_model.encode.assert_called_once_with(
             ["hello", "world"],
             normalize_embeddings=True,
             convert_to_numpy=True,
         )
 
+    @pytest.mark.asyncio
+    async def test_reloaded_model_gets_its_own_batcher(self):
+        manager = ModelManager(max_concurrency=1)
+        old_model, new_model = MagicMock(), MagicMock()
+        old_model.encode.return_value = np.array([[1.0]])
+        new_model.encode.return_value = np.array([[2.0]])
+
+        with patch.object(
+            manager, "get_model", new_callable=AsyncMock, side_effect=[old_model, new_model]
+        ), patch(
+            "app.embedding_main.asyncio.to_thread", side_effect=_passthrough_to_thread
+        ):
+            first = await manager.encode("swap-model", ["x"])
+            second = await manager.encode("swap-model", ["x"])
+
+        assert first.tolist() == [[1.0]]
+        assert second.tolist() == [[2.0]]
+        new_model.encode.assert_called_once()
+
+
+def _recording_encoder(started=None, release=None):
+    """Encoder that records each batch and returns one row per text.
+
+    Row ``i`` is ``[len(text), ord(text[0])]`` so scatter order is checkable.
+    When ``release`` is given, the encoder blocks on it (it runs in a thread).
+    """
+    calls: list[list[str]] = []
+
+    def encode(batch):
+        calls.append(list(batch))
+        if started is not None:
+            started.set()
+        if release is not None:
+            release.wait(5)
+        return np.array([[float(len(t)), float(ord(t[0]))] for t in batch])
+
+    return encode, calls
+
+
+class TestEncodeBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self):
+        encode, calls = _recording_encoder()
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0.05, max_texts=64)
+
+        first, second = await asyncio.gather(
+            batcher.submit(["aaa", "b"], EncodePriority.BULK),
+            batcher.submit(["cc"], EncodePriority.BULK),
+        )
+
+        assert len(calls) == 1
+        assert calls[0] == ["b", "cc", "aaa"]  # sorted by length
+        assert first.tolist() == [[3.0, 97.0], [1.0, 98.0]]
+        assert second.tolist() == [[2.0, 99.0]]
+
+    @pytest.mark.asyncio
+    async def test_max_texts_splits_batches(self):
+        encode, calls = _recording_encoder()
+        batcher = EncodeBatcher(encode, max_concurrency=2, max_wait=0.05, max_texts=2)
+
+        results = await asyncio.gather(
+            *(batcher.submit([t], EncodePriority.BULK) for t in ["a", "b", "c"])
+        )
+
+        assert sorted(len(c) for c in calls) == [1, 2]
+        assert [r.tolist()[0][1] for r in results] == [97.0, 98.0, 99.0]
+
+    @pytest.mark.asyncio
+    async def test_interactive_taken_before_bulk(self):
+        started, release = threading.Event(), threading.Event()
+        encode, calls = _recording_encoder(started, release)
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0, max_texts=1)
+
+        blocker = asyncio.create_task(batcher.submit(["x"], EncodePriority.BULK))
+        await asyncio.to_thread(started.wait, 5)
+        bulk = asyncio.create_task(batcher.submit(["bulk"], EncodePriority.BULK))
+        await asyncio.sleep(0)
+        query = asyncio.create_task(batcher.submit(["query"], EncodePriority.INTERACTIVE))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, bulk, query)
+
+        assert calls == [["x"], ["query"], ["bulk"]]
+
+    @pytest.mark.asyncio
+    async def test_last_slot_reserved_for_interactive(self):
+        started, release = threading.Event(), threading.Event()
+        encode, calls = _recording_encoder(started, release)
+        batcher = EncodeBatcher(encode, max_concurrency=2, max_wait=0, max_texts=1)
+
+        bulk = [
+            asyncio.create_task(batcher.submit([t], EncodePriority.BULK))
+            for t in ["b1", "b2"]
+        ]
+        await asyncio.to_thread(started.wait, 5)
+        query = asyncio.create_task(batcher.submit(["q"], EncodePriority.INTERACTIVE))
+        for _ in range(50):
+            if len(calls) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        # One bulk batch is running; the second slot went to the query.
+        assert calls == [["b1"], ["q"]]
+        release.set()
+        await asyncio.gather(query, *bulk)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_one_is_never_exceeded(self):
+        started, release = threading.Event(), threading.Event()
+        encode, calls = _recording_encoder(started, release)
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0, max_texts=1)
+
+        bulk = [
+            asyncio.create_task(batcher.submit([t], EncodePriority.BULK))
+            for t in ["b1", "b2"]
+        ]
+        await asyncio.to_thread(started.wait, 5)
+        query = asyncio.create_task(batcher.submit(["q"], EncodePriority.INTERACTIVE))
+        await asyncio.sleep(0.05)
+
+        # The single slot is busy, so the query waits but jumps the bulk queue.
+        assert calls == [["b1"]]
+        release.set()
+        await asyncio.gather(query, *bulk)
+        assert calls == [["b1"], ["q"], ["b2"]]
+
+    @pytest.mark.asyncio
+    async def test_shared_slots_cap_passes_across_models(self):
+        started, release = threading.Event(), threading.Event()
+        encode_a, calls_a = _recording_encoder(started, release)
+        encode_b, calls_b = _recording_encoder()
+        slots = EncodeSlots(2)
+        model_a = EncodeBatcher(encode_a, max_concurrency=2, max_wait=0, max_texts=1, slots=slots)
+        model_b = EncodeBatcher(encode_b, max_concurrency=2, max_wait=0, max_texts=1, slots=slots)
+
+        bulk_a = asyncio.create_task(model_a.submit(["a"], EncodePriority.BULK))
+        await asyncio.to_thread(started.wait, 5)
+        bulk_b = asyncio.create_task(model_b.submit(["b"], EncodePriority.BULK))
+        query_b = asyncio.create_task(model_b.submit(["q"], EncodePriority.INTERACTIVE))
+        await asyncio.sleep(0.05)
+
+        # Model A's bulk pass holds the only bulk slot process-wide; model B's
+        # query still gets the reserved one.
+        assert calls_b == [["q"]]
+        assert not bulk_b.done()
+        release.set()
+        await asyncio.gather(bulk_a, bulk_b, query_b)
+        assert calls_a == [["a"]]
+        assert calls_b == [["q"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_interactive_batch_does_not_carry_bulk(self):
+        encode, calls = _recording_encoder()
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0.05, max_texts=64)
+
+        await asyncio.gather(
+            batcher.submit(["bulk-1", "bulk-2"], EncodePriority.BULK),
+            batcher.submit(["q"], EncodePriority.INTERACTIVE),
+        )
+
+        assert calls == [["q"], ["bulk-1", "bulk-2"]]
+
+    @pytest.mark.asyncio
+    async def test_close_stops_idle_worker(self):
+        encode, _ = _recording_encoder()
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0, max_texts=8)
+        await batcher.submit(["a"], EncodePriority.BULK)
+        worker = batcher._worker
+
+        batcher.close()
+        await asyncio.sleep(0)
+
+        assert worker.done()
+
+    @pytest.mark.asyncio
+    async def test_close_serves_queued_requests_first(self):
+        started, release = threading.Event(), threading.Event()
+        encode, calls = _recording_encoder(started, release)
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0, max_texts=1)
+
+        first = asyncio.create_task(batcher.submit(["a"], EncodePriority.BULK))
+        await asyncio.to_thread(started.wait, 5)
+        second = asyncio.create_task(batcher.submit(["b"], EncodePriority.BULK))
+        await asyncio.sleep(0)
+        batcher.close()
+        release.set()
+        await asyncio.gather(first, second)
+        await asyncio.wait_for(batcher._worker, 1)
+
+        assert calls == [["a"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_encoded_in_length_buckets(self):
+        encode, calls = _recording_encoder()
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0.05, max_texts=64)
+        long_text = "z" * 500
+
+        short, mixed = await asyncio.gather(
+            batcher.submit(["a", "bb"], EncodePriority.BULK),
+            batcher.submit([long_text, "c"], EncodePriority.BULK),
+        )
+
+        assert calls == [["a", "c", "bb"], [long_text]]
+        assert short.tolist() == [[1.0, 97.0], [2.0, 98.0]]
+        assert mixed.tolist() == [[500.0, 122.0], [1.0, 99.0]]
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_every_caller_in_batch(self):
+        def encode(batch):
+            raise RuntimeError("CUDA out of memory")
+
+        batcher = EncodeBatcher(encode, max_concurrency=1, max_wait=0.05, max_texts=64)
+        results = await asyncio.gather(
+            batcher.submit(["a"], EncodePriority.BULK),
+            batcher.submit(["b"], EncodePriority.INTERACTIVE),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        # The batcher keeps serving after a failed batch.
+        batcher._encode_batch = _recording_encoder()[0]
+        result = await batcher.submit(["ok"], EncodePriority.BULK)
+        assert result.tolist() == [[2.0, 111.0]]
+
 
 class TestEmbeddingServerEdgeCases:
     def test_health_starting_when_default_model_not_loaded(self):
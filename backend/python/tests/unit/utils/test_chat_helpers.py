@@ -2233,6 +2233,35 @@ class TestGetRecord:
         assert "vr-1" in vr_map
         assert vr_map["vr-1"] is not None
 
+    @pytest.mark.asyncio
+    async def test_block_framed_record_reads_only_selected_blocks(self):
+        blob_store = AsyncMock()
+        blob_store.get_record_blocks_from_storage = AsyncMock(return_value=_make_record_blob())
+        lookup = {"record_doc_id": "doc-1", "storageFormat": "blocks-v1"}
+        vr_map = {}
+
+        await get_record(
+            "vr-1", vr_map, blob_store, "org-1",
+            lookup_result=lookup, block_selection=({3}, {1}),
+        )
+
+        blob_store.get_record_blocks_from_storage.assert_awaited_once_with(
+            "vr-1", "org-1", {3}, {1}, lookup_result=lookup
+        )
+        blob_store.get_record_from_storage.assert_not_awaited()
+        assert vr_map["vr-1"] is not None
+
+    @pytest.mark.asyncio
+    async def test_legacy_record_ignores_block_selection(self):
+        blob_store = AsyncMock()
+        blob_store.get_record_from_storage = AsyncMock(return_value=_make_record_blob())
+        lookup = {"record_doc_id": "doc-1", "storageFormat": "record-v1"}
+
+        await get_record("vr-1", {}, blob_store, "org-1", lookup_result=lookup, block_selection=({3}, set()))
+
+        blob_store.get_record_from_storage.assert_awaited_once()
+        blob_store.get_record_blocks_from_storage.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_record_not_found_sets_none(self):
         blob_store = AsyncMock()
@@ -0,0 +1,83 @@
+"""Tests for app.utils.docling_wire_format."""
+
+import base64
+import json
+
+import pytest
+
+from app.utils.docling_wire_format import (
+    binary_transfer_enabled,
+    decode_document,
+    encode_document,
+)
+
+
+def _png_uri(seed: int, size: int = 4096) -> str:
+    raw = bytes((seed + i) % 251 for i in range(size))
+    return "data:image/png;base64," + base64.b64encode(raw).decode()
+
+
+def _document(pictures: int = 3) -> dict:
+    return {
+        "schema_name": "DoclingDocument",
+        "name": "report",
+        "origin": {"mimetype": "application/pdf", "uri": "file:///tmp/report.pdf"},
+        "texts": [
+            {"self_ref": f"#/texts/{i}", "text": f"paragraph {i}", "prov": [{"page_no": 1 + i // 5}]}
+            for i in range(20)
+        ],
+        "pictures": [
+            {"self_ref": f"#/pictures/{i}", "image": {"mimetype": "image/png", "dpi": 72, "uri": _png_uri(i)}}
+            for i in range(pictures)
+        ],
+        "pages": {"1": {"page_no": 1, "size": {"width": 612.0, "height": 792.0}, "image": None}},
+    }
+
+
+class TestRoundTrip:
+    def test_document_and_meta_survive(self):
+        meta = {"provider_used": "docling", "metadata": {"record_name": "report.pdf"}}
+
+        document, decoded_meta = decode_document(encode_document(_document(), meta))
+
+        assert document == _document()
+        assert decoded_meta == meta
+
+    def test_json_text_is_accepted(self):
+        document, meta = decode_document(encode_document(json.dumps(_document())))
+
+        assert document == _document()
+        assert meta == {}
+
+    def test_bitmaps_travel_as_raw_parts(self):
+        text = json.dumps(_document(pictures=10)).encode()
+
+        body = encode_document(json.loads(text))
+
+        # base64 inflates by 4/3; the raw parts alone undercut the JSON.
+        assert len(body) < len(text) * 0.8
+        assert _png_uri(0).split(",")[1][:64].encode() not in body
+
+    def test_non_data_uris_are_left_alone(self):
+        document, _ = decode_document(encode_document(_document(pictures=0)))
+
+        assert document["origin"]["uri"] == "file:///tmp/report.pdf"
+
+
+class TestMalformed:
+    def test_wrong_magic(self):
+        with pytest.raises(ValueError, match="Not a binary"):
+            decode_document(b'{"success": true}')
+
+    def test_truncated_parts(self):
+        body = encode_document(_document())
+
+        with pytest.raises(ValueError, match="expected"):
+            decode_document(body[:-10])
+
+
+def test_binary_transfer_is_opt_in(monkeypatch):
+    monkeypatch.delenv("DOCLING_BINARY_TRANSFER", raising=False)
+    assert binary_transfer_enabled() is False
+    monkeypatch.setenv("DOCLING_BINARY_TRANSFER", "true")
+    assert binary_transfer_enabled() is True
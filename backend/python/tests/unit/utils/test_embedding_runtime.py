@@ -0,0 +1,182 @@
+"""Tests for app.utils.embedding_runtime — the shared embedding model runtimes."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.utils import embedding_runtime as er
+
+
+def _config(model="text-embedding-3-small", api_key="k1", **extra):
+    return {
+        "provider": "openai",
+        "isDefault": True,
+        "configuration": {"model": model, "apiKey": api_key},
+        **extra,
+    }
+
+
+def _model(dim=4):
+    model = MagicMock()
+    model.model_name = "m"
+    model.aembed_query = AsyncMock(return_value=[0.0] * dim)
+    model.aembed_documents = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+    return model
+
+
+class TestConfigHash:
+    def test_default_when_no_config(self):
+        assert er.embedding_config_hash(er.select_embedding_config([])) == "default"
+
+    def test_key_rotation_changes_the_hash(self):
+        assert er.embedding_config_hash(_config(api_key="k1")) != er.embedding_config_hash(
+            _config(api_key="k2")
+        )
+
+    def test_selects_the_default_config(self):
+        configs = [_config(model="a", isDefault=False), _config(model="b")]
+        assert er.select_embedding_config(configs)["configuration"]["model"] == "b"
+
+
+class TestGetEmbeddingRuntime:
+    @pytest.mark.asyncio
+    async def test_reuses_runtime_while_config_is_unchanged(self):
+        with patch.object(er, "get_embedding_model", return_value=_model()) as build:
+            first = await er.get_embedding_runtime([_config()])
+            second = await er.get_embedding_runtime([_config()])
+
+        assert first is second
+        assert build.call_count == 1
+        assert er.current_embedding_runtime() is first
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_callers_build_once(self):
+        with patch.object(er, "get_embedding_model", return_value=_model()) as build:
+            runtimes = await asyncio.gather(
+                *(er.get_embedding_runtime([_config()]) for _ in range(5))
+            )
+
+        assert build.call_count == 1
+        assert len({id(r) for r in runtimes}) == 1
+
+    @pytest.mark.asyncio
+    async def test_config_change_swaps_and_old_runtime_keeps_working(self):
+        model_a, model_b = _model(), _model()
+        with patch.object(er, "get_embedding_model", side_effect=[model_a, model_b]):
+            old = await er.get_embedding_runtime([_config(model="a")])
+            new = await er.get_embedding_runtime([_config(model="b")])
+
+        assert new.embeddings is model_b
+        assert er.current_embedding_runtime() is new
+        assert await old.aembed_query("q") == [0.0] * 4
+
+    @pytest.mark.asyncio
+    async def test_config_change_closes_the_replaced_runtime(self):
+        model_a, model_b = _model(), _model()
+        sdk_client = MagicMock(spec=["close"])
+        sdk_client.close = AsyncMock()
+        model_a.async_client = MagicMock(_client=sdk_client)
+        with patch.object(er, "get_embedding_model", side_effect=[model_a, model_b]):
+            await er.get_embedding_runtime([_config(model="a")])
+            await er.get_embedding_runtime([_config(model="b")])
+        await asyncio.gather(*er._retiring)
+
+        sdk_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_default_model_without_config(self):
+        with patch.object(er, "get_default_embedding_model", return_value=_model()) as build:
+            runtime = await er.get_embedding_runtime(None)
+
+        build.assert_called_once()
+        assert runtime.provider is None
+        assert runtime.is_multimodal is False
+
+    @pytest.mark.asyncio
+    async def test_unsupported_provider_raises(self):
+        with patch.object(er, "get_embedding_model", return_value=None):
+            with pytest.raises(ValueError):
+                await er.get_embedding_runtime([_config()])
+
+    @pytest.mark.parametrize("provider", ["sentenceTransformers", "huggingFace"])
+    def test_local_providers_do_not_load_a_model_per_loop(self, provider):
+        # Per-loop runtimes are only cheap because local models live in the
+        # embedding server; the runtime just holds a client to it.
+        from app.utils.embedding_server_client import EmbeddingServerEmbeddings
+
+        config = {"provider": provider, "configuration": {"model": "BAAI/bge-small-en-v1.5"}}
+        assert isinstance(er.get_embedding_model(provider, config), EmbeddingServerEmbeddings)
+
+
+class TestEmbeddingRuntime:
+    @pytest.mark.asyncio
+    async def test_large_inputs_are_split_and_reassembled_in_order(self):
+        model = _model()
+        runtime = er.EmbeddingRuntime(model, batch_size=2)
+
+        vectors = await runtime.aembed_documents(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert [len(c.args[0]) for c in model.aembed_documents.call_args_list] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_calls_are_capped(self):
+        in_flight = peak = 0
+
+        async def embed(text):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [0.0]
+
+        model = _model()
+        model.aembed_query = AsyncMock(side_effect=embed)
+        runtime = er.EmbeddingRuntime(model, max_concurrency=2)
+
+        await asyncio.gather(*(runtime.aembed_query(str(i)) for i in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_dimension_is_probed_once(self):
+        model = _model(dim=8)
+        runtime = er.EmbeddingRuntime(model)
+
+        assert await runtime.dimension() == 8
+        assert await runtime.dimension() == 8
+        model.aembed_query.assert_awaited_once()
+
+    def test_unknown_attributes_fall_through_to_the_model(self):
+        runtime = er.EmbeddingRuntime(_model(), config=_config(isMultimodal=True))
+
+        assert runtime.model_name == "m"
+        assert runtime.provider == "openai"
+        assert runtime.is_multimodal is True
+
+    @pytest.mark.asyncio
+    async def test_aclose_waits_for_calls_in_flight(self):
+        release = asyncio.Event()
+        events = []
+
+        async def embed(text):
+            await release.wait()
+            events.append("embedded")
+            return [0.0]
+
+        model = _model()
+        model.aembed_query = AsyncMock(side_effect=embed)
+        model.client = MagicMock(spec=["close"])
+        model.client.close.side_effect = lambda: events.append("closed")
+        runtime = er.EmbeddingRuntime(model, max_concurrency=2)
+
+        call = asyncio.create_task(runtime.aembed_query("q"))
+        await asyncio.sleep(0)
+        closing = asyncio.create_task(runtime.aclose())
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(call, closing)
+
+        assert events == ["embedded", "closed"]
@@ -1,7 +1,10 @@
 """Unit tests for embedding server HTTP client retries."""
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import numpy as np
 import openai
 import pytest
 
@@ -12,16 +15,26 @@ from app.config.constants.ai_models import (
     EMBEDDING_SERVER_REQUEST_TIMEOUT_SECONDS,
 )
 from app.services.messaging.backpressure import BackpressureCoordinator
+from app.utils import embedding_server_client
 from app.utils.embedding_server_client import (
     EmbeddingServerEmbeddings,
     _embedding_server_base_url,
+    _embedding_server_binary_dtype,
     _embedding_server_max_retries,
     _embedding_server_timeout,
     _is_retriable_embedding_error,
     _retry_delay_seconds,
     _signal_backpressure_if_rate_limited,
+    close_shared_clients,
     get_embedding_server_embeddings,
 )
+from app.utils.embedding_wire_format import (
+    BINARY_CONTENT_TYPE,
+    HEADER_COUNT,
+    HEADER_DIMENSIONS,
+    HEADER_DTYPE,
+    encode_matrix,
+)
 
 
 def _rate_limit_error(retry_after: str | None) -> openai.RateLimitError:
@@ -463,7 +476,9 @@ class TestEmbeddingServerEmbeddings:
         result = client.embed_documents(["hello", "world"])
 
         assert result == [[0.1, 0.2], [0.3, 0.4]]
-        mock_inner.embed_documents.assert_called_once_with(["hello", "world"])
+        mock_inner.embed_documents.assert_called_once_with(
+            ["hello", "world"], extra_body={"priority": "bulk"}
+        )
 
     @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
     def test_embed_query_delegates_to_inner(self, mock_openai_cls):
@@ -475,7 +490,9 @@ class TestEmbeddingServerEmbeddings:
         result = client.embed_query("query text")
 
         assert result == [0.5, 0.6]
-        mock_inner.embed_query.assert_called_once_with("query text")
+        mock_inner.embed_query.assert_called_once_with(
+            "query text", extra_body={"priority": "interactive"}
+        )
 
     @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
     @pytest.mark.asyncio
@@ -488,7 +505,9 @@ class TestEmbeddingServerEmbeddings:
         result = await client.aembed_documents(["async", "docs"])
 
         assert result == [[0.7], [0.8]]
-        mock_inner.aembed_documents.assert_awaited_once_with(["async", "docs"])
+        mock_inner.aembed_documents.assert_awaited_once_with(
+            ["async", "docs"], extra_body={"priority": "bulk"}
+        )
 
     @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
     @pytest.mark.asyncio
@@ -501,7 +520,182 @@ class TestEmbeddingServerEmbeddings:
         result = await client.aembed_query("async query")
 
         assert result == [0.9, 1.0]
-        mock_inner.aembed_query.assert_awaited_once_with("async query")
+        mock_inner.aembed_query.assert_awaited_once_with(
+            "async query", extra_body={"priority": "interactive"}
+        )
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    def test_priority_hint_keeps_trust_remote_code(self, mock_openai_cls):
+        mock_inner = MagicMock()
+        mock_inner.embed_query.return_value = [0.5]
+        mock_openai_cls.return_value = mock_inner
+
+        client = EmbeddingServerEmbeddings(max_retries=1, trust_remote_code=True)
+        client.embed_query("query text")
+
+        mock_inner.embed_query.assert_called_once_with(
+            "query text",
+            extra_body={"priority": "interactive", "trust_remote_code": True},
+        )
+
+
+def _binary_handler(requests: list[dict], status_code: int = 200):
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        if status_code != 200:
+            return httpx.Response(status_code, headers={"Retry-After": "3"})
+        dtype = payload["encoding_format"]
+        matrix = np.array(
+            [[float(len(t)), 0.5, -0.25] for t in payload["input"]], dtype=np.float32
+        )
+        return httpx.Response(
+            200,
+            content=encode_matrix(matrix, dtype),
+            headers={
+                "content-type": BINARY_CONTENT_TYPE,
+                HEADER_COUNT: str(matrix.shape[0]),
+                HEADER_DIMENSIONS: str(matrix.shape[1]),
+                HEADER_DTYPE: dtype,
+            },
+        )
+
+    return handler
+
+
+@pytest.fixture
+def shared_http(monkeypatch):
+    """Route the shared binary-path clients through a MockTransport."""
+    state = {"transport": None}
+    real_client, real_async_client = httpx.Client, httpx.AsyncClient
+
+    def use(handler):
+        state["transport"] = httpx.MockTransport(handler)
+
+    monkeypatch.setattr(embedding_server_client, "_shared_sync_client", {})
+    monkeypatch.setattr(embedding_server_client, "_shared_async_clients", {})
+    monkeypatch.setattr(
+        embedding_server_client.httpx,
+        "Client",
+        lambda: real_client(transport=state["transport"]),
+    )
+    monkeypatch.setattr(
+        embedding_server_client.httpx,
+        "AsyncClient",
+        lambda: real_async_client(transport=state["transport"]),
+    )
+    return use
+
+
+def _binary_client(mock_openai_cls, chunk_size=1000, **kwargs):
+    mock_openai_cls.return_value.chunk_size = chunk_size
+    return EmbeddingServerEmbeddings(max_retries=1, **kwargs)
+
+
+class TestEmbeddingServerBinaryWireFormat:
+    def test_binary_dtype_env_default_is_json(self, monkeypatch):
+        monkeypatch.delenv("EMBEDDING_SERVER_BINARY_DTYPE", raising=False)
+        assert _embedding_server_binary_dtype() is None
+
+    def test_binary_dtype_from_env(self, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_SERVER_BINARY_DTYPE", " Float16 ")
+        assert _embedding_server_binary_dtype() == "float16"
+
+    def test_binary_dtype_invalid_env_falls_back_to_json(self, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_SERVER_BINARY_DTYPE", "bfloat16")
+        assert _embedding_server_binary_dtype() is None
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    def test_invalid_explicit_dtype_rejected(self, mock_openai_cls):
+        with pytest.raises(ValueError):
+            EmbeddingServerEmbeddings(binary_dtype="float64")
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    @pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+    def test_embed_documents_decodes_binary_body(self, mock_openai_cls, dtype, shared_http):
+        requests: list[dict] = []
+        shared_http(_binary_handler(requests))
+        client = _binary_client(mock_openai_cls, binary_dtype=dtype)
+
+        result = client.embed_documents(["ab", "abcd"])
+
+        np.testing.assert_allclose(result, [[2.0, 0.5, -0.25], [4.0, 0.5, -0.25]], rtol=1e-2)
+        assert requests == [{
+            "model": DEFAULT_EMBEDDING_MODEL,
+            "input": ["ab", "abcd"],
+            "encoding_format": dtype,
+            "priority": "bulk",
+        }]
+        mock_openai_cls.return_value.embed_documents.assert_not_called()
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    @pytest.mark.asyncio
+    async def test_aembed_query_uses_binary_body(self, mock_openai_cls, shared_http):
+        requests: list[dict] = []
+        shared_http(_binary_handler(requests))
+        client = _binary_client(mock_openai_cls, binary_dtype="float32")
+
+        result = await client.aembed_query("abc")
+
+        assert result == [3.0, 0.5, -0.25]
+        assert requests[0]["priority"] == "interactive"
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    @pytest.mark.asyncio
+    async def test_binary_inputs_are_chunked_like_openai(self, mock_openai_cls, shared_http):
+        requests: list[dict] = []
+        shared_http(_binary_handler(requests))
+        client = _binary_client(mock_openai_cls, chunk_size=2, binary_dtype="float32")
+
+        result = await client.aembed_documents(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert [r["input"] for r in requests] == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+        assert [row[0] for row in result] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    @pytest.mark.asyncio
+    async def test_clients_are_shared_and_closed_on_shutdown(self, mock_openai_cls, shared_http):
+        shared_http(_binary_handler([]))
+        first = _binary_client(mock_openai_cls, binary_dtype="float32")
+        second = _binary_client(mock_openai_cls, binary_dtype="float32")
+
+        await first.aembed_query("a")
+        await second.aembed_query("b")
+        second.embed_query("c")
+
+        async_clients = list(embedding_server_client._shared_async_clients.values())
+        sync_client = embedding_server_client._shared_sync_client["client"]
+        assert len(async_clients) == 1
+
+        await close_shared_clients()
+
+        assert async_clients[0].is_closed
+        assert sync_client.is_closed
+        assert embedding_server_client._shared_sync_client == {}
+        assert embedding_server_client._shared_async_clients == {}
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    def test_empty_batch_skips_request(self, mock_openai_cls, shared_http):
+        client = _binary_client(mock_openai_cls, binary_dtype="float32")
+        assert client.embed_documents([]) == []
+        assert embedding_server_client._shared_sync_client == {}
+
+    @patch("app.utils.embedding_server_client.OpenAIEmbeddings")
+    def test_binary_429_is_retried_and_signals_backpressure(self, mock_openai_cls, shared_http):
+        coordinator = BackpressureCoordinator()
+        shared_http(_binary_handler([], status_code=429))
+        client = _binary_client(
+            mock_openai_cls, binary_dtype="float32", backpressure_coordinator=coordinator
+        )
+
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            client.embed_documents(["a"])
+
+        assert _is_retriable_embedding_error(exc_info.value)
+        assert coordinator.paused_services == frozenset({"EmbeddingServer"})
+
+    def test_binary_transport_error_is_retriable(self):
+        assert _is_retriable_embedding_error(httpx.ConnectError("refused"))
 
 
 class TestGetEmbeddingServerEmbeddings:
@@ -0,0 +1,54 @@
+"""Unit tests for the embedding server binary wire format."""
+
+import struct
+
+import numpy as np
+import pytest
+
+from app.utils.embedding_wire_format import decode_matrix, encode_matrix
+
+
+def _matrix() -> np.ndarray:
+    return np.array([[0.5, -0.25, 0.125], [1.0, 0.0, -1.0]], dtype=np.float32)
+
+
+class TestEncodeMatrix:
+    def test_float32_is_little_endian_row_major(self):
+        body = encode_matrix(_matrix(), "float32")
+        assert body == struct.pack("<6f", 0.5, -0.25, 0.125, 1.0, 0.0, -1.0)
+
+    def test_float16_halves_payload(self):
+        assert len(encode_matrix(_matrix(), "float16")) == 6 * 2
+
+    def test_int8_prefixes_per_row_scales(self):
+        body = encode_matrix(_matrix(), "int8")
+        assert len(body) == 2 * 4 + 6
+        scales = struct.unpack("<2f", body[:8])
+        assert scales == pytest.approx((0.5 / 127, 1.0 / 127))
+
+    def test_int8_zero_row_does_not_divide_by_zero(self):
+        body = encode_matrix(np.zeros((1, 4), dtype=np.float32), "int8")
+        np.testing.assert_array_equal(decode_matrix(body, 1, 4, "int8"), np.zeros((1, 4)))
+
+    def test_unsupported_dtype_raises(self):
+        with pytest.raises(ValueError):
+            encode_matrix(_matrix(), "float64")
+
+
+class TestDecodeMatrix:
+    @pytest.mark.parametrize(
+        ("dtype", "atol"), [("float32", 0.0), ("float16", 1e-3), ("int8", 1e-2)]
+    )
+    def test_round_trip(self, dtype, atol):
+        decoded = decode_matrix(encode_matrix(_matrix(), dtype), 2, 3, dtype)
+        assert decoded.dtype == np.float32
+        np.testing.assert_allclose(decoded, _matrix(), atol=atol)
+
+    def test_truncated_body_raises(self):
+        body = encode_matrix(_matrix(), "float32")
+        with pytest.raises(ValueError, match="expected 24"):
+            decode_matrix(body[:-4], 2, 3, "float32")
+
+    def test_unsupported_dtype_raises(self):
+        with pytest.raises(ValueError):
+            decode_matrix(b"", 0, 0, "bfloat16")
@@ -255,6 +255,41 @@ class TestFetchMultipleRecordsImpl:
         assert result["ok"] is True
         assert len(result["records"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_partial_record_is_completed_before_returning(self):
+        from app.utils.fetch_full_record import _fetch_multiple_records_impl
+
+        partial = {"id": "r1", "partial_blocks": {"documentId": "doc-1"}}
+
+        async def complete(record, org_id):
+            record.pop("partial_blocks")
+            record["block_containers"] = {"blocks": [{"index": 0}], "block_groups": []}
+            return record
+
+        blob_store = MagicMock()
+        blob_store.complete_partial_record = AsyncMock(side_effect=complete)
+
+        result = await _fetch_multiple_records_impl(
+            ["r1"], {"vr1": partial}, blob_store=blob_store, org_id="org-1",
+        )
+
+        blob_store.complete_partial_record.assert_awaited_once_with(partial, "org-1")
+        assert result["ok"] is True
+        assert result["records"][0]["block_containers"]["blocks"] == [{"index": 0}]
+
+    @pytest.mark.asyncio
+    async def test_partial_record_that_cannot_be_completed_is_not_available(self):
+        from app.utils.fetch_full_record import _fetch_multiple_records_impl
+
+        blob_store = MagicMock()
+        blob_store.complete_partial_record = AsyncMock(side_effect=Exception("gone"))
+
+        result = await _fetch_multiple_records_impl(
+            ["r1"], {"vr1": {"id": "r1", "partial_blocks": {}}}, blob_store=blob_store, org_id="org-1",
+        )
+
+        assert result["ok"] is False
+
     @pytest.mark.asyncio
     async def test_map_hit_ticket_upgrades_live_context_metadata(self):
         from app.utils.fetch_full_record import _fetch_multiple_records_impl
@@ -0,0 +1,61 @@
+"""Tests for app.utils.pdf_utils."""
+
+from io import BytesIO
+
+import pypdfium2 as pdfium
+
+from app.utils.pdf_utils import get_pdf_page_count, slice_pdf_pages
+
+
+def _pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for i in range(num_pages):
+        # Distinct widths make each source page identifiable after slicing.
+        pdf.new_page(100 + i, 200)
+    buf = BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+def _widths(content: bytes) -> list[float]:
+    pdf = pdfium.PdfDocument(content)
+    try:
+        return [pdf[i].get_size()[0] for i in range(len(pdf))]
+    finally:
+        pdf.close()
+
+
+class TestSlicePdfPages:
+    def test_keeps_requested_pages_at_their_original_numbers(self):
+        sliced = slice_pdf_pages(_pdf(30), 11, 20)
+
+        widths = _widths(sliced)
+        assert len(widths) == 20
+        assert widths[:10] == [1.0] * 10
+        assert widths[10:] == [100.0 + i for i in range(10, 20)]
+
+    def test_first_range_has_no_placeholders(self):
+        sliced = slice_pdf_pages(_pdf(5), 1, 2)
+
+        assert _widths(sliced) == [100.0, 101.0]
+
+    def test_slice_is_smaller_than_source_with_real_content(self):
+        pdf = pdfium.PdfDocument.new()
+        for _ in range(20):
+            page = pdf.new_page(612, 792)
+            for j in range(40):
+                obj = pdfium.PdfImage.new(pdf)
+                obj.set_bitmap(pdfium.PdfBitmap.new_native(32, 32, pdfium.raw.FPDFBitmap_BGR))
+                obj.set_matrix(pdfium.PdfMatrix().scale(32, 32).translate(j * 10, j * 10))
+                page.insert_obj(obj)
+            page.gen_content()
+        buf = BytesIO()
+        pdf.save(buf)
+        pdf.close()
+        content = buf.getvalue()
+
+        sliced = slice_pdf_pages(content, 19, 20)
+
+        assert get_pdf_page_count(sliced) == 20
+        assert len(sliced) < len(content) / 4
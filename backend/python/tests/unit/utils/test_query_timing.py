@@ -0,0 +1,163 @@
+"""Tests for app.utils.query_timing — per-request phase and backend timing."""
+
+import asyncio
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import query_timing as qt
+
+
+@pytest.fixture
+def timer():
+    timer = qt.QueryTimer(qid="q1")
+    token = qt.start_query_timer(timer)
+    yield timer
+    qt.reset_query_timer(token)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings(monkeypatch):
+    for name in (qt.ENV_ENABLED, qt.ENV_PHASE_LOG, qt.ENV_SERVER_TIMING):
+        monkeypatch.delenv(name, raising=False)
+    qt.reset_query_timing_settings()
+    yield
+    qt.reset_query_timing_settings()
+
+
+class TestPhases:
+    @pytest.mark.asyncio
+    async def test_concurrent_spans_of_one_phase_count_wall_time_once(self, timer):
+        async def fetch():
+            with qt.phase("blob_fetch"):
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*(fetch() for _ in range(10)))
+
+        assert 0.04 <= timer.durations["blob_fetch"] < 0.25
+
+    @pytest.mark.asyncio
+    async def test_tasks_share_the_request_timer(self, timer):
+        async def work():
+            with qt.phase("embedding"):
+                await asyncio.sleep(0)
+
+        await asyncio.create_task(work())
+
+        assert "embedding" in timer.durations
+
+    @pytest.mark.asyncio
+    async def test_decorator_times_coroutine(self, timer):
+        @qt.timed_phase("rerank")
+        async def rerank(x):
+            return x * 2
+
+        assert await rerank(3) == 6
+        assert "rerank" in timer.durations
+
+    def test_span_closes_on_exception(self, timer):
+        with pytest.raises(ValueError):
+            with qt.phase("vector_search"):
+                raise ValueError("boom")
+
+        assert "vector_search" in timer.durations
+        assert timer._depth["vector_search"] == 0
+
+    def test_point_measurement_keeps_first_value(self, timer):
+        qt.record_phase("llm_first_token", 0.2)
+        qt.record_phase("llm_first_token", 0.9)
+
+        assert timer.durations["llm_first_token"] == 0.2
+
+    def test_hooks_are_noops_without_a_request(self):
+        assert qt.current_query_timer() is None
+        with qt.phase("embedding"), qt.backend_call("neo4j"):
+            pass
+        qt.record_phase("llm_first_token", 0.1)
+
+
+class TestBackendCalls:
+    def test_calls_are_summed_per_backend_and_observed(self, timer):
+        with patch.object(qt, "BACKEND_CALL_DURATION") as histogram:
+            for _ in range(3):
+                with qt.backend_call("arango"):
+                    pass
+
+        assert timer.backends["arango"][0] == 3
+        assert histogram.observe.call_count == 3
+        assert histogram.observe.call_args.args == ("arango",)
+
+    def test_nothing_observed_outside_a_request(self):
+        with patch.object(qt, "BACKEND_CALL_DURATION") as histogram:
+            with qt.backend_call("arango"):
+                pass
+
+        histogram.observe.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_trace_config_times_requests(self, timer):
+        trace_config = qt.aiohttp_trace_config("blob")
+        ctx = MagicMock()
+
+        for hook in trace_config.on_request_start:
+            await hook(None, ctx, None)
+        for hook in trace_config.on_request_end:
+            await hook(None, ctx, None)
+
+        assert timer.backends["blob"][0] == 1
+
+
+class TestReporting:
+    def test_server_timing_lists_phases_in_order_then_backends_and_total(self, timer):
+        timer.durations.update({"llm_total": 1.5, "embedding": 0.012})
+        timer.add_backend_call("qdrant", 0.02)
+
+        value = timer.server_timing()
+
+        assert value.startswith("embedding;dur=12.0, llm_total;dur=1500.0")
+        assert 'backend.qdrant;dur=20.0;desc="1 calls"' in value
+        assert value.split(", ")[-1].startswith("total;dur=")
+
+    def test_finish_logs_phase_lines_agg_phases_can_read(self, timer):
+        logger = MagicMock(spec=logging.Logger)
+        with qt.phase("vector_search"):
+            pass
+
+        with patch.object(qt, "QUERY_PHASE_DURATION") as histogram:
+            timer.finish(logger)
+
+        histogram.observe.assert_called_once()
+        formats = [c.args[0] % c.args[1:] for c in logger.info.call_args_list]
+        assert formats[0].startswith("PHASE qid=q1 step=vector_search ms=")
+        assert formats[-1].startswith("PHASE qid=q1 step=total ms=")
+
+    def test_finish_records_nothing_for_requests_without_phases(self, timer):
+        logger = MagicMock(spec=logging.Logger)
+        with patch.object(qt, "QUERY_PHASE_DURATION") as histogram:
+            timer.finish(logger)
+
+        histogram.observe.assert_not_called()
+        logger.info.assert_not_called()
+
+    def test_phase_log_can_be_turned_off(self, timer, monkeypatch):
+        monkeypatch.setenv(qt.ENV_PHASE_LOG, "0")
+        qt.reset_query_timing_settings()
+        logger = MagicMock(spec=logging.Logger)
+        with qt.phase("embedding"):
+            pass
+
+        timer.finish(logger)
+
+        logger.info.assert_not_called()
+
+    def test_phase_log_failure_is_logged_at_debug(self, timer):
+        logger = MagicMock(spec=logging.Logger)
+        logger.info.side_effect = ValueError("closed stream")
+        with qt.phase("embedding"):
+            pass
+
+        timer.finish(logger)
+
+        logger.debug.assert_called_once()
+        assert "closed stream" in str(logger.debug.call_args.args[-1])
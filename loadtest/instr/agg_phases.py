@@ -3,9 +3,14 @@
 
     sudo docker logs --since <ts> pipeshub-ai 2>&1 | agg_phases.py
 
+The query service logs these itself (`app/utils/query_timing.py`): one line per
+phase when a request finishes, then `step=total`. Phases can overlap (retrieval
+runs beside agent setup), so their shares need not add up to 100%.
+
 Only requests that reached a terminal step are counted, so a trial that is cut
 off mid-flight cannot inflate a phase's share by dropping the phases that would
-have followed it.
+have followed it. Logs from the old in-container patch (`step=finalize`) are
+still read.
 """
 
 import re
@@ -15,8 +20,11 @@ from collections import defaultdict
 LINE = re.compile(
     r"PHASE qid=(?P<qid>\w+) step=(?P<step>\w+) ms=(?P<ms>[\d.]+) cum=(?P<cum>[\d.]+)"
 )
-TERMINAL = ("finalize", "llm_stream")
+TERMINAL = ("total", "finalize", "llm_stream")
 ORDER = [
+    "permission_fetch", "embedding", "vector_search", "graph_hydrate", "blob_fetch",
+    "rerank", "llm_first_token", "llm_total",
+    # legacy patch marks
     "llm_config", "user_context", "connector_probe", "attachments", "chat_state",
     "connector_prefetch", "agent_create", "retrieval_wait", "llm_stream", "finalize",
 ]
@@ -56,7 +64,7 @@ def main() -> int:
     print("-" * 71)
 
     seen = [s for s in ORDER if any(s in per_q[q] for q in complete)]
-    seen += sorted({s for q in complete for s in per_q[q]} - set(seen))
+    seen += sorted({s for q in complete for s in per_q[q]} - set(seen) - {"total"})
     for step in seen:
         vals = [per_q[q][step] for q in complete if step in per_q[q]]
         if not vals:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Summarise RECORDCACHE lines (see app/services/cache/decoded_record_cache.py)
+from stdin.
+
+Each worker logs cumulative counters, so the run's share is the last line minus
+the first per pid — a warm worker carries counts from earlier runs. A worker
+that logged only once is reported from its absolute counters.
+"""
+from __future__ import annotations
+
+import re
+import sys
+
+LINE = re.compile(
+    r"RECORDCACHE pid=(\d+) hits=(\d+) misses=(\d+) coalesced=(\d+) evictions=(\d+) "
+    r"invalidations=(\d+) bytes=(\d+) entries=(\d+)"
+)
+COUNTERS = ("hits", "misses", "coalesced", "evictions", "invalidations")
+
+
+def main() -> int:
+    first: dict[str, tuple[int, ...]] = {}
+    last: dict[str, tuple[int, ...]] = {}
+    for line in sys.stdin:
+        m = LINE.search(line)
+        if m:
+            values = tuple(int(v) for v in m.groups()[1:])
+            first.setdefault(m.group(1), values)
+            last[m.group(1)] = values
+    if not last:
+        print("  (no RECORDCACHE lines — decoded-record cache off or run too short)")
+        return 0
+
+    totals = dict.fromkeys(COUNTERS, 0)
+    resident_bytes = entries = 0
+    for pid, end in last.items():
+        start = first[pid] if first[pid] != end else (0,) * len(end)
+        for i, name in enumerate(COUNTERS):
+            totals[name] += end[i] - start[i]
+        resident_bytes += end[5]
+        entries += end[6]
+
+    lookups = totals["hits"] + totals["misses"]
+    hit_rate = totals["hits"] / lookups if lookups else 0.0
+    print(
+        f"  workers={len(last)}  hits={totals['hits']}  misses={totals['misses']}  "
+        f"hit-rate={hit_rate:.1%}  coalesced={totals['coalesced']}"
+    )
+    print(
+        f"  evictions={totals['evictions']}  invalidations={totals['invalidations']}  "
+        f"resident={resident_bytes / 1e6:.1f} MB in {entries} records"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,16 @@
 #!/usr/bin/env bash
-# instrument.sh on|off|status — per-phase and per-backend timing in the
-# query service.
+# instrument.sh on|off|status — per-window backend timing in the query
+# service.
 #
-# `perftest.sh` reports throughput, turn-phase latency and backend latency from
-# log lines this adds. CPU and memory work without it; the rest needs it on.
+# Turn-phase timing needs nothing from this script any more: the query service
+# logs `PHASE` lines itself (`app/utils/query_timing.py`). This adds the
+# `BACKENDAGG`/`LOOPLAG` window summaries `perftest.sh` reports as backend
+# latency. CPU and memory work without it.
 #
-# Nothing under backend/ is edited: the probes are copied into the running
+# Nothing under backend/ is edited: the probe is copied into the running
 # container and imported from `app/utils/runtime_threads.py`, which
-# `query_main` imports first. `docker restart` keeps them; `docker compose up`
-# recreates the container and drops them — re-run `on` after that.
+# `query_main` imports first. `docker restart` keeps it; `docker compose up`
+# recreates the container and drops it — re-run `on` after that.
 set -uo pipefail
 ACTION=${1:-status}
 HERE="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -22,8 +24,8 @@ if [ "$PIPESHUB_MODE" != "docker" ]; then
     echo "container and patches files there. A native deployment would mean"
     echo "editing your working tree, which this script will not do."
     echo
-    echo "Native runs still report CPU and memory; throughput, phase latency and"
-    echo "backend latency are the sections that need these probes."
+    echo "Native runs still report CPU, memory, throughput and phase latency;"
+    echo "the per-window backend summary is the section that needs this probe."
     exit 1
 fi
 
@@ -35,18 +37,8 @@ in_container() { $DOCKER exec -i "$CONTAINER" "$@"; }
 
 case "$ACTION" in
   on)
-    echo "== copying probes into $CONTAINER"
-    $DOCKER cp "$HERE/instr/query_phase_timing.py" "$CONTAINER:/app/python/app/utils/query_phase_timing.py"
-    $DOCKER cp "$HERE/instr/backend_timing.py"     "$CONTAINER:/app/python/app/utils/backend_timing.py"
-    $DOCKER cp "$HERE/instr/apply_instrumentation.py" "$CONTAINER:/tmp/apply_instrumentation.py"
-
-    echo "== patching phase marks into the request path"
-    # The patcher takes both request-path targets; called bare it prints usage
-    # and exits 2, which meant the phase patch silently never applied.
-    in_container python3 /tmp/apply_instrumentation.py \
-      /app/python/app/api/routes/chatbot.py \
-      /app/python/app/agents/chat_modes/bridge.py || {
-      echo "!! phase patch failed — throughput/latency will be unavailable"; }
+    echo "== copying the backend probe into $CONTAINER"
+    $DOCKER cp "$HERE/instr/backend_timing.py" "$CONTAINER:/app/python/app/utils/backend_timing.py"
 
     echo "== wiring the backend-latency probe"
     in_container python3 - <<'PY'
@@ -108,17 +100,10 @@ open(p, "w").write(out)
 print("   unwired")
 PY
     in_container sh -c 'rm -f /app/python/app/utils/backend_timing.py' || true
-    in_container sh -c 'rm -f /app/python/app/utils/query_phase_timing.py' || true
-    # The patcher is forward-only. Phase marks stay until the container is
-    # recreated; say so rather than pretending a revert ran.
-    echo "   (phase marks remain — recreate the container to clear them)"
     bash "$HERE/restart_query.sh"
     ;;
 
   status)
-    echo -n "phase marks : "
-    in_container grep -qc "_phase_mark" /app/python/app/api/routes/chatbot.py 2>/dev/null \
-      && echo "applied" || echo "not applied"
     echo -n "backend probe: "
     in_container grep -q "backend_timing" "$RT" 2>/dev/null && echo "wired" || echo "not wired"
     echo -n "recent lines : "
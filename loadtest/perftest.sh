@@ -239,7 +239,7 @@ say ""
 say "==================== TURN LATENCY (per phase, ms) ===================="
 if log_available; then
   log_read "$START" "$FINISH" | "$PYTHON" "$HERE/instr/agg_phases.py" 2>/dev/null | tee -a "$REPORT" \
-    || say "   (no phase data - run ./instrument.sh on to enable)"
+    || say "   (no phase data - is PIPESHUB_QUERY_PHASE_LOG=0 on the query service?)"
 else
   say "   (no log source - set PIPESHUB_QUERY_LOG in .env; see .env.example)"
 fi
@@ -293,6 +293,16 @@ else
   say "   (no log source - set PIPESHUB_QUERY_LOG in .env; see .env.example)"
 fi
 
+say ""
+say "==================== RECORD CACHE (decoded blob records) ===================="
+if log_available; then
+  log_read "$START" "$FINISH" | grep -a RECORDCACHE \
+    | "$PYTHON" "$HERE/instr/agg_record_cache.py" 2>/dev/null | tee -a "$REPORT" \
+    || say "   (no record cache data)"
+else
+  say "   (no log source - set PIPESHUB_QUERY_LOG in .env; see .env.example)"
+fi
+
 # Machine-readable, so `aggregate.py` can roll many runs into one table without
 # re-parsing the human report. PIPESHUB_ARM/TRIAL are set by the matrix driver.
 "$PYTHON" "$HERE/instr/make_summary.py" \
@@ -10,7 +10,7 @@
 #
 # process_monitor.sh is the container entrypoint, so changing it needs a
 # `docker restart`. That is fine BETWEEN configs; never do it mid-trial.
-# `docker restart` preserves docker cp'd files, so the phase-timing patch
+# `docker restart` preserves docker cp'd files, so the backend-timing probe
 # survives -- only `docker compose up -d` would wipe it.
 set -euo pipefail
 
@@ -97,10 +97,6 @@ else
     [ "$got" = "$want" ] || { echo "WORKER COUNT MISMATCH -- do not trial this config" >&2; exit 1; }
 fi
 
-echo "== phase instrumentation still applied:"
-$DOCKER exec "$CONTAINER" grep -c '_phase_mark("' \
-    /app/python/app/api/routes/chatbot.py /app/python/app/agents/chat_modes/bridge.py || true
-
 echo "== settling ${SETTLE}s (restart also bounces indexing/connector; F6 showed"
 echo "   background indexing inflates latency and contaminated an early baseline)"
 sleep "$SETTLE"
@@ -20,9 +20,8 @@ if ! log_available; then
     exit 0
 fi
 
-# `step=finalize` is emitted by the instrumentation patch (./instrument.sh on).
-# Without it, fall back to a line the application already logs once per
-# completed turn — `respond.py`'s AnswerFinalizer. Fall back rather than count
+# `step=finalize` was emitted by the old in-container phase patch. Without it,
+# fall back to a line the application already logs once per completed turn — `respond.py`'s AnswerFinalizer. Fall back rather than count
 # both: an instrumented run emits BOTH, and summing them doubles every turn.
 LOGTEXT=$(log_read "$START" "$END")
 marks=$(printf '%s' "$LOGTEXT" | grep -ac 'step=finalize' || true)